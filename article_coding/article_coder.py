@@ -57,6 +57,7 @@ from context.shared.person_details import PersonDetails
 from context_text.models import Article
 from context_text.models import Article_Author
 from context_text.models import Article_Data
+from context_text.models import Article_Data_Network_Tie
 from context_text.models import Article_Person
 from context_text.models import Article_Subject
 from context_text.models import Article_Subject_Mention
@@ -65,7 +66,11 @@ from context_text.models import Article_Text
 from context_text.models import Person
 from context_text.models import Person_External_UUID
 from context_text.models import Person_Newspaper
+from context_text.article_coding.article_coding_context import ArticleCodingContext
+from context_text.article_coding.person_confidence_index import PersonConfidenceIndex
+from context_text.article_coding.person_name_index import PersonNameIndex
 from context_text.shared.context_text_base import ContextTextBase
+from context_text.shared.name_key_helper import NameKeyHelper
 
 #================================================================================
 # Shared variables and functions
@@ -109,6 +114,8 @@ class ArticleCoder( BasicRateLimited ):
     # config parameters
     PARAM_AUTOPROC_ALL = "autoproc_all"
     PARAM_AUTOPROC_AUTHORS = "autoproc_authors"
+    PARAM_USE_PERSON_NAME_INDEX = "use_person_name_index"
+    PARAM_USE_NAME_KEYS = "use_name_keys"
     
     # author string processing
     REGEX_BEGINS_WITH_BY = re.compile( r'^\s*BY\s+', re.IGNORECASE )
@@ -434,6 +441,28 @@ class ArticleCoder( BasicRateLimited ):
         # debug
         self.debug = ""
         
+        # optional in-memory Person name index (see set_person_name_index()).
+        self.person_name_index = None
+        
+        # match names on Person's name key columns rather than "__iexact"
+        #     (see set_use_name_keys()).
+        self.use_name_keys = False
+        
+        # optional in-memory index of UUID and newspaper associations used in
+        #     confidence scoring (see set_person_confidence_index()).
+        self.person_confidence_index = None
+        
+        # ArticleCodingContext for the article being coded by code_article().
+        self.coding_context = None
+        
+        # Article_Text mentions and quotations are found in when there is no
+        #     coding context (see get_article_text()).
+        self.article_text = None
+        
+        # optional cache of responses from the coding service, for coders
+        #     that call one (a context_text.shared.response_cache.ResponseCache).
+        self.response_cache = None
+        
         # exception helper
         self.exception_helper = None
         my_exception_helper = ExceptionHelper()
@@ -525,8 +554,25 @@ class ArticleCoder( BasicRateLimited ):
             # got an article?
             if ( article_IN is not None ):
     
-                # call process_article()
-                status_OUT = self.process_article( article_IN, automated_coding_user )
+                # call process_article(), with a coding context that holds the
+                #     article's text, existing mentions and quotations, and new
+                #     ones to save once it is done.  Network ties of the
+                #     Article_Data it touches are rebuilt once, at the end,
+                #     not each time an author or source is saved.
+                with Article_Data_Network_Tie.defer_updates():
+                
+                    self.coding_context = ArticleCodingContext( article_IN )
+                    try:
+                    
+                        status_OUT = self.process_article( article_IN, automated_coding_user )
+                        
+                    finally:
+                    
+                        self.flush_coding_context()
+                        
+                    #-- END try...finally around process_article() --#
+                    
+                #-- END with deferred network tie updates --#
     
                 # see if status other than success
                 if ( status_OUT != self.STATUS_SUCCESS ):
@@ -552,6 +598,134 @@ class ArticleCoder( BasicRateLimited ):
         return status_OUT
 
     #-- END method code_article() --#
+
+
+    def find_all_in_article_text( self, article_IN, string_list_IN ):
+
+        '''
+        Accepts Article and list of the strings (mentions and quotations) that
+           will be looked for in its text while it is coded.  Finds them all
+           at once with Article_Text.find_in_text_batch(), in the Article_Text
+           returned by get_article_text() (re-loaded if there is no coding
+           context), so each find_in_text() call made while processing a
+           mention or quotation just looks up its result.  Returns the
+           dictionary find_in_text_batch() returns, or None if no article.
+        '''
+
+        # return reference
+        dict_OUT = None
+
+        # declare variables
+        article_text = None
+
+        # got an article?
+        if ( article_IN is not None ):
+
+            # start of the article - load fresh text if no coding context.
+            if ( self.get_coding_context( article_IN ) is None ):
+
+                self.article_text = None
+
+            #-- END check to see if coding context --#
+
+            article_text = self.get_article_text( article_IN )
+            dict_OUT = article_text.find_in_text_batch( string_list_IN )
+
+        #-- END check to see if article --#
+
+        return dict_OUT
+
+    #-- END method find_all_in_article_text() --#
+
+
+    def flush_coding_context( self ):
+
+        '''
+        Saves the new mentions and quotations in the current coding context,
+           then clears it.  Returns count of rows saved.
+        '''
+
+        # return reference
+        count_OUT = 0
+
+        if ( self.coding_context is not None ):
+
+            try:
+
+                count_OUT = self.coding_context.flush()
+
+            finally:
+
+                self.coding_context = None
+
+            #-- END try...finally around flush --#
+
+        #-- END check to see if coding context --#
+
+        return count_OUT
+
+    #-- END method flush_coding_context() --#
+
+
+    def get_article_text( self, article_IN ):
+
+        '''
+        Returns the Article_Text to find article_IN's mentions and quotations
+           in - the coding context's, if there is one for the article, or
+           else the one this coder last loaded for the article (loading it if
+           there isn't one), so results of find_all_in_article_text() are
+           there for each mention and quotation.
+        '''
+
+        # return reference
+        article_text_OUT = None
+
+        # declare variables
+        my_coding_context = None
+
+        my_coding_context = self.get_coding_context( article_IN )
+        if ( my_coding_context is not None ):
+
+            article_text_OUT = my_coding_context.get_article_text()
+
+        else:
+
+            # already loaded for this article?
+            if ( ( self.article_text is None ) or ( self.article_text.article_id != article_IN.id ) ):
+
+                self.article_text = article_IN.article_text_set.get()
+
+            #-- END check to see if already loaded --#
+
+            article_text_OUT = self.article_text
+
+        #-- END check to see if coding context --#
+
+        return article_text_OUT
+
+    #-- END method get_article_text() --#
+
+
+    def get_coding_context( self, article_IN = None ):
+
+        '''
+        Returns the ArticleCodingContext for the article being coded, or None
+           if there isn't one or it is for a different article than article_IN.
+        '''
+
+        # return reference
+        context_OUT = None
+
+        if ( ( self.coding_context is not None )
+            and ( ( article_IN is None ) or ( article_IN.id == self.coding_context.article.id ) ) ):
+
+            context_OUT = self.coding_context
+
+        #-- END check to see if coding context for article --#
+
+        return context_OUT
+
+    #-- END method get_coding_context() --#
     
 
     def get_config_application( self ):
@@ -685,6 +859,43 @@ class ArticleCoder( BasicRateLimited ):
     #-- END get_exception_helper() --#
 
 
+    def get_person_confidence_index( self ):
+
+        '''
+        Returns this instance's PersonConfidenceIndex, or None if confidence
+           scoring should load what it needs for each call.
+        '''
+        
+        return self.person_confidence_index
+
+    #-- END get_person_confidence_index() --#
+
+
+    def get_person_name_index( self ):
+
+        '''
+        Returns this instance's PersonNameIndex, or None if lookups should go
+           straight to the database.
+        '''
+        
+        return self.person_name_index
+
+    #-- END get_person_name_index() --#
+
+
+    def get_use_name_keys( self ):
+
+        '''
+        Returns True if person lookups match names on Person's name key
+           columns (ignoring case, accents, and punctuation), False if they
+           compare name parts with "__iexact".
+        '''
+        
+        return self.use_name_keys
+
+    #-- END get_use_name_keys() --#
+
+
     @abstractmethod
     def init_config_properties( self, *args, **kwargs ):
 
@@ -720,6 +931,59 @@ class ArticleCoder( BasicRateLimited ):
     #-- END abstract method init_config_properties() --#
     
 
+    def init_person_name_index( self, person_qs_IN = None ):
+
+        '''
+        Builds a PersonNameIndex from the Persons in the QuerySet passed in
+           (defaults to all Persons), and stores it in this instance so
+           lookup_person() matches names using the index rather than the
+           database.  The index matches names the same way as the database
+           (see set_use_name_keys()).  Intended to be called once per coding
+           run.  Returns the index.
+        '''
+        
+        # return reference
+        index_OUT = None
+        
+        # build and store.
+        index_OUT = PersonNameIndex( use_name_keys_IN = self.get_use_name_keys() )
+        index_OUT.build( person_qs_IN )
+        self.set_person_name_index( index_OUT )
+        
+        return index_OUT
+
+    #-- END method init_person_name_index() --#
+    
+
+    def is_article_response_cached( self, article_IN ):
+
+        '''
+        Returns True if coding article_IN will use a stored response rather
+           than making a request to a rate-limited service, so callers can skip
+           waiting for the rate limit.  Defaults to False - coders with a
+           response cache should override.
+        '''
+        
+        return False
+
+    #-- END method is_article_response_cached() --#
+
+
+    def iterate_articles_pipelined( self, article_iterable_IN, rate_limiter_IN = None ):
+
+        '''
+        Accepts iterable of articles and optional shared rate limiter.  Returns
+           an iterator over the articles to pass to code_article(), in the
+           order they should be coded.  Coders that call a remote service can
+           override this to send requests for upcoming articles while earlier
+           ones are being coded.  Defaults to returning the articles as-is.
+        '''
+        
+        return iter( article_iterable_IN )
+
+    #-- END method iterate_articles_pipelined() --#
+    
+
     def load_config_properties( self, *args, **kwargs ):
 
         '''
@@ -1003,132 +1267,191 @@ class ArticleCoder( BasicRateLimited ):
         - If UUID present in person_details_IN, checks to see if any other person has that UIID related.  If yes...  Uh Oh. -2.0
         - If newspaper present, checks to see if person is related to that newspaper.  If not, -0.1.
         - Tries a full-name search.  If others with full-name, -0.1 (though likely a parsing issue...)
+
+        Scores through lookup_calc_confidence_batch(), so per-person and
+           batched scores always match.
         '''
 
         # return reference
         value_OUT = 0.0
         
+        # score a batch of one.
+        value_OUT = self.lookup_calc_confidence_batch( [ ( person_IN, person_details_IN ) ] )[ 0 ]
+
+        return value_OUT
+
+    #-- END method lookup_calc_confidence() --#
+
+
+    def lookup_calc_confidence_batch( self, person_details_list_IN ):
+
+        '''
+        Accepts list of ( Person, person details ) pairs - for example, all the
+           people matched in one article, or a chunk of articles.  Loads the
+           Person_External_UUID rows for all of their UUIDs and the
+           Person_Newspaper rows for all of their newspapers with two IN
+           queries (into the coder's PersonConfidenceIndex if there is one,
+           so values already loaded are not loaded again), then scores each
+           person the way lookup_calc_confidence() describes.  Returns list of
+           confidence scores, in the same order as the pairs passed in (0.0
+           for a pair with no person).
+        '''
+
+        # return reference
+        list_OUT = []
+        
         # declare variables.
-        me = "lookup_calc_confidence"
+        me = "lookup_calc_confidence_batch"
+        confidence_index = None
+        details_list = None
+        uuid_list = None
+        person_newspaper_pair_list = None
+        person_IN = None
+        person_details_IN = None
         my_person_details = None
         newspaper_IN = None
+        newspaper_id = None
         uuid_IN = ""
         person_id = -1
         confidence_level = 0.0
-        confidence_qs = None
+        uuid_person_id_list = None
+        other_person_id_list = None
         confidence_count = -1
-        current_person = None
         
-        # sanity full-name lookup.
-        standardized_full_name = ""
-        full_name_qs = None
-        full_name_match_count = -1
+        # use run's index if there is one.
+        confidence_index = self.get_person_confidence_index()
+        if ( confidence_index is None ):
         
-        # got a person?
-        if ( person_IN is not None ):
+            confidence_index = PersonConfidenceIndex()
+            
+        #-- END check to see if index --#
+        
+        # collect UUIDs and person-newspaper pairs.
+        details_list = []
+        uuid_list = []
+        person_newspaper_pair_list = []
+        for person_IN, person_details_IN in person_details_list_IN:
         
             # make sure we have PersonDetails instance.
             my_person_details = PersonDetails.get_instance( person_details_IN )
-        
-            # load up incoming things we care about here.
-            newspaper_IN = my_person_details.get( self.PARAM_NEWSPAPER_INSTANCE, None )
-            uuid_IN = my_person_details.get( self.PARAM_EXTERNAL_UUID, None )
-            person_id = person_IN.id
-        
-            # start confidence at 1
-            confidence_level = 1.0
+            details_list.append( my_person_details )
             
-            # got a UUID?
-            if ( ( uuid_IN is not None ) and ( uuid_IN != "" ) ):
-
-                # yes.  See if we have one that matches.
-                confidence_qs = person_IN.person_external_uuid_set.filter( uuid = uuid_IN )
-                
-                # got any?
-                confidence_count = confidence_qs.count()
-                if ( confidence_count == 0 ):
-                
-                    # no match for UUID.
-                    confidence_level = confidence_level - 0.1
-                
-                elif ( confidence_count > 1 ):
-                
-                    # multiple matches!  Error.
-                    self.output_debug( "In " + me + ": ERROR - While calculating confidence, multiple matches for UUID \"" + uuid_IN + "\"" )
-                
-                #-- END check to see if match. --#
-                
-                # see if anyone else has this UUID.
-                confidence_qs = Person.objects.filter( person_external_uuid__uuid = uuid_IN )
-                confidence_qs = confidence_qs.exclude( pk = person_id )
-                
-                # got any?
-                confidence_count = confidence_qs.count()
-                if ( confidence_count > 0 ):
+            if ( person_IN is not None ):
+            
+                uuid_list.append( my_person_details.get( self.PARAM_EXTERNAL_UUID, None ) )
+                newspaper_IN = my_person_details.get( self.PARAM_NEWSPAPER_INSTANCE, None )
+                if ( newspaper_IN is not None ):
                 
-                    # found match for UUID other than this person.
-                    confidence_level = confidence_level - 2.0
-                    
-                    self.output_debug( "In " + me + ": ERROR - found people other than the one passed in with UUID." )
-                    self.output_debug( "In " + me + ": Person passed in: " + str( person_IN ) )
-                    self.output_debug( "In " + me + ": Others:" )
-
-                    # output other people, for debugging.
-                    for current_person in confidence_qs:
+                    person_newspaper_pair_list.append( ( person_IN.id, newspaper_IN.id ) )
                     
-                        self.output_debug( "In " + me + ": - " + str( current_person ) )
-                    
-                    #-- END loop over corrupted UUID persons. --#
+                #-- END check to see if newspaper --#
                 
-                #-- END check to see if single match. --#                            
+            #-- END check to see if person --#
             
-            #-- END check to see if UUID --#
+        #-- END loop over people --#
+        
+        # load - two queries at most.
+        confidence_index.load( uuid_list, person_newspaper_pair_list )
+
+        # score.
+        for ( person_IN, person_details_IN ), my_person_details in zip( person_details_list_IN, details_list ):
+        
+            confidence_level = 0.0
+        
+            # got a person?
+            if ( person_IN is not None ):
             
-            # got a newspaper?
-            if ( newspaper_IN is not None ):
+                # load up incoming things we care about here.
+                newspaper_IN = my_person_details.get( self.PARAM_NEWSPAPER_INSTANCE, None )
+                uuid_IN = my_person_details.get( self.PARAM_EXTERNAL_UUID, None )
+                person_id = person_IN.id
             
-                # see if any have same paper as that passed in.
-                confidence_qs = person_IN.person_newspaper_set.filter( newspaper = newspaper_IN )
+                # start confidence at 1
+                confidence_level = 1.0
                 
-                # got any?
-                confidence_count = confidence_qs.count()
-                if ( confidence_count == 0 ):
-                
-                    # no match for paper.
-                    confidence_level = confidence_level - 0.1
+                # got a UUID?
+                if ( ( uuid_IN is not None ) and ( uuid_IN != "" ) ):
+    
+                    # yes.  See if we have one that matches.
+                    uuid_person_id_list = confidence_index.get_person_id_list_for_uuid( uuid_IN )
+                    confidence_count = 0
+                    if ( person_id is not None ):
+                    
+                        confidence_count = uuid_person_id_list.count( person_id )
+                        
+                    #-- END check to see if saved person --#
+                    
+                    # got any?
+                    if ( confidence_count == 0 ):
+                    
+                        # no match for UUID.
+                        confidence_level = confidence_level - 0.1
+                    
+                    elif ( confidence_count > 1 ):
+                    
+                        # multiple matches!  Error.
+                        self.output_debug( "In " + me + ": ERROR - While calculating confidence, multiple matches for UUID \"" + uuid_IN + "\"" )
                     
-                elif ( confidence_count > 1 ):
+                    #-- END check to see if match. --#
+                    
+                    # see if anyone else has this UUID.
+                    other_person_id_list = sorted( set( [ current_person_id for current_person_id in uuid_person_id_list if current_person_id != person_id ] ) )
+                    
+                    # got any?
+                    if ( len( other_person_id_list ) > 0 ):
+                    
+                        # found match for UUID other than this person.
+                        confidence_level = confidence_level - 2.0
+                        
+                        self.output_debug( "In " + me + ": ERROR - found people other than the one passed in with UUID." )
+                        self.output_debug( "In " + me + ": Person passed in: " + str( person_IN ) )
+                        self.output_debug( "In " + me + ": Others (Person IDs): " + str( other_person_id_list ) )
+                    
+                    #-- END check to see if single match. --#                            
                 
-                    # multiple matches!  Error.
-                    self.output_debug( "In " + me + ": ERROR - While calculating confidence, multiple matches for newspaper: " + str( newspaper_IN ) )
+                #-- END check to see if UUID --#
                 
-                #-- END check to see if single match. --#                            
+                # got a newspaper?
+                if ( newspaper_IN is not None ):
                 
-            #-- END check to see if newspaper passed in. --#
-            
-            # full name check (just out of curiosity...)
-            standardized_full_name = person_IN.full_name_string
+                    # see if any have same paper as that passed in.
+                    confidence_count = confidence_index.get_person_newspaper_count( person_id, newspaper_IN.id )
+                    if ( ( confidence_count is None ) or ( person_id is None ) ):
+                    
+                        # unsaved person - no newspapers.
+                        confidence_count = 0
+                        
+                    #-- END check to see if loaded --#
+                    
+                    # got any?
+                    if ( confidence_count == 0 ):
+                    
+                        # no match for paper.
+                        confidence_level = confidence_level - 0.1
+                        
+                    elif ( confidence_count > 1 ):
+                    
+                        # multiple matches!  Error.
+                        self.output_debug( "In " + me + ": ERROR - While calculating confidence, multiple matches for newspaper: " + str( newspaper_IN ) )
+                    
+                    #-- END check to see if single match. --#                            
+                    
+                #-- END check to see if newspaper passed in. --#
+                
+                # full name check - never evaluated in the per-person version
+                #    (full_name_match_count stayed -1), so not checked here
+                #    either.
+    
+            #-- END check to see if person. --#
             
-            # look for matches based on full name string.
-            full_name_qs = Person.objects.filter( full_name_string__iexact = standardized_full_name )
-  
-            # got more than one?
-            if ( full_name_match_count > 1 ):
+            self.output_debug( "In " + me + ": confidence = " + str( confidence_level ) )
+            list_OUT.append( confidence_level )
             
-                # there are more than one match.  My confidence just decreased.
-                confidence_level = confidence_level - 0.5
-
-            #-- END check to see if duplicates. --#
+        #-- END loop over people --#
 
-        #-- END check to see if person. --#
-        
-        value_OUT = confidence_level
-
-        self.output_debug( "In " + me + ": confidence = " + str( value_OUT ) )
-
-        return value_OUT
+        return list_OUT
 
-    #-- END abstract method load_config_properties() --#
+    #-- END method lookup_calc_confidence_batch() --#
     
     
     def lookup_person( self,
@@ -1176,6 +1499,10 @@ class ArticleCoder( BasicRateLimited ):
            - Person.get_person_for_name( full_name_IN, create_if_no_match_IN ).
            - Person.look_up_person_from_name( full_name_IN ).
 
+        Every name lookup uses the same matching rule - name keys if
+           get_use_name_keys(), else "__iexact" - whether it goes to the
+           database or to the PersonNameIndex.
+
         Tries to get person based on full name.  Then, if multiple matches, we
            attempt to disambiguate.  If new Person created, save the person.
            Then, if update_person_IN is true, update the person with information
@@ -1327,7 +1654,7 @@ class ArticleCoder( BasicRateLimited ):
         #------------------------------------------------------------------------
             
                 # lookup Person
-                person_instance = Person.get_person_for_name( full_name_IN, create_if_no_match_IN = create_if_no_match_IN )
+                person_instance = self.lookup_person_for_name( full_name_IN, create_if_no_match_IN = create_if_no_match_IN )
                 lookup_status = Person.get_person_lookup_status( person_instance )
                 
                 # Decide what to do based on status.
@@ -1344,10 +1671,10 @@ class ArticleCoder( BasicRateLimited ):
 
                         # yes.  Do strict lookup with no partial match to see if
                         #     this is an exact match.
-                        temp_person = Person.get_person_for_name( full_name_IN,
-                                                                  create_if_no_match_IN = False,
-                                                                  do_strict_match_IN = True,
-                                                                  do_partial_match_IN = False )
+                        temp_person = self.lookup_person_for_name( full_name_IN,
+                                                                   create_if_no_match_IN = False,
+                                                                   do_strict_match_IN = True,
+                                                                   do_partial_match_IN = False )
                         temp_lookup_status = Person.get_person_lookup_status( temp_person )
                         
                         # exact match?
@@ -1359,8 +1686,8 @@ class ArticleCoder( BasicRateLimited ):
                             # further verify by checking if just one match for
                             #     the name passed in and first_name, ignoring
                             #     other name fields.
-                            test_person_qs = Person.objects.filter( first_name__iexact = full_name_IN )
-                            test_person_count = test_person_qs.count()
+                            test_person_qs = self.lookup_person_list_for_first_name( full_name_IN )
+                            test_person_count = len( test_person_qs )
                             if ( test_person_count == 1 ):
 
                                 # This is a relatively rare scenario - a single
@@ -1411,10 +1738,10 @@ class ArticleCoder( BasicRateLimited ):
                     #    False.  Use lookup method to get QuerySet of matches,
                     #    then based on the results, set match_status and if
                     #    multiple, add all to multiple_list.
-                    multiple_qs = Person.look_up_person_from_name( full_name_IN )
+                    multiple_qs = self.lookup_person_list_for_name( full_name_IN )
                     
                     # get count
-                    multiple_count = multiple_qs.count()
+                    multiple_count = len( multiple_qs )
                     
                     # 0 or many?
                     if ( multiple_count == 0 ):
@@ -1423,7 +1750,7 @@ class ArticleCoder( BasicRateLimited ):
                         match_status = self.MATCH_STATUS_NONE
                         
                         # make new person instance for name (not saved)
-                        person_instance = Person.get_person_for_name( full_name_IN, create_if_no_match_IN = True )
+                        person_instance = self.lookup_person_for_name( full_name_IN, create_if_no_match_IN = True )
                     
                         self.output_debug( "In " + me + ": multiple_qs.count() returned " + str( multiple_count ) + " ( match_status = \"" + match_status + "\" )." )
                     
@@ -1431,7 +1758,7 @@ class ArticleCoder( BasicRateLimited ):
                     
                         # one match. What?
                         match_status = self.MATCH_STATUS_SINGLE
-                        person_instance = multiple_qs.get()
+                        person_instance = multiple_qs[ 0 ]
                         
                         self.output_debug( "In " + me + ": multiple_qs.count() returned " + str( multiple_count ) + " ( match_status = \"" + match_status + "\" ), in a part of code where result should have been either 0 or > 1.  Error." )
                     
@@ -1481,7 +1808,7 @@ class ArticleCoder( BasicRateLimited ):
                     if ( person_instance is None ):
                     
                         # make instance, but it isn't saved to database.
-                        person_instance = Person.get_person_for_name( full_name_IN, create_if_no_match_IN = True )
+                        person_instance = self.lookup_person_for_name( full_name_IN, create_if_no_match_IN = True )
                         
                     #-- END check to see if person_instance --#
                     
@@ -1493,10 +1820,10 @@ class ArticleCoder( BasicRateLimited ):
                     #self.output_debug( debug_string, me )
                         
                     # look for matches based on full name string.
-                    full_name_qs = Person.objects.filter( full_name_string__iexact = standardized_full_name )
+                    full_name_qs = self.lookup_person_list_for_full_name_string( standardized_full_name )
 
                     # got anything back?
-                    full_name_count = full_name_qs.count()
+                    full_name_count = len( full_name_qs )
                     if ( full_name_count == 0 ):
 
                         # !remove periods, look again.
@@ -1514,14 +1841,14 @@ class ArticleCoder( BasicRateLimited ):
                         temp_full_name = temp_person.full_name_string
                         
                         # look for matches based on no-periods full name string.
-                        full_name_qs = Person.objects.filter( full_name_string__iexact = temp_full_name )
+                        full_name_qs = self.lookup_person_list_for_full_name_string( temp_full_name )
 
                     #-- END try to lookup person, periods removed from name strings. --#
                     
                     # !TODO - just first name, last name...?
 
                     # got anything back?
-                    full_name_count = full_name_qs.count()
+                    full_name_count = len( full_name_qs )
                     if ( full_name_count == 0 ):
                     
                         # nothing returned from looking for full name, either.
@@ -1533,7 +1860,7 @@ class ArticleCoder( BasicRateLimited ):
                         match_status = self.MATCH_STATUS_SINGLE
                         
                         # store person as person_instance.
-                        person_instance = full_name_qs.get()
+                        person_instance = full_name_qs[ 0 ]
                         
                         # verification will handle assessing confidence.
                     
@@ -1641,13 +1968,13 @@ class ArticleCoder( BasicRateLimited ):
                     if ( ( found_person == False ) and ( on_multiple_match_try_exact_lookup_IN == True ) ):
                     
                         # try a strict match lookup.
-                        person_qs = Person.look_up_person_from_name( full_name_IN, do_strict_match_IN = True )
+                        person_qs = self.lookup_person_list_for_name( full_name_IN, do_strict_match_IN = True )
                     
                         # how many results?  And, if only one, is this really better?
-                        if ( person_qs.count() == 1 ):
+                        if ( len( person_qs ) == 1 ):
                         
                             # Well, caller asked for it.  OK!
-                            person_instance = person_filter_qs.get()
+                            person_instance = person_qs[ 0 ]
                             found_person = True
                             confidence_level = 0.7  # not sure of level of confidence here - if small sample, might be right...                           
                         
@@ -1752,6 +2079,13 @@ class ArticleCoder( BasicRateLimited ):
                         
                         # Save the record.
                         person_instance.save()
+                        
+                        # keep name index current.
+                        if ( self.person_name_index is not None ):
+                        
+                            self.person_name_index.add_person( person_instance )
+                            
+                        #-- END check to see if name index --#
 
                         # call update_person() to set title, organization,
                         #     related records.
@@ -1802,6 +2136,209 @@ class ArticleCoder( BasicRateLimited ):
     #-- END method lookup_person() --#
 
 
+    def lookup_person_for_name( self,
+                                full_name_IN,
+                                create_if_no_match_IN = False,
+                                do_strict_match_IN = False,
+                                do_partial_match_IN = False ):
+
+        '''
+        Wrapper around Person.get_person_for_name() that uses this instance's
+           PersonNameIndex if there is one (and a partial match wasn't
+           requested).  Same return values: single match (FOUND), new unsaved
+           Person (NEW), or None (multiple, or none without create).  If
+           get_use_name_keys(), the database lookup matches on the name key
+           columns, same as the rest of lookup_person().
+        '''
+        
+        # return reference
+        instance_OUT = None
+        
+        # declare variables
+        name_index = None
+        person_list = None
+        
+        # got an index?
+        name_index = self.get_person_name_index()
+        if ( ( name_index is not None ) and ( do_partial_match_IN == False ) ):
+        
+            # yes - use it.
+            instance_OUT = name_index.get_person_for_name( full_name_IN,
+                                                           create_if_no_match_IN = create_if_no_match_IN,
+                                                           do_strict_match_IN = do_strict_match_IN )
+        
+        elif ( self.get_use_name_keys() == True ):
+        
+            # no - database, on name keys.  Same rules as get_person_for_name().
+            person_list = list( Person.look_up_person_from_name( full_name_IN,
+                                                                 do_strict_match_IN = do_strict_match_IN,
+                                                                 do_partial_match_IN = do_partial_match_IN,
+                                                                 use_name_keys_IN = True ) )
+            if ( len( person_list ) == 1 ):
+            
+                # found.
+                instance_OUT = person_list[ 0 ]
+            
+            elif ( ( len( person_list ) == 0 ) and ( create_if_no_match_IN == True ) ):
+            
+                # new.
+                instance_OUT = Person.create_person_for_name( full_name_IN )
+            
+            #-- END check to see how many matches --#
+        
+        else:
+        
+            # no - database.
+            instance_OUT = Person.get_person_for_name( full_name_IN,
+                                                       create_if_no_match_IN = create_if_no_match_IN,
+                                                       do_strict_match_IN = do_strict_match_IN,
+                                                       do_partial_match_IN = do_partial_match_IN )
+        
+        #-- END check to see if name index --#
+        
+        return instance_OUT
+
+    #-- END method lookup_person_for_name() --#
+
+
+    def lookup_person_list_for_first_name( self, first_name_IN ):
+
+        '''
+        Returns list of Persons whose first name matches the name passed in,
+           ignoring case (and accents and punctuation, comparing
+           first_name_key, if get_use_name_keys()), from the PersonNameIndex
+           if there is one, else the database.
+        '''
+        
+        # return reference
+        list_OUT = None
+        
+        # declare variables
+        name_index = None
+        person_id_set = None
+        
+        # got an index?
+        name_index = self.get_person_name_index()
+        if ( name_index is not None ):
+        
+            # yes - use it.
+            person_id_set = name_index.look_up_first_name( first_name_IN )
+            list_OUT = list( Person.objects.filter( id__in = person_id_set ).order_by( "id" ) )
+        
+        elif ( self.get_use_name_keys() == True ):
+        
+            # no - database, on name key.
+            list_OUT = list( Person.objects.filter( first_name_key = NameKeyHelper.make_name_key( first_name_IN ) ) )
+        
+        else:
+        
+            # no - database.
+            list_OUT = list( Person.objects.filter( first_name__iexact = first_name_IN ) )
+        
+        #-- END check to see if name index --#
+        
+        return list_OUT
+
+    #-- END method lookup_person_list_for_first_name() --#
+
+
+    def lookup_person_list_for_full_name_string( self, full_name_string_IN ):
+
+        '''
+        Returns list of Persons whose full_name_string matches the string passed
+           in, ignoring case, from the PersonNameIndex if there is one, else the
+           database.
+        '''
+        
+        # return reference
+        list_OUT = None
+        
+        # declare variables
+        name_index = None
+        person_id_set = None
+        
+        # got an index?
+        name_index = self.get_person_name_index()
+        if ( name_index is not None ):
+        
+            # yes - use it.
+            person_id_set = name_index.look_up_full_name_string( full_name_string_IN )
+            list_OUT = list( Person.objects.filter( id__in = person_id_set ).order_by( "id" ) )
+        
+        else:
+        
+            # no - database.
+            list_OUT = list( Person.objects.filter( full_name_string__iexact = full_name_string_IN ) )
+        
+        #-- END check to see if name index --#
+        
+        return list_OUT
+
+    #-- END method lookup_person_list_for_full_name_string() --#
+
+
+    def lookup_person_list_for_name( self, full_name_IN, do_strict_match_IN = False ):
+
+        '''
+        Wrapper around Person.look_up_person_from_name() (matching on the
+           name key columns if get_use_name_keys()) that uses this instance's
+           PersonNameIndex if there is one.  Returns a list of the matching
+           Persons.
+        '''
+        
+        # return reference
+        list_OUT = None
+        
+        # declare variables
+        name_index = None
+        
+        # got an index?
+        name_index = self.get_person_name_index()
+        if ( name_index is not None ):
+        
+            # yes - use it.
+            list_OUT = name_index.look_up_person_from_name( full_name_IN, do_strict_match_IN = do_strict_match_IN )
+        
+        else:
+        
+            # no - database.
+            list_OUT = list( Person.look_up_person_from_name( full_name_IN, do_strict_match_IN = do_strict_match_IN, use_name_keys_IN = self.get_use_name_keys() ) )
+        
+        #-- END check to see if name index --#
+        
+        return list_OUT
+
+    #-- END method lookup_person_list_for_name() --#
+
+
+    def make_mention_find_string( self, mention_string_IN, mention_suffix_IN = "" ):
+
+        '''
+        Accepts mention string and optional suffix (text right after the
+           mention).  Returns the string process_mention() looks for in the
+           article text - the mention plus its suffix, if there is one (to
+           make sure we get the right "he", for example).
+        '''
+
+        # return reference
+        string_OUT = ""
+
+        string_OUT = mention_string_IN.strip()
+
+        # add suffix if present.
+        if ( ( mention_suffix_IN is not None ) and ( mention_suffix_IN != "" ) ):
+
+            # strip suffix, then add space between it and string just to make
+            #    sure there is only one space.
+            string_OUT += " " + mention_suffix_IN.strip()
+
+        #-- END check to see if suffix passed in. --#
+
+        return string_OUT
+
+    #-- END method make_mention_find_string() --#
+
+
     def output_debug( self, message_IN, method_IN = "", indent_with_IN = "", logger_name_IN = "", do_print_IN = False, resource_string_IN = None  ):
         
         '''
@@ -1815,6 +2352,57 @@ class ArticleCoder( BasicRateLimited ):
     #-- END method output_debug() --#
 
 
+    def preload_person_confidence_index( self, uuid_list_IN = None, newspaper_id_IN = None, person_id_list_IN = None ):
+
+        '''
+        Accepts list of external UUIDs and a newspaper ID for people about to
+           be looked up in one article, and optional list of IDs of people
+           likely to be matched.  Replaces this instance's
+           PersonConfidenceIndex with a new one, so each article sees rows
+           other coders wrote since the last one, then loads the
+           Person_External_UUID rows for the UUIDs and the Person_Newspaper
+           rows linking the newspaper to the people who have those UUIDs or
+           are in person_id_list_IN, so lookup_calc_confidence() doesn't query
+           for them.  Anyone else is loaded when scored.  Call
+           set_person_confidence_index( None ) when done with the article.
+           Returns the index.
+        '''
+
+        # return reference
+        index_OUT = None
+
+        # declare variables
+        person_id_set = None
+        current_uuid = None
+        person_id_list = None
+
+        index_OUT = self.set_person_confidence_index( PersonConfidenceIndex() )
+        index_OUT.load( uuid_list_IN )
+
+        # newspaper - just for the people who hold the UUIDs, plus any passed in.
+        if ( newspaper_id_IN is not None ):
+
+            person_id_set = set( person_id_list_IN or [] )
+            for current_uuid in ( uuid_list_IN or [] ):
+
+                person_id_list = index_OUT.get_person_id_list_for_uuid( current_uuid )
+                if ( person_id_list is not None ):
+
+                    person_id_set.update( person_id_list )
+
+                #-- END check to see if UUID loaded --#
+
+            #-- END loop over UUIDs --#
+
+            index_OUT.load( person_newspaper_pair_list_IN = [ ( current_person_id, newspaper_id_IN ) for current_person_id in person_id_set ] )
+
+        #-- END check to see if newspaper --#
+
+        return index_OUT
+
+    #-- END method preload_person_confidence_index() --#
+
+
     @abstractmethod
     def process_article( self, article_IN, coding_user_IN = None, *args, **kwargs ):
 
@@ -1935,7 +2523,9 @@ class ArticleCoder( BasicRateLimited ):
         # declare variables - mention details and lookup
         mention_string = ""
         mention_length = ""
+        my_coding_context = None
         mention_qs = None
+        mention_list = None
         mention_count = -1
         current_mention = None
         
@@ -2017,12 +2607,22 @@ class ArticleCoder( BasicRateLimited ):
                 if ( article_IN is not None ):
 
                     # is this mention already stored?
+                    my_coding_context = self.get_coding_context( article_IN )
+                    if ( my_coding_context is not None ):
+                    
+                        # look in mentions loaded for the article.
+                        mention_list = my_coding_context.get_mention_list( article_subject_IN, mention_string )
+                        mention_count = len( mention_list )
+                        
+                    else:
                     
-                    # Filter on value.
-                    mention_qs = article_subject_IN.article_subject_mention_set.filter( value = mention_string )
+                        # Filter on value.
+                        mention_qs = article_subject_IN.article_subject_mention_set.filter( value = mention_string )
+                        mention_count = mention_qs.count()
+                        
+                    #-- END check to see if coding context --#
                                     
                     # got one?
-                    mention_count = mention_qs.count()
                     if ( mention_count == 0 ):
                                     
                         # no.  Create one.
@@ -2039,20 +2639,11 @@ class ArticleCoder( BasicRateLimited ):
                         #    of the article.
                         
                         # get article text for article.
-                        article_text = article_IN.article_text_set.get()
+                        article_text = self.get_article_text( article_IN )
                         
                         # then, call find_in_text (FIT) method on mention plus suffix (to
                         #    make sure we get the right "he", for example).
-                        find_string = mention_string
-
-                        # add suffix if present.
-                        if ( ( mention_suffix is not None ) and ( mention_suffix != "" ) ):
-                            
-                            # strip suffix, then add space between it and string
-                            #    just to make sure there is only one space.
-                            find_string += " " + mention_suffix.strip()
-
-                        #-- END check to see if suffix passed in. --#
+                        find_string = self.make_mention_find_string( mention_string, mention_suffix )
 
                         # find in text!
                         mention_FIT_values = article_text.find_in_text( find_string )
@@ -2405,17 +2996,61 @@ class ArticleCoder( BasicRateLimited ):
                             
                         #-- END check to see if notes. --#
                                     
-                        # save the quotation instance.
-                        current_mention.save()
+                        # save the mention instance (with the rest of the
+                        #     article's new rows, if coding context).
+                        if ( my_coding_context is not None ):
+                        
+                            my_coding_context.add_mention( current_mention )
+                            
+                        else:
+                        
+                            current_mention.save()
+                            
+                        #-- END check to see if coding context --#
                         
                         # and return it.
                         instance_OUT = current_mention
                         
+                    elif ( ( mention_count == 1 ) and ( my_coding_context is not None ) ):
+                    
+                        # already got one.  Return it.
+                        instance_OUT = mention_list[ 0 ]
+                    
                     elif ( mention_count == 1 ):
                     
                         # already got one.  Return it.
                         instance_OUT = mention_qs.get()
                     
+                    elif ( ( mention_count > 1 ) and ( my_coding_context is not None ) ):
+                    
+                        # trouble - more than one mention matches.  Output message, return the first.
+                        debug_message = "WARNING - more than one mention matches \"" + mention_string + "\".  Returning the first match."
+                        self.output_debug( debug_message, me )
+
+                        # grab first match.
+                        mention_list.sort( key = lambda mention : ( mention.value_index is None, mention.value_index ) )
+                        instance_OUT = mention_list[ 0 ]
+
+                        # if prefix or suffix, see if they narrow to 1.
+                        if ( ( mention_prefix is not None ) and ( mention_prefix != "" ) ):
+
+                            mention_list = [ mention for mention in mention_list if mention.context_before == mention_prefix ]
+
+                        #-- END check to see if prefix. --#
+
+                        if ( ( mention_suffix is not None ) and ( mention_suffix != "" ) ):
+
+                            mention_list = [ mention for mention in mention_list if mention.context_after == mention_suffix ]
+
+                        #-- END check to see if suffix. --#
+
+                        # down to 1?
+                        if ( len( mention_list ) == 1 ):
+
+                            instance_OUT = mention_list[ 0 ]
+
+                        #-- END check to see if we've narrowed it to 1.
+                    
                     elif ( mention_count > 1 ):
                     
                         # trouble - more than one mention matches.  Output message, return the first.
@@ -3109,7 +3744,9 @@ class ArticleCoder( BasicRateLimited ):
         # declare variables - quotation details and lookup.
         quotation_string = ""
         quotation_length = ""
+        my_coding_context = None
         quotation_qs = None
+        quotation_list = None
         quotation_count = -1
         current_quotation = None
         original_quotation_string = ""
@@ -3158,11 +3795,22 @@ class ArticleCoder( BasicRateLimited ):
 
                     # need to see if this quotation has already been stored.
 
-                    # Filter on value in related Article_Subject_Quotation instances.
-                    quotation_qs = article_subject_IN.article_subject_quotation_set.filter( value = quotation_string )
+                    my_coding_context = self.get_coding_context( article_IN )
+                    if ( my_coding_context is not None ):
+                    
+                        # look in quotations loaded for the article.
+                        quotation_list = my_coding_context.get_quotation_list( article_subject_IN, quotation_string )
+                        quotation_count = len( quotation_list )
+                        
+                    else:
+                    
+                        # Filter on value in related Article_Subject_Quotation instances.
+                        quotation_qs = article_subject_IN.article_subject_quotation_set.filter( value = quotation_string )
+                        quotation_count = quotation_qs.count()
+                        
+                    #-- END check to see if coding context --#
                                     
                     # got one?
-                    quotation_count = quotation_qs.count()
                     if ( quotation_count == 0 ):
                                     
                         # no.  Create one.
@@ -3182,7 +3830,7 @@ class ArticleCoder( BasicRateLimited ):
                         #    of the article.
                         
                         # get article text for article.
-                        article_text = article_IN.article_text_set.get()
+                        article_text = self.get_article_text( article_IN )
                         
                         # then, call find_in_text (FIT) method.  When we deal with words, we
                         #    split on spaces.  Because of this, "words" must include the
@@ -3421,12 +4069,26 @@ class ArticleCoder( BasicRateLimited ):
                         #article_subject.attribution_speaker_name_index_range = ""
                         #article_subject.attribution_speaker_name_word_range = ""
                         
-                        # save the quotation instance.
-                        current_quotation.save()
+                        # save the quotation instance (with the rest of the
+                        #     article's new rows, if coding context).
+                        if ( my_coding_context is not None ):
+                        
+                            my_coding_context.add_quotation( current_quotation )
+                            
+                        else:
+                        
+                            current_quotation.save()
+                            
+                        #-- END check to see if coding context --#
                         
                         # and return it.
                         instance_OUT = current_quotation
                         
+                    elif ( ( quotation_count == 1 ) and ( my_coding_context is not None ) ):
+                    
+                        # already got one.  Return it.
+                        instance_OUT = quotation_list[ 0 ]
+                    
                     elif ( quotation_count == 1 ):
                     
                         # already got one.  Return it.
@@ -3746,6 +4408,54 @@ class ArticleCoder( BasicRateLimited ):
     #-- END set_exception_helper() --#
 
 
+    def set_person_confidence_index( self, value_IN ):
+
+        '''
+        Accepts a PersonConfidenceIndex (or None to load for each call), stores
+           it, returns it.
+        '''
+        
+        # store value.
+        self.person_confidence_index = value_IN
+        
+        return self.get_person_confidence_index()
+
+    #-- END set_person_confidence_index() --#
+
+
+    def set_person_name_index( self, value_IN ):
+
+        '''
+        Accepts a PersonNameIndex (or None to go back to database lookups),
+           stores it, returns it.
+        '''
+        
+        # store value.
+        self.person_name_index = value_IN
+        
+        return self.get_person_name_index()
+
+    #-- END set_person_name_index() --#
+
+
+    def set_use_name_keys( self, value_IN ):
+
+        '''
+        Accepts boolean.  If True, every person lookup in lookup_person()
+           matches names on Person's name key columns (ignoring case, accents,
+           and punctuation); if False, name parts are compared with
+           "__iexact".  Set before calling init_person_name_index().  Stores
+           the value, returns it.
+        '''
+        
+        # store value.
+        self.use_name_keys = value_IN
+        
+        return self.get_use_name_keys()
+
+    #-- END set_use_name_keys() --#
+
+
     def update_config_properties( self, props_IN ):
         
         # declare variables
@@ -3848,6 +4558,13 @@ class ArticleCoder( BasicRateLimited ):
                 # Call Person.associate_newspaper - it handles checking to see if
                 #    association is already present.
                 person_OUT.associate_newspaper( newspaper_IN, newspaper_notes_IN )
+                
+                # keep confidence index current.
+                if ( self.person_confidence_index is not None ):
+                
+                    self.person_confidence_index.add_newspaper( person_OUT.id, newspaper_IN.id )
+                    
+                #-- END check to see if confidence index --#
             
             #-- END check to see if newspaper_IN present --#
             
@@ -3860,6 +4577,13 @@ class ArticleCoder( BasicRateLimited ):
                 # we do.  Call Person.associate_external_uuid() - it handles
                 #    checking if association is already present.
                 person_OUT.associate_external_uuid( external_uuid_IN, external_uuid_source_IN, external_uuid_name_IN, external_uuid_notes_IN )
+                
+                # keep confidence index current.
+                if ( self.person_confidence_index is not None ):
+                
+                    self.person_confidence_index.add_external_uuid( person_OUT.id, external_uuid_IN )
+                    
+                #-- END check to see if confidence index --#
             
             #-- END check to see if external UUID --#
 
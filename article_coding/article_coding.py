@@ -41,12 +41,18 @@ How to add a new ArticleCoder implementation:
 
 
 # python base imports
+import concurrent.futures
 #from datetime import date
 from datetime import datetime
 import logging
+import multiprocessing
 import operator
+import threading
+import time
 
 # django database classes
+from django.db import connection
+from django.db import connections
 from django.db.models import Q
 
 # python_utilities
@@ -68,6 +74,163 @@ from context_text.article_coding.open_calais_v2.open_calais_v2_article_coder imp
 from context_text.shared.context_text_base import ContextTextBase
 
 
+#===============================================================================
+# functions
+#===============================================================================
+
+
+def code_article_id_list_worker( param_dict_IN, article_id_list_IN, rate_limiter_IN ):
+
+    '''
+    Worker for ArticleCoding.code_article_data_parallel().  Must be a module-level
+        function so it can be pickled for process pools.  Accepts the
+        ArticleCoding parameter dictionary, a list of article IDs, and a
+        SharedRateLimiter.  Creates its own ArticleCoding and ArticleCoder,
+        codes each article, and returns a dictionary with the list of
+        ( article_id, status ) tuples and counters.  Once the rate limiter's
+        daily limit is reached, stops coding, and gives each article it did
+        not code the status STATUS_DAILY_LIMIT_REACHED.  Closes this worker's
+        database connection when done.
+    '''
+    
+    # return reference
+    result_OUT = {}
+    
+    # declare variables
+    me = "code_article_id_list_worker"
+    my_logger = None
+    my_article_coding = None
+    article_coder = None
+    article_status_list = []
+    article_counter = 0
+    error_counter = 0
+    exception_counter = 0
+    daily_limit_counter = 0
+    continue_work = True
+    current_article_id = -1
+    current_article = None
+    current_status = ""
+    exception_message = ""
+    response_cache_hit_count = 0
+    response_cache_miss_count = 0
+    
+    # set up coding instance from parameters.
+    my_article_coding = ArticleCoding()
+    my_article_coding.store_parameters( param_dict_IN )
+    my_logger = my_article_coding.get_logger()
+    
+    try:
+
+        # create and initialize coder.
+        article_coder = my_article_coding.get_coder_instance()
+        article_coder.initialize_from_params( param_dict_IN )
+        
+        # name matching rule, and preload Person name index?
+        my_article_coding.init_coder_person_lookup( article_coder )
+        
+        # loop over IDs.
+        for current_article_id in article_id_list_IN:
+        
+            # not coded unless we get past the daily limit check.
+            current_status = ArticleCoding.STATUS_DAILY_LIMIT_REACHED
+            
+            # OK to continue work?
+            if ( continue_work == True ):
+
+                # per-article exception handling, same as code_article_data().
+                try:
+                
+                    # load article
+                    current_article = Article.objects.get( pk = current_article_id )
+                    
+                    # wait for rate limiter (unless response is cached) - also
+                    #     tells us if the daily limit has been reached.
+                    if ( article_coder.is_article_response_cached( current_article ) == False ):
+                    
+                        continue_work = rate_limiter_IN.start_request()
+                        
+                    #-- END check to see if response cached --#
+    
+                    # still OK?
+                    if ( continue_work == True ):
+                    
+                        # increment article counter
+                        article_counter += 1
+                        
+                        my_logger.info( "In " + me + "(): ==> article " + str( article_counter ) + " of " + str( len( article_id_list_IN ) ) + ": " + str( current_article_id ) + " - " + current_article.headline )
+                        
+                        # code the article.
+                        current_status = article_coder.code_article( current_article )
+                        
+                        # success?
+                        if ( current_status != ArticleCoder.STATUS_SUCCESS ):
+                        
+                            # nope.  Error.
+                            error_counter += 1
+                            
+                        #-- END check to see if success --#
+                        
+                    else:
+                    
+                        my_logger.warning( "In " + me + "(): daily request limit reached - not coding article " + str( current_article_id ) + " or the " + str( len( article_id_list_IN ) - len( article_status_list ) - 1 ) + " after it." )
+                        
+                    #-- END check to see if daily limit reached --#
+                    
+                except Exception as e:
+                
+                    # increment exception_counter
+                    exception_counter += 1
+                    
+                    # log exception, no email or anything.
+                    exception_message = "Exception caught for article " + str( current_article_id )
+                    my_article_coding.get_exception_helper().process_exception( e, exception_message )
+                    current_status = "======> " + exception_message + " - " + str( e )
+                    
+                #-- END exception handling around individual article processing. --#
+                
+            #-- END check to see if OK to continue --#
+            
+            # not coded?
+            if ( current_status == ArticleCoding.STATUS_DAILY_LIMIT_REACHED ):
+            
+                daily_limit_counter += 1
+                
+            #-- END check to see if not coded because of daily limit --#
+            
+            # store status for merge in parent.
+            article_status_list.append( ( current_article_id, current_status ) )
+            
+        #-- END loop over article IDs --#
+        
+    finally:
+    
+        # close this worker's database connection.
+        connection.close()
+        
+    #-- END try...finally around coding --#
+    
+    # response cache counts
+    if ( ( article_coder is not None ) and ( article_coder.response_cache is not None ) ):
+    
+        response_cache_hit_count = article_coder.response_cache.hit_count
+        response_cache_miss_count = article_coder.response_cache.miss_count
+        
+    #-- END check to see if response cache --#
+    
+    # build result
+    result_OUT[ ArticleCoding.WORKER_RESULT_ARTICLE_STATUS_LIST ] = article_status_list
+    result_OUT[ ArticleCoding.WORKER_RESULT_ARTICLE_COUNTER ] = article_counter
+    result_OUT[ ArticleCoding.WORKER_RESULT_ERROR_COUNTER ] = error_counter
+    result_OUT[ ArticleCoding.WORKER_RESULT_EXCEPTION_COUNTER ] = exception_counter
+    result_OUT[ ArticleCoding.WORKER_RESULT_DAILY_LIMIT_COUNTER ] = daily_limit_counter
+    result_OUT[ ArticleCoding.WORKER_RESULT_RESPONSE_CACHE_HIT_COUNTER ] = response_cache_hit_count
+    result_OUT[ ArticleCoding.WORKER_RESULT_RESPONSE_CACHE_MISS_COUNTER ] = response_cache_miss_count
+    
+    return result_OUT
+
+#-- END function code_article_id_list_worker() --#
+
+
 #===============================================================================
 # classes (in alphabetical order by name)
 #===============================================================================
@@ -91,6 +254,10 @@ class ArticleCoding( ContextTextBase ):
 
     # parameters that are unique to this class.
     PARAM_CODER_TYPE = 'coder_type'   # type of coder we want to use, in case there are multiple implementations.
+    PARAM_WORKER_POOL_TYPE = 'worker_pool_type'   # type of worker pool to code articles in parallel - "none", "thread", "process", or "pipeline".
+    PARAM_WORKER_COUNT = 'worker_count'   # number of workers to shard the article ID list across.
+    PARAM_USE_PERSON_NAME_INDEX = ArticleCoder.PARAM_USE_PERSON_NAME_INDEX   # "yes" to preload an in-memory Person name index for the run (ignored by parallel coding with more than one worker).
+    PARAM_USE_NAME_KEYS = ArticleCoder.PARAM_USE_NAME_KEYS   # "yes" to match person names on Person's name key columns (ignoring accents and punctuation) rather than "__iexact".
 
     # constants for parsing date range string - moved to parent
     #PARAM_DATE_RANGE_ITEM_SEPARATOR = '||'
@@ -114,6 +281,10 @@ class ArticleCoding( ContextTextBase ):
         ContextTextBase.PARAM_UNIQUE_ID_LIST : ParamContainer.PARAM_TYPE_STRING,
         ContextTextBase.PARAM_ARTICLE_ID_LIST : ParamContainer.PARAM_TYPE_STRING,
         PARAM_CODER_TYPE : ParamContainer.PARAM_TYPE_STRING,
+        PARAM_WORKER_POOL_TYPE : ParamContainer.PARAM_TYPE_STRING,
+        PARAM_WORKER_COUNT : ParamContainer.PARAM_TYPE_INT,
+        PARAM_USE_PERSON_NAME_INDEX : ParamContainer.PARAM_TYPE_STRING,
+        PARAM_USE_NAME_KEYS : ParamContainer.PARAM_TYPE_STRING,
     }
 
     # variables for choosing yes or no.
@@ -133,6 +304,29 @@ class ArticleCoding( ContextTextBase ):
     ARTICLE_CODING_IMPL_CHOICES_LIST = [ ARTICLE_CODING_IMPL_OPEN_CALAIS_API_V1, ARTICLE_CODING_IMPL_OPEN_CALAIS_API_V2 ]
     ARTICLE_CODING_IMPL_DEFAULT = ARTICLE_CODING_IMPL_OPEN_CALAIS_API_V2
 
+    # worker pool types - "thread" is for I/O-bound coders (OpenCalais), 
+    #     "process" for coders that are CPU-bound, "pipeline" for one coder
+    #     that keeps several requests to its service in flight.
+    WORKER_POOL_TYPE_NONE = "none"
+    WORKER_POOL_TYPE_THREAD = "thread"
+    WORKER_POOL_TYPE_PROCESS = "process"
+    WORKER_POOL_TYPE_PIPELINE = "pipeline"
+    WORKER_POOL_TYPE_CHOICES_LIST = [ WORKER_POOL_TYPE_NONE, WORKER_POOL_TYPE_THREAD, WORKER_POOL_TYPE_PROCESS, WORKER_POOL_TYPE_PIPELINE ]
+    WORKER_POOL_TYPE_DEFAULT = WORKER_POOL_TYPE_NONE
+    WORKER_COUNT_DEFAULT = 4
+
+    # status for articles not coded because the daily request limit was reached.
+    STATUS_DAILY_LIMIT_REACHED = ArticleCoder.STATUS_ERROR_PREFIX + "daily request limit reached - article not coded."
+
+    # worker result dictionary keys
+    WORKER_RESULT_ARTICLE_STATUS_LIST = "article_status_list"
+    WORKER_RESULT_ARTICLE_COUNTER = "article_counter"
+    WORKER_RESULT_ERROR_COUNTER = "error_counter"
+    WORKER_RESULT_EXCEPTION_COUNTER = "exception_counter"
+    WORKER_RESULT_DAILY_LIMIT_COUNTER = "daily_limit_counter"
+    WORKER_RESULT_RESPONSE_CACHE_HIT_COUNTER = "response_cache_hit_counter"
+    WORKER_RESULT_RESPONSE_CACHE_MISS_COUNTER = "response_cache_miss_counter"
+
 
     #---------------------------------------------------------------------------
     # NOT Instance variables
@@ -188,6 +382,22 @@ class ArticleCoding( ContextTextBase ):
     #---------------------------------------------------------------------------
 
 
+    def add_response_cache_summary( self, summary_helper_IN, hit_count_IN, miss_count_IN ):
+
+        '''
+        Accepts SummaryHelper and coder response cache hit and miss counts.
+           Adds the counts to the summary.
+        '''
+
+        summary_helper_IN.set_prop_value( "response_cache_hit_counter", hit_count_IN )
+        summary_helper_IN.set_prop_desc( "response_cache_hit_counter", "Response cache hits" )
+
+        summary_helper_IN.set_prop_value( "response_cache_miss_counter", miss_count_IN )
+        summary_helper_IN.set_prop_desc( "response_cache_miss_counter", "Response cache misses (service requests)" )
+
+    #-- END method add_response_cache_summary() --#
+
+
     def code_article_data( self, query_set_IN ):
 
         """
@@ -235,10 +445,12 @@ class ArticleCoding( ContextTextBase ):
         current_status = ""
         my_exception_helper = None
         exception_message = ""
+        worker_pool_type = None
         
         # rate-limiting variables
         am_i_rate_limited = False
         continue_work = True
+        is_response_cached = False
         
         # auditing variables
         article_counter = -1
@@ -257,6 +469,22 @@ class ArticleCoding( ContextTextBase ):
         # init rate-limiting
         am_i_rate_limited = self.do_manage_time
 
+        # parallel worker pool requested?
+        worker_pool_type = self.get_worker_pool_type()
+        if ( ( query_set_IN ) and ( worker_pool_type == self.WORKER_POOL_TYPE_PIPELINE ) ):
+        
+            # yes - one coder, requests pipelined.
+            status_OUT = self.code_article_data_pipelined( query_set_IN )
+            return status_OUT
+            
+        elif ( ( query_set_IN ) and ( worker_pool_type != self.WORKER_POOL_TYPE_NONE ) ):
+        
+            # yes - shard the articles across a pool of workers instead.
+            status_OUT = self.code_article_data_parallel( query_set_IN, pool_type_IN = worker_pool_type )
+            return status_OUT
+            
+        #-- END check to see if parallel worker pool. --#
+
         # do we have a query set?
         if ( query_set_IN ):
 
@@ -274,6 +502,11 @@ class ArticleCoding( ContextTextBase ):
             # use the dictionary from the param container to initialize.
             article_coder.initialize_from_params( param_dict )
 
+            # name matching rule, and preload Person name index?  Index is
+            #     built once here, then kept current by the coder as it
+            #     creates Persons.
+            self.init_coder_person_lookup( article_coder )
+
             # loop on the article list, passing each to the ArticleCoder for
             #    processing.
             article_counter = 0
@@ -288,9 +521,16 @@ class ArticleCoding( ContextTextBase ):
                     # increment article counter
                     article_counter += 1
                     
-                    # rate-limited?
+                    # rate-limited (and coder has to make a request)?
+                    is_response_cached = False
                     if ( am_i_rate_limited == True ):
                     
+                        is_response_cached = article_coder.is_article_response_cached( current_article )
+                        
+                    #-- END check to see if rate-limited --#
+                    
+                    if ( ( am_i_rate_limited == True ) and ( is_response_cached == False ) ):
+                    
                         # yes - start timer.
                         self.start_request()
                     
@@ -362,8 +602,8 @@ class ArticleCoding( ContextTextBase ):
 
                     #-- END exception handling around individual article processing. --#
                 
-                    # rate-limited?
-                    if ( am_i_rate_limited == True ):
+                    # rate-limited (and coder made a request)?
+                    if ( ( am_i_rate_limited == True ) and ( is_response_cached == False ) ):
                     
                         # yes - check if we may continue.
                         continue_work = self.may_i_continue()
@@ -405,6 +645,13 @@ class ArticleCoding( ContextTextBase ):
         my_summary_helper.set_prop_value( "exception_counter", exception_counter )
         my_summary_helper.set_prop_desc( "exception_counter", "Exception count" )
 
+        # response cache?
+        if ( ( article_coder is not None ) and ( article_coder.response_cache is not None ) ):
+        
+            self.add_response_cache_summary( my_summary_helper, article_coder.response_cache.hit_count, article_coder.response_cache.miss_count )
+            
+        #-- END check to see if response cache --#
+
         # output - set prefix if you want.
         summary_string += my_summary_helper.create_summary_string( item_prefix_IN = "==> " )
         my_logger.info( summary_string )
@@ -417,6 +664,432 @@ class ArticleCoding( ContextTextBase ):
     #-- END code_article_data() --#
 
 
+    def code_article_data_parallel( self, query_set_IN, pool_type_IN = None, worker_count_IN = None ):
+
+        """
+            Accepts query set of Articles, and optional worker pool type and
+               worker count (if not passed in, retrieved from parameters).
+               Retrieves the IDs of the articles in the QuerySet, splits them
+               into one shard per worker, then codes each shard in a separate
+               thread or process (pool type "thread" for I/O-bound coders like
+               OpenCalais, "process" for CPU-bound coders).  Each worker gets
+               its own ArticleCoder instance and its own database connection,
+               and all workers share a single rate limiter so the combined
+               request rate across workers still respects the coder's rate
+               limit, and the combined request count its daily limit - once
+               that is reached, workers stop, and the articles they did not
+               code get status STATUS_DAILY_LIMIT_REACHED.  The Person name index is turned off when there is
+               more than one worker (see get_worker_param_dict()).  Once all
+               workers are done, per-article statuses are
+               merged back into this instance using record_article_status(),
+               and counts are rolled up into the summary.
+
+            Parameters:
+            - query_set_IN - QuerySet of Articles we want to code.
+            - pool_type_IN - type of worker pool - one of WORKER_POOL_TYPE_THREAD or WORKER_POOL_TYPE_PROCESS.
+            - worker_count_IN - number of workers to use.
+
+            Returns:
+            - String - Status message.
+        """
+
+        # return reference
+        status_OUT = ''
+
+        # declare variables
+        me = "code_article_data_parallel"
+        my_logger = None
+        my_summary_helper = None
+        summary_string = ""
+        pool_type = None
+        worker_count = -1
+        param_dict = {}
+        article_coder = None
+        rate_limit_in_seconds = -1
+        rate_limit_daily_limit = -1
+        article_id_list = None
+        shard_list = None
+        my_manager = None
+        rate_limiter = None
+        executor_class = None
+        future_list = None
+        current_shard = None
+        current_future = None
+        worker_result = None
+        article_status_list = None
+        article_id = -1
+        article_status = ""
+        
+        # auditing variables
+        article_counter = 0
+        exception_counter = 0
+        error_counter = 0
+        response_cache_hit_counter = 0
+        response_cache_miss_counter = 0
+        daily_limit_counter = 0
+        
+        # grab a logger.
+        my_logger = self.get_logger()
+        
+        # initialize summary helper
+        my_summary_helper = SummaryHelper()
+        
+        # pool type
+        pool_type = pool_type_IN
+        if ( pool_type is None ):
+        
+            pool_type = self.get_worker_pool_type()
+            
+        #-- END check to see if pool type passed in --#
+
+        # worker count
+        worker_count = worker_count_IN
+        if ( worker_count is None ):
+        
+            worker_count = self.get_worker_count()
+            
+        #-- END check to see if worker count passed in --#
+
+        # create a coder to set up rate limiting in this instance.
+        article_coder = self.get_coder_instance()
+        if ( self.do_manage_time == True ):
+        
+            rate_limit_in_seconds = self.rate_limit_in_seconds
+            rate_limit_daily_limit = article_coder.rate_limit_daily_limit
+            
+        #-- END check to see if rate-limited --#
+
+        # get article IDs, split into shards.
+        article_id_list = list( query_set_IN.values_list( "id", flat = True ) )
+        shard_list = self.shard_article_id_list( article_id_list, worker_count )
+        
+        # Get parameters from parent parameter container, for workers.
+        param_dict = self.get_worker_param_dict( len( shard_list ) )
+        
+        my_logger.info( "In " + me + "(): coding " + str( len( article_id_list ) ) + " articles in " + str( len( shard_list ) ) + " shards using worker pool type \"" + str( pool_type ) + "\"." )
+        
+        # set up pool and shared rate limiter.
+        if ( pool_type == self.WORKER_POOL_TYPE_PROCESS ):
+        
+            # processes - rate limiter state lives in a manager process, so it
+            #     can be shared across worker processes.
+            my_manager = multiprocessing.Manager()
+            rate_limiter = SharedRateLimiter( rate_limit_in_seconds,
+                                              lock_IN = my_manager.Lock(),
+                                              next_start_time_IN = my_manager.Value( "d", 0.0 ),
+                                              daily_limit_IN = rate_limit_daily_limit,
+                                              request_count_IN = my_manager.Value( "i", 0 ) )
+            executor_class = concurrent.futures.ProcessPoolExecutor
+            
+            # close connections before fork so each worker opens its own.
+            connections.close_all()
+            
+        else:
+        
+            # threads - django gives each thread its own connection.
+            rate_limiter = SharedRateLimiter( rate_limit_in_seconds, daily_limit_IN = rate_limit_daily_limit )
+            executor_class = concurrent.futures.ThreadPoolExecutor
+            
+        #-- END check to see what type of pool. --#
+        
+        try:
+        
+            # run the shards.
+            with executor_class( max_workers = len( shard_list ) ) as executor:
+            
+                # submit
+                future_list = []
+                for current_shard in shard_list:
+                
+                    current_future = executor.submit( code_article_id_list_worker,
+                                                      param_dict,
+                                                      current_shard,
+                                                      rate_limiter )
+                    future_list.append( current_future )
+                    
+                #-- END loop over shards --#
+                
+                # merge results as they come in.
+                for current_future in concurrent.futures.as_completed( future_list ):
+                
+                    worker_result = current_future.result()
+                    
+                    # per-article statuses
+                    article_status_list = worker_result.get( self.WORKER_RESULT_ARTICLE_STATUS_LIST, [] )
+                    for article_id, article_status in article_status_list:
+                    
+                        self.record_article_status( article_id, article_status )
+                        
+                    #-- END loop over article statuses --#
+                    
+                    # counters
+                    article_counter += worker_result.get( self.WORKER_RESULT_ARTICLE_COUNTER, 0 )
+                    error_counter += worker_result.get( self.WORKER_RESULT_ERROR_COUNTER, 0 )
+                    exception_counter += worker_result.get( self.WORKER_RESULT_EXCEPTION_COUNTER, 0 )
+                    response_cache_hit_counter += worker_result.get( self.WORKER_RESULT_RESPONSE_CACHE_HIT_COUNTER, 0 )
+                    response_cache_miss_counter += worker_result.get( self.WORKER_RESULT_RESPONSE_CACHE_MISS_COUNTER, 0 )
+                    daily_limit_counter += worker_result.get( self.WORKER_RESULT_DAILY_LIMIT_COUNTER, 0 )
+                    
+                #-- END loop over completed workers --#
+                
+            #-- END with executor --#
+            
+        finally:
+        
+            # shut down manager, if there is one.
+            if ( my_manager is not None ):
+            
+                my_manager.shutdown()
+                
+            #-- END check to see if manager --#
+            
+        #-- END try...finally around worker pool --#
+
+        # set stop time
+        my_summary_helper.set_stop_time()
+
+        # add stuff to summary
+        my_summary_helper.set_prop_value( "article_counter", article_counter )
+        my_summary_helper.set_prop_desc( "article_counter", "Articles processed" )
+
+        my_summary_helper.set_prop_value( "error_counter", error_counter )
+        my_summary_helper.set_prop_desc( "error_counter", "Error count" )
+
+        my_summary_helper.set_prop_value( "exception_counter", exception_counter )
+        my_summary_helper.set_prop_desc( "exception_counter", "Exception count" )
+
+        my_summary_helper.set_prop_value( "worker_pool_type", pool_type )
+        my_summary_helper.set_prop_desc( "worker_pool_type", "Worker pool type" )
+
+        my_summary_helper.set_prop_value( "worker_count", len( shard_list ) )
+        my_summary_helper.set_prop_desc( "worker_count", "Worker count" )
+
+        # daily limit?
+        if ( daily_limit_counter > 0 ):
+        
+            my_summary_helper.set_prop_value( "daily_limit_counter", daily_limit_counter )
+            my_summary_helper.set_prop_desc( "daily_limit_counter", "Not coded - daily request limit reached" )
+            
+        #-- END check to see if daily limit reached --#
+
+        # response cache?
+        if ( ( response_cache_hit_counter + response_cache_miss_counter ) > 0 ):
+        
+            self.add_response_cache_summary( my_summary_helper, response_cache_hit_counter, response_cache_miss_counter )
+            
+        #-- END check to see if response cache used --#
+
+        # output - set prefix if you want.
+        summary_string += my_summary_helper.create_summary_string( item_prefix_IN = "==> " )
+        my_logger.info( summary_string )
+        
+        # output summary string as status.
+        status_OUT += summary_string
+
+        return status_OUT
+
+    #-- END code_article_data_parallel() --#
+
+
+    def code_article_data_pipelined( self, query_set_IN ):
+
+        """
+            Accepts query set of Articles.  Codes them with a single
+               ArticleCoder, getting the articles from the coder's
+               iterate_articles_pipelined(), so a coder that calls a remote
+               service (OpenCalais) keeps up to its concurrent request limit of
+               requests in flight over one pooled session while the responses
+               that have come back are coded here.  Requests wait on a shared
+               rate limiter if the coder is rate-limited.  Like the worker
+               pools, stops sending requests at the coder's daily limit, and
+               records a daily limit status for each article not coded.
+
+            Parameters:
+            - query_set_IN - QuerySet of Articles we want to code.
+
+            Returns:
+            - String - Status message.
+        """
+
+        # return reference
+        status_OUT = ''
+
+        # declare variables
+        me = "code_article_data_pipelined"
+        logging_message = ""
+        my_logger = None
+        do_i_print_updates = False
+        my_summary_helper = None
+        summary_string = ""
+        article_coder = None
+        param_dict = {}
+        rate_limiter = None
+        coded_article_id_set = None
+        current_article = None
+        current_status = ""
+        my_exception_helper = None
+        exception_message = ""
+        article_id = -1
+        
+        # auditing variables
+        article_counter = 0
+        exception_counter = 0
+        error_counter = 0
+        daily_limit_counter = 0
+        
+        # grab a logger.
+        my_logger = self.get_logger()
+        
+        # do I print some status?
+        do_i_print_updates = self.do_print_updates
+        
+        # initialize summary helper
+        my_summary_helper = SummaryHelper()
+        
+        # create and initialize ArticleCoder instance.
+        article_coder = self.get_coder_instance()
+        param_dict = self.get_param_container().get_parameters()
+        article_coder.initialize_from_params( param_dict )
+
+        # name matching rule, and preload Person name index?
+        self.init_coder_person_lookup( article_coder )
+
+        # rate-limited?
+        if ( self.do_manage_time == True ):
+        
+            rate_limiter = SharedRateLimiter( self.rate_limit_in_seconds, daily_limit_IN = article_coder.rate_limit_daily_limit )
+            
+        #-- END check to see if rate-limited --#
+
+        # loop over articles as the coder hands them back.
+        coded_article_id_set = set()
+        for current_article in article_coder.iterate_articles_pipelined( query_set_IN, rate_limiter_IN = rate_limiter ):
+        
+            # increment article counter
+            article_counter += 1
+            coded_article_id_set.add( current_article.id )
+            
+            logging_message = "\n\n============================================================\n==> article " + str( article_counter ) + ": " + str( current_article.id ) + " - " + current_article.headline
+            my_logger.info( logging_message )
+            
+            # print?
+            if ( do_i_print_updates == True ):
+            
+                print( logging_message )
+                
+            #-- END check to see if we print a message.
+            
+            try:
+        
+                # code the article.
+                current_status = article_coder.code_article( current_article )
+                
+                # record status
+                self.record_article_status( current_article.id, current_status )
+                
+                # success?
+                if ( current_status != ArticleCoder.STATUS_SUCCESS ):
+                
+                    # nope.  Error.
+                    error_counter += 1
+                    
+                    logging_message = "======> In " + me + "(): ERROR - " + current_status + "; article = " + str( current_article )
+                    my_logger.debug( logging_message )
+                    
+                    # print?
+                    if ( do_i_print_updates == True ):
+                    
+                        print( logging_message )
+                        
+                    #-- END check to see if we print a message.
+                    
+                #-- END check to see if success --#
+                
+            except Exception as e:
+                
+                # increment exception_counter
+                exception_counter += 1
+                
+                # log exception, no email or anything.
+                my_exception_helper = self.get_exception_helper()
+                exception_message = "Exception caught for article " + str( current_article.id )
+                my_exception_helper.process_exception( e, exception_message )
+                
+                logging_message = "======> " + exception_message + " - " + str( e )
+                my_logger.debug( logging_message )
+                
+                # print?
+                if ( do_i_print_updates == True ):
+                
+                    print( logging_message )
+                    
+                #-- END check to see if we print a message.
+                
+                # record status
+                self.record_article_status( current_article.id, logging_message )
+
+            #-- END exception handling around individual article processing. --#
+            
+        #-- END loop over articles --#
+
+        # stopped at daily limit?  Record articles that weren't coded.
+        if ( ( rate_limiter is not None ) and ( rate_limiter.may_i_continue() == False ) ):
+        
+            for article_id in query_set_IN.values_list( "id", flat = True ):
+            
+                if ( article_id not in coded_article_id_set ):
+                
+                    self.record_article_status( article_id, self.STATUS_DAILY_LIMIT_REACHED )
+                    daily_limit_counter += 1
+                    
+                #-- END check to see if article coded --#
+                
+            #-- END loop over article IDs --#
+            
+        #-- END check to see if daily limit reached --#
+
+        # set stop time
+        my_summary_helper.set_stop_time()
+
+        # add stuff to summary
+        my_summary_helper.set_prop_value( "article_counter", article_counter )
+        my_summary_helper.set_prop_desc( "article_counter", "Articles processed" )
+
+        my_summary_helper.set_prop_value( "error_counter", error_counter )
+        my_summary_helper.set_prop_desc( "error_counter", "Error count" )
+
+        my_summary_helper.set_prop_value( "exception_counter", exception_counter )
+        my_summary_helper.set_prop_desc( "exception_counter", "Exception count" )
+
+        if ( daily_limit_counter > 0 ):
+        
+            my_summary_helper.set_prop_value( "daily_limit_counter", daily_limit_counter )
+            my_summary_helper.set_prop_desc( "daily_limit_counter", "Not coded - daily request limit reached" )
+            
+        #-- END check to see if daily limit reached --#
+
+        my_summary_helper.set_prop_value( "worker_pool_type", self.WORKER_POOL_TYPE_PIPELINE )
+        my_summary_helper.set_prop_desc( "worker_pool_type", "Worker pool type" )
+
+        # response cache?
+        if ( article_coder.response_cache is not None ):
+        
+            self.add_response_cache_summary( my_summary_helper, article_coder.response_cache.hit_count, article_coder.response_cache.miss_count )
+            
+        #-- END check to see if response cache --#
+
+        # output - set prefix if you want.
+        summary_string += my_summary_helper.create_summary_string( item_prefix_IN = "==> " )
+        my_logger.info( summary_string )
+        
+        # output summary string as status.
+        status_OUT += summary_string
+
+        return status_OUT
+
+    #-- END code_article_data_pipelined() --#
+
+
     def create_article_query_set( self, param_prefix_IN = '' ):
 
         # return reference
@@ -711,6 +1384,102 @@ class ArticleCoding( ContextTextBase ):
     #-- END method get_success_list() --#
     
 
+    def get_worker_param_dict( self, worker_count_IN ):
+        
+        '''
+        Accepts the number of workers code_article_data_parallel() will run.
+            Returns a copy of this instance's parameters for the workers.  If
+            more than one worker, turns off PARAM_USE_PERSON_NAME_INDEX - each
+            worker would build its own PersonNameIndex, and an index only
+            knows about the people its own worker creates, so two workers
+            coding the same new name would each create a Person for it.
+        '''
+        
+        # return reference
+        dict_OUT = None
+        
+        # declare variables
+        me = "get_worker_param_dict"
+        
+        dict_OUT = dict( self.get_param_container().get_parameters() )
+        if ( ( worker_count_IN > 1 ) and ( self.get_param_as_str( self.PARAM_USE_PERSON_NAME_INDEX, self.CHOICE_NO ) == self.CHOICE_YES ) ):
+        
+            self.get_logger().warning( "In " + me + "(): " + self.PARAM_USE_PERSON_NAME_INDEX + " ignored with " + str( worker_count_IN ) + " workers - workers' name indexes don't see each other's new people." )
+            dict_OUT[ self.PARAM_USE_PERSON_NAME_INDEX ] = self.CHOICE_NO
+            
+        #-- END check to see if name index with more than one worker --#
+        
+        return dict_OUT
+        
+    #-- END method get_worker_param_dict() --#
+    
+
+    def get_worker_count( self ):
+        
+        '''
+        Returns the number of workers to use for parallel coding, from
+            parameter PARAM_WORKER_COUNT.  If not set or invalid, returns
+            WORKER_COUNT_DEFAULT.
+        '''
+        
+        # return reference
+        value_OUT = -1
+        
+        # declare variables
+        worker_count_string = ""
+        
+        # get value
+        worker_count_string = self.get_param_as_str( self.PARAM_WORKER_COUNT, "" )
+        
+        try:
+        
+            value_OUT = int( worker_count_string )
+            
+        except ValueError:
+        
+            value_OUT = self.WORKER_COUNT_DEFAULT
+            
+        #-- END try to convert worker count to int --#
+        
+        # must be at least 1.
+        if ( value_OUT < 1 ):
+        
+            value_OUT = self.WORKER_COUNT_DEFAULT
+            
+        #-- END check to see if valid count --#
+        
+        return value_OUT
+        
+    #-- END method get_worker_count() --#
+    
+
+    def get_worker_pool_type( self ):
+        
+        '''
+        Returns the type of worker pool to use for coding, from parameter
+            PARAM_WORKER_POOL_TYPE.  If not set or unknown, returns
+            WORKER_POOL_TYPE_DEFAULT.
+        '''
+        
+        # return reference
+        value_OUT = None
+        
+        # get value
+        value_OUT = self.get_param_as_str( self.PARAM_WORKER_POOL_TYPE, self.WORKER_POOL_TYPE_DEFAULT )
+        
+        # known value?
+        if ( value_OUT not in self.WORKER_POOL_TYPE_CHOICES_LIST ):
+        
+            # no - use default.
+            value_OUT = self.WORKER_POOL_TYPE_DEFAULT
+            
+        #-- END check to see if known pool type --#
+        
+        return value_OUT
+        
+    #-- END method get_worker_pool_type() --#
+    
+
     def has_errors( self ):
         
         '''
@@ -745,6 +1514,35 @@ class ArticleCoding( ContextTextBase ):
     #-- END method has_errors() --#
     
 
+    def init_coder_person_lookup( self, article_coder_IN ):
+        
+        '''
+        Accepts ArticleCoder.  Sets how it matches person names from
+            PARAM_USE_NAME_KEYS, then, if PARAM_USE_PERSON_NAME_INDEX, builds
+            its PersonNameIndex (which matches the same way).  Returns the
+            coder.
+        '''
+        
+        # return reference
+        coder_OUT = None
+        
+        coder_OUT = article_coder_IN
+        
+        # name keys or "__iexact"?
+        coder_OUT.set_use_name_keys( self.get_param_as_str( self.PARAM_USE_NAME_KEYS, self.CHOICE_NO ) == self.CHOICE_YES )
+        
+        # preload Person name index?
+        if ( self.get_param_as_str( self.PARAM_USE_PERSON_NAME_INDEX, self.CHOICE_NO ) == self.CHOICE_YES ):
+        
+            coder_OUT.init_person_name_index()
+            
+        #-- END check to see if we use Person name index --#
+        
+        return coder_OUT
+        
+    #-- END method init_coder_person_lookup() --#
+    
+
     def record_article_status( self, article_id_IN, status_IN ):
     
         '''
@@ -863,4 +1661,239 @@ class ArticleCoding( ContextTextBase ):
     #-- END set_exception_helper() --#
 
 
-#-- END class ArticleCoding --#
\ No newline at end of file
+    def shard_article_id_list( self, article_id_list_IN, shard_count_IN ):
+        
+        '''
+        Accepts list of article IDs and number of shards.  Splits the list into
+            at most shard_count_IN lists, dealing IDs out round-robin so that
+            each shard gets a similar mix of older and newer articles.  Empty
+            shards are omitted.  Returns list of lists of IDs.
+        '''
+        
+        # return reference
+        shard_list_OUT = []
+        
+        # declare variables
+        shard_count = -1
+        shard_index = -1
+        
+        # make sure we have a valid shard count.
+        shard_count = shard_count_IN
+        if ( ( shard_count is None ) or ( shard_count < 1 ) ):
+        
+            shard_count = 1
+            
+        #-- END check to see if valid shard count --#
+        
+        # deal out IDs.
+        for shard_index in range( shard_count ):
+        
+            shard_list_OUT.append( article_id_list_IN[ shard_index : : shard_count ] )
+            
+        #-- END loop over shards --#
+        
+        # omit empty shards.
+        shard_list_OUT = [ current_shard for current_shard in shard_list_OUT if len( current_shard ) > 0 ]
+        
+        return shard_list_OUT
+        
+    #-- END method shard_article_id_list() --#
+
+
+#-- END class ArticleCoding --#
+
+
+class SharedRateLimiter( object ):
+    
+    '''
+    Rate limiter that can be shared by a pool of threads or processes.  Keeps
+        the time at which the next request may start in a shared value guarded
+        by a shared lock, so requests from all workers combined are spaced at
+        least rate_limit_in_seconds apart.  If a daily limit is set, also
+        counts requests started with start_request() in a shared value, and
+        refuses to start more once the combined count reaches the limit (a
+        coder's rate_limit_daily_limit, counted for this run, like
+        BasicRateLimited.may_i_continue() does for serial coding).  For
+        threads, the default lock and values are fine.  For processes, pass in
+        a Lock(), a Value( "d" ), and a Value( "i" ) from a
+        multiprocessing.Manager() so the instance can be pickled to workers.
+    '''
+
+
+    def __init__( self, rate_limit_in_seconds_IN, lock_IN = None, next_start_time_IN = None, daily_limit_IN = -1, request_count_IN = None ):
+
+        # declare variables
+        self.rate_limit_in_seconds = rate_limit_in_seconds_IN
+        self.lock = lock_IN
+        self.next_start_time = next_start_time_IN
+        self.daily_limit = daily_limit_IN
+        self.request_count = request_count_IN
+        
+        # defaults - thread-safe.
+        if ( self.lock is None ):
+        
+            self.lock = threading.Lock()
+            
+        #-- END check to see if lock passed in --#
+        
+        if ( self.next_start_time is None ):
+        
+            self.next_start_time = multiprocessing.Value( "d", 0.0, lock = False )
+            
+        #-- END check to see if shared value passed in --#
+
+        if ( self.request_count is None ):
+        
+            self.request_count = multiprocessing.Value( "i", 0, lock = False )
+            
+        #-- END check to see if shared count passed in --#
+
+    #-- END method __init__() --#
+
+
+    def is_daily_limit_reached( self ):
+        
+        '''
+        Returns True if a daily limit is set (greater than 0) and the requests
+            started with start_request() have reached it, False if not.
+        '''
+        
+        # return reference
+        is_reached_OUT = False
+        
+        if ( ( self.daily_limit is not None ) and ( self.daily_limit > 0 ) and ( self.request_count.value >= self.daily_limit ) ):
+        
+            is_reached_OUT = True
+            
+        #-- END check to see if daily limit reached --#
+        
+        return is_reached_OUT
+        
+    #-- END method is_daily_limit_reached() --#
+
+
+    def may_i_continue( self ):
+        
+        '''
+        Returns True if another request may be started, False if the daily
+            limit has been reached.  Same name and meaning as
+            BasicRateLimited.may_i_continue(), without the waiting.
+        '''
+        
+        # return reference
+        continue_OUT = True
+        
+        with self.lock:
+        
+            continue_OUT = ( self.is_daily_limit_reached() == False )
+            
+        #-- END with lock --#
+        
+        return continue_OUT
+        
+    #-- END method may_i_continue() --#
+
+
+    def reserve_slot( self ):
+        
+        '''
+        Call with lock held.  Reserves the next request slot.  Returns the
+            number of seconds until the slot starts (0.0 if not rate-limited,
+            or if the slot starts now).
+        '''
+        
+        # return reference
+        wait_seconds_OUT = 0.0
+        
+        # declare variables
+        current_time = None
+        slot_start_time = None
+        
+        # rate-limited?
+        if ( ( self.rate_limit_in_seconds is not None ) and ( self.rate_limit_in_seconds > 0 ) ):
+        
+            current_time = time.time()
+            slot_start_time = max( current_time, self.next_start_time.value )
+            self.next_start_time.value = slot_start_time + self.rate_limit_in_seconds
+            wait_seconds_OUT = slot_start_time - current_time
+            
+        #-- END check to see if rate-limited --#
+        
+        return wait_seconds_OUT
+        
+    #-- END method reserve_slot() --#
+
+
+    def start_request( self ):
+        
+        '''
+        If the daily limit has not been reached, counts a request, reserves
+            the next request slot, sleeps until that slot starts, and returns
+            True.  If the daily limit has been reached, returns False right
+            away - the caller should not make the request.
+        '''
+        
+        # return reference
+        may_start_OUT = False
+        
+        # declare variables
+        wait_seconds = 0.0
+        
+        # check limit, count, and reserve in one go, so workers can't
+        #     overshoot the limit between check and count.
+        with self.lock:
+        
+            if ( self.is_daily_limit_reached() == False ):
+            
+                self.request_count.value += 1
+                wait_seconds = self.reserve_slot()
+                may_start_OUT = True
+                
+            #-- END check to see if daily limit reached --#
+            
+        #-- END with lock --#
+        
+        # wait until our slot starts (outside lock, so others can reserve).
+        if ( wait_seconds > 0 ):
+        
+            time.sleep( wait_seconds )
+            
+        #-- END check to see if we need to wait --#
+        
+        return may_start_OUT
+        
+    #-- END method start_request() --#
+
+
+    def wait_for_turn( self ):
+        
+        '''
+        Reserves the next request slot, then sleeps until that slot starts.  If
+            rate limit is not set (less than or equal to 0), returns
+            immediately.  Does not count toward or check the daily limit (see
+            start_request()).  Returns number of seconds slept.
+        '''
+        
+        # return reference
+        wait_seconds_OUT = 0.0
+        
+        # reserve a slot.
+        with self.lock:
+        
+            wait_seconds_OUT = self.reserve_slot()
+            
+        #-- END with lock --#
+        
+        # wait until our slot starts (outside lock, so others can reserve).
+        if ( wait_seconds_OUT > 0 ):
+        
+            time.sleep( wait_seconds_OUT )
+            
+        #-- END check to see if we need to wait --#
+        
+        return wait_seconds_OUT
+        
+    #-- END method wait_for_turn() --#
+
+
+#-- END class SharedRateLimiter --#
@@ -0,0 +1,305 @@
+from __future__ import unicode_literals
+
+'''
+Copyright 2010-2016 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text.
+
+context_text is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text. If not, see http://www.gnu.org/licenses/.
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+# context_text imports
+from context_text.models import Article_Subject_Mention
+from context_text.models import Article_Subject_Quotation
+
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class ArticleCodingContext( object ):
+
+    '''
+    State for coding one article, created by ArticleCoder.code_article() before
+        it calls process_article() and flushed once process_article() returns:
+        - the article's Article_Text, loaded once rather than once per mention
+            and quotation.
+        - the Article_Subject_Mentions and Article_Subject_Quotations already
+            stored for the article, loaded with one query each and indexed by
+            Article_Subject ID plus ( value, context_before, context_after ),
+            by Article_Subject ID plus value, and (quotations) by Article_Subject
+            ID plus UUID, so duplicate checks are dictionary probes instead of
+            filter() and count() queries.
+        - new mentions and quotations, added to the indexes right away so later
+            duplicate checks see them, then saved together with bulk_create()
+            in flush().
+    Mentions and quotations that are not saved until flush() don't have an ID
+        before then.
+    '''
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+
+    # batch size for bulk_create()
+    BULK_CREATE_BATCH_SIZE = 500
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> class methods
+    #---------------------------------------------------------------------------
+
+
+    @classmethod
+    def make_context_key( cls, article_subject_id_IN, value_IN, context_before_IN = None, context_after_IN = None ):
+
+        '''
+        Accepts Article_Subject ID, value, and text before and after the value.
+            Returns key for the selected text index.
+        '''
+
+        return ( article_subject_id_IN, value_IN, context_before_IN, context_after_IN )
+
+    #-- END class method make_context_key() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> __init__() method
+    #---------------------------------------------------------------------------
+
+
+    def __init__( self, article_IN ):
+
+        # declare variables
+        self.article = article_IN
+        self.article_text = None
+
+        # mention indexes - lists of Article_Subject_Mentions.
+        self.mention_context_dict = {}
+        self.mention_value_dict = {}
+
+        # quotation indexes - lists of Article_Subject_Quotations.
+        self.quotation_context_dict = {}
+        self.quotation_value_dict = {}
+        self.quotation_uuid_dict = {}
+
+        # new rows, saved in flush().
+        self.pending_mention_list = []
+        self.pending_quotation_list = []
+
+        # load existing mentions and quotations.
+        self.load_selected_text()
+
+    #-- END method __init__() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def add_mention( self, mention_IN, is_new_IN = True ):
+
+        '''
+        Accepts Article_Subject_Mention.  Adds it to the mention indexes.  If
+            is_new_IN, also queues it to be saved in flush().
+        '''
+
+        self.add_to_index( mention_IN, self.mention_context_dict, self.mention_value_dict )
+        if ( is_new_IN == True ):
+
+            self.pending_mention_list.append( mention_IN )
+
+        #-- END check to see if new --#
+
+    #-- END method add_mention() --#
+
+
+    def add_quotation( self, quotation_IN, is_new_IN = True ):
+
+        '''
+        Accepts Article_Subject_Quotation.  Adds it to the quotation indexes.
+            If is_new_IN, also queues it to be saved in flush().
+        '''
+
+        # declare variables
+        uuid_key = None
+
+        self.add_to_index( quotation_IN, self.quotation_context_dict, self.quotation_value_dict )
+
+        # UUID
+        if ( quotation_IN.uuid is not None ):
+
+            uuid_key = ( quotation_IN.article_subject_id, quotation_IN.uuid )
+            self.quotation_uuid_dict.setdefault( uuid_key, [] ).append( quotation_IN )
+
+        #-- END check to see if UUID --#
+
+        if ( is_new_IN == True ):
+
+            self.pending_quotation_list.append( quotation_IN )
+
+        #-- END check to see if new --#
+
+    #-- END method add_quotation() --#
+
+
+    def add_to_index( self, selected_text_IN, context_dict_IN, value_dict_IN ):
+
+        '''
+        Accepts Abstract_Selected_Text child instance and the context and value
+            index dictionaries.  Adds the instance to both.
+        '''
+
+        # declare variables
+        context_key = None
+        value_key = None
+
+        context_key = self.make_context_key( selected_text_IN.article_subject_id,
+                                             selected_text_IN.value,
+                                             selected_text_IN.context_before,
+                                             selected_text_IN.context_after )
+        context_dict_IN.setdefault( context_key, [] ).append( selected_text_IN )
+
+        value_key = ( selected_text_IN.article_subject_id, selected_text_IN.value )
+        value_dict_IN.setdefault( value_key, [] ).append( selected_text_IN )
+
+    #-- END method add_to_index() --#
+
+
+    def flush( self ):
+
+        '''
+        Saves pending mentions and quotations with bulk_create(), then clears
+            the pending lists.  Returns count of rows saved.
+        '''
+
+        # return reference
+        count_OUT = 0
+
+        if ( len( self.pending_mention_list ) > 0 ):
+
+            Article_Subject_Mention.objects.bulk_create( self.pending_mention_list, batch_size = self.BULK_CREATE_BATCH_SIZE )
+            count_OUT += len( self.pending_mention_list )
+            self.pending_mention_list = []
+
+        #-- END check to see if pending mentions --#
+
+        if ( len( self.pending_quotation_list ) > 0 ):
+
+            Article_Subject_Quotation.objects.bulk_create( self.pending_quotation_list, batch_size = self.BULK_CREATE_BATCH_SIZE )
+            count_OUT += len( self.pending_quotation_list )
+            self.pending_quotation_list = []
+
+        #-- END check to see if pending quotations --#
+
+        return count_OUT
+
+    #-- END method flush() --#
+
+
+    def get_article_text( self ):
+
+        '''
+        Returns the article's Article_Text, loading it the first time.
+        '''
+
+        if ( self.article_text is None ):
+
+            self.article_text = self.article.article_text_set.get()
+
+        #-- END check to see if loaded --#
+
+        return self.article_text
+
+    #-- END method get_article_text() --#
+
+
+    def get_mention_list( self, article_subject_IN, value_IN, context_before_IN = None, context_after_IN = None, match_context_IN = False ):
+
+        '''
+        Accepts Article_Subject and mention value, and optional text before and
+            after.  If match_context_IN, returns list of the subject's mentions
+            with that value and context, else list of the subject's mentions
+            with that value.  Returns empty list if none.
+        '''
+
+        # return reference
+        list_OUT = None
+
+        if ( match_context_IN == True ):
+
+            list_OUT = self.mention_context_dict.get( self.make_context_key( article_subject_IN.id, value_IN, context_before_IN, context_after_IN ), [] )
+
+        else:
+
+            list_OUT = self.mention_value_dict.get( ( article_subject_IN.id, value_IN ), [] )
+
+        #-- END check to see how we look up --#
+
+        return list( list_OUT )
+
+    #-- END method get_mention_list() --#
+
+
+    def get_quotation_list( self, article_subject_IN, value_IN ):
+
+        '''
+        Accepts Article_Subject and quotation value.  Returns list of the
+            subject's quotations with that value (empty if none).
+        '''
+
+        return list( self.quotation_value_dict.get( ( article_subject_IN.id, value_IN ), [] ) )
+
+    #-- END method get_quotation_list() --#
+
+
+    def get_quotation_list_for_uuid( self, article_subject_IN, uuid_IN ):
+
+        '''
+        Accepts Article_Subject and quotation UUID.  Returns list of the
+            subject's quotations with that UUID (empty if none).
+        '''
+
+        return list( self.quotation_uuid_dict.get( ( article_subject_IN.id, uuid_IN ), [] ) )
+
+    #-- END method get_quotation_list_for_uuid() --#
+
+
+    def load_selected_text( self ):
+
+        '''
+        Loads the mentions and quotations already stored for the article's
+            Article_Subjects (one query each) into the indexes.
+        '''
+
+        # declare variables
+        current_mention = None
+        current_quotation = None
+
+        for current_mention in Article_Subject_Mention.objects.filter( article_subject__article_data__article_id = self.article.id ).order_by( "value_index", "id" ):
+
+            self.add_mention( current_mention, is_new_IN = False )
+
+        #-- END loop over existing mentions --#
+
+        for current_quotation in Article_Subject_Quotation.objects.filter( article_subject__article_data__article_id = self.article.id ).order_by( "value_index", "id" ):
+
+            self.add_quotation( current_quotation, is_new_IN = False )
+
+        #-- END loop over existing quotations --#
+
+    #-- END method load_selected_text() --#
+
+
+#-- END class ArticleCodingContext --#
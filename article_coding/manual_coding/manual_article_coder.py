@@ -60,6 +60,7 @@ from context.shared.person_details import PersonDetails
 from context_text.models import Alternate_Subject_Match
 from context_text.models import Article_Author
 from context_text.models import Article_Data
+from context_text.models import Article_Data_Network_Tie
 from context_text.models import Article_Data_Notes
 from context_text.models import Article_Subject
 from context_text.models import Article_Subject_Mention
@@ -526,6 +527,61 @@ class ManualArticleCoder( ArticleCoder ):
     #============================================================================
 
 
+    def get_data_store_find_string_list( self, person_list_IN, compact_white_space_IN = False ):
+
+        '''
+        Accepts list of people from data store JSON, and flag that says if
+           white space is compacted.  Returns list of the strings that will
+           be looked for in the article text when the subjects and sources
+           are processed - each one's name, and each source's quote text.
+        '''
+
+        # return reference
+        list_OUT = []
+
+        # declare variables
+        current_person = None
+        person_type = None
+        current_string = None
+
+        for current_person in person_list_IN:
+
+            # skip empty entries, and authors.
+            if ( current_person is not None ):
+
+                person_type = current_person.get( self.DATA_STORE_PROP_PERSON_TYPE )
+                if ( ( person_type == self.PERSON_TYPE_SUBJECT ) or ( person_type == self.PERSON_TYPE_SOURCE ) ):
+
+                    # name, then quote text.
+                    for current_string in [ current_person.get( self.DATA_STORE_PROP_PERSON_NAME ), current_person.get( self.DATA_STORE_PROP_QUOTE_TEXT ) ]:
+
+                        if ( ( current_string is not None ) and ( current_string != "" ) ):
+
+                            if ( compact_white_space_IN == True ):
+
+                                current_string = StringHelper.replace_white_space( string_IN = current_string,
+                                                                                   replace_with_IN = " ",
+                                                                                   use_regex_IN = True )
+
+                            #-- END check to see if we are compacting white space --#
+
+                            list_OUT.append( current_string.strip() )
+
+                        #-- END check to see if string --#
+
+                    #-- END loop over strings --#
+
+                #-- END check to see if subject or source --#
+
+            #-- END check to see if person --#
+
+        #-- END loop over people --#
+
+        return list_OUT
+
+    #-- END method get_data_store_find_string_list() --#
+
+
     def init_config_properties( self, *args, **kwargs ):
 
         '''
@@ -662,6 +718,9 @@ class ManualArticleCoder( ArticleCoder ):
     #-- END method process_article() --#
     
 
+    # rebuild network ties of the Article_Data once, when the whole JSON has
+    #     been processed, not each time an author or source is saved.
+    @Article_Data_Network_Tie.defer_updates()
     def process_data_store_json( self,
                                  article_IN,
                                  coder_user_IN,
@@ -951,6 +1010,11 @@ class ManualArticleCoder( ArticleCoder ):
                             
                             # got one or more people?
                             if ( person_count > 0 ):
+                            
+                                # find all of the names and quotations in the
+                                #     article text at once, so processing each
+                                #     person below just looks up its results.
+                                self.find_all_in_article_text( article_IN, self.get_data_store_find_string_list( person_list, compact_white_space_IN ) )
                                                     
                                 # !loop over persons
                                 person_counter = 0
@@ -23,6 +23,11 @@ Configuration properties for it are stored in django's admins, in the
    "OpenCalais_REST_API_v2":
    - open_calais_access_token - permid.org access token for accessing OpenCalais version 2 API.
    - submitter - submitter you want to report to the API.
+   - response_cache_directory - optional - if set, responses are stored in
+      this directory, keyed on a hash of the article text, and re-used when
+      the same text is coded again, rather than calling the API.
+   - response_cache_max_mb - optional - size limit for the response cache, in
+      megabytes (defaults to 1024).
 '''
 
 #================================================================================
@@ -68,6 +73,10 @@ from context_text.article_coding.article_coder import ArticleCoder
 # class to help with parsing and processing OpenCalaisV2ApiResponse.
 from context_text.article_coding.open_calais_v2.open_calais_v2_api_response import OpenCalaisV2ApiResponse
 
+# response cache
+from context_text.shared.request_pipeline import RequestPipeline
+from context_text.shared.response_cache import ResponseCache
+
 #================================================================================
 # Package constants-ish
 #================================================================================
@@ -107,6 +116,9 @@ class OpenCalaisV2ArticleCoder( ArticleCoder ):
     # config property names.
     CONFIG_PROP_OPEN_CALAIS_ACCESS_TOKEN = "open_calais_access_token"
     CONFIG_PROP_SUBMITTER = "submitter"
+    CONFIG_PROP_RESPONSE_CACHE_DIRECTORY = "response_cache_directory"
+    CONFIG_PROP_RESPONSE_CACHE_MAX_MB = "response_cache_max_mb"
+    CONFIG_PROP_CONCURRENT_REQUEST_LIMIT = "concurrent_request_limit"
     
     # HTTP header names
     HTTP_HEADER_NAME_X_AG_ACCESS_TOKEN = "x-ag-access-token"
@@ -146,6 +158,16 @@ class OpenCalaisV2ArticleCoder( ArticleCoder ):
     RATE_LIMIT_DEFAULT_SECONDS_PER_ARTICLE = 2
     RATE_LIMIT_DEFAULT_ARTICLES_PER_DAY = 5000
     
+    # concurrent requests - number our license lets us have in flight at once,
+    #    and the text OpenCalais sends back when we go over.
+    CONCURRENT_REQUEST_LIMIT_DEFAULT = 2
+    CONCURRENT_REQUEST_LIMIT_TEXT = "exceeded the concurrent request limit"
+    
+    # response cache - change version if a change in the API means stored
+    #    responses should no longer be used.
+    RESPONSE_CACHE_API_VERSION = "permid-calais-v2"
+    RESPONSE_CACHE_DEFAULT_MAX_MB = 1024
+    
 
     #============================================================================
     # NOT Instance variables
@@ -202,6 +224,15 @@ class OpenCalaisV2ArticleCoder( ArticleCoder ):
         
         # list of articles dinged for concurrent connections.
         self.concurrent_request_limit_article_list = []
+        
+        # shared, pooled requests Session, and number of requests we may have
+        #    in flight at once.
+        self.requests_session = None
+        self.concurrent_request_limit = self.CONCURRENT_REQUEST_LIMIT_DEFAULT
+        
+        # map of article ID to RequestPipelineResult for articles whose
+        #    requests were already sent by iterate_articles_pipelined().
+        self.prefetched_result_dict = {}
 
     #-- END method __init__() --#
 
@@ -341,6 +372,68 @@ class OpenCalaisV2ArticleCoder( ArticleCoder ):
     #-- END function create_person_to_quotation_dict() --#
 
 
+    def create_request_pipeline( self, rate_limiter_IN = None ):
+
+        '''
+        Accepts optional rate limiter shared with other requests (anything with
+           start_request() and may_i_continue() methods, like
+           SharedRateLimiter).  Returns a RequestPipeline that sends
+           requests to the OpenCalais API over this instance's pooled requests
+           Session, with our HTTP headers, keeping up to
+           concurrent_request_limit requests in flight and re-sending those
+           that hit the concurrent request limit.
+        '''
+
+        # return reference
+        pipeline_OUT = None
+
+        # declare variables
+        my_http_helper = None
+        header_dict = None
+        header_name = None
+
+        # headers from Http_Helper
+        my_http_helper = self.get_http_helper()
+        header_dict = {}
+        for header_name in [ self.HTTP_HEADER_NAME_X_AG_ACCESS_TOKEN, self.HTTP_HEADER_NAME_CONTENT_TYPE, self.HTTP_HEADER_NAME_OUTPUT_FORMAT, self.HTTP_HEADER_NAME_SUBMITTER ]:
+
+            header_dict[ header_name ] = my_http_helper.get_http_header( header_name )
+
+        #-- END loop over headers --#
+
+        pipeline_OUT = RequestPipeline( self.OPEN_CALAIS_REST_API_URL,
+                                        header_dict_IN = header_dict,
+                                        concurrency_IN = self.concurrent_request_limit,
+                                        rate_limiter_IN = rate_limiter_IN,
+                                        session_IN = self.requests_session )
+        pipeline_OUT.concurrency_limit_text_list.append( self.CONCURRENT_REQUEST_LIMIT_TEXT )
+
+        return pipeline_OUT
+
+    #-- END method create_request_pipeline() --#
+
+
+    def get_article_request_data( self, article_IN ):
+
+        '''
+        Accepts article.  Returns the text we send to OpenCalais for it - the
+           article text without HTML.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        article_text = None
+
+        article_text = article_IN.article_text_set.get()
+        value_OUT = article_text.get_content_sans_html()
+
+        return value_OUT
+
+    #-- END method get_article_request_data() --#
+
+
     def get_content_type( self ):
 
         '''
@@ -448,6 +541,103 @@ class OpenCalaisV2ArticleCoder( ArticleCoder ):
     #-- END function get_person_to_quotation_dict() --#
 
 
+    def get_response_cache_key( self, request_data_IN ):
+
+        '''
+        Accepts the text we send to OpenCalais for an article.  Returns the key
+           for the response to that text in the response cache - a hash of the
+           text, the API version, and the content type and output format we
+           ask for.
+        '''
+
+        # return reference
+        key_OUT = None
+
+        # declare variables
+        version_string = ""
+
+        version_string = "{}|{}|{}".format( self.RESPONSE_CACHE_API_VERSION, self.get_content_type(), self.get_output_format() )
+        key_OUT = ResponseCache.make_key( request_data_IN, version_string )
+
+        return key_OUT
+
+    #-- END method get_response_cache_key() --#
+
+
+    def get_response_find_string_list( self, json_response_IN ):
+
+        '''
+        Accepts OpenCalais JSON response for an article.  Returns list of the
+           strings that process_json_mention() and process_json_quotation()
+           look for in the article text - mention plus suffix for each
+           instance of each person, and the "exact" (quotation plus
+           attribution) of the first instance of each quotation.
+        '''
+
+        # return reference
+        list_OUT = []
+
+        # declare variables
+        my_response_helper = None
+        item_dict = None
+        current_item_json = None
+        instance_list = None
+        current_instance = None
+        current_exact = None
+
+        # response helper
+        my_response_helper = OpenCalaisV2ApiResponse()
+        my_response_helper.set_json_response_object( json_response_IN )
+
+        # mentions of people.
+        item_dict = my_response_helper.get_items_of_type( OpenCalaisV2ApiResponse.OC_ITEM_TYPE_PERSON )
+        if ( item_dict is not None ):
+
+            for current_item_json in six.itervalues( item_dict ):
+
+                instance_list = JSONHelper.get_json_object_property( current_item_json, OpenCalaisV2ApiResponse.JSON_NAME_INSTANCES )
+                for current_instance in ( instance_list or [] ):
+
+                    current_exact = current_instance.get( OpenCalaisV2ApiResponse.JSON_NAME_EXACT, None )
+                    if ( current_exact is not None ):
+
+                        list_OUT.append( self.make_mention_find_string( current_exact, current_instance.get( OpenCalaisV2ApiResponse.JSON_NAME_SUFFIX, None ) ) )
+
+                    #-- END check to see if exact --#
+
+                #-- END loop over instances --#
+
+            #-- END loop over people --#
+
+        #-- END check to see if people --#
+
+        # quotations
+        item_dict = my_response_helper.get_items_of_type( OpenCalaisV2ApiResponse.OC_ITEM_TYPE_QUOTATION )
+        if ( item_dict is not None ):
+
+            for current_item_json in six.itervalues( item_dict ):
+
+                instance_list = current_item_json.get( OpenCalaisV2ApiResponse.JSON_NAME_INSTANCES, None )
+                if ( ( instance_list is not None ) and ( len( instance_list ) > 0 ) ):
+
+                    current_exact = instance_list[ 0 ].get( OpenCalaisV2ApiResponse.JSON_NAME_EXACT, None )
+                    if ( current_exact is not None ):
+
+                        list_OUT.append( current_exact )
+
+                    #-- END check to see if exact --#
+
+                #-- END check to see if instances --#
+
+            #-- END loop over quotations --#
+
+        #-- END check to see if quotations --#
+
+        return list_OUT
+
+    #-- END method get_response_find_string_list() --#
+
+
     def init_config_properties( self, *args, **kwargs ):
 
         '''
@@ -470,6 +660,9 @@ class OpenCalaisV2ArticleCoder( ArticleCoder ):
         self.set_config_application( self.CONFIG_APPLICATION )
         self.add_config_property( self.CONFIG_PROP_OPEN_CALAIS_ACCESS_TOKEN )
         self.add_config_property( self.CONFIG_PROP_SUBMITTER )
+        self.add_config_property( self.CONFIG_PROP_RESPONSE_CACHE_DIRECTORY )
+        self.add_config_property( self.CONFIG_PROP_RESPONSE_CACHE_MAX_MB )
+        self.add_config_property( self.CONFIG_PROP_CONCURRENT_REQUEST_LIMIT )
 
     #-- END abstract method init_config_properties() --#
     
@@ -495,6 +688,9 @@ class OpenCalaisV2ArticleCoder( ArticleCoder ):
         my_content_type = ""
         my_output_format = ""
         my_submitter = "context_text"
+        my_response_cache_directory = ""
+        my_response_cache_max_mb = -1
+        my_concurrent_request_limit = -1
         
         # update config properties with params passed in.
         self.update_config_properties( params_IN )
@@ -523,12 +719,249 @@ class OpenCalaisV2ArticleCoder( ArticleCoder ):
         # request type
         my_http_helper.request_type = Http_Helper.REQUEST_TYPE_POST
         
+        # concurrent request limit
+        my_concurrent_request_limit = int( self.get_config_property( self.CONFIG_PROP_CONCURRENT_REQUEST_LIMIT, self.CONCURRENT_REQUEST_LIMIT_DEFAULT ) or self.CONCURRENT_REQUEST_LIMIT_DEFAULT )
+        self.concurrent_request_limit = max( 1, my_concurrent_request_limit )
+        
+        # one pooled requests Session for all requests, so connections to
+        #    OpenCalais are reused rather than opened for each article.
+        if ( self.requests_session is not None ):
+        
+            self.requests_session.close()
+            
+        #-- END check to see if existing session --#
+        self.requests_session = RequestPipeline.make_session( self.concurrent_request_limit )
+        my_http_helper.set_requests_session( self.requests_session )
+        
         # store the http_helper
         self.set_http_helper( my_http_helper )
+        
+        # response cache?
+        my_response_cache_directory = self.get_config_property( self.CONFIG_PROP_RESPONSE_CACHE_DIRECTORY, "" )
+        if ( my_response_cache_directory ):
+        
+            # yes - create it.
+            my_response_cache_max_mb = int( self.get_config_property( self.CONFIG_PROP_RESPONSE_CACHE_MAX_MB, self.RESPONSE_CACHE_DEFAULT_MAX_MB ) or self.RESPONSE_CACHE_DEFAULT_MAX_MB )
+            self.response_cache = ResponseCache( my_response_cache_directory, max_size_bytes_IN = my_response_cache_max_mb * 1024 * 1024 )
+            
+        else:
+        
+            self.response_cache = None
+            
+        #-- END check to see if response cache --#
 
     #-- END abstract method initialize_from_params() --#
     
 
+    def is_article_response_cached( self, article_IN ):
+
+        '''
+        Returns True if there is a response cache and it has a response for the
+           text of article_IN, so coding it won't call the OpenCalais API.
+           Returns False if the article doesn't have exactly one Article_Text -
+           coding it will fail, and is counted as that article's error.
+
+        inheritance: This method overrides the method of the same name in the
+           ArticleCoder parent class.
+        '''
+
+        # return reference
+        is_cached_OUT = False
+
+        # declare variables
+        article_text = None
+
+        # got a cache?
+        if ( ( self.response_cache is not None ) and ( article_IN is not None ) ):
+
+            try:
+
+                article_text = article_IN.article_text_set.get()
+                is_cached_OUT = self.response_cache.contains( self.get_response_cache_key( article_text.get_content_sans_html() ) )
+
+            except ( Article_Text.DoesNotExist, Article_Text.MultipleObjectsReturned ):
+
+                is_cached_OUT = False
+
+            #-- END try/except around finding text --#
+
+        #-- END check to see if cache --#
+
+        return is_cached_OUT
+
+    #-- END method is_article_response_cached() --#
+
+
+    def iterate_articles_pipelined( self, article_iterable_IN, rate_limiter_IN = None ):
+
+        '''
+        Accepts iterable of articles and optional shared rate limiter.
+           Generator - sends the OpenCalais requests for the articles through a
+           RequestPipeline, and as each response comes back, stores it in
+           prefetched_result_dict and yields its article, so process_article()
+           uses the stored response while the requests for the next articles
+           are still outstanding.  Articles are yielded in the order their
+           responses arrive.  Articles whose responses are in the response
+           cache are not sent - they are yielded as they are reached, and
+           process_article() reads them from the cache as usual.  Articles
+           whose request can't be built (no Article_Text, for example) are not
+           sent either, and are yielded as they are reached, so coding them
+           fails and is recorded for that article alone.  Once the rate
+           limiter's daily limit is reached, no more requests are sent.  The
+           rest of the articles with cached responses are still yielded, but
+           articles whose request was refused or never made are not - the
+           caller records them as not coded.
+
+        inheritance: This method overrides the method of the same name in the
+           ArticleCoder parent class.
+        '''
+
+        # declare variables
+        my_pipeline = None
+        article_iterator = None
+        article_dict = None
+        unsent_article_list = None
+        current_result = None
+        current_article = None
+        is_cached = False
+
+        # place to keep articles until response comes back.
+        article_iterator = iter( article_iterable_IN )
+        article_dict = {}
+        unsent_article_list = []
+
+        def make_request_iterator():
+
+            # declare variables
+            current_article = None
+            request_data = None
+
+            for current_article in article_iterator:
+
+                # errors here would end the whole run - leave them for
+                #     process_article(), inside the caller's per-article
+                #     exception handling.
+                request_data = None
+                try:
+
+                    if ( self.is_article_response_cached( current_article ) == False ):
+
+                        request_data = self.get_article_request_data( current_article )
+
+                    #-- END check to see if cached --#
+
+                except Exception as e:
+
+                    request_data = None
+
+                #-- END try/except around building request --#
+
+                if ( request_data is None ):
+
+                    # cached, or can't be sent - no request.
+                    unsent_article_list.append( current_article )
+
+                else:
+
+                    article_dict[ current_article.id ] = current_article
+                    yield current_article.id, request_data
+
+                #-- END check to see if request --#
+
+            #-- END loop over articles --#
+
+        #-- END function make_request_iterator() --#
+
+        with self.create_request_pipeline( rate_limiter_IN ) as my_pipeline:
+
+            for current_result in my_pipeline.run( make_request_iterator() ):
+
+                # unsent articles reached while filling the pipeline.
+                while ( len( unsent_article_list ) > 0 ):
+
+                    yield unsent_article_list.pop( 0 )
+
+                #-- END loop over unsent articles --#
+
+                if ( current_result.is_daily_limit_reached == True ):
+
+                    # not sent - leave it for the caller.
+                    article_dict.pop( current_result.key )
+
+                else:
+
+                    self.prefetched_result_dict[ current_result.key ] = current_result
+                    yield article_dict.pop( current_result.key )
+
+                #-- END check to see if request was sent --#
+
+            #-- END loop over pipeline results --#
+
+        #-- END with pipeline --#
+
+        # any unsent articles left?
+        while ( len( unsent_article_list ) > 0 ):
+
+            yield unsent_article_list.pop( 0 )
+
+        #-- END loop over unsent articles --#
+
+        # stopped at daily limit before reaching the rest?  Cached ones can
+        #     still be coded.
+        for current_article in article_iterator:
+
+            try:
+
+                is_cached = self.is_article_response_cached( current_article )
+
+            except Exception as e:
+
+                # leave error for process_article().
+                is_cached = True
+
+            #-- END try/except around checking cache --#
+
+            if ( is_cached == True ):
+
+                yield current_article
+
+            #-- END check to see if cached --#
+
+        #-- END loop over articles not reached --#
+
+    #-- END method iterate_articles_pipelined() --#
+    
+
+    def make_mention_find_string( self, mention_string_IN, mention_suffix_IN = "" ):
+
+        '''
+        Accepts the "exact" of an OpenCalais mention and its "suffix".  Returns
+           the string process_json_mention() looks for in the article text -
+           exact plus suffix, as OpenCalais returned them (the suffix includes
+           any white space after the mention).
+
+        inheritance: This method overrides the method of the same name in the
+           ArticleCoder parent class.
+        '''
+
+        # return reference
+        string_OUT = ""
+
+        string_OUT = mention_string_IN
+
+        # is suffix None?
+        if ( mention_suffix_IN is not None ):
+
+            # not None, add it.
+            string_OUT += mention_suffix_IN
+
+        #-- END check to see if suffix is None --#
+
+        return string_OUT
+
+    #-- END method make_mention_find_string() --#
+
+
     def process_article( self, article_IN, coding_user_IN = None, *args, **kwargs ):
 
         '''
@@ -571,6 +1004,8 @@ class OpenCalaisV2ArticleCoder( ArticleCoder ):
         requests_raw_text = ""
         requests_response_json = None
         is_response_OK = True
+        response_cache_key = None
+        prefetched_result = None
         article_data = None
         my_author_string = ""
         latest_status = ""
@@ -624,8 +1059,17 @@ class OpenCalaisV2ArticleCoder( ArticleCoder ):
                     #    so we can set a status in the Article_Data instance.
                     try:
                 
-                        # then, get text.
-                        article_text = article_IN.article_text_set.get()
+                        # then, get text (once, from coding context, if there
+                        #     is one).
+                        if ( self.get_coding_context( article_IN ) is not None ):
+                        
+                            article_text = self.get_coding_context( article_IN ).get_article_text()
+                            
+                        else:
+                        
+                            article_text = article_IN.article_text_set.get()
+                            
+                        #-- END check to see if coding context --#
                         
                         # retrieve article body with HTML
                         article_body_html = article_text.get_content()
@@ -669,18 +1113,78 @@ class OpenCalaisV2ArticleCoder( ArticleCoder ):
                             
                         #-- END debug --#
                         
-                        # make the request.
-                        requests_response = my_http_helper.load_url_requests( self.OPEN_CALAIS_REST_API_URL, request_type_IN = Http_Helper.REQUEST_TYPE_POST, data_IN = request_data )
+                        # already have a response for this text?
+                        requests_response = None
+                        requests_raw_text = None
+                        if ( self.response_cache is not None ):
+                        
+                            response_cache_key = self.get_response_cache_key( request_data )
+                            requests_raw_text = self.response_cache.get( response_cache_key )
+                            
+                        #-- END check to see if response cache --#
+                        
+                        # request already sent by iterate_articles_pipelined()?
+                        if ( requests_raw_text is None ):
+                        
+                            prefetched_result = self.prefetched_result_dict.pop( article_IN.id, None )
+                            
+                        #-- END check to see if cached response --#
                         
-                        # raw text:
-                        requests_raw_text = requests_response.text
+                        if ( ( requests_raw_text is None ) and ( prefetched_result is not None ) ):
+                        
+                            # yes - use its response.
+                            requests_raw_text = prefetched_result.raw_text
+                            
+                        elif ( requests_raw_text is None ):
+
+                            # no - make the request.
+                            requests_response = my_http_helper.load_url_requests( self.OPEN_CALAIS_REST_API_URL, request_type_IN = Http_Helper.REQUEST_TYPE_POST, data_IN = request_data )
+                            
+                            # raw text:
+                            requests_raw_text = requests_response.text
+                            
+                        #-- END check to see if cached response --#
                         
                         # convert to a json object, inside try since sometimes OpenCalais
                         #    returns non-parsable stuff.
                         try:
                         
                             # convert to JSON object
-                            requests_response_json = requests_response.json()
+                            if ( requests_response is not None ):
+                            
+                                requests_response_json = requests_response.json()
+                                
+                                # store successful responses for next time.
+                                if ( ( response_cache_key is not None ) and ( requests_response.status_code == requests.codes.ok ) ):
+                                
+                                    self.response_cache.put( response_cache_key, requests_raw_text )
+                                    
+                                #-- END check to see if we cache response --#
+                                
+                            elif ( prefetched_result is not None ):
+                            
+                                # pipeline already parsed it (or gave up).
+                                if ( prefetched_result.is_success() == False ):
+                                
+                                    raise ValueError( prefetched_result.error_message )
+                                    
+                                #-- END check to see if pipeline request failed --#
+                                
+                                requests_response_json = prefetched_result.response_json
+                                
+                                # store successful responses for next time.
+                                if ( response_cache_key is not None ):
+                                
+                                    self.response_cache.put( response_cache_key, requests_raw_text )
+                                    
+                                #-- END check to see if we cache response --#
+                                
+                            else:
+                            
+                                requests_response_json = json.loads( requests_raw_text )
+                                
+                            #-- END check to see if cached response --#
+
                             is_response_OK = True
                             
                         except ValueError as ve:
@@ -708,7 +1212,7 @@ class OpenCalaisV2ArticleCoder( ArticleCoder ):
                             
                             # check to see if this is the OpenCalais "concurrent
                             #     request" error.
-                            if ( "exceeded the concurrent request limit" in requests_raw_text ):
+                            if ( self.CONCURRENT_REQUEST_LIMIT_TEXT in requests_raw_text ):
                             
                                 # yup.  Note the article ID.
                                 self.concurrent_request_limit_article_list.append( article_IN.id )
@@ -738,7 +1242,11 @@ class OpenCalaisV2ArticleCoder( ArticleCoder ):
                         #-- END try/except around JSON processing. --#
                         
                         # close the response.
-                        requests_response.close()
+                        if ( requests_response is not None ):
+                        
+                            requests_response.close()
+                            
+                        #-- END check to see if response --#
                             
                         '''
                         #-- END with requests.Session() as my_session --#
@@ -944,6 +1452,11 @@ class OpenCalaisV2ArticleCoder( ArticleCoder ):
         
         #-- END check to see if capture method already present in article data --#
         
+        # find all of the mentions and quotations in the response in the
+        #     article text at once, so processing each one below just looks up
+        #     its result.
+        self.find_all_in_article_text( article_IN, self.get_response_find_string_list( json_response_IN ) )
+        
         # see what methods we call based on the process by value.
         if ( ( process_by_IN is not None ) and ( process_by_IN != "" ) ):
         
@@ -1091,6 +1604,12 @@ class OpenCalaisV2ArticleCoder( ArticleCoder ):
             # make sure we have one or more person
             if ( person_count > 0 ):
             
+                # load UUID and newspaper associations used in confidence
+                #     scoring for all the people at once (person URIs are
+                #     their external UUIDs).  New index each article, so rows
+                #     written by other coders since the last one are seen.
+                self.preload_person_confidence_index( list( person_dict.keys() ), article_IN.newspaper_id )
+            
                 # loop over them
                 person_counter = 0
                 for current_oc_URI, current_person_json in six.iteritems( person_dict ):
@@ -1106,6 +1625,9 @@ class OpenCalaisV2ArticleCoder( ArticleCoder ):
                 
                 #-- END loop over persons --#
                 
+                # done with this article's index.
+                self.set_person_confidence_index( None )
+                
             else:
     
                 my_logger.debug( "In OpenCalaisV2ArticleCoder." + me + ": No persons in article, so nothing else to do." )
@@ -1246,7 +1768,9 @@ class OpenCalaisV2ArticleCoder( ArticleCoder ):
         
         # declare variables
         me = "process_json_mention"
+        my_coding_context = None
         mention_qs = None
+        mention_list = None
         mention_count = -1
         current_mention = None
         
@@ -1326,15 +1850,28 @@ class OpenCalaisV2ArticleCoder( ArticleCoder ):
 
         # is this mention already stored?
         
-        # Filter on exact, offset, length, prefix, and suffix.
-        mention_qs = article_subject_IN.article_subject_mention_set.filter( value = mention_exact )
-        mention_qs = mention_qs.filter( value_index = mention_offset )
-        mention_qs = mention_qs.filter( value_length = mention_length )
-        mention_qs = mention_qs.filter( context_before = mention_prefix )
-        mention_qs = mention_qs.filter( context_after = mention_suffix )
+        my_coding_context = self.get_coding_context( article_IN )
+        if ( my_coding_context is not None ):
+        
+            # look in mentions loaded for the article - exact, prefix, and
+            #     suffix, then offset and length.
+            mention_list = my_coding_context.get_mention_list( article_subject_IN, mention_exact, mention_prefix, mention_suffix, match_context_IN = True )
+            mention_list = [ mention for mention in mention_list if ( ( mention.value_index == mention_offset ) and ( mention.value_length == mention_length ) ) ]
+            mention_count = len( mention_list )
+            
+        else:
+        
+            # Filter on exact, offset, length, prefix, and suffix.
+            mention_qs = article_subject_IN.article_subject_mention_set.filter( value = mention_exact )
+            mention_qs = mention_qs.filter( value_index = mention_offset )
+            mention_qs = mention_qs.filter( value_length = mention_length )
+            mention_qs = mention_qs.filter( context_before = mention_prefix )
+            mention_qs = mention_qs.filter( context_after = mention_suffix )
+            mention_count = mention_qs.count()
+            
+        #-- END check to see if coding context --#
                         
         # got one?
-        mention_count = mention_qs.count()
         if ( mention_count == 0 ):
                         
             # no.  Create one.
@@ -1355,19 +1892,11 @@ class OpenCalaisV2ArticleCoder( ArticleCoder ):
             #    of the article.
             
             # get article text for article.
-            article_text = article_IN.article_text_set.get()
+            article_text = self.get_article_text( article_IN )
             
             # then, call find_in_text (FIT) method on mention plus suffix (to
             #    make sure we get the right "he", for example).
-            find_string = mention_exact
-            
-            # is suffix None?
-            if ( mention_suffix is not None ):
-                
-                # not None, add it.
-                find_string += mention_suffix
-                
-            #-- END check to see if suffix is None --#
+            find_string = self.make_mention_find_string( mention_exact, mention_suffix )
 
             mention_FIT_values = article_text.find_in_text( find_string )
             
@@ -1647,8 +2176,17 @@ class OpenCalaisV2ArticleCoder( ArticleCoder ):
                 
             #-- END check to see if notes. --#
                         
-            # save the quotation instance.
-            current_mention.save()
+            # save the mention instance (with the rest of the article's new
+            #     rows, if coding context).
+            if ( my_coding_context is not None ):
+            
+                my_coding_context.add_mention( current_mention )
+                
+            else:
+            
+                current_mention.save()
+                
+            #-- END check to see if coding context --#
             
             # and return it.
             instance_OUT = current_mention
@@ -1656,7 +2194,15 @@ class OpenCalaisV2ArticleCoder( ArticleCoder ):
         elif ( mention_count == 1 ):
         
             # already got one.  Return it.
-            instance_OUT = mention_qs.get()
+            if ( my_coding_context is not None ):
+            
+                instance_OUT = mention_list[ 0 ]
+                
+            else:
+            
+                instance_OUT = mention_qs.get()
+                
+            #-- END check to see if coding context --#
         
         elif ( mention_count > 1 ):
         
@@ -1966,7 +2512,9 @@ class OpenCalaisV2ArticleCoder( ArticleCoder ):
         
         # declare variables
         me = "process_json_quotation"
+        my_coding_context = None
         quotation_qs = None
+        quotation_list = None
         quotation_count = -1
         
         # declare variables - Information from OpenCalais JSON
@@ -2009,11 +2557,22 @@ class OpenCalaisV2ArticleCoder( ArticleCoder ):
 
         # need to see if this quotation has already been stored.
 
-        # Filter on UUID from Quotation JSON object.
-        quotation_qs = article_subject_IN.article_subject_quotation_set.filter( uuid = quotation_URI_IN )
+        my_coding_context = self.get_coding_context( article_IN )
+        if ( my_coding_context is not None ):
+        
+            # look in quotations loaded for the article.
+            quotation_list = my_coding_context.get_quotation_list_for_uuid( article_subject_IN, quotation_URI_IN )
+            quotation_count = len( quotation_list )
+            
+        else:
+        
+            # Filter on UUID from Quotation JSON object.
+            quotation_qs = article_subject_IN.article_subject_quotation_set.filter( uuid = quotation_URI_IN )
+            quotation_count = quotation_qs.count()
+            
+        #-- END check to see if coding context --#
                         
         # got one?
-        quotation_count = quotation_qs.count()
         if ( quotation_count == 0 ):
                         
             # no.  Create one.
@@ -2096,7 +2655,7 @@ class OpenCalaisV2ArticleCoder( ArticleCoder ):
             #    of the article.
             
             # get article text for article.
-            article_text = article_IN.article_text_set.get()
+            article_text = self.get_article_text( article_IN )
             
             # then, call find_in_text (FIT) method.  When we deal with words, we
             #    split on spaces.  Because of this, "words" must include the
@@ -2318,8 +2877,17 @@ class OpenCalaisV2ArticleCoder( ArticleCoder ):
             #article_subject.attribution_speaker_name_index_range = ""
             #article_subject.attribution_speaker_name_word_range = ""
             
-            # save the quotation instance.
-            current_quotation.save()
+            # save the quotation instance (with the rest of the article's new
+            #     rows, if coding context).
+            if ( my_coding_context is not None ):
+            
+                my_coding_context.add_quotation( current_quotation )
+                
+            else:
+            
+                current_quotation.save()
+                
+            #-- END check to see if coding context --#
             
             # and return it.
             instance_OUT = current_quotation
@@ -2327,7 +2895,15 @@ class OpenCalaisV2ArticleCoder( ArticleCoder ):
         elif ( quotation_count == 1 ):
         
             # already got one.  Return it.
-            instance_OUT = quotation_qs.get()
+            if ( my_coding_context is not None ):
+            
+                instance_OUT = quotation_list[ 0 ]
+                
+            else:
+            
+                instance_OUT = quotation_qs.get()
+                
+            #-- END check to see if coding context --#
         
         elif ( quotation_count > 1 ):
         
@@ -0,0 +1,262 @@
+from __future__ import unicode_literals
+
+'''
+Copyright 2010-2016 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text.
+
+context_text is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text. If not, see http://www.gnu.org/licenses/.
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+# context_text imports
+from context_text.models import Person_External_UUID
+from context_text.models import Person_Newspaper
+
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class PersonConfidenceIndex( object ):
+
+    '''
+    In-memory copy of the Person_External_UUID and Person_Newspaper rows that
+        ArticleCoder.lookup_calc_confidence() checks, so confidence for many
+        people can be scored with two IN queries rather than three queries per
+        person:
+        - for each loaded UUID, the IDs of the people that have it (one entry
+            per Person_External_UUID row).
+        - for each loaded ( person ID, newspaper ID ) pair, the number of
+            Person_Newspaper rows that link them.
+    Meant to live for one article (see
+        ArticleCoder.preload_person_confidence_index()) - rows other coders
+        write after it is loaded are not seen.  Kept current with this coder's
+        own changes by calling add_external_uuid() and add_newspaper() when
+        ArticleCoder.update_person() associates them.  Getters return None for
+        values that have not been loaded.
+    '''
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> __init__() method
+    #---------------------------------------------------------------------------
+
+
+    def __init__( self ):
+
+        # UUID --> list of person IDs
+        self.uuid_to_person_id_list_dict = {}
+
+        # ( person ID, newspaper ID ) --> count of Person_Newspaper rows.
+        self.person_newspaper_count_dict = {}
+        self.loaded_person_newspaper_set = set()
+
+    #-- END method __init__() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def add_external_uuid( self, person_id_IN, uuid_IN ):
+
+        '''
+        Accepts person ID and UUID that was just associated with the person.
+            If the UUID is loaded and the person doesn't have it yet, adds it
+            (Person.associate_external_uuid() doesn't add duplicates).
+        '''
+
+        # declare variables
+        person_id_list = None
+
+        person_id_list = self.uuid_to_person_id_list_dict.get( uuid_IN, None )
+        if ( ( person_id_list is not None ) and ( person_id_IN not in person_id_list ) ):
+
+            person_id_list.append( person_id_IN )
+
+        #-- END check to see if UUID loaded and new for person --#
+
+    #-- END method add_external_uuid() --#
+
+
+    def add_newspaper( self, person_id_IN, newspaper_id_IN ):
+
+        '''
+        Accepts person ID and newspaper ID that was just associated with the
+            person.  If the pair is loaded and not yet associated, counts it
+            (Person.associate_newspaper() doesn't add duplicates).
+        '''
+
+        # declare variables
+        pair_key = None
+
+        pair_key = ( person_id_IN, newspaper_id_IN )
+        if ( self.is_person_newspaper_loaded( person_id_IN, newspaper_id_IN ) == True ):
+
+            if ( self.person_newspaper_count_dict.get( pair_key, 0 ) == 0 ):
+
+                self.person_newspaper_count_dict[ pair_key ] = 1
+
+            #-- END check to see if new --#
+
+        #-- END check to see if loaded --#
+
+    #-- END method add_newspaper() --#
+
+
+    def get_person_id_list_for_uuid( self, uuid_IN ):
+
+        '''
+        Returns list of IDs of people who have the UUID passed in (one per
+            Person_External_UUID row), or None if UUID not loaded.
+        '''
+
+        # return reference
+        list_OUT = None
+
+        list_OUT = self.uuid_to_person_id_list_dict.get( uuid_IN, None )
+        if ( list_OUT is not None ):
+
+            list_OUT = list( list_OUT )
+
+        #-- END check to see if loaded --#
+
+        return list_OUT
+
+    #-- END method get_person_id_list_for_uuid() --#
+
+
+    def get_person_newspaper_count( self, person_id_IN, newspaper_id_IN ):
+
+        '''
+        Returns count of Person_Newspaper rows for person and newspaper passed
+            in, or None if not loaded.
+        '''
+
+        # return reference
+        count_OUT = None
+
+        if ( self.is_person_newspaper_loaded( person_id_IN, newspaper_id_IN ) == True ):
+
+            count_OUT = self.person_newspaper_count_dict.get( ( person_id_IN, newspaper_id_IN ), 0 )
+
+        #-- END check to see if loaded --#
+
+        return count_OUT
+
+    #-- END method get_person_newspaper_count() --#
+
+
+    def is_person_newspaper_loaded( self, person_id_IN, newspaper_id_IN ):
+
+        '''
+        Returns True if the Person_Newspaper rows for the person and newspaper
+            passed in are loaded.
+        '''
+
+        return ( ( person_id_IN, newspaper_id_IN ) in self.loaded_person_newspaper_set )
+
+    #-- END method is_person_newspaper_loaded() --#
+
+
+    def load( self, uuid_list_IN = None, person_newspaper_pair_list_IN = None ):
+
+        '''
+        Accepts list of UUIDs and list of ( person ID, newspaper ID ) pairs.
+            Loads the ones not already loaded - one IN query for the UUIDs, one
+            for the pairs.  Returns count of queries run.
+        '''
+
+        # return reference
+        query_count_OUT = 0
+
+        # declare variables
+        uuid_set = None
+        pair_set = None
+        person_id_set = None
+        newspaper_id_set = None
+        current_uuid = None
+        current_person_id = None
+        current_newspaper_id = None
+        pair_key = None
+
+        # UUIDs not yet loaded
+        uuid_set = set()
+        for current_uuid in ( uuid_list_IN or [] ):
+
+            if ( ( current_uuid is not None ) and ( current_uuid != "" ) and ( current_uuid not in self.uuid_to_person_id_list_dict ) ):
+
+                uuid_set.add( current_uuid )
+
+            #-- END check to see if we need to load UUID --#
+
+        #-- END loop over UUIDs --#
+
+        if ( len( uuid_set ) > 0 ):
+
+            for current_uuid in uuid_set:
+
+                self.uuid_to_person_id_list_dict[ current_uuid ] = []
+
+            #-- END loop over UUIDs --#
+
+            for current_uuid, current_person_id in Person_External_UUID.objects.filter( uuid__in = uuid_set ).values_list( "uuid", "person_id" ):
+
+                self.uuid_to_person_id_list_dict[ current_uuid ].append( current_person_id )
+
+            #-- END loop over Person_External_UUID rows --#
+
+            query_count_OUT += 1
+
+        #-- END check to see if UUIDs to load --#
+
+        # person-newspaper pairs not yet loaded (unsaved people have none).
+        pair_set = set()
+        for current_person_id, current_newspaper_id in ( person_newspaper_pair_list_IN or [] ):
+
+            if ( ( current_newspaper_id is not None )
+                and ( self.is_person_newspaper_loaded( current_person_id, current_newspaper_id ) == False ) ):
+
+                pair_set.add( ( current_person_id, current_newspaper_id ) )
+
+            #-- END check to see if we need to load pair --#
+
+        #-- END loop over pairs --#
+
+        person_id_set = set( [ pair_key[ 0 ] for pair_key in pair_set if pair_key[ 0 ] is not None ] )
+        newspaper_id_set = set( [ pair_key[ 1 ] for pair_key in pair_set ] )
+        if ( len( person_id_set ) > 0 ):
+
+            for current_person_id, current_newspaper_id in Person_Newspaper.objects.filter( person_id__in = person_id_set, newspaper_id__in = newspaper_id_set ).values_list( "person_id", "newspaper_id" ):
+
+                # IN on both columns can also match pairs not asked for.
+                pair_key = ( current_person_id, current_newspaper_id )
+                if ( pair_key in pair_set ):
+
+                    self.person_newspaper_count_dict[ pair_key ] = self.person_newspaper_count_dict.get( pair_key, 0 ) + 1
+
+                #-- END check to see if pair asked for --#
+
+            #-- END loop over Person_Newspaper rows --#
+
+            query_count_OUT += 1
+
+        #-- END check to see if pairs to load --#
+
+        self.loaded_person_newspaper_set.update( pair_set )
+
+        return query_count_OUT
+
+    #-- END method load() --#
+
+
+#-- END class PersonConfidenceIndex --#
@@ -0,0 +1,552 @@
+from __future__ import unicode_literals
+
+'''
+Copyright 2010-2016 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text.
+
+context_text is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text. If not, see http://www.gnu.org/licenses/.
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+# python_utilities
+from python_utilities.logging.logging_helper import LoggingHelper
+
+# context_text imports
+from context_text.models import Person
+from context_text.shared.name_key_helper import NameKeyHelper
+
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class PersonNameIndex( LoggingHelper ):
+
+    '''
+    In-memory index of the name parts of every Person in the database, built
+        once per coding run so that ArticleCoder.lookup_person() can match
+        names with dictionary probes rather than a handful of ORM queries per
+        name.  Name part values are normalized the same way the database path
+        compares them: lower-cased (like "__iexact"), or, if the index is
+        created with use_name_keys_IN = True, first, middle, and last names
+        with NameKeyHelper.make_name_key() (like Person's name key columns).
+        The index is kept current by calling add_person() each time a Person
+        is created or renamed.
+
+    Lookup methods mirror the Person class methods they replace:
+    - get_person_for_name() - Person.get_person_for_name()
+    - look_up_person_from_name() - Person.look_up_person_from_name( ..., use_name_keys_IN = use_name_keys ) (but returns a list)
+    - look_up_first_name() - Person.objects.filter( first_name__iexact = ... ), or first_name_key if use_name_keys
+    - look_up_full_name_string() - Person.objects.filter( full_name_string__iexact = ... )
+
+    Partial ("__icontains") matching is not supported - callers should use the
+        database for that.
+    '''
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+
+    # logging
+    LOGGER_NAME = "context_text.article_coding.person_name_index"
+
+    # Person name part fields, in the order they are stored in the name key.
+    FIELD_NAME_PREFIX = "name_prefix"
+    FIELD_FIRST_NAME = "first_name"
+    FIELD_MIDDLE_NAME = "middle_name"
+    FIELD_LAST_NAME = "last_name"
+    FIELD_NAME_SUFFIX = "name_suffix"
+    FIELD_FULL_NAME_STRING = "full_name_string"
+
+    NAME_PART_FIELD_LIST = []
+    NAME_PART_FIELD_LIST.append( FIELD_NAME_PREFIX )
+    NAME_PART_FIELD_LIST.append( FIELD_FIRST_NAME )
+    NAME_PART_FIELD_LIST.append( FIELD_MIDDLE_NAME )
+    NAME_PART_FIELD_LIST.append( FIELD_LAST_NAME )
+    NAME_PART_FIELD_LIST.append( FIELD_NAME_SUFFIX )
+
+    # name part fields that Person has name key columns for.
+    NAME_KEY_FIELD_LIST = []
+    NAME_KEY_FIELD_LIST.append( FIELD_FIRST_NAME )
+    NAME_KEY_FIELD_LIST.append( FIELD_MIDDLE_NAME )
+    NAME_KEY_FIELD_LIST.append( FIELD_LAST_NAME )
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> class methods
+    #---------------------------------------------------------------------------
+
+
+    @classmethod
+    def normalize_value( cls, value_IN ):
+
+        '''
+        Accepts a name part value.  Returns the value lower-cased, or "" if
+            None, so it can be compared the way "__iexact" compares.
+        '''
+
+        # return reference
+        value_OUT = ""
+
+        if ( value_IN is not None ):
+
+            value_OUT = "{}".format( value_IN ).lower()
+
+        #-- END check to see if None --#
+
+        return value_OUT
+
+    #-- END class method normalize_value() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> __init__() method
+    #---------------------------------------------------------------------------
+
+
+    def __init__( self, use_name_keys_IN = False ):
+
+        # call parent's __init__()
+        super( PersonNameIndex, self ).__init__()
+
+        # compare first, middle, and last names on name keys, or lower-cased?
+        self.use_name_keys = use_name_keys_IN
+
+        # field name --> normalized value --> set of person IDs.
+        self.name_part_index = {}
+        for field_name in self.NAME_PART_FIELD_LIST:
+
+            self.name_part_index[ field_name ] = {}
+
+        #-- END loop over name part fields --#
+
+        # normalized full name string --> set of person IDs.
+        self.full_name_string_index = {}
+
+        # person ID --> tuple of normalized name parts (plus full name string
+        #     at the end), so we can un-index a person who is renamed.
+        self.person_id_to_name_key_map = {}
+
+        # set logger name
+        self.set_logger_name( self.LOGGER_NAME )
+
+    #-- END method __init__() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def add_person( self, person_IN ):
+
+        '''
+        Accepts Person instance that has been saved.  Adds it to the index,
+            replacing any prior entry for the same ID.  Returns the name key
+            stored for the person, or None if the person has no ID.
+        '''
+
+        # return reference
+        name_key_OUT = None
+
+        # declare variables
+        value_list = None
+        field_name = None
+
+        # got a saved person?
+        if ( ( person_IN is not None ) and ( person_IN.id ) ):
+
+            # build value list.
+            value_list = []
+            for field_name in self.NAME_PART_FIELD_LIST:
+
+                value_list.append( getattr( person_IN, field_name, None ) )
+
+            #-- END loop over name part fields --#
+
+            value_list.append( getattr( person_IN, self.FIELD_FULL_NAME_STRING, None ) )
+
+            name_key_OUT = self.add_person_values( person_IN.id, value_list )
+
+        #-- END check to see if saved person --#
+
+        return name_key_OUT
+
+    #-- END method add_person() --#
+
+
+    def add_person_values( self, person_id_IN, value_list_IN ):
+
+        '''
+        Accepts person ID and list of that person's raw values for
+            NAME_PART_FIELD_LIST, followed by full_name_string.  Normalizes the
+            values and adds them to the index, replacing any prior entry for
+            the same ID.  Returns the normalized name key tuple.
+        '''
+
+        # return reference
+        name_key_OUT = None
+
+        # declare variables
+        field_index = -1
+        field_name = None
+        normalized_value = None
+
+        # remove existing entry, if there is one.
+        self.remove_person( person_id_IN )
+
+        # normalize
+        name_key_OUT = [ self.normalize_name_part( field_name, value_list_IN[ field_index ] ) for field_index, field_name in enumerate( self.NAME_PART_FIELD_LIST ) ]
+        name_key_OUT.append( self.normalize_value( value_list_IN[ len( self.NAME_PART_FIELD_LIST ) ] ) )
+        name_key_OUT = tuple( name_key_OUT )
+
+        # add to name part indexes
+        for field_index, field_name in enumerate( self.NAME_PART_FIELD_LIST ):
+
+            normalized_value = name_key_OUT[ field_index ]
+            self.name_part_index[ field_name ].setdefault( normalized_value, set() ).add( person_id_IN )
+
+        #-- END loop over name part fields --#
+
+        # add to full name string index
+        normalized_value = name_key_OUT[ len( self.NAME_PART_FIELD_LIST ) ]
+        self.full_name_string_index.setdefault( normalized_value, set() ).add( person_id_IN )
+
+        # remember key
+        self.person_id_to_name_key_map[ person_id_IN ] = name_key_OUT
+
+        return name_key_OUT
+
+    #-- END method add_person_values() --#
+
+
+    def build( self, person_qs_IN = None ):
+
+        '''
+        Accepts optional QuerySet of Persons (defaults to all Persons).  Loads
+            the name parts of each into the index using a single values_list()
+            query.  Returns count of persons indexed.
+        '''
+
+        # return reference
+        count_OUT = 0
+
+        # declare variables
+        me = "build"
+        person_qs = None
+        field_list = None
+        current_row = None
+
+        # QuerySet
+        person_qs = person_qs_IN
+        if ( person_qs is None ):
+
+            person_qs = Person.objects.all()
+
+        #-- END check to see if QuerySet passed in --#
+
+        # one query for everyone's name parts.
+        field_list = [ "id" ] + self.NAME_PART_FIELD_LIST + [ self.FIELD_FULL_NAME_STRING ]
+        for current_row in person_qs.values_list( *field_list ).iterator():
+
+            self.add_person_values( current_row[ 0 ], current_row[ 1 : ] )
+            count_OUT += 1
+
+        #-- END loop over person rows --#
+
+        self.output_debug_message( "In " + me + "(): indexed " + str( count_OUT ) + " persons." )
+
+        return count_OUT
+
+    #-- END method build() --#
+
+
+    def get_person_for_name( self, full_name_IN, create_if_no_match_IN = False, do_strict_match_IN = False ):
+
+        '''
+        Same contract as Person.get_person_for_name(), without the partial
+            match option: if exactly one Person matches, returns it (FOUND).  If
+            none match and create_if_no_match_IN, returns new, unsaved Person
+            for the name (NEW).  Otherwise (no match and no create, or multiple
+            matches) returns None.  Only the single match is loaded from the
+            database.
+        '''
+
+        # return reference
+        instance_OUT = None
+
+        # declare variables
+        parsed_person = None
+        person_id_set = None
+
+        # parse name into an unsaved Person.
+        parsed_person = Person.create_person_for_name( full_name_IN )
+
+        # look up.
+        person_id_set = self.look_up_person_ids( parsed_person, do_strict_match_IN = do_strict_match_IN )
+        if ( len( person_id_set ) == 1 ):
+
+            # found.
+            instance_OUT = Person.objects.get( pk = list( person_id_set )[ 0 ] )
+
+        elif ( ( len( person_id_set ) == 0 ) and ( create_if_no_match_IN == True ) ):
+
+            # new.
+            instance_OUT = parsed_person
+
+        #-- END check to see how many matches --#
+
+        return instance_OUT
+
+    #-- END method get_person_for_name() --#
+
+
+    def is_strict_match( self, parsed_key_IN, person_key_IN ):
+
+        '''
+        Accepts normalized key for a parsed name and for an indexed Person.
+            Returns True if every name part that is empty in the parsed name is
+            also empty for the person (populated parts are assumed to already
+            match).
+        '''
+
+        # return reference
+        is_match_OUT = True
+
+        # declare variables
+        field_index = -1
+
+        for field_index in range( len( self.NAME_PART_FIELD_LIST ) ):
+
+            if ( ( parsed_key_IN[ field_index ] == "" ) and ( person_key_IN[ field_index ] != "" ) ):
+
+                is_match_OUT = False
+
+            #-- END check to see if empty part populated in person --#
+
+        #-- END loop over name parts --#
+
+        return is_match_OUT
+
+    #-- END method is_strict_match() --#
+
+
+    def look_up_first_name( self, first_name_IN ):
+
+        '''
+        Returns set of IDs of Persons whose first name matches the value passed
+            in, ignoring case (and accents and punctuation, if use_name_keys).
+        '''
+
+        # return reference
+        id_set_OUT = None
+
+        # look up.
+        id_set_OUT = set( self.name_part_index[ self.FIELD_FIRST_NAME ].get( self.normalize_name_part( self.FIELD_FIRST_NAME, first_name_IN ), set() ) )
+
+        return id_set_OUT
+
+    #-- END method look_up_first_name() --#
+
+
+    def look_up_full_name_string( self, full_name_string_IN ):
+
+        '''
+        Returns set of IDs of Persons whose full_name_string matches the value
+            passed in, ignoring case.
+        '''
+
+        # return reference
+        id_set_OUT = None
+
+        # look up.
+        id_set_OUT = set( self.full_name_string_index.get( self.normalize_value( full_name_string_IN ), set() ) )
+
+        return id_set_OUT
+
+    #-- END method look_up_full_name_string() --#
+
+
+    def look_up_person_from_name( self, full_name_IN, do_strict_match_IN = False ):
+
+        '''
+        Same matching rules as Person.look_up_person_from_name() with
+            use_name_keys_IN = use_name_keys, but returns a list of the
+            matching Person instances, loaded in one query.
+        '''
+
+        # return reference
+        list_OUT = []
+
+        # declare variables
+        parsed_person = None
+        person_id_set = None
+
+        # parse and look up.
+        parsed_person = Person.create_person_for_name( full_name_IN )
+        person_id_set = self.look_up_person_ids( parsed_person, do_strict_match_IN = do_strict_match_IN )
+
+        # load any matches.
+        if ( len( person_id_set ) > 0 ):
+
+            list_OUT = list( Person.objects.filter( id__in = person_id_set ).order_by( "id" ) )
+
+        #-- END check to see if matches --#
+
+        return list_OUT
+
+    #-- END method look_up_person_from_name() --#
+
+
+    def look_up_person_ids( self, parsed_person_IN, do_strict_match_IN = False ):
+
+        '''
+        Accepts unsaved Person whose name parts hold a parsed name.  Returns the
+            set of IDs of Persons whose name parts match every part that is
+            populated in the parsed name.  If do_strict_match_IN, the name
+            parts that are empty in the parsed name must also be empty in the
+            match.  If no name parts are populated, returns an empty set.
+        '''
+
+        # return reference
+        id_set_OUT = set()
+
+        # declare variables
+        field_index = -1
+        field_name = None
+        normalized_value = None
+        match_set = None
+        candidate_set = None
+        parsed_key = None
+
+        # build normalized key for parsed name.
+        parsed_key = tuple( [ self.normalize_name_part( field_name, getattr( parsed_person_IN, field_name, None ) ) for field_name in self.NAME_PART_FIELD_LIST ] )
+
+        # intersect ID sets for populated parts, smallest first.
+        candidate_set = None
+        for field_index, field_name in enumerate( self.NAME_PART_FIELD_LIST ):
+
+            normalized_value = parsed_key[ field_index ]
+            if ( normalized_value != "" ):
+
+                match_set = self.name_part_index[ field_name ].get( normalized_value, set() )
+                if ( candidate_set is None ):
+
+                    candidate_set = set( match_set )
+
+                else:
+
+                    candidate_set &= match_set
+
+                #-- END check to see if first populated part --#
+
+            #-- END check to see if part populated --#
+
+        #-- END loop over name parts --#
+
+        # got anything?
+        if ( candidate_set is not None ):
+
+            # strict?
+            if ( do_strict_match_IN == True ):
+
+                # empty parts in parsed name must be empty in match.
+                for person_id in candidate_set:
+
+                    if ( self.is_strict_match( parsed_key, self.person_id_to_name_key_map[ person_id ] ) == True ):
+
+                        id_set_OUT.add( person_id )
+
+                    #-- END check to see if strict match --#
+
+                #-- END loop over candidates --#
+
+            else:
+
+                id_set_OUT = candidate_set
+
+            #-- END check to see if strict --#
+
+        #-- END check to see if any parts populated --#
+
+        return id_set_OUT
+
+    #-- END method look_up_person_ids() --#
+
+
+    def normalize_name_part( self, field_name_IN, value_IN ):
+
+        '''
+        Accepts name part field name and value.  Returns the value normalized
+            the way the database path compares it - if use_name_keys,
+            NameKeyHelper.make_name_key() for fields in NAME_KEY_FIELD_LIST,
+            else normalize_value().
+        '''
+
+        # return reference
+        value_OUT = ""
+
+        if ( ( self.use_name_keys == True ) and ( field_name_IN in self.NAME_KEY_FIELD_LIST ) ):
+
+            value_OUT = NameKeyHelper.make_name_key( value_IN )
+
+        else:
+
+            value_OUT = self.normalize_value( value_IN )
+
+        #-- END check to see if keyed field --#
+
+        return value_OUT
+
+    #-- END method normalize_name_part() --#
+
+
+    def remove_person( self, person_id_IN ):
+
+        '''
+        Accepts person ID.  If the person is in the index, removes them.
+            Returns True if removed, False if not in index.
+        '''
+
+        # return reference
+        was_removed_OUT = False
+
+        # declare variables
+        name_key = None
+        field_index = -1
+        field_name = None
+
+        # in index?
+        name_key = self.person_id_to_name_key_map.pop( person_id_IN, None )
+        if ( name_key is not None ):
+
+            # remove from each name part index.
+            for field_index, field_name in enumerate( self.NAME_PART_FIELD_LIST ):
+
+                self.name_part_index[ field_name ].get( name_key[ field_index ], set() ).discard( person_id_IN )
+
+            #-- END loop over name part fields --#
+
+            # and full name string.
+            self.full_name_string_index.get( name_key[ len( self.NAME_PART_FIELD_LIST ) ], set() ).discard( person_id_IN )
+
+            was_removed_OUT = True
+
+        #-- END check to see if in index --#
+
+        return was_removed_OUT
+
+    #-- END method remove_person() --#
+
+
+#-- END class PersonNameIndex --#
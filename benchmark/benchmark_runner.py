@@ -0,0 +1,620 @@
+from __future__ import unicode_literals
+from __future__ import division
+
+'''
+Copyright 2010-2016 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text.
+
+context_text is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text. If not, see http://www.gnu.org/licenses/.
+
+Times the coding and export hot paths on a SyntheticCorpus, counting
+   queries, and returns the results as a dictionary that is written out as
+   JSON, so results from two commits can be diffed (see compare_results()).
+   Each run of a scenario is inside a savepoint that is rolled back, so every
+   run starts from the same data.  OpenCalais is stubbed by pre-filling the
+   coder's response cache (see SyntheticCoding).
+
+Usage:
+
+    my_corpus = SyntheticCorpus( article_count_IN = 500 )
+    my_corpus.create()
+    my_runner = BenchmarkRunner( my_corpus )
+    result_dict = my_runner.run()
+    print( BenchmarkRunner.to_json( result_dict ) )
+    my_runner.cleanup()
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+
+# python base imports
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import timeit
+
+# django imports
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db import transaction
+from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+# context_text imports
+from context_text.article_coding.article_coder import ArticleCoder
+from context_text.article_coding.article_coding import ArticleCoding
+from context_text.article_coding.manual_coding.manual_article_coder import ManualArticleCoder
+from context_text.article_coding.open_calais_v2.open_calais_v2_article_coder import OpenCalaisV2ArticleCoder
+from context_text.benchmark.synthetic_coding import SyntheticCoding
+from context_text.export.csv_article_output import CsvArticleOutput
+from context_text.export.network_data_output import NetworkDataOutput
+from context_text.export.network_output import NetworkOutput
+from context_text.export.to_context_base.export_to_context import ExportToContext
+from context_text.models import Article
+from context_text.models import Article_Data
+from context_text.shared.context_text_base import ContextTextBase
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class BenchmarkRunner( object ):
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+
+    # defaults
+    DEFAULT_REPEAT_COUNT = 3
+    DEFAULT_CODING_ARTICLE_COUNT = 50
+
+    # bump when the layout of the result dictionary changes.
+    RESULT_FORMAT_VERSION = 1
+
+    # scenario names
+    SCENARIO_CODE_ARTICLE_DATA = "ArticleCoding.code_article_data"
+    SCENARIO_PROCESS_DATA_STORE_JSON = "ManualArticleCoder.process_data_store_json"
+    SCENARIO_NETWORK_OUTPUT_PREFIX = "NetworkOutput.render_network_data - "
+    SCENARIO_CSV_ARTICLE_OUTPUT_PREFIX = "CsvArticleOutput.render - "
+    SCENARIO_PROCESS_ARTICLES = "ExportToContext.process_articles"
+    SCENARIO_FILTER_ARTICLES = "Article.filter_articles"
+
+    # user the manual coding scenario codes as.
+    MANUAL_CODER_USERNAME = "synthetic_benchmark"
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> class methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    @classmethod
+    def compare_results( cls, old_result_dict_IN, new_result_dict_IN ):
+
+        '''
+        Accepts two result dictionaries from run() (say, from the commits
+           before and after a change).  Returns list of dictionaries, one per
+           scenario in both - name, old and new median milliseconds and query
+           counts, and new median as a ratio of old (None if old was 0).
+        '''
+
+        # return reference
+        list_OUT = []
+
+        # declare variables
+        old_scenario_dict = None
+        new_scenario = None
+        old_scenario = None
+        current_dict = None
+
+        old_scenario_dict = dict( [ ( old_scenario[ "name" ], old_scenario ) for old_scenario in old_result_dict_IN.get( "scenario_list", [] ) ] )
+        for new_scenario in new_result_dict_IN.get( "scenario_list", [] ):
+
+            old_scenario = old_scenario_dict.get( new_scenario[ "name" ], None )
+            if ( old_scenario is not None ):
+
+                current_dict = {}
+                current_dict[ "name" ] = new_scenario[ "name" ]
+                current_dict[ "old_median_ms" ] = old_scenario[ "median_ms" ]
+                current_dict[ "new_median_ms" ] = new_scenario[ "median_ms" ]
+                current_dict[ "old_query_count" ] = old_scenario[ "query_count" ]
+                current_dict[ "new_query_count" ] = new_scenario[ "query_count" ]
+                current_dict[ "median_ratio" ] = None
+                if ( ( old_scenario[ "median_ms" ] ) and ( new_scenario[ "median_ms" ] is not None ) ):
+
+                    current_dict[ "median_ratio" ] = new_scenario[ "median_ms" ] / old_scenario[ "median_ms" ]
+
+                #-- END check to see if we can divide --#
+
+                list_OUT.append( current_dict )
+
+            #-- END check to see if scenario in both --#
+
+        #-- END loop over new scenarios --#
+
+        return list_OUT
+
+    #-- END class method compare_results() --#
+
+
+    @classmethod
+    def get_git_revision( cls ):
+
+        '''
+        Returns the git commit this code is checked out at, or None if it is
+           not in a git repository (or git is not installed).
+        '''
+
+        # return reference
+        value_OUT = None
+
+        try:
+
+            value_OUT = subprocess.check_output( [ "git", "rev-parse", "HEAD" ], cwd = os.path.dirname( os.path.abspath( __file__ ) ), stderr = subprocess.STDOUT ).decode( "utf-8" ).strip()
+
+        except Exception as e:
+
+            value_OUT = None
+
+        #-- END try...except around git --#
+
+        return value_OUT
+
+    #-- END class method get_git_revision() --#
+
+
+    @classmethod
+    def to_json( cls, result_dict_IN ):
+
+        '''
+        Returns result dictionary as JSON, with sorted keys and one value per
+           line, so two results diff cleanly.
+        '''
+
+        return json.dumps( result_dict_IN, indent = 4, sort_keys = True )
+
+    #-- END class method to_json() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> __init__() method
+    #---------------------------------------------------------------------------
+
+
+    def __init__( self, corpus_IN, repeat_count_IN = DEFAULT_REPEAT_COUNT, coding_article_count_IN = DEFAULT_CODING_ARTICLE_COUNT ):
+
+        # declare variables
+        self.corpus = corpus_IN
+        self.repeat_count = repeat_count_IN
+
+        # coding and export scenarios use the first coding_article_count
+        #    articles - the rest of the corpus is there for the filter and
+        #    output scenarios.
+        self.coding_article_count = coding_article_count_IN
+
+        # set up by prepare()
+        self.is_prepared = False
+        self.temp_directory = None
+        self.response_cache_directory = None
+        self.network_output_directory = None
+        self.coding_article_id_list = []
+        self.data_store_json_dict = {}
+        self.manual_coder_user = None
+
+    #-- END method __init__() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def cleanup( self ):
+
+        '''
+        Removes the temporary response cache and output directories.
+        '''
+
+        if ( self.temp_directory is not None ):
+
+            shutil.rmtree( self.temp_directory, ignore_errors = True )
+            self.temp_directory = None
+
+        #-- END check to see if temp directory --#
+
+        self.is_prepared = False
+
+    #-- END method cleanup() --#
+
+
+    def get_coding_article_qs( self ):
+
+        '''
+        Returns QuerySet of the articles the coding and export scenarios use.
+        '''
+
+        return Article.objects.filter( id__in = self.coding_article_id_list ).order_by( "id" )
+
+    #-- END method get_coding_article_qs() --#
+
+
+    def get_scenario_list( self ):
+
+        '''
+        Returns list of ( name, setup function, run function ) for every
+           scenario.  Setup functions run inside the scenario's savepoint but
+           aren't timed.  None means no setup.
+        '''
+
+        # return reference
+        list_OUT = []
+
+        # declare variables
+        output_type = None
+        output_label = None
+
+        list_OUT.append( ( self.SCENARIO_CODE_ARTICLE_DATA, None, self.run_code_article_data ) )
+        list_OUT.append( ( self.SCENARIO_PROCESS_DATA_STORE_JSON, None, self.run_process_data_store_json ) )
+        for output_type, output_label in NetworkDataOutput.NETWORK_DATA_FORMAT_CHOICES_LIST:
+
+            list_OUT.append( ( self.SCENARIO_NETWORK_OUTPUT_PREFIX + output_type, None, self.make_network_output_function( output_type ) ) )
+
+        #-- END loop over network data output types --#
+
+        for output_type, output_label in CsvArticleOutput.OUTPUT_TYPE_CHOICES_LIST:
+
+            list_OUT.append( ( self.SCENARIO_CSV_ARTICLE_OUTPUT_PREFIX + output_type, None, self.make_csv_article_output_function( output_type ) ) )
+
+        #-- END loop over CSV output types --#
+
+        list_OUT.append( ( self.SCENARIO_PROCESS_ARTICLES, self.setup_process_articles, self.run_process_articles ) )
+        list_OUT.append( ( self.SCENARIO_FILTER_ARTICLES, None, self.run_filter_articles ) )
+
+        return list_OUT
+
+    #-- END method get_scenario_list() --#
+
+
+    def make_csv_article_output_function( self, output_type_IN ):
+
+        '''
+        Returns function that renders the corpus's Article_Data as CSV of the
+           type passed in, through NetworkOutput, the way the output views do.
+        '''
+
+        def run_csv_article_output():
+
+            # declare variables
+            network_outputter = None
+            csv_outputter = None
+
+            network_outputter = self.make_network_outputter( { NetworkOutput.PARAM_OUTPUT_TYPE : output_type_IN } )
+            csv_outputter = network_outputter.create_csv_article_output( network_outputter.create_network_query_set() )
+            csv_outputter.render()
+
+        #-- END function run_csv_article_output() --#
+
+        return run_csv_article_output
+
+    #-- END method make_csv_article_output_function() --#
+
+
+    def make_network_output_function( self, output_type_IN ):
+
+        '''
+        Returns function that renders the corpus's network in the NDO output
+           type passed in, through NetworkOutput, the way the output views do.
+        '''
+
+        def run_network_output():
+
+            # declare variables
+            network_outputter = None
+
+            network_outputter = self.make_network_outputter( { NetworkOutput.PARAM_OUTPUT_TYPE : output_type_IN,
+                                                               NetworkOutput.PARAM_NETWORK_DATA_OUTPUT_TYPE : NetworkOutput.NETWORK_DATA_OUTPUT_TYPE_NET_AND_ATTR_COLS,
+                                                               NetworkOutput.PARAM_PERSON_QUERY_TYPE : NetworkOutput.PERSON_QUERY_TYPE_ARTICLES,
+                                                               NetworkOutput.PARAM_NETWORK_OUTPUT_DIRECTORY : self.network_output_directory } )
+            network_outputter.render_network_data( network_outputter.create_network_query_set() )
+
+        #-- END function run_network_output() --#
+
+        return run_network_output
+
+    #-- END method make_network_output_function() --#
+
+
+    def make_network_outputter( self, param_dict_IN ):
+
+        '''
+        Returns NetworkOutput set up from a POST request for the corpus's
+           newspapers, plus the parameters passed in.
+        '''
+
+        # return reference
+        instance_OUT = None
+
+        # declare variables
+        post_dict = None
+        current_newspaper = None
+
+        post_dict = {}
+        post_dict[ ContextTextBase.PARAM_PUBLICATION_LIST ] = [ current_newspaper.id for current_newspaper in self.corpus.newspaper_list ]
+        post_dict.update( param_dict_IN )
+
+        instance_OUT = NetworkOutput()
+        instance_OUT.set_request( RequestFactory().post( "/", post_dict ) )
+
+        return instance_OUT
+
+    #-- END method make_network_outputter() --#
+
+
+    def prepare( self ):
+
+        '''
+        Picks the coding articles, makes temporary directories, stores an
+           OpenCalais response for each coding article in the response cache,
+           and makes the manual coder's data store JSON for each.
+        '''
+
+        # declare variables
+        person_name_to_id_dict = None
+        current_person = None
+        current_article = None
+        created = False
+
+        self.coding_article_id_list = [ current_article.id for current_article in self.corpus.article_list[ : self.coding_article_count ] ]
+
+        # directories
+        self.temp_directory = tempfile.mkdtemp( prefix = "context_text_benchmark-" )
+        self.response_cache_directory = os.path.join( self.temp_directory, "response_cache" )
+        self.network_output_directory = os.path.join( self.temp_directory, "network_output" )
+        os.makedirs( self.network_output_directory )
+
+        # OpenCalais stub
+        SyntheticCoding.populate_response_cache( self.get_coding_article_qs(), self.response_cache_directory )
+
+        # manual coding
+        person_name_to_id_dict = dict( [ ( current_person.full_name_string, current_person.id ) for current_person in self.corpus.person_list ] )
+        self.data_store_json_dict = {}
+        for current_article in self.get_coding_article_qs():
+
+            self.data_store_json_dict[ current_article.id ] = SyntheticCoding.make_data_store_json( current_article, person_name_to_id_dict )
+
+        #-- END loop over coding articles --#
+
+        self.manual_coder_user, created = User.objects.get_or_create( username = self.MANUAL_CODER_USERNAME )
+        self.is_prepared = True
+
+    #-- END method prepare() --#
+
+
+    def run( self, scenario_name_list_IN = None ):
+
+        '''
+        Accepts optional list of scenario names (or name prefixes) to run -
+           default is all.  Runs each scenario repeat_count times.  Returns
+           result dictionary - the corpus summary, environment, and a result
+           dictionary for each scenario (see run_scenario()).
+        '''
+
+        # return reference
+        dict_OUT = {}
+
+        # declare variables
+        scenario_list = None
+        scenario_name = ""
+        setup_function = None
+        run_function = None
+        name_prefix = ""
+
+        if ( self.is_prepared == False ):
+
+            self.prepare()
+
+        #-- END check to see if prepared --#
+
+        dict_OUT[ "format_version" ] = self.RESULT_FORMAT_VERSION
+        dict_OUT[ "git_revision" ] = self.get_git_revision()
+        dict_OUT[ "database_vendor" ] = connection.vendor
+        dict_OUT[ "python_version" ] = platform.python_version()
+        dict_OUT[ "corpus" ] = self.corpus.get_summary_dict()
+        dict_OUT[ "repeat_count" ] = self.repeat_count
+        dict_OUT[ "coding_article_count" ] = len( self.coding_article_id_list )
+        dict_OUT[ "scenario_list" ] = []
+
+        scenario_list = self.get_scenario_list()
+        for scenario_name, setup_function, run_function in scenario_list:
+
+            if ( ( scenario_name_list_IN is None ) or ( True in [ scenario_name.startswith( name_prefix ) for name_prefix in scenario_name_list_IN ] ) ):
+
+                dict_OUT[ "scenario_list" ].append( self.run_scenario( scenario_name, setup_function, run_function ) )
+
+            #-- END check to see if we run this scenario --#
+
+        #-- END loop over scenarios --#
+
+        return dict_OUT
+
+    #-- END method run() --#
+
+
+    def run_code_article_data( self ):
+
+        # declare variables
+        my_article_coding = None
+        param_dict = None
+
+        param_dict = {}
+        param_dict[ ArticleCoding.PARAM_CODER_TYPE ] = ArticleCoding.ARTICLE_CODING_IMPL_OPEN_CALAIS_API_V2
+        param_dict[ OpenCalaisV2ArticleCoder.CONFIG_PROP_RESPONSE_CACHE_DIRECTORY ] = self.response_cache_directory
+
+        my_article_coding = ArticleCoding()
+        my_article_coding.store_parameters( param_dict )
+        my_article_coding.code_article_data( self.get_coding_article_qs() )
+
+    #-- END method run_code_article_data() --#
+
+
+    def run_filter_articles( self ):
+
+        '''
+        Runs and loads the Article.filter_articles() filter shapes the views
+           and ArticleCoding use - newspapers and date range and section,
+           date range, and unique identifiers.
+        '''
+
+        # declare variables
+        start_date_string = ""
+        end_date_string = ""
+        current_newspaper = None
+        newspaper_id_list = None
+        params_list = None
+        current_params = None
+
+        start_date_string = self.corpus.start_date.strftime( "%Y-%m-%d" )
+        end_date_string = ( self.corpus.start_date.replace( month = 1, day = 31 ) ).strftime( "%Y-%m-%d" )
+        newspaper_id_list = [ current_newspaper.id for current_newspaper in self.corpus.newspaper_list ]
+
+        params_list = []
+        params_list.append( { Article.PARAM_NEWSPAPER_ID_IN_LIST : newspaper_id_list, Article.PARAM_START_DATE : start_date_string, Article.PARAM_END_DATE : end_date_string, Article.PARAM_SECTION_NAME_IN_LIST : self.corpus.SECTION_NAME_LIST[ : 1 ] } )
+        params_list.append( { Article.PARAM_NEWSPAPER_ID_IN_LIST : newspaper_id_list, Article.PARAM_START_DATE : start_date_string, Article.PARAM_END_DATE : end_date_string } )
+        params_list.append( { Article.PARAM_UNIQUE_ID_IN_LIST : [ self.corpus.get_unique_identifier( article_index ) for article_index in range( self.coding_article_count ) ] } )
+        for current_params in params_list:
+
+            list( Article.filter_articles( params_IN = current_params ) )
+
+        #-- END loop over filter parameters --#
+
+    #-- END method run_filter_articles() --#
+
+
+    def run_process_articles( self ):
+
+        # declare variables
+        my_export = None
+
+        my_export = ExportToContext()
+        my_export.progress_interval = self.coding_article_count + 1
+        my_export.process_articles( self.get_coding_article_qs() )
+
+    #-- END method run_process_articles() --#
+
+
+    def run_process_data_store_json( self ):
+
+        # declare variables
+        my_manual_coder = None
+        current_article = None
+
+        my_manual_coder = ManualArticleCoder()
+        for current_article in self.get_coding_article_qs():
+
+            my_manual_coder.process_data_store_json( current_article, self.manual_coder_user, self.data_store_json_dict[ current_article.id ] )
+
+        #-- END loop over coding articles --#
+
+    #-- END method run_process_data_store_json() --#
+
+
+    def run_scenario( self, scenario_name_IN, setup_function_IN, run_function_IN ):
+
+        '''
+        Runs scenario repeat_count times, each in a savepoint that is rolled
+           back.  Returns dictionary - name, query count (from the last run),
+           minimum, median, and maximum milliseconds, milliseconds for each
+           run, and error (None, or the exception message if a run failed -
+           no more runs after that).
+        '''
+
+        # return reference
+        dict_OUT = {}
+
+        # declare variables
+        ms_list = None
+        query_count = None
+        error_message = None
+        run_index = -1
+        captured_queries = None
+        start_time = None
+        elapsed_ms = None
+
+        ms_list = []
+        for run_index in range( self.repeat_count ):
+
+            if ( error_message is None ):
+
+                try:
+
+                    with transaction.atomic():
+
+                        if ( setup_function_IN is not None ):
+
+                            setup_function_IN()
+
+                        #-- END check to see if setup --#
+
+                        with CaptureQueriesContext( connection ) as captured_queries:
+
+                            start_time = timeit.default_timer()
+                            run_function_IN()
+                            elapsed_ms = ( timeit.default_timer() - start_time ) * 1000
+
+                        #-- END with CaptureQueriesContext --#
+
+                        ms_list.append( elapsed_ms )
+                        query_count = len( captured_queries )
+                        transaction.set_rollback( True )
+
+                    #-- END with savepoint --#
+
+                except Exception as e:
+
+                    error_message = "{}: {}".format( type( e ).__name__, e )
+
+                #-- END try...except around scenario --#
+
+            #-- END check to see if error in an earlier run --#
+
+        #-- END loop over runs --#
+
+        dict_OUT[ "name" ] = scenario_name_IN
+        dict_OUT[ "query_count" ] = query_count
+        dict_OUT[ "ms_list" ] = ms_list
+        dict_OUT[ "min_ms" ] = min( ms_list ) if ( len( ms_list ) > 0 ) else None
+        dict_OUT[ "median_ms" ] = sorted( ms_list )[ ( len( ms_list ) - 1 ) // 2 ] if ( len( ms_list ) > 0 ) else None
+        dict_OUT[ "max_ms" ] = max( ms_list ) if ( len( ms_list ) > 0 ) else None
+        dict_OUT[ "error" ] = error_message
+
+        return dict_OUT
+
+    #-- END method run_scenario() --#
+
+
+    def setup_process_articles( self ):
+
+        '''
+        ExportToContext exports automated OpenCalais coding - hand the
+           coding articles' synthetic automated Article_Data to the automated
+           coding user.
+        '''
+
+        Article_Data.objects.filter( article_id__in = self.coding_article_id_list, coder = self.corpus.coder_list[ 0 ] ).update( coder = ArticleCoder.get_automated_coding_user() )
+
+    #-- END method setup_process_articles() --#
+
+
+#-- END class BenchmarkRunner --#
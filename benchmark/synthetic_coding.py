@@ -0,0 +1,330 @@
+from __future__ import unicode_literals
+
+'''
+Copyright 2010-2016 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text.
+
+context_text is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text. If not, see http://www.gnu.org/licenses/.
+
+Makes coder input for articles in a SyntheticCorpus (see
+   context_text.data.synthetic_corpus) - the OpenCalais API response and the
+   manual coding data store JSON a coder would submit - from the quotations in
+   each article's text ('"<quote>," said <name>.').  OpenCalais responses are
+   stored in an OpenCalaisV2ArticleCoder response cache directory, so coding
+   the articles reads them from there rather than calling the API.
+
+Usage:
+
+    SyntheticCoding.populate_response_cache( article_qs, cache_directory )
+    my_article_coding.store_parameters( { "response_cache_directory" : cache_directory, ... } )
+    my_article_coding.code_article_data( article_qs )
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+
+# python base imports
+import hashlib
+import json
+import re
+
+# six - Python 2 and 3 support
+import six
+
+# context_text imports
+from context_text.article_coding.manual_coding.manual_article_coder import ManualArticleCoder
+from context_text.article_coding.open_calais_v2.open_calais_v2_api_response import OpenCalaisV2ApiResponse
+from context_text.article_coding.open_calais_v2.open_calais_v2_article_coder import OpenCalaisV2ArticleCoder
+from context_text.shared.response_cache import ResponseCache
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class SyntheticCoding( object ):
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+
+    # quotations in synthetic article text - '"<quote>," said <name>.'
+    QUOTATION_REGEX = re.compile( r'"(?P<quote>[^"]+)," said (?P<name>[^.]+)\.' )
+
+    # characters of context around a mention.
+    CONTEXT_LENGTH = 30
+
+    # OpenCalais URIs
+    URI_PREFIX_PERSON = "http://d.opencalais.com/pershash-1/"
+    URI_PREFIX_QUOTATION = "http://d.opencalais.com/genericHasher-1/"
+    URI_DOC = "http://d.opencalais.com/dochash-1/synthetic"
+
+    # OpenCalais type groups
+    TYPE_GROUP_ENTITIES = "entities"
+    TYPE_GROUP_RELATIONS = "relations"
+
+    # author string divider (see SyntheticCorpus.create_articles()).
+    AUTHOR_STRING_DIVIDER = " / "
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> class methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    @classmethod
+    def find_quotation_list( cls, text_IN ):
+
+        '''
+        Accepts plain text of a synthetic article.  Returns list of dictionaries,
+           one per quotation, in order - "quote", "name", "exact" (the whole
+           sentence, quotation through attribution), and the "offset" and
+           "length" of the name and of the sentence in the text.
+        '''
+
+        # return reference
+        list_OUT = []
+
+        # declare variables
+        current_match = None
+        current_dict = None
+
+        for current_match in cls.QUOTATION_REGEX.finditer( text_IN ):
+
+            current_dict = {}
+            current_dict[ "quote" ] = current_match.group( "quote" )
+            current_dict[ "name" ] = current_match.group( "name" )
+            current_dict[ "exact" ] = current_match.group( 0 )
+            current_dict[ "offset" ] = current_match.start()
+            current_dict[ "length" ] = current_match.end() - current_match.start()
+            current_dict[ "name_offset" ] = current_match.start( "name" )
+            current_dict[ "name_length" ] = current_match.end( "name" ) - current_match.start( "name" )
+            list_OUT.append( current_dict )
+
+        #-- END loop over quotations --#
+
+        return list_OUT
+
+    #-- END class method find_quotation_list() --#
+
+
+    @classmethod
+    def make_data_store_json( cls, article_IN, person_name_to_id_dict_IN ):
+
+        '''
+        Accepts article and dictionary of person name to Person ID.  Returns
+           the manual coding data store JSON string a coder would submit for
+           the article - its author, then a source for each quotation.
+        '''
+
+        # return reference
+        json_OUT = None
+
+        # declare variables
+        person_list = None
+        author_name = ""
+        current_quotation = None
+        data_store_dict = None
+        current_person = None
+        person_index = -1
+
+        # people - author first.
+        person_list = []
+        author_name = article_IN.author_varchar.split( cls.AUTHOR_STRING_DIVIDER )[ 0 ].strip()
+        person_list.append( cls.make_data_store_person( ManualArticleCoder.PERSON_TYPE_AUTHOR, author_name, person_name_to_id_dict_IN, "" ) )
+        for current_quotation in cls.find_quotation_list( article_IN.article_text_set.get().get_content_sans_html() ):
+
+            person_list.append( cls.make_data_store_person( ManualArticleCoder.PERSON_TYPE_SOURCE, current_quotation[ "name" ], person_name_to_id_dict_IN, current_quotation[ "exact" ] ) )
+
+        #-- END loop over quotations --#
+
+        # data store
+        data_store_dict = {}
+        data_store_dict[ ManualArticleCoder.DATA_STORE_PROP_PERSON_ARRAY ] = person_list
+        data_store_dict[ ManualArticleCoder.DATA_STORE_PROP_NEXT_PERSON_INDEX ] = len( person_list )
+        data_store_dict[ ManualArticleCoder.DATA_STORE_PROP_LATEST_PERSON_INDEX ] = len( person_list ) - 1
+        data_store_dict[ ManualArticleCoder.DATA_STORE_PROP_NAME_TO_PERSON_INDEX_MAP ] = {}
+        data_store_dict[ ManualArticleCoder.DATA_STORE_PROP_ID_TO_PERSON_INDEX_MAP ] = {}
+        data_store_dict[ ManualArticleCoder.DATA_STORE_PROP_STATUS_MESSAGE_ARRAY ] = []
+        for person_index, current_person in enumerate( person_list ):
+
+            data_store_dict[ ManualArticleCoder.DATA_STORE_PROP_NAME_TO_PERSON_INDEX_MAP ][ current_person[ ManualArticleCoder.DATA_STORE_PROP_PERSON_NAME ] ] = person_index
+            if ( current_person[ ManualArticleCoder.DATA_STORE_PROP_PERSON_ID ] is not None ):
+
+                data_store_dict[ ManualArticleCoder.DATA_STORE_PROP_ID_TO_PERSON_INDEX_MAP ][ six.text_type( current_person[ ManualArticleCoder.DATA_STORE_PROP_PERSON_ID ] ) ] = person_index
+
+            #-- END check to see if person ID --#
+
+        #-- END loop over people --#
+
+        json_OUT = json.dumps( data_store_dict )
+
+        return json_OUT
+
+    #-- END class method make_data_store_json() --#
+
+
+    @classmethod
+    def make_data_store_person( cls, person_type_IN, person_name_IN, person_name_to_id_dict_IN, quote_text_IN ):
+
+        '''
+        Returns data store dictionary for one person.
+        '''
+
+        # return reference
+        dict_OUT = {}
+
+        dict_OUT[ ManualArticleCoder.DATA_STORE_PROP_PERSON_TYPE ] = person_type_IN
+        dict_OUT[ ManualArticleCoder.DATA_STORE_PROP_PERSON_NAME ] = person_name_IN
+        dict_OUT[ ManualArticleCoder.DATA_STORE_PROP_TITLE ] = ""
+        dict_OUT[ ManualArticleCoder.DATA_STORE_PROP_QUOTE_TEXT ] = quote_text_IN
+        dict_OUT[ ManualArticleCoder.DATA_STORE_PROP_PERSON_ID ] = person_name_to_id_dict_IN.get( person_name_IN, None )
+
+        return dict_OUT
+
+    #-- END class method make_data_store_person() --#
+
+
+    @classmethod
+    def make_instance_dict( cls, text_IN, offset_IN, length_IN ):
+
+        '''
+        Returns OpenCalais "instances" entry for the span of text_IN at
+           offset_IN, length_IN long.
+        '''
+
+        # return reference
+        dict_OUT = {}
+
+        # declare variables
+        prefix = ""
+        exact = ""
+        suffix = ""
+
+        prefix = text_IN[ max( 0, offset_IN - cls.CONTEXT_LENGTH ) : offset_IN ]
+        exact = text_IN[ offset_IN : offset_IN + length_IN ]
+        suffix = text_IN[ offset_IN + length_IN : offset_IN + length_IN + cls.CONTEXT_LENGTH ]
+
+        dict_OUT[ OpenCalaisV2ApiResponse.JSON_NAME_DETECTION ] = "[{}]{}[{}]".format( prefix, exact, suffix )
+        dict_OUT[ OpenCalaisV2ApiResponse.JSON_NAME_PREFIX ] = prefix
+        dict_OUT[ OpenCalaisV2ApiResponse.JSON_NAME_EXACT ] = exact
+        dict_OUT[ OpenCalaisV2ApiResponse.JSON_NAME_SUFFIX ] = suffix
+        dict_OUT[ OpenCalaisV2ApiResponse.JSON_NAME_OFFSET ] = offset_IN
+        dict_OUT[ OpenCalaisV2ApiResponse.JSON_NAME_LENGTH ] = length_IN
+
+        return dict_OUT
+
+    #-- END class method make_instance_dict() --#
+
+
+    @classmethod
+    def make_open_calais_json( cls, text_IN ):
+
+        '''
+        Accepts plain text of a synthetic article.  Returns dictionary shaped
+           like an OpenCalais v2 API JSON response for it - a Person entity for
+           each person quoted, with an instance per mention, and a Quotation
+           relation for each quotation.
+        '''
+
+        # return reference
+        dict_OUT = {}
+
+        # declare variables
+        quotation_index = -1
+        current_quotation = None
+        person_uri = ""
+        person_dict = None
+        quotation_dict = None
+
+        dict_OUT[ OpenCalaisV2ApiResponse.JSON_NAME_DOC ] = { "info" : { "docId" : cls.URI_DOC } }
+        for quotation_index, current_quotation in enumerate( cls.find_quotation_list( text_IN ) ):
+
+            # person
+            person_uri = cls.make_uri( cls.URI_PREFIX_PERSON, current_quotation[ "name" ] )
+            person_dict = dict_OUT.get( person_uri, None )
+            if ( person_dict is None ):
+
+                person_dict = {}
+                person_dict[ OpenCalaisV2ApiResponse.JSON_NAME_ITEM_TYPE_GROUP ] = cls.TYPE_GROUP_ENTITIES
+                person_dict[ OpenCalaisV2ApiResponse.JSON_NAME_ITEM_TYPE ] = OpenCalaisV2ApiResponse.OC_ITEM_TYPE_PERSON
+                person_dict[ OpenCalaisV2ApiResponse.JSON_NAME_PERSON_NAME ] = current_quotation[ "name" ]
+                person_dict[ OpenCalaisV2ApiResponse.JSON_NAME_INSTANCES ] = []
+                dict_OUT[ person_uri ] = person_dict
+
+            #-- END check to see if person already in response --#
+
+            person_dict[ OpenCalaisV2ApiResponse.JSON_NAME_INSTANCES ].append( cls.make_instance_dict( text_IN, current_quotation[ "name_offset" ], current_quotation[ "name_length" ] ) )
+
+            # quotation
+            quotation_dict = {}
+            quotation_dict[ OpenCalaisV2ApiResponse.JSON_NAME_ITEM_TYPE_GROUP ] = cls.TYPE_GROUP_RELATIONS
+            quotation_dict[ OpenCalaisV2ApiResponse.JSON_NAME_ITEM_TYPE ] = OpenCalaisV2ApiResponse.OC_ITEM_TYPE_QUOTATION
+            quotation_dict[ OpenCalaisV2ApiResponse.JSON_NAME_QUOTE_PERSON_URI ] = person_uri
+            quotation_dict[ OpenCalaisV2ApiResponse.JSON_NAME_QUOTATION ] = current_quotation[ "quote" ]
+            quotation_dict[ OpenCalaisV2ApiResponse.JSON_NAME_QUOTE_QUOTATION_TYPE ] = OpenCalaisV2ApiResponse.QUOTATION_TYPE_PRIMARY
+            quotation_dict[ OpenCalaisV2ApiResponse.JSON_NAME_INSTANCES ] = [ cls.make_instance_dict( text_IN, current_quotation[ "offset" ], current_quotation[ "length" ] ) ]
+            dict_OUT[ cls.make_uri( cls.URI_PREFIX_QUOTATION, "{}|{}".format( quotation_index, current_quotation[ "exact" ] ) ) ] = quotation_dict
+
+        #-- END loop over quotations --#
+
+        return dict_OUT
+
+    #-- END class method make_open_calais_json() --#
+
+
+    @classmethod
+    def make_uri( cls, prefix_IN, value_IN ):
+
+        '''
+        Returns prefix_IN plus a hash of value_IN - same value, same URI.
+        '''
+
+        return prefix_IN + hashlib.md5( six.text_type( value_IN ).encode( "utf-8" ) ).hexdigest()
+
+    #-- END class method make_uri() --#
+
+
+    @classmethod
+    def populate_response_cache( cls, article_qs_IN, cache_directory_IN ):
+
+        '''
+        Accepts QuerySet of synthetic articles and response cache directory.
+           Stores an OpenCalais response for each article's text in the cache,
+           under the key OpenCalaisV2ArticleCoder looks it up by.  Returns
+           count of responses stored.
+        '''
+
+        # return reference
+        count_OUT = 0
+
+        # declare variables
+        article_coder = None
+        response_cache = None
+        current_article = None
+        request_data = ""
+
+        article_coder = OpenCalaisV2ArticleCoder()
+        response_cache = ResponseCache( cache_directory_IN )
+        for current_article in article_qs_IN:
+
+            request_data = article_coder.get_article_request_data( current_article )
+            response_cache.put( article_coder.get_response_cache_key( request_data ), json.dumps( cls.make_open_calais_json( request_data ) ) )
+            count_OUT += 1
+
+        #-- END loop over articles --#
+
+        return count_OUT
+
+    #-- END class method populate_response_cache() --#
+
+
+#-- END class SyntheticCoding --#
@@ -128,6 +128,10 @@ class Collector( object ):
     # variable to hold BeautifulSoupHelper, if needed.
     bs_helper = None
     
+    # if set, ConcurrentFetcher used to retrieve items in queue at once (see
+    #    get_item_request() and iterate_item_queue()).
+    fetcher = None
+    
     # error handling variables
     error_id_to_details_map = {}
     error_limit = -1
@@ -567,6 +571,24 @@ class Collector( object ):
     #-- END method get_id_for_item() --#
 
 
+    def get_item_request( self, id_IN, item_IN ):
+
+        '''
+        Accepts an item ID and item.  If the item can be retrieved by a
+           ConcurrentFetcher before it is processed, returns a URL string or
+           urllib Request for it.  Defaults to returning None (no fetching -
+           process_item() gets just the ID and item).  Override in child
+           classes that load items from the web.
+        '''
+
+        # return reference
+        request_OUT = None
+
+        return request_OUT
+
+    #-- END method get_item_request() --#
+
+
     def get_regex_id( self ):
     
         # return reference
@@ -596,6 +618,65 @@ class Collector( object ):
     #-- END method initialize() --#
 
 
+    def iterate_item_queue( self, item_queue_map_IN ):
+
+        '''
+        Generator - accepts item queue map (ID to item).  Yields a tuple of
+           ( id, item, fetch_result ) for each item in the map.  If there is
+           a fetcher in this instance, items for which get_item_request()
+           returns a request are retrieved concurrently, and fetch_result is
+           the FetchResult for the item.  Otherwise, fetch_result is None.
+        '''
+
+        # declare variables
+        request_list = []
+        current_id = ""
+        current_item = ""
+        current_request = None
+        fetch_result = None
+
+        # fetching?
+        if ( self.fetcher is not None ):
+
+            # yes - build list of requests, yield items with no request now.
+            request_list = []
+            for current_id, current_item in list( item_queue_map_IN.items() ):
+
+                current_request = self.get_item_request( current_id, current_item )
+                if ( current_request is not None ):
+
+                    request_list.append( ( ( current_id, current_item ), current_request ) )
+
+                else:
+
+                    yield ( current_id, current_item, None )
+
+                #-- END check to see if request --#
+
+            #-- END loop over items --#
+
+            # fetch the rest, in order.
+            for fetch_result in self.fetcher.fetch_all( request_list ):
+
+                current_id, current_item = fetch_result.key
+                yield ( current_id, current_item, fetch_result )
+
+            #-- END loop over fetch results --#
+
+        else:
+
+            # no - just items.
+            for current_id, current_item in list( item_queue_map_IN.items() ):
+
+                yield ( current_id, current_item, None )
+
+            #-- END loop over items --#
+
+        #-- END check to see if fetching --#
+
+    #-- END method iterate_item_queue() --#
+
+
     def output_debug( self, message_IN, me_IN = "", prefix_IN = "" ):
     
         '''
@@ -744,12 +825,13 @@ class Collector( object ):
     #-- END method output_errors --#
 
 
-    def process_item( self, item_id_IN, item_IN ):
+    def process_item( self, item_id_IN, item_IN, fetch_result_IN = None ):
 
         '''
         This function is called on each item in the item queue.  It should
            be overridden in the child method.  It is called by
-           process_item_queue().
+           process_item_queue().  If the item was retrieved by the fetcher,
+           fetch_result_IN is the (successful) FetchResult for it.
         '''
         
         # return reference
@@ -769,6 +851,9 @@ class Collector( object ):
            it in database with status of "unparsed".  Eventually, could build
            rudimentary BS parsing in right here, but for now, just need to get
            the data.
+           If there is a fetcher in this instance, items are retrieved
+           concurrently, then handed to process_item() one at a time, in this
+           thread (see iterate_item_queue()).
         Preconditions: must have already pulled over the article list page and
            grabbed the appropriate <ul> for processing.
         '''    
@@ -787,6 +872,7 @@ class Collector( object ):
         current_page_contents = ""
         item_counter = 0
         do_clear_queue_on_finish = True
+        current_fetch_result = None
         
         # set flag to clear queue
         do_clear_queue_on_finish = clear_on_finish_IN
@@ -796,7 +882,7 @@ class Collector( object ):
         my_queue_size = len( my_item_queue_map )
         if ( my_queue_size > 0 ):
         
-            for current_id, current_item in my_item_queue_map.items():
+            for current_id, current_item, current_fetch_result in self.iterate_item_queue( my_item_queue_map ):
             
                 # increment counter and output debug.
                 item_counter += 1
@@ -811,8 +897,23 @@ class Collector( object ):
                 #    error.
                 try:
                 
-                    # got an item.  Invoke the process_item method.
-                    self.process_item( current_id, current_item )
+                    # fetched?
+                    if ( current_fetch_result is None ):
+
+                        # no.  Invoke the process_item method.
+                        self.process_item( current_id, current_item )
+
+                    elif ( current_fetch_result.is_success() == True ):
+
+                        # yes.  Pass along what we got.
+                        self.process_item( current_id, current_item, fetch_result_IN = current_fetch_result )
+
+                    else:
+
+                        # could not retrieve item.  Log it.
+                        self.add_error( current_item, current_id, "ERROR: could not retrieve item in Collector." + me + ": " + str( current_fetch_result.exception ), None, current_fetch_result.stack_trace )
+
+                    #-- END check to see if fetched --#
                     
                 except Exception as e:
                 
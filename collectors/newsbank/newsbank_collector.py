@@ -23,10 +23,16 @@ This code file contains a class that can be used to pull down articles from
 #================================================================================
 
 # imports
+import collections
+import concurrent.futures
 import datetime
+import functools
 import gc
+import itertools
+import json
 import os
 import sys
+import traceback
 
 # regular expression library.
 import re
@@ -49,6 +55,9 @@ from python_utilities.beautiful_soup.beautiful_soup_helper import BeautifulSoupH
 # collector parent class
 from collector import Collector
 
+# concurrent fetching
+from newsbank_fetcher import ConcurrentFetcher
+
 # Newsbank helper
 from newsbank_helper import NewsBankHelper
 
@@ -70,6 +79,81 @@ PLACE_CODE_GRAND_RAPIDS_PRESS = "GRPB"
 DEFAULT_DATE_FORMAT = "%Y-%m-%d"
 
 
+#================================================================================
+# Package functions
+#================================================================================
+
+
+# NewsBankHelper parse_item_file() uses in worker processes (one per process).
+worker_newsbank_helper = None
+
+def parse_item_file( item_IN, newsbank_helper_IN = None ):
+
+    '''
+    Accepts a tuple of ( id, file_path ) for a file that contains the HTML of a
+       NewsBank article, and an optional NewsBankHelper.  Reads the file and
+       parses it (see NewsBankHelper.parse_file_contents()) without touching
+       the database, so it can be run in a worker process.  If no helper is
+       passed in, uses one per process.
+
+    Returns a tuple of ( id, file_path, parsed_article, error_message,
+       stack_trace ).  If there was an exception, parsed_article is None and
+       error_message and stack_trace describe the exception.
+    '''
+
+    # return reference
+    result_OUT = None
+
+    # declare variables
+    global worker_newsbank_helper
+    item_id = ""
+    item_path = ""
+    nb_helper = None
+    item_file = None
+    parsed_article = None
+    error_message = ""
+    stack_trace = ""
+
+    item_id, item_path = item_IN
+
+    # get helper.
+    nb_helper = newsbank_helper_IN
+    if ( nb_helper is None ):
+
+        if ( worker_newsbank_helper is None ):
+
+            worker_newsbank_helper = NewsBankHelper()
+
+        #-- END check to see if helper for this process --#
+
+        nb_helper = worker_newsbank_helper
+
+    #-- END check to see if helper passed in --#
+
+    try:
+
+        # read article HTML, then parse.
+        with open( item_path, 'r' ) as item_file:
+
+            parsed_article = nb_helper.parse_file_contents( item_id, item_file.read() )
+
+        #-- END with open file --#
+
+    except Exception as e:
+
+        parsed_article = None
+        error_message = str( e )
+        stack_trace = traceback.format_exc()
+
+    #-- END try/except around parse --#
+
+    result_OUT = ( item_id, item_path, parsed_article, error_message, stack_trace )
+
+    return result_OUT
+
+#-- END function parse_item_file() --#
+
+
 #================================================================================
 # NewsBankCollector class
 #================================================================================
@@ -212,6 +296,15 @@ class NewsBankWebCollector( NewsBankCollector ):
     always_new_connection = False
     init_url = "http://infoweb.newsbank.com/best/usyearend"
     
+    # concurrent fetching - if fetch_max_workers > 1, issue and article pages
+    #    are retrieved by a ConcurrentFetcher (see initialize_fetcher()).
+    #    Defaults to one page at a time.
+    fetch_max_workers = 1
+    fetch_per_host_limit = ConcurrentFetcher.DEFAULT_PER_HOST_LIMIT
+    fetch_max_retries = ConcurrentFetcher.DEFAULT_MAX_RETRIES
+    fetch_backoff_seconds = ConcurrentFetcher.DEFAULT_BACKOFF_SECONDS
+    fetch_politeness_delay = ConcurrentFetcher.DEFAULT_POLITENESS_DELAY
+    
     #============================================================================
     # Instance methods
     #============================================================================
@@ -469,6 +562,11 @@ class NewsBankWebCollector( NewsBankCollector ):
            variable article queue (a map of docid to URL).
         - Second, it loops over the articles in the queue, loads and
            processes each, then clears the queue for the next issue.
+
+        If fetch_max_workers is greater than 1, issue pages are retrieved
+           ahead of time and article pages for each issue are retrieved at
+           once, by a ConcurrentFetcher (see initialize_fetcher()).  They are
+           still processed in order, in this thread.
         
         Preconditions: None.
         Postconditions: None. 
@@ -483,6 +581,8 @@ class NewsBankWebCollector( NewsBankCollector ):
         my_url_opener = None
         current_date = ""
         date_counter = -1
+        issue_list = None
+        issue_fetch_result = None
         current_request = None
         current_connection = None
         current_content = ""
@@ -497,11 +597,25 @@ class NewsBankWebCollector( NewsBankCollector ):
             # get url_opener
             my_url_opener = self.get_url_opener()
 
+            # fetching concurrently?
+            if ( self.fetcher is not None ):
+
+                # yes - fetch issues ahead, in date order.
+                issue_list = self.fetcher.fetch_all( ( current_date, self.create_issue_request( current_date, place_code_IN ) ) for current_date in date_list )
+                issue_list = ( ( issue_fetch_result.key, issue_fetch_result ) for issue_fetch_result in issue_list )
+
+            else:
+
+                # no - open each issue as we get to it (see below).
+                issue_list = ( ( current_date, None ) for current_date in date_list )
+
+            #-- END check to see if fetching concurrently. --#
+
             # loop over the dates to process.
             print( "\n*** dates to process: " + str( len( date_list ) ) + "\n\n" )
             date_counter = 0
 
-            for current_date in date_list:
+            for current_date, issue_fetch_result in issue_list:
 
                 # update counter.
                 date_counter += 1
@@ -511,17 +625,38 @@ class NewsBankWebCollector( NewsBankCollector ):
 
                 print( "\n*** current date ( " + str( date_counter ) + " ): " + str( current_date ) + "\n\n" )
 
-                # create request for current date's issue.
-                current_request = self.create_issue_request( current_date, place_code_IN )
+                # already fetched?
+                if ( issue_fetch_result is None ):
+
+                    # no - create request for current date's issue.
+                    current_request = self.create_issue_request( current_date, place_code_IN )
                 
-                # get connection to page.
-                current_connection = my_url_opener.open( current_request )
+                    # get connection to page.
+                    current_connection = my_url_opener.open( current_request )
+
+                elif ( issue_fetch_result.is_success() == True ):
+
+                    # fetch result stands in for connection.
+                    current_connection = issue_fetch_result
+
+                else:
+
+                    # could not retrieve issue.
+                    current_connection = None
+                    self.add_error( "", "", "Could not retrieve issue for date " + str( current_date ) + ": " + str( issue_fetch_result.exception ), None, issue_fetch_result.stack_trace )
+
+                #-- END check to see if already fetched --#
+
+                # got a connection?
+                if ( current_connection is not None ):
 
-                # pass connection on to method that deals with a given issue.
-                self.process_issue( current_connection )
+                    # pass connection on to method that deals with a given issue.
+                    self.process_issue( current_connection )
                 
-                # close the connection
-                current_connection.close()
+                    # close the connection
+                    current_connection.close()
+
+                #-- END check to see if connection --#
                 
                 # check to see if the array and the map are the same length (to
                 #    see if there were any URLs where we could not parse out the
@@ -598,6 +733,24 @@ class NewsBankWebCollector( NewsBankCollector ):
     #-- END method generate_issue_url --#
 
 
+    def get_item_request( self, id_IN, item_IN ):
+
+        '''
+        Accepts article ID and article path.  Returns the Request for the
+           article, so the fetcher can retrieve it.
+        '''
+
+        # return reference
+        request_OUT = None
+
+        # create request for article.
+        request_OUT = self.create_article_request( item_IN )
+
+        return request_OUT
+
+    #-- END method get_item_request() --#
+
+
     def get_newsbank_helper( self ):
     
         # return reference
@@ -717,10 +870,49 @@ class NewsBankWebCollector( NewsBankCollector ):
         
         # initialize newsbank helper
         self.initialize_newsbank_helper()
+        
+        # initialize fetcher (after URL opener, so it shares cookies).
+        self.initialize_fetcher()
     
     #-- END method initialize_url_opener() --#
 
 
+    def initialize_fetcher( self ):
+
+        '''
+        If fetch_max_workers is greater than 1, creates a ConcurrentFetcher
+           that uses this instance's fetch_* settings, user agent, and cookie
+           jar, and stores it in self.fetcher.  If not, sets self.fetcher to
+           None, so pages are retrieved one at a time with the URL opener.
+        '''
+
+        # close existing fetcher.
+        if ( self.fetcher is not None ):
+
+            self.fetcher.close()
+
+        #-- END check to see if existing fetcher --#
+
+        # fetching concurrently?
+        if ( self.fetch_max_workers > 1 ):
+
+            self.fetcher = ConcurrentFetcher( max_workers_IN = self.fetch_max_workers,
+                                              per_host_limit_IN = self.fetch_per_host_limit,
+                                              max_retries_IN = self.fetch_max_retries,
+                                              backoff_seconds_IN = self.fetch_backoff_seconds,
+                                              politeness_delay_IN = self.fetch_politeness_delay,
+                                              cookie_jar_IN = self.cookie_jar,
+                                              header_dict_IN = { self.HEADER_VARIABLE_NAME_USER_AGENT : self.user_agent } )
+
+        else:
+
+            self.fetcher = None
+
+        #-- END check to see if fetching concurrently --#
+
+    #-- END method initialize_fetcher() --#
+
+
     def initialize_newsbank_helper( self ):
     
         # declare variables
@@ -823,12 +1015,13 @@ class NewsBankWebCollector( NewsBankCollector ):
     #-- END method process_article_list() --#
 
 
-    def process_item( self, id_IN, item_IN ):
+    def process_item( self, id_IN, item_IN, fetch_result_IN = None ):
 
         '''
-        Accepts an id and an item. Pulls in the body of the HTML, parses it,
-           then stores it - can store file to file system, insert parsed record
-           into database, or both.
+        Accepts an id and an item. Pulls in the body of the HTML (or uses the
+           body in fetch_result_IN, if the fetcher already retrieved it),
+           parses it, then stores it - can store file to file system, insert
+           parsed record into database, or both.
         Preconditions: must have already pulled over the article list page and
            grabbed the appropriate <ul> for processing.
         '''    
@@ -854,17 +1047,27 @@ class NewsBankWebCollector( NewsBankCollector ):
             current_docid = id_IN
             current_url = item_IN
 
-            # get URL opener.
-            my_url_opener = self.get_url_opener()
+            # already fetched?
+            if ( fetch_result_IN is not None ):
+
+                # yes - get HTML body.
+                current_page_contents = fetch_result_IN.read()
+
+            else:
+
+                # get URL opener.
+                my_url_opener = self.get_url_opener()
     
-            # create request for current article.
-            current_request = self.create_article_request( current_url )
+                # create request for current article.
+                current_request = self.create_article_request( current_url )
                 
-            # get connection to page.
-            current_connection = my_url_opener.open( current_request )
+                # get connection to page.
+                current_connection = my_url_opener.open( current_request )
                 
-            # get HTML body.
-            current_page_contents = current_connection.read()
+                # get HTML body.
+                current_page_contents = current_connection.read()
+
+            #-- END check to see if already fetched --#
                 
             # *** Need to parse item, to make sure that it is valid.
             # Get NewsBankHelper
@@ -1125,6 +1328,13 @@ class FileSystemCollector( NewsBankCollector ):
     DO_ON_DUPLICATE_INSERT = "insert" # create a duplicate record.  Pow!
     DO_ON_DUPLICATE_SKIP = "skip" # skip and move on to next article.
 
+    # names of values in checkpoint file (see process_item_stream()).
+    CHECKPOINT_DIRECTORY_PATH = "directory_path"
+    CHECKPOINT_ITEM_COUNT = "item_count"
+    CHECKPOINT_BATCH_COUNT = "batch_count"
+    CHECKPOINT_LAST_ITEM = "last_item"
+    CHECKPOINT_UPDATED = "updated"
+
     #============================================================================
     # Instance variables
     #============================================================================
@@ -1139,6 +1349,17 @@ class FileSystemCollector( NewsBankCollector ):
     do_on_duplicate = DO_ON_DUPLICATE_UPDATE
     duplicate_count = 0
     
+    # variables for streaming import (see process_item_stream()) - if
+    #    stream_items is True, files are processed as the directory is walked,
+    #    parse_worker_count processes parse them, and they are stored
+    #    batch_size at a time.  If checkpoint_file_path is set, progress is
+    #    recorded there after each batch, and a run that is interrupted
+    #    picks up after the last batch stored.
+    stream_items = False
+    batch_size = 500
+    parse_worker_count = 1
+    checkpoint_file_path = ""
+    
     # instance of newsbank helper - inherited from NewsBankCollector
     #my_newsbank_helper = NewsBankHelper()
 
@@ -1207,7 +1428,8 @@ class FileSystemCollector( NewsBankCollector ):
         This method uses a directory path and a place code stored in instance.
            Traverses the directory and all children looking for HTML files to
            parse.  For each file to process adds it to queue, saving article
-           path instead of URL.
+           path instead of URL.  If stream_items is True, instead processes
+           the files as they are found (see process_item_stream()).
            
         Preconditions: Path to directory must actually point to a directory.
         Postconditions: None. 
@@ -1229,10 +1451,22 @@ class FileSystemCollector( NewsBankCollector ):
             
             if ( is_directory ):
             
-                # It is a directory.  Now, need to call recursive function
-                #    to descend into directory structure and add all HTML files
-                #    it finds to the article queue.
-                self.gather_items_from_directory( directory_path_IN )                
+                # streaming?
+                if ( self.stream_items == True ):
+
+                    # yes - process files as we find them, in batches.  Queue
+                    #    stays empty, so nothing left to process after this.
+                    self.process_item_stream( self.iterate_items_from_directory( directory_path_IN ),
+                                              item_iterator_function_IN = functools.partial( self.iterate_items_from_directory, directory_path_IN ) )
+
+                else:
+
+                    # It is a directory.  Now, need to call recursive function
+                    #    to descend into directory structure and add all HTML files
+                    #    it finds to the article queue.
+                    self.gather_items_from_directory( directory_path_IN )                
+
+                #-- END check to see if streaming --#
             
             #-- END check to see if directory path refers to a directory --#
 
@@ -1252,6 +1486,7 @@ class FileSystemCollector( NewsBankCollector ):
               function again, passing it the path to the child directory.
            2) HTML files (files that end in ".html").  If it finds any, adds
               the path to the HTML file to the article queue, then exits.
+           Walking is done by iterate_items_from_directory().
            
         Preconditions: Path to directory must actually point to a directory.
         Postconditions: Paths of all HTML files encountered are added to the
@@ -1264,15 +1499,8 @@ class FileSystemCollector( NewsBankCollector ):
         # declare variables
         directory_path_IN = ""
         is_directory = False
-        directory = None
-        current_directory_path = ""
-        child_directories = None
-        child_files = None
-        current_file = ""
-        include_item = False
-        regex_get_id = None
-        regex_result = None
         current_id = ""
+        current_item = ""
             
         # make sure we have a directory in which we start and a place code.
         directory_path_IN = self.directory_path
@@ -1283,43 +1511,13 @@ class FileSystemCollector( NewsBankCollector ):
             
             if ( is_directory ):
             
-                # It is a directory.  Use walk to traverse all directories,
-                #    then use the glob package to just grab *.html files
-                #    from each directory, add them to the queue.
-                for current_directory_path, child_directories, child_files in os.walk( directory_path_IN ):
-                
-                    # for now, just print what we've found.
-                    self.output_debug( "=== current directory === path: " + current_directory_path + "; file count: " + str( len( child_files ) ) + "\n" )
+                # It is a directory.  Walk it, add each item found to the
+                #    queue.
+                for current_id, current_item in self.iterate_items_from_directory( directory_path_IN ):
 
-                    # are there child files?
-                    if ( child_files ):
-                    
-                        # yes, there are child files.  Loop over them, looking
-                        #    for file names that end in ".html".
-                        for current_file in child_files:
-                        
-                            # initialize variables
-                            include_item = False
-                            
-                            # should current item be included?
-                            include_item = self.do_include_item( current_file )
-                            
-                            # got anything in result?
-                            if ( include_item == True ):
-                            
-                                # got something.  Get ID, add item to queue.
-                                regex_get_id = self.get_regex_id()
-                                regex_result = regex_get_id.findall( current_file )
-                                current_id = regex_result[ 0 ].strip()
-                                self.add_item_to_queue( current_directory_path + "/" + current_file, current_id )
-                            
-                            #-- END check to see if we include current item. --#
+                    self.add_item_to_queue( current_item, current_id )
 
-                        #-- END loop over child files --#
-                    
-                    #-- END check to see if child files --#
-                
-                #-- END walk over directories starting in directory_path_IN --#
+                #-- END loop over items in directory_path_IN --#
             
             #-- END check to see if directory path refers to a directory --#
 
@@ -1354,6 +1552,59 @@ class FileSystemCollector( NewsBankCollector ):
     #-- END method get_regex_id() --#
 
 
+    def iterate_items_from_directory( self, directory_path_IN ):
+
+        '''
+        Generator - accepts a directory path.  Walks the directory and all of
+           its children, yielding a tuple of ( id, file_path ) for each file
+           that should be included (see do_include_item()), as it is found.
+           Directories and files are walked in sorted order, so the order is
+           the same every time for the same tree (process_item_stream() relies
+           on this to resume).
+        '''
+
+        # declare variables
+        current_directory_path = ""
+        child_directories = None
+        child_files = None
+        current_file = ""
+        include_item = False
+        regex_get_id = None
+        regex_result = None
+        current_id = ""
+
+        # get ID regex.
+        regex_get_id = self.get_regex_id()
+
+        for current_directory_path, child_directories, child_files in os.walk( directory_path_IN ):
+        
+            # sort children in place, so walk order is stable.
+            child_directories.sort()
+
+            # for now, just print what we've found.
+            self.output_debug( "=== current directory === path: " + current_directory_path + "; file count: " + str( len( child_files ) ) + "\n" )
+
+            # Loop over child files, looking for file names that end in ".html".
+            for current_file in sorted( child_files ):
+            
+                # should current item be included?
+                include_item = self.do_include_item( current_file )
+                if ( include_item == True ):
+                
+                    # got something.  Get ID, yield item.
+                    regex_result = regex_get_id.findall( current_file )
+                    current_id = regex_result[ 0 ].strip()
+                    yield ( current_id, current_directory_path + "/" + current_file )
+                
+                #-- END check to see if we include current item. --#
+
+            #-- END loop over child files --#
+        
+        #-- END walk over directories starting in directory_path_IN --#
+
+    #-- END method iterate_items_from_directory() --#
+
+
     def process_article_tag_list( self, tag_element_list_IN, article_instance_IN ):
 
         '''
@@ -1492,4 +1743,309 @@ class FileSystemCollector( NewsBankCollector ):
     #-- END method process_item() --#
 
 
+    def process_item_stream( self, item_iterator_IN, item_iterator_function_IN = None ):
+
+        '''
+        Accepts an iterator of ( id, file_path ) tuples (see
+           iterate_items_from_directory()).  Processes the items as they come,
+           batch_size at a time: parses the files in a batch (in
+           parse_worker_count processes, if more than 1), then stores all the
+           articles that parsed in one transaction (see
+           NewsBankHelper.save_parsed_article_list()).  If storing a batch
+           fails, the transaction is rolled back and the batch's items are
+           processed one at a time with process_item(), so errors are logged
+           against the items that caused them.
+
+           If checkpoint_file_path is set, the number of items done so far and
+           the last of them are written there after each batch.  If the file
+           is there when this starts (for the same directory_path), that many
+           items are skipped first, so an interrupted run picks up after the
+           last batch stored - but only if the last item skipped is the last
+           item in the checkpoint.  Only the last item skipped is kept in
+           memory.  If it doesn't match (files were added or removed since),
+           the checkpoint is ignored and all items are processed, from a new
+           iterator: item_iterator_function_IN() if passed (a function with no
+           arguments that returns a new iterator over the same items), else
+           iter( item_iterator_IN ), so item_iterator_IN must then be
+           something that can be iterated again, like a list.  Once all items
+           are processed, the checkpoint file is removed.
+
+        Preconditions: the iterator must yield items in the same order each
+           time for resuming to work.
+
+        Returns number of items processed (not counting those skipped).
+        '''
+
+        # return reference
+        count_OUT = 0
+
+        # declare variables
+        me = "process_item_stream"
+        my_batch_size = -1
+        nb_helper = None
+        checkpoint_dict = None
+        item_count = 0
+        batch_count = 0
+        item_iterator = None
+        executor = None
+        current_batch = None
+        current_item_tuple = None
+        result_list = None
+        parsed_list = None
+        current_id = ""
+        current_item = ""
+        parsed_article = None
+        error_message = ""
+        stack_trace = ""
+        saved_list = None
+        skipped_deque = None
+        skipped_count = -1
+        last_item = ""
+
+        my_batch_size = max( 1, int( self.batch_size ) )
+        nb_helper = self.get_newsbank_helper()
+
+        # resuming?
+        item_iterator = iter( item_iterator_IN )
+        checkpoint_dict = self.read_checkpoint()
+        item_count = checkpoint_dict.get( self.CHECKPOINT_ITEM_COUNT, 0 )
+        batch_count = checkpoint_dict.get( self.CHECKPOINT_BATCH_COUNT, 0 )
+        if ( item_count > 0 ):
+
+            # yes - skip items already done, counting them and keeping only
+            #     the last to check against the checkpoint.
+            last_item = checkpoint_dict.get( self.CHECKPOINT_LAST_ITEM, "" )
+            skipped_count = 0
+            skipped_deque = collections.deque( maxlen = 1 )
+            for current_item_tuple in itertools.islice( item_iterator, item_count ):
+
+                skipped_count += 1
+                skipped_deque.append( current_item_tuple )
+
+            #-- END loop over items to skip --#
+
+            if ( ( skipped_count == item_count ) and ( skipped_deque[ -1 ][ 1 ] == last_item ) ):
+
+                self.output_debug( "=== in " + me + "(): resuming after " + str( item_count ) + " items in " + str( batch_count ) + " batches (last item: " + str( last_item ) + ")." )
+
+            else:
+
+                # items changed since the checkpoint - start over.
+                self.output_debug( "=== in " + me + "(): checkpoint says " + str( item_count ) + " items done, last " + str( last_item ) + ", but item " + str( skipped_count ) + " is " + ( str( skipped_deque[ -1 ][ 1 ] ) if ( skipped_count > 0 ) else "missing" ) + ".  Ignoring checkpoint, processing all items." )
+                if ( item_iterator_function_IN is not None ):
+
+                    item_iterator = item_iterator_function_IN()
+
+                else:
+
+                    item_iterator = iter( item_iterator_IN )
+
+                #-- END check to see how to start over --#
+
+                item_count = 0
+                batch_count = 0
+
+            #-- END check to see if checkpoint matches items --#
+
+            skipped_deque = None
+
+        #-- END check to see if resuming --#
+
+        # parse in other processes?
+        if ( self.parse_worker_count > 1 ):
+
+            executor = concurrent.futures.ProcessPoolExecutor( max_workers = self.parse_worker_count )
+
+        #-- END check to see if multiple processes --#
+
+        try:
+
+            current_batch = list( itertools.islice( item_iterator, my_batch_size ) )
+            while ( len( current_batch ) > 0 ):
+
+                # parse.
+                if ( executor is not None ):
+
+                    result_list = executor.map( parse_item_file, current_batch, chunksize = max( 1, len( current_batch ) // ( self.parse_worker_count * 4 ) ) )
+
+                else:
+
+                    result_list = [ parse_item_file( current_item_tuple, nb_helper ) for current_item_tuple in current_batch ]
+
+                #-- END check to see if multiple processes --#
+
+                # log errors, keep the rest.
+                parsed_list = []
+                for current_id, current_item, parsed_article, error_message, stack_trace in result_list:
+
+                    self.current_id = current_id
+                    self.current_item = current_item
+
+                    if ( parsed_article is None ):
+
+                        self.add_error( current_item, current_id, "ERROR: Exception caught parsing item in FileSystemCollector." + me + ": " + error_message, None, stack_trace )
+
+                    elif ( parsed_article.status != nb_helper.STATUS_SUCCESS ):
+
+                        self.add_error( current_item, current_id, parsed_article.status )
+
+                    else:
+
+                        parsed_list.append( ( current_id, current_item, parsed_article ) )
+
+                    #-- END check to see if parsed --#
+
+                #-- END loop over parse results --#
+
+                # store.
+                try:
+
+                    saved_list = nb_helper.save_parsed_article_list( [ current_item_tuple[ 2 ] for current_item_tuple in parsed_list ] )
+                    self.total_articles_processed += len( saved_list )
+
+                except Exception as e:
+
+                    # batch rolled back - process one at a time.
+                    self.output_debug( "=== in " + me + "(): Exception storing batch " + str( batch_count + 1 ) + " ( " + str( e ) + " ), processing items one at a time." )
+                    for current_id, current_item, parsed_article in parsed_list:
+
+                        self.current_id = current_id
+                        self.current_item = current_item
+                        self.process_item( current_id, current_item )
+
+                    #-- END loop over parsed items --#
+
+                #-- END try/except around storing batch --#
+
+                # batch done - record progress.
+                item_count += len( current_batch )
+                batch_count += 1
+                count_OUT += len( current_batch )
+                self.write_checkpoint( item_count, batch_count, current_batch[ -1 ][ 1 ] )
+                self.output_debug( "=== in " + me + "(): batch " + str( batch_count ) + " done - " + str( item_count ) + " items ( total errors: " + str( self.get_error_count() ) + " )." )
+
+                # memory management.
+                gc.collect()
+                django.db.reset_queries()
+
+                # next batch.
+                current_batch = list( itertools.islice( item_iterator, my_batch_size ) )
+
+            #-- END loop over batches --#
+
+        finally:
+
+            if ( executor is not None ):
+
+                executor.shutdown()
+
+            #-- END check to see if executor --#
+
+        #-- END try/finally around processing --#
+
+        # got through everything - nothing to resume.
+        self.remove_checkpoint()
+
+        return count_OUT
+
+    #-- END method process_item_stream() --#
+
+
+    def read_checkpoint( self ):
+
+        '''
+        If checkpoint_file_path is set and there is a checkpoint file there for
+           this instance's directory_path, returns dictionary of the values
+           stored in it (see process_item_stream()).  If not, returns an empty
+           dictionary.
+        '''
+
+        # return reference
+        dict_OUT = {}
+
+        # declare variables
+        me = "read_checkpoint"
+        checkpoint_file = None
+        checkpoint_dict = None
+
+        # got a checkpoint file?
+        if ( ( self.checkpoint_file_path ) and ( os.path.isfile( self.checkpoint_file_path ) ) ):
+
+            with open( self.checkpoint_file_path, 'r' ) as checkpoint_file:
+
+                checkpoint_dict = json.load( checkpoint_file )
+
+            #-- END with open checkpoint file --#
+
+            # for this directory?
+            if ( checkpoint_dict.get( self.CHECKPOINT_DIRECTORY_PATH, None ) == self.directory_path ):
+
+                dict_OUT = checkpoint_dict
+
+            else:
+
+                self.output_debug( "=== in " + me + "(): checkpoint file " + self.checkpoint_file_path + " is for directory " + str( checkpoint_dict.get( self.CHECKPOINT_DIRECTORY_PATH, None ) ) + ", not " + self.directory_path + ".  Ignoring it." )
+
+            #-- END check to see if checkpoint for this directory --#
+
+        #-- END check to see if checkpoint file --#
+
+        return dict_OUT
+
+    #-- END method read_checkpoint() --#
+
+
+    def remove_checkpoint( self ):
+
+        '''
+        If checkpoint_file_path is set and there is a file there, removes it.
+        '''
+
+        if ( ( self.checkpoint_file_path ) and ( os.path.isfile( self.checkpoint_file_path ) ) ):
+
+            os.remove( self.checkpoint_file_path )
+
+        #-- END check to see if checkpoint file --#
+
+    #-- END method remove_checkpoint() --#
+
+
+    def write_checkpoint( self, item_count_IN, batch_count_IN, last_item_IN = "" ):
+
+        '''
+        If checkpoint_file_path is set, writes the number of items and batches
+           done and the last item done to it, as JSON.  Writes to a temporary
+           file, then replaces the checkpoint file with it, so an interruption
+           while writing can't leave a partial checkpoint.
+        '''
+
+        # declare variables
+        checkpoint_dict = None
+        temp_file_path = ""
+        checkpoint_file = None
+
+        # got a path?
+        if ( self.checkpoint_file_path ):
+
+            checkpoint_dict = {}
+            checkpoint_dict[ self.CHECKPOINT_DIRECTORY_PATH ] = self.directory_path
+            checkpoint_dict[ self.CHECKPOINT_ITEM_COUNT ] = item_count_IN
+            checkpoint_dict[ self.CHECKPOINT_BATCH_COUNT ] = batch_count_IN
+            checkpoint_dict[ self.CHECKPOINT_LAST_ITEM ] = last_item_IN
+            checkpoint_dict[ self.CHECKPOINT_UPDATED ] = datetime.datetime.now().isoformat()
+
+            temp_file_path = self.checkpoint_file_path + ".tmp"
+            with open( temp_file_path, 'w' ) as checkpoint_file:
+
+                json.dump( checkpoint_dict, checkpoint_file, indent = 4 )
+
+            #-- END with open temp file --#
+
+            os.replace( temp_file_path, self.checkpoint_file_path )
+
+        #-- END check to see if checkpoint path --#
+
+    #-- END method write_checkpoint() --#
+
+
 #-- END class FileSystemCollector --#
\ No newline at end of file
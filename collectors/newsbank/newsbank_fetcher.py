@@ -0,0 +1,612 @@
+'''
+Copyright 2010-2013 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text.
+
+context_text is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text. If not, see http://www.gnu.org/licenses/.
+'''
+
+'''
+This code file contains a class that fetches many URLs at once with a bounded
+   pool of threads, for collectors that need to pull down thousands of issue
+   and article pages.  It limits how many requests are open against any one
+   host at a time, spaces out requests to a host by a politeness delay,
+   re-uses connections (one requests Session per worker thread, all sharing
+   the collector's cookie jar, so log-in cookies carry over), and retries
+   failed requests with exponential backoff.
+
+Results come back in the order requests were passed in, so the collector can
+   keep processing them one at a time, on its own thread.
+'''
+
+#================================================================================
+# Imports
+#================================================================================
+
+# imports
+import collections
+import concurrent.futures
+import threading
+import time
+import traceback
+
+# six - Python 2 and 3 support
+import six
+from six.moves.urllib.parse import urlparse
+
+# HTTP
+import requests
+from requests.adapters import HTTPAdapter
+
+#================================================================================
+# FetchError class
+#================================================================================
+
+
+class FetchError( Exception ):
+
+    '''
+    Raised (and stored in FetchResult.exception) when a URL can't be retrieved
+       after all retries, or returns a status code that isn't worth retrying.
+    '''
+
+    # just make it work exactly like an Exception
+    pass
+
+#-- END FetchError class --#
+
+
+#================================================================================
+# FetchResult class
+#================================================================================
+
+
+class FetchResult( object ):
+
+    '''
+    Holds the outcome of fetching one URL.  Implements read(), info(),
+       geturl(), and close() like the response from a urllib opener, so it can
+       be passed to code that expects an open connection (process_issue(), for
+       example).
+    '''
+
+    def __init__( self, key_IN = None, url_IN = "" ):
+
+        # what was requested
+        self.key = key_IN
+        self.url = url_IN
+
+        # what came back
+        self.status_code = -1
+        self.content = None
+        self.headers = {}
+        self.final_url = url_IN
+        self.attempt_count = 0
+
+        # if error
+        self.exception = None
+        self.stack_trace = ""
+
+    #-- END method __init__() --#
+
+
+    def close( self ):
+
+        # nothing to close - content is already read.
+        pass
+
+    #-- END method close() --#
+
+
+    def geturl( self ):
+
+        return self.final_url
+
+    #-- END method geturl() --#
+
+
+    def info( self ):
+
+        return self.headers
+
+    #-- END method info() --#
+
+
+    def is_success( self ):
+
+        return ( self.exception is None )
+
+    #-- END method is_success() --#
+
+
+    def read( self ):
+
+        return self.content
+
+    #-- END method read() --#
+
+
+#-- END class FetchResult --#
+
+
+#================================================================================
+# ConcurrentFetcher class
+#================================================================================
+
+
+class ConcurrentFetcher( object ):
+
+    '''
+    Fetches URLs using a bounded pool of worker threads.  Usage:
+
+        fetcher = ConcurrentFetcher( max_workers_IN = 8, per_host_limit_IN = 2 )
+        for fetch_result in fetcher.fetch_all( [ ( key, url_or_request ), ... ] ):
+            if ( fetch_result.is_success() == True ):
+                ...fetch_result.read()...
+        fetcher.close()
+
+    Requests can be URL strings or urllib Request instances (headers in the
+       Request are sent along).
+    '''
+
+    #============================================================================
+    # Constants-ish
+    #============================================================================
+
+
+    HEADER_NAME_RETRY_AFTER = "Retry-After"
+
+    # status codes that are worth retrying.
+    RETRY_STATUS_CODE_LIST = [ 429, 500, 502, 503, 504 ]
+
+    # defaults
+    DEFAULT_MAX_WORKERS = 4
+    DEFAULT_PER_HOST_LIMIT = 2
+    DEFAULT_MAX_RETRIES = 3
+    DEFAULT_BACKOFF_SECONDS = 1.0
+    DEFAULT_POLITENESS_DELAY = 0.5
+    DEFAULT_TIMEOUT = 60
+
+
+    #============================================================================
+    # Built-in Instance methods
+    #============================================================================
+
+
+    def __init__( self,
+                  max_workers_IN = DEFAULT_MAX_WORKERS,
+                  per_host_limit_IN = DEFAULT_PER_HOST_LIMIT,
+                  max_retries_IN = DEFAULT_MAX_RETRIES,
+                  backoff_seconds_IN = DEFAULT_BACKOFF_SECONDS,
+                  politeness_delay_IN = DEFAULT_POLITENESS_DELAY,
+                  timeout_IN = DEFAULT_TIMEOUT,
+                  cookie_jar_IN = None,
+                  header_dict_IN = None ):
+
+        # configuration
+        self.max_workers = max_workers_IN
+        self.per_host_limit = per_host_limit_IN
+        self.max_retries = max_retries_IN
+        self.backoff_seconds = backoff_seconds_IN
+        self.politeness_delay = politeness_delay_IN
+        self.timeout = timeout_IN
+        self.cookie_jar = cookie_jar_IN
+        self.header_dict = {}
+        if ( header_dict_IN is not None ):
+
+            self.header_dict.update( header_dict_IN )
+
+        #-- END check to see if default headers --#
+
+        # per-host state - semaphore to limit concurrent requests, time when
+        #    next request is allowed to start.
+        self.host_lock = threading.Lock()
+        self.host_to_semaphore_map = {}
+        self.host_to_next_start_map = {}
+
+        # per-thread requests Session, and list of all so we can close them.
+        self.thread_local = threading.local()
+        self.session_list = []
+        self.session_list_lock = threading.Lock()
+
+        # stats
+        self.request_count = 0
+        self.retry_count = 0
+
+    #-- END method __init__() --#
+
+
+    #============================================================================
+    # Instance methods
+    #============================================================================
+
+
+    def close( self ):
+
+        '''
+        Closes all the requests Sessions (and so their open connections).
+        '''
+
+        # declare variables
+        current_session = None
+
+        with self.session_list_lock:
+
+            for current_session in self.session_list:
+
+                current_session.close()
+
+            #-- END loop over sessions --#
+
+            self.session_list = []
+
+        #-- END with session_list_lock --#
+
+        # new threads (or this one) will make new sessions.
+        self.thread_local = threading.local()
+
+    #-- END method close() --#
+
+
+    def fetch( self, request_IN, key_IN = None ):
+
+        '''
+        Accepts a URL string or urllib Request and an optional key to store in
+           the result.  Retrieves it in the calling thread, waiting on the
+           per-host limit and politeness delay, retrying with backoff if a
+           retryable error.  Returns a FetchResult - never raises.
+        '''
+
+        # return reference
+        result_OUT = None
+
+        # declare variables
+        url = ""
+        header_dict = None
+        host = ""
+        host_semaphore = None
+        my_session = None
+        response = None
+        attempt_number = 0
+        keep_trying = True
+        wait_seconds = 0.0
+
+        # get URL and headers.
+        url, header_dict = self.get_url_and_headers( request_IN )
+        result_OUT = FetchResult( key_IN, url )
+
+        try:
+
+            host = urlparse( url ).netloc
+            host_semaphore = self.get_host_semaphore( host )
+            my_session = self.get_session()
+
+            attempt_number = 0
+            keep_trying = True
+            while ( keep_trying == True ):
+
+                attempt_number += 1
+                result_OUT.attempt_count = attempt_number
+                response = None
+                wait_seconds = 0.0
+
+                # only per_host_limit requests to this host at once.
+                with host_semaphore:
+
+                    self.wait_for_host( host )
+                    self.request_count += 1
+
+                    try:
+
+                        response = my_session.get( url, headers = header_dict, timeout = self.timeout )
+
+                    except ( requests.exceptions.ConnectionError, requests.exceptions.Timeout ) as ce:
+
+                        # retryable, if attempts left.
+                        if ( attempt_number > self.max_retries ):
+
+                            raise
+
+                        #-- END check to see if out of attempts --#
+
+                    #-- END try/except around request --#
+
+                #-- END with host semaphore --#
+
+                # what happened?
+                if ( response is None ):
+
+                    # connection error - retry.
+                    wait_seconds = self.get_backoff_seconds( attempt_number )
+
+                elif ( response.status_code in self.RETRY_STATUS_CODE_LIST ):
+
+                    # server says try again - retry, if attempts left.
+                    if ( attempt_number > self.max_retries ):
+
+                        raise FetchError( "HTTP status " + str( response.status_code ) + " for URL " + url + " after " + str( attempt_number ) + " attempts." )
+
+                    #-- END check to see if out of attempts --#
+
+                    wait_seconds = self.get_backoff_seconds( attempt_number, response )
+
+                elif ( response.status_code >= 400 ):
+
+                    # not worth retrying.
+                    raise FetchError( "HTTP status " + str( response.status_code ) + " for URL " + url + "." )
+
+                else:
+
+                    # success!
+                    result_OUT.status_code = response.status_code
+                    result_OUT.content = response.content
+                    result_OUT.headers = response.headers
+                    result_OUT.final_url = response.url
+                    keep_trying = False
+
+                #-- END check to see what happened --#
+
+                # retrying?
+                if ( keep_trying == True ):
+
+                    self.retry_count += 1
+                    time.sleep( wait_seconds )
+
+                #-- END check to see if retrying --#
+
+            #-- END loop over attempts --#
+
+        except Exception as e:
+
+            # store exception and stack trace in result.
+            result_OUT.exception = e
+            result_OUT.stack_trace = traceback.format_exc()
+            if ( response is not None ):
+
+                result_OUT.status_code = response.status_code
+
+            #-- END check to see if response --#
+
+        #-- END try/except --#
+
+        return result_OUT
+
+    #-- END method fetch() --#
+
+
+    def fetch_all( self, request_list_IN ):
+
+        '''
+        Generator.  Accepts an iterable of ( key, request ) tuples, where request
+           is a URL string or urllib Request.  Fetches them using a pool of
+           max_workers threads, keeping at most 2 * max_workers requests in
+           flight or waiting to be read.  Yields a FetchResult for each, in the
+           order they were passed in, as soon as each is ready.
+        '''
+
+        # declare variables
+        window_size = -1
+        pending_future_queue = None
+        current_key = None
+        current_request = None
+        current_future = None
+
+        window_size = max( 1, self.max_workers * 2 )
+        pending_future_queue = collections.deque()
+
+        with concurrent.futures.ThreadPoolExecutor( max_workers = self.max_workers ) as executor:
+
+            try:
+
+                for current_key, current_request in request_list_IN:
+
+                    pending_future_queue.append( executor.submit( self.fetch, current_request, current_key ) )
+
+                    # window full?  Hand back oldest.
+                    if ( len( pending_future_queue ) >= window_size ):
+
+                        yield pending_future_queue.popleft().result()
+
+                    #-- END check to see if window full --#
+
+                #-- END loop over requests --#
+
+                # return the rest.
+                while ( len( pending_future_queue ) > 0 ):
+
+                    yield pending_future_queue.popleft().result()
+
+                #-- END loop over pending --#
+
+            finally:
+
+                # if caller stopped early, don't fetch the rest.
+                for current_future in pending_future_queue:
+
+                    current_future.cancel()
+
+                #-- END loop over pending futures --#
+
+            #-- END try/finally --#
+
+        #-- END with executor --#
+
+    #-- END method fetch_all() --#
+
+
+    def get_backoff_seconds( self, attempt_number_IN, response_IN = None ):
+
+        '''
+        Returns seconds to wait before retrying: backoff_seconds doubled for
+           each attempt after the first, or the server's Retry-After value (in
+           seconds), if it sent one and it is longer.
+        '''
+
+        # return reference
+        seconds_OUT = 0.0
+
+        # declare variables
+        retry_after = None
+
+        seconds_OUT = self.backoff_seconds * ( 2 ** ( attempt_number_IN - 1 ) )
+
+        # server tell us how long?
+        if ( response_IN is not None ):
+
+            retry_after = response_IN.headers.get( self.HEADER_NAME_RETRY_AFTER, None )
+            if ( ( retry_after is not None ) and ( retry_after.strip().isdigit() == True ) ):
+
+                seconds_OUT = max( seconds_OUT, float( retry_after.strip() ) )
+
+            #-- END check to see if numeric Retry-After --#
+
+        #-- END check to see if response --#
+
+        return seconds_OUT
+
+    #-- END method get_backoff_seconds() --#
+
+
+    def get_host_semaphore( self, host_IN ):
+
+        '''
+        Returns the semaphore that limits concurrent requests to host_IN,
+           creating it if needed.
+        '''
+
+        # return reference
+        semaphore_OUT = None
+
+        with self.host_lock:
+
+            semaphore_OUT = self.host_to_semaphore_map.get( host_IN, None )
+            if ( semaphore_OUT is None ):
+
+                semaphore_OUT = threading.BoundedSemaphore( max( 1, self.per_host_limit ) )
+                self.host_to_semaphore_map[ host_IN ] = semaphore_OUT
+
+            #-- END check to see if semaphore --#
+
+        #-- END with host_lock --#
+
+        return semaphore_OUT
+
+    #-- END method get_host_semaphore() --#
+
+
+    def get_session( self ):
+
+        '''
+        Returns the requests Session for the current thread, creating it if
+           needed.  Each Session keeps its connections open between requests
+           and uses the cookie jar passed to this instance, if one was.
+        '''
+
+        # return reference
+        session_OUT = None
+
+        # declare variables
+        my_adapter = None
+
+        session_OUT = getattr( self.thread_local, "session", None )
+        if ( session_OUT is None ):
+
+            session_OUT = requests.Session()
+
+            # one kept-alive connection per allowed concurrent request.
+            my_adapter = HTTPAdapter( pool_connections = 1, pool_maxsize = max( 1, self.per_host_limit ) )
+            session_OUT.mount( "http://", my_adapter )
+            session_OUT.mount( "https://", my_adapter )
+
+            # share cookies and default headers.
+            if ( self.cookie_jar is not None ):
+
+                session_OUT.cookies = self.cookie_jar
+
+            #-- END check to see if cookie jar --#
+
+            session_OUT.headers.update( self.header_dict )
+
+            # store.
+            self.thread_local.session = session_OUT
+            with self.session_list_lock:
+
+                self.session_list.append( session_OUT )
+
+            #-- END with session_list_lock --#
+
+        #-- END check to see if session for thread --#
+
+        return session_OUT
+
+    #-- END method get_session() --#
+
+
+    def get_url_and_headers( self, request_IN ):
+
+        '''
+        Accepts URL string or urllib Request.  Returns tuple of URL and
+           dictionary of headers for the request.
+        '''
+
+        # declare variables
+        url_OUT = ""
+        header_dict_OUT = {}
+
+        if ( isinstance( request_IN, six.string_types ) == True ):
+
+            url_OUT = request_IN
+
+        else:
+
+            # urllib Request.
+            url_OUT = request_IN.get_full_url()
+            header_dict_OUT = dict( request_IN.header_items() )
+
+        #-- END check to see what type of request --#
+
+        return url_OUT, header_dict_OUT
+
+    #-- END method get_url_and_headers() --#
+
+
+    def wait_for_host( self, host_IN ):
+
+        '''
+        Sleeps, if needed, so that requests to host_IN start at least
+           politeness_delay seconds apart.
+        '''
+
+        # declare variables
+        now = None
+        next_start = None
+        wait_seconds = 0.0
+
+        if ( self.politeness_delay > 0 ):
+
+            # reserve the next slot.
+            with self.host_lock:
+
+                now = time.time()
+                next_start = max( now, self.host_to_next_start_map.get( host_IN, now ) )
+                self.host_to_next_start_map[ host_IN ] = next_start + self.politeness_delay
+                wait_seconds = next_start - now
+
+            #-- END with host_lock --#
+
+            if ( wait_seconds > 0 ):
+
+                time.sleep( wait_seconds )
+
+            #-- END check to see if need to wait --#
+
+        #-- END check to see if delay --#
+
+    #-- END method wait_for_host() --#
+
+
+#-- END class ConcurrentFetcher --#
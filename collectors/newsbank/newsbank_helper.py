@@ -57,8 +57,13 @@ from python_utilities.strings.string_helper import StringHelper
 #sys.path.append( '/home/jonathanmorgan/Documents/django-dev/research' )
 #from context_text.models import Article
 from context_text.models import Article
+from context_text.models import Article_RawData
 from context_text.models import Article_Text
 
+# django database
+from django.db import connections
+from django.db import transaction
+
 # other context_text
 from context_text.shared.context_text_base import ContextTextBase
 
@@ -71,6 +76,96 @@ SOURCE_NEWS_BANK = "NewsBank"
 PLACE_CODE_GRAND_RAPIDS_PRESS = "GRPB"
 
 
+#================================================================================
+# NewsBankParsedArticle class
+#================================================================================
+
+class NewsBankParsedArticle( object ):
+
+    '''
+    Holds the values NewsBankHelper.parse_file_contents() pulls out of the HTML
+       of a NewsBank article, so parsing can happen apart from the database (in
+       a worker process, for example - instances are picklable), and the
+       values can be placed in an Article later (see
+       NewsBankHelper.apply_parsed_article()).  Article fields are stored as
+       attributes with the same names as on Article, so
+       process_article_tag_list() can fill them in just as it does an Article.
+    '''
+
+    #============================================================================
+    # Constants-ish
+    #============================================================================
+
+    # Article fields that can be set in a parsed article.
+    ARTICLE_FIELD_NAME_LIST = [
+        "unique_identifier",
+        "unique_identifier_type",
+        "archive_source",
+        "headline",
+        "source_string",
+        "pub_date",
+        "author_string",
+        "author_varchar",
+        "edition",
+        "section",
+        "page",
+        "corrections",
+        "index_terms",
+        "archive_id",
+        "notes",
+        "copyright",
+        "permalink"
+    ]
+
+
+    #============================================================================
+    # Instance methods
+    #============================================================================
+
+
+    def __init__( self, id_IN = "" ):
+
+        # declare variables
+        self.id = id_IN
+        self.status = ""
+        self.text = ""
+        self.raw_html = ""
+
+    #-- END method __init__() --#
+
+
+    def get_article_field_dict( self ):
+
+        '''
+        Returns dictionary of Article field name to value for each Article
+           field that has been set in this instance.
+        '''
+
+        # return reference
+        dict_OUT = {}
+
+        # declare variables
+        field_name = ""
+
+        for field_name in self.ARTICLE_FIELD_NAME_LIST:
+
+            # set?
+            if ( field_name in self.__dict__ ):
+
+                dict_OUT[ field_name ] = self.__dict__[ field_name ]
+
+            #-- END check to see if field set --#
+
+        #-- END loop over field names --#
+
+        return dict_OUT
+
+    #-- END method get_article_field_dict() --#
+
+
+#-- END class NewsBankParsedArticle --#
+
+
 #================================================================================
 # NewsBankCollector class
 #================================================================================
@@ -159,6 +254,48 @@ class NewsBankHelper( object ):
     #============================================================================
 
 
+    def apply_parsed_article( self, parsed_article_IN, article_instance_IN ):
+
+        '''
+        Accepts a NewsBankParsedArticle and an Article.  Places the values
+           parsed from the article's HTML into the Article, along with the
+           newspaper for this helper's place, if there is one.  Does not save
+           the Article, or set its text or raw HTML.  Returns the Article.
+        '''
+
+        # return reference
+        article_OUT = None
+
+        # declare variables
+        field_name = ""
+        field_value = None
+
+        # got an article?
+        if ( ( parsed_article_IN ) and ( article_instance_IN ) ):
+
+            article_OUT = article_instance_IN
+
+            # got a related newspaper to nest?
+            if ( self.newspaper_for_place ):
+                
+                article_OUT.newspaper = self.newspaper_for_place
+            
+            #-- END check to see if there is a related newspaper instance --#
+
+            # then the parsed fields.
+            for field_name, field_value in six.iteritems( parsed_article_IN.get_article_field_dict() ):
+
+                setattr( article_OUT, field_name, field_value )
+
+            #-- END loop over parsed fields --#
+
+        #-- END check to see if article --#
+
+        return article_OUT
+
+    #-- END method apply_parsed_article() --#
+
+
     def clean_article_body( self, bs_body_tag_IN ):
 
         '''
@@ -486,8 +623,17 @@ class NewsBankHelper( object ):
     #-- END method generate_url --#
 
 
-    def get_article_instance( self, id_IN ):
+    def get_article_instance( self, id_IN, existing_article_list_IN = None ):
     
+        '''
+        Accepts an article ID.  Returns Article instance to populate for that
+           ID, based on duplicate check settings: a new Article, the existing
+           Article with that ID (update), or None (skip).  If you already
+           retrieved the existing Articles with the ID (for a batch of IDs, for
+           example), pass them in existing_article_list_IN and the database
+           won't be queried.
+        '''
+
         # return reference
         article_OUT = None
         
@@ -513,14 +659,24 @@ class NewsBankHelper( object ):
             
                 # Use the Article object to look for an existing article with the
                 #    id passed in.
-                existing_article_qs = Article.objects.filter( unique_identifier = id_IN )
-                existing_article_count = existing_article_qs.count()
+                if ( existing_article_list_IN is not None ):
+
+                    # already retrieved.
+                    existing_article_qs = existing_article_list_IN
+
+                else:
+
+                    existing_article_qs = list( Article.objects.filter( unique_identifier = id_IN ) )
+
+                #-- END check to see if existing articles passed in --#
+
+                existing_article_count = len( existing_article_qs )
                 
                 # got one or more duplicates?
                 if ( existing_article_count == 1 ):
                 
                     # one duplicate.  We have options.  Get the one row.
-                    existing_article = existing_article_qs.get( unique_identifier = id_IN )
+                    existing_article = existing_article_qs[ 0 ]
                 
                     # Yes.  We have a duplicate.  What do we do about it?
                     if ( duplicate_action == self.DO_ON_DUPLICATE_UPDATE ):
@@ -599,8 +755,12 @@ class NewsBankHelper( object ):
             
         #-- END check to see if ID passed in --#
         
-        # set the unique_identifier_type
-        article_instance.unique_idnetifier_type = Article.ENTITY_ID_TYPE_ARTICLE_NEWSBANK_ID
+        # set the unique_identifier_type (unless skipping).
+        if ( article_instance is not None ):
+
+            article_instance.unique_identifier_type = Article.ENTITY_ID_TYPE_ARTICLE_NEWSBANK_ID
+
+        #-- END check to see if article instance --#
         
         article_OUT = article_instance
 
@@ -754,6 +914,196 @@ class NewsBankHelper( object ):
     #-- END method output_debug() --#
 
 
+    def parse_file_contents( self, id_IN, contents_IN ):
+
+        '''
+        Accepts an ID and the contents of a file (the HTML of a NewsBank
+           article).  Uses BeautifulSoup to pull the values for an Article out
+           of the HTML, without touching the database, so it is safe to call
+           in a separate process.
+
+        Postconditions: Returns a NewsBankParsedArticle.  If there was a
+           problem parsing, its status is the error message.  Otherwise,
+           status is STATUS_SUCCESS, and the parsed values can be placed in an
+           Article with apply_parsed_article().
+        '''
+
+        # return reference
+        parsed_OUT = None
+
+        # declare variables
+        me = "parse_file_contents"
+        
+        # variables to hold properties of an article
+        my_source_string = ""
+        my_pub_date = ""
+        my_author_string = ""
+        my_headline = ""
+        my_text = ""
+        my_permalink = ""
+
+        # variables for actually parsing article
+        bs_helper = None
+        bs_article = None
+        bs_div_docBody = None
+        bs_div_openUrl = None
+        bs_h3_docCite = None
+        bs_span_pubName = None
+        bs_temp_tag = None
+        bs_div_sourceInfo = None
+        error_string = ""
+
+        # make parsed article
+        parsed_OUT = NewsBankParsedArticle( id_IN )
+
+        # make sure we have something in contents
+        if ( ( id_IN ) and ( contents_IN ) ):
+        
+            # create Beautiful Soup instance for this article.
+            bs_article = BeautifulSoup( contents_IN )
+            bs_helper = self.get_bs_helper()
+            
+            # get the docbody div, which has everything except the permalink.
+            bs_div_docBody = bs_article.find( "div", self.HTML_CLASS_DOC_BODY )
+            
+            # do we have a docbody BeautifulSoup object?  If no, problem
+            #    retrieving original file - no sense parsing.
+            if ( bs_div_docBody ):
+                
+                # place stuff we already know into parsed article.
+                parsed_OUT.unique_identifier = id_IN
+                parsed_OUT.unique_identifier_type = Article.ENTITY_ID_TYPE_ARTICLE_NEWSBANK_ID
+                parsed_OUT.archive_source = SOURCE_NEWS_BANK
+                parsed_OUT.raw_html = contents_IN
+                
+                # Use Beautiful Soup to parse out all of the data from the HTML file.
+                
+                # --- headline
+    
+                bs_h3_docCite = bs_div_docBody.find( "h3", self.HTML_CLASS_DOC_CITE )
+                my_headline = bs_h3_docCite.string
+                my_headline = bs_helper.convert_html_entities( my_headline )
+                
+                # strip out extra white space (tabs, newlines, etc.).
+                my_headline = self.regex_white_space.sub( " ", my_headline )
+                my_headline = my_headline.strip()
+    
+                self.output_debug( "<<< headline: " + my_headline )
+                
+                # For source string and date, first get span that holds paper name
+                bs_span_pubName = bs_div_docBody.find( "span", self.HTML_CLASS_PUB_NAME )
+                
+                # --- source_string
+    
+                # source string is text contents of pubName span.
+                my_source_string = bs_span_pubName.string
+                
+                self.output_debug( "<<< source_string: " + my_source_string )
+    
+                # --- pub_date
+    
+                # to get date, first get parent of pubName span.
+                bs_temp_tag = bs_span_pubName.parent
+                
+                # just get the text within this parent element.
+                #my_pub_date = self.bs_get_child_text( bs_temp_tag )
+                my_pub_date = bs_helper.bs_get_cleaned_direct_child_text( bs_temp_tag )
+                
+                self.output_debug( "<<< pub_date (before conversion): " + str( my_pub_date ) )
+                
+                # got anything?
+                if ( my_pub_date ):
+                
+                    # yes.  Should be formatted: "- Wednesday, July 8, 2009", so 
+                    #    "- %A, %B %d, %Y" - convert to datetime.
+                    my_pub_date = datetime.datetime.strptime( my_pub_date, "- %A, %B %d, %Y" )
+                
+                #-- END check to see if pub date is populated --#
+                
+                self.output_debug( "<<< pub_date (after conversion): " + str( my_pub_date ) )
+                
+                # --- author_string
+                
+                # get div with class "sourceInfo"
+                bs_temp_tag = bs_div_docBody.find( "div", self.HTML_CLASS_SOURCE_INFO )
+                
+                # get nested text
+                #my_author_string = self.bs_get_child_text( bs_temp_tag )
+                my_author_string = bs_helper.bs_get_cleaned_direct_child_text( bs_temp_tag )
+    
+                self.output_debug( "<<< author_string: " + my_author_string )
+    
+                # --- text
+                
+                # get div with class "mainText"
+                bs_temp_tag = bs_div_docBody.find( "div", self.HTML_CLASS_MAIN_TEXT )
+                
+                # clean up the article body text.
+                my_text = self.clean_article_body( bs_temp_tag )
+
+                self.output_debug( "<<< text: " + my_text )
+                
+                # Next we get stuff that is in tags.  First, retrieve sourceInfo div
+                #    that is direct child of docbody.  Use recursive = False.
+                bs_div_sourceInfo = bs_div_docBody.find( "div", self.HTML_CLASS_SOURCE_INFO, recursive = False )
+    
+                # Did we find the element that holds the list of tags?
+                if ( bs_div_sourceInfo ):
+                
+                    # got a tag list.  Process it.
+                    parsed_OUT = self.process_article_tag_list( bs_div_sourceInfo, parsed_OUT )
+    
+                #-- END check to make sure we have a tag list. --#
+                
+                # get permalink
+                bs_div_openUrl = bs_article.find( "div", id = self.HTML_ID_OPEN_URL )
+                
+                # get anchor tag within that container
+                bs_temp_tag = bs_div_openUrl.find( "a" )
+    
+                # does the tag we found have an href attribute?
+                if ( bs_temp_tag.has_key( "href" ) ):
+                
+                    # yes.
+                    my_permalink = bs_temp_tag[ "href" ]
+                    parsed_OUT.permalink = my_permalink.strip()
+                    
+                    self.output_debug( "<<< permalink: " + my_permalink )
+                 
+                #-- END check to see if we have a URL for permalink. --#
+                
+                # Add items to parsed article
+                parsed_OUT.headline = my_headline
+                parsed_OUT.source_string = my_source_string
+                parsed_OUT.pub_date = my_pub_date
+                parsed_OUT.author_string = my_author_string
+                parsed_OUT.author_varchar = my_author_string
+                parsed_OUT.text = my_text
+                parsed_OUT.status = self.STATUS_SUCCESS
+                
+            else:
+            
+                # No docBody div, so can't process.  Update status, fall out.
+                error_string = "ERROR in NewsBankHelper." + me + ": No div with class docBody in article with ID = " + id_IN + ", so can't process article."
+                parsed_OUT.status = error_string
+            
+            #-- END check to see if we have a docBody <div> --#
+                        
+        else:
+        
+            # for now, just print what we've found.
+            self.output_debug( "=== in " + me + "(): no contents passed in." )
+        
+            error_string = "ERROR in NewsBankHelper." + me + ": No content for article with ID = " + str( id_IN ) + ", so can't process article."
+            parsed_OUT.status = error_string
+
+        #-- END check to see if contents_IN has something in it --#
+                
+        return parsed_OUT
+                
+    #-- END method parse_file_contents() --#
+
+
     def process_article_list( self, bs_article_list_ul_IN ):
 
         '''
@@ -1041,231 +1391,51 @@ class NewsBankHelper( object ):
 
         # declare variables
         me = "process_file_contents"
-        
-        # variables to hold properties of an article
-        my_source_string = ""
-        my_pub_date = ""
-        my_section = ""
-        my_page = ""
-        my_author_string = ""
-        my_headline = ""
-        my_text = ""
-        my_edition = ""
-        my_index_terms = ""
-        my_archive_id = ""
-        my_corrections = ""
-        my_copyright = ""
-        my_permalink = ""
-
-        # variables for actually parsing article
-        bs_helper = None
+        parsed_article = None
         article_instance = None
-        bs_article = None
-        bs_div_docBody = None
-        bs_div_openUrl = None
-        bs_h3_docCite = None
-        bs_span_pubName = None
-        bs_temp_tag = None
-        bs_current_element = None
-        current_class_attr = ""
-        current_string = ""
-        bs_div_sourceInfo = None
-        bs_current_item = None # could be element, or could be text.
-        current_class = ""
-        error_string = ""
 
-        # make sure we have something in contents
-        if ( ( id_IN ) and ( contents_IN ) ):
-        
-            # create Beautiful Soup instance for this article.
-            bs_article = BeautifulSoup( contents_IN )
-            bs_helper = self.get_bs_helper()
-            
-            # get the docbody div, which has everything except the permalink.
-            bs_div_docBody = bs_article.find( "div", self.HTML_CLASS_DOC_BODY )
-            
-            # do we have a docbody BeautifulSoup object?  If no, problem
-            #    retrieving original file - no sense parsing.
-            if ( bs_div_docBody ):
-                
-                # get article instance to use in interacting with database.
-                article_instance = self.get_article_instance( id_IN )
-                                
-                # check to see if we process - decided by whether there is something
-                #    in article_instance or not.  If no, skip and move to next
-                #    article.
-                if ( article_instance ):
-    
-                    # place stuff we already know into model.
-                    # Now, only set if we save, after saving.
-                    #article_instance.raw_html = contents_IN
-                    article_instance.unique_identifier = id_IN
-                    article_instance.unique_identifier_type = Article.ENTITY_ID_TYPE_ARTICLE_NEWSBANK_ID
-                    article_instance.archive_source = SOURCE_NEWS_BANK
-                    
-                    # got a related newspaper to nest?
-                    if ( self.newspaper_for_place ):
-                        
-                        article_instance.newspaper = self.newspaper_for_place
-                    
-                    #-- END check to see if there is a related newspaper instance --#
-                    
-                    # Use Beautiful Soup to parse out all of the data from the HTML file.
-                    
-                    # --- headline
-        
-                    bs_h3_docCite = bs_div_docBody.find( "h3", self.HTML_CLASS_DOC_CITE )
-                    my_headline = bs_h3_docCite.string
-                    my_headline = bs_helper.convert_html_entities( my_headline )
-                    
-                    # strip out extra white space (tabs, newlines, etc.).
-                    my_headline = self.regex_white_space.sub( " ", my_headline )
-                    my_headline = my_headline.strip()
-        
-                    self.output_debug( "<<< headline: " + my_headline )
-                    
-                    # For source string and date, first get span that holds paper name
-                    bs_span_pubName = bs_div_docBody.find( "span", self.HTML_CLASS_PUB_NAME )
-                    
-                    # --- source_string
-        
-                    # source string is text contents of pubName span.
-                    my_source_string = bs_span_pubName.string
-                    
-                    self.output_debug( "<<< source_string: " + my_source_string )
-        
-                    # --- pub_date
-        
-                    # to get date, first get parent of pubName span.
-                    bs_temp_tag = bs_span_pubName.parent
-                    
-                    # just get the text within this parent element.
-                    #my_pub_date = self.bs_get_child_text( bs_temp_tag )
-                    my_pub_date = bs_helper.bs_get_cleaned_direct_child_text( bs_temp_tag )
-                    
-                    self.output_debug( "<<< pub_date (before conversion): " + str( my_pub_date ) )
-                    
-                    # got anything?
-                    if ( my_pub_date ):
-                    
-                        # yes.  Should be formatted: "- Wednesday, July 8, 2009", so 
-                        #    "- %A, %B %d, %Y" - convert to datetime.
-                        my_pub_date = datetime.datetime.strptime( my_pub_date, "- %A, %B %d, %Y" )
-                    
-                    #-- END check to see if pub date is populated --#
-                    
-                    self.output_debug( "<<< pub_date (after conversion): " + str( my_pub_date ) )
-                    
-                    # --- author_string
-                    
-                    # get div with class "sourceInfo"
-                    bs_temp_tag = bs_div_docBody.find( "div", self.HTML_CLASS_SOURCE_INFO )
-                    
-                    # get nested text
-                    #my_author_string = self.bs_get_child_text( bs_temp_tag )
-                    my_author_string = bs_helper.bs_get_cleaned_direct_child_text( bs_temp_tag )
-        
-                    self.output_debug( "<<< author_string: " + my_author_string )
-        
-                    # --- text
-                    
-                    # get div with class "mainText"
-                    bs_temp_tag = bs_div_docBody.find( "div", self.HTML_CLASS_MAIN_TEXT )
-                    
-                    # clean up the article body text.
-                    my_text = self.clean_article_body( bs_temp_tag )
+        # parse (status is error message if no contents, no docBody).
+        parsed_article = self.parse_file_contents( id_IN, contents_IN )
+        if ( parsed_article.status == self.STATUS_SUCCESS ):
 
-                    self.output_debug( "<<< text: " + my_text )
-                    
-                    # Next we get stuff that is in tags.  First, retrieve sourceInfo div
-                    #    that is direct child of docbody.  Use recursive = False.
-                    bs_div_sourceInfo = bs_div_docBody.find( "div", self.HTML_CLASS_SOURCE_INFO, recursive = False )
-        
-                    # Did we find the element that holds the list of tags?
-                    if ( bs_div_sourceInfo ):
-                    
-                        # got a tag list.  Process it.
-                        article_instance = self.process_article_tag_list( bs_div_sourceInfo, article_instance )
-        
-                        '''
-                        my_section = ""
-                        my_page = ""
-                        my_edition = ""
-                        my_index_terms = ""
-                        my_archive_id = ""
-                        my_corrections = ""
-                        my_copyright = ""
-                        '''
-        
-                    
-                    #-- END check to make sure we have a tag list. --#
-                    
-                    # get permalink
-                    bs_div_openUrl = bs_article.find( "div", id = self.HTML_ID_OPEN_URL )
-                    
-                    # get anchor tag within that container
-                    bs_temp_tag = bs_div_openUrl.find( "a" )
-        
-                    # does the tag we found have an href attribute?
-                    if ( bs_temp_tag.has_key( "href" ) ):
-                    
-                        # yes.
-                        my_permalink = bs_temp_tag[ "href" ]
-                        article_instance.permalink = my_permalink.strip()
-                        
-                        self.output_debug( "<<< permalink: " + my_permalink )
-                     
-                    #-- END check to see if we have a URL for permalink. --#
-                    
-                    # Add items to article instance
-                    article_instance.headline = my_headline
-                    article_instance.source_string = my_source_string
-                    article_instance.pub_date = my_pub_date
-                    article_instance.author_string = my_author_string
-                    article_instance.author_varchar = my_author_string
-                    
-                    # Now, only set if we save, after saving.
-                    #article_instance.text = my_text
-                    
-                    # Do we update?  If you want body text, raw html saved, you
-                    #    have to do an update.
-                    if ( do_update_IN == True ):
+            # get article instance to use in interacting with database.
+            article_instance = self.get_article_instance( id_IN )
+                            
+            # check to see if we process - decided by whether there is something
+            #    in article_instance or not.  If no, skip and move to next
+            #    article.
+            if ( article_instance ):
 
-                        # save the item/article to the database.
-                        article_instance.save()
-                        
-                        # set text and raw html.
-                        article_instance.set_text( my_text )
-                        article_instance.set_raw_html( contents_IN )                        
-                        
-                    #-- END check to see if we do an update. --#
+                # place parsed values into model.
+                self.apply_parsed_article( parsed_article, article_instance )
+
+                # Do we update?  If you want body text, raw html saved, you
+                #    have to do an update.
+                if ( do_update_IN == True ):
+
+                    # save the item/article to the database.
+                    article_instance.save()
                     
-                else:
-                
-                    # Skipping this article - probably because of duplicate checking.
-                    self.output_debug( "=== in " + me + "(): no article_instance, so skipping article with ID " + id_IN + ", probably because it is a duplicate of one already in the database (duplicate action: " + self.do_on_duplicate + ")." )
-    
-                #-- END check to see if we process. --#
+                    # set text and raw html.
+                    article_instance.set_text( parsed_article.text )
+                    article_instance.set_raw_html( contents_IN )                        
+                    
+                #-- END check to see if we do an update. --#
                 
             else:
             
-                # No docBody div, so can't process.  Log error, update status, fall out.
-                error_string = "ERROR in NewsBankHelper." + me + ": No div with class docBody in article with ID = " + id_IN + ", so can't process article."
-                status_OUT = error_string
-                #self.add_error( self.current_item, self.current_id, error_string )
-            
-            #-- END check to see if we have a docBody <div> --#
-                        
+                # Skipping this article - probably because of duplicate checking.
+                self.output_debug( "=== in " + me + "(): no article_instance, so skipping article with ID " + id_IN + ", probably because it is a duplicate of one already in the database (duplicate action: " + self.do_on_duplicate + ")." )
+
+            #-- END check to see if we process. --#
+
         else:
-        
-            # for now, just print what we've found.
-            self.output_debug( "=== in process_file_contents(): no contents passed in." )
-        
-            error_string = "ERROR in NewsBankHelper." + me + ": No content for article with ID = " + id_IN + ", so can't process article."
-            status_OUT = error_string
-            #self.add_error( self.current_item, self.current_id, error_string )
 
-        #-- END check to see if contents_IN has something in it --#
+            # error parsing.
+            status_OUT = parsed_article.status
+            #self.add_error( self.current_item, self.current_id, status_OUT )
+
+        #-- END check to see if parsed --#
                 
         return status_OUT
                 
@@ -1299,4 +1469,167 @@ class NewsBankHelper( object ):
     #-- END method process_paragraph_contents() --#
 
 
+    def save_parsed_article_list( self, parsed_article_list_IN ):
+
+        '''
+        Accepts a list of NewsBankParsedArticles that parsed successfully.
+           Stores them in the database in one transaction, with one query to
+           look for duplicates of all of them (rather than one per article).
+           Articles that are new, along with their Article_Text and
+           Article_RawData, are inserted with bulk_create() (Articles are saved
+           one at a time if the database can't return IDs from a bulk insert).
+           Existing articles that are being updated are saved one at a time,
+           as in process_file_contents().  Duplicate handling is the same as
+           process_file_contents(), including for an ID that is in the list
+           more than once.
+
+        Returns list of Articles saved.
+        '''
+
+        # return reference
+        list_OUT = []
+
+        # declare variables
+        me = "save_parsed_article_list"
+        id_list = []
+        existing_article_map = {}
+        parsed_article = None
+        article_instance = None
+        existing_article_list = None
+        create_pair_list = []
+        update_pair_list = []
+        current_pair = None
+        db_features = None
+        can_return_ids = False
+        text_instance = None
+        text_list = []
+        raw_data_instance = None
+        raw_data_list = []
+
+        # got anything?
+        if ( ( parsed_article_list_IN is not None ) and ( len( parsed_article_list_IN ) > 0 ) ):
+
+            # do we check for duplicates?
+            if ( self.check_for_duplicates == True ):
+
+                # yes - retrieve all existing articles with IDs in list at once.
+                id_list = [ parsed_article.id for parsed_article in parsed_article_list_IN ]
+                for article_instance in Article.objects.filter( unique_identifier__in = id_list ):
+
+                    existing_article_map.setdefault( article_instance.unique_identifier, [] ).append( article_instance )
+
+                #-- END loop over existing articles --#
+
+            #-- END check to see if checking for duplicates --#
+
+            # decide what to do with each.
+            for parsed_article in parsed_article_list_IN:
+
+                existing_article_list = existing_article_map.setdefault( parsed_article.id, [] )
+                article_instance = self.get_article_instance( parsed_article.id, existing_article_list_IN = existing_article_list )
+                if ( article_instance is None ):
+
+                    # Skipping this article - probably because of duplicate checking.
+                    self.output_debug( "=== in " + me + "(): no article_instance, so skipping article with ID " + parsed_article.id + ", probably because it is a duplicate of one already in the database (duplicate action: " + self.do_on_duplicate + ")." )
+
+                else:
+
+                    self.apply_parsed_article( parsed_article, article_instance )
+
+                    if ( article_instance.pk is not None ):
+
+                        # existing - update.
+                        update_pair_list.append( [ article_instance, parsed_article ] )
+
+                    elif ( article_instance in existing_article_list ):
+
+                        # new in this list, and updated again - use latest.
+                        for current_pair in create_pair_list:
+
+                            if ( current_pair[ 0 ] is article_instance ):
+
+                                current_pair[ 1 ] = parsed_article
+
+                            #-- END check to see if pair for this article --#
+
+                        #-- END loop over pairs --#
+
+                    else:
+
+                        # new - so later copies in list are duplicates.
+                        create_pair_list.append( [ article_instance, parsed_article ] )
+                        existing_article_list.append( article_instance )
+
+                    #-- END check to see if new or existing --#
+
+                #-- END check to see if skipping --#
+
+            #-- END loop over parsed articles --#
+
+            # can database fill in IDs on bulk insert?
+            db_features = connections[ Article.objects.db ].features
+            can_return_ids = getattr( db_features, "can_return_rows_from_bulk_insert", False ) or getattr( db_features, "can_return_ids_from_bulk_insert", False )
+
+            with transaction.atomic():
+
+                # new articles
+                if ( len( create_pair_list ) > 0 ):
+
+                    if ( can_return_ids == True ):
+
+                        Article.objects.bulk_create( [ current_pair[ 0 ] for current_pair in create_pair_list ] )
+
+                    else:
+
+                        for current_pair in create_pair_list:
+
+                            current_pair[ 0 ].save()
+
+                        #-- END loop over new articles --#
+
+                    #-- END check to see if bulk insert returns IDs --#
+
+                    # then text and raw data, now articles have IDs.
+                    for article_instance, parsed_article in create_pair_list:
+
+                        text_instance = Article_Text()
+                        text_instance.article = article_instance
+                        text_instance.content_type = "canonical"
+                        text_instance.set_text( parsed_article.text )
+                        text_list.append( text_instance )
+
+                        raw_data_instance = Article_RawData()
+                        raw_data_instance.article = article_instance
+                        raw_data_instance.content_type = "html"
+                        raw_data_instance.set_content( parsed_article.raw_html )
+                        raw_data_list.append( raw_data_instance )
+
+                        list_OUT.append( article_instance )
+
+                    #-- END loop over new articles --#
+
+                    Article_Text.objects.bulk_create( text_list )
+                    Article_RawData.objects.bulk_create( raw_data_list )
+
+                #-- END check to see if new articles --#
+
+                # updates - same as process_file_contents().
+                for article_instance, parsed_article in update_pair_list:
+
+                    article_instance.save()
+                    article_instance.set_text( parsed_article.text )
+                    article_instance.set_raw_html( parsed_article.raw_html )
+                    list_OUT.append( article_instance )
+
+                #-- END loop over articles to update --#
+
+            #-- END transaction --#
+
+        #-- END check to see if anything passed in --#
+
+        return list_OUT
+
+    #-- END method save_parsed_article_list() --#
+
+
 #-- END class NewsBankHelper --#
\ No newline at end of file
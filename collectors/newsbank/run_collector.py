@@ -50,6 +50,7 @@ output_directory_IN = ""
 do_database_output_IN = False
 do_file_output_IN = False
 ignore_missing_issues_IN = False
+fetch_workers_IN = 1
 
 #================================================================================
 # Initialize command line argument processor
@@ -92,6 +93,9 @@ options_parser.add_option( "-a", "--email_from", dest = "email_from", default =
 # output_directory
 options_parser.add_option( "-b", "--email_to", dest = "email_to", default = "", help = "Email address (es - if multiple, comma-separated list) to which you want status emails to be sent." )
 
+# number of pages to fetch at once
+options_parser.add_option( "-w", "--fetch_workers", dest = "fetch_workers", type = "int", default = 1, help = "Number of issue and article pages to retrieve at once.  Defaults to 1 (one at a time)." )
+
 # parse options passed in on command line.
 (options, args) = options_parser.parse_args()
 
@@ -269,6 +273,10 @@ if ( len( newsbank_collector.dates_to_process ) > 0 ):
     
     # set error handling options
     newsbank_collector.ignore_missing_issues = ignore_missing_issues_IN
+
+    # set up concurrent fetching
+    fetch_workers_IN = options.fetch_workers
+    newsbank_collector.fetch_max_workers = fetch_workers_IN
     
     # if outputting files, set the output directory
     if ( do_file_output_IN == True ):
@@ -107,6 +107,13 @@ if ( processing_date ):
     # do check for duplicates.
     fs_collector.check_for_duplicates = True
     
+    # for big directories - store files as they are found, in batches, parsing
+    #    in multiple processes, and pick up where we left off if interrupted.
+    #fs_collector.stream_items = True
+    #fs_collector.batch_size = 500
+    #fs_collector.parse_worker_count = 4
+    #fs_collector.checkpoint_file_path = "databaser-" + processing_date + ".checkpoint.json"
+    
     # call the method to loop over dates.
     fs_collector.collect()
     
@@ -19,10 +19,16 @@ Configuration properties for it are stored in django's admins, in the
 
 # imports
 
+# python base imports
+import datetime
+
 # six - python 2 + 3
 import six
 
 # django imports
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce
 from django.db.models.query import QuerySet
 
 # python utilities
@@ -33,6 +39,8 @@ from python_utilities.status.status_container import StatusContainer
 
 # context_text models
 from context_text.models import Article_Author
+from context_text.models import Article_Data
+from context_text.models import Article_Data_Network_Tie
 from context_text.models import Article_Subject
 from context_text.models import Person
 
@@ -54,8 +62,20 @@ class PersonData( object ):
     
     # merge functions
     CLASS_NAME_TO_MERGE_FUNCTION_MAP = {}
+    CLASS_NAME_TO_BULK_MERGE_FUNCTION_MAP = {}
     DEFAULT_MERGE_FUNCTION = None
     
+    # bulk merge
+    DEFAULT_MERGE_BATCH_SIZE = 500
+    
+    # Person references that record history, so are left alone when merging
+    #     (see switch_persons_in_data()).
+    PRESERVED_PERSON_FIELD_NAME_LIST = [ "original_person" ]
+    
+    # models derived from coding that are rebuilt after a merge rather than
+    #     merged (see merge_persons_bulk()).
+    REBUILT_PERSON_MODEL_LIST = [ Article_Data_Network_Tie ]
+    
 
     #============================================================================
     # static methods
@@ -68,12 +88,13 @@ class PersonData( object ):
 
 
     @classmethod
-    def get_merge_function( cls, class_IN, *args, **kwargs ):
+    def get_merge_function( cls, class_IN, is_bulk_IN = False, *args, **kwargs ):
         
         '''
         Accepts a class.  Retrieves its name (__name__).  Looks up a merge
-            function from CLASS_NAME_TO_MERGE_FUNCTION_MAP for the class name,
-            returns a reference to the merge function.
+            function from CLASS_NAME_TO_MERGE_FUNCTION_MAP for the class name
+            (or from CLASS_NAME_TO_BULK_MERGE_FUNCTION_MAP if is_bulk_IN is
+            True), returns a reference to the merge function.
         '''
         
         # return reference
@@ -82,6 +103,7 @@ class PersonData( object ):
         # declare variables
         map_count = -1
         class_name = ""
+        function_map = None
         function_reference = None
         
         # got a class passed in?
@@ -103,7 +125,17 @@ class PersonData( object ):
             class_name = class_name.lower()
             
             # retrieve function from map.
-            function_reference = cls.CLASS_NAME_TO_MERGE_FUNCTION_MAP.get( class_name, None )
+            if ( is_bulk_IN == True ):
+            
+                function_map = cls.CLASS_NAME_TO_BULK_MERGE_FUNCTION_MAP
+                
+            else:
+            
+                function_map = cls.CLASS_NAME_TO_MERGE_FUNCTION_MAP
+                
+            #-- END check to see which map --#
+            
+            function_reference = function_map.get( class_name, None )
             
             value_OUT = function_reference
             
@@ -179,6 +211,83 @@ class PersonData( object ):
     #-- END class method get_person_related_set_attribute_names() --#
 
 
+    @classmethod
+    def get_person_reference_field_list( cls, *args, **kwargs ):
+        
+        '''
+        Returns list of ( model class, field name ) tuples, one for each
+            ForeignKey that refers to Person (from Person._meta.related_objects),
+            leaving out fields in PRESERVED_PERSON_FIELD_NAME_LIST and models
+            in REBUILT_PERSON_MODEL_LIST.
+        '''
+        
+        # return reference
+        field_list_OUT = []
+        
+        # declare variables
+        related_object = None
+        related_field = None
+        
+        for related_object in Person._meta.related_objects:
+        
+            # only ForeignKeys (many-to-one), not rebuilt models.
+            if ( ( related_object.one_to_many == True )
+                and ( related_object.related_model not in cls.REBUILT_PERSON_MODEL_LIST ) ):
+            
+                related_field = related_object.field
+                if ( related_field.name not in cls.PRESERVED_PERSON_FIELD_NAME_LIST ):
+                
+                    field_list_OUT.append( ( related_object.related_model, related_field.name ) )
+                    
+                #-- END check to see if preserved field --#
+                
+            #-- END check to see if ForeignKey --#
+            
+        #-- END loop over related objects --#
+        
+        return field_list_OUT
+        
+    #-- END class method get_person_reference_field_list() --#
+
+
+    @classmethod
+    def get_referenced_person_id_list( cls, record_instance_IN, *args, **kwargs ):
+        
+        '''
+        Accepts model instance.  Returns list of the IDs of the Persons it
+            refers to through ForeignKeys, leaving out fields in
+            PRESERVED_PERSON_FIELD_NAME_LIST and empty references.
+        '''
+        
+        # return reference
+        id_list_OUT = []
+        
+        # declare variables
+        current_field = None
+        person_id = None
+        
+        for current_field in record_instance_IN._meta.concrete_fields:
+        
+            if ( ( current_field.many_to_one == True )
+                and ( current_field.related_model == Person )
+                and ( current_field.name not in cls.PRESERVED_PERSON_FIELD_NAME_LIST ) ):
+            
+                person_id = getattr( record_instance_IN, current_field.attname )
+                if ( person_id is not None ):
+                
+                    id_list_OUT.append( person_id )
+                    
+                #-- END check to see if reference --#
+                
+            #-- END check to see if ForeignKey to Person --#
+            
+        #-- END loop over fields --#
+        
+        return id_list_OUT
+        
+    #-- END class method get_referenced_person_id_list() --#
+
+
     @classmethod
     def init_merge_function_info( cls, *args, **kwargs ):
         
@@ -235,6 +344,19 @@ class PersonData( object ):
         cls.CLASS_NAME_TO_MERGE_FUNCTION_MAP[ "reliability_names" ] = cls.mf_do_nothing
         cls.CLASS_NAME_TO_MERGE_FUNCTION_MAP[ "reliability_ties" ] = cls.mf_do_nothing
         
+        # bulk merge (merge_persons_bulk()) - same as above, except context_text
+        #     records that just refer to a person have the reference moved to
+        #     the INTO person (one UPDATE per table).
+        cls.CLASS_NAME_TO_BULK_MERGE_FUNCTION_MAP.update( cls.CLASS_NAME_TO_MERGE_FUNCTION_MAP )
+        cls.CLASS_NAME_TO_BULK_MERGE_FUNCTION_MAP[ "alternate_author_match" ] = cls.mf_update_person_reference
+        cls.CLASS_NAME_TO_BULK_MERGE_FUNCTION_MAP[ "alternate_name" ] = cls.mf_update_person_reference
+        cls.CLASS_NAME_TO_BULK_MERGE_FUNCTION_MAP[ "alternate_subject_match" ] = cls.mf_update_person_reference
+        cls.CLASS_NAME_TO_BULK_MERGE_FUNCTION_MAP[ "article_author" ] = cls.mf_update_person_reference
+        cls.CLASS_NAME_TO_BULK_MERGE_FUNCTION_MAP[ "article_subject" ] = cls.mf_update_person_reference
+        cls.CLASS_NAME_TO_BULK_MERGE_FUNCTION_MAP[ "person_external_uuid" ] = cls.mf_update_person_reference
+        cls.CLASS_NAME_TO_BULK_MERGE_FUNCTION_MAP[ "person_newspaper" ] = cls.mf_update_person_reference
+        cls.CLASS_NAME_TO_BULK_MERGE_FUNCTION_MAP[ "person_organization" ] = cls.mf_update_person_reference
+        
         # AND, finally, set default merge function.
         cls.DEFAULT_MERGE_FUNCTION = cls.mf_do_nothing
         
@@ -322,6 +444,78 @@ class PersonData( object ):
     #-- END merge function mf_just_delete() --#
 
     
+    @classmethod
+    def mf_update_person_reference( cls, record_instance_IN, merge_from_person_IN, merge_into_person_IN, logger_name_IN = None, *args, **kwargs ):
+        
+        '''
+        merge function - moves each reference to the merge from person in the
+            record passed in over to the merge into person, then saves.  If
+            the record has an "original_person" that is empty, it is set to the
+            merge from person first, like switch_persons_in_data().
+            merge_persons_bulk() does the same thing for a whole table with
+            one UPDATE.
+        '''
+
+        # return reference
+        status_OUT = StatusContainer()
+        
+        # declare variables
+        me = "mf_update_person_reference"
+        debug_message = ""
+        my_logger_name = ""
+        current_field = None
+        field_name = ""
+        
+        # set logger name.
+        if ( ( logger_name_IN is not None ) and ( logger_name_IN != "" ) ):
+        
+            # got one - use it.
+            my_logger_name = logger_name_IN
+        
+        else:
+        
+            # not set.  Use default.
+            my_logger_name = cls.LOGGER_NAME
+        
+        #-- END check to see if loger name passed in. --#
+        
+        debug_message = "Updating person references in record: " + str( record_instance_IN ) + "; merge from person = " + str( merge_from_person_IN ) + "; merge into person = " + str( merge_into_person_IN )
+        LoggingHelper.output_debug( debug_message, method_IN = me, logger_name_IN = my_logger_name )
+
+        # loop over ForeignKeys to Person.
+        for current_field in record_instance_IN._meta.concrete_fields:
+        
+            field_name = current_field.name
+            if ( ( current_field.many_to_one == True )
+                and ( current_field.related_model == Person )
+                and ( field_name not in cls.PRESERVED_PERSON_FIELD_NAME_LIST )
+                and ( getattr( record_instance_IN, current_field.attname ) == merge_from_person_IN.id ) ):
+            
+                # remember original person?
+                if ( ( field_name == "person" )
+                    and ( hasattr( record_instance_IN, "original_person_id" ) == True )
+                    and ( record_instance_IN.original_person_id is None ) ):
+                
+                    record_instance_IN.original_person = merge_from_person_IN
+                    
+                #-- END check to see if original_person --#
+                
+                setattr( record_instance_IN, field_name, merge_into_person_IN )
+                
+            #-- END check to see if reference to merge from person --#
+            
+        #-- END loop over fields --#
+        
+        record_instance_IN.save()
+
+        # init status.
+        status_OUT = status_OUT.set_status_code( StatusContainer.STATUS_CODE_SUCCESS )
+        
+        return status_OUT        
+        
+    #-- END merge function mf_update_person_reference() --#
+
+    
     @classmethod
     def merge_records( cls, record_qs_IN, merge_from_id_IN, merge_into_id_IN, do_delete_IN = False, logger_name_IN = None, *args, **kwargs ):
         
@@ -355,6 +549,8 @@ class PersonData( object ):
         related_class = None
         related_id = ""
         related_id_list = []
+        record_id = -1
+        record_id_list = []
         merge_function = None
         related_qs = None
         related_record = None
@@ -462,6 +658,85 @@ class PersonData( object ):
         return status_OUT
         
     #-- END class method merge_records() --#
+
+
+    @classmethod
+    def merge_records_in_batches( cls, record_qs_IN, merge_function_IN, merge_from_person_list_IN, merge_into_person_IN, do_updates_IN = True, do_delete_IN = False, batch_size_IN = DEFAULT_MERGE_BATCH_SIZE, logger_name_IN = None, *args, **kwargs ):
+        
+        '''
+        Fallback for related records that need a per-record merge function.
+            Accepts QuerySet of related records, the merge function for their
+            class, list of merge from Person instances, and the merge into
+            Person.  Reads the IDs of the records once, then loads and merges
+            them batch_size_IN at a time.  If do_delete_IN, deletes each batch
+            after it is merged.  If do_updates_IN is False, just counts.
+            Returns the number of records.
+        '''
+        
+        # return reference
+        count_OUT = 0
+        
+        # declare variables
+        related_class = None
+        record_id_list = None
+        from_person_id_to_instance_map = None
+        from_person = None
+        start_index = -1
+        batch_id_list = None
+        batch_qs = None
+        current_record = None
+        from_person_id = -1
+        
+        # get class and IDs once, so we aren't looping inside a related set.
+        related_class = record_qs_IN.model
+        record_id_list = list( record_qs_IN.order_by( "pk" ).values_list( "pk", flat = True ) )
+        count_OUT = len( record_id_list )
+        
+        if ( ( do_updates_IN == True ) and ( count_OUT > 0 ) ):
+        
+            from_person_id_to_instance_map = {}
+            for from_person in merge_from_person_list_IN:
+            
+                from_person_id_to_instance_map[ from_person.id ] = from_person
+                
+            #-- END loop over from persons --#
+            
+            for start_index in range( 0, count_OUT, batch_size_IN ):
+            
+                batch_id_list = record_id_list[ start_index : start_index + batch_size_IN ]
+                batch_qs = related_class.objects.filter( pk__in = batch_id_list )
+                
+                for current_record in batch_qs:
+                
+                    # find the from person this record refers to.
+                    from_person = None
+                    for from_person_id in cls.get_referenced_person_id_list( current_record ):
+                    
+                        if ( from_person_id in from_person_id_to_instance_map ):
+                        
+                            from_person = from_person_id_to_instance_map[ from_person_id ]
+                            
+                        #-- END check to see if merge from person --#
+                        
+                    #-- END loop over referenced persons --#
+                    
+                    merge_function_IN( current_record, from_person, merge_into_person_IN, logger_name_IN = logger_name_IN )
+                    
+                #-- END loop over records in batch --#
+                
+                if ( do_delete_IN == True ):
+                
+                    related_class.objects.filter( pk__in = batch_id_list ).delete()
+                    
+                #-- END check to see if we delete --#
+                
+            #-- END loop over batches --#
+            
+        #-- END check to see if updating --#
+        
+        return count_OUT
+        
+    #-- END class method merge_records_in_batches() --#
         
     
     @classmethod
@@ -616,6 +891,226 @@ class PersonData( object ):
         
     #-- END class method merge_persons() --#
 
+
+    @classmethod
+    def merge_persons_bulk( cls, from_person_id_list_IN, into_person_id_IN, do_updates_IN = True, delete_from_IN = False, batch_size_IN = DEFAULT_MERGE_BATCH_SIZE, logger_name_IN = None, *args, **kwargs ):
+
+        '''
+        Set-based person merge.  For each ForeignKey to Person (see
+            get_person_reference_field_list()), looks up the bulk merge
+            function for the related model (CLASS_NAME_TO_BULK_MERGE_FUNCTION_MAP
+            - unlike merge_persons(), which leaves coding alone, this moves
+            context_text references to the INTO person):
+            - if it is mf_update_person_reference(), issues one
+                QuerySet.update() that moves all rows that refer to any of the
+                FROM persons over to the INTO person (UPDATE ... WHERE
+                person_id IN ( ... )).
+            - otherwise, passes the rows to merge_records_in_batches(), which
+                calls the merge function on each, batch_size_IN at a time.
+            Then rebuilds the Article_Data_Network_Tie rows of every
+            Article_Data that referred to a FROM person.  All in one
+            transaction.  If do_updates_IN is False, just counts.  If
+            delete_from_IN, deletes the FROM persons at the end.
+
+        Returns StatusContainer with a message per table with the number of
+            rows moved, then elapsed time.
+        '''
+
+        # return reference
+        status_OUT = StatusContainer()
+                
+        # declare variables
+        me = "merge_persons_bulk"
+        debug_message = ""
+        my_logger_name = ""
+        status_message = ""
+        start_time = None
+        elapsed_time = None
+        from_person_id_list = None
+        into_person = None
+        from_person_qs = None
+        from_person_list = None
+        from_person = None
+        related_model = None
+        field_name = ""
+        related_qs = None
+        merge_function = None
+        update_dict = None
+        row_count = -1
+        total_row_count = 0
+        article_data_id_set = None
+        rebuilt_article_data_qs = None
+        delete_person = None
+        
+        # set logger name.
+        if ( ( logger_name_IN is not None ) and ( logger_name_IN != "" ) ):
+        
+            # got one - use it.
+            my_logger_name = logger_name_IN
+        
+        else:
+        
+            # not set.  Use default.
+            my_logger_name = cls.LOGGER_NAME
+        
+        #-- END check to see if loger name passed in. --#
+        
+        start_time = datetime.datetime.now()
+        
+        # got a list passed in?
+        if ( ( from_person_id_list_IN is not None )
+            and ( isinstance( from_person_id_list_IN, list ) == True )
+            and ( len( from_person_id_list_IN ) > 0 ) ):
+        
+            # make sure there is a person to merge to...
+            if ( ( into_person_id_IN is not None )
+                and ( isinstance( into_person_id_IN, six.integer_types ) == True )
+                and ( into_person_id_IN > 0 ) ):
+                
+                with transaction.atomic():
+                
+                    into_person = Person.objects.get( pk = into_person_id_IN )
+                    
+                    # FROM persons - never the INTO person.
+                    from_person_qs = Person.objects.filter( pk__in = from_person_id_list_IN )
+                    from_person_qs = from_person_qs.exclude( pk = into_person_id_IN )
+                    from_person_list = list( from_person_qs )
+                    from_person_id_list = [ from_person.id for from_person in from_person_list ]
+                    
+                    # Article_Data whose network ties refer to FROM persons, or
+                    #     will once their authors and sources move - rebuilt
+                    #     below, since QuerySet.update() doesn't call save().
+                    article_data_id_set = set( Article_Author.objects.filter( person_id__in = from_person_id_list ).values_list( "article_data_id", flat = True ) )
+                    article_data_id_set.update( Article_Subject.objects.filter( person_id__in = from_person_id_list ).values_list( "article_data_id", flat = True ) )
+                    article_data_id_set.update( Article_Data_Network_Tie.objects.filter( from_person_id__in = from_person_id_list ).values_list( "article_data_id", flat = True ) )
+                    article_data_id_set.update( Article_Data_Network_Tie.objects.filter( to_person_id__in = from_person_id_list ).values_list( "article_data_id", flat = True ) )
+                    
+                    # loop over references to Person.
+                    for related_model, field_name in cls.get_person_reference_field_list():
+                    
+                        related_qs = related_model.objects.filter( **{ field_name + "__in" : from_person_id_list } )
+                        merge_function = cls.get_merge_function( related_model, is_bulk_IN = True )
+                        
+                        if ( merge_function == cls.mf_update_person_reference ):
+                        
+                            # one UPDATE for the whole table.
+                            if ( do_updates_IN == True ):
+                            
+                                update_dict = {}
+                                
+                                # remember original person, like
+                                #     switch_persons_in_data(), unless already
+                                #     set by an earlier switch.  Listed first,
+                                #     so it reads "person" before it changes.
+                                if ( ( field_name == "person" )
+                                    and ( hasattr( related_model, "original_person" ) == True ) ):
+                                
+                                    update_dict[ "original_person" ] = Coalesce( F( "original_person" ), F( "person" ) )
+                                    
+                                #-- END check to see if original_person --#
+                                
+                                update_dict[ field_name ] = into_person
+                                row_count = related_qs.update( **update_dict )
+                                
+                            else:
+                            
+                                row_count = related_qs.count()
+                                
+                            #-- END check to see if updating --#
+                            
+                        else:
+                        
+                            # per-record merge function, in batches.
+                            row_count = cls.merge_records_in_batches( related_qs,
+                                                                      merge_function,
+                                                                      from_person_list,
+                                                                      into_person,
+                                                                      do_updates_IN = do_updates_IN,
+                                                                      do_delete_IN = delete_from_IN,
+                                                                      batch_size_IN = batch_size_IN,
+                                                                      logger_name_IN = my_logger_name )
+                            
+                        #-- END check to see if bulk update --#
+                        
+                        status_message = "- " + related_model._meta.db_table + "." + field_name + ": " + str( row_count )
+                        if ( merge_function == cls.mf_update_person_reference ):
+                        
+                            total_row_count += row_count
+                            status_message += " rows moved"
+                            
+                        else:
+                        
+                            status_message += " rows passed to " + merge_function.__name__ + "()"
+                            
+                        #-- END check to see if moved --#
+                        
+                        status_OUT.add_message( status_message )
+                        LoggingHelper.output_debug( status_message, method_IN = me, logger_name_IN = my_logger_name )
+                        
+                    #-- END loop over references to Person --#
+                    
+                    # rebuild network ties - before FROM persons are deleted,
+                    #     so ties that refer to them aren't cascade-deleted.
+                    if ( do_updates_IN == True ):
+                    
+                        rebuilt_article_data_qs = Article_Data.objects.filter( id__in = article_data_id_set )
+                        row_count = Article_Data_Network_Tie.update_for_article_data_qs( rebuilt_article_data_qs )
+                        status_message = "- " + Article_Data_Network_Tie._meta.db_table + ": " + str( row_count ) + " rows rebuilt for " + str( len( article_data_id_set ) ) + " Article_Data"
+                        status_OUT.add_message( status_message )
+                        LoggingHelper.output_debug( status_message, method_IN = me, logger_name_IN = my_logger_name )
+                        
+                    #-- END check to see if updating --#
+                    
+                    # delete the FROM persons?
+                    if ( ( do_updates_IN == True ) and ( delete_from_IN == True ) ):
+                    
+                        for delete_person in from_person_list:
+                        
+                            status_OUT.add_message( "Deleting Person: " + str( delete_person ) )
+                            delete_person.delete()
+                            
+                        #-- END loop over persons to delete. --#
+                        
+                    #-- END check to see if we delete. --#
+                    
+                #-- END with transaction --#
+                
+                # status is success.
+                status_OUT.set_status_code( StatusContainer.STATUS_CODE_SUCCESS )
+
+                if ( do_updates_IN == False ):
+                
+                    status_OUT.add_message( "do_updates_IN = False, NO CHANGES MADE!" )
+                
+                #-- END check to see if we made updates or not --#
+
+                status_OUT.add_message( "Total rows moved: " + str( total_row_count ) )
+
+            else:
+            
+                # no person ID to merge into - nothing to merge.
+                status_OUT.set_status_code( StatusContainer.STATUS_CODE_ERROR )
+                status_message = "No person ID to merge into, so nothing to merge."
+                status_OUT.add_message( status_message )
+                
+            #-- END check to see if ID to merge into. --#
+            
+        else:
+        
+            # no list of from person IDs - nothing to merge.
+            status_OUT.set_status_code( StatusContainer.STATUS_CODE_ERROR )
+            status_message = "No person IDs in list of persons to merge passed in, so nothing to merge."
+            status_OUT.add_message( status_message )
+            
+        #-- END check to see if list of person to merge. --#
+
+        elapsed_time = datetime.datetime.now() - start_time
+        status_OUT.add_message( "Elapsed time: " + str( elapsed_time ) )
+
+        return status_OUT
+        
+    #-- END class method merge_persons_bulk() --#
+
     @classmethod
     def switch_persons_in_data( cls, from_person_id_IN, to_person_id_IN, do_updates_IN = True, *args, **kwargs ):
         
@@ -0,0 +1,465 @@
+from __future__ import unicode_literals
+
+'''
+Copyright 2010-2016 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text.
+
+context_text is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text. If not, see http://www.gnu.org/licenses/.
+
+Builds a deterministic synthetic corpus - newspapers, people, coders,
+   articles with text, and coded Article_Data with authors and quoted and
+   mentioned subjects - for measuring query plans and performance without
+   needing a copy of a real database.  The same seed and sizes always make the
+   same corpus.
+
+Usage:
+
+    my_corpus = SyntheticCorpus( article_count_IN = 5000 )
+    my_corpus.create()
+    ...
+    my_corpus.delete()
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+
+# python base imports
+import datetime
+import random
+
+# django imports
+from django.contrib.auth.models import User
+from django.db import transaction
+
+# context_text models
+from context_text.models import Article
+from context_text.models import Article_Author
+from context_text.models import Article_Data
+from context_text.models import Article_Subject
+from context_text.models import Article_Text
+from context_text.models import Newspaper
+from context_text.models import Person
+from context_text.models import Temp_Section
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class SyntheticCorpus( object ):
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+
+    # defaults
+    DEFAULT_ARTICLE_COUNT = 1000
+    DEFAULT_NEWSPAPER_COUNT = 3
+    DEFAULT_PERSON_COUNT = 500
+    DEFAULT_MAX_AUTHORS = 2
+    DEFAULT_MAX_SOURCES = 6
+    DEFAULT_SEED = 1
+    DEFAULT_START_DATE = datetime.date( 2009, 1, 1 )
+    DEFAULT_DAY_COUNT = 365
+    DEFAULT_BATCH_SIZE = 1000
+
+    # every Nth article also gets coded by the manual coder.
+    MANUAL_CODER_EVERY = 10
+
+    # prefix for names and identifiers, so synthetic rows are easy to find.
+    LABEL_PREFIX = "synthetic"
+
+    # coders
+    CODER_TYPE_AUTOMATED = "OpenCalais_REST_API_v2"
+    CODER_TYPE_MANUAL = "Manual_Article_Subject_Coding"
+
+    # sections - same names as Temp_Section, plus non-news.
+    SECTION_NAME_LIST = Temp_Section.NEWS_SECTION_NAME_LIST + [ "Opinion", "Obituaries" ]
+
+    # name parts
+    FIRST_NAME_LIST = [ "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "David", "Susan", "James", "Karen", "Thomas" ]
+    LAST_NAME_LIST = [ "Smith", "Johnson", "Williams", "Brown", "Jones", "Miller", "Davis", "Garcia", "Wilson", "Moore", "Taylor", "VanderArk" ]
+
+    # text
+    QUOTE_LIST = [ "We will vote on it next week", "The plant is going to close", "Nobody saw this coming", "It is a good day for the city", "We need more information before we decide" ]
+    FILLER_SENTENCE = "The council met Tuesday to discuss the budget for the coming year."
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> __init__() method
+    #---------------------------------------------------------------------------
+
+
+    def __init__( self,
+                  article_count_IN = DEFAULT_ARTICLE_COUNT,
+                  newspaper_count_IN = DEFAULT_NEWSPAPER_COUNT,
+                  person_count_IN = DEFAULT_PERSON_COUNT,
+                  seed_IN = DEFAULT_SEED ):
+
+        # declare variables
+        self.article_count = article_count_IN
+        self.newspaper_count = newspaper_count_IN
+        self.person_count = person_count_IN
+        self.seed = seed_IN
+        self.max_authors = self.DEFAULT_MAX_AUTHORS
+        self.max_sources = self.DEFAULT_MAX_SOURCES
+        self.start_date = self.DEFAULT_START_DATE
+        self.day_count = self.DEFAULT_DAY_COUNT
+        self.batch_size = self.DEFAULT_BATCH_SIZE
+
+        # what we made.
+        self.newspaper_list = []
+        self.person_list = []
+        self.coder_list = []
+        self.article_list = []
+        self.article_data_list = []
+        self.author_count = 0
+        self.subject_count = 0
+
+        # random number generator - seeded, so corpus is repeatable.
+        self.random = None
+
+    #-- END method __init__() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def create( self ):
+
+        '''
+        Creates the whole corpus in one transaction.  Returns dictionary of
+           counts of what was created (see get_summary_dict()).
+        '''
+
+        self.random = random.Random( self.seed )
+
+        with transaction.atomic():
+
+            self.create_coders()
+            self.create_newspapers()
+            self.create_persons()
+            self.create_articles()
+            self.create_article_data()
+
+        #-- END with transaction --#
+
+        return self.get_summary_dict()
+
+    #-- END method create() --#
+
+
+    def create_article_data( self ):
+
+        '''
+        Creates an automated coder Article_Data for each article (and a manual
+           one for every MANUAL_CODER_EVERY-th article), each with authors and
+           quoted and mentioned subjects drawn from the person list.
+        '''
+
+        # declare variables
+        automated_coder = None
+        manual_coder = None
+        article_data_list = None
+        article_index = -1
+        current_article = None
+        current_article_data = None
+        author_list = None
+        subject_list = None
+        person_list = None
+        current_person = None
+        source_count = -1
+        author_count = -1
+        person_index = -1
+
+        automated_coder = self.coder_list[ 0 ]
+        manual_coder = self.coder_list[ 1 ]
+
+        # Article_Data
+        article_data_list = []
+        for article_index, current_article in enumerate( self.article_list ):
+
+            current_article_data = Article_Data( article = current_article, coder = automated_coder, coder_type = self.CODER_TYPE_AUTOMATED, status = Article_Data.STATUS_COMPLETE )
+            article_data_list.append( current_article_data )
+
+            if ( ( article_index % self.MANUAL_CODER_EVERY ) == 0 ):
+
+                current_article_data = Article_Data( article = current_article, coder = manual_coder, coder_type = self.CODER_TYPE_MANUAL, status = Article_Data.STATUS_COMPLETE )
+                article_data_list.append( current_article_data )
+
+            #-- END check to see if manual coding too --#
+
+        #-- END loop over articles --#
+
+        Article_Data.objects.bulk_create( article_data_list, batch_size = self.batch_size )
+        self.article_data_list = list( Article_Data.objects.filter( article__in = self.article_list ).order_by( "article_id", "id" ) )
+
+        # authors and subjects
+        author_list = []
+        subject_list = []
+        for current_article_data in self.article_data_list:
+
+            # pick distinct people, authors first.
+            author_count = self.random.randint( 1, self.max_authors )
+            source_count = self.random.randint( 0, self.max_sources )
+            person_list = self.random.sample( self.person_list, min( len( self.person_list ), author_count + source_count + 1 ) )
+
+            for current_person in person_list[ :author_count ]:
+
+                author_list.append( Article_Author( article_data = current_article_data, person = current_person, name = current_person.full_name_string, author_type = "staff" ) )
+
+            #-- END loop over authors --#
+
+            for person_index, current_person in enumerate( person_list[ author_count: ] ):
+
+                # last one is just mentioned.
+                if ( person_index < source_count ):
+
+                    subject_list.append( Article_Subject( article_data = current_article_data, person = current_person, name = current_person.full_name_string, subject_type = Article_Subject.SUBJECT_TYPE_QUOTED, source_type = Article_Subject.SOURCE_TYPE_INDIVIDUAL ) )
+
+                else:
+
+                    subject_list.append( Article_Subject( article_data = current_article_data, person = current_person, name = current_person.full_name_string, subject_type = Article_Subject.SUBJECT_TYPE_MENTIONED ) )
+
+                #-- END check to see if quoted or mentioned --#
+
+            #-- END loop over subjects --#
+
+        #-- END loop over Article_Data --#
+
+        Article_Author.objects.bulk_create( author_list, batch_size = self.batch_size )
+        Article_Subject.objects.bulk_create( subject_list, batch_size = self.batch_size )
+        self.author_count = len( author_list )
+        self.subject_count = len( subject_list )
+
+    #-- END method create_article_data() --#
+
+
+    def create_articles( self ):
+
+        '''
+        Creates articles spread across newspapers, sections, and days, each
+           with an Article_Text whose paragraphs quote people from the person
+           list.
+        '''
+
+        # declare variables
+        article_list = None
+        text_list = None
+        article_index = -1
+        current_article = None
+        current_text = None
+        article_by_id_dict = None
+
+        article_list = []
+        for article_index in range( self.article_count ):
+
+            current_article = Article()
+            current_article.unique_identifier = self.get_unique_identifier( article_index )
+            current_article.newspaper = self.random.choice( self.newspaper_list )
+            current_article.pub_date = self.start_date + datetime.timedelta( days = self.random.randrange( self.day_count ) )
+            current_article.section = self.random.choice( self.SECTION_NAME_LIST )
+            current_article.page = str( self.random.randint( 1, 12 ) )
+            current_article.headline = "Synthetic article {}".format( article_index )
+            current_article.author_varchar = "{} / THE GRAND RAPIDS PRESS".format( self.random.choice( self.person_list ).full_name_string )
+            article_list.append( current_article )
+
+        #-- END loop over articles --#
+
+        Article.objects.bulk_create( article_list, batch_size = self.batch_size )
+
+        # reload in order, so we have IDs whatever the database.
+        self.article_list = list( Article.objects.filter( unique_identifier__startswith = self.get_unique_identifier( "" ) ).order_by( "id" ) )
+
+        # text
+        text_list = []
+        for current_article in self.article_list:
+
+            current_text = Article_Text()
+            current_text.article = current_article
+            current_text.content_type = "canonical"
+            current_text.set_text( self.make_article_text() )
+            text_list.append( current_text )
+
+        #-- END loop over articles --#
+
+        Article_Text.objects.bulk_create( text_list, batch_size = self.batch_size )
+
+    #-- END method create_articles() --#
+
+
+    def create_coders( self ):
+
+        '''
+        Gets or creates an automated and a manual coder User.
+        '''
+
+        # declare variables
+        coder_user = None
+        created = False
+        username = ""
+
+        self.coder_list = []
+        for username in [ "automated", "manual" ]:
+
+            coder_user, created = User.objects.get_or_create( username = "{}_{}".format( self.LABEL_PREFIX, username ) )
+            self.coder_list.append( coder_user )
+
+        #-- END loop over coder names --#
+
+    #-- END method create_coders() --#
+
+
+    def create_newspapers( self ):
+
+        '''
+        Creates newspapers.
+        '''
+
+        # declare variables
+        newspaper_index = -1
+        current_newspaper = None
+
+        self.newspaper_list = []
+        for newspaper_index in range( self.newspaper_count ):
+
+            current_newspaper = Newspaper( name = "{} newspaper {} - {}".format( self.LABEL_PREFIX, self.seed, newspaper_index ), newsbank_code = "{}{}".format( self.LABEL_PREFIX.upper()[ :3 ], newspaper_index ) )
+            current_newspaper.save()
+            self.newspaper_list.append( current_newspaper )
+
+        #-- END loop over newspapers --#
+
+    #-- END method create_newspapers() --#
+
+
+    def create_persons( self ):
+
+        '''
+        Creates people, with names made from the first and last name lists
+           plus a number, so every name is distinct.
+        '''
+
+        # declare variables
+        person_list = None
+        person_index = -1
+        first_name = ""
+        last_name = ""
+        current_person = None
+
+        person_list = []
+        for person_index in range( self.person_count ):
+
+            first_name = self.random.choice( self.FIRST_NAME_LIST )
+            last_name = "{}{}".format( self.random.choice( self.LAST_NAME_LIST ), person_index )
+            current_person = Person( first_name = first_name, last_name = last_name, gender = "na" )
+            current_person.full_name_string = "{} {}".format( first_name, last_name )
+            current_person.notes = self.get_unique_identifier( "person" )
+
+            # bulk_create() doesn't call save(), so set name keys here.
+            current_person.update_name_keys()
+            person_list.append( current_person )
+
+        #-- END loop over persons --#
+
+        Person.objects.bulk_create( person_list, batch_size = self.batch_size )
+        self.person_list = list( Person.objects.filter( notes = self.get_unique_identifier( "person" ) ).order_by( "id" ) )
+
+    #-- END method create_persons() --#
+
+
+    def delete( self ):
+
+        '''
+        Removes everything this corpus (with this seed) created.  Articles
+           cascade to their text and Article_Data, which cascade to authors
+           and subjects.
+        '''
+
+        with transaction.atomic():
+
+            Article.objects.filter( unique_identifier__startswith = self.get_unique_identifier( "" ) ).delete()
+            Person.objects.filter( notes = self.get_unique_identifier( "person" ) ).delete()
+            Newspaper.objects.filter( name__startswith = "{} newspaper {} - ".format( self.LABEL_PREFIX, self.seed ) ).delete()
+
+        #-- END with transaction --#
+
+        self.newspaper_list = []
+        self.person_list = []
+        self.article_list = []
+        self.article_data_list = []
+
+    #-- END method delete() --#
+
+
+    def get_summary_dict( self ):
+
+        '''
+        Returns dictionary of counts of what was created.
+        '''
+
+        # return reference
+        dict_OUT = {}
+
+        dict_OUT[ "seed" ] = self.seed
+        dict_OUT[ "newspaper_count" ] = len( self.newspaper_list )
+        dict_OUT[ "person_count" ] = len( self.person_list )
+        dict_OUT[ "article_count" ] = len( self.article_list )
+        dict_OUT[ "article_data_count" ] = len( self.article_data_list )
+        dict_OUT[ "author_count" ] = self.author_count
+        dict_OUT[ "subject_count" ] = self.subject_count
+
+        return dict_OUT
+
+    #-- END method get_summary_dict() --#
+
+
+    def get_unique_identifier( self, suffix_IN ):
+
+        '''
+        Returns identifier for a synthetic row - prefix, seed, then suffix.
+           Pass "" to get the prefix shared by all this corpus's articles.
+        '''
+
+        return "{}-{}-{}".format( self.LABEL_PREFIX, self.seed, suffix_IN )
+
+    #-- END method get_unique_identifier() --#
+
+
+    def make_article_text( self ):
+
+        '''
+        Returns HTML text for an article - a few paragraphs of filler, each
+           followed by a quotation attributed to someone in the person list.
+        '''
+
+        # declare variables
+        paragraph_list = None
+        paragraph_count = -1
+        paragraph_index = -1
+        current_person = None
+
+        paragraph_list = []
+        paragraph_count = self.random.randint( 3, 8 )
+        for paragraph_index in range( paragraph_count ):
+
+            current_person = self.random.choice( self.person_list )
+            paragraph_list.append( '<p id="{}">{} "{}," said {}.</p>'.format( paragraph_index + 1, self.FILLER_SENTENCE, self.random.choice( self.QUOTE_LIST ), current_person.full_name_string ) )
+
+        #-- END loop over paragraphs --#
+
+        return "".join( paragraph_list )
+
+    #-- END method make_article_text() --#
+
+
+#-- END class SyntheticCorpus --#
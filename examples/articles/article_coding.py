@@ -86,6 +86,22 @@ params[ ArticleCoding.PARAM_ARTICLE_ID_LIST ] = article_id_in_list
 # OpenCalais REST API v.2
 params[ ArticleCoding.PARAM_CODER_TYPE ] = ArticleCoding.ARTICLE_CODING_IMPL_OPEN_CALAIS_API_V2
 
+# code in parallel?  "thread" for I/O-bound coders like OpenCalais, "process"
+#     for CPU-bound coders.  Workers share the coder's rate limit.
+#params[ ArticleCoding.PARAM_WORKER_POOL_TYPE ] = ArticleCoding.WORKER_POOL_TYPE_THREAD
+#params[ ArticleCoding.PARAM_WORKER_COUNT ] = 4
+
+# or "pipeline" - one coder, with up to the OpenCalais concurrent request limit
+#     (config property "concurrent_request_limit") of requests in flight.
+#params[ ArticleCoding.PARAM_WORKER_POOL_TYPE ] = ArticleCoding.WORKER_POOL_TYPE_PIPELINE
+
+# preload an in-memory Person name index for faster person lookups?
+#params[ ArticleCoding.PARAM_USE_PERSON_NAME_INDEX ] = ArticleCoding.CHOICE_YES
+
+# match person names ignoring accents and punctuation ("Jose OBrien" finds
+#     "José O'Brien")?  Run backfill_person_name_keys first.
+#params[ ArticleCoding.PARAM_USE_NAME_KEYS ] = ArticleCoding.CHOICE_YES
+
 # get instance of ArticleCoding
 my_article_coding = ArticleCoding()
 my_article_coding.do_print_updates = do_i_print_updates
@@ -30,9 +30,10 @@ import six
 # import StringIO
 from six import StringIO
 
-# Django DB classes, just to play with...
-#from django.db.models import Count # for aggregating counts of authors, sources.
-#from django.db.models import Max   # for getting max value of author, source counts.
+# Django DB classes, for aggregating counts of authors, sources.
+from django.db.models import Count
+from django.db.models import Max
+from django.db.models import Q
 
 # Import the classes for our context_text application
 #from context_text.models import Article
@@ -46,6 +47,51 @@ from context_text.models import Topic
 # classes (in alphabetical order by name)
 #===============================================================================
 
+class CsvLineBuffer( object ):
+
+    '''
+    File-like object for csv.writer that holds on to the lines written to it
+       until they are collected with pop_lines(), so CSV output can be handed
+       off a few lines at a time (to a StreamingHttpResponse, for example)
+       instead of being built up in one big string.
+    '''
+
+    def __init__( self ):
+
+        # declare variables
+        self.line_list = []
+
+    #-- END method __init__() --#
+
+
+    def pop_lines( self ):
+
+        '''
+        Returns everything written since last call as a string, and empties
+           the buffer.
+        '''
+
+        # return reference
+        lines_OUT = ""
+
+        lines_OUT = "".join( self.line_list )
+        self.line_list = []
+
+        return lines_OUT
+
+    #-- END method pop_lines() --#
+
+
+    def write( self, value_IN ):
+
+        # just store it.
+        self.line_list.append( value_IN )
+
+    #-- END method write() --#
+
+#-- END class CsvLineBuffer --#
+
+
 class CsvArticleOutput( object ):
 
 
@@ -69,6 +115,9 @@ class CsvArticleOutput( object ):
     CSV_LIST_OUTPUT_TYPE_HEADERS = 'headers'
     CSV_LIST_OUTPUT_TYPE_VALUES = 'values'
 
+    # number of Article_Data rows to fetch at a time when streaming.
+    DEFAULT_ITERATOR_CHUNK_SIZE = 500
+
 
     #---------------------------------------------------------------------------
     # __init__() method
@@ -88,6 +137,9 @@ class CsvArticleOutput( object ):
         self.max_authors = -1
         self.max_sources = -1
         
+        # rows to fetch per round trip when iterating over query set.
+        self.iterator_chunk_size = self.DEFAULT_ITERATOR_CHUNK_SIZE
+        
         # CSV python library outputter, stored in case a method needs to output
         #    directly to it instead of allowing a parent routine aggregate lists
         #    and then output them all at once.
@@ -101,6 +153,61 @@ class CsvArticleOutput( object ):
     #---------------------------------------------------------------------------
 
 
+    def compute_max_counts( self ):
+
+        """
+            Uses a single aggregate query against the nested query set to find
+               the greatest number of topics, locations, authors, and quoted
+               sources in any one Article_Data, and stores them in the max_*
+               instance variables.  Returns dictionary of the maxima.
+        """
+
+        # return reference
+        max_dict_OUT = {}
+
+        # declare variables
+        counts_query_set = None
+        max_name = ""
+        max_value = None
+
+        # count each related set per Article_Data (distinct, since joining
+        #    all four multiplies rows), then take the max of each count.
+        counts_query_set = self.query_set.order_by()
+        counts_query_set = counts_query_set.annotate(
+            csv_topic_count = Count( "topics", distinct = True ),
+            csv_location_count = Count( "locations", distinct = True ),
+            csv_author_count = Count( "article_author", distinct = True ),
+            csv_source_count = Count( "article_subject", filter = Q( article_subject__subject_type = Article_Subject.SUBJECT_TYPE_QUOTED ), distinct = True )
+        )
+        max_dict_OUT = counts_query_set.aggregate(
+            max_topics = Max( "csv_topic_count" ),
+            max_locations = Max( "csv_location_count" ),
+            max_authors = Max( "csv_author_count" ),
+            max_sources = Max( "csv_source_count" )
+        )
+
+        # empty query set gives None - use -1, like before there were articles.
+        for max_name, max_value in six.iteritems( max_dict_OUT ):
+
+            if ( max_value is None ):
+
+                max_dict_OUT[ max_name ] = -1
+
+            #-- END check to see if None --#
+
+        #-- END loop over maxima --#
+
+        # Store the max counts.
+        self.max_topics = max_dict_OUT[ "max_topics" ]
+        self.max_locations = max_dict_OUT[ "max_locations" ]
+        self.max_authors = max_dict_OUT[ "max_authors" ]
+        self.max_sources = max_dict_OUT[ "max_sources" ]
+
+        return max_dict_OUT
+
+    #-- END method compute_max_counts() --#
+
+
     def create_article_list( self, output_type_IN, article_data_IN = None, header_prefix_IN = ''):
 
         """
@@ -1176,6 +1283,94 @@ class CsvArticleOutput( object ):
     #-- END method create_topic_list() --#
 
 
+    def iterate_csv_lines( self ):
+
+        """
+            Generator - assumes query set of articles has been placed in this
+               instance.  Finds the max counts with one aggregate query, then
+               yields the CSV output in the format specified in the output_type
+               instance variable a piece at a time: the header line, then the
+               line or lines for each article.  Articles are fetched from the
+               database in chunks of iterator_chunk_size (using a server-side
+               cursor where the database supports it), so neither the query
+               set nor the CSV output is ever held in memory all at once.  Pass
+               the generator to a django StreamingHttpResponse, or see
+               render_to_file().
+        """
+
+        # declare variables
+        article_data_query_set = None
+        output_type_IN = ''
+        line_buffer = None
+        output_csv = None
+        header_list = None
+        current_article_data = None
+        current_article_list = None
+
+        article_data_query_set = self.query_set
+
+        # figure out max number of topics, locations, authors, and sources.
+        self.compute_max_counts()
+
+        # Initialize CSV output.
+        line_buffer = CsvLineBuffer()
+        output_csv = csv.writer( line_buffer )
+        self.csv_output = output_csv
+
+        # get output type
+        output_type_IN = self.output_type
+
+        # render the header.
+        header_list = self.create_header_list()
+        output_csv.writerow( header_list )
+        yield line_buffer.pop_lines()
+
+        # loop over articles.
+        for current_article_data in article_data_query_set.iterator( chunk_size = self.iterator_chunk_size ):
+
+            if ( output_type_IN == CsvArticleOutput.ARTICLE_OUTPUT_TYPE_ARTICLE_PER_LINE ):
+
+                # pass current_article to render_article_per_line, place result
+                #    in the output csv file.
+                current_article_list = self.render_article_per_line( current_article_data )
+
+                # got something back?
+                if ( current_article_list ):
+
+                    # yes - add it to the output.
+                    output_csv.writerow( current_article_list )
+
+                #-- END check to see if we got a list back. --#
+
+            elif ( output_type_IN == CsvArticleOutput.ARTICLE_OUTPUT_TYPE_SOURCE_PER_LINE ):
+
+                # pass current_article CSV output buffer to
+                #    render_article_source_per_line, let it deal with placing
+                #    each source's row in the CSV output.
+                self.render_article_source_per_line( current_article_data, output_csv )
+
+            elif ( output_type_IN == CsvArticleOutput.ARTICLE_OUTPUT_TYPE_AUTHOR_PER_LINE ):
+
+                # pass current_article CSV output buffer to
+                #    render_article_author_per_line, let it deal with placing
+                #    each author's row in the CSV output.
+                self.render_article_author_per_line( current_article_data, output_csv )
+
+            else:
+
+                # unknown output type - no article rows.
+                break
+
+            #-- END check to see what our output type is --#
+
+            # hand off this article's lines.
+            yield line_buffer.pop_lines()
+
+        #-- END loop over articles to output to CSV.
+
+    #-- END method iterate_csv_lines() --#
+
+
     def render_article_author_per_line( self, article_data_IN, output_csv_IN = None ):
 
         """
@@ -1603,10 +1798,9 @@ class CsvArticleOutput( object ):
             Preconditions: assumes that we have a query set of articles stored
                in the instance.  If not, does nothing, returns empty string.
 
-            Postconditions: returns the CSV network data, in a string.
-
-            Parameters:
-            - request_IN - django HTTP request instance that contains parameters we use to generate network data.
+            Postconditions: returns the CSV network data, in a string.  For
+               large query sets, use iterate_csv_lines() or render_to_file()
+               instead, so the output isn't all built up in memory.
 
             Returns:
             - String - CSV output for the network described by the articles selected based on the parameters passed in.
@@ -1616,168 +1810,64 @@ class CsvArticleOutput( object ):
         csv_OUT = ''
 
         # declare variables
-        article_data_query_set = None
-        current_topic_count = -1
-        current_location_count = -1
-        current_author_count = -1
-        article_source_set = None
-        current_source_count = -1
-        topic_max = -1
-        location_max = -1
-        author_max = -1
-        source_max = -1
-        output_type_IN = ''
-
-        # Variables for using django magic to derive counts.
-        #counts_query_set = None
-        #count_results = None
-        #magic_author_max = -1
-        #magic_source_max = -1
-
-        header_list = None
-        current_article_data = None
         output_string_buffer = None
-        output_csv = None
-        current_article_list = None
-        #current_list_of_article_lists = None
-
-        # first, get an article query set based on the input parameters.
-        #article_query_set = output_create_network_query_set( request_IN )
-        article_data_query_set = self.query_set
-
-        # first, need to figure out max number of authors, sources - Loop over the
-        #    article query set to figure out the max of each.
-        for current_article_data in article_data_query_set:
-
-            # retrieve source and author counts.
-            current_topic_count = current_article_data.topics.count()
-            current_location_count = current_article_data.locations.count()
-            current_author_count = current_article_data.article_author_set.count()
-            
-            # get sources, then count().
-            article_source_set = current_article_data.get_quoted_article_sources_qs()
-            current_source_count = article_source_set.count()
-
-            # compare current counts to max counts, update max if current is
-            #    greater.
-            if ( current_topic_count > topic_max ):
-
-                topic_max = current_topic_count
-
-            #-- END topic count max check. --#
-
-            if ( current_location_count > location_max ):
-
-                location_max = current_location_count
-
-            #-- END location count max check. --#
-
-            if ( current_author_count > author_max ):
-
-                author_max = current_author_count
-
-            #-- END author count max check. --#
-
-            if ( current_source_count > source_max ):
-
-                source_max = current_source_count
-
-            #-- END author count max check. --#
-
-        #-- END loop over articles to get max number of sources, authors. --#
+        csv_lines = ""
 
-        # Store the max counts.
-        self.max_topics = topic_max
-        self.max_locations = location_max
-        self.max_authors = author_max
-        self.max_sources = source_max
-
-        # Might be able to use django aggregate magic for this, instead.
-        # annotate, aggregate query string to retrieve author_count.  Works, but is
-        #    buggy in 1.1.
-        #counts_query_set = article_query_set.annotate( author_count_JSM = Count( 'article_author' ) )
-        #count_results = counts_query_set.aggregate( max_authors = Max( 'author_count_JSM' ) )
-        #magic_author_max = count_results[ 'max_authors' ]
-
-        # annotate, aggregate query string to retrieve source_count.  Works, but is
-        #    buggy in 1.1.
-        #counts_query_set = article_query_set.annotate( source_count_JSM = Count( 'article_source' ) )
-        #count_results = counts_query_set.aggregate( max_sources = Max( 'source_count_JSM' ) )
-        #magic_source_max = count_results[ 'max_sources' ]
-
-        # Then, once we know the max author and source counts, we loop over each
-        #    article and add it to the CSV output.
-
-        # Initialize CSV output.
+        # Initialize output.
         output_string_buffer = StringIO()
-        output_csv = csv.writer( output_string_buffer )
-        self.csv_output = output_csv
 
-        # get output type
-        output_type_IN = self.output_type
+        for csv_lines in self.iterate_csv_lines():
 
-        # render the header.
-        header_list = self.create_header_list()
-        output_csv.writerow( header_list )
+            output_string_buffer.write( csv_lines )
 
-        if ( output_type_IN == CsvArticleOutput.ARTICLE_OUTPUT_TYPE_ARTICLE_PER_LINE ):
+        #-- END loop over CSV lines --#
 
-            # loop over articles.
-            for current_article_data in article_data_query_set:
-
-                # pass current_article to render_article_per_line, place result
-                #    in the output csv file.
-                current_article_list = self.render_article_per_line( current_article_data )
+        # store the CSV file in our output string.
+        csv_OUT = output_string_buffer.getvalue()
 
-                # got something back?
-                if ( current_article_list ):
+        # close the string buffer.
+        output_string_buffer.close()
 
-                    # yes - add it to the output.
-                    output_csv.writerow( current_article_list )
+        return csv_OUT
 
-                #-- END check to see if we got a list back. --#
+    #-- END render_articles() --#
 
-            #-- END loop over articles to output to CSV.
 
-        elif ( output_type_IN == CsvArticleOutput.ARTICLE_OUTPUT_TYPE_SOURCE_PER_LINE ):
+    def render_to_file( self, file_IN ):
 
-            # loop over articles.
-            for current_article_data in article_data_query_set:
+        """
+            Accepts open, writable text file.  Writes CSV output for the query
+               set nested in this instance to the file as it is generated.
+               Returns number of Article_Data rendered.
+        """
 
-                # pass current_article CSV output buffer to
-                #    render_article_source_per_line, let it deal with placing
-                #    each source's row in the CSV output.
-                self.render_article_source_per_line( current_article_data, output_csv )
+        # return reference
+        count_OUT = 0
 
-            #-- END loop over articles to output to CSV.
+        # declare variables
+        csv_lines = ""
+        is_header = True
 
-        elif ( output_type_IN == CsvArticleOutput.ARTICLE_OUTPUT_TYPE_AUTHOR_PER_LINE ):
+        for csv_lines in self.iterate_csv_lines():
 
-            # loop over articles.
-            for current_article_data in article_data_query_set:
+            file_IN.write( csv_lines )
 
-                # pass current_article CSV output buffer to
-                #    render_article_author_per_line, let it deal with placing
-                #    each author's row in the CSV output.
-                self.render_article_author_per_line( current_article_data, output_csv )
+            # count articles, not header.
+            if ( is_header == True ):
 
-            #-- END loop over articles to output to CSV.
+                is_header = False
 
-        #-- END check to see what our output type is --#
+            else:
 
-        # debug output
-        #output_csv.writerow( [ author_max, source_max ] )
-        #output_csv.writerow( [ magic_author_max, magic_source_max ] )
+                count_OUT += 1
 
-        # store the CSV file in our output string.
-        csv_OUT = output_string_buffer.getvalue()
+            #-- END check to see if header --#
 
-        # close the string buffer.
-        output_string_buffer.close()
+        #-- END loop over CSV lines --#
 
-        return csv_OUT
+        return count_OUT
 
-    #-- END render_articles() --#
+    #-- END method render_to_file() --#
 
 
     def set_output_type( self, value_IN ):
@@ -124,11 +124,11 @@ class NDO_CSVMatrix( NetworkDataOutput ):
         # return reference
 
         # declare variables
+        current_node = None
         current_person_label = ""
-        person_list = None
         do_output_network = False
-        current_person_relations = None
-        current_other_id = -1
+        sparse_matrix = None
+        row_index = None
         current_other_count = -1
         column_value_list = []
         csv_writer = None
@@ -142,8 +142,19 @@ class NDO_CSVMatrix( NetworkDataOutput ):
                 self.debug += "person " + str( person_id_IN ) + "; "
             #-- END DEBUG --#
                 
+            # get current user's row from the node table.
+            current_node = self.get_node_table().get_node( person_id_IN )
+
             # get label for current user
-            current_person_label = str( row_count_IN ) + "__" + self.get_person_label( person_id_IN )
+            if ( current_node is not None ):
+
+                current_person_label = str( row_count_IN ) + "__" + current_node.label
+
+            else:
+
+                current_person_label = str( row_count_IN ) + "__" + self.get_person_label( person_id_IN )
+
+            #-- END check to see if in node table --#
             
             # make it first column in row.
             column_value_list.append( current_person_label )
@@ -152,32 +163,28 @@ class NDO_CSVMatrix( NetworkDataOutput ):
             do_output_network = self.do_output_network()
             if ( do_output_network == True ):
 
-                # get person list
-                person_list = self.get_master_person_list()
-    
-                # get relations for this person.
-                current_person_relations = self.get_relations_for_person( person_id_IN )
-    
-                # loop over master list, checking for relations with each person.
-                for current_other_id in sorted( person_list ):
-    
-                    # try to retrieve relation count from relations
-                    if current_other_id in current_person_relations:
-    
-                        # they are related.  Get count.
-                        current_other_count = current_person_relations[ current_other_id ]
-    
-                    else:
-    
-                        # no relation.  Set current count to 0
-                        current_other_count = 0
-    
-                    #-- END check to see if related.
-    
-                    # output the count for the current person.
-                    column_value_list.append( str( current_other_count ) )
-    
-                #-- END loop over master list --#
+                # get sparse relations, and this person's row within them
+                #    (same index as in the node table).
+                sparse_matrix = self.get_sparse_relation_matrix()
+                if ( current_node is not None ):
+
+                    row_index = current_node.index
+
+                #-- END check to see if in node table --#
+
+                # in the network?
+                if ( row_index is not None ):
+
+                    # expand the row's ties into one count per person in the
+                    #    sorted master list (0 if no relation), then output
+                    #    the count for each person.
+                    for current_other_count in sparse_matrix.get_dense_row( row_index ):
+
+                        column_value_list.append( str( current_other_count ) )
+
+                    #-- END loop over counts in row --#
+
+                #-- END check to see if person in network --#
                 
             #-- END check to see if we output network data. --#
             
@@ -191,7 +198,15 @@ class NDO_CSVMatrix( NetworkDataOutput ):
                 column_value_list.append( str( person_id_IN ) )
 
                 # get current person's person type and append it.
-                person_type_id = self.get_person_type_id( person_id_IN )
+                if ( current_node is not None ):
+
+                    person_type_id = current_node.person_type_id
+
+                else:
+
+                    person_type_id = self.get_person_type_id( person_id_IN )
+
+                #-- END check to see if in node table --#
                 column_value_list.append( str( person_type_id ) )
                             
             #-- END check to see if we append attributes to the end of rows. --#
@@ -371,11 +386,10 @@ class NDO_CSVMatrix( NetworkDataOutput ):
         if ( ( master_list != None ) and ( len( master_list ) > 0 ) ):
 
             # loop over sorted person list, calling method to output network
-            #    row for each person.  Leaving in sorted() since it copies
-            #    the array, and we are looping twice - not sure if it will
-            #    maintain two separate positions in nested loops.
+            #    row for each person.  The list is sorted once, when the
+            #    sparse relation matrix is built.
             person_counter = 0
-            for current_person_id in sorted( master_list ):
+            for current_person_id in self.get_sorted_person_id_list():
 
                 # increment counter
                 person_counter += 1
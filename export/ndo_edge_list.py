@@ -0,0 +1,240 @@
+'''
+Copyright 2014 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text.
+
+context_text is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text. If not, see http://www.gnu.org/licenses/.
+'''
+
+__author__="jonathanmorgan"
+__date__ ="$May 1, 2010 6:26:35 PM$"
+
+if __name__ == "__main__":
+    print( "Hello World" )
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+# parent class.
+from context_text.export.ndo_csv_matrix import NDO_CSVMatrix
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class NDO_EdgeList( NDO_CSVMatrix ):
+
+    '''
+    Outputs network as a CSV edge list - one row per tie, rather than one row
+       and column per person - so output size is proportional to the number of
+       ties, not the square of the number of people.  Streams ties from the
+       sparse relation matrix built in NetworkDataOutput.  Node attributes are
+       either appended to each edge as from/to columns, or output as a
+       separate node table (which also includes people with no ties) after
+       the edges.
+    '''
+
+
+    #---------------------------------------------------------------------------
+    # CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+    # output type
+    MY_OUTPUT_TYPE = "edge_list"
+
+    # LOCAL_DEBUG_FLAG
+    LOCAL_DEBUG_FLAG = False
+
+    # column headers
+    HEADER_FROM_PERSON_ID = "from_person_id"
+    HEADER_TO_PERSON_ID = "to_person_id"
+    HEADER_TIE_COUNT = "tie_count"
+    HEADER_FROM_PERSON_TYPE = "from_person_type"
+    HEADER_TO_PERSON_TYPE = "to_person_type"
+
+
+    #---------------------------------------------------------------------------
+    # instance variables
+    #---------------------------------------------------------------------------
+
+
+    #---------------------------------------------------------------------------
+    # __init__() method
+    #---------------------------------------------------------------------------
+
+
+    def __init__( self ):
+
+        # call parent's __init__()
+        super( NDO_EdgeList, self ).__init__()
+
+        # override things set in parent.
+        self.output_type = self.MY_OUTPUT_TYPE
+        self.debug = "NDO_EdgeList debug:\n\n"
+
+        # initialize variables.
+        self.csv_string_buffer = None
+        self.csv_writer = None
+        self.delimiter = ","
+
+        # variables for outputting result as file
+        self.mime_type = "text/csv"
+        self.file_extension = "csv"
+
+    #-- END method __init__() --#
+
+
+    #---------------------------------------------------------------------------
+    # instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def append_edge_rows( self ):
+
+        '''
+            Method: append_edge_rows()
+
+            Purpose: Appends a header row, then one row per tie in the sparse
+               relation matrix: from person ID, to person ID, tie count, and,
+               if we are outputting attribute columns, the person type IDs of
+               the from and to people.
+
+            Postconditions: Rows are appended to the end of the nested CSV
+               document, but nothing is returned.
+        '''
+
+        # declare variables
+        do_output_attrs = False
+        header_list = None
+        sparse_matrix = None
+        node_table = None
+        node_id_list = None
+        type_id_list = None
+        row_index = -1
+        column_index = -1
+        tie_count = -1
+        column_value_list = None
+
+        # include attributes?
+        do_output_attrs = self.do_output_attribute_columns()
+
+        # header
+        header_list = [ self.HEADER_FROM_PERSON_ID, self.HEADER_TO_PERSON_ID, self.HEADER_TIE_COUNT ]
+        if ( do_output_attrs == True ):
+
+            header_list.append( self.HEADER_FROM_PERSON_TYPE )
+            header_list.append( self.HEADER_TO_PERSON_TYPE )
+
+        #-- END check to see if attributes --#
+        self.append_row_to_csv( header_list )
+
+        # get sparse relations, and IDs and type IDs, by index, from the
+        #    node table.
+        sparse_matrix = self.get_sparse_relation_matrix()
+        node_table = self.get_node_table()
+        node_id_list = node_table.person_id_list
+        type_id_list = node_table.person_type_id_array
+
+        # loop over ties.
+        for row_index, column_index, tie_count in sparse_matrix.iterate_edges():
+
+            column_value_list = [ str( node_id_list[ row_index ] ), str( node_id_list[ column_index ] ), str( tie_count ) ]
+
+            # attributes?
+            if ( do_output_attrs == True ):
+
+                column_value_list.append( str( type_id_list[ row_index ] ) )
+                column_value_list.append( str( type_id_list[ column_index ] ) )
+
+            #-- END check to see if attributes --#
+
+            self.append_row_to_csv( column_value_list )
+
+        #-- END loop over ties --#
+
+    #-- END method append_edge_rows() --#
+
+
+    def append_node_rows( self ):
+
+        '''
+            Method: append_node_rows()
+
+            Purpose: Appends a node table to the CSV document - a header row
+               made up of the node attribute names, then one row per person in
+               the sorted master list with that person's ID and type ID.
+
+            Postconditions: Rows are appended to the end of the nested CSV
+               document, but nothing is returned.
+        '''
+
+        # declare variables
+        current_node = None
+
+        # header
+        self.append_row_to_csv( list( self.NODE_ATTRIBUTE_LIST ) )
+
+        # loop over node table
+        for current_node in self.get_node_table().node_list:
+
+            self.append_row_to_csv( [ str( current_node.person_id ), str( current_node.person_type_id ) ] )
+
+        #-- END loop over people --#
+
+    #-- END method append_node_rows() --#
+
+
+    def create_csv_document( self ):
+
+        """
+            Method: create_csv_document()
+
+            Purpose: Overrides NDO_CSVMatrix method to output an edge list
+               rather than a square matrix.  If network output is requested,
+               appends one row per tie.  If attribute rows are requested (or
+               just attributes), appends node table.
+
+            Preconditions: Assumes that csv output is already initialized.
+
+            Returns:
+            - nothing - CSV is stored in internal CSV Writer and String buffer.
+        """
+
+        # declare variables
+        do_output_network = False
+        do_output_nodes = False
+
+        # what are we outputting?
+        do_output_network = self.do_output_network()
+        do_output_nodes = ( ( self.do_output_attribute_rows() == True ) or ( do_output_network == False ) )
+
+        # edges?
+        if ( do_output_network == True ):
+
+            self.append_edge_rows()
+
+        #-- END check to see if output network --#
+
+        # nodes?
+        if ( do_output_nodes == True ):
+
+            # separate from edges with an empty row?
+            if ( do_output_network == True ):
+
+                self.get_csv_writer().writerow( [] )
+
+            #-- END check to see if edges, too --#
+
+            self.append_node_rows()
+
+        #-- END check to see if output nodes --#
+
+    #-- END method create_csv_document --#
+
+
+#-- END class NDO_EdgeList --#
@@ -0,0 +1,172 @@
+'''
+Copyright 2014 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text.
+
+context_text is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text. If not, see http://www.gnu.org/licenses/.
+'''
+
+__author__="jonathanmorgan"
+__date__ ="$May 1, 2010 6:26:35 PM$"
+
+if __name__ == "__main__":
+    print( "Hello World" )
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+# parent abstract class.
+from context_text.export.network_data_output import NetworkDataOutput
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class NDO_MatrixMarket( NetworkDataOutput ):
+
+    '''
+    Outputs network in Matrix Market coordinate format
+       (http://math.nist.gov/MatrixMarket/formats.html), which can be read
+       directly by scipy.io.mmread(), R's Matrix::readMM(), etc.  Only ties
+       that exist are written, one "<row> <column> <count>" line each, with
+       1-based indexes into the sorted master person list.  The label of the
+       person for each index is written in comment lines before the size line.
+    '''
+
+
+    #---------------------------------------------------------------------------
+    # CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+    # output constants
+    OUTPUT_END_OF_LINE = "\n"
+    MATRIX_MARKET_BANNER = "%%MatrixMarket matrix coordinate integer general"
+    MATRIX_MARKET_COMMENT_PREFIX = "%"
+
+    # output type
+    MY_OUTPUT_TYPE = "matrix_market"
+
+
+    #---------------------------------------------------------------------------
+    # __init__() method
+    #---------------------------------------------------------------------------
+
+
+    def __init__( self ):
+
+        # call parent's __init__()
+        super( NDO_MatrixMarket, self ).__init__()
+
+        # override things set in parent.
+        self.output_type = self.MY_OUTPUT_TYPE
+        self.debug = "NDO_MatrixMarket debug:\n\n"
+
+        # variables for outputting result as file
+        self.mime_type = "text/plain"
+        self.file_extension = "mtx"
+
+    #-- END method __init__() --#
+
+
+    #---------------------------------------------------------------------------
+    # instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def create_line_list( self ):
+
+        """
+            Method: create_line_list()
+
+            Purpose: Builds list of the lines in the Matrix Market document:
+               banner, comment with network label (if one), one comment per
+               person with their 1-based index and label, the size line
+               ( "<rows> <columns> <non-zero count>" ), then one line per tie.
+
+            Returns:
+            - list of lines, without end-of-line characters.
+        """
+
+        # return reference
+        list_OUT = []
+
+        # declare variables
+        comment_prefix = self.MATRIX_MARKET_COMMENT_PREFIX
+        sparse_matrix = None
+        node_count = -1
+        label_list = None
+        label_index = -1
+        row_index = -1
+        column_index = -1
+        tie_count = -1
+
+        # banner
+        list_OUT.append( self.MATRIX_MARKET_BANNER )
+
+        # label?
+        if ( self.network_label != '' ):
+
+            list_OUT.append( comment_prefix + " " + self.network_label )
+
+        #-- END check to see if network label --#
+
+        # get sparse relations
+        sparse_matrix = self.get_sparse_relation_matrix()
+        node_count = sparse_matrix.get_node_count()
+
+        # person labels, in index order.
+        label_list = self.create_label_list()
+        for label_index in range( len( label_list ) ):
+
+            list_OUT.append( comment_prefix + " " + str( label_index + 1 ) + " " + label_list[ label_index ] )
+
+        #-- END loop over labels --#
+
+        # size line
+        list_OUT.append( str( node_count ) + " " + str( node_count ) + " " + str( sparse_matrix.get_edge_count() ) )
+
+        # entries, converted to 1-based indexes.
+        for row_index, column_index, tie_count in sparse_matrix.iterate_edges():
+
+            list_OUT.append( str( row_index + 1 ) + " " + str( column_index + 1 ) + " " + str( tie_count ) )
+
+        #-- END loop over ties --#
+
+        return list_OUT
+
+    #-- END method create_line_list() --#
+
+
+    def render_network_data( self ):
+
+        """
+            Assumes render method has already created network data by calling
+               process_author_relations() and updated source person types by
+               calling update_source_person_types().  Outputs the ties in
+               Matrix Market coordinate format.  Person types are included in
+               the person labels in the comment lines.
+
+            Returns:
+            - String - Matrix Market document for the network.
+        """
+
+        # return reference
+        network_data_OUT = ''
+
+        # declare variables
+        end_of_line = self.OUTPUT_END_OF_LINE
+
+        # join lines
+        network_data_OUT = end_of_line.join( self.create_line_list() ) + end_of_line
+
+        return network_data_OUT
+
+    #-- END render_network_data() --#
+
+
+#-- END class NDO_MatrixMarket --#
@@ -118,11 +118,9 @@ class NDO_SimpleMatrix( NetworkDataOutput ):
         # declare variables
         master_list = None
         my_label = ''
-        current_person_id = -1
+        current_node = None
         person_count = -1
         current_type = ''
-        current_type_id = -1
-        current_label = ""
         current_value = ''
         delimiter = delimiter_IN
         unknown_count = 0
@@ -136,15 +134,15 @@ class NDO_SimpleMatrix( NetworkDataOutput ):
         # got something?
         if ( master_list ):
 
-            # loop over sorted person list, building label line for each person.
+            # loop over node table, in sorted person order, building label
+            #    line for each person.
             person_count = 0
-            for current_person_id in sorted( master_list ):
+            for current_node in self.get_node_table().node_list:
 
                 person_count += 1
                 
-                # get current person type and type ID
-                current_type = self.get_person_type( current_person_id )
-                current_type_id = self.get_person_type_id( current_person_id )
+                # get current person type
+                current_type = current_node.person_type
 
                 # increment count
                 if ( current_type == NetworkDataOutput.PERSON_TYPE_UNKNOWN ):
@@ -156,11 +154,8 @@ class NDO_SimpleMatrix( NetworkDataOutput ):
                 elif ( current_type == NetworkDataOutput.PERSON_TYPE_BOTH ):
                     both_count += 1
 
-                # get label
-                current_label = self.get_person_label( current_person_id )
-
                 # append the person's row to the output string.
-                current_value = str( person_count ) + "__" + current_label
+                current_value = str( person_count ) + "__" + current_node.label
 
                 # do we want quotes?
                 if ( quote_character_IN != '' ):
@@ -227,7 +222,7 @@ class NDO_SimpleMatrix( NetworkDataOutput ):
 
             # loop over sorted person list, calling method to output network
             #    row for each person.
-            for current_person_id in sorted( master_list ):
+            for current_person_id in self.get_sorted_person_id_list():
 
                 # append the person's row to the output string.
                 network_string_OUT += self.create_person_row_string( current_person_id ) + end_of_line
@@ -260,41 +255,30 @@ class NDO_SimpleMatrix( NetworkDataOutput ):
         string_OUT = ""
 
         # declare variables
-        master_list = None
-        current_person_relations = None
-        current_other_id = -1
+        sparse_matrix = None
+        row_index = None
+        row_value_list = None
         current_other_count = -1
         delimiter = self.column_separator
 
         # get person ID?
         if ( person_id_IN ):
 
-            # get master list
-            master_list = self.get_master_person_list()
-
-            # get relations for this person.
-            current_person_relations = self.get_relations_for_person( person_id_IN )
-
-            # loop over master list, checking for relations with each person.
-            for current_other_id in sorted( master_list ):
-
-                # try to retrieve relation count from relations
-                if current_other_id in current_person_relations:
-
-                    # they are related.  Get count.
-                    current_other_count = current_person_relations[ current_other_id ]
-
-                else:
+            # get sparse relations, and this person's row within them.
+            sparse_matrix = self.get_sparse_relation_matrix()
+            row_index = sparse_matrix.get_index_for_person_id( person_id_IN )
 
-                    # no relation.  Set current count to 0
-                    current_other_count = 0
+            # in the network?
+            if ( row_index is not None ):
 
-                #-- END check to see if related.
+                # expand the row's ties into one count per person in the
+                #    sorted master list (0 if no relation).
+                row_value_list = sparse_matrix.get_dense_row( row_index )
 
-                # output the count for the current person.
-                string_OUT += delimiter + str( current_other_count )
+                # output the count for each person.
+                string_OUT = delimiter + delimiter.join( [ str( current_other_count ) for current_other_count in row_value_list ] )
 
-            #-- END loop over master list --#
+            #-- END check to see if person in network --#
 
         #-- END check to make sure we have a person --#
 
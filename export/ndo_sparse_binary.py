@@ -0,0 +1,500 @@
+from __future__ import unicode_literals
+from __future__ import division
+
+'''
+Copyright 2010-2014 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text.
+
+context_text is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text. If not, see http://www.gnu.org/licenses/.
+'''
+
+__author__="jonathanmorgan"
+__date__ ="$May 1, 2010 6:26:35 PM$"
+
+if __name__ == "__main__":
+    print( "Hello World" )
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+# python libraries
+import os
+import tempfile
+
+# django
+from django.utils.text import slugify
+
+# numpy and scipy - only needed for this output type, so if they aren't
+#    installed, the rest of the export package still works.
+try:
+
+    import numpy
+    import scipy.io
+    import scipy.sparse
+
+except ImportError:
+
+    numpy = None
+    scipy = None
+
+#-- END try...except around numpy and scipy imports --#
+
+# pyarrow - only needed for Parquet output.
+try:
+
+    import pyarrow
+    import pyarrow.parquet
+
+except ImportError:
+
+    pyarrow = None
+
+#-- END try...except around pyarrow import --#
+
+# parent abstract class.
+from context_text.export.network_data_output import NetworkDataOutput
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class NDO_SparseBinary( NetworkDataOutput ):
+
+    '''
+    Builds the network's adjacency matrix directly from the CSR arrays in the
+       sparse relation matrix built in NetworkDataOutput - as a
+       scipy.sparse.csr_matrix, or a dense numpy array if the network is dense
+       enough - rather than formatting text, then writes it to binary files
+       in an output directory:
+       - .npz - numpy.savez_compressed() archive.  Sparse matrices are stored
+          in the same layout as scipy.sparse.save_npz(), so
+          scipy.sparse.load_npz() reads them, plus "person_id" and
+          "person_type_id" arrays with the node attributes in row order.
+       - .mtx - Matrix Market, written with scipy.io.mmwrite().
+       - .parquet - edge list with from/to person IDs, tie count and from/to
+          person types (needs pyarrow).
+       render_network_data() returns a message with the paths of the files.
+    '''
+
+
+    #---------------------------------------------------------------------------
+    # CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+    # output type
+    MY_OUTPUT_TYPE = "sparse_binary"
+
+    # output constants
+    OUTPUT_END_OF_LINE = "\n"
+
+    # file formats
+    FILE_FORMAT_NPZ = "npz"
+    FILE_FORMAT_MATRIX_MARKET = "mtx"
+    FILE_FORMAT_PARQUET = "parquet"
+    FILE_FORMAT_LIST_DEFAULT = [ FILE_FORMAT_NPZ, FILE_FORMAT_MATRIX_MARKET, FILE_FORMAT_PARQUET ]
+
+    # file names
+    FILE_NAME_PREFIX_DEFAULT = "network"
+    OUTPUT_DIRECTORY_PREFIX = "context_text_network_"
+
+    # if at least this fraction of cells have ties, build a dense numpy array.
+    DENSE_THRESHOLD_DEFAULT = 0.25
+
+    # edge table columns
+    COLUMN_FROM_PERSON_ID = "from_person_id"
+    COLUMN_TO_PERSON_ID = "to_person_id"
+    COLUMN_TIE_COUNT = "tie_count"
+    COLUMN_FROM_PERSON_TYPE = "from_person_type"
+    COLUMN_TO_PERSON_TYPE = "to_person_type"
+    COLUMN_FROM_PERSON_TYPE_ID = "from_person_type_id"
+    COLUMN_TO_PERSON_TYPE_ID = "to_person_type_id"
+
+    # npz array names
+    NPZ_ARRAY_PERSON_ID = "person_id"
+    NPZ_ARRAY_PERSON_TYPE_ID = "person_type_id"
+    NPZ_ARRAY_ADJACENCY = "adjacency"
+
+
+    #---------------------------------------------------------------------------
+    # __init__() method
+    #---------------------------------------------------------------------------
+
+
+    def __init__( self ):
+
+        # call parent's __init__()
+        super( NDO_SparseBinary, self ).__init__()
+
+        # override things set in parent.
+        self.output_type = self.MY_OUTPUT_TYPE
+        self.debug = "NDO_SparseBinary debug:\n\n"
+
+        # variables for outputting result as file - the rendered result is a
+        #    message listing the files written.
+        self.mime_type = "text/plain"
+        self.file_extension = "txt"
+
+        # where and what to write.
+        self.output_directory = None
+        self.file_format_list = list( self.FILE_FORMAT_LIST_DEFAULT )
+        self.dense_threshold = self.DENSE_THRESHOLD_DEFAULT
+
+        # paths of files written by render_network_data(), by format.
+        self.output_path_dict = {}
+
+    #-- END method __init__() --#
+
+
+    #---------------------------------------------------------------------------
+    # instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def build_adjacency_matrix( self, allow_dense_IN = True ):
+
+        """
+            Method: build_adjacency_matrix()
+
+            Purpose: Wraps the CSR arrays of the sparse relation matrix in a
+               scipy.sparse.csr_matrix (no copying of ties cell by cell).  If
+               allow_dense_IN and the share of cells with ties is at least
+               dense_threshold, converts it to a dense numpy array.  Rows and
+               columns are in sorted master person list order.
+
+            Returns:
+            - scipy.sparse.csr_matrix or numpy.ndarray - adjacency matrix.
+        """
+
+        # return reference
+        matrix_OUT = None
+
+        # declare variables
+        sparse_matrix = None
+        node_count = -1
+        density = 0.0
+
+        self.check_dependencies()
+
+        # get sparse relations
+        sparse_matrix = self.get_sparse_relation_matrix()
+        node_count = sparse_matrix.get_node_count()
+
+        matrix_OUT = scipy.sparse.csr_matrix( ( numpy.array( sparse_matrix.value_list, dtype = numpy.int64 ),
+                                                numpy.array( sparse_matrix.column_index_list, dtype = numpy.int64 ),
+                                                numpy.array( sparse_matrix.row_pointer_list, dtype = numpy.int64 ) ),
+                                              shape = ( node_count, node_count ) )
+
+        # dense?
+        if ( ( allow_dense_IN == True ) and ( node_count > 0 ) ):
+
+            density = sparse_matrix.get_edge_count() / ( node_count * node_count )
+            if ( density >= self.dense_threshold ):
+
+                matrix_OUT = matrix_OUT.toarray()
+
+            #-- END check to see if dense --#
+
+        #-- END check to see if dense allowed --#
+
+        return matrix_OUT
+
+    #-- END method build_adjacency_matrix() --#
+
+
+    def build_edge_table( self ):
+
+        """
+            Method: build_edge_table()
+
+            Purpose: Builds the edge list as a dictionary of column name to
+               numpy array, one entry per tie, by indexing the node arrays
+               with the row and column indexes of the sparse matrix.
+
+            Returns:
+            - dictionary - column name to numpy array.
+        """
+
+        # return reference
+        table_OUT = {}
+
+        # declare variables
+        coo_matrix = None
+        person_id_array = None
+        person_type_id_array = None
+        person_type_array = None
+
+        # COO - row, column, and value arrays.
+        coo_matrix = self.build_adjacency_matrix( allow_dense_IN = False ).tocoo()
+
+        # node attributes, in row order.
+        person_id_array, person_type_id_array, person_type_array = self.build_node_arrays()
+
+        table_OUT[ self.COLUMN_FROM_PERSON_ID ] = person_id_array[ coo_matrix.row ]
+        table_OUT[ self.COLUMN_TO_PERSON_ID ] = person_id_array[ coo_matrix.col ]
+        table_OUT[ self.COLUMN_TIE_COUNT ] = coo_matrix.data
+        table_OUT[ self.COLUMN_FROM_PERSON_TYPE ] = person_type_array[ coo_matrix.row ]
+        table_OUT[ self.COLUMN_TO_PERSON_TYPE ] = person_type_array[ coo_matrix.col ]
+        table_OUT[ self.COLUMN_FROM_PERSON_TYPE_ID ] = person_type_id_array[ coo_matrix.row ]
+        table_OUT[ self.COLUMN_TO_PERSON_TYPE_ID ] = person_type_id_array[ coo_matrix.col ]
+
+        return table_OUT
+
+    #-- END method build_edge_table() --#
+
+
+    def build_node_arrays( self ):
+
+        """
+            Method: build_node_arrays()
+
+            Purpose: Builds numpy arrays of node attributes in sorted master
+               person list order - person ID, person type ID, and person type.
+
+            Returns:
+            - tuple - ( person ID array, person type ID array, person type array ).
+        """
+
+        # declare variables
+        node_table = None
+        person_id_array = None
+        person_type_id_array = None
+        person_type_array = None
+
+        self.check_dependencies()
+
+        # straight from the node table's columns.
+        node_table = self.get_node_table()
+        person_id_array = numpy.array( node_table.person_id_list, dtype = numpy.int64 )
+        person_type_id_array = numpy.array( node_table.person_type_id_array, dtype = numpy.int8 )
+        person_type_array = numpy.array( node_table.person_type_list, dtype = object )
+
+        return ( person_id_array, person_type_id_array, person_type_array )
+
+    #-- END method build_node_arrays() --#
+
+
+    def check_dependencies( self ):
+
+        '''
+        Raises ImportError if numpy and scipy are not installed.
+        '''
+
+        if ( ( numpy is None ) or ( scipy is None ) ):
+
+            raise ImportError( "NDO_SparseBinary output requires numpy and scipy (pip install -r requirements-sparse-binary.txt)." )
+
+        #-- END check to see if numpy and scipy --#
+
+    #-- END method check_dependencies() --#
+
+
+    def get_output_path( self, file_format_IN ):
+
+        '''
+        Returns path of the file for the format passed in - output directory
+           (a new temporary directory if not set), then network label (or
+           "network") as file name, with format as extension.
+        '''
+
+        # return reference
+        path_OUT = None
+
+        # declare variables
+        file_name_prefix = ""
+
+        # got a directory?
+        if ( ( self.output_directory is None ) or ( self.output_directory == "" ) ):
+
+            self.output_directory = tempfile.mkdtemp( prefix = self.OUTPUT_DIRECTORY_PREFIX )
+
+        #-- END check to see if output directory --#
+
+        file_name_prefix = slugify( self.network_label )
+        if ( file_name_prefix == "" ):
+
+            file_name_prefix = self.FILE_NAME_PREFIX_DEFAULT
+
+        #-- END check to see if label --#
+
+        path_OUT = os.path.join( self.output_directory, file_name_prefix + "." + file_format_IN )
+
+        return path_OUT
+
+    #-- END method get_output_path() --#
+
+
+    def initialize_from_params( self, param_container_IN ):
+
+        # declare variables
+        output_directory_IN = ''
+
+        # call parent
+        super( NDO_SparseBinary, self ).initialize_from_params( param_container_IN )
+
+        # output directory
+        output_directory_IN = param_container_IN.get_param_as_str( NetworkDataOutput.PARAM_NETWORK_OUTPUT_DIRECTORY, '' )
+        if ( output_directory_IN != '' ):
+
+            self.output_directory = output_directory_IN
+
+        #-- END check to see if output directory --#
+
+    #-- END method initialize_from_params() --#
+
+
+    def render_network_data( self ):
+
+        """
+            Assumes render method has already created network data by calling
+               process_author_relations() and updated source person types by
+               calling update_source_person_types().  Writes each format in
+               file_format_list to the output directory.
+
+            Returns:
+            - String - message with the path of each file written, one per
+               line.
+        """
+
+        # return reference
+        network_data_OUT = ''
+
+        # declare variables
+        file_format = ""
+        output_path = ""
+
+        self.output_path_dict = {}
+        for file_format in self.file_format_list:
+
+            output_path = self.get_output_path( file_format )
+
+            if ( file_format == self.FILE_FORMAT_NPZ ):
+
+                self.write_npz( output_path )
+
+            elif ( file_format == self.FILE_FORMAT_MATRIX_MARKET ):
+
+                self.write_matrix_market( output_path )
+
+            elif ( file_format == self.FILE_FORMAT_PARQUET ):
+
+                self.write_parquet( output_path )
+
+            else:
+
+                output_path = None
+
+            #-- END check to see what format --#
+
+            if ( output_path is not None ):
+
+                self.output_path_dict[ file_format ] = output_path
+                network_data_OUT += file_format + ": " + output_path + self.OUTPUT_END_OF_LINE
+
+            #-- END check to see if written --#
+
+        #-- END loop over formats --#
+
+        return network_data_OUT
+
+    #-- END render_network_data() --#
+
+
+    def write_matrix_market( self, path_IN ):
+
+        '''
+        Writes adjacency matrix to path passed in in Matrix Market coordinate
+           format, with network label as comment.  Returns path.
+        '''
+
+        scipy.io.mmwrite( path_IN, self.build_adjacency_matrix( allow_dense_IN = False ), comment = self.network_label, field = "integer" )
+
+        return path_IN
+
+    #-- END method write_matrix_market() --#
+
+
+    def write_npz( self, path_IN ):
+
+        '''
+        Writes adjacency matrix and node attribute arrays to path passed in
+           with numpy.savez_compressed().  Sparse matrices are stored the way
+           scipy.sparse.save_npz() stores them (format, shape, data, indices,
+           indptr), dense as an "adjacency" array.  Returns path.
+        '''
+
+        # declare variables
+        adjacency_matrix = None
+        person_id_array = None
+        person_type_id_array = None
+        person_type_array = None
+        array_dict = None
+
+        adjacency_matrix = self.build_adjacency_matrix()
+        person_id_array, person_type_id_array, person_type_array = self.build_node_arrays()
+
+        array_dict = {}
+        array_dict[ self.NPZ_ARRAY_PERSON_ID ] = person_id_array
+        array_dict[ self.NPZ_ARRAY_PERSON_TYPE_ID ] = person_type_id_array
+
+        if ( scipy.sparse.issparse( adjacency_matrix ) == True ):
+
+            array_dict[ "format" ] = numpy.array( adjacency_matrix.format.encode( "ascii" ) )
+            array_dict[ "shape" ] = numpy.array( adjacency_matrix.shape )
+            array_dict[ "data" ] = adjacency_matrix.data
+            array_dict[ "indices" ] = adjacency_matrix.indices
+            array_dict[ "indptr" ] = adjacency_matrix.indptr
+
+        else:
+
+            array_dict[ self.NPZ_ARRAY_ADJACENCY ] = adjacency_matrix
+
+        #-- END check to see if sparse --#
+
+        # savez_compressed() adds ".npz" if it is not there - it is.
+        numpy.savez_compressed( path_IN, **array_dict )
+
+        return path_IN
+
+    #-- END method write_npz() --#
+
+
+    def write_parquet( self, path_IN ):
+
+        '''
+        Writes edge list (see build_edge_table()) to path passed in as a
+           Parquet file.  Returns path.
+        '''
+
+        # declare variables
+        edge_table = None
+        column_name = ""
+
+        if ( pyarrow is None ):
+
+            raise ImportError( "NDO_SparseBinary Parquet output requires pyarrow (pip install -r requirements-sparse-binary.txt)." )
+
+        #-- END check to see if pyarrow --#
+
+        edge_table = self.build_edge_table()
+
+        # person types as strings.
+        for column_name in [ self.COLUMN_FROM_PERSON_TYPE, self.COLUMN_TO_PERSON_TYPE ]:
+
+            edge_table[ column_name ] = edge_table[ column_name ].astype( str )
+
+        #-- END loop over type columns --#
+
+        pyarrow.parquet.write_table( pyarrow.Table.from_pydict( edge_table ), path_IN )
+
+        return path_IN
+
+    #-- END method write_parquet() --#
+
+
+#-- END class NDO_SparseBinary --#
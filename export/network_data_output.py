@@ -34,17 +34,24 @@ import six
 # Django DB classes, just to play with...
 #from django.db.models import Count # for aggregating counts of authors, sources.
 #from django.db.models import Max   # for getting max value of author, source counts.
+from django.db.models import Prefetch
+from django.db.models import Sum
 
 # python_utilities
 from python_utilities.parameters.param_container import ParamContainer
 
 # Import the classes for our context_text application
 #from context_text.models import Article
-#from context_text.models import Article_Author
+from context_text.models import Article_Author
+from context_text.models import Article_Data_Network_Tie
 from context_text.models import Article_Subject
 #from context_text.models import Person
 #from context_text.models import Topic
 
+# Import context_text export classes.
+from context_text.export.network_node_table import NetworkNodeTable
+from context_text.export.sparse_relation_matrix import SparseRelationMatrix
+
 # Import context_text shared classes.
 from context_text.shared.context_text_base import ContextTextBase
 
@@ -75,12 +82,18 @@ class NetworkDataOutput( ContextTextBase ):
     NETWORK_DATA_FORMAT_SIMPLE_MATRIX = "simple_matrix"
     NETWORK_DATA_FORMAT_CSV_MATRIX = "csv_matrix"
     NETWORK_DATA_FORMAT_TAB_DELIMITED_MATRIX = "tab_delimited_matrix"
+    NETWORK_DATA_FORMAT_EDGE_LIST = "edge_list"
+    NETWORK_DATA_FORMAT_MATRIX_MARKET = "matrix_market"
+    NETWORK_DATA_FORMAT_SPARSE_BINARY = "sparse_binary"
     NETWORK_DATA_FORMAT_DEFAULT = NETWORK_DATA_FORMAT_TAB_DELIMITED_MATRIX
     
     NETWORK_DATA_FORMAT_CHOICES_LIST = [
         ( NETWORK_DATA_FORMAT_SIMPLE_MATRIX, "Simple Matrix" ),
         ( NETWORK_DATA_FORMAT_CSV_MATRIX, "CSV Matrix" ),
         ( NETWORK_DATA_FORMAT_TAB_DELIMITED_MATRIX, "Tab-Delimited Matrix" ),
+        ( NETWORK_DATA_FORMAT_EDGE_LIST, "Edge List (CSV)" ),
+        ( NETWORK_DATA_FORMAT_MATRIX_MARKET, "Matrix Market (sparse)" ),
+        ( NETWORK_DATA_FORMAT_SPARSE_BINARY, "NumPy/SciPy binary files (.npz, .mtx, .parquet)" ),
     ]
 
     # Network data output types
@@ -158,6 +171,8 @@ class NetworkDataOutput( ContextTextBase ):
     PARAM_NETWORK_DATA_OUTPUT_TYPE = 'network_data_output_type'   # type of data you want to output - either just the network, just node attributes, or network with attributes in same table, either with attributes as additional rows or additional columns.
     PARAM_NETWORK_INCLUDE_HEADERS = 'network_include_headers'
     PARAM_NETWORK_INCLUDE_RENDER_DETAILS = 'network_include_render_details'
+    PARAM_NETWORK_USE_PRECOMPUTED_TIES = 'network_use_precomputed_ties'
+    PARAM_NETWORK_OUTPUT_DIRECTORY = 'network_output_directory'   # directory output types that write files (sparse_binary) write them to.
     PARAM_SOURCE_CAPACITY_INCLUDE_LIST = Article_Subject.PARAM_SOURCE_CAPACITY_INCLUDE_LIST
     PARAM_SOURCE_CAPACITY_EXCLUDE_LIST = Article_Subject.PARAM_SOURCE_CAPACITY_EXCLUDE_LIST
     PARAM_SOURCE_CONTACT_TYPE_INCLUDE_LIST = Article_Subject.PARAM_SOURCE_CONTACT_TYPE_INCLUDE_LIST
@@ -173,6 +188,13 @@ class NetworkDataOutput( ContextTextBase ):
         NODE_ATTRIBUTE_PERSON_TYPE,
     ]
 
+    # bulk loading - names of attributes prefetched lists are stored in on
+    #    each Article_Data, and fields to load for authors and sources.
+    PREFETCH_ATTR_AUTHOR_LIST = "prefetched_author_list"
+    PREFETCH_ATTR_QUOTED_SOURCE_LIST = "prefetched_quoted_source_list"
+    PREFETCH_AUTHOR_FIELD_LIST = [ "id", "article_data", "person" ]
+    PREFETCH_SOURCE_FIELD_LIST = [ "id", "article_data", "person", "subject_type", "source_type", "source_contact_type", "source_capacity" ]
+
 
     #---------------------------------------------------------------------------
     # __init__() method
@@ -206,12 +228,29 @@ class NetworkDataOutput( ContextTextBase ):
         # variable to hold master person list.
         self.master_person_list = []
 
+        # sparse (CSR) version of relation_map, indexed by position in sorted
+        #    master person list - built once, after relations are mapped.
+        self.sparse_relation_matrix = None
+
+        # read-only table of the people in the network (sorted IDs, ID to
+        #    index, types, type IDs, labels) - built once, after the sparse
+        #    matrix, so renderers don't look people up per row or cell.
+        self.node_table = None
+
         # internal debug string
         self.debug = "NetworkDataOutput debug:\n\n"
 
         # inclusion parameter holder
         self.inclusion_params = {}
 
+        # load all authors and sources in bulk before building ties?  If
+        #    False, queries for each Article_Data's people one at a time.
+        self.use_bulk_load = True
+
+        # build network by aggregating precomputed Article_Data_Network_Tie
+        #    rows in the database, rather than from authors and sources?
+        self.use_precomputed_ties = False
+
         # set logger name (for LoggingHelper parent class: (LoggingHelper --> BasicRateLimited --> ContextTextBase --> ArticleCoding).
         self.set_logger_name( "context_text.export.network_data_output" )
         
@@ -223,7 +262,7 @@ class NetworkDataOutput( ContextTextBase ):
     #---------------------------------------------------------------------------
 
 
-    def add_directed_relation( self, person_from_id_IN, person_to_id_IN ):
+    def add_directed_relation( self, person_from_id_IN, person_to_id_IN, tie_count_IN = 1 ):
 
         """
             Method: add_directed_relation()
@@ -231,14 +270,16 @@ class NetworkDataOutput( ContextTextBase ):
             Purpose: Accepts two person IDs.  For the from person, goes into the
                nested connection map, grabs that person's connection dictionary,
                and checks if the to person is in the map.  If so, grabs the
-               counter for number of contacts and increments it by one.  If not,
-               adds the person and sets counter to 1.
+               counter for number of contacts and increments it by tie_count_IN
+               (1 by default).  If not, adds the person and sets counter to
+               tie_count_IN.
 
             Preconditions: connection_map must be initialized to a dictionary.
 
             Params:
             - person_from_id_IN - person ID of 1st person to connect.
             - person_to_id_IN - person ID of 2nd person to connect.
+            - tie_count_IN - number of ties to add - defaults to 1.
 
             Returns:
             - string status message, either STATUS_OK if success, or
@@ -286,18 +327,22 @@ class NetworkDataOutput( ContextTextBase ):
                     # yes.  Retrieve that person's value, add one, and place
                     #    incremented value back in hash.
                     current_person_count = person_relations[ person_to_id_IN ]
-                    updated_person_count = current_person_count + 1
+                    updated_person_count = current_person_count + tie_count_IN
 
                 else: # not already connected.
 
-                    # not in person relations.  Set count to 1
-                    updated_person_count = 1
+                    # not in person relations.  Set count to tie count.
+                    updated_person_count = tie_count_IN
 
                 #-- END check to see if already are connected. --#
 
                 # update the count.
                 person_relations[ person_to_id_IN ] = updated_person_count
 
+                # relations changed - clear out sparse matrix and node table.
+                self.sparse_relation_matrix = None
+                self.node_table = None
+
             #-- END sanity check to make sure we have a map.
 
         #-- END check to make sure we have IDs. --#
@@ -312,7 +357,7 @@ class NetworkDataOutput( ContextTextBase ):
     #-- END method add_directed_relation --#
 
 
-    def add_reciprocal_relation( self, person_1_id_IN, person_2_id_IN ):
+    def add_reciprocal_relation( self, person_1_id_IN, person_2_id_IN, tie_count_IN = 1 ):
 
         """
             Method: add_reciprocal_relation()
@@ -320,14 +365,16 @@ class NetworkDataOutput( ContextTextBase ):
             Purpose: Accepts two person IDs.  For each, goes into the nested
                connection map, grabs that person's connection dictionary, and
                checks if the other person is in the map.  If so, grabs the
-               counter for number of contacts and increments it by one.  If not,
-               adds the person and sets counter to 1.
+               counter for number of contacts and increments it by tie_count_IN
+               (1 by default).  If not, adds the person and sets counter to
+               tie_count_IN.
 
             Preconditions: connection_map must be initialized to a dictionary.
 
             Params:
             - person_1_id_IN - person ID of 1st person to connect.
             - person_2_id_IN - person ID of 2nd person to connect.
+            - tie_count_IN - number of ties to add - defaults to 1.
 
             Returns:
             - string status message, either STATUS_OK if success, or
@@ -361,8 +408,8 @@ class NetworkDataOutput( ContextTextBase ):
             #-- END DEBUG --#
 
             # add directed relations from 1 to 2 and from 2 to 1.
-            self.add_directed_relation( person_1_id_IN, person_2_id_IN )
-            self.add_directed_relation( person_2_id_IN, person_1_id_IN )
+            self.add_directed_relation( person_1_id_IN, person_2_id_IN, tie_count_IN )
+            self.add_directed_relation( person_2_id_IN, person_1_id_IN, tie_count_IN )
 
             if ( self.DEBUG_FLAG == True ):
                 # output the author map
@@ -473,17 +520,10 @@ class NetworkDataOutput( ContextTextBase ):
 
         # declare variables
         master_list = None
-        my_label = ''
-        current_person_id = -1
+        node_table = None
         person_count = -1
-        current_type = ''
-        current_type_id = -1
         current_label = ""
         current_value = ''
-        unknown_count = 0
-        author_count = 0
-        source_count = 0
-        both_count = 0
 
         # get master list
         master_list = self.get_master_person_list()
@@ -491,28 +531,12 @@ class NetworkDataOutput( ContextTextBase ):
         # got something?
         if ( master_list ):
 
-            # loop over sorted person list, building label line for each person.
+            # loop over precomputed labels, in sorted person order.
+            node_table = self.get_node_table()
             person_count = 0
-            for current_person_id in sorted( master_list ):
+            for current_label in node_table.label_list:
 
                 person_count += 1
-                
-                # get current person type and type ID
-                current_type = self.get_person_type( current_person_id )
-                current_type_id = self.get_person_type_id( current_person_id )
-
-                # increment count
-                if ( current_type == NetworkDataOutput.PERSON_TYPE_UNKNOWN ):
-                    unknown_count += 1
-                elif ( current_type == NetworkDataOutput.PERSON_TYPE_AUTHOR ):
-                    author_count += 1
-                elif ( current_type == NetworkDataOutput.PERSON_TYPE_SOURCE ):
-                    source_count += 1
-                elif ( current_type == NetworkDataOutput.PERSON_TYPE_BOTH ):
-                    both_count += 1
-
-                # get label
-                current_label = self.get_person_label( current_person_id )
 
                 # append the person's row to the output string.
                 current_value = str( person_count ) + "__" + current_label
@@ -530,9 +554,6 @@ class NetworkDataOutput( ContextTextBase ):
 
             #-- END loop over persons. --#
 
-            # append counts
-            #string_OUT += "\n\ntotals: unknown=" + str( unknown_count ) + "; author=" + str( author_count ) + "; source=" + str( source_count ) + "; both=" + str( both_count ) + "\n\n"
-
         #-- END check to make sure we have a person list. --#
 
         return list_OUT
@@ -561,8 +582,7 @@ class NetworkDataOutput( ContextTextBase ):
 
         # declare variables
         person_list = None
-        current_person_id = -1
-        output_person_id = -1
+        person_id_list = None
 
         # get master list
         person_list = self.get_master_person_list()
@@ -570,23 +590,19 @@ class NetworkDataOutput( ContextTextBase ):
         # got it?
         if ( person_list ):
 
-            # loop over the master list.
-            for current_person_id in sorted( person_list ):
-            
-                # store in output variable
-                output_person_id = current_person_id
+            # sorted IDs, from the node table.
+            person_id_list = self.get_node_table().person_id_list
 
-                # append as a string?
-                if ( as_string_IN == True ):
+            # as strings?
+            if ( as_string_IN == True ):
 
-                    output_person_id = str( output_person_id )
+                list_OUT = [ str( current_person_id ) for current_person_id in person_id_list ]
 
-                #-- END check to see if append as string --#
+            else:
 
-                # append to output list.
-                list_OUT.append( output_person_id )
+                list_OUT = list( person_id_list )
 
-            #-- END loop over people --#
+            #-- END check to see if append as string --#
 
         #-- END check to make sure we have list.
 
@@ -617,8 +633,7 @@ class NetworkDataOutput( ContextTextBase ):
 
         # declare variables
         person_list = None
-        current_person_id = -1
-        current_person_type_id = -1
+        person_type_id_array = None
 
         # get master list
         person_list = self.get_master_person_list()
@@ -626,24 +641,20 @@ class NetworkDataOutput( ContextTextBase ):
         # got it?
         if ( person_list ):
 
-            # loop over the master list, look for each in the map of person to
-            #    type.  If found, append type.  If not found, append "unknown".
-            for current_person_id in sorted( person_list ):
-
-                # get person's type
-                current_person_type_id = self.get_person_type_id( current_person_id )
+            # type IDs, in sorted person order, from the node table (people
+            #    without a type are already "unknown").
+            person_type_id_array = self.get_node_table().person_type_id_array
 
-                # append as a string?
-                if ( as_string_IN == True ):
+            # as strings?
+            if ( as_string_IN == True ):
 
-                    current_person_type_id = str( current_person_type_id )
+                list_OUT = [ str( current_person_type_id ) for current_person_type_id in person_type_id_array ]
 
-                #-- END check to see if append as string --#
+            else:
 
-                # append to output list.
-                list_OUT.append( current_person_type_id )
+                list_OUT = list( person_type_id_array )
 
-            #-- END loop over people --#
+            #-- END check to see if append as string --#
 
         #-- END check to make sure we have list.
 
@@ -870,6 +881,11 @@ class NetworkDataOutput( ContextTextBase ):
         # save this as the master person list.
         self.master_person_list = merged_person_id_list
 
+        # list changed - clear out sparse matrix and node table so they are
+        #    rebuilt.
+        self.sparse_relation_matrix = None
+        self.node_table = None
+
         list_OUT = self.master_person_list
         
         my_logger.debug( "In " + me + ": len( self.master_person_list ) = " + str( len( self.master_person_list ) ) )
@@ -879,6 +895,52 @@ class NetworkDataOutput( ContextTextBase ):
     #-- END method generate_master_person_list() --#
 
 
+    def get_article_people( self, article_data_IN ):
+
+        """
+            Method: get_article_people()
+
+            Purpose: accepts an Article_Data instance, returns the authors and
+               the quoted sources for it.  If the lists were bulk-loaded by
+               prefetch_article_people(), just returns them.  If not, queries
+               for them.
+
+            Params:
+            - article_data_IN - Article_Data whose people we want.
+
+            Returns:
+            - tuple - ( list of Article_Author instances, list of quoted
+               Article_Subject instances ).
+        """
+
+        # return references
+        author_list_OUT = None
+        source_list_OUT = None
+
+        # declare variables
+        author_attr = self.PREFETCH_ATTR_AUTHOR_LIST
+        source_attr = self.PREFETCH_ATTR_QUOTED_SOURCE_LIST
+
+        # prefetched?
+        if ( hasattr( article_data_IN, author_attr ) == True ):
+
+            # yes - use lists.
+            author_list_OUT = getattr( article_data_IN, author_attr )
+            source_list_OUT = getattr( article_data_IN, source_attr )
+
+        else:
+
+            # no - query.
+            author_list_OUT = list( article_data_IN.article_author_set.all() )
+            source_list_OUT = list( article_data_IN.get_quoted_article_sources_qs() )
+
+        #-- END check to see if prefetched --#
+
+        return author_list_OUT, source_list_OUT
+
+    #-- END method get_article_people() --#
+
+
     def get_master_person_list( self, is_sorted_IN = True ):
 
         """
@@ -932,6 +994,80 @@ class NetworkDataOutput( ContextTextBase ):
     #-- END method get_master_person_list() --#
 
 
+    def get_node_from_table( self, person_id_IN ):
+
+        """
+            Method: get_node_from_table()
+
+            Purpose: accepts a person ID.  If the node table has already been
+               built, returns that person's NetworkNode from it.  Does not
+               build the table - person types can still be changing while
+               ties are being generated.
+
+            Params:
+            - person_id_IN - ID of person whose node we want.
+
+            Returns:
+            - NetworkNode - node for person, or None if no table or person not
+               in it.
+        """
+
+        # return reference
+        node_OUT = None
+
+        # got a table?
+        if ( self.node_table is not None ):
+
+            node_OUT = self.node_table.get_node( person_id_IN )
+
+        #-- END check to see if node table built --#
+
+        return node_OUT
+
+    #-- END method get_node_from_table() --#
+
+
+    def get_node_table( self ):
+
+        """
+            Method: get_node_table()
+
+            Purpose: Checks if the read-only node table has already been built
+               for the current master person list.  If not, builds one from
+               the sorted person ID list and self.person_type_dict and stores
+               it in the instance.
+
+            Preconditions: relations and person types should already be
+               mapped - call after ties have been generated.
+
+            Returns:
+            - NetworkNodeTable - sorted IDs, ID to index map, types, type IDs,
+               and labels for the people in the network.
+        """
+
+        # return reference
+        table_OUT = None
+
+        # got one already?
+        table_OUT = self.node_table
+        if ( table_OUT is None ):
+
+            # no - build from sorted IDs and types.
+            table_OUT = NetworkNodeTable( self.get_sorted_person_id_list(),
+                                          self.person_type_dict,
+                                          NetworkDataOutput.PERSON_TYPE_TO_ID,
+                                          NetworkDataOutput.PERSON_TYPE_UNKNOWN )
+
+            # store it.
+            self.node_table = table_OUT
+
+        #-- END check to see if already built --#
+
+        return table_OUT
+
+    #-- END method get_node_table() --#
+
+
     def get_person_label( self, person_id_IN ):
 
         """
@@ -954,16 +1090,28 @@ class NetworkDataOutput( ContextTextBase ):
         # declare variables
         person_type = ""
         person_type_id = ""
+        current_node = None
 
         # got a value?
         if ( person_id_IN ):
 
-            # get current person type and type ID
-            person_type = self.get_person_type( person_id_IN )
-            person_type_id = self.get_person_type_id( person_id_IN )
+            # already in node table?
+            current_node = self.get_node_from_table( person_id_IN )
+            if ( current_node is not None ):
+
+                # yes - use it.
+                value_OUT = current_node.label
 
-            # append the person's row to the output string.
-            value_OUT = str( person_id_IN ) + "__" + person_type + "-" + str( person_type_id )
+            else:
+
+                # get current person type and type ID
+                person_type = self.get_person_type( person_id_IN )
+                person_type_id = self.get_person_type_id( person_id_IN )
+
+                # append the person's row to the output string.
+                value_OUT = str( person_id_IN ) + "__" + person_type + "-" + str( person_type_id )
+
+            #-- END check to see if in node table --#
 
         #-- END check to see if we have a person ID --#
 
@@ -992,20 +1140,32 @@ class NetworkDataOutput( ContextTextBase ):
 
         # declare variables
         person_to_type_map = None
+        current_node = None
 
         # got a value?
         if ( person_id_IN ):
 
-            # get dict.
-            person_to_type_map = self.person_type_dict
+            # already in node table?
+            current_node = self.get_node_from_table( person_id_IN )
+            if ( current_node is not None ):
+
+                # yes - use it.
+                value_OUT = current_node.person_type
+
+            else:
+
+                # get dict.
+                person_to_type_map = self.person_type_dict
 
-            # see if person is in the dict.
-            if person_id_IN in person_to_type_map:
+                # see if person is in the dict.
+                if person_id_IN in person_to_type_map:
 
-                # they exist! get their type
-                value_OUT = person_to_type_map[ person_id_IN ]
+                    # they exist! get their type
+                    value_OUT = person_to_type_map[ person_id_IN ]
 
-            #-- END check to see if person has a type --#
+                #-- END check to see if person has a type --#
+
+            #-- END check to see if in node table --#
 
         #-- END check to see if we have a person ID --#
 
@@ -1036,28 +1196,40 @@ class NetworkDataOutput( ContextTextBase ):
         # declare variables
         person_type = ''
         type_to_id_map = None
+        current_node = None
 
         # got a value?
         if ( person_id_IN ):
 
-            # get person type
-            person_type = self.get_person_type( person_id_IN )
+            # already in node table?
+            current_node = self.get_node_from_table( person_id_IN )
+            if ( current_node is not None ):
+
+                # yes - use it.
+                value_OUT = current_node.person_type_id
 
-            # look up the ID for that type.
-            type_to_id_map = NetworkDataOutput.PERSON_TYPE_TO_ID
+            else:
 
-            # known type?
-            if person_type in type_to_id_map:
+                # get person type
+                person_type = self.get_person_type( person_id_IN )
 
-                # yes, return id
-                value_OUT = type_to_id_map[ person_type ]
+                # look up the ID for that type.
+                type_to_id_map = NetworkDataOutput.PERSON_TYPE_TO_ID
 
-            else:
+                # known type?
+                if person_type in type_to_id_map:
+
+                    # yes, return id
+                    value_OUT = type_to_id_map[ person_type ]
+
+                else:
 
-                # no, return unknown's ID.
-                value_OUT = type_to_id_map[ NetworkDataOutput.PERSON_TYPE_UNKNOWN ]
+                    # no, return unknown's ID.
+                    value_OUT = type_to_id_map[ NetworkDataOutput.PERSON_TYPE_UNKNOWN ]
 
-            #-- END check to see if type is known type. --#
+                #-- END check to see if type is known type. --#
+
+            #-- END check to see if in node table --#
 
         #-- END check to see if we have a person ID --#
 
@@ -1140,12 +1312,86 @@ class NetworkDataOutput( ContextTextBase ):
     #-- END method get_relations_for_person() --#
 
 
+    def get_sorted_person_id_list( self ):
+
+        """
+            Method: get_sorted_person_id_list()
+
+            Purpose: returns the person IDs from the master person list in
+               sorted order.  Uses the list stored in the sparse relation
+               matrix, so the master list is only sorted once per render,
+               rather than once per row.
+
+            Returns:
+            - List - sorted list of person IDs.
+        """
+
+        # return reference
+        list_OUT = []
+
+        # declare variables
+        sparse_matrix = None
+
+        # get sparse matrix
+        sparse_matrix = self.get_sparse_relation_matrix()
+
+        # return its node list.
+        list_OUT = sparse_matrix.node_id_list
+
+        return list_OUT
+
+    #-- END method get_sorted_person_id_list() --#
+
+
+    def get_sparse_relation_matrix( self ):
+
+        """
+            Method: get_sparse_relation_matrix()
+
+            Purpose: Checks if a sparse (CSR) version of the relation map has
+               already been built for the current master person list.  If
+               not, builds one from the nested relation_map and the master
+               person list and stores it in the instance.
+
+            Preconditions: relations should already be mapped - call after
+               process_author_relations() has been called for all articles.
+
+            Returns:
+            - SparseRelationMatrix - sparse relations, indexed by position in
+               the sorted master person list.
+        """
+
+        # return reference
+        matrix_OUT = None
+
+        # declare variables
+        master_list = None
+
+        # got one already?
+        matrix_OUT = self.sparse_relation_matrix
+        if ( matrix_OUT is None ):
+
+            # no - get master list, then build.
+            master_list = self.get_master_person_list()
+            matrix_OUT = SparseRelationMatrix( self.get_relation_map(), master_list )
+
+            # store it.
+            self.sparse_relation_matrix = matrix_OUT
+
+        #-- END check to see if already built --#
+
+        return matrix_OUT
+
+    #-- END method get_sparse_relation_matrix() --#
+
+
     def initialize_from_params( self, param_container_IN ):
 
         # declare variables
         output_type_IN = ''
         data_output_type_IN = ''
         include_render_details_IN = ''
+        use_precomputed_ties_IN = ''
         network_label_IN = ''
         source_capacity_include_list_IN = None
         source_capacity_exclude_list_IN = None
@@ -1155,6 +1401,7 @@ class NetworkDataOutput( ContextTextBase ):
         output_type_IN = param_container_IN.get_param_as_str( NetworkDataOutput.PARAM_OUTPUT_TYPE, NetworkDataOutput.NETWORK_DATA_FORMAT_DEFAULT )
         data_output_type_IN = param_container_IN.get_param_as_str( NetworkDataOutput.PARAM_NETWORK_DATA_OUTPUT_TYPE, NetworkDataOutput.NETWORK_DATA_OUTPUT_TYPE_DEFAULT )
         include_render_details_IN = param_container_IN.get_param_as_str( NetworkDataOutput.PARAM_NETWORK_INCLUDE_RENDER_DETAILS, NetworkDataOutput.CHOICE_NO )
+        use_precomputed_ties_IN = param_container_IN.get_param_as_str( NetworkDataOutput.PARAM_NETWORK_USE_PRECOMPUTED_TIES, NetworkDataOutput.CHOICE_NO )
         network_label_IN = param_container_IN.get_param_as_str( NetworkDataOutput.PARAM_NETWORK_LABEL, '' )
         source_capacity_include_list_IN = param_container_IN.get_param_as_list( NetworkDataOutput.PARAM_SOURCE_CAPACITY_INCLUDE_LIST )
         source_capacity_exclude_list_IN = param_container_IN.get_param_as_list( NetworkDataOutput.PARAM_SOURCE_CAPACITY_EXCLUDE_LIST )
@@ -1177,6 +1424,19 @@ class NetworkDataOutput( ContextTextBase ):
             self.include_render_details = False
         
         #-- END check to see whether we include render details --#
+
+        # convert use_precomputed_ties_IN to boolean
+        if ( use_precomputed_ties_IN == NetworkDataOutput.CHOICE_YES ):
+
+            # yes - True
+            self.use_precomputed_ties = True
+
+        else:
+
+            # not yes, so False.
+            self.use_precomputed_ties = False
+
+        #-- END check to see whether we use precomputed ties --#
         
         # got source contact type include list?
         if ( ( source_contact_type_include_list_IN is not None ) and ( len( source_contact_type_include_list_IN ) > 0 ) ):
@@ -1238,6 +1498,50 @@ class NetworkDataOutput( ContextTextBase ):
     #-- END method is_source_connected() --#
 
 
+    def prefetch_article_people( self, article_data_qs_IN ):
+
+        """
+            Method: prefetch_article_people()
+
+            Purpose: accepts a QuerySet of Article_Data, returns a QuerySet
+               that will load the authors and quoted sources for all of the
+               Article_Data in two set-based queries when it is evaluated,
+               rather than two or more queries per Article_Data.  Lists are
+               stored on each Article_Data in the attributes named in
+               PREFETCH_ATTR_AUTHOR_LIST and PREFETCH_ATTR_QUOTED_SOURCE_LIST,
+               and only the columns needed to build ties are loaded.  Use
+               get_article_people() to retrieve them.
+
+            Params:
+            - article_data_qs_IN - QuerySet of Article_Data to load people for.
+
+            Returns:
+            - QuerySet - Article_Data QuerySet with prefetches added.
+        """
+
+        # return reference
+        qs_OUT = None
+
+        # declare variables
+        author_qs = None
+        source_qs = None
+
+        # authors
+        author_qs = Article_Author.objects.only( *self.PREFETCH_AUTHOR_FIELD_LIST ).order_by( "id" )
+
+        # quoted sources
+        source_qs = Article_Subject.objects.filter( subject_type = Article_Subject.SUBJECT_TYPE_QUOTED )
+        source_qs = source_qs.only( *self.PREFETCH_SOURCE_FIELD_LIST ).order_by( "id" )
+
+        # add prefetches.
+        qs_OUT = article_data_qs_IN.prefetch_related( Prefetch( "article_author_set", queryset = author_qs, to_attr = self.PREFETCH_ATTR_AUTHOR_LIST ),
+                                                      Prefetch( "article_subject_set", queryset = source_qs, to_attr = self.PREFETCH_ATTR_QUOTED_SOURCE_LIST ) )
+
+        return qs_OUT
+
+    #-- END method prefetch_article_people() --#
+
+
     def process_author_relations( self, author_qs_IN, source_qs_IN ):
 
         """
@@ -1286,6 +1590,7 @@ class NetworkDataOutput( ContextTextBase ):
         author_id_list = None
         remaining_author_id_list = None
         remaining_person_id = -1
+        source_list = None
 
         # initialize logger
         my_logger = self.get_logger()
@@ -1293,6 +1598,14 @@ class NetworkDataOutput( ContextTextBase ):
         # make sure we have a QuerySet.
         if ( author_qs_IN is not None ):
 
+            # make sure sources are only retrieved once, not once per author.
+            source_list = source_qs_IN
+            if ( ( source_list is not None ) and ( isinstance( source_list, list ) == False ) ):
+
+                source_list = list( source_list )
+
+            #-- END check to see if sources are already a list --#
+
             # do we have more than one author?
             #if ( author_qs_IN.count() > 1 ):
 
@@ -1386,7 +1699,7 @@ class NetworkDataOutput( ContextTextBase ):
                 self.update_person_type( current_person_id, NetworkDataOutput.PERSON_TYPE_AUTHOR )
 
                 # update the person's relations to sources.
-                self.process_source_relations( current_person_id, source_qs_IN )
+                self.process_source_relations( current_person_id, source_list )
 
             #-- END processing loop over author keys --#
 
@@ -1397,6 +1710,123 @@ class NetworkDataOutput( ContextTextBase ):
     #-- END method process_author_relations --#
 
 
+    def process_network_ties( self, article_data_qs_IN ):
+
+        """
+            Method: process_network_ties()
+
+            Purpose: Accepts a QuerySet of Article_Data.  Rather than loading
+               each Article_Data's authors and sources, aggregates the
+               Article_Data_Network_Tie rows precomputed for those Article_Data
+               in the database:
+               - sets person types from the "author" and "source" rows.
+               - sums "author_author" ties and connected "author_source" ties
+                  by pair of people, then adds each pair to the relation map as
+                  a reciprocal relation with the summed count.
+               Source connectedness is checked in SQL, with the same rules as
+               Article_Subject.is_connected() - source type must be
+               "individual", and the source contact type and capacity include
+               and exclude lists in self.inclusion_params are applied.
+
+            Preconditions: Article_Data_Network_Tie rows must be up to date for
+               the Article_Data (see
+               Article_Data_Network_Tie.update_for_article_data_qs(), or the
+               backfill_network_ties management command).  render() checks for
+               Article_Data with authors but no tie rows, and doesn't call this
+               method if it finds any.
+
+            Params:
+            - article_data_qs_IN - QuerySet of Article_Data to build network from.
+
+            Returns:
+            - string status message, either STATUS_OK if success, or
+               STATUS_ERROR_PREFIX followed by descriptive error message.
+        """
+
+        # return reference
+        status_OUT = NetworkDataOutput.STATUS_OK
+
+        # declare variables
+        tie_qs = None
+        person_type_qs = None
+        current_person_id = None
+        current_tie_type = None
+        author_tie_qs = None
+        source_tie_qs = None
+        my_inclusion_params = None
+        contact_type_include_list = None
+        current_tie_qs = None
+        summed_tie_qs = None
+        from_person_id = None
+        to_person_id = None
+        tie_total = None
+
+        # ties for the Article_Data passed in.
+        tie_qs = Article_Data_Network_Tie.objects.filter( article_data__in = article_data_qs_IN.values( "id" ) )
+
+        # person types
+        person_type_qs = tie_qs.filter( tie_type__in = [ Article_Data_Network_Tie.TIE_TYPE_AUTHOR, Article_Data_Network_Tie.TIE_TYPE_SOURCE ] )
+        person_type_qs = person_type_qs.order_by().values_list( "from_person_id", "tie_type" ).distinct()
+        for current_person_id, current_tie_type in person_type_qs:
+
+            if ( current_tie_type == Article_Data_Network_Tie.TIE_TYPE_AUTHOR ):
+
+                self.update_person_type( current_person_id, NetworkDataOutput.PERSON_TYPE_AUTHOR )
+
+            else:
+
+                self.update_person_type( current_person_id, NetworkDataOutput.PERSON_TYPE_SOURCE )
+
+            #-- END check to see what type --#
+
+        #-- END loop over person types --#
+
+        # author-author ties
+        author_tie_qs = tie_qs.filter( tie_type = Article_Data_Network_Tie.TIE_TYPE_AUTHOR_AUTHOR )
+
+        # author-source ties, only to connected sources.
+        source_tie_qs = tie_qs.filter( tie_type = Article_Data_Network_Tie.TIE_TYPE_AUTHOR_SOURCE )
+        source_tie_qs = source_tie_qs.filter( source_type = Article_Subject.SOURCE_TYPE_INDIVIDUAL )
+
+        my_inclusion_params = self.inclusion_params
+        contact_type_include_list = my_inclusion_params.get( NetworkDataOutput.PARAM_SOURCE_CONTACT_TYPE_INCLUDE_LIST, None )
+        if ( ( contact_type_include_list is not None ) and ( len( contact_type_include_list ) > 0 ) ):
+
+            source_tie_qs = source_tie_qs.filter( source_contact_type__in = contact_type_include_list )
+
+        #-- END check to see if source contact type include list --#
+
+        if NetworkDataOutput.PARAM_SOURCE_CAPACITY_INCLUDE_LIST in my_inclusion_params:
+
+            source_tie_qs = source_tie_qs.filter( source_capacity__in = my_inclusion_params[ NetworkDataOutput.PARAM_SOURCE_CAPACITY_INCLUDE_LIST ] )
+
+        #-- END check to see if source capacity include list --#
+
+        if NetworkDataOutput.PARAM_SOURCE_CAPACITY_EXCLUDE_LIST in my_inclusion_params:
+
+            source_tie_qs = source_tie_qs.exclude( source_capacity__in = my_inclusion_params[ NetworkDataOutput.PARAM_SOURCE_CAPACITY_EXCLUDE_LIST ] )
+
+        #-- END check to see if source capacity exclude list --#
+
+        # sum ties by pair of people, and add them to the relation map.
+        for current_tie_qs in [ author_tie_qs, source_tie_qs ]:
+
+            summed_tie_qs = current_tie_qs.order_by().values( "from_person_id", "to_person_id" )
+            summed_tie_qs = summed_tie_qs.annotate( tie_total = Sum( "tie_count" ) )
+            summed_tie_qs = summed_tie_qs.values_list( "from_person_id", "to_person_id", "tie_total" )
+            for from_person_id, to_person_id, tie_total in summed_tie_qs:
+
+                self.add_reciprocal_relation( from_person_id, to_person_id, tie_total )
+
+            #-- END loop over summed ties --#
+
+        #-- END loop over tie QuerySets --#
+
+        return status_OUT
+
+    #-- END method process_network_ties() --#
+
+
     def process_source_relations( self, author_id_IN, source_qs_IN ):
 
         """
@@ -1436,8 +1866,10 @@ class NetworkDataOutput( ContextTextBase ):
         # make sure we have an author ID.
         if ( author_id_IN != '' ):
 
-            # make sure we have a QuerySet, and it has more than one thing in it.
-            if ( ( source_qs_IN is not None ) and ( source_qs_IN.count() > 0 ) ):
+            # make sure we have sources, and there is at least one.  len()
+            #    rather than count() so a list works, and so a QuerySet is
+            #    evaluated once and then iterated from its cache.
+            if ( ( source_qs_IN is not None ) and ( len( source_qs_IN ) > 0 ) ):
 
                 # we have sources to join.  Loop!
                 source_counter = 0
@@ -1537,8 +1969,10 @@ class NetworkDataOutput( ContextTextBase ):
         article_data_counter = 0
         current_article_data = None
         article_author_count = -1
-        author_qs = None
-        source_qs = None
+        author_list = None
+        source_list = None
+        use_precomputed_ties = False
+        missing_ties_count = -1
 
         # initialize logger
         my_logger = self.get_logger()
@@ -1547,6 +1981,31 @@ class NetworkDataOutput( ContextTextBase ):
         article_data_query_set = self.query_set
         person_dict = self.person_dictionary
 
+        # precomputed ties missing for any of the Article_Data (coded before
+        #    the tie table existed, and not backfilled)?  Then build ties from
+        #    authors and sources, rather than leave theirs out.
+        use_precomputed_ties = self.use_precomputed_ties
+        if ( ( use_precomputed_ties == True ) and ( hasattr( article_data_query_set, "values" ) == True ) ):
+
+            missing_ties_count = Article_Data_Network_Tie.get_article_data_missing_ties_qs( article_data_query_set ).count()
+            if ( missing_ties_count > 0 ):
+
+                my_logger.warning( "In " + me + "(): " + str( missing_ties_count ) + " Article_Data have authors but no precomputed network ties - building network from authors and sources instead.  Run \"python manage.py backfill_network_ties\" to add them." )
+                use_precomputed_ties = False
+
+            #-- END check to see if ties missing --#
+
+        #-- END check to see if precomputed ties --#
+
+        # load all authors and quoted sources for the Article_Data in a
+        #    couple of set-based queries, so ties are built in memory.  Do
+        #    this before checking the QuerySet below, since that evaluates it.
+        if ( ( use_precomputed_ties == False ) and ( self.use_bulk_load == True ) and ( hasattr( article_data_query_set, "prefetch_related" ) == True ) ):
+
+            article_data_query_set = self.prefetch_article_people( article_data_query_set )
+
+        #-- END check to see if bulk load --#
+
         # make sure each of these has something in it.
         if ( ( article_data_query_set ) and ( person_dict ) ):
 
@@ -1554,55 +2013,64 @@ class NetworkDataOutput( ContextTextBase ):
             # create ties
             #--------------------------------------------------------------------
             
-            # loop over the article data for each article to be processed.
-            for current_article_data in article_data_query_set:
+            # precomputed ties?
+            if ( use_precomputed_ties == True ):
 
-                article_data_counter += 1
+                # yes - aggregate ties stored for the Article_Data in SQL.
+                self.process_network_ties( article_data_query_set )
 
-                if ( self.DEBUG_FLAG == True ):
+            else:
 
-                    # output message about connectedness of source.
-                    debug_string = "In " + me + ": +++ Current article data = " + str( current_article_data.id ) + " +++"
+                # loop over the article data for each article to be processed.
+                for current_article_data in article_data_query_set:
+
+                    article_data_counter += 1
+
+                    if ( self.DEBUG_FLAG == True ):
+
+                        # output message about connectedness of source.
+                        debug_string = "In " + me + ": +++ Current article data = " + str( current_article_data.id ) + " +++"
                     
-                    # add to debug string?
-                    self.debug += "\n\n" + debug_string + "\n\n"
+                        # add to debug string?
+                        self.debug += "\n\n" + debug_string + "\n\n"
                     
-                    my_logger.debug( debug_string )
+                        my_logger.debug( debug_string )
 
-                #-- END DEBUG --#
+                    #-- END DEBUG --#
 
-                # first, see how many authors this article has.
-                article_author_count = current_article_data.article_author_set.count()
+                    # get authors and quoted sources.
+                    author_list, source_list = self.get_article_people( current_article_data )
 
-                # if no authors, move on.
-                if ( article_author_count > 0 ):
+                    # first, see how many authors this article has.
+                    article_author_count = len( author_list )
 
-                    # get authors
-                    author_qs = current_article_data.article_author_set.all()
-                    source_qs = current_article_data.get_quoted_article_sources_qs()
+                    # if no authors, move on.
+                    if ( article_author_count > 0 ):
 
-                    # call method to loop over authors and tie them to other
-                    #    authors (if present) and eligible sources.
-                    self.process_author_relations( author_qs, source_qs )
+                        # call method to loop over authors and tie them to other
+                        #    authors (if present) and eligible sources.
+                        self.process_author_relations( author_list, source_list )
 
-                    # update the person types for sources
-                    self.update_source_person_types( source_qs )
+                        # update the person types for sources
+                        self.update_source_person_types( source_list )
 
-                    if ( self.DEBUG_FLAG == True ):
+                        if ( self.DEBUG_FLAG == True ):
 
-                        # output message about connectedness of source.
-                        debug_string = "In " + me + ": Relation Map after article " + str( article_data_counter ) + ":\n" + str( self.relation_map )
+                            # output message about connectedness of source.
+                            debug_string = "In " + me + ": Relation Map after article " + str( article_data_counter ) + ":\n" + str( self.relation_map )
                         
-                        # add to debug string?
-                        self.debug += "\n\n" + debug_string + "\n\n"
+                            # add to debug string?
+                            self.debug += "\n\n" + debug_string + "\n\n"
                         
-                        #my_logger.debug( debug_string )
+                            #my_logger.debug( debug_string )
     
-                    #-- END DEBUG --#
+                        #-- END DEBUG --#
+
+                    #-- END check to make sure there are authors.
 
-                #-- END check to make sure there are authors.
+                #-- END loop over article data for each article to be processed.
 
-            #-- END loop over article data for each article to be processed.
+            #-- END check to see if use precomputed ties --#
 
             #--------------------------------------------------------------------
             # build person list (list of network matrix rows/columns)
@@ -1617,6 +2085,14 @@ class NetworkDataOutput( ContextTextBase ):
             #    included in the network are in the dict.
             self.generate_master_person_list()
 
+            # convert the relation map to a sparse matrix indexed by position
+            #    in the sorted master list, for renderers to share.
+            self.get_sparse_relation_matrix()
+
+            # then build the node table (types, type IDs, and labels in the
+            #    same order) once, for renderers and attribute output.
+            self.get_node_table()
+
             if ( self.DEBUG_FLAG == True ):
                 self.debug += "\n\nPerson Dictionary:\n" + str( self.person_dictionary ) + "\n\n"
                 self.debug += "\n\nMaster person list:\n" + str( self.master_person_list ) + "\n\n"
@@ -1747,6 +2223,9 @@ class NetworkDataOutput( ContextTextBase ):
             # got a value?
             if ( value_IN ):
 
+                # types changing - clear out node table so it is rebuilt.
+                self.node_table = None
+
                 # see if person is already in dict.
                 person_to_type_map = self.person_type_dict
 
@@ -1814,8 +2293,8 @@ class NetworkDataOutput( ContextTextBase ):
         current_source = None
         current_person_id = -1
 
-        # make sure we have a QuerySet, and it has more than one thing in it.
-        if ( ( source_qs_IN is not None ) and ( source_qs_IN.count() > 0 ) ):
+        # make sure we have sources, and there is at least one.
+        if ( ( source_qs_IN is not None ) and ( len( source_qs_IN ) > 0 ) ):
 
             # we have sources to join.  Loop!
             for current_source in source_qs_IN:
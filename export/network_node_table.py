@@ -0,0 +1,268 @@
+from __future__ import unicode_literals
+from __future__ import division
+
+'''
+Copyright 2010-2014 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text.
+
+context_text is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text. If not, see http://www.gnu.org/licenses/.
+'''
+
+__author__="jonathanmorgan"
+__date__ ="$May 1, 2010 6:26:35 PM$"
+
+if __name__ == "__main__":
+    print( "Hello World" )
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+# python libraries
+from types import MappingProxyType
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class NetworkNode( object ):
+
+    '''
+    One row of a NetworkNodeTable - a person in the network, with their
+       position in the sorted master person list, person type, person type
+       ID, and label ( "<person_id>__<person_type>-<person_type_id>" ).  Uses
+       __slots__, so there is no per-row __dict__.  Read-only once created.
+    '''
+
+    __slots__ = ( "index", "person_id", "person_type", "person_type_id", "label" )
+
+
+    def __init__( self, index_IN, person_id_IN, person_type_IN, person_type_id_IN, label_IN ):
+
+        object.__setattr__( self, "index", index_IN )
+        object.__setattr__( self, "person_id", person_id_IN )
+        object.__setattr__( self, "person_type", person_type_IN )
+        object.__setattr__( self, "person_type_id", person_type_id_IN )
+        object.__setattr__( self, "label", label_IN )
+
+    #-- END method __init__() --#
+
+
+    def __delattr__( self, name_IN ):
+
+        raise AttributeError( "NetworkNode is read-only - can't delete " + str( name_IN ) )
+
+    #-- END method __delattr__() --#
+
+
+    def __repr__( self ):
+
+        return "NetworkNode( " + str( self.index ) + ", " + self.label + " )"
+
+    #-- END method __repr__() --#
+
+
+    def __setattr__( self, name_IN, value_IN ):
+
+        raise AttributeError( "NetworkNode is read-only - can't set " + str( name_IN ) )
+
+    #-- END method __setattr__() --#
+
+
+#-- END class NetworkNode --#
+
+
+class NetworkNodeTable( object ):
+
+    '''
+    Read-only table of the people in a NetworkDataOutput network, built once
+       after ties are generated so renderers don't look up each person's
+       type, type ID, and label once per row or cell:
+       - person_id_list - tuple of sorted person IDs (same order as the rows
+          and columns of the SparseRelationMatrix).
+       - person_id_to_index_dict - read-only map (MappingProxyType) of person
+          ID to position in the list.
+       - person_type_list - tuple of person type strings.
+       - person_type_id_array - tuple of person type IDs.
+       - label_list - tuple of person labels.
+       - node_list - tuple of (read-only) NetworkNode instances, one per
+          person.
+    Once built, neither the attributes nor what they contain can be
+       changed - make a new table instead.
+    '''
+
+    __slots__ = ( "person_id_list", "person_id_to_index_dict", "person_type_list", "person_type_id_array", "label_list", "node_list", "is_frozen" )
+
+
+    #---------------------------------------------------------------------------
+    # __init__() method
+    #---------------------------------------------------------------------------
+
+
+    def __init__( self, person_id_list_IN, person_type_dict_IN, type_to_id_map_IN, unknown_type_IN ):
+
+        # declare variables
+        object.__setattr__( self, "is_frozen", False )
+
+        # build
+        self.build( person_id_list_IN, person_type_dict_IN, type_to_id_map_IN, unknown_type_IN )
+
+        # freeze
+        self.is_frozen = True
+
+    #-- END method __init__() --#
+
+
+    def __len__( self ):
+
+        return len( self.person_id_list )
+
+    #-- END method __len__() --#
+
+
+    def __delattr__( self, name_IN ):
+
+        raise AttributeError( "NetworkNodeTable is read-only - can't delete " + str( name_IN ) )
+
+    #-- END method __delattr__() --#
+
+
+    def __setattr__( self, name_IN, value_IN ):
+
+        if ( self.is_frozen == True ):
+
+            raise AttributeError( "NetworkNodeTable is read-only - can't set " + str( name_IN ) )
+
+        #-- END check to see if frozen --#
+
+        object.__setattr__( self, name_IN, value_IN )
+
+    #-- END method __setattr__() --#
+
+
+    #---------------------------------------------------------------------------
+    # instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def build( self, person_id_list_IN, person_type_dict_IN, type_to_id_map_IN, unknown_type_IN ):
+
+        '''
+        Accepts sorted list of person IDs, map of person ID to person type,
+           map of person type to person type ID, and the type to use for
+           people who aren't in the type map.  Makes one pass over the IDs,
+           storing each person's index, type, type ID, and label.  Returns
+           self.
+        '''
+
+        # declare variables
+        person_type_dict = None
+        unknown_type_id = None
+        index_dict = None
+        type_list = None
+        type_id_array = None
+        label_list = None
+        node_list = None
+        current_index = -1
+        current_person_id = None
+        current_type = None
+        current_type_id = None
+        current_label = None
+
+        # initialize
+        person_type_dict = person_type_dict_IN
+        if ( person_type_dict is None ):
+
+            person_type_dict = {}
+
+        #-- END check to see if type map --#
+
+        unknown_type_id = type_to_id_map_IN[ unknown_type_IN ]
+
+        index_dict = {}
+        type_list = []
+        type_id_array = []
+        label_list = []
+        node_list = []
+        for current_index, current_person_id in enumerate( person_id_list_IN ):
+
+            # type and type ID - unknown if not in maps.
+            current_type = person_type_dict.get( current_person_id, unknown_type_IN )
+            current_type_id = type_to_id_map_IN.get( current_type, unknown_type_id )
+
+            # label
+            current_label = str( current_person_id ) + "__" + current_type + "-" + str( current_type_id )
+
+            index_dict[ current_person_id ] = current_index
+            type_list.append( current_type )
+            type_id_array.append( current_type_id )
+            label_list.append( current_label )
+            node_list.append( NetworkNode( current_index, current_person_id, current_type, current_type_id, current_label ) )
+
+        #-- END loop over sorted person IDs --#
+
+        # store
+        self.person_id_list = tuple( person_id_list_IN )
+        self.person_id_to_index_dict = MappingProxyType( index_dict )
+        self.person_type_list = tuple( type_list )
+        self.person_type_id_array = tuple( type_id_array )
+        self.label_list = tuple( label_list )
+        self.node_list = tuple( node_list )
+
+        return self
+
+    #-- END method build() --#
+
+
+    def get_index( self, person_id_IN ):
+
+        '''
+        Returns position of person ID passed in, or None if not in table.
+        '''
+
+        return self.person_id_to_index_dict.get( person_id_IN, None )
+
+    #-- END method get_index() --#
+
+
+    def get_node( self, person_id_IN ):
+
+        '''
+        Returns NetworkNode for person ID passed in, or None if not in table.
+        '''
+
+        # return reference
+        node_OUT = None
+
+        # declare variables
+        node_index = None
+
+        node_index = self.person_id_to_index_dict.get( person_id_IN, None )
+        if ( node_index is not None ):
+
+            node_OUT = self.node_list[ node_index ]
+
+        #-- END check to see if in table --#
+
+        return node_OUT
+
+    #-- END method get_node() --#
+
+
+    def iter_nodes( self ):
+
+        '''
+        Returns iterator over the NetworkNodes in the table, in sorted order.
+        '''
+
+        return iter( self.node_list )
+
+    #-- END method iter_nodes() --#
+
+
+#-- END class NetworkNodeTable --#
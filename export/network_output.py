@@ -46,7 +46,13 @@ from datetime import datetime
 import operator
 
 # django database classes
+from django.db.models import Case
+from django.db.models import IntegerField
+from django.db.models import OuterRef
 from django.db.models import Q
+from django.db.models import Subquery
+from django.db.models import Value
+from django.db.models import When
 
 # python_utilities
 from python_utilities.parameters.param_container import ParamContainer
@@ -60,6 +66,9 @@ from context_text.export.csv_article_output import CsvArticleOutput
 from context_text.export.network_data_output import NetworkDataOutput
 from context_text.export.ndo_simple_matrix import NDO_SimpleMatrix
 from context_text.export.ndo_csv_matrix import NDO_CSVMatrix
+from context_text.export.ndo_edge_list import NDO_EdgeList
+from context_text.export.ndo_matrix_market import NDO_MatrixMarket
+from context_text.export.ndo_sparse_binary import NDO_SparseBinary
 from context_text.export.ndo_tab_delimited_matrix import NDO_TabDelimitedMatrix
 
 # Import context_text shared classes.
@@ -98,12 +107,16 @@ class NetworkOutput( ContextTextBase ):
     PARAM_HEADER_PREFIX = 'header_prefix'   # for output, optional prefix you want appended to front of column header names.
     PARAM_OUTPUT_TYPE = 'output_type'   # type of output you want, either CSV, tab-delimited, or old UCINet format that I should just remove.
     PARAM_ALLOW_DUPLICATE_ARTICLES = 'allow_duplicate_articles'   # allow duplicate articles...  Not sure this is relevant anymore.
+    PARAM_DEDUPLICATE_IN_PYTHON = 'deduplicate_in_python'   # if removing duplicate articles, loop over Article_Data in python rather than filtering with a subquery in the database.
+    PARAM_CSV_DOWNLOAD_AS_FILE = 'csv_download_as_file'   # for article output, stream CSV back as a file download rather than rendering it in the page.
 
     # parameters specific to network output
     PARAM_NETWORK_DOWNLOAD_AS_FILE = NetworkDataOutput.PARAM_NETWORK_DOWNLOAD_AS_FILE
     PARAM_NETWORK_LABEL = NetworkDataOutput.PARAM_NETWORK_LABEL
     PARAM_NETWORK_INCLUDE_HEADERS = NetworkDataOutput.PARAM_NETWORK_INCLUDE_HEADERS
     PARAM_NETWORK_INCLUDE_RENDER_DETAILS = NetworkDataOutput.PARAM_NETWORK_INCLUDE_RENDER_DETAILS
+    PARAM_NETWORK_USE_PRECOMPUTED_TIES = NetworkDataOutput.PARAM_NETWORK_USE_PRECOMPUTED_TIES
+    PARAM_NETWORK_OUTPUT_DIRECTORY = NetworkDataOutput.PARAM_NETWORK_OUTPUT_DIRECTORY
     PARAM_NETWORK_DATA_OUTPUT_TYPE = NetworkDataOutput.PARAM_NETWORK_DATA_OUTPUT_TYPE
 
     # prefix for person-selection params - same as network selection parameters
@@ -131,12 +144,16 @@ class NetworkOutput( ContextTextBase ):
         ContextTextBase.PARAM_TAG_LIST : ParamContainer.PARAM_TYPE_LIST,        
         ContextTextBase.PARAM_UNIQUE_ID_LIST : ParamContainer.PARAM_TYPE_LIST,
         PARAM_ALLOW_DUPLICATE_ARTICLES : ParamContainer.PARAM_TYPE_STRING,
+        PARAM_DEDUPLICATE_IN_PYTHON : ParamContainer.PARAM_TYPE_STRING,
         PARAM_SOURCE_CONTACT_TYPE_INCLUDE_LIST : ParamContainer.PARAM_TYPE_LIST,
         PARAM_SOURCE_CAPACITY_INCLUDE_LIST : ParamContainer.PARAM_TYPE_LIST,
         PARAM_SOURCE_CAPACITY_EXCLUDE_LIST : ParamContainer.PARAM_TYPE_LIST,
         PARAM_HEADER_PREFIX : ParamContainer.PARAM_TYPE_STRING,
+        PARAM_CSV_DOWNLOAD_AS_FILE : ParamContainer.PARAM_TYPE_STRING,
         PARAM_NETWORK_DOWNLOAD_AS_FILE : ParamContainer.PARAM_TYPE_STRING,
         PARAM_NETWORK_INCLUDE_RENDER_DETAILS : ParamContainer.PARAM_TYPE_STRING,
+        PARAM_NETWORK_USE_PRECOMPUTED_TIES : ParamContainer.PARAM_TYPE_STRING,
+        PARAM_NETWORK_OUTPUT_DIRECTORY : ParamContainer.PARAM_TYPE_STRING,
         PARAM_OUTPUT_TYPE : ParamContainer.PARAM_TYPE_STRING,
         PARAM_NETWORK_DATA_OUTPUT_TYPE : ParamContainer.PARAM_TYPE_STRING,
         PARAM_NETWORK_LABEL : ParamContainer.PARAM_TYPE_STRING,
@@ -152,7 +169,8 @@ class NetworkOutput( ContextTextBase ):
         PARAM_PERSON_PREFIX + ContextTextBase.PARAM_TOPIC_LIST : ParamContainer.PARAM_TYPE_LIST,
         PARAM_PERSON_PREFIX + ContextTextBase.PARAM_TAG_LIST : ParamContainer.PARAM_TYPE_LIST,
         PARAM_PERSON_PREFIX + ContextTextBase.PARAM_UNIQUE_ID_LIST : ParamContainer.PARAM_TYPE_LIST,
-        PARAM_PERSON_PREFIX + PARAM_ALLOW_DUPLICATE_ARTICLES : ParamContainer.PARAM_TYPE_STRING
+        PARAM_PERSON_PREFIX + PARAM_ALLOW_DUPLICATE_ARTICLES : ParamContainer.PARAM_TYPE_STRING,
+        PARAM_PERSON_PREFIX + PARAM_DEDUPLICATE_IN_PYTHON : ParamContainer.PARAM_TYPE_STRING
     }
 
     OUTPUT_TYPE_CHOICES_LIST = [
@@ -175,6 +193,9 @@ class NetworkOutput( ContextTextBase ):
     NETWORK_OUTPUT_TYPE_SIMPLE_MATRIX = NetworkDataOutput.NETWORK_DATA_FORMAT_SIMPLE_MATRIX
     NETWORK_OUTPUT_TYPE_CSV_MATRIX = NetworkDataOutput.NETWORK_DATA_FORMAT_CSV_MATRIX
     NETWORK_OUTPUT_TYPE_TAB_DELIMITED_MATRIX = NetworkDataOutput.NETWORK_DATA_FORMAT_TAB_DELIMITED_MATRIX
+    NETWORK_OUTPUT_TYPE_EDGE_LIST = NetworkDataOutput.NETWORK_DATA_FORMAT_EDGE_LIST
+    NETWORK_OUTPUT_TYPE_MATRIX_MARKET = NetworkDataOutput.NETWORK_DATA_FORMAT_MATRIX_MARKET
+    NETWORK_OUTPUT_TYPE_SPARSE_BINARY = NetworkDataOutput.NETWORK_DATA_FORMAT_SPARSE_BINARY
     NETWORK_OUTPUT_TYPE_DEFAULT = NetworkDataOutput.NETWORK_DATA_FORMAT_DEFAULT
     
     NETWORK_OUTPUT_TYPE_CHOICES_LIST = NetworkDataOutput.NETWORK_DATA_FORMAT_CHOICES_LIST
@@ -330,6 +351,41 @@ class NetworkOutput( ContextTextBase ):
     #-- END function add_people_to_dict() --#
 
 
+    def create_csv_article_output( self, query_set_IN ):
+
+        """
+            Accepts query set of Article_Data.  Creates a new instance of the
+               CsvArticleOutput class, places the query set in it, and sets its
+               output type and header prefix from the request.  Returns the
+               instance, ready to render() or iterate_csv_lines().
+        """
+
+        # return reference
+        csv_outputter_OUT = None
+
+        # declare variables
+        my_params = None
+        output_type_IN = ''
+        header_prefix_IN = ''
+
+        # retrieve the output type and header_prefix.
+        my_params = self.get_param_container()
+        output_type_IN = my_params.get_param_as_str( NetworkOutput.PARAM_OUTPUT_TYPE, '' )
+        header_prefix_IN = my_params.get_param_as_str( NetworkOutput.PARAM_HEADER_PREFIX, '' )
+
+        # create instance of CsvArticleOutput.
+        csv_outputter_OUT = CsvArticleOutput()
+
+        # initialize it.
+        csv_outputter_OUT.set_output_type( output_type_IN )
+        csv_outputter_OUT.set_query_set( query_set_IN )
+        csv_outputter_OUT.header_prefix = header_prefix_IN
+
+        return csv_outputter_OUT
+
+    #-- END method create_csv_article_output() --#
+
+
     def create_network_query_set( self ):
 
         # return reference
@@ -993,6 +1049,42 @@ class NetworkOutput( ContextTextBase ):
     #-- END method get_coder_id_list --#
 
 
+    def get_coder_rank_dict( self, param_prefix_IN = '' ):
+
+        '''
+        Accepts param prefix.  If there is a prioritized coder list, returns
+            a dictionary that maps each coder ID in the merged coder ID list
+            (see get_coder_id_list()) to its position in that list (0 is
+            highest priority).  If no prioritized list, returns None.
+        '''
+
+        # return reference
+        dict_OUT = None
+
+        # declare variables
+        coder_id_list = None
+        coder_rank = -1
+        coder_id = None
+
+        # prioritized coders?
+        if ( self.has_prioritized_coder_list( param_prefix_IN ) == True ):
+
+            # yes - map ID to position, keeping first if listed twice.
+            coder_id_list = self.get_coder_id_list( param_prefix_IN )
+            dict_OUT = {}
+            for coder_rank, coder_id in enumerate( coder_id_list ):
+
+                dict_OUT.setdefault( coder_id, coder_rank )
+
+            #-- END loop over coder IDs --#
+
+        #-- END check to see if prioritized coders --#
+
+        return dict_OUT
+
+    #-- END method get_coder_rank_dict() --#
+
+
     def get_NDO_instance( self ):
 
         '''
@@ -1026,7 +1118,22 @@ class NetworkOutput( ContextTextBase ):
         
             # Tab-delimited matrix.
             NDO_instance_OUT = NDO_TabDelimitedMatrix()
-        
+
+        elif ( output_type_IN == self.NETWORK_OUTPUT_TYPE_EDGE_LIST ):
+
+            # CSV edge list.
+            NDO_instance_OUT = NDO_EdgeList()
+
+        elif ( output_type_IN == self.NETWORK_OUTPUT_TYPE_MATRIX_MARKET ):
+
+            # Matrix Market coordinate (sparse) format.
+            NDO_instance_OUT = NDO_MatrixMarket()
+
+        elif ( output_type_IN == self.NETWORK_OUTPUT_TYPE_SPARSE_BINARY ):
+
+            # numpy/scipy binary files.
+            NDO_instance_OUT = NDO_SparseBinary()
+
         else:
         
             # no output type, or unknown.  Make simple output matrix.
@@ -1121,6 +1228,55 @@ class NetworkOutput( ContextTextBase ):
     #-- END method has_prioritized_coder_list() --#
 
 
+    def make_coder_rank_expression( self, coder_rank_dict_IN = None ):
+
+        '''
+        Accepts dictionary that maps coder ID to priority (0 is highest).
+            Returns a CASE expression that evaluates to the priority of an
+            Article_Data row's coder, for use in annotate() and order_by().
+            Coders not in the dictionary get a priority after all that are.
+            If no dictionary, all rows get the same priority.
+        '''
+
+        # return reference
+        expression_OUT = None
+
+        # declare variables
+        when_list = None
+        coder_id = None
+        coder_rank = -1
+        unranked_rank = 0
+
+        # make a WHEN for each coder.
+        when_list = []
+        if ( coder_rank_dict_IN is not None ):
+
+            for coder_id, coder_rank in coder_rank_dict_IN.items():
+
+                when_list.append( When( coder_id = coder_id, then = Value( coder_rank ) ) )
+
+            #-- END loop over coder ranks --#
+
+            unranked_rank = len( coder_rank_dict_IN )
+
+        #-- END check to see if coder ranks --#
+
+        # got any?
+        if ( len( when_list ) > 0 ):
+
+            expression_OUT = Case( *when_list, default = Value( unranked_rank ), output_field = IntegerField() )
+
+        else:
+
+            expression_OUT = Value( unranked_rank, output_field = IntegerField() )
+
+        #-- END check to see if any coder ranks --#
+
+        return expression_OUT
+
+    #-- END method make_coder_rank_expression() --#
+
+
     def render_csv_article_data( self, query_set_IN ):
 
         """
@@ -1154,26 +1310,13 @@ class NetworkOutput( ContextTextBase ):
         csv_OUT = ''
 
         # declare variables
-        my_params = None
         csv_outputter = None
-        output_type_IN = ''
-        header_prefix_IN = ''
 
         # do we have a query set?
         if ( query_set_IN ):
 
-            # retrieve the output type and header_prefix.
-            my_params = self.get_param_container()
-            output_type_IN = my_params.get_param_as_str( NetworkOutput.PARAM_OUTPUT_TYPE, '' )
-            header_prefix_IN = my_params.get_param_as_str( NetworkOutput.PARAM_HEADER_PREFIX, '' )
-
-            # create instance of CsvArticleOutput.
-            csv_outputter = CsvArticleOutput()
-
-            # initialize it.
-            csv_outputter.set_output_type( output_type_IN )
-            csv_outputter.set_query_set( query_set_IN )
-            csv_outputter.header_prefix = header_prefix_IN
+            # create and initialize instance of CsvArticleOutput.
+            csv_outputter = self.create_csv_article_output( query_set_IN )
 
             # render and return the result.
             csv_OUT = csv_outputter.render()
@@ -1196,136 +1339,208 @@ class NetworkOutput( ContextTextBase ):
                instances passed in that we can interact with to look for
                duplicates.  If not, does nothing.
                
-            Postconditions: returns a query set with a not IN filter that omits
-               Article_Data instances past the first it encounters for a given
-               article.
+            Postconditions: by default, returns a query set filtered by a
+               subquery that picks one Article_Data per article unique
+               identifier in the database (see
+               remove_duplicate_article_data_in_database()).  If the
+               "deduplicate_in_python" parameter is "yes", loops over the
+               Article_Data in python instead and returns a query set with a
+               not IN filter (see remove_duplicate_article_data_in_python()).
+               Either way, if there is a prioritized coder list, the
+               Article_Data from the highest priority coder is kept.
 
             Parameters:
             - query_set_IN - django QuerySet instance that contains Article_Data instances.
+            - param_prefix_IN - prefix for the parameters to use.
 
             Returns:
-            - QuerySet - QuerySet of Article_Data instances with only one Article_Data row per Article.  If nothing to remove, just returns QuerySet passed in.  If something other than a QuerySet passed in, just returns it.
+            - QuerySet - QuerySet of Article_Data instances with only one Article_Data row per Article.  If something other than a QuerySet passed in, just returns it.
         """
         
-        # ! TODO - test!
-
         # return reference
-        qs_OUT = ''
+        qs_OUT = None
 
         # declare variables
         me = "remove_duplicate_article_data"
         my_logger = None
-        unique_article_id_to_article_data_id_dict = {}
-        unique_article_id_to_article_data_map = {}        
-        has_prioritized_coders = False
-        prioritized_coder_id_list = None
-        current_article_data = None
-        current_article = None
-        current_unique_id = ''
-        current_id = -1
-        current_coder = None
-        current_coder_id = -1
-        current_coder_index = -1
-        current_article_data_id = -1
-        selected_article_data = None
-        selected_article_data_id = -1
-        selected_coder = None
-        selected_coder_id = -1
-        selected_coder_index = -1
-        omit_id_list = []
+        coder_rank_dict = None
+        deduplicate_in_python_IN = None
 
         # get logger
         my_logger = self.get_logger()
-        
-        my_logger.debug( "In " + me + ": beginning of method: count of query_set_IN = " + str( query_set_IN.count() ) )
-        
+
         # to start, set return QuerySet to QuerySet passed in.
         qs_OUT = query_set_IN
 
         # do we have a query set?
         if query_set_IN is not None:
-        
-            # get prioritized coder list?
-            has_prioritized_coders = self.has_prioritized_coder_list( param_prefix_IN )
-            if ( has_prioritized_coders == True ):
-            
-                # yes - retrieve.
-                prioritized_coder_id_list = self.get_coder_id_list( param_prefix_IN )
-                
-            #-- END check to see if prioritized coders? --#
-             
-            # loop over the article data
-            for current_article_data in query_set_IN:
 
-                # got an article?
-                current_article = current_article_data.article
-                if ( current_article ):
+            # coder priorities, if any.
+            coder_rank_dict = self.get_coder_rank_dict( param_prefix_IN )
 
-                    # yes - get unique identifier of article
-                    current_unique_id = current_article.unique_identifier
-                    current_id = current_article.id
+            # in database, or in python?
+            deduplicate_in_python_IN = self.get_param_as_str( param_prefix_IN + NetworkOutput.PARAM_DEDUPLICATE_IN_PYTHON, ContextTextBase.CHOICE_NO )
+            if ( deduplicate_in_python_IN == ContextTextBase.CHOICE_YES ):
 
-                    # get ID of current Article_Data row.
-                    current_article_data_id = current_article_data.id
-    
-                    #my_logger.debug( "In " + me + ": current_article = id: " + str( current_id ) + "; current_unique_id = " + str( current_unique_id ) )
+                qs_OUT = self.remove_duplicate_article_data_in_python( query_set_IN, coder_rank_dict )
+
+            else:
+
+                qs_OUT = self.remove_duplicate_article_data_in_database( query_set_IN, coder_rank_dict )
+
+            #-- END check to see where we deduplicate --#
+
+            my_logger.debug( "In " + me + ": deduplicate_in_python = " + str( deduplicate_in_python_IN ) + "; coder_rank_dict = " + str( coder_rank_dict ) )
+
+        #-- END check to make sure we have a query set. --#
+
+        return qs_OUT
+
+    #-- END remove_duplicate_article_data() --#
+
+
+    def remove_duplicate_article_data_in_database( self, query_set_IN, coder_rank_dict_IN = None ):
+
+        """
+            Accepts query set of Article_Data and optional dictionary that
+               maps coder ID to priority (0 is highest; coders not in the
+               dictionary come after all that are).  Returns a query set
+               that only includes, for each article unique identifier, the
+               Article_Data with the highest priority coder (lowest ID if
+               a tie or no priorities).  Article_Data with no article are
+               left in.
+
+            Rather than pulling rows back into python and excluding a list of
+               IDs, filters on a correlated subquery that, for each row, picks
+               the ID of the row to keep for its article from the same query
+               set, ranked by coder using CASE.
+
+            Returns:
+            - QuerySet - QuerySet of Article_Data instances with only one Article_Data row per Article.
+        """
+
+        # return reference
+        qs_OUT = None
+
+        # declare variables
+        coder_rank_expression = None
+        candidate_qs = None
+        selected_id_subquery = None
+
+        # to start, set return QuerySet to QuerySet passed in.
+        qs_OUT = query_set_IN
+
+        # do we have a query set?
+        if query_set_IN is not None:
+
+            # rank each row's coder.
+            coder_rank_expression = self.make_coder_rank_expression( coder_rank_dict_IN )
+
+            # for each row, the ID of the best row in the same query set for
+            #     the same article unique identifier.
+            candidate_qs = query_set_IN.order_by()
+            candidate_qs = candidate_qs.filter( article__unique_identifier = OuterRef( "article__unique_identifier" ) )
+            candidate_qs = candidate_qs.annotate( dedup_coder_rank = coder_rank_expression )
+            candidate_qs = candidate_qs.order_by( "dedup_coder_rank", "id" ).values( "id" )[ : 1 ]
+            selected_id_subquery = Subquery( candidate_qs )
+
+            # keep rows that are that row, or that have no article.
+            qs_OUT = query_set_IN.filter( Q( article__isnull = True ) | Q( id = selected_id_subquery ) )
+
+        #-- END check to make sure we have a query set. --#
+
+        return qs_OUT
+
+    #-- END remove_duplicate_article_data_in_database() --#
+
+
+    def remove_duplicate_article_data_in_python( self, query_set_IN, coder_rank_dict_IN = None ):
+
+        """
+            Accepts query set of Article_Data and optional dictionary that
+               maps coder ID to priority (0 is highest; coders not in the
+               dictionary come after all that are).  Loops over the query
+               set's ( id, article unique identifier, coder ID ) values, in
+               query set order, and returns a query set with a not IN filter
+               that omits Article_Data past the first it encounters for a
+               given article, unless a later one has a higher priority coder.
+               Article_Data with no article are left in.
+
+            Returns:
+            - QuerySet - QuerySet of Article_Data instances with only one Article_Data row per Article.  If nothing to remove, just returns QuerySet passed in.
+        """
+
+        # return reference
+        qs_OUT = None
+
+        # declare variables
+        coder_rank_dict = None
+        unranked_rank = -1
+        unique_id_to_selected_dict = None
+        values_qs = None
+        current_article_data_id = -1
+        current_article_id = None
+        current_unique_id = None
+        current_coder_id = None
+        current_rank = -1
+        selected_article_data_id = -1
+        selected_rank = -1
+        omit_id_list = None
+
+        # to start, set return QuerySet to QuerySet passed in.
+        qs_OUT = query_set_IN
+
+        # do we have a query set?
+        if query_set_IN is not None:
+
+            # coder ranks - without priorities, all the same.
+            coder_rank_dict = coder_rank_dict_IN
+            if ( coder_rank_dict is None ):
+
+                coder_rank_dict = {}
+
+            #-- END check to see if coder ranks --#
+
+            unranked_rank = len( coder_rank_dict )
+
+            # one pass over just the values we need.
+            unique_id_to_selected_dict = {}
+            omit_id_list = []
+            values_qs = query_set_IN.values_list( "id", "article_id", "article__unique_identifier", "coder_id" )
+            for current_article_data_id, current_article_id, current_unique_id, current_coder_id in values_qs:
+
+                # got an article?
+                if ( current_article_id is not None ):
+
+                    current_rank = coder_rank_dict.get( current_coder_id, unranked_rank )
 
                     # is the unique_id in the dict?
-                    if current_unique_id in unique_article_id_to_article_data_id_dict:
-    
-                        # yes - so, this is a duplicate.  Do we have prioritized
-                        #     coders?
-                        if ( has_prioritized_coders == True ):
-                        
-                            # prioritized coders.  Get instance for current
-                            #     selected article, then get ID of coder.
-                            selected_article_data = unique_article_id_to_article_data_map[ current_unique_id ]
-                            selected_article_data_id = selected_article_data.id
-                            selected_coder = selected_article_data.coder
-                            selected_coder_id = selected_coder.id
-                            
-                            # get selected index from prioritized list.
-                            selected_coder_index = prioritized_coder_id_list.index( selected_coder_id )
-                            
-                            # get coder ID and index from current.
-                            current_coder = current_article_data.coder 
-                            current_coder_id = current_coder.id
-                            current_coder_index = prioritized_coder_id_list.index( current_coder_id )
-                        
-                            # if current index less than selected_value...
-                            if ( current_coder_index < selected_coder_index ):
-                                
-                                # this is highest priority yet. store current
-                                #     rather than selected.
-                                unique_article_id_to_article_data_id_dict[ current_unique_id ] = current_article_data_id
-                                unique_article_id_to_article_data_map[ current_unique_id ] = current_article_data
-                            
-                                # add selected to the omit list.
-                                omit_id_list.append( selected_article_data_id )
-                            
-                            else:
-                            
-                                # not a higher priority - add to omit list.
-                                omit_id_list.append( current_article_data_id )
-                            
-                            #-- END check to see if higher priority. --#
-                            
+                    if current_unique_id in unique_id_to_selected_dict:
+
+                        # yes - so, this is a duplicate.  Higher priority than
+                        #     the one we have (first come, first served if
+                        #     the same)?
+                        selected_article_data_id, selected_rank = unique_id_to_selected_dict[ current_unique_id ]
+                        if ( current_rank < selected_rank ):
+
+                            # yes - keep current, omit selected.
+                            unique_id_to_selected_dict[ current_unique_id ] = ( current_article_data_id, current_rank )
+                            omit_id_list.append( selected_article_data_id )
+
                         else:
-                        
-                            # No prioritization - first come, first served.
-                            #     Add id to omit list.
+
+                            # no - omit current.
                             omit_id_list.append( current_article_data_id )
-                            
-                        #-- END check to see if prioritized coder list. --#
-    
+
+                        #-- END check to see if higher priority. --#
+
                     else:
-    
-                        # not in dict, so add it and its ID and instance.
-                        unique_article_id_to_article_data_id_dict[ current_unique_id ] = current_article_data_id
-                        unique_article_id_to_article_data_map[ current_unique_id ] = current_article_data
-    
+
+                        # not in dict, so add it.
+                        unique_id_to_selected_dict[ current_unique_id ] = ( current_article_data_id, current_rank )
+
                     #-- END check to see if duplicate. --#
-                    
+
                 #-- END check to see if we have an article. --#
 
             #-- END loop over article data --#
@@ -1340,11 +1555,9 @@ class NetworkOutput( ContextTextBase ):
 
         #-- END check to make sure we have a query set. --#
 
-        my_logger.debug( "In " + me + ": end of method: count of qs_OUT = " + str( qs_OUT.count() ) )
-
         return qs_OUT
 
-    #-- END remove_duplicate_article_data() --#
+    #-- END remove_duplicate_article_data_in_python() --#
 
 
     def render_network_data( self, query_set_IN ):
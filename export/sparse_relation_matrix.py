@@ -0,0 +1,275 @@
+from __future__ import unicode_literals
+from __future__ import division
+
+'''
+Copyright 2010-2014 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text.
+
+context_text is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text. If not, see http://www.gnu.org/licenses/.
+'''
+
+__author__="jonathanmorgan"
+__date__ ="$May 1, 2010 6:26:35 PM$"
+
+if __name__ == "__main__":
+    print( "Hello World" )
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+# six imports - support Pythons 2 and 3
+import six
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class SparseRelationMatrix( object ):
+
+    '''
+    Compressed sparse row (CSR) representation of a NetworkDataOutput
+       relation_map.  Rows and columns are indexed by position in the sorted
+       master person list, so the list only needs to be sorted once, and
+       only ties that actually exist are stored:
+       - node_id_list - sorted list of person IDs, one per row/column.
+       - node_id_to_index_dict - map of person ID to position in node_id_list.
+       - row_pointer_list - for row i, ties are stored in positions
+          row_pointer_list[ i ] through row_pointer_list[ i + 1 ] - 1 of the
+          column and value lists (length is node count + 1).
+       - column_index_list - column index of each stored tie.
+       - value_list - tie count of each stored tie.
+    Relations for person IDs that are not in the node list are ignored, just
+       like they are when a dense matrix is rendered.
+    '''
+
+    #---------------------------------------------------------------------------
+    # __init__() method
+    #---------------------------------------------------------------------------
+
+
+    def __init__( self, relation_map_IN = None, person_id_list_IN = None ):
+
+        # declare variables
+        self.node_id_list = []
+        self.node_id_to_index_dict = {}
+        self.row_pointer_list = [ 0 ]
+        self.column_index_list = []
+        self.value_list = []
+
+        # got a person list?
+        if ( person_id_list_IN is not None ):
+
+            # yes - build.
+            self.build( relation_map_IN, person_id_list_IN )
+
+        #-- END check to see if person list passed in. --#
+
+    #-- END method __init__() --#
+
+
+    #---------------------------------------------------------------------------
+    # instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def build( self, relation_map_IN, person_id_list_IN ):
+
+        '''
+        Accepts relation map ( { from_id : { to_id : count } } ) and list of
+           person IDs to include in the network.  Sorts the person list once,
+           maps each ID to its position, then loops over the people in order
+           and stores each person's ties in CSR arrays, with columns in
+           ascending order within each row.  Returns self.
+        '''
+
+        # declare variables
+        relation_map = None
+        node_id_list = None
+        node_id_to_index_dict = None
+        row_pointer_list = None
+        column_index_list = None
+        value_list = None
+        current_index = -1
+        current_person_id = None
+        current_relations = None
+        row_tie_list = None
+        other_person_id = None
+        other_count = None
+        other_index = None
+        row_tie = None
+
+        # initialize
+        relation_map = relation_map_IN
+        if ( relation_map is None ):
+
+            relation_map = {}
+
+        #-- END check to see if relation map. --#
+
+        # sort the person list, then map ID to index.
+        node_id_list = sorted( person_id_list_IN )
+        node_id_to_index_dict = {}
+        for current_index, current_person_id in enumerate( node_id_list ):
+
+            node_id_to_index_dict[ current_person_id ] = current_index
+
+        #-- END loop over sorted person IDs. --#
+
+        # build CSR arrays.
+        row_pointer_list = [ 0 ]
+        column_index_list = []
+        value_list = []
+        for current_person_id in node_id_list:
+
+            # get relations for this person.
+            current_relations = relation_map.get( current_person_id, None )
+            if ( current_relations ):
+
+                # convert ties to ( index, count ) for people in the network.
+                row_tie_list = []
+                for other_person_id, other_count in six.iteritems( current_relations ):
+
+                    other_index = node_id_to_index_dict.get( other_person_id, None )
+                    if ( other_index is not None ):
+
+                        row_tie_list.append( ( other_index, other_count ) )
+
+                    #-- END check to see if other person is in network --#
+
+                #-- END loop over relations --#
+
+                # sort by column index and append.
+                row_tie_list.sort()
+                for row_tie in row_tie_list:
+
+                    column_index_list.append( row_tie[ 0 ] )
+                    value_list.append( row_tie[ 1 ] )
+
+                #-- END loop over ties in row --#
+
+            #-- END check to see if relations --#
+
+            # close out the row.
+            row_pointer_list.append( len( column_index_list ) )
+
+        #-- END loop over people --#
+
+        # store
+        self.node_id_list = node_id_list
+        self.node_id_to_index_dict = node_id_to_index_dict
+        self.row_pointer_list = row_pointer_list
+        self.column_index_list = column_index_list
+        self.value_list = value_list
+
+        return self
+
+    #-- END method build() --#
+
+
+    def get_dense_row( self, row_index_IN ):
+
+        '''
+        Accepts row index, returns list of tie counts for that row with one
+           entry per node (0 where there is no tie), for use by renderers that
+           still output a full square matrix.  Only touches stored ties.
+        '''
+
+        # return reference
+        list_OUT = None
+
+        # declare variables
+        row_start = -1
+        row_end = -1
+        position = -1
+
+        # start with all zeroes.
+        list_OUT = [ 0 ] * len( self.node_id_list )
+
+        # fill in ties.
+        row_start = self.row_pointer_list[ row_index_IN ]
+        row_end = self.row_pointer_list[ row_index_IN + 1 ]
+        for position in six.moves.range( row_start, row_end ):
+
+            list_OUT[ self.column_index_list[ position ] ] = self.value_list[ position ]
+
+        #-- END loop over stored ties --#
+
+        return list_OUT
+
+    #-- END method get_dense_row() --#
+
+
+    def get_edge_count( self ):
+
+        '''
+        Returns number of stored (non-zero) ties.
+        '''
+
+        return len( self.value_list )
+
+    #-- END method get_edge_count() --#
+
+
+    def get_index_for_person_id( self, person_id_IN ):
+
+        '''
+        Returns index of person in sorted node list, or None if not present.
+        '''
+
+        return self.node_id_to_index_dict.get( person_id_IN, None )
+
+    #-- END method get_index_for_person_id() --#
+
+
+    def get_node_count( self ):
+
+        '''
+        Returns number of nodes (rows/columns) in the matrix.
+        '''
+
+        return len( self.node_id_list )
+
+    #-- END method get_node_count() --#
+
+
+    def iterate_edges( self ):
+
+        '''
+        Generator that yields each stored tie as a COO-style tuple of
+           ( row_index, column_index, value ), in row order, with columns
+           ascending within each row.
+        '''
+
+        # declare variables
+        row_pointer_list = None
+        column_index_list = None
+        value_list = None
+        row_index = -1
+        position = -1
+
+        # get arrays.
+        row_pointer_list = self.row_pointer_list
+        column_index_list = self.column_index_list
+        value_list = self.value_list
+
+        # loop over rows.
+        for row_index in six.moves.range( len( self.node_id_list ) ):
+
+            for position in six.moves.range( row_pointer_list[ row_index ], row_pointer_list[ row_index + 1 ] ):
+
+                yield ( row_index, column_index_list[ position ], value_list[ position ] )
+
+            #-- END loop over ties in row --#
+
+        #-- END loop over rows --#
+
+    #-- END method iterate_edges() --#
+
+
+#-- END class SparseRelationMatrix --#
@@ -0,0 +1,465 @@
+from __future__ import unicode_literals
+
+'''
+Copyright 2019-present (2019) Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text.
+
+context_text is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text. If not, see http://www.gnu.org/licenses/.
+'''
+
+# imports
+
+# six - python 2 and 3
+import six
+
+# django
+from django.db import connection
+from django.db import transaction
+from django.utils.text import slugify
+
+# context imports
+from context.models import Entity_Relation
+from context.models import Entity_Relation_Trait
+
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class BulkRelationWriter( object ):
+
+    '''
+    Collects Entity_Relations to create (see add_relation()), then writes them
+       and their traits with bulk_create() in chunks when flush() is called.
+       Works like Entity_Relation.create_entity_relation() - a relation is only
+       created if there isn't already one with the same FROM, TO, THROUGH,
+       type, and match traits - but the check is done against a set built
+       from two queries per chunk rather than a lookup per relation.
+       Relations that already exist are left as they are.
+    '''
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+    DEFAULT_CHUNK_SIZE = 500
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> class methods
+    #---------------------------------------------------------------------------
+
+
+    @classmethod
+    def make_trait_value( cls, value_IN ):
+
+        '''
+        Accepts trait value.  Returns it as it is stored and compared - as a
+           string, or None if None.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        if ( value_IN is not None ):
+
+            value_OUT = six.text_type( value_IN )
+
+        #-- END check to see if None --#
+
+        return value_OUT
+
+    #-- END class method make_trait_value() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> __init__() method
+    #---------------------------------------------------------------------------
+
+
+    def __init__( self, chunk_size_IN = DEFAULT_CHUNK_SIZE ):
+
+        # declare variables
+        self.chunk_size = chunk_size_IN
+
+        # pending relations - list of dictionaries, plus set of keys so we
+        #     don't queue the same relation twice.
+        self.pending_list = []
+        self.pending_key_set = set()
+
+        # stats
+        self.created_count = 0
+        self.existing_count = 0
+        self.trait_count = 0
+
+    #-- END method __init__() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def add_relation( self,
+                      from_IN,
+                      to_IN,
+                      through_IN = None,
+                      type_IN = None,
+                      trait_name_to_value_map_IN = None,
+                      match_trait_dict_IN = None ):
+
+        '''
+        Accepts the same arguments as Entity_Relation.create_entity_relation().
+           Queues the relation to be created on the next flush().  Returns True
+           if queued, False if the same relation was already queued.
+        '''
+
+        # return reference
+        is_queued_OUT = False
+
+        # declare variables
+        relation_key = None
+        pending_dict = None
+
+        relation_key = self.make_relation_key( from_IN.id,
+                                               to_IN.id,
+                                               self.get_id( through_IN ),
+                                               self.get_id( type_IN ),
+                                               match_trait_dict_IN )
+
+        if ( relation_key not in self.pending_key_set ):
+
+            pending_dict = {}
+            pending_dict[ "key" ] = relation_key
+            pending_dict[ "from" ] = from_IN
+            pending_dict[ "to" ] = to_IN
+            pending_dict[ "through" ] = through_IN
+            pending_dict[ "type" ] = type_IN
+            pending_dict[ "traits" ] = trait_name_to_value_map_IN
+            pending_dict[ "match_traits" ] = match_trait_dict_IN
+            self.pending_list.append( pending_dict )
+            self.pending_key_set.add( relation_key )
+            is_queued_OUT = True
+
+        #-- END check to see if already queued --#
+
+        return is_queued_OUT
+
+    #-- END method add_relation() --#
+
+
+    def flush( self ):
+
+        '''
+        Writes pending relations that don't already exist, plus their traits,
+           in chunks of chunk_size.  Returns number of relations created.
+        '''
+
+        # return reference
+        count_OUT = 0
+
+        # declare variables
+        start_index = -1
+        chunk_list = None
+
+        with transaction.atomic():
+
+            for start_index in range( 0, len( self.pending_list ), self.chunk_size ):
+
+                chunk_list = self.pending_list[ start_index : start_index + self.chunk_size ]
+                count_OUT += self.write_chunk( chunk_list )
+
+            #-- END loop over chunks --#
+
+        #-- END with transaction --#
+
+        # reset
+        self.pending_list = []
+        self.pending_key_set = set()
+
+        return count_OUT
+
+    #-- END method flush() --#
+
+
+    def get_existing_key_set( self, pending_list_IN ):
+
+        '''
+        Accepts list of pending relation dictionaries.  Returns the set of
+           their keys that match relations already in the database.  Uses
+           one query for the relations with matching FROM and type, and one
+           for the match traits of those relations.
+        '''
+
+        # return reference
+        key_set_OUT = set()
+
+        # declare variables
+        from_id_set = None
+        type_id_set = None
+        match_name_set = None
+        pending_dict = None
+        relation_qs = None
+        relation_id = None
+        from_id = None
+        to_id = None
+        through_id = None
+        type_id = None
+        base_key = None
+        base_key_to_id_list_dict = None
+        id_to_trait_dict = None
+        trait_qs = None
+        trait_name = None
+        trait_value = None
+        match_trait_dict = None
+        match_name = None
+        match_value = None
+        existing_trait_dict = None
+        is_match = None
+
+        # what do we need to look at?
+        from_id_set = set()
+        type_id_set = set()
+        match_name_set = set()
+        for pending_dict in pending_list_IN:
+
+            from_id_set.add( pending_dict[ "from" ].id )
+            type_id_set.add( self.get_id( pending_dict[ "type" ] ) )
+            if ( pending_dict[ "match_traits" ] is not None ):
+
+                match_name_set.update( pending_dict[ "match_traits" ].keys() )
+
+            #-- END check to see if match traits --#
+
+        #-- END loop over pending --#
+
+        # existing relations, by FROM, TO, THROUGH, and type.
+        base_key_to_id_list_dict = {}
+        relation_qs = Entity_Relation.objects.filter( relation_from_id__in = from_id_set )
+        relation_qs = relation_qs.values_list( "id", "relation_from_id", "relation_to_id", "relation_through_id", "relation_type_id" )
+        for relation_id, from_id, to_id, through_id, type_id in relation_qs:
+
+            if ( type_id in type_id_set ):
+
+                base_key = ( from_id, to_id, through_id, type_id )
+                base_key_to_id_list_dict.setdefault( base_key, [] ).append( relation_id )
+
+            #-- END check to see if type we care about --#
+
+        #-- END loop over relations --#
+
+        # their match traits.
+        id_to_trait_dict = {}
+        if ( ( len( base_key_to_id_list_dict ) > 0 ) and ( len( match_name_set ) > 0 ) ):
+
+            trait_qs = Entity_Relation_Trait.objects.filter( entity_relation__relation_from_id__in = from_id_set,
+                                                             name__in = match_name_set )
+            trait_qs = trait_qs.values_list( "entity_relation_id", "name", "value" )
+            for relation_id, trait_name, trait_value in trait_qs:
+
+                id_to_trait_dict.setdefault( relation_id, {} )[ trait_name ] = trait_value
+
+            #-- END loop over traits --#
+
+        #-- END check to see if we need traits --#
+
+        # which pending relations are already there?
+        for pending_dict in pending_list_IN:
+
+            base_key = pending_dict[ "key" ][ :4 ]
+            match_trait_dict = pending_dict[ "match_traits" ]
+            if ( match_trait_dict is None ):
+
+                match_trait_dict = {}
+
+            #-- END check to see if match traits --#
+
+            for relation_id in base_key_to_id_list_dict.get( base_key, [] ):
+
+                # all match traits present with the same value?
+                existing_trait_dict = id_to_trait_dict.get( relation_id, {} )
+                is_match = True
+                for match_name, match_value in six.iteritems( match_trait_dict ):
+
+                    if ( existing_trait_dict.get( match_name, None ) != self.make_trait_value( match_value ) ):
+
+                        is_match = False
+
+                    #-- END check to see if trait matches --#
+
+                #-- END loop over match traits --#
+
+                if ( is_match == True ):
+
+                    key_set_OUT.add( pending_dict[ "key" ] )
+                    break
+
+                #-- END check to see if match --#
+
+            #-- END loop over existing relations with same base key --#
+
+        #-- END loop over pending --#
+
+        return key_set_OUT
+
+    #-- END method get_existing_key_set() --#
+
+
+    def get_id( self, instance_IN ):
+
+        '''
+        Returns ID of instance passed in, or None if None.
+        '''
+
+        # return reference
+        id_OUT = None
+
+        if ( instance_IN is not None ):
+
+            id_OUT = instance_IN.id
+
+        #-- END check to see if instance --#
+
+        return id_OUT
+
+    #-- END method get_id() --#
+
+
+    def make_relation_key( self, from_id_IN, to_id_IN, through_id_IN, type_id_IN, match_trait_dict_IN = None ):
+
+        '''
+        Returns hashable key for a relation - FROM, TO, THROUGH, and type IDs,
+           then the match traits as a frozenset of ( name, value ) tuples.
+        '''
+
+        # return reference
+        key_OUT = None
+
+        # declare variables
+        trait_pair_set = None
+        trait_name = None
+        trait_value = None
+
+        trait_pair_set = set()
+        if ( match_trait_dict_IN is not None ):
+
+            for trait_name, trait_value in six.iteritems( match_trait_dict_IN ):
+
+                trait_pair_set.add( ( trait_name, self.make_trait_value( trait_value ) ) )
+
+            #-- END loop over match traits --#
+
+        #-- END check to see if match traits --#
+
+        key_OUT = ( from_id_IN, to_id_IN, through_id_IN, type_id_IN, frozenset( trait_pair_set ) )
+
+        return key_OUT
+
+    #-- END method make_relation_key() --#
+
+
+    def write_chunk( self, pending_list_IN ):
+
+        '''
+        Accepts list of pending relation dictionaries.  Creates the ones that
+           don't already exist with bulk_create(), then their traits.  Returns
+           number of relations created.
+        '''
+
+        # return reference
+        count_OUT = 0
+
+        # declare variables
+        existing_key_set = None
+        new_pending_list = None
+        relation_list = None
+        pending_dict = None
+        relation_instance = None
+        trait_list = None
+        trait_name = None
+        trait_value = None
+        trait_instance = None
+
+        existing_key_set = self.get_existing_key_set( pending_list_IN )
+
+        # make relations.
+        new_pending_list = []
+        relation_list = []
+        for pending_dict in pending_list_IN:
+
+            if ( pending_dict[ "key" ] in existing_key_set ):
+
+                self.existing_count += 1
+
+            else:
+
+                relation_instance = Entity_Relation()
+                relation_instance.relation_from = pending_dict[ "from" ]
+                relation_instance.relation_to = pending_dict[ "to" ]
+                relation_instance.relation_through = pending_dict[ "through" ]
+                relation_instance.relation_type = pending_dict[ "type" ]
+                new_pending_list.append( pending_dict )
+                relation_list.append( relation_instance )
+
+            #-- END check to see if exists --#
+
+        #-- END loop over pending --#
+
+        if ( len( relation_list ) > 0 ):
+
+            # need IDs for traits - bulk_create() only sets them if the
+            #     database returns them.
+            if ( connection.features.can_return_rows_from_bulk_insert == True ):
+
+                Entity_Relation.objects.bulk_create( relation_list )
+
+            else:
+
+                for relation_instance in relation_list:
+
+                    relation_instance.save()
+
+                #-- END loop over relations --#
+
+            #-- END check to see if bulk_create() sets IDs --#
+
+            # then traits.
+            trait_list = []
+            for pending_dict, relation_instance in zip( new_pending_list, relation_list ):
+
+                if ( pending_dict[ "traits" ] is not None ):
+
+                    for trait_name, trait_value in six.iteritems( pending_dict[ "traits" ] ):
+
+                        trait_instance = Entity_Relation_Trait()
+                        trait_instance.entity_relation = relation_instance
+                        trait_instance.name = trait_name
+                        trait_instance.slug = slugify( trait_name )
+                        trait_instance.value = self.make_trait_value( trait_value )
+                        trait_list.append( trait_instance )
+
+                    #-- END loop over traits --#
+
+                #-- END check to see if traits --#
+
+            #-- END loop over new relations --#
+
+            Entity_Relation_Trait.objects.bulk_create( trait_list, batch_size = self.chunk_size )
+
+            count_OUT = len( relation_list )
+            self.created_count += count_OUT
+            self.trait_count += len( trait_list )
+
+        #-- END check to see if anything to create --#
+
+        return count_OUT
+
+    #-- END method write_chunk() --#
+
+
+#-- END class BulkRelationWriter --#
@@ -22,6 +22,7 @@ import six
 
 # django imports
 from django.db.models import Avg, Max, Min
+from django.db.models import Prefetch
 from django.db.models.query import QuerySet
 from django.utils.text import slugify
 
@@ -44,6 +45,7 @@ from context_text.article_coding.article_coding import ArticleCoding
 from context_text.article_coding.open_calais_v2.open_calais_v2_article_coder import OpenCalaisV2ArticleCoder
 from context_text.collectors.newsbank.newspapers.GRPB import GRPB
 from context_text.collectors.newsbank.newspapers.DTNB import DTNB
+from context_text.export.to_context_base.bulk_relation_writer import BulkRelationWriter
 from context_text.models import Article
 from context_text.models import Article_Author
 from context_text.models import Article_Data
@@ -100,6 +102,9 @@ class ExportToContext( ContextTextBase ):
     TAG_PREFIX = "export_to_context-"
     TAG_TIMESTAMP_FORMAT = "%Y%m%d-%H%M%S"
     
+    # batched export
+    DEFAULT_BATCH_SIZE = 100
+    
 
     #============================================================================
     # static methods
@@ -190,8 +195,54 @@ class ExportToContext( ContextTextBase ):
 
 
     @classmethod
-    def make_author_entity_list( cls, article_data_IN ):
+    def get_person_entity( cls, person_IN, entity_cache_IN = None ):
+        
+        '''
+        Accepts a Person and an optional dictionary of person IDs to entities.
+            If the person's entity is in the dictionary, returns it.  If not,
+            creates it with create_person_entity(), stores it in the
+            dictionary (if one was passed in), and returns it.
+        '''
         
+        # return reference
+        entity_OUT = None
+        
+        # declare variables
+        person_id = None
+        
+        # got a cache?
+        if ( entity_cache_IN is not None ):
+        
+            person_id = person_IN.id
+            entity_OUT = entity_cache_IN.get( person_id, None )
+            if ( entity_OUT is None ):
+            
+                entity_OUT = cls.create_person_entity( person_IN )
+                entity_cache_IN[ person_id ] = entity_OUT
+                
+            #-- END check to see if already created --#
+        
+        else:
+        
+            # no cache - just create.
+            entity_OUT = cls.create_person_entity( person_IN )
+        
+        #-- END check to see if cache --#
+        
+        return entity_OUT
+        
+    #-- END class method get_person_entity() --#
+    
+
+    @classmethod
+    def make_author_entity_list( cls, article_data_IN, entity_cache_IN = None ):
+        
+        '''
+        Accepts Article_Data, returns list of entities for its authors.  If
+            dictionary of person IDs to entities passed in, uses it to create
+            each person's entity only once (see get_person_entity()).
+        '''
+
         # return reference
         list_OUT = None
         
@@ -220,7 +271,7 @@ class ExportToContext( ContextTextBase ):
                 current_person = article_author.person
 
                 # create their entity.
-                person_entity = cls.create_person_entity( current_person )
+                person_entity = cls.get_person_entity( current_person, entity_cache_IN )
                 
                 # store entity for making relations.
                 author_entity_list.append( person_entity )
@@ -245,8 +296,16 @@ class ExportToContext( ContextTextBase ):
     
 
     @classmethod
-    def make_relation_trait_dict( cls, article_entity_IN = None, article_data_IN = None ):
+    def make_relation_trait_dict( cls, article_entity_IN = None, article_data_IN = None, identifier_type_IN = None ):
         
+        '''
+        Builds dictionary of traits for relations based on an article - the
+            article entity's pub_date and sourcenet ID identifier, plus coder
+            information from Article_Data if passed in.  If the
+            Entity_Identifier_Type for the sourcenet article ID is passed in,
+            uses it rather than looking it up.
+        '''
+
         # return reference
         dict_OUT = None
         
@@ -275,7 +334,13 @@ class ExportToContext( ContextTextBase ):
             
             # pull in identifier with sourcenet django ID
             identifier_name = Article.ENTITY_ID_TYPE_ARTICLE_SOURCENET_ID
-            identifier_type = Entity_Identifier_Type.get_type_for_name( identifier_name )
+            identifier_type = identifier_type_IN
+            if ( identifier_type is None ):
+
+                identifier_type = Entity_Identifier_Type.get_type_for_name( identifier_name )
+
+            #-- END check to see if identifier type passed in --#
+
             entity_identifier = article_entity_IN.get_identifier( identifier_name, id_type_IN = identifier_type )
             identifier_uuid = entity_identifier.uuid
             trait_dict[ identifier_name ] = identifier_uuid
@@ -335,8 +400,15 @@ class ExportToContext( ContextTextBase ):
     
 
     @classmethod
-    def make_subject_entity_list( cls, article_data_IN, limit_to_sources_IN = False, include_sources_in_subjects_IN = True ):
+    def make_subject_entity_list( cls, article_data_IN, limit_to_sources_IN = False, include_sources_in_subjects_IN = True, entity_cache_IN = None ):
         
+        '''
+        Accepts Article_Data, returns list of entities for its subjects, or
+            just its sources if limit_to_sources_IN is True.  If dictionary of
+            person IDs to entities passed in, uses it to create each person's
+            entity only once (see get_person_entity()).
+        '''
+
         # return reference
         list_OUT = None
         
@@ -366,7 +438,7 @@ class ExportToContext( ContextTextBase ):
                 subject_type = article_subject.subject_type
 
                 # create their entity.
-                person_entity = cls.create_person_entity( current_person )
+                person_entity = cls.get_person_entity( current_person, entity_cache_IN )
                 
                 # store based on subject_type so we can make relations.
                 if ( subject_type == Article_Subject.SUBJECT_TYPE_MENTIONED ):
@@ -453,6 +525,14 @@ class ExportToContext( ContextTextBase ):
         #self.logging_filemode = self.LOGGING_DEFAULT_FILEMODE
         self.progress_interval = 100
         
+        # batched export - see process_articles_in_batches().
+        self.batch_size = self.DEFAULT_BATCH_SIZE
+        self.relation_writer = None
+        
+        # caches - relation types by slug, identifier types by name.
+        self.relation_type_dict = {}
+        self.identifier_type_dict = {}
+        
     #-- END method __init__() --#
 
 
@@ -519,12 +599,14 @@ class ExportToContext( ContextTextBase ):
         
             # traits to filter relations on.
             # - include traits for pub_date and django/sourcenet ID of article.
-            relation_trait_filter_dict = self.make_relation_trait_dict( article_entity_IN = article_entity_IN )
+            relation_trait_filter_dict = self.make_relation_trait_dict( article_entity_IN = article_entity_IN,
+                                                                        identifier_type_IN = self.get_identifier_type( Article.ENTITY_ID_TYPE_ARTICLE_SOURCENET_ID ) )
             
             # traits for actual relations, both article info and coder
             #     information from Article_Data.
             trait_dict = self.make_relation_trait_dict( article_entity_IN = article_entity_IN,
-                                                        article_data_IN = article_data_IN )            
+                                                        article_data_IN = article_data_IN,
+                                                        identifier_type_IN = self.get_identifier_type( Article.ENTITY_ID_TYPE_ARTICLE_SOURCENET_ID ) )            
                     
             #------------------------------------------------------------------#
             # ! ----> Entity_Relation_Type slugs - FROM ARTICLE
@@ -532,7 +614,7 @@ class ExportToContext( ContextTextBase ):
 
             # ! --------> CONTEXT_RELATION_TYPE_SLUG_AUTHOR = "author"    # FROM article TO reporter.
             relation_type_slug = ContextTextBase.CONTEXT_RELATION_TYPE_SLUG_AUTHOR
-            relation_type = Entity_Relation_Type.objects.get( slug = relation_type_slug )
+            relation_type = self.get_relation_type( relation_type_slug )
             to_entity_list = author_entity_list_IN
 
             # got entities in list?
@@ -542,11 +624,11 @@ class ExportToContext( ContextTextBase ):
                 for to_entity in to_entity_list:
                 
                     # create relation if no match of FROM, TO, type, and pub_date.
-                    relation = Entity_Relation.create_entity_relation( from_IN = from_entity,
-                                                                       to_IN = to_entity,
-                                                                       type_IN = relation_type,
-                                                                       trait_name_to_value_map_IN = trait_dict,
-                                                                       match_trait_dict_IN = relation_trait_filter_dict )
+                    relation = self.create_entity_relation( from_IN = from_entity,
+                                                            to_IN = to_entity,
+                                                            type_IN = relation_type,
+                                                            trait_name_to_value_map_IN = trait_dict,
+                                                            match_trait_dict_IN = relation_trait_filter_dict )
                 
                 #-- END loop over TO entities --#
             
@@ -554,7 +636,7 @@ class ExportToContext( ContextTextBase ):
 
             # ! --------> CONTEXT_RELATION_TYPE_SLUG_SOURCE = "source"    # FROM article TO source person.
             relation_type_slug = ContextTextBase.CONTEXT_RELATION_TYPE_SLUG_SOURCE
-            relation_type = Entity_Relation_Type.objects.get( slug = relation_type_slug )
+            relation_type = self.get_relation_type( relation_type_slug )
             to_entity_list = source_entity_list_IN
 
             # got entities in list?
@@ -564,11 +646,11 @@ class ExportToContext( ContextTextBase ):
                 for to_entity in to_entity_list:
                 
                     # create relation if no match of FROM, TO, type, and pub_date.
-                    relation = Entity_Relation.create_entity_relation( from_IN = from_entity,
-                                                                       to_IN = to_entity,
-                                                                       type_IN = relation_type,
-                                                                       trait_name_to_value_map_IN = trait_dict,
-                                                                       match_trait_dict_IN = relation_trait_filter_dict )
+                    relation = self.create_entity_relation( from_IN = from_entity,
+                                                            to_IN = to_entity,
+                                                            type_IN = relation_type,
+                                                            trait_name_to_value_map_IN = trait_dict,
+                                                            match_trait_dict_IN = relation_trait_filter_dict )
                 
                 #-- END loop over TO entities --#
             
@@ -577,7 +659,7 @@ class ExportToContext( ContextTextBase ):
 
             # ! --------> CONTEXT_RELATION_TYPE_SLUG_SUBJECT = "subject"  # FROM article TO subject person.
             relation_type_slug = ContextTextBase.CONTEXT_RELATION_TYPE_SLUG_SUBJECT
-            relation_type = Entity_Relation_Type.objects.get( slug = relation_type_slug )
+            relation_type = self.get_relation_type( relation_type_slug )
             to_entity_list = subject_entity_list_IN
 
             # got entities in list?
@@ -587,11 +669,11 @@ class ExportToContext( ContextTextBase ):
                 for to_entity in to_entity_list:
                 
                     # create relation if no match of FROM, TO, type, and pub_date.
-                    relation = Entity_Relation.create_entity_relation( from_IN = from_entity,
-                                                                       to_IN = to_entity,
-                                                                       type_IN = relation_type,
-                                                                       trait_name_to_value_map_IN = trait_dict,
-                                                                       match_trait_dict_IN = relation_trait_filter_dict )
+                    relation = self.create_entity_relation( from_IN = from_entity,
+                                                            to_IN = to_entity,
+                                                            type_IN = relation_type,
+                                                            trait_name_to_value_map_IN = trait_dict,
+                                                            match_trait_dict_IN = relation_trait_filter_dict )
                 
                 #-- END loop over TO entities --#
             
@@ -613,7 +695,7 @@ class ExportToContext( ContextTextBase ):
             
                     # ! --------> CONTEXT_RELATION_TYPE_SLUG_MENTIONED = "mentioned"  # FROM reporter/author TO subject THROUGH article (includes subjects and sources).
                     relation_type_slug = ContextTextBase.CONTEXT_RELATION_TYPE_SLUG_MENTIONED
-                    relation_type = Entity_Relation_Type.objects.get( slug = relation_type_slug )
+                    relation_type = self.get_relation_type( relation_type_slug )
                     to_entity_list = subject_entity_list_IN
         
                     # got entities in TO list?
@@ -623,12 +705,12 @@ class ExportToContext( ContextTextBase ):
                         for to_entity in to_entity_list:
                         
                             # create relation if no match of FROM, TO, THROUGH, type, and pub_date.
-                            relation = Entity_Relation.create_entity_relation( from_IN = from_entity,
-                                                                               to_IN = to_entity,
-                                                                               through_IN = through_entity,
-                                                                               type_IN = relation_type,
-                                                                               trait_name_to_value_map_IN = trait_dict,
-                                                                               match_trait_dict_IN = relation_trait_filter_dict )
+                            relation = self.create_entity_relation( from_IN = from_entity,
+                                                                    to_IN = to_entity,
+                                                                    through_IN = through_entity,
+                                                                    type_IN = relation_type,
+                                                                    trait_name_to_value_map_IN = trait_dict,
+                                                                    match_trait_dict_IN = relation_trait_filter_dict )
                         
                         #-- END loop over TO entities --#
                     
@@ -636,7 +718,7 @@ class ExportToContext( ContextTextBase ):
 
                     # ! --------> CONTEXT_RELATION_TYPE_SLUG_QUOTED = "quoted"  # FROM reporter TO source THROUGH article.
                     relation_type_slug = ContextTextBase.CONTEXT_RELATION_TYPE_SLUG_QUOTED
-                    relation_type = Entity_Relation_Type.objects.get( slug = relation_type_slug )
+                    relation_type = self.get_relation_type( relation_type_slug )
                     to_entity_list = source_entity_list_IN
         
                     # got entities in TO list?
@@ -646,12 +728,12 @@ class ExportToContext( ContextTextBase ):
                         for to_entity in to_entity_list:
                         
                             # create relation if no match of FROM, TO, THROUGH, type, and pub_date.
-                            relation = Entity_Relation.create_entity_relation( from_IN = from_entity,
-                                                                               to_IN = to_entity,
-                                                                               through_IN = through_entity,
-                                                                               type_IN = relation_type,
-                                                                               trait_name_to_value_map_IN = trait_dict,
-                                                                               match_trait_dict_IN = relation_trait_filter_dict )
+                            relation = self.create_entity_relation( from_IN = from_entity,
+                                                                    to_IN = to_entity,
+                                                                    through_IN = through_entity,
+                                                                    type_IN = relation_type,
+                                                                    trait_name_to_value_map_IN = trait_dict,
+                                                                    match_trait_dict_IN = relation_trait_filter_dict )
                         
                         #-- END loop over TO entities --#
                     
@@ -659,7 +741,7 @@ class ExportToContext( ContextTextBase ):
 
                     # ! --------> CONTEXT_RELATION_TYPE_SLUG_SHARED_BYLINE = "shared_byline"  # FROM author TO author THROUGH article.
                     relation_type_slug = ContextTextBase.CONTEXT_RELATION_TYPE_SLUG_SHARED_BYLINE
-                    relation_type = Entity_Relation_Type.objects.get( slug = relation_type_slug )
+                    relation_type = self.get_relation_type( relation_type_slug )
                     to_entity_list = author_entity_list_IN
         
                     # got people in list?
@@ -675,12 +757,12 @@ class ExportToContext( ContextTextBase ):
                             if ( from_entity_id != to_entity_id ):
                         
                                 # create relation if no match of FROM, TO, THROUGH, type, and pub_date.
-                                relation = Entity_Relation.create_entity_relation( from_IN = from_entity,
-                                                                                   to_IN = to_entity,
-                                                                                   through_IN = through_entity,
-                                                                                   type_IN = relation_type,
-                                                                                   trait_name_to_value_map_IN = trait_dict,
-                                                                                   match_trait_dict_IN = relation_trait_filter_dict )
+                                relation = self.create_entity_relation( from_IN = from_entity,
+                                                                        to_IN = to_entity,
+                                                                        through_IN = through_entity,
+                                                                        type_IN = relation_type,
+                                                                        trait_name_to_value_map_IN = trait_dict,
+                                                                        match_trait_dict_IN = relation_trait_filter_dict )
                                                                                    
                             #-- END check to make sure we don't make self-ties --#
                         
@@ -708,7 +790,7 @@ class ExportToContext( ContextTextBase ):
             
                     # ! --------> CONTEXT_RELATION_TYPE_SLUG_SAME_ARTICLE_SOURCES = "same_article_sources"    # FROM source person TO source person THROUGH article.
                     relation_type_slug = ContextTextBase.CONTEXT_RELATION_TYPE_SLUG_SAME_ARTICLE_SOURCES
-                    relation_type = Entity_Relation_Type.objects.get( slug = relation_type_slug )
+                    relation_type = self.get_relation_type( relation_type_slug )
                     to_entity_list = source_entity_list_IN
         
                     # got people in list?
@@ -724,12 +806,12 @@ class ExportToContext( ContextTextBase ):
                             if ( from_entity_id != to_entity_id ):
                         
                                 # create relation if no match of FROM, TO, THROUGH, type, and pub_date.
-                                relation = Entity_Relation.create_entity_relation( from_IN = from_entity,
-                                                                                   to_IN = to_entity,
-                                                                                   through_IN = through_entity,
-                                                                                   type_IN = relation_type,
-                                                                                   trait_name_to_value_map_IN = trait_dict,
-                                                                                   match_trait_dict_IN = relation_trait_filter_dict )
+                                relation = self.create_entity_relation( from_IN = from_entity,
+                                                                        to_IN = to_entity,
+                                                                        through_IN = through_entity,
+                                                                        type_IN = relation_type,
+                                                                        trait_name_to_value_map_IN = trait_dict,
+                                                                        match_trait_dict_IN = relation_trait_filter_dict )
                                                                                    
                             #-- END check to make sure we don't make self-ties --#
                         
@@ -757,7 +839,7 @@ class ExportToContext( ContextTextBase ):
             
                     # ! --------> CONTEXT_RELATION_TYPE_SLUG_SAME_ARTICLE_SUBJECTS = "same_article_subjects"  # FROM subject person TO subject person THROUGH article (includes subjects and sources).
                     relation_type_slug = ContextTextBase.CONTEXT_RELATION_TYPE_SLUG_SAME_ARTICLE_SUBJECTS
-                    relation_type = Entity_Relation_Type.objects.get( slug = relation_type_slug )
+                    relation_type = self.get_relation_type( relation_type_slug )
                     to_entity_list = subject_entity_list_IN
         
                     # got people in list?
@@ -773,12 +855,12 @@ class ExportToContext( ContextTextBase ):
                             if ( from_entity_id != to_entity_id ):
                         
                                 # create relation if no match of FROM, TO, THROUGH, type, and pub_date.
-                                relation = Entity_Relation.create_entity_relation( from_IN = from_entity,
-                                                                                   to_IN = to_entity,
-                                                                                   through_IN = through_entity,
-                                                                                   type_IN = relation_type,
-                                                                                   trait_name_to_value_map_IN = trait_dict,
-                                                                                   match_trait_dict_IN = relation_trait_filter_dict )
+                                relation = self.create_entity_relation( from_IN = from_entity,
+                                                                        to_IN = to_entity,
+                                                                        through_IN = through_entity,
+                                                                        type_IN = relation_type,
+                                                                        trait_name_to_value_map_IN = trait_dict,
+                                                                        match_trait_dict_IN = relation_trait_filter_dict )
                                                                                    
                             #-- END check to make sure we don't make self-ties --#
                         
@@ -806,6 +888,57 @@ class ExportToContext( ContextTextBase ):
     #-- END method create_article_relations() --#
 
 
+    def create_entity_relation( self,
+                                from_IN,
+                                to_IN,
+                                through_IN = None,
+                                type_IN = None,
+                                trait_name_to_value_map_IN = None,
+                                match_trait_dict_IN = None ):
+        
+        '''
+        Creates a relation if there isn't already a match on FROM, TO,
+            THROUGH, type, and match traits.  If a relation_writer is set
+            (see process_articles_in_batches()), queues the relation there to
+            be written in bulk and returns None.  If not, calls
+            Entity_Relation.create_entity_relation() and returns the relation.
+        '''
+        
+        # return reference
+        relation_OUT = None
+        
+        # declare variables
+        relation_writer = None
+        
+        # batched?
+        relation_writer = self.relation_writer
+        if ( relation_writer is not None ):
+        
+            # queue it.
+            relation_writer.add_relation( from_IN,
+                                          to_IN,
+                                          through_IN = through_IN,
+                                          type_IN = type_IN,
+                                          trait_name_to_value_map_IN = trait_name_to_value_map_IN,
+                                          match_trait_dict_IN = match_trait_dict_IN )
+            
+        else:
+        
+            # create now.
+            relation_OUT = Entity_Relation.create_entity_relation( from_IN = from_IN,
+                                                                   to_IN = to_IN,
+                                                                   through_IN = through_IN,
+                                                                   type_IN = type_IN,
+                                                                   trait_name_to_value_map_IN = trait_name_to_value_map_IN,
+                                                                   match_trait_dict_IN = match_trait_dict_IN )
+            
+        #-- END check to see if batched --#
+        
+        return relation_OUT
+        
+    #-- END method create_entity_relation() --#
+
+
     def create_newspaper_relations( self,
                                     newspaper_entity_IN,
                                     article_entity_IN,
@@ -848,7 +981,8 @@ class ExportToContext( ContextTextBase ):
         
             # shared traits for these relations, also used to filter.
             # - includes article's pub_date and sourcenet article ID.
-            trait_dict = self.make_relation_trait_dict( article_entity_IN = article_entity_IN )
+            trait_dict = self.make_relation_trait_dict( article_entity_IN = article_entity_IN,
+                                                        identifier_type_IN = self.get_identifier_type( Article.ENTITY_ID_TYPE_ARTICLE_SOURCENET_ID ) )
             relation_trait_filter_dict = trait_dict
                         
             # ! ----> "newspaper_article"    # FROM newspaper TO article.
@@ -862,14 +996,14 @@ class ExportToContext( ContextTextBase ):
 
                 # get type
                 relation_type_slug = ContextTextBase.CONTEXT_RELATION_TYPE_SLUG_NEWSPAPER_ARTICLE
-                relation_type = Entity_Relation_Type.objects.get( slug = relation_type_slug )
+                relation_type = self.get_relation_type( relation_type_slug )
                 
                 # create relation if no match of FROM, TO, type, pub_date, and article ID.
-                relation = Entity_Relation.create_entity_relation( from_IN = from_entity,
-                                                                   to_IN = article_entity_IN,
-                                                                   type_IN = relation_type,
-                                                                   trait_name_to_value_map_IN = trait_dict,
-                                                                   match_trait_dict_IN = relation_trait_filter_dict )                
+                relation = self.create_entity_relation( from_IN = from_entity,
+                                                        to_IN = article_entity_IN,
+                                                        type_IN = relation_type,
+                                                        trait_name_to_value_map_IN = trait_dict,
+                                                        match_trait_dict_IN = relation_trait_filter_dict )                
             
             #-- END check to see if article entity. --#
             
@@ -879,7 +1013,7 @@ class ExportToContext( ContextTextBase ):
             from_entity = newspaper_entity_IN
             through_entity = article_entity_IN
             relation_type_slug = ContextTextBase.CONTEXT_RELATION_TYPE_SLUG_NEWSPAPER_REPORTER
-            relation_type = Entity_Relation_Type.objects.get( slug = relation_type_slug )
+            relation_type = self.get_relation_type( relation_type_slug )
             to_entity_list = author_entity_list_IN
 
             # got people in list?
@@ -889,12 +1023,12 @@ class ExportToContext( ContextTextBase ):
                 for to_entity in to_entity_list:
                 
                     # create relation if no match of FROM, TO, type, and pub_date.
-                    relation = Entity_Relation.create_entity_relation( from_IN = from_entity,
-                                                                       to_IN = to_entity,
-                                                                       through_IN = through_entity,
-                                                                       type_IN = relation_type,
-                                                                       trait_name_to_value_map_IN = trait_dict,
-                                                                       match_trait_dict_IN = relation_trait_filter_dict )
+                    relation = self.create_entity_relation( from_IN = from_entity,
+                                                            to_IN = to_entity,
+                                                            through_IN = through_entity,
+                                                            type_IN = relation_type,
+                                                            trait_name_to_value_map_IN = trait_dict,
+                                                            match_trait_dict_IN = relation_trait_filter_dict )
                 
                 #-- END loop over TO entities --#
             
@@ -906,7 +1040,7 @@ class ExportToContext( ContextTextBase ):
             from_entity = newspaper_entity_IN
             through_entity = article_entity_IN
             relation_type_slug = ContextTextBase.CONTEXT_RELATION_TYPE_SLUG_NEWSPAPER_SUBJECT
-            relation_type = Entity_Relation_Type.objects.get( slug = relation_type_slug )
+            relation_type = self.get_relation_type( relation_type_slug )
             to_entity_list = subject_entity_list_IN
 
             # got people in list?
@@ -916,12 +1050,12 @@ class ExportToContext( ContextTextBase ):
                 for to_entity in to_entity_list:
                 
                     # create relation if no match of FROM, TO, type, and pub_date.
-                    relation = Entity_Relation.create_entity_relation( from_IN = from_entity,
-                                                                       to_IN = to_entity,
-                                                                       through_IN = through_entity,
-                                                                       type_IN = relation_type,
-                                                                       trait_name_to_value_map_IN = trait_dict,
-                                                                       match_trait_dict_IN = relation_trait_filter_dict )
+                    relation = self.create_entity_relation( from_IN = from_entity,
+                                                            to_IN = to_entity,
+                                                            through_IN = through_entity,
+                                                            type_IN = relation_type,
+                                                            trait_name_to_value_map_IN = trait_dict,
+                                                            match_trait_dict_IN = relation_trait_filter_dict )
                 
                 #-- END loop over TO entities --#
             
@@ -933,7 +1067,7 @@ class ExportToContext( ContextTextBase ):
             from_entity = newspaper_entity_IN
             through_entity = article_entity_IN
             relation_type_slug = ContextTextBase.CONTEXT_RELATION_TYPE_SLUG_NEWSPAPER_SOURCE
-            relation_type = Entity_Relation_Type.objects.get( slug = relation_type_slug )
+            relation_type = self.get_relation_type( relation_type_slug )
             to_entity_list = source_entity_list_IN
 
             # got people in list?
@@ -943,12 +1077,12 @@ class ExportToContext( ContextTextBase ):
                 for to_entity in to_entity_list:
                 
                     # create relation if no match of FROM, TO, type, and pub_date.
-                    relation = Entity_Relation.create_entity_relation( from_IN = from_entity,
-                                                                       to_IN = to_entity,
-                                                                       through_IN = through_entity,
-                                                                       type_IN = relation_type,
-                                                                       trait_name_to_value_map_IN = trait_dict,
-                                                                       match_trait_dict_IN = relation_trait_filter_dict )
+                    relation = self.create_entity_relation( from_IN = from_entity,
+                                                            to_IN = to_entity,
+                                                            through_IN = through_entity,
+                                                            type_IN = relation_type,
+                                                            trait_name_to_value_map_IN = trait_dict,
+                                                            match_trait_dict_IN = relation_trait_filter_dict )
                 
                 #-- END loop over TO entities --#
             
@@ -974,7 +1108,16 @@ class ExportToContext( ContextTextBase ):
                           article_data_IN,
                           author_entity_list_IN = None,
                           subject_entity_list_IN = None,
-                          source_entity_list_IN = None ):
+                          source_entity_list_IN = None,
+                          article_entity_IN = None,
+                          newspaper_entity_IN = None ):
+
+        '''
+        Creates newspaper-based and article-based relations for the article in
+            the Article_Data passed in.  If the article's entity or its
+            newspaper's entity are passed in, uses them rather than retrieving
+            them again.
+        '''
                           
         # return reference
         status_OUT = None
@@ -999,12 +1142,23 @@ class ExportToContext( ContextTextBase ):
         
             # first, get article entity.
             article_instance = article_data_IN.article
-            article_entity = article_instance.get_entity()
+            article_entity = article_entity_IN
+            if ( article_entity is None ):
+
+                article_entity = article_instance.get_entity()
+
+            #-- END check to see if article entity passed in --#
+
             if ( article_entity is not None ):
             
                 # next, get newspaper entity.
                 newspaper_instance = article_instance.newspaper
-                if ( newspaper_instance is not None ):
+                if ( newspaper_entity_IN is not None ):
+
+                    # passed in - use it.
+                    newspaper_entity = newspaper_entity_IN
+
+                elif ( newspaper_instance is not None ):
                 
                     # got a newspaper - try to retrieve entity.
                     newspaper_entity = newspaper_instance.get_entity()
@@ -1106,6 +1260,172 @@ class ExportToContext( ContextTextBase ):
     #-- END method create_relations() --#
 
 
+    def get_identifier_type( self, name_IN ):
+        
+        '''
+        Accepts Entity_Identifier_Type name.  Returns the type, looking it up
+            the first time and then remembering it.
+        '''
+        
+        # return reference
+        type_OUT = None
+        
+        # already looked up?
+        if ( name_IN in self.identifier_type_dict ):
+        
+            type_OUT = self.identifier_type_dict[ name_IN ]
+            
+        else:
+        
+            type_OUT = Entity_Identifier_Type.get_type_for_name( name_IN )
+            self.identifier_type_dict[ name_IN ] = type_OUT
+            
+        #-- END check to see if already looked up --#
+        
+        return type_OUT
+        
+    #-- END method get_identifier_type() --#
+
+
+    def get_relation_type( self, slug_IN ):
+        
+        '''
+        Accepts Entity_Relation_Type slug.  Returns the type, looking it up the
+            first time and then remembering it.  Raises
+            Entity_Relation_Type.DoesNotExist if there isn't one, like
+            Entity_Relation_Type.objects.get() does.
+        '''
+        
+        # return reference
+        type_OUT = None
+        
+        # already looked up?
+        type_OUT = self.relation_type_dict.get( slug_IN, None )
+        if ( type_OUT is None ):
+        
+            type_OUT = Entity_Relation_Type.objects.get( slug = slug_IN )
+            self.relation_type_dict[ slug_IN ] = type_OUT
+            
+        #-- END check to see if already looked up --#
+        
+        return type_OUT
+        
+    #-- END method get_relation_type() --#
+
+
+    def load_relation_types( self ):
+        
+        '''
+        Loads all Entity_Relation_Types into the cache get_relation_type()
+            uses, in one query.  Returns number loaded.
+        '''
+        
+        # return reference
+        count_OUT = 0
+        
+        # declare variables
+        relation_type = None
+        
+        for relation_type in Entity_Relation_Type.objects.all():
+        
+            self.relation_type_dict[ relation_type.slug ] = relation_type
+            count_OUT += 1
+            
+        #-- END loop over relation types --#
+        
+        return count_OUT
+        
+    #-- END method load_relation_types() --#
+
+
+    def output_progress( self, article_counter_IN, article_count_IN, start_time_IN, previous_time_IN ):
+        
+        '''
+        Outputs a progress update - articles processed so far, and total and
+            per-period elapsed time and averages - then garbage collects.
+            Returns the current time, to pass back in as previous_time_IN next
+            time.
+        '''
+        
+        # return reference
+        current_time_OUT = None
+        
+        # declare variables
+        progress_interval = None
+        elapsed_time = None
+        elapsed_this_period = None
+        average_time = None
+        average_this_period = None
+        
+        progress_interval = self.progress_interval
+        current_time_OUT = datetime.datetime.now()
+        elapsed_time = current_time_OUT - start_time_IN
+        elapsed_this_period = current_time_OUT - previous_time_IN
+        average_time = elapsed_time / article_counter_IN
+        average_this_period = elapsed_this_period / progress_interval
+        print( "\n----> Processed {} of {} articles at {}".format( article_counter_IN, article_count_IN, current_time_OUT ) )
+        print( "Total elapsed: {} ( average: {} )".format( elapsed_time, average_time ) )
+        print( "Period elapsed: {} ( average: {} )".format( elapsed_this_period, average_this_period ) )
+        
+        # also, garbage collect
+        gc.collect()
+        
+        return current_time_OUT
+        
+    #-- END method output_progress() --#
+
+
+    def output_summary( self,
+                        status_IN,
+                        good_counter_IN,
+                        more_than_one_counter_IN,
+                        zero_counter_IN,
+                        unexpected_counter_IN ):
+        
+        '''
+        Outputs summary of Article_Data counts from processing articles, adds
+            it to the StatusContainer passed in, and sets the status to error
+            if any counts other than "good" are > 0.
+        '''
+        
+        # declare variables
+        log_message = None
+        status_message = None
+        status_code = None
+        
+        log_message = "\nSummary:"
+        status_message = "{}".format( log_message )
+        self.output_message( log_message, do_print_IN = True, log_level_code_IN = logging.INFO )        
+        log_message = "- good count: {}".format( good_counter_IN )
+        status_message += "\n{}".format( log_message )
+        self.output_message( log_message, do_print_IN = True, log_level_code_IN = logging.INFO )        
+        log_message = "- > 1 count: {}".format( more_than_one_counter_IN )
+        status_message += "\n{}".format( log_message )
+        self.output_message( log_message, do_print_IN = True, log_level_code_IN = logging.INFO )        
+        log_message = "- 0 count: {}".format( zero_counter_IN )
+        status_message += "\n{}".format( log_message )
+        self.output_message( log_message, do_print_IN = True, log_level_code_IN = logging.INFO )        
+        log_message = "- unexpected count: {}".format( unexpected_counter_IN )
+        status_message += "\n{}".format( log_message )
+        self.output_message( log_message, do_print_IN = True, log_level_code_IN = logging.INFO )
+        
+        # update status
+        status_IN.add_message( status_message )
+        
+        # if any counts other than "good" are > 1, set to error code.
+        if ( ( more_than_one_counter_IN > 0 )
+            or ( zero_counter_IN > 0 )
+            or ( unexpected_counter_IN > 0 ) ):
+            
+            # ERROR.
+            status_code = StatusContainer.STATUS_CODE_ERROR
+            status_IN.set_status_code( status_code )
+
+        #-- END check to see if any non-"good" --#            
+        
+    #-- END method output_summary() --#
+
+
     def process_articles( self, article_qs_IN, tag_articles_IN = False ):
         
         # return reference
@@ -1299,18 +1619,7 @@ class ExportToContext( ContextTextBase ):
             # output an update every progress_interval articles.
             if ( ( article_counter % progress_interval ) == 0 ):
             
-                previous_time = current_time
-                current_time = datetime.datetime.now()
-                elapsed_time = current_time - start_time
-                elapsed_this_period = current_time - previous_time
-                average_time = elapsed_time / article_counter
-                average_this_period = elapsed_this_period / progress_interval
-                print( "\n----> Processed {} of {} articles at {}".format( article_counter, article_count, current_time ) )
-                print( "Total elapsed: {} ( average: {} )".format( elapsed_time, average_time ) )
-                print( "Period elapsed: {} ( average: {} )".format( elapsed_this_period, average_this_period ) )
-                
-                # also, garbage collect
-                gc.collect()
+                current_time = self.output_progress( article_counter, article_count, start_time, current_time )
             
             #-- END check to see if we output progress update. --#
             
@@ -1324,39 +1633,286 @@ class ExportToContext( ContextTextBase ):
     
         #-- END loop over articles --#
         
-        log_message = "\nSummary:"
-        status_message = "{}".format( log_message )
-        self.output_message( log_message, do_print_IN = True, log_level_code_IN = logging.INFO )        
-        log_message = "- good count: {}".format( good_counter )
-        status_message += "\n{}".format( log_message )
-        self.output_message( log_message, do_print_IN = True, log_level_code_IN = logging.INFO )        
-        log_message = "- > 1 count: {}".format( more_than_one_counter )
-        status_message += "\n{}".format( log_message )
-        self.output_message( log_message, do_print_IN = True, log_level_code_IN = logging.INFO )        
-        log_message = "- 0 count: {}".format( zero_counter )
-        status_message += "\n{}".format( log_message )
-        self.output_message( log_message, do_print_IN = True, log_level_code_IN = logging.INFO )        
-        log_message = "- unexpected count: {}".format( unexpected_counter )
-        status_message += "\n{}".format( log_message )
-        self.output_message( log_message, do_print_IN = True, log_level_code_IN = logging.INFO )
+        # summary, and error status if any counts other than "good".
+        self.output_summary( status_OUT, good_counter, more_than_one_counter, zero_counter, unexpected_counter )
         
-        # update status
-        status_OUT.add_message( status_message )
+        return status_OUT
+    
+    #-- END method process_articles() --#
+
+
+    def process_articles_in_batches( self, article_qs_IN, tag_articles_IN = False, batch_size_IN = None ):
         
-        # if any counts other than "good" are > 1, set to error code.
-        if ( ( more_than_one_counter > 0 )
-            or ( zero_counter > 0 )
-            or ( unexpected_counter > 0 ) ):
+        '''
+        Batched version of process_articles() - same results, fewer queries.
+            Works through the articles batch_size at a time (self.batch_size
+            if batch_size_IN not passed in):
+            - relation types and the article ID identifier type are looked up
+                once, before the first batch.
+            - each batch's articles, their OpenCalais V2 Article_Data, and the
+                Article_Data's authors and subjects with their people are
+                loaded in a few queries.
+            - each person's and newspaper's entity is created once for the
+                whole run, not once per article they appear in.
+            - relations are collected in a BulkRelationWriter and written with
+                bulk_create() at the end of each batch, checked against
+                existing relations by set lookup.
+            Progress is output every progress_interval articles, as in
+            process_articles().
+        '''
+        
+        # return reference
+        status_OUT = None
+        
+        # declare variables
+        me = "process_articles_in_batches"
+        status_message = None
+        status_code = None
+        article_tag_value = None
+        batch_size = None
+        article_id_list = None
+        article_count = None
+        progress_interval = None
+        coder_type_list = None
+        article_data_q = None
+        batch_start = None
+        batch_id_list = None
+        article_dict = None
+        article_data_qs = None
+        article_data_dict = None
+        article_data_list = None
+        article_data_count = None
+        article_data_instance = None
+        current_article_id = None
+        current_article = None
+        article_entity = None
+        current_newspaper = None
+        newspaper_entity = None
+        log_message = None
+        
+        # declare variables - entities and relations
+        person_entity_dict = None
+        newspaper_entity_dict = None
+        author_entity_list = None
+        subject_entity_list = None
+        source_entity_list = None
+        result_status = None
+        result_status_is_error = None
+        relation_writer = None
+        
+        # declare variables - auditing
+        article_counter = None
+        good_counter = None
+        more_than_one_counter = None
+        zero_counter = None
+        unexpected_counter = None
+        start_time = None
+        current_time = None
+        
+        # init status container
+        status_OUT = StatusContainer()
+        status_OUT.set_status_code( StatusContainer.STATUS_CODE_SUCCESS )
+        
+        # init start time
+        start_time = datetime.datetime.now()
+        current_time = start_time
+        
+        # initialization
+        batch_size = batch_size_IN
+        if ( ( batch_size is None ) or ( batch_size <= 0 ) ):
+        
+            batch_size = self.batch_size
             
-            # ERROR.
-            status_code = StatusContainer.STATUS_CODE_ERROR
-            status_OUT.set_status_code( status_code )
+        #-- END check to see if batch size passed in --#
+        
+        article_id_list = list( article_qs_IN.values_list( "id", flat = True ) )
+        article_count = len( article_id_list )
+        
+        # initialization - retrieve a Q to filter Article_Data on automated
+        #     coder with type for OpenCalais V2.
+        coder_type_list = []
+        coder_type_list.append( OpenCalaisV2ArticleCoder.CONFIG_APPLICATION )
+        article_data_q = Article_Data.create_q_only_automated( coder_type_list )
+        
+        # initialization - are we tagging article?
+        if ( tag_articles_IN == True ):
+        
+            # yes.  Create tag value - TAG_PREFIX + timestamp.
+            article_tag_value = self.TAG_PREFIX + start_time.strftime( self.TAG_TIMESTAMP_FORMAT )
+            
+        #-- END check of tagging articles. --#
+        
+        # initialization - caches
+        self.load_relation_types()
+        self.get_identifier_type( Article.ENTITY_ID_TYPE_ARTICLE_SOURCENET_ID )
+        person_entity_dict = {}
+        newspaper_entity_dict = {}
+        relation_writer = BulkRelationWriter()
+        self.relation_writer = relation_writer
 
-        #-- END check to see if any non-"good" --#            
+        # loop over articles
+        article_counter = 0
+        progress_interval = self.progress_interval
+        good_counter = 0
+        more_than_one_counter = 0
+        zero_counter = 0
+        unexpected_counter = 0
+        try:
+        
+            for batch_start in range( 0, article_count, batch_size ):
+            
+                batch_id_list = article_id_list[ batch_start : batch_start + batch_size ]
+                
+                # ! ----> load the batch
+                article_dict = Article.objects.select_related( "newspaper" ).in_bulk( batch_id_list )
+                
+                # Article_Data by automated coder, type OpenCalais V2, with
+                #     authors and subjects.
+                article_data_qs = Article_Data.objects.filter( article_id__in = batch_id_list )
+                article_data_qs = article_data_qs.filter( article_data_q )
+                article_data_qs = article_data_qs.select_related( "coder" )
+                article_data_qs = article_data_qs.prefetch_related( Prefetch( "article_author_set", queryset = Article_Author.objects.select_related( "person" ) ),
+                                                                    Prefetch( "article_subject_set", queryset = Article_Subject.objects.select_related( "person" ) ) )
+                article_data_dict = {}
+                for article_data_instance in article_data_qs:
+                
+                    article_data_dict.setdefault( article_data_instance.article_id, [] ).append( article_data_instance )
+                    
+                #-- END loop over Article_Data --#
+                
+                # ! ----> process each article
+                for current_article_id in batch_id_list:
+                
+                    article_counter += 1
+                    current_article = article_dict.get( current_article_id, None )
+                    article_data_list = article_data_dict.get( current_article_id, [] )
+                    article_data_count = len( article_data_list )
+                    
+                    # got 1?
+                    if ( ( current_article is not None ) and ( article_data_count == 1 ) ):
+                    
+                        # got one.  Process.
+                        good_counter += 1
+                        article_data_instance = article_data_list[ 0 ]
+                        
+                        # use the Article we already loaded.
+                        article_data_instance.article = current_article
+
+                        # ! --------> Article and Newspaper
+                        article_entity = self.create_article_entity( current_article )
+                        
+                        current_newspaper = current_article.newspaper
+                        newspaper_entity = None
+                        if ( current_newspaper is not None ):
+                        
+                            if ( current_newspaper.id not in newspaper_entity_dict ):
+                            
+                                newspaper_entity_dict[ current_newspaper.id ] = current_newspaper.get_entity()
+                                
+                            #-- END check to see if newspaper entity already retrieved --#
+                            
+                            newspaper_entity = newspaper_entity_dict[ current_newspaper.id ]
+                            
+                        #-- END check to see if newspaper --#
+                        
+                        # ! --------> Authors, Subjects, and Sources (Person)
+                        author_entity_list = self.make_author_entity_list( article_data_instance,
+                                                                           entity_cache_IN = person_entity_dict )
+                        subject_entity_list = self.make_subject_entity_list( article_data_instance,
+                                                                             limit_to_sources_IN = False,
+                                                                             entity_cache_IN = person_entity_dict )
+                        source_entity_list = self.make_subject_entity_list( article_data_instance,
+                                                                            limit_to_sources_IN = True,
+                                                                            entity_cache_IN = person_entity_dict )
+                        
+                        # ! --------> queue relations
+                        result_status = self.create_relations( article_data_instance,
+                                                               author_entity_list,
+                                                               subject_entity_list,
+                                                               source_entity_list,
+                                                               article_entity_IN = article_entity,
+                                                               newspaper_entity_IN = newspaper_entity )
+                        result_status_is_error = result_status.is_error()
+                        
+                        # errors?
+                        if ( result_status_is_error == True ):
+                        
+                            # set status to error, add a message, then nest the
+                            #     StatusContainer instance.
+                            status_message = "ERROR - errors creating relations.  See nested StatusContainer for more details."
+                            self.output_message( status_message, do_print_IN = True, log_level_code_IN = logging.ERROR )
+                            status_code = StatusContainer.STATUS_CODE_ERROR
+                            status_OUT.set_status_code( status_code )
+                            status_OUT.add_message( status_message )
+                            status_OUT.add_status_container( result_status )
+                            
+                        #-- END check to see if errors. --#
+                    
+                    elif ( current_article is None ):
+                    
+                        # article went away between getting IDs and now.
+                        unexpected_counter += 1
+                        log_message = "ERROR - Article: {} - not found when loading batch.  Moving to next article.".format( current_article_id )
+                        self.output_message( log_message, do_print_IN = True, log_level_code_IN = logging.INFO )
+                        status_OUT.add_message( log_message )
+                    
+                    elif ( article_data_count > 1 ):
+                    
+                        # more than one.  Hmmm.
+                        more_than_one_counter += 1
+                        log_message = "ERROR - Article: {} - More than one Article_Data instance found ( {} ).  Moving to next article.".format( current_article_id, article_data_count )
+                        self.output_message( log_message, do_print_IN = True, log_level_code_IN = logging.INFO )
+                        status_OUT.add_message( log_message )
+                    
+                    else:
+                    
+                        # none.  ERROR.  move on.
+                        zero_counter += 1
+                        log_message = "ERROR - Article: {} - No Article_Data instances found ( {} ).  Moving to next article.".format( current_article_id, article_data_count )
+                        self.output_message( log_message, do_print_IN = True, log_level_code_IN = logging.INFO )        
+                        status_OUT.add_message( log_message )
+                    
+                    #-- END check to see how many Article_Data. --#
+                    
+                    # output an update every progress_interval articles.
+                    if ( ( article_counter % progress_interval ) == 0 ):
+                    
+                        current_time = self.output_progress( article_counter, article_count, start_time, current_time )
+                    
+                    #-- END check to see if we output progress update. --#
+                    
+                    # do we tag each article we process?
+                    if ( ( tag_articles_IN == True ) and ( current_article is not None ) ):
+                    
+                        # yes.  Apply tag value.
+                        current_article.tags.add( article_tag_value )
+                        
+                    #-- END check of tagging articles. --#
+                
+                #-- END loop over articles in batch --#
+                
+                # ! ----> write the batch's relations.
+                relation_writer.flush()
+            
+            #-- END loop over batches --#
+        
+        finally:
+        
+            # back to creating relations one at a time.
+            self.relation_writer = None
+        
+        #-- END try/finally around batches --#
+        
+        log_message = "- relations created: {}; already present: {}; traits created: {}".format( relation_writer.created_count, relation_writer.existing_count, relation_writer.trait_count )
+        self.output_message( log_message, do_print_IN = True, log_level_code_IN = logging.INFO )
+        status_OUT.add_message( log_message )
+
+        # summary, and error status if any counts other than "good".
+        self.output_summary( status_OUT, good_counter, more_than_one_counter, zero_counter, unexpected_counter )
         
         return status_OUT
     
-    #-- END method process_articles() --#
+    #-- END method process_articles_in_batches() --#
 
 
     def set_article_uuid_id_type( self, value_IN ):
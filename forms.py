@@ -125,6 +125,7 @@ from context_text.models import Article_Subject
 from context_text.models import Newspaper
 from context_text.models import Person
 from context_text.models import Topic
+from context_text.shared.person_search import PersonSearch
 
 
 #===============================================================================
@@ -416,6 +417,9 @@ class ArticleOutputTypeSelectForm( forms.Form ):
     # and a place to specify the text you want pre-pended to each column header.
     header_prefix = forms.CharField( required = False, label = "Column Header Prefix" )
 
+    # stream the CSV back as a file instead of rendering it in the page?
+    csv_download_as_file = forms.ChoiceField( required = False, label = "Download CSV As File?", choices = NetworkOutput.CHOICES_YES_OR_NO_LIST )
+
 #-- END Form class ArticleOutputTypeSelectForm --#
 
 
@@ -467,6 +471,9 @@ class ArticleSelectForm( forms.Form ):
     
     # allow duplicate articles?
     allow_duplicate_articles = forms.ChoiceField( required = False, choices = NetworkOutput.CHOICES_YES_OR_NO_LIST )
+
+    # if not, remove duplicates in python rather than in the database?
+    deduplicate_in_python = forms.ChoiceField( required = False, label = "Remove Duplicates in Python?", choices = NetworkOutput.CHOICES_YES_OR_NO_LIST )
     
 #-- END Form class ArticleSelectForm --#
 
@@ -486,6 +493,12 @@ class NetworkOutputForm( forms.Form ):
     # include render details? 
     network_include_render_details = forms.ChoiceField( required = False, label = "Include Render Details?", choices = NetworkOutput.CHOICES_YES_OR_NO_LIST )
 
+    # build network from precomputed per-Article_Data ties?
+    network_use_precomputed_ties = forms.ChoiceField( required = False, label = "Use Precomputed Ties?", choices = NetworkOutput.CHOICES_YES_OR_NO_LIST )
+
+    # directory on the server for data formats that write files (binary).
+    network_output_directory = forms.CharField( required = False, label = "Output Directory (binary formats)" )
+
     # just contains the format you want the network data outputted as.
     output_type = forms.ChoiceField( label = "Data Format", choices = NetworkOutput.NETWORK_OUTPUT_TYPE_CHOICES_LIST, initial = NetworkOutput.NETWORK_OUTPUT_TYPE_DEFAULT )
 
@@ -510,11 +523,16 @@ class PersonLookupTypeForm( FormParent ):
     
     PERSON_LOOKUP_TYPE_GENERAL_QUERY = "general_query"
     PERSON_LOOKUP_TYPE_EXACT_QUERY = "exact_query"
+    PERSON_LOOKUP_TYPE_RANKED_SEARCH = "ranked_search"
+    
+    # max results for ranked search.
+    PERSON_LOOKUP_RANKED_SEARCH_LIMIT = 200
     
     # action choices
     PERSON_LOOKUP_TYPE_CHOICES = (
         ( PERSON_LOOKUP_TYPE_GENERAL_QUERY, "General Query (match what is entered, ignore anything not entered)" ),
         ( PERSON_LOOKUP_TYPE_EXACT_QUERY, "Exact Query (match exactly what is entered, even empty fields)" ),
+        ( PERSON_LOOKUP_TYPE_RANKED_SEARCH, "Ranked Search (similar names, best matches first)" ),
     )
     lookup_type = forms.ChoiceField( required = True, choices = PERSON_LOOKUP_TYPE_CHOICES )
 
@@ -849,6 +867,16 @@ class PersonLookupByNameForm( ModelFormParent ):
                                                              do_partial_match_IN = do_partial_match,
                                                              qs_IN = person_qs )
             
+            elif ( lookup_type == PersonLookupTypeForm.PERSON_LOOKUP_TYPE_RANKED_SEARCH ):
+            
+                debug_message = "performing ranked search"
+                LoggingHelper.output_debug( debug_message, method_IN = me, logger_name_IN = my_logger_name )
+
+                # typo-tolerant, ranked - see context_text.shared.person_search.
+                person_qs = PersonSearch.get_backend().search_queryset( name_string,
+                                                                        limit_IN = PersonLookupTypeForm.PERSON_LOOKUP_RANKED_SEARCH_LIMIT,
+                                                                        qs_IN = person_qs )
+
             elif ( lookup_type == PersonLookupTypeForm.PERSON_LOOKUP_TYPE_EXACT_QUERY ):
             
                 debug_message = "performing exact query"
@@ -945,7 +973,7 @@ class Person_MergeActionForm( FormParent ):
         ( PERSON_MERGE_ACTION_LOOKUP, "Lookup (no changes)" ),
         ( PERSON_MERGE_ACTION_MERGE_CODING, "Merge Coding --> FROM 1 / INTO 1" ),
         ( PERSON_MERGE_ACTION_UN_MERGE_CODING, "Un-Merge Coding --> FROM = person we want coding to once again refer to; INTO (optional) = only undo records updated to refer to this person." ),
-        #( PERSON_MERGE_ACTION_MERGE_ALL, "Merge All Person Data" ),
+        ( PERSON_MERGE_ACTION_MERGE_ALL, "Merge All Person Data --> FROM n / INTO 1" ),
     )
     
     # other constants
@@ -1020,6 +1048,9 @@ class PersonSelectForm( forms.Form ):
     # allow duplicate articles?
     person_allow_duplicate_articles = forms.ChoiceField( required = False, choices = NetworkOutput.CHOICES_YES_OR_NO_LIST )
 
+    # if not, remove duplicates in python rather than in the database?
+    person_deduplicate_in_python = forms.ChoiceField( required = False, label = "Remove Duplicates in Python?", choices = NetworkOutput.CHOICES_YES_OR_NO_LIST )
+
 #-- end Form class PersonSelectForm --#
 
 
@@ -0,0 +1,104 @@
+from __future__ import unicode_literals
+
+'''
+Copyright 2010-2016 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text.
+
+context_text is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text. If not, see http://www.gnu.org/licenses/.
+
+Management command that builds the precomputed network tie rows
+   (Article_Data_Network_Tie) for existing Article_Data, in batches, with one
+   transaction and bulk_create() per batch.  Ties are kept up to date as
+   authors and sources are saved, so this is only needed for data coded
+   before migration 0034 added the table, or after Article_Author or
+   Article_Subject rows are written without save() - bulk_create(), update(),
+   or raw SQL.  Until it has been run, networks built with
+   "network_use_precomputed_ties" fall back to building ties from authors and
+   sources.
+
+Usage:
+
+    python manage.py backfill_network_ties --batch-size 1000
+    python manage.py backfill_network_ties --missing-only
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+
+# django imports
+from django.core.management.base import BaseCommand
+
+# context_text imports
+from context_text.models import Article_Data
+from context_text.models import Article_Data_Network_Tie
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class Command( BaseCommand ):
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+
+    help = "Build the precomputed network tie rows for existing Article_Data, in batches."
+
+    # defaults
+    DEFAULT_BATCH_SIZE = 1000
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def add_arguments( self, parser ):
+
+        parser.add_argument( "--batch-size", type = int, default = self.DEFAULT_BATCH_SIZE, help = "Article_Data to rebuild ties for at a time." )
+        parser.add_argument( "--start-id", type = int, default = 0, help = "Only rebuild ties for Article_Data with ID greater than or equal to this." )
+        parser.add_argument( "--missing-only", action = "store_true", help = "Only build ties for Article_Data that have authors but no ties yet." )
+
+    #-- END method add_arguments() --#
+
+
+    def handle( self, *args, **options ):
+
+        # declare variables
+        batch_size = None
+        start_id = None
+        article_data_qs = None
+        result_dict = None
+
+        batch_size = max( 1, options[ "batch_size" ] )
+        start_id = options[ "start_id" ]
+
+        article_data_qs = Article_Data.objects.all()
+        if ( start_id > 0 ):
+
+            article_data_qs = article_data_qs.filter( id__gte = start_id )
+
+        #-- END check to see if start ID --#
+
+        if ( options[ "missing_only" ] == True ):
+
+            article_data_qs = Article_Data_Network_Tie.get_article_data_missing_ties_qs( article_data_qs )
+
+        #-- END check to see if only missing --#
+
+        result_dict = Article_Data_Network_Tie.update_in_batches( article_data_qs, batch_size_IN = batch_size )
+        self.stdout.write( "Checked {} Article_Data, created {} network tie rows.".format( result_dict[ "checked" ], result_dict[ "created" ] ) )
+
+    #-- END method handle() --#
+
+
+#-- END class Command --#
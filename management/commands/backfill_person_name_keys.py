@@ -0,0 +1,91 @@
+from __future__ import unicode_literals
+
+'''
+Copyright 2010-2016 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text.
+
+context_text is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text. If not, see http://www.gnu.org/licenses/.
+
+Management command that brings the name key columns on Person (first_name_key,
+   last_name_key, etc. - see Person.update_name_keys()) up to date with each
+   person's name parts, in batches, with one bulk_update() per batch.  Keys are
+   set on every save() and by migration 0036, so this is only needed after
+   people are written without save() - bulk_create(), update(), or raw SQL.
+
+Usage:
+
+    python manage.py backfill_person_name_keys --batch-size 1000
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+
+# django imports
+from django.core.management.base import BaseCommand
+
+# context_text imports
+from context_text.models import Person
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class Command( BaseCommand ):
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+
+    help = "Update the name key columns on Person from each person's name parts, in batches."
+
+    # defaults
+    DEFAULT_BATCH_SIZE = 1000
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def add_arguments( self, parser ):
+
+        parser.add_argument( "--batch-size", type = int, default = self.DEFAULT_BATCH_SIZE, help = "People to read and update at a time." )
+        parser.add_argument( "--start-id", type = int, default = 0, help = "Only check people with ID greater than or equal to this." )
+
+    #-- END method add_arguments() --#
+
+
+    def handle( self, *args, **options ):
+
+        # declare variables
+        batch_size = None
+        start_id = None
+        person_qs = None
+        result_dict = None
+
+        batch_size = max( 1, options[ "batch_size" ] )
+        start_id = options[ "start_id" ]
+
+        person_qs = Person.objects.all()
+        if ( start_id > 0 ):
+
+            person_qs = person_qs.filter( id__gte = start_id )
+
+        #-- END check to see if start ID --#
+
+        result_dict = Person.update_name_keys_in_batches( person_qs, batch_size_IN = batch_size )
+        self.stdout.write( "Checked {} people, updated name keys for {}.".format( result_dict[ "checked" ], result_dict[ "updated" ] ) )
+
+    #-- END method handle() --#
+
+
+#-- END class Command --#
@@ -0,0 +1,201 @@
+from __future__ import unicode_literals
+from __future__ import division
+
+'''
+Copyright 2010-2016 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text.
+
+context_text is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text. If not, see http://www.gnu.org/licenses/.
+
+Management command that times the coding and export hot paths - OpenCalais
+   and manual coding, network and CSV output, export to context, and article
+   filtering - on a synthetic corpus, and writes timings and query counts as
+   JSON (see context_text.benchmark.benchmark_runner).  Save the JSON from
+   one commit and pass it to --compare-to on the next to see what changed.
+   The corpus is built inside a transaction that is rolled back unless you
+   pass --keep-corpus.
+
+Usage:
+
+    python manage.py benchmark_hot_paths --articles 1000 --output before.json
+    python manage.py benchmark_hot_paths --articles 1000 --output after.json --compare-to before.json
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+
+# python base imports
+import json
+
+# django imports
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+# context_text imports
+from context_text.benchmark.benchmark_runner import BenchmarkRunner
+from context_text.data.synthetic_corpus import SyntheticCorpus
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class Command( BaseCommand ):
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+
+    help = "Time coding and export hot paths on a synthetic corpus, with query counts, and write the results as JSON."
+
+    # defaults
+    DEFAULT_ARTICLE_COUNT = 200
+    DEFAULT_PERSON_COUNT = 200
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def add_arguments( self, parser ):
+
+        parser.add_argument( "--articles", type = int, default = self.DEFAULT_ARTICLE_COUNT, help = "Synthetic articles to create." )
+        parser.add_argument( "--persons", type = int, default = self.DEFAULT_PERSON_COUNT, help = "Synthetic people to create." )
+        parser.add_argument( "--newspapers", type = int, default = SyntheticCorpus.DEFAULT_NEWSPAPER_COUNT, help = "Synthetic newspapers to create." )
+        parser.add_argument( "--seed", type = int, default = SyntheticCorpus.DEFAULT_SEED, help = "Seed for the synthetic corpus." )
+        parser.add_argument( "--repeat", type = int, default = BenchmarkRunner.DEFAULT_REPEAT_COUNT, help = "Runs per scenario (median is reported)." )
+        parser.add_argument( "--coding-articles", type = int, default = BenchmarkRunner.DEFAULT_CODING_ARTICLE_COUNT, help = "Articles the coding and export scenarios process." )
+        parser.add_argument( "--scenario", action = "append", default = None, help = "Scenario name or name prefix to run (repeat for more).  Default: all." )
+        parser.add_argument( "--list", action = "store_true", default = False, help = "List scenario names and exit." )
+        parser.add_argument( "--output", default = None, help = "File to write JSON results to.  Default: stdout." )
+        parser.add_argument( "--compare-to", default = None, help = "JSON results from an earlier run to compare against." )
+        parser.add_argument( "--keep-corpus", action = "store_true", default = False, help = "Keep the synthetic corpus when done." )
+
+    #-- END method add_arguments() --#
+
+
+    def handle( self, *args, **options ):
+
+        # declare variables
+        my_corpus = None
+        my_runner = None
+        scenario_tuple = None
+        result_dict = None
+        result_json = ""
+        output_file = None
+        compare_file = None
+        compare_list = None
+
+        # just list?
+        if ( options[ "list" ] == True ):
+
+            for scenario_tuple in BenchmarkRunner( None ).get_scenario_list():
+
+                self.stdout.write( scenario_tuple[ 0 ] )
+
+            #-- END loop over scenarios --#
+
+        else:
+
+            with transaction.atomic():
+
+                my_corpus = SyntheticCorpus( article_count_IN = options[ "articles" ], newspaper_count_IN = options[ "newspapers" ], person_count_IN = options[ "persons" ], seed_IN = options[ "seed" ] )
+                self.stderr.write( "Synthetic corpus: {}".format( my_corpus.create() ) )
+
+                my_runner = BenchmarkRunner( my_corpus, repeat_count_IN = options[ "repeat" ], coding_article_count_IN = options[ "coding_articles" ] )
+                try:
+
+                    result_dict = my_runner.run( scenario_name_list_IN = options[ "scenario" ] )
+
+                finally:
+
+                    my_runner.cleanup()
+
+                #-- END try...finally around run --#
+
+                # keep corpus?
+                if ( options[ "keep_corpus" ] == False ):
+
+                    transaction.set_rollback( True )
+
+                #-- END check to see if keep corpus --#
+
+            #-- END with transaction --#
+
+            # output
+            result_json = BenchmarkRunner.to_json( result_dict )
+            if ( options[ "output" ] is not None ):
+
+                with open( options[ "output" ], "w" ) as output_file:
+
+                    output_file.write( result_json )
+
+                #-- END with output file --#
+
+            else:
+
+                self.stdout.write( result_json )
+
+            #-- END check to see where output goes --#
+
+            # compare?
+            if ( options[ "compare_to" ] is not None ):
+
+                with open( options[ "compare_to" ] ) as compare_file:
+
+                    compare_list = BenchmarkRunner.compare_results( json.load( compare_file ), result_dict )
+
+                #-- END with compare file --#
+
+                self.output_comparison( compare_list )
+
+            #-- END check to see if compare --#
+
+        #-- END check to see if just listing --#
+
+    #-- END method handle() --#
+
+
+    def output_comparison( self, compare_list_IN ):
+
+        '''
+        Writes the comparison from BenchmarkRunner.compare_results() to stderr,
+            so it doesn't end up in JSON written to stdout.
+        '''
+
+        # declare variables
+        current_compare = None
+        ratio_string = ""
+
+        self.stderr.write( "\n==> median ms and queries, old --> new\n" )
+        for current_compare in compare_list_IN:
+
+            ratio_string = "n/a"
+            if ( current_compare[ "median_ratio" ] is not None ):
+
+                ratio_string = "{:.2f}x".format( current_compare[ "median_ratio" ] )
+
+            #-- END check to see if ratio --#
+
+            self.stderr.write( "- {}: {:.2f} --> {:.2f} ms ({}); {} --> {} queries".format( current_compare[ "name" ],
+                                                                                          current_compare[ "old_median_ms" ] or 0.0,
+                                                                                          current_compare[ "new_median_ms" ] or 0.0,
+                                                                                          ratio_string,
+                                                                                          current_compare[ "old_query_count" ],
+                                                                                          current_compare[ "new_query_count" ] ) )
+
+        #-- END loop over comparisons --#
+
+    #-- END method output_comparison() --#
+
+
+#-- END class Command --#
@@ -0,0 +1,371 @@
+from __future__ import unicode_literals
+from __future__ import division
+
+'''
+Copyright 2010-2016 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text.
+
+context_text is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text. If not, see http://www.gnu.org/licenses/.
+
+Management command that measures PersonAutocomplete latency - p50, p90, and
+   p99 per request - for each available PersonSearch backend and for the
+   Person.find_person_from_name() partial match the autocomplete used before.
+   Requests replay typing sampled names one keystroke at a time, plus one
+   typo per name.  Builds a synthetic table of people first (see
+   context_text.data.synthetic_corpus), inside a transaction that is rolled
+   back unless you pass --keep-corpus.
+
+Usage:
+
+    python manage.py benchmark_person_search --persons 100000
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+
+# python base imports
+import math
+import random
+import timeit
+
+# django imports
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+# context_text imports
+from context_text.data.synthetic_corpus import SyntheticCorpus
+from context_text.models import Person
+from context_text.shared.person_search import NGramPersonSearchBackend
+from context_text.shared.person_search import PersonSearch
+from context_text.shared.person_search import PersonSearchBackend
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class Command( BaseCommand ):
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+
+    help = "Measure p50/p99 PersonAutocomplete search latency for each PersonSearch backend, on a synthetic table of people."
+
+    # defaults
+    DEFAULT_PERSON_COUNT = 100000
+    DEFAULT_NAME_COUNT = 50
+    DEFAULT_MIN_KEYSTROKES = 2
+
+    # label for the pre-PersonSearch lookup.
+    BASELINE_LABEL = "find_person_from_name (partial)"
+
+    # percentiles to report.
+    PERCENTILE_LIST = [ 50, 90, 99 ]
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> class methods
+    #---------------------------------------------------------------------------
+
+
+    @classmethod
+    def get_percentile( cls, sorted_value_list_IN, percentile_IN ):
+
+        '''
+        Accepts sorted list of values and percentile (0 to 100).  Returns the
+            nearest-rank percentile, or None if the list is empty.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        rank_index = -1
+
+        if ( len( sorted_value_list_IN ) > 0 ):
+
+            rank_index = max( 0, int( math.ceil( percentile_IN / 100 * len( sorted_value_list_IN ) ) ) - 1 )
+            value_OUT = sorted_value_list_IN[ rank_index ]
+
+        #-- END check to see if any values --#
+
+        return value_OUT
+
+    #-- END class method get_percentile() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def add_arguments( self, parser ):
+
+        parser.add_argument( "--persons", type = int, default = self.DEFAULT_PERSON_COUNT, help = "Build a synthetic table with this many people first (0 - use people already in the database)." )
+        parser.add_argument( "--seed", type = int, default = SyntheticCorpus.DEFAULT_SEED, help = "Seed for synthetic people and sampled names." )
+        parser.add_argument( "--names", type = int, default = self.DEFAULT_NAME_COUNT, help = "Names to type, one keystroke at a time." )
+        parser.add_argument( "--min-keystrokes", type = int, default = self.DEFAULT_MIN_KEYSTROKES, help = "Keystrokes before the first request." )
+        parser.add_argument( "--limit", type = int, default = PersonSearchBackend.DEFAULT_RESULT_LIMIT, help = "Results per request." )
+        parser.add_argument( "--backend", action = "append", default = None, help = "Backend to measure (repeat for more).  Default: every available backend." )
+        parser.add_argument( "--no-baseline", action = "store_true", default = False, help = "Don't measure find_person_from_name()." )
+        parser.add_argument( "--keep-corpus", action = "store_true", default = False, help = "Keep synthetic people when done." )
+
+    #-- END method add_arguments() --#
+
+
+    def get_query_list( self, name_count_IN, min_keystrokes_IN, seed_IN ):
+
+        '''
+        Samples name_count_IN people.  Returns list of the search strings the
+            autocomplete would get while someone types each "first last" name
+            - every prefix at least min_keystrokes_IN long - plus the name with
+            two letters of the last name swapped.
+        '''
+
+        # return reference
+        list_OUT = []
+
+        # declare variables
+        my_random = None
+        person_id_list = None
+        name_list = None
+        first_name = None
+        last_name = None
+        full_name = None
+        char_index = -1
+        swap_index = -1
+
+        my_random = random.Random( seed_IN )
+        person_id_list = list( Person.objects.values_list( "id", flat = True ) )
+        person_id_list = my_random.sample( person_id_list, min( name_count_IN, len( person_id_list ) ) )
+        name_list = list( Person.objects.filter( id__in = person_id_list ).order_by( "id" ).values_list( "first_name", "last_name" ) )
+        for first_name, last_name in name_list:
+
+            full_name = "{} {}".format( first_name, last_name ).strip()
+            for char_index in range( min_keystrokes_IN, len( full_name ) + 1 ):
+
+                list_OUT.append( full_name[ : char_index ] )
+
+            #-- END loop over keystrokes --#
+
+            # typo
+            if ( len( last_name ) > 2 ):
+
+                swap_index = my_random.randrange( len( last_name ) - 1 )
+                list_OUT.append( "{} {}{}{}{}".format( first_name, last_name[ : swap_index ], last_name[ swap_index + 1 ], last_name[ swap_index ], last_name[ swap_index + 2 : ] ) )
+
+            #-- END check to see if long enough for typo --#
+
+        #-- END loop over names --#
+
+        return list_OUT
+
+    #-- END method get_query_list() --#
+
+
+    def handle( self, *args, **options ):
+
+        # declare variables
+        person_count_IN = -1
+        my_corpus = None
+        query_list = None
+        backend_name_list = None
+        current_backend_class = None
+        result_list = None
+
+        person_count_IN = options[ "persons" ]
+        result_list = []
+
+        with transaction.atomic():
+
+            # synthetic people?
+            if ( person_count_IN > 0 ):
+
+                my_corpus = SyntheticCorpus( article_count_IN = 0, newspaper_count_IN = 1, person_count_IN = person_count_IN, seed_IN = options[ "seed" ] )
+                self.stdout.write( "Synthetic corpus: {}".format( my_corpus.create() ) )
+
+            #-- END check to see if synthetic people --#
+
+            query_list = self.get_query_list( options[ "names" ], options[ "min_keystrokes" ], options[ "seed" ] )
+            self.stdout.write( "{} people, {} requests.".format( Person.objects.count(), len( query_list ) ) )
+
+            # backends
+            backend_name_list = options[ "backend" ]
+            if ( backend_name_list is None ):
+
+                backend_name_list = [ current_backend_class.BACKEND_NAME for current_backend_class in PersonSearch.BACKEND_CLASS_LIST if ( current_backend_class.is_available() == True ) ]
+
+            #-- END check to see if backends passed in --#
+
+            for backend_name in backend_name_list:
+
+                result_list.append( self.run_backend( PersonSearch.get_backend( backend_name ), query_list, options[ "limit" ] ) )
+
+            #-- END loop over backends --#
+
+            # baseline
+            if ( options[ "no_baseline" ] == False ):
+
+                result_list.append( self.run_baseline( query_list, options[ "limit" ] ) )
+
+            #-- END check to see if baseline --#
+
+            # keep corpus?
+            if ( ( my_corpus is not None ) and ( options[ "keep_corpus" ] == False ) ):
+
+                transaction.set_rollback( True )
+
+                # don't leave rolled-back people in the n-gram index.
+                PersonSearch.get_backend( NGramPersonSearchBackend.BACKEND_NAME ).clear()
+
+            #-- END check to see if keep corpus --#
+
+        #-- END with transaction --#
+
+        self.output_results( result_list )
+
+    #-- END method handle() --#
+
+
+    def make_result( self, label_IN, time_list_IN, build_ms_IN = None ):
+
+        '''
+        Accepts label, list of request times in seconds, and optional index
+            build time in milliseconds.  Returns result dictionary - label,
+            request count, build time, and mean, max, and percentile latency
+            in milliseconds.
+        '''
+
+        # return reference
+        dict_OUT = {}
+
+        # declare variables
+        ms_list = None
+        percentile = None
+
+        ms_list = sorted( [ current_time * 1000 for current_time in time_list_IN ] )
+        dict_OUT[ "label" ] = label_IN
+        dict_OUT[ "request_count" ] = len( ms_list )
+        dict_OUT[ "build_ms" ] = build_ms_IN
+        dict_OUT[ "mean_ms" ] = ( sum( ms_list ) / len( ms_list ) ) if ( len( ms_list ) > 0 ) else None
+        dict_OUT[ "max_ms" ] = ms_list[ -1 ] if ( len( ms_list ) > 0 ) else None
+        for percentile in self.PERCENTILE_LIST:
+
+            dict_OUT[ "p{}_ms".format( percentile ) ] = self.get_percentile( ms_list, percentile )
+
+        #-- END loop over percentiles --#
+
+        return dict_OUT
+
+    #-- END method make_result() --#
+
+
+    def output_results( self, result_list_IN ):
+
+        '''
+        Writes a report of the result dictionaries in result_list_IN to stdout.
+        '''
+
+        # declare variables
+        current_result = None
+        line_string = ""
+        percentile = None
+
+        self.stdout.write( "\n==> latency per request, ms\n" )
+        for current_result in result_list_IN:
+
+            line_string = "- {}: {} requests;".format( current_result[ "label" ], current_result[ "request_count" ] )
+            for percentile in self.PERCENTILE_LIST:
+
+                line_string += " p{} {:.2f};".format( percentile, current_result[ "p{}_ms".format( percentile ) ] or 0.0 )
+
+            #-- END loop over percentiles --#
+
+            line_string += " max {:.2f}; mean {:.2f}".format( current_result[ "max_ms" ] or 0.0, current_result[ "mean_ms" ] or 0.0 )
+            if ( current_result[ "build_ms" ] is not None ):
+
+                line_string += "; index build {:.2f}".format( current_result[ "build_ms" ] )
+
+            #-- END check to see if build time --#
+
+            self.stdout.write( line_string )
+
+        #-- END loop over results --#
+
+    #-- END method output_results() --#
+
+
+    def run_backend( self, backend_IN, query_list_IN, limit_IN ):
+
+        '''
+        Times each search in query_list_IN with the backend passed in,
+            including loading the ranked Persons the autocomplete renders.
+            Builds the n-gram backend's index first, timed separately.
+            Returns result dictionary (see make_result()).
+        '''
+
+        # declare variables
+        build_ms = None
+        time_list = None
+        query_string = None
+        start_time = None
+
+        # build index up front, so first request isn't charged for it.
+        if ( isinstance( backend_IN, NGramPersonSearchBackend ) == True ):
+
+            start_time = timeit.default_timer()
+            backend_IN.build()
+            build_ms = ( timeit.default_timer() - start_time ) * 1000
+
+        #-- END check to see if index to build --#
+
+        time_list = []
+        for query_string in query_list_IN:
+
+            start_time = timeit.default_timer()
+            list( backend_IN.search_queryset( query_string, limit_IN = limit_IN ) )
+            time_list.append( timeit.default_timer() - start_time )
+
+        #-- END loop over queries --#
+
+        return self.make_result( backend_IN.BACKEND_NAME, time_list, build_ms )
+
+    #-- END method run_backend() --#
+
+
+    def run_baseline( self, query_list_IN, limit_IN ):
+
+        '''
+        Times each search in query_list_IN with Person.find_person_from_name()
+            partial matching.  Returns result dictionary (see make_result()).
+        '''
+
+        # declare variables
+        time_list = None
+        query_string = None
+        start_time = None
+
+        time_list = []
+        for query_string in query_list_IN:
+
+            start_time = timeit.default_timer()
+            list( Person.find_person_from_name( query_string, do_strict_match_IN = False, do_partial_match_IN = True )[ : limit_IN ] )
+            time_list.append( timeit.default_timer() - start_time )
+
+        #-- END loop over queries --#
+
+        return self.make_result( self.BASELINE_LABEL, time_list )
+
+    #-- END method run_baseline() --#
+
+
+#-- END class Command --#
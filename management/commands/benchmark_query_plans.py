@@ -0,0 +1,445 @@
+from __future__ import unicode_literals
+
+'''
+Copyright 2010-2016 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text.
+
+context_text is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text. If not, see http://www.gnu.org/licenses/.
+
+Management command that runs the Article and Article_Data filter shapes the
+   views, Temp_Section, and NetworkOutput issue, and reports the database's
+   query plan and latency for each.  Can build a synthetic corpus first (see
+   context_text.data.synthetic_corpus), and with --compare also runs each
+   query with the filter indexes (migration 0035) dropped, inside a
+   transaction that is rolled back, so you can see before and after on the
+   same data.  Nothing is left behind unless you pass --keep-corpus.
+
+Usage:
+
+    python manage.py benchmark_query_plans --articles 20000 --compare
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+
+# python base imports
+import datetime
+import timeit
+
+# django imports
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db import transaction
+from django.db.models import Count
+from django.db.models import Max
+from django.db.models import Min
+
+# context_text imports
+from context_text.data.synthetic_corpus import SyntheticCorpus
+from context_text.export.network_output import NetworkOutput
+from context_text.models import Article
+from context_text.models import Article_Author
+from context_text.models import Article_Data
+from context_text.models import Article_Subject
+from context_text.models import Temp_Section
+from context_text.shared.context_text_base import ContextTextBase
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class Command( BaseCommand ):
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+
+    help = "Report query plan and latency for the Article and Article_Data filters the views issue, optionally on a synthetic corpus and with and without the filter indexes."
+
+    # models whose Meta.indexes are compared with --compare.
+    INDEXED_MODEL_LIST = [ Article, Article_Data, Article_Author, Article_Subject ]
+
+    # defaults
+    DEFAULT_REPEAT_COUNT = 5
+    DEFAULT_DATE_WINDOW_DAYS = 30
+    DEFAULT_UNIQUE_ID_COUNT = 20
+
+    # phase labels
+    PHASE_WITH_INDEXES = "with indexes"
+    PHASE_WITHOUT_INDEXES = "without indexes"
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def add_arguments( self, parser ):
+
+        parser.add_argument( "--articles", type = int, default = 0, help = "Build a synthetic corpus with this many articles first (default 0 - use data already in the database)." )
+        parser.add_argument( "--seed", type = int, default = SyntheticCorpus.DEFAULT_SEED, help = "Seed for synthetic corpus." )
+        parser.add_argument( "--repeat", type = int, default = self.DEFAULT_REPEAT_COUNT, help = "Times to run each query." )
+        parser.add_argument( "--compare", action = "store_true", default = False, help = "Also run each query with the filter indexes dropped (needs a database with transactional DDL, like PostgreSQL or SQLite)." )
+        parser.add_argument( "--keep-corpus", action = "store_true", default = False, help = "Keep synthetic corpus when done." )
+        parser.add_argument( "--no-plan", action = "store_true", default = False, help = "Just report latency, not query plans." )
+
+    #-- END method add_arguments() --#
+
+
+    def analyze_tables( self ):
+
+        '''
+        Updates the database's table statistics so the planner knows about
+           newly created rows.  PostgreSQL and SQLite only.
+        '''
+
+        # declare variables
+        my_cursor = None
+
+        if ( connection.vendor in [ "postgresql", "sqlite" ] ):
+
+            with connection.cursor() as my_cursor:
+
+                my_cursor.execute( "ANALYZE" )
+
+            #-- END with cursor --#
+
+        #-- END check to see if supported database --#
+
+    #-- END method analyze_tables() --#
+
+
+    def get_existing_index_list( self ):
+
+        '''
+        Returns list of ( model, Index ) for the Meta.indexes of
+           INDEXED_MODEL_LIST that actually exist in the database.
+        '''
+
+        # return reference
+        list_OUT = []
+
+        # declare variables
+        current_model = None
+        constraint_dict = None
+        my_cursor = None
+        current_index = None
+
+        with connection.cursor() as my_cursor:
+
+            for current_model in self.INDEXED_MODEL_LIST:
+
+                constraint_dict = connection.introspection.get_constraints( my_cursor, current_model._meta.db_table )
+                for current_index in current_model._meta.indexes:
+
+                    if ( current_index.name in constraint_dict ):
+
+                        list_OUT.append( ( current_model, current_index ) )
+
+                    #-- END check to see if index exists --#
+
+                #-- END loop over model's indexes --#
+
+            #-- END loop over models --#
+
+        #-- END with cursor --#
+
+        return list_OUT
+
+    #-- END method get_existing_index_list() --#
+
+
+    def get_query_list( self ):
+
+        '''
+        Returns list of ( label, QuerySet ) pairs - the filter shapes issued by
+           Article.filter_articles(), Article_Data.filter_records(),
+           Temp_Section, and NetworkOutput.create_query_set(), with values
+           taken from the data in the database.
+        '''
+
+        # return reference
+        list_OUT = []
+
+        # declare variables
+        date_dict = None
+        start_date = None
+        end_date = None
+        start_date_string = ""
+        end_date_string = ""
+        newspaper_id = None
+        section_name = ""
+        unique_id_list = None
+        person_id = None
+        network_outputter = None
+
+        # values to filter on - date window at start of data, busiest
+        #    newspaper and section, some unique IDs, a person.
+        date_dict = Article.objects.aggregate( min_date = Min( "pub_date" ), max_date = Max( "pub_date" ) )
+        start_date = date_dict[ "min_date" ] or datetime.date.today()
+        end_date = start_date + datetime.timedelta( days = self.DEFAULT_DATE_WINDOW_DAYS )
+        start_date_string = start_date.strftime( "%Y-%m-%d" )
+        end_date_string = end_date.strftime( "%Y-%m-%d" )
+        newspaper_id = Article.objects.exclude( newspaper = None ).values( "newspaper_id" ).annotate( article_count = Count( "id" ) ).order_by( "-article_count" ).values_list( "newspaper_id", flat = True ).first()
+        section_name = Article.objects.values( "section" ).annotate( article_count = Count( "id" ) ).order_by( "-article_count" ).values_list( "section", flat = True ).first() or ""
+        unique_id_list = list( Article.objects.order_by( "-id" ).values_list( "unique_identifier", flat = True )[ :self.DEFAULT_UNIQUE_ID_COUNT ] )
+        person_id = Article_Subject.objects.exclude( person = None ).values_list( "person_id", flat = True ).first()
+
+        # ! ----> Article.filter_articles()
+        list_OUT.append( ( "filter_articles - newspaper, date range, section",
+            Article.filter_articles( params_IN = {
+                Article.PARAM_NEWSPAPER_ID_IN_LIST : [ newspaper_id ],
+                Article.PARAM_START_DATE : start_date_string,
+                Article.PARAM_END_DATE : end_date_string,
+                Article.PARAM_SECTION_NAME_IN_LIST : [ section_name ]
+            } )
+        ) )
+        list_OUT.append( ( "filter_articles - date range",
+            Article.filter_articles( params_IN = {
+                Article.PARAM_START_DATE : start_date_string,
+                Article.PARAM_END_DATE : end_date_string
+            } )
+        ) )
+        list_OUT.append( ( "filter_articles - unique identifiers",
+            Article.filter_articles( params_IN = {
+                Article.PARAM_UNIQUE_ID_IN_LIST : unique_id_list
+            } )
+        ) )
+
+        # ! ----> Temp_Section statistics
+        list_OUT.append( ( "Temp_Section - section, date range",
+            Article.objects.filter( section = section_name, pub_date__gte = start_date, pub_date__lte = end_date )
+        ) )
+        list_OUT.append( ( "Temp_Section - all news sections, date range",
+            Article.objects.filter( section__in = Temp_Section.NEWS_SECTION_NAME_LIST, pub_date__gte = start_date, pub_date__lte = end_date )
+        ) )
+
+        # ! ----> Article_Data.filter_records()
+        list_OUT.append( ( "filter_records - automated coder_type",
+            Article_Data.filter_records( params_IN = {
+                Article_Data.PARAM_CODER_TYPE_FILTER_TYPE : Article_Data.CODER_TYPE_FILTER_TYPE_AUTOMATED,
+                Article_Data.PARAM_CODER_TYPES_LIST : [ SyntheticCorpus.CODER_TYPE_AUTOMATED ]
+            } )
+        ) )
+        list_OUT.append( ( "Article_Data - status",
+            Article_Data.objects.filter( status = Article_Data.STATUS_NEW )
+        ) )
+
+        # ! ----> NetworkOutput.create_query_set()
+        network_outputter = NetworkOutput()
+        network_outputter.store_parameters( {
+            ContextTextBase.PARAM_START_DATE : start_date_string,
+            ContextTextBase.PARAM_END_DATE : end_date_string,
+            ContextTextBase.PARAM_PUBLICATION_LIST : [ newspaper_id ],
+            NetworkOutput.PARAM_CODER_TYPE_FILTER_TYPE : ContextTextBase.CODER_TYPE_FILTER_TYPE_AUTOMATED,
+            NetworkOutput.PARAM_CODER_TYPE_LIST : [ SyntheticCorpus.CODER_TYPE_AUTOMATED ]
+        } )
+        list_OUT.append( ( "NetworkOutput.create_query_set - date range, publication, coder_type",
+            network_outputter.create_query_set()
+        ) )
+
+        # ! ----> Article_Person.person
+        list_OUT.append( ( "Article_Subject - Article_Data for person",
+            Article_Subject.objects.filter( person_id = person_id ).values( "article_data_id" )
+        ) )
+        list_OUT.append( ( "Article_Author - Article_Data for person",
+            Article_Author.objects.filter( person_id = person_id ).values( "article_data_id" )
+        ) )
+
+        return list_OUT
+
+    #-- END method get_query_list() --#
+
+
+    def handle( self, *args, **options ):
+
+        # declare variables
+        article_count_IN = -1
+        my_corpus = None
+        result_dict = None
+        existing_index_list = None
+
+        article_count_IN = options[ "articles" ]
+        result_dict = {}
+
+        with transaction.atomic():
+
+            # synthetic corpus?
+            if ( article_count_IN > 0 ):
+
+                my_corpus = SyntheticCorpus( article_count_IN = article_count_IN, person_count_IN = max( SyntheticCorpus.DEFAULT_PERSON_COUNT, article_count_IN // 10 ), seed_IN = options[ "seed" ] )
+                self.stdout.write( "Synthetic corpus: {}".format( my_corpus.create() ) )
+
+            #-- END check to see if synthetic corpus --#
+
+            self.analyze_tables()
+
+            existing_index_list = self.get_existing_index_list()
+            self.stdout.write( "Filter indexes present: {}".format( ", ".join( [ current_index.name for current_model, current_index in existing_index_list ] ) or "none - is migration 0035 applied?" ) )
+
+            # with indexes (as database is now).
+            result_dict[ self.PHASE_WITH_INDEXES ] = self.run_queries( options[ "repeat" ], options[ "no_plan" ] == False )
+
+            # compare without?
+            if ( ( options[ "compare" ] == True ) and ( len( existing_index_list ) > 0 ) ):
+
+                if ( connection.features.can_rollback_ddl == True ):
+
+                    # drop indexes inside savepoint, then roll back.
+                    with transaction.atomic():
+
+                        with connection.schema_editor() as schema_editor:
+
+                            for current_model, current_index in existing_index_list:
+
+                                schema_editor.remove_index( current_model, current_index )
+
+                            #-- END loop over indexes --#
+
+                        #-- END with schema editor --#
+
+                        self.analyze_tables()
+                        result_dict[ self.PHASE_WITHOUT_INDEXES ] = self.run_queries( options[ "repeat" ], options[ "no_plan" ] == False )
+                        transaction.set_rollback( True )
+
+                    #-- END with savepoint --#
+
+                else:
+
+                    self.stdout.write( "--compare skipped - {} can't roll back schema changes.  Run this command before and after migrating to 0035 instead.".format( connection.vendor ) )
+
+                #-- END check to see if we can roll back DDL --#
+
+            #-- END check to see if compare --#
+
+            # keep corpus?
+            if ( ( my_corpus is not None ) and ( options[ "keep_corpus" ] == False ) ):
+
+                transaction.set_rollback( True )
+
+            #-- END check to see if keep corpus --#
+
+        #-- END with transaction --#
+
+        self.output_results( result_dict )
+
+    #-- END method handle() --#
+
+
+    def output_results( self, result_dict_IN ):
+
+        '''
+        Writes a report of the results in result_dict_IN (phase label to list
+           of result dictionaries from run_queries()) to stdout.
+        '''
+
+        # declare variables
+        phase_label = ""
+        result_list = None
+        result_index = -1
+        current_result = None
+        without_result = None
+
+        for phase_label in [ self.PHASE_WITH_INDEXES, self.PHASE_WITHOUT_INDEXES ]:
+
+            result_list = result_dict_IN.get( phase_label, None )
+            if ( result_list is not None ):
+
+                self.stdout.write( "\n==> {}\n".format( phase_label ) )
+                for current_result in result_list:
+
+                    self.stdout.write( "\n- {}: {} rows; best {:.2f} ms; median {:.2f} ms".format( current_result[ "label" ], current_result[ "row_count" ], current_result[ "best_ms" ], current_result[ "median_ms" ] ) )
+                    if ( current_result[ "plan" ] ):
+
+                        self.stdout.write( current_result[ "plan" ] )
+
+                    #-- END check to see if plan --#
+
+                #-- END loop over results --#
+
+            #-- END check to see if phase was run --#
+
+        #-- END loop over phases --#
+
+        # summary, if compared.
+        if ( self.PHASE_WITHOUT_INDEXES in result_dict_IN ):
+
+            self.stdout.write( "\n==> median ms, without --> with indexes\n" )
+            for result_index, current_result in enumerate( result_dict_IN[ self.PHASE_WITH_INDEXES ] ):
+
+                without_result = result_dict_IN[ self.PHASE_WITHOUT_INDEXES ][ result_index ]
+                self.stdout.write( "- {}: {:.2f} --> {:.2f}".format( current_result[ "label" ], without_result[ "median_ms" ], current_result[ "median_ms" ] ) )
+
+            #-- END loop over results --#
+
+        #-- END check to see if compared --#
+
+    #-- END method output_results() --#
+
+
+    def run_queries( self, repeat_count_IN, include_plan_IN = True ):
+
+        '''
+        Runs each query from get_query_list() repeat_count_IN times.  Returns
+           list of dictionaries with the label, row count, query plan, and
+           best and median latency in milliseconds.
+        '''
+
+        # return reference
+        list_OUT = []
+
+        # declare variables
+        query_label = ""
+        query_set = None
+        plan_string = ""
+        time_list = None
+        repeat_index = -1
+        start_time = None
+        row_count = -1
+
+        for query_label, query_set in self.get_query_list():
+
+            # plan
+            plan_string = ""
+            if ( include_plan_IN == True ):
+
+                plan_string = query_set.explain()
+
+            #-- END check to see if plan --#
+
+            # time
+            time_list = []
+            for repeat_index in range( max( 1, repeat_count_IN ) ):
+
+                start_time = timeit.default_timer()
+                row_count = len( list( query_set.all().values_list( "pk", flat = True ) ) )
+                time_list.append( ( timeit.default_timer() - start_time ) * 1000 )
+
+            #-- END loop over repeats --#
+
+            time_list.sort()
+            list_OUT.append( {
+                "label" : query_label,
+                "row_count" : row_count,
+                "plan" : plan_string,
+                "best_ms" : time_list[ 0 ],
+                "median_ms" : time_list[ len( time_list ) // 2 ]
+            } )
+
+        #-- END loop over queries --#
+
+        return list_OUT
+
+    #-- END method run_queries() --#
+
+
+#-- END class Command --#
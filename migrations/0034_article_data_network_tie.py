@@ -0,0 +1,34 @@
+# Adds the Article_Data_Network_Tie table of precomputed network ties.  Only
+#     creates the table - build ties for Article_Data coded before this
+#     migration with "python manage.py backfill_network_ties".
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('context_text', '0033_auto_20201218_1723'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Article_Data_Network_Tie',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tie_type', models.CharField(choices=[('author', 'Author'), ('source', 'Source'), ('author_author', 'Author - Author tie'), ('author_source', 'Author - Source tie')], db_index=True, max_length=255)),
+                ('tie_count', models.IntegerField(default=1)),
+                ('source_type', models.CharField(blank=True, max_length=255, null=True)),
+                ('source_contact_type', models.CharField(blank=True, max_length=255, null=True)),
+                ('source_capacity', models.CharField(blank=True, max_length=255, null=True)),
+                ('create_date', models.DateTimeField(auto_now_add=True)),
+                ('article_data', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='context_text.article_data')),
+                ('from_person', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='context_text_article_data_network_tie_from_person_set', to='context_text.person')),
+                ('to_person', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='context_text_article_data_network_tie_to_person_set', to='context_text.person')),
+            ],
+            options={
+                'ordering': ['article_data', 'id'],
+            },
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Adds the indexes declared in the Meta.indexes of Article, Article_Data,
+#     Article_Author and Article_Subject, matched to the filters in
+#     Article.filter_articles(), Article_Data.filter_records() and
+#     NetworkOutput (see the benchmark_query_plans management command).
+#     Operations mirror those Meta.indexes, so makemigrations has nothing new
+#     to add.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('context_text', '0034_article_data_network_tie'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['pub_date'], name='article_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['newspaper', 'pub_date', 'section'], name='article_paper_date_sect_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['section', 'pub_date'], name='article_section_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['unique_identifier'], name='article_unique_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article_data',
+            index=models.Index(fields=['coder_type'], name='article_data_coder_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article_data',
+            index=models.Index(fields=['status'], name='article_data_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article_data',
+            index=models.Index(fields=['article', 'coder'], name='article_data_art_coder_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article_author',
+            index=models.Index(fields=['person', 'article_data'], name='article_author_person_ad_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article_subject',
+            index=models.Index(fields=['person', 'article_data'], name='article_subject_person_ad_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article_subject',
+            index=models.Index(fields=['article_data', 'subject_type'], name='article_subject_ad_type_idx'),
+        ),
+    ]
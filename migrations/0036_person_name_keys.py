@@ -0,0 +1,211 @@
+# Adds the Person name-key columns used to match names ignoring accents,
+#     punctuation and case, and fills them in for existing Person rows.
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+
+# Name key logic, frozen as of this migration (see
+#     context_text.shared.name_key_helper.NameKeyHelper), so later changes to
+#     the helper don't change what this migration does.
+REGEX_PUNCTUATION = re.compile( r"[^\w\s]|_", re.UNICODE )
+REGEX_WHITE_SPACE = re.compile( r"\s+", re.UNICODE )
+REGEX_INITIALS_SEPARATOR = re.compile( r"[\s.\-]+", re.UNICODE )
+INITIALS_KEY_MAX_LENGTH = 32
+NAME_KEY_MAX_LENGTH = 255
+SOUNDEX_KEY_LENGTH = 4
+SOUNDEX_CODE_DICT = {}
+SOUNDEX_CODE_DICT.update( dict.fromkeys( "bfpv", "1" ) )
+SOUNDEX_CODE_DICT.update( dict.fromkeys( "cgjkqsxz", "2" ) )
+SOUNDEX_CODE_DICT.update( dict.fromkeys( "dt", "3" ) )
+SOUNDEX_CODE_DICT.update( dict.fromkeys( "l", "4" ) )
+SOUNDEX_CODE_DICT.update( dict.fromkeys( "mn", "5" ) )
+SOUNDEX_CODE_DICT.update( dict.fromkeys( "r", "6" ) )
+SOUNDEX_IGNORE_LETTERS = "hw"
+
+
+def make_name_key( value_IN ):
+
+    # return reference
+    value_OUT = ""
+
+    if ( value_IN is not None ):
+
+        value_OUT = "".join( [ current_char for current_char in unicodedata.normalize( "NFKD", "{}".format( value_IN ) ) if ( unicodedata.combining( current_char ) == 0 ) ] ).lower()
+        value_OUT = REGEX_PUNCTUATION.sub( "", value_OUT )
+        value_OUT = REGEX_WHITE_SPACE.sub( " ", value_OUT ).strip()
+
+    #-- END check to see if None --#
+
+    return value_OUT
+
+#-- END function make_name_key() --#
+
+
+def make_initials_key( value_IN ):
+
+    # return reference
+    value_OUT = ""
+
+    # declare variables
+    word_list = []
+    current_word = None
+
+    if ( value_IN is not None ):
+
+        for current_word in REGEX_INITIALS_SEPARATOR.split( "{}".format( value_IN ) ):
+
+            current_word = make_name_key( current_word ).replace( " ", "" )
+            if ( current_word != "" ):
+
+                word_list.append( current_word )
+
+            #-- END check to see if empty --#
+
+        #-- END loop over words --#
+
+    #-- END check to see if None --#
+
+    value_OUT = "".join( [ current_word[ 0 ] for current_word in word_list ] )
+
+    return value_OUT
+
+#-- END function make_initials_key() --#
+
+
+def make_phonetic_key( value_IN ):
+
+    # return reference
+    value_OUT = ""
+
+    # declare variables
+    letter_list = None
+    code_list = None
+    previous_code = None
+    current_letter = None
+    current_code = None
+
+    letter_list = [ current_letter for current_letter in make_name_key( value_IN ) if ( "a" <= current_letter <= "z" ) ]
+    if ( len( letter_list ) > 0 ):
+
+        code_list = [ letter_list[ 0 ] ]
+        previous_code = SOUNDEX_CODE_DICT.get( letter_list[ 0 ], "" )
+        for current_letter in letter_list[ 1 : ]:
+
+            if ( current_letter not in SOUNDEX_IGNORE_LETTERS ):
+
+                current_code = SOUNDEX_CODE_DICT.get( current_letter, "" )
+                if ( ( current_code != "" ) and ( current_code != previous_code ) ):
+
+                    code_list.append( current_code )
+
+                #-- END check to see if new code --#
+
+                previous_code = current_code
+
+            #-- END check to see if ignored letter --#
+
+        #-- END loop over letters --#
+
+        value_OUT = "".join( code_list )[ : SOUNDEX_KEY_LENGTH ].ljust( SOUNDEX_KEY_LENGTH, "0" )
+
+    #-- END check to see if any letters --#
+
+    return value_OUT
+
+#-- END function make_phonetic_key() --#
+
+
+def make_person_key_dict( first_name_IN, middle_name_IN, last_name_IN ):
+
+    # return reference
+    dict_OUT = {}
+
+    dict_OUT[ "first_name_key" ] = make_name_key( first_name_IN )[ : NAME_KEY_MAX_LENGTH ]
+    dict_OUT[ "first_initials_key" ] = make_initials_key( first_name_IN )[ : INITIALS_KEY_MAX_LENGTH ]
+    dict_OUT[ "middle_name_key" ] = make_name_key( middle_name_IN )[ : NAME_KEY_MAX_LENGTH ]
+    dict_OUT[ "middle_initials_key" ] = make_initials_key( middle_name_IN )[ : INITIALS_KEY_MAX_LENGTH ]
+    dict_OUT[ "last_name_key" ] = make_name_key( last_name_IN )[ : NAME_KEY_MAX_LENGTH ]
+    dict_OUT[ "last_name_phonetic_key" ] = make_phonetic_key( last_name_IN )
+
+    return dict_OUT
+
+#-- END function make_person_key_dict() --#
+
+
+def populate_person_name_keys( apps, schema_editor ):
+
+    '''
+    Sets the new name keys for existing people, 1000 at a time.  Re-run any
+        time with "python manage.py backfill_person_name_keys".
+    '''
+
+    # declare variables
+    Person = apps.get_model( "context_text", "Person" )
+    field_name_list = list( make_person_key_dict( None, None, None ).keys() )
+    person_qs = Person.objects.only( "id", "first_name", "middle_name", "last_name" ).order_by( "id" )
+    last_id = 0
+    batch_list = list( person_qs.filter( id__gt = last_id )[ : 1000 ] )
+    while ( len( batch_list ) > 0 ):
+
+        for current_person in batch_list:
+
+            key_dict = make_person_key_dict( current_person.first_name, current_person.middle_name, current_person.last_name )
+            for field_name, field_value in key_dict.items():
+
+                setattr( current_person, field_name, field_value )
+
+            #-- END loop over keys --#
+
+        #-- END loop over batch --#
+
+        Person.objects.bulk_update( batch_list, field_name_list )
+        last_id = batch_list[ -1 ].id
+        batch_list = list( person_qs.filter( id__gt = last_id )[ : 1000 ] )
+
+    #-- END loop over batches --#
+
+#-- END function populate_person_name_keys() --#
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('context_text', '0035_article_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='person',
+            name='first_initials_key',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='person',
+            name='first_name_key',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='person',
+            name='last_name_key',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='person',
+            name='last_name_phonetic_key',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=8),
+        ),
+        migrations.AddField(
+            model_name='person',
+            name='middle_initials_key',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='person',
+            name='middle_name_key',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=255),
+        ),
+        migrations.RunPython(populate_person_name_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,137 @@
+# Adds Person.full_name_key, fills it in for existing Person rows, and on
+#     PostgreSQL adds the pg_trgm index used by person autocomplete.
+
+import logging
+import re
+import unicodedata
+
+from django.db import DatabaseError, migrations, models, transaction
+
+
+# Name key logic, frozen as of this migration (see
+#     context_text.shared.name_key_helper.NameKeyHelper), so later changes to
+#     the helper don't change what this migration does.
+REGEX_PUNCTUATION = re.compile( r"[^\w\s]|_", re.UNICODE )
+REGEX_WHITE_SPACE = re.compile( r"\s+", re.UNICODE )
+NAME_KEY_MAX_LENGTH = 255
+
+
+def make_name_key( value_IN ):
+
+    # return reference
+    value_OUT = ""
+
+    if ( value_IN is not None ):
+
+        value_OUT = "".join( [ current_char for current_char in unicodedata.normalize( "NFKD", "{}".format( value_IN ) ) if ( unicodedata.combining( current_char ) == 0 ) ] ).lower()
+        value_OUT = REGEX_PUNCTUATION.sub( "", value_OUT )
+        value_OUT = REGEX_WHITE_SPACE.sub( " ", value_OUT ).strip()
+
+    #-- END check to see if None --#
+
+    return value_OUT
+
+#-- END function make_name_key() --#
+
+
+def make_full_name_key( first_name_IN, middle_name_IN, last_name_IN ):
+
+    # return reference
+    value_OUT = ""
+
+    # declare variables
+    key_list = None
+
+    key_list = [ make_name_key( current_name )[ : NAME_KEY_MAX_LENGTH ] for current_name in ( first_name_IN, middle_name_IN, last_name_IN ) ]
+    value_OUT = " ".join( [ current_key for current_key in key_list if ( current_key != "" ) ] )[ : NAME_KEY_MAX_LENGTH ]
+
+    return value_OUT
+
+#-- END function make_full_name_key() --#
+
+
+def populate_full_name_key( apps, schema_editor ):
+
+    '''
+    Sets full_name_key for existing people, 1000 at a time.
+    '''
+
+    # declare variables
+    Person = apps.get_model( "context_text", "Person" )
+    person_qs = Person.objects.only( "id", "first_name", "middle_name", "last_name" ).order_by( "id" )
+    last_id = 0
+    batch_list = list( person_qs.filter( id__gt = last_id )[ : 1000 ] )
+    while ( len( batch_list ) > 0 ):
+
+        for current_person in batch_list:
+
+            current_person.full_name_key = make_full_name_key( current_person.first_name, current_person.middle_name, current_person.last_name )
+
+        #-- END loop over batch --#
+
+        Person.objects.bulk_update( batch_list, [ "full_name_key" ] )
+        last_id = batch_list[ -1 ].id
+        batch_list = list( person_qs.filter( id__gt = last_id )[ : 1000 ] )
+
+    #-- END loop over batches --#
+
+#-- END function populate_full_name_key() --#
+
+
+def create_trigram_index( apps, schema_editor ):
+
+    '''
+    PostgreSQL only: enables pg_trgm and adds a GIN trigram index on
+        full_name_key, for PostgreSQLPersonSearchBackend.  If the extension
+        can't be created (not installed, or no permission), logs and moves on -
+        PersonSearch then uses the in-process n-gram index instead.
+    '''
+
+    if ( schema_editor.connection.vendor == "postgresql" ):
+
+        try:
+
+            with transaction.atomic( using = schema_editor.connection.alias ):
+
+                schema_editor.execute( "CREATE EXTENSION IF NOT EXISTS pg_trgm" )
+                schema_editor.execute( "CREATE INDEX IF NOT EXISTS person_full_name_key_trgm_idx ON context_text_person USING gin ( full_name_key gin_trgm_ops )" )
+
+            #-- END with savepoint --#
+
+        except DatabaseError as de:
+
+            logging.getLogger( __name__ ).warning( "pg_trgm not available, skipping trigram index on context_text_person.full_name_key: {}".format( de ) )
+
+        #-- END try...except around extension --#
+
+    #-- END check to see if PostgreSQL --#
+
+#-- END function create_trigram_index() --#
+
+
+def drop_trigram_index( apps, schema_editor ):
+
+    if ( schema_editor.connection.vendor == "postgresql" ):
+
+        schema_editor.execute( "DROP INDEX IF EXISTS person_full_name_key_trgm_idx" )
+
+    #-- END check to see if PostgreSQL --#
+
+#-- END function drop_trigram_index() --#
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('context_text', '0036_person_name_keys'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='person',
+            name='full_name_key',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.RunPython(populate_full_name_key, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
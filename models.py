@@ -20,6 +20,8 @@ You should have received a copy of the GNU Lesser General Public License along w
 
 # python imports
 from abc import ABCMeta, abstractmethod
+import bisect
+import contextlib
 import datetime
 from decimal import Decimal
 from decimal import getcontext
@@ -27,6 +29,7 @@ import gc
 import logging
 import pickle
 #import re
+import threading
 
 # import six for Python 2 and 3 compatibility.
 import six
@@ -55,14 +58,21 @@ from django.contrib.auth.models import User
 from django.db import models
 
 # Django query object for OR-ing selection criteria together.
+from django.db.models import Count
 from django.db.models import Q
 
 # Dajngo object for interacting directly with database.
 from django.db import connection
+from django.db import transaction
 import django.db
 
+# Django signals
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+
 # django encoding imports (for supporting 2 and 3).
 import django.utils.encoding
+from django.utils import timezone
 from django.utils.text import slugify
 
 # python_utilities - text cleanup
@@ -101,7 +111,10 @@ from context.shared.entity_models import Abstract_Related_JSON_Content
 from context.shared.person_details import PersonDetails
 
 # context_text imports
+from context_text.shared.aho_corasick import AhoCorasickAutomaton
 from context_text.shared.context_text_base import ContextTextBase
+from context_text.shared.name_key_helper import NameKeyHelper
+from context_text.shared.parsed_text_cache import ParsedTextCache
 
 #================================================================================
 # Shared variables and functions
@@ -221,6 +234,163 @@ def get_dict_value( dict_IN, name_IN, default_IN = None ):
 #-- END method get_dict_value() --#
 
 
+'''
+Bulk deep copy, shared by the make_deep_copies() class methods.
+'''
+
+DEFAULT_DEEP_COPY_BATCH_SIZE = 500
+
+def bulk_copy_instances( instance_list_IN, parent_field_name_IN = None, parent_id_map_IN = None, change_dict_IN = None, batch_size_IN = DEFAULT_DEEP_COPY_BATCH_SIZE ):
+
+    '''
+    Accepts list of saved instances of a single model.  Makes a copy of each
+       with all concrete fields other than the primary key, re-points the
+       ForeignKey named parent_field_name_IN using parent_id_map_IN (dictionary
+       of old parent ID to new parent instance), sets any values in
+       change_dict_IN, then inserts the copies with bulk_create().  Does not
+       call save(), so overridden save() methods are not run.  Returns
+       dictionary of old ID to new instance.
+    '''
+
+    # return reference
+    id_map_OUT = {}
+
+    # declare variables
+    model_class = None
+    concrete_field_list = None
+    parent_field = None
+    copy_list = None
+    original_instance = None
+    copy_instance = None
+    current_field = None
+    change_name = ""
+    change_value = None
+
+    # got anything?
+    if ( ( instance_list_IN is not None ) and ( len( instance_list_IN ) > 0 ) ):
+
+        model_class = type( instance_list_IN[ 0 ] )
+        concrete_field_list = [ current_field for current_field in model_class._meta.concrete_fields if ( current_field.primary_key == False ) ]
+
+        if ( parent_field_name_IN is not None ):
+
+            parent_field = model_class._meta.get_field( parent_field_name_IN )
+
+        #-- END check to see if parent field --#
+
+        # make copies.
+        copy_list = []
+        for original_instance in instance_list_IN:
+
+            copy_instance = model_class()
+            for current_field in concrete_field_list:
+
+                setattr( copy_instance, current_field.attname, getattr( original_instance, current_field.attname ) )
+
+            #-- END loop over fields --#
+
+            # re-point parent.
+            if ( parent_field is not None ):
+
+                setattr( copy_instance, parent_field.attname, parent_id_map_IN[ getattr( original_instance, parent_field.attname ) ].pk )
+
+            #-- END check to see if parent field --#
+
+            if ( change_dict_IN is not None ):
+
+                for change_name, change_value in six.iteritems( change_dict_IN ):
+
+                    setattr( copy_instance, change_name, change_value )
+
+                #-- END loop over changes --#
+
+            #-- END check to see if changes --#
+
+            copy_list.append( copy_instance )
+
+        #-- END loop over instances --#
+
+        # insert - need IDs for children, and bulk_create() only sets them if
+        #     the database returns them.
+        if ( connection.features.can_return_rows_from_bulk_insert == True ):
+
+            model_class.objects.bulk_create( copy_list, batch_size = batch_size_IN )
+
+        else:
+
+            for copy_instance in copy_list:
+
+                models.Model.save( copy_instance )
+
+            #-- END loop over copies --#
+
+        #-- END check to see if bulk_create() sets IDs --#
+
+        for original_instance, copy_instance in zip( instance_list_IN, copy_list ):
+
+            id_map_OUT[ original_instance.pk ] = copy_instance
+
+        #-- END loop to build map --#
+
+    #-- END check to see if anything passed in --#
+
+    return id_map_OUT
+
+#-- END method bulk_copy_instances() --#
+
+
+def bulk_copy_m2m_values( field_name_IN, id_map_IN, batch_size_IN = DEFAULT_DEEP_COPY_BATCH_SIZE ):
+
+    '''
+    Accepts name of a ManyToManyField and dictionary of old ID to new instance
+       (from bulk_copy_instances()).  Reads the old instances' rows from the
+       field's through table in one query, and inserts matching rows for the
+       new instances with bulk_create().  Returns number of rows created.
+    '''
+
+    # return reference
+    count_OUT = 0
+
+    # declare variables
+    model_class = None
+    m2m_field = None
+    through_class = None
+    from_column_name = ""
+    to_column_name = ""
+    through_qs = None
+    through_list = None
+    old_id = None
+    related_id = None
+
+    # got anything?
+    if ( ( id_map_IN is not None ) and ( len( id_map_IN ) > 0 ) ):
+
+        model_class = type( next( six.itervalues( id_map_IN ) ) )
+        m2m_field = model_class._meta.get_field( field_name_IN )
+        through_class = m2m_field.remote_field.through
+        from_column_name = m2m_field.m2m_column_name()
+        to_column_name = m2m_field.m2m_reverse_name()
+
+        through_qs = through_class.objects.filter( **{ from_column_name + "__in" : list( id_map_IN.keys() ) } )
+        through_qs = through_qs.values_list( from_column_name, to_column_name )
+
+        through_list = []
+        for old_id, related_id in through_qs:
+
+            through_list.append( through_class( **{ from_column_name : id_map_IN[ old_id ].pk, to_column_name : related_id } ) )
+
+        #-- END loop over through rows --#
+
+        through_class.objects.bulk_create( through_list, batch_size = batch_size_IN )
+        count_OUT = len( through_list )
+
+    #-- END check to see if anything passed in --#
+
+    return count_OUT
+
+#-- END method bulk_copy_m2m_values() --#
+
+
 '''
 Models for context_text, including some that are specific to the Grand Rapids Press.
 '''
@@ -549,6 +719,274 @@ class Person( Abstract_Person ):
     organization = models.ForeignKey( Organization, on_delete = models.SET_NULL, blank = True, null = True )
     #entity = models.ForeignKey( Entity, on_delete = models.SET_NULL, blank = True, null = True )
 
+    # normalized name keys, set from name parts on save (see
+    #     update_name_keys() and NameKeyHelper), so lookups are exact matches
+    #     on indexed columns.  full_name_key is for PersonSearch (trigram
+    #     index on PostgreSQL - see migration 0037).
+    first_name_key = models.CharField( max_length = 255, blank = True, default = "", db_index = True )
+    first_initials_key = models.CharField( max_length = 32, blank = True, default = "", db_index = True )
+    middle_name_key = models.CharField( max_length = 255, blank = True, default = "", db_index = True )
+    middle_initials_key = models.CharField( max_length = 32, blank = True, default = "", db_index = True )
+    last_name_key = models.CharField( max_length = 255, blank = True, default = "", db_index = True )
+    last_name_phonetic_key = models.CharField( max_length = 8, blank = True, default = "", db_index = True )
+    full_name_key = models.CharField( max_length = 255, blank = True, default = "" )
+
+
+    #----------------------------------------------------------------------
+    # ! ==> class methods
+    #----------------------------------------------------------------------
+
+
+    @classmethod
+    def filter_on_name_keys( cls, qs_IN, parsed_name_IN, do_strict_match_IN = False, do_partial_match_IN = False, do_initials_match_IN = False, do_phonetic_match_IN = False ):
+
+        '''
+        Accepts QuerySet of Persons and HumanName.  Filters the QuerySet on the
+            name key columns so each name part populated in the HumanName
+            matches, and returns the filtered QuerySet:
+            - first, middle, and last names: key equals the key of the parsed
+                part (contains it, if do_partial_match_IN - same results as
+                the "__icontains" lookups this replaces).
+            - if do_initials_match_IN, a first or middle name that is just
+                initials ("A", "M.J.") matches the initials key instead.
+            - if do_phonetic_match_IN, last name matches the phonetic key
+                (Soundex) instead.
+            - name prefix and suffix (no key columns - rarely populated):
+                "__iexact" ("__icontains" if do_partial_match_IN).
+            If do_strict_match_IN, parts that are empty in the HumanName must
+                also be empty in the match.
+        '''
+
+        # return reference
+        qs_OUT = None
+
+        # declare variables
+        key_part_list = None
+        part_name = None
+        key_field_name = None
+        initials_field_name = None
+        part_value = None
+        key_value = None
+        filter_dict = None
+        raw_part_list = None
+        field_name = None
+
+        qs_OUT = qs_IN
+
+        # name parts with key columns.
+        key_part_list = []
+        key_part_list.append( ( "first", "first_name_key", "first_initials_key" ) )
+        key_part_list.append( ( "middle", "middle_name_key", "middle_initials_key" ) )
+        key_part_list.append( ( "last", "last_name_key", None ) )
+        for part_name, key_field_name, initials_field_name in key_part_list:
+
+            part_value = getattr( parsed_name_IN, part_name, None )
+            key_value = NameKeyHelper.make_name_key( part_value )
+            if ( key_value != "" ):
+
+                if ( ( do_initials_match_IN == True ) and ( initials_field_name is not None ) and ( NameKeyHelper.is_initials( part_value ) == True ) ):
+
+                    filter_dict = { initials_field_name : NameKeyHelper.make_initials_key( part_value ) }
+
+                elif ( ( do_phonetic_match_IN == True ) and ( part_name == "last" ) ):
+
+                    filter_dict = { "last_name_phonetic_key" : NameKeyHelper.make_phonetic_key( part_value ) }
+
+                elif ( do_partial_match_IN == True ):
+
+                    filter_dict = { key_field_name + "__contains" : key_value }
+
+                else:
+
+                    filter_dict = { key_field_name : key_value }
+
+                #-- END check to see how to match --#
+
+                qs_OUT = qs_OUT.filter( **filter_dict )
+
+            elif ( do_strict_match_IN == True ):
+
+                qs_OUT = qs_OUT.filter( **{ key_field_name : "" } )
+
+            #-- END check to see if part populated --#
+
+        #-- END loop over key name parts --#
+
+        # prefix and suffix.
+        raw_part_list = []
+        raw_part_list.append( ( "title", "name_prefix" ) )
+        raw_part_list.append( ( "suffix", "name_suffix" ) )
+        for part_name, field_name in raw_part_list:
+
+            part_value = getattr( parsed_name_IN, part_name, None )
+            if ( part_value ):
+
+                if ( do_partial_match_IN == True ):
+
+                    qs_OUT = qs_OUT.filter( **{ field_name + "__icontains" : part_value } )
+
+                else:
+
+                    qs_OUT = qs_OUT.filter( **{ field_name + "__iexact" : part_value } )
+
+                #-- END check to see if partial --#
+
+            elif ( do_strict_match_IN == True ):
+
+                qs_OUT = qs_OUT.filter( Q( **{ field_name + "__isnull" : True } ) | Q( **{ field_name : "" } ) )
+
+            #-- END check to see if part populated --#
+
+        #-- END loop over prefix and suffix --#
+
+        return qs_OUT
+
+    #-- END class method filter_on_name_keys() --#
+
+
+    @classmethod
+    def look_up_person_from_name( cls, name_IN = "", parsed_name_IN = None, do_strict_match_IN = False, do_partial_match_IN = False, qs_IN = None, use_name_keys_IN = False, do_initials_match_IN = False, do_phonetic_match_IN = False, *args, **kwargs ):
+
+        '''
+        Extends Abstract_Person.look_up_person_from_name() (also used by
+            get_person_for_name() and find_person_from_name()).  By default,
+            just calls the parent method, so name parts are compared with
+            "__iexact"/"__icontains" as before.  If use_name_keys_IN is True,
+            matches on the name key columns instead, so exact matches are
+            equality tests on indexed columns - accepts name string and
+            optional HumanName already parsed from it, plus optional QuerySet
+            to filter (defaults to all Persons), and returns QuerySet of
+            Persons whose name parts match (see filter_on_name_keys() for the
+            match options, including do_initials_match_IN and
+            do_phonetic_match_IN, which are ignored unless use_name_keys_IN is
+            True).  If no name, returns empty QuerySet.
+        '''
+
+        # return reference
+        qs_OUT = None
+
+        # declare variables
+        parsed_name = None
+
+        # name keys?
+        if ( use_name_keys_IN == True ):
+
+            # parse
+            parsed_name = parsed_name_IN
+            if ( ( parsed_name is None ) and ( name_IN ) ):
+
+                parsed_name = HumanName( name_IN )
+
+            #-- END check to see if need to parse --#
+
+            # QuerySet
+            qs_OUT = qs_IN
+            if ( qs_OUT is None ):
+
+                qs_OUT = cls.objects.all()
+
+            #-- END check to see if QuerySet passed in --#
+
+            # got a name?
+            if ( ( parsed_name is not None ) and ( NameKeyHelper.make_name_key( str( parsed_name ) ) != "" ) ):
+
+                qs_OUT = cls.filter_on_name_keys( qs_OUT,
+                                                  parsed_name,
+                                                  do_strict_match_IN = do_strict_match_IN,
+                                                  do_partial_match_IN = do_partial_match_IN,
+                                                  do_initials_match_IN = do_initials_match_IN,
+                                                  do_phonetic_match_IN = do_phonetic_match_IN )
+
+            else:
+
+                # no name - no matches.
+                qs_OUT = qs_OUT.none()
+
+            #-- END check to see if name --#
+
+        else:
+
+            # no - parent method, unchanged.
+            qs_OUT = super( Person, cls ).look_up_person_from_name( name_IN = name_IN, parsed_name_IN = parsed_name_IN, do_strict_match_IN = do_strict_match_IN, do_partial_match_IN = do_partial_match_IN, qs_IN = qs_IN, *args, **kwargs )
+
+        #-- END check to see if name keys --#
+
+        return qs_OUT
+
+    #-- END class method look_up_person_from_name() --#
+
+
+    @classmethod
+    def update_name_keys_in_batches( cls, qs_IN = None, batch_size_IN = 1000 ):
+
+        '''
+        Accepts optional QuerySet of Persons (defaults to all) and batch size.
+            Reads the name parts of batch_size_IN people at a time (in ID
+            order), and saves the name keys of those whose keys are out of date
+            with one bulk_update() per batch.  For rows written without save()
+            (bulk_create(), update(), raw SQL).  Returns dictionary with counts
+            of people checked ("checked") and updated ("updated").
+        '''
+
+        # return reference
+        dict_OUT = {}
+
+        # declare variables
+        person_qs = None
+        field_name_list = None
+        last_id = 0
+        batch_list = None
+        update_list = None
+        current_person = None
+        checked_count = 0
+        updated_count = 0
+
+        # QuerySet
+        person_qs = qs_IN
+        if ( person_qs is None ):
+
+            person_qs = cls.objects.all()
+
+        #-- END check to see if QuerySet passed in --#
+
+        field_name_list = list( NameKeyHelper.make_person_key_dict( None, None, None ).keys() )
+        person_qs = person_qs.only( "id", "first_name", "middle_name", "last_name", *field_name_list ).order_by( "id" )
+
+        # keyset pagination, so each batch is an indexed range read.
+        batch_list = list( person_qs.filter( id__gt = last_id )[ : batch_size_IN ] )
+        while ( len( batch_list ) > 0 ):
+
+            update_list = []
+            for current_person in batch_list:
+
+                if ( len( current_person.update_name_keys() ) > 0 ):
+
+                    update_list.append( current_person )
+
+                #-- END check to see if keys changed --#
+
+            #-- END loop over batch --#
+
+            if ( len( update_list ) > 0 ):
+
+                cls.objects.bulk_update( update_list, field_name_list )
+
+            #-- END check to see if updates --#
+
+            checked_count += len( batch_list )
+            updated_count += len( update_list )
+            last_id = batch_list[ -1 ].id
+            batch_list = list( person_qs.filter( id__gt = last_id )[ : batch_size_IN ] )
+
+        #-- END loop over batches --#
+
+        dict_OUT[ "checked" ] = checked_count
+        dict_OUT[ "updated" ] = updated_count
+
+        return dict_OUT
+
+    #-- END class method update_name_keys_in_batches() --#
+
 
     #---------------------------------------------------------------------------
     # ! ==> overridden built-in methods
@@ -1030,6 +1468,54 @@ class Person( Abstract_Person ):
     #-- END method update_entity() --#
 
 
+    def update_name_keys( self ):
+
+        '''
+        Sets the name key columns from the current name parts.  Called before
+            every save (see person_pre_save()), so only needs to be called
+            directly when rows are updated without save(), as in the
+            backfill_person_name_keys command.  Returns list of the names of
+            the key fields whose values changed.
+        '''
+
+        # return reference
+        list_OUT = []
+
+        # declare variables
+        key_dict = None
+        field_name = None
+        field_value = None
+
+        key_dict = NameKeyHelper.make_person_key_dict( self.first_name, self.middle_name, self.last_name )
+        for field_name, field_value in six.iteritems( key_dict ):
+
+            if ( getattr( self, field_name ) != field_value ):
+
+                setattr( self, field_name, field_value )
+                list_OUT.append( field_name )
+
+            #-- END check to see if changed --#
+
+        #-- END loop over key fields --#
+
+        return list_OUT
+
+    #-- END method update_name_keys() --#
+
+
+@receiver( pre_save, sender = Person )
+def person_pre_save( sender, instance, **kwargs ):
+
+    '''
+    Keeps Person name keys current on every save, including rows loaded from
+        fixtures (loaddata calls save_base(), not save()).
+    '''
+
+    instance.update_name_keys()
+
+#-- END function person_pre_save() --#
+
+
 #== END Person Model ===========================================================#
 
 
@@ -1684,6 +2170,15 @@ class Article( Abstract_Entity_Container ):
     class Meta:
         ordering = [ 'pub_date', 'section', 'page' ]
 
+        # indexes to match filter_articles(), Temp_Section, and NetworkOutput
+        #    filters (see benchmark_query_plans management command).
+        indexes = [
+            models.Index( fields = [ "pub_date" ], name = "article_pub_date_idx" ),
+            models.Index( fields = [ "newspaper", "pub_date", "section" ], name = "article_paper_date_sect_idx" ),
+            models.Index( fields = [ "section", "pub_date" ], name = "article_section_date_idx" ),
+            models.Index( fields = [ "unique_identifier" ], name = "article_unique_id_idx" ),
+        ]
+
     #----------------------------------------------------------------------------
     # ! ==> class methods
     #----------------------------------------------------------------------------
@@ -3388,6 +3883,23 @@ class Article_Text( Unique_Article_Content ):
     FIT_FIRST_WORD_NUMBER_LIST = "first_word_number_list"
     FIT_LAST_WORD_NUMBER_LIST = "last_word_number_list"
     FIT_PARAGRAPH_NUMBER_LIST = "paragraph_number_list"
+    FIT_ITEM_LIST = []
+    FIT_ITEM_LIST.append( FIT_CANONICAL_INDEX_LIST )
+    FIT_ITEM_LIST.append( FIT_TEXT_INDEX_LIST )
+    FIT_ITEM_LIST.append( FIT_FIRST_WORD_NUMBER_LIST )
+    FIT_ITEM_LIST.append( FIT_LAST_WORD_NUMBER_LIST )
+    FIT_ITEM_LIST.append( FIT_PARAGRAPH_NUMBER_LIST )
+
+    # Names of items in the dictionary of parse products built from content.
+    PARSE_CACHE_FIT_RESULTS = "fit_results"
+    PARSE_CACHE_PARAGRAPH_LIST = "paragraph_list"
+    PARSE_CACHE_PLAIN_TEXT = "plain_text"
+    PARSE_CACHE_WORD_LIST = "word_list"
+    PARSE_CACHE_WORD_OFFSET_INDEX = "word_offset_index"
+
+    # optional ParsedTextCache shared across instances, for batch runs - see
+    #    enable_shared_parse_cache().
+    shared_parse_cache = None
 
 
     #----------------------------------------------------------------------
@@ -3499,6 +4011,80 @@ class Article_Text( Unique_Article_Content ):
     #-- END class method convert_string_to_word_list() --#
 
 
+    @classmethod
+    def copy_FIT_values( cls, FIT_values_IN, item_list_IN = None ):
+
+        '''
+        Accepts a dictionary of results from a find_in_text() call and an
+           optional list of the items we want (defaults to all items in the
+           dictionary).  Returns a new dictionary with a copy of the list for
+           each item, so changes to one don't change the other.
+        '''
+
+        # return reference
+        dict_OUT = {}
+
+        # declare variables
+        item_name = ""
+        item_value = None
+
+        for item_name, item_value in six.iteritems( FIT_values_IN ):
+
+            # do we want this item?
+            if ( ( item_list_IN is None ) or ( item_name in item_list_IN ) ):
+
+                # copy lists - None is error marker, leave as-is.
+                if ( item_value is not None ):
+
+                    item_value = list( item_value )
+
+                #-- END check to see if None --#
+
+                dict_OUT[ item_name ] = item_value
+
+            #-- END check to see if item wanted --#
+
+        #-- END loop over items --#
+
+        return dict_OUT
+
+    #-- END class method copy_FIT_values() --#
+
+
+    @classmethod
+    def disable_shared_parse_cache( cls ):
+
+        '''
+        Turns off the parse cache shared across instances.  Instances go back
+           to caching only their own parse products.
+        '''
+
+        cls.shared_parse_cache = None
+
+    #-- END class method disable_shared_parse_cache() --#
+
+
+    @classmethod
+    def enable_shared_parse_cache( cls, max_size_IN = ParsedTextCache.DEFAULT_MAX_SIZE ):
+
+        '''
+        Turns on a bounded least-recently-used cache of parse products shared
+           by all Article_Text instances, keyed on content, so a batch run
+           that loads the same text more than once only parses it once.
+           Replaces any existing shared cache.  Returns the cache.
+        '''
+
+        # return reference
+        cache_OUT = None
+
+        cache_OUT = ParsedTextCache( max_size_IN = max_size_IN )
+        cls.shared_parse_cache = cache_OUT
+
+        return cache_OUT
+
+    #-- END class method enable_shared_parse_cache() --#
+
+
     @classmethod
     def process_paragraph_contents( cls, paragraph_element_list_IN, bs_helper_IN = None, *args, **kwargs ):
 
@@ -3705,6 +4291,10 @@ class Article_Text( Unique_Article_Content ):
         # call parent __init()__ first.
         super( Article_Text, self ).__init__( *args, **kwargs )
 
+        # parse products for content, built lazily - see get_parse_cache_dict().
+        self.parse_cache_dict = None
+        self.parse_cache_content = None
+
     #-- END method __init__() --#
 
 
@@ -3724,19 +4314,338 @@ class Article_Text( Unique_Article_Content ):
     #-- END method __str__() --#
 
 
-    def find_in_canonical_text( self, string_IN, do_multi_graph_check_IN = True ):
+    def clear_parse_cache( self ):
 
         '''
-        Accepts a string that we want to locate in the nested article text.
-        If found, returns a list of the indices of positions in the string where
-           the string was found (could be more than one).  If not found, returns
-           empty list.  If error, returns None.
+        Throws away this instance's parse products, so they are rebuilt from
+           content the next time they are needed.  Called whenever content is
+           changed through this class's methods.
         '''
 
-        # return reference.
-        list_OUT = []
+        self.parse_cache_dict = None
+        self.parse_cache_content = None
 
-        # declare variables
+    #-- END method clear_parse_cache() --#
+
+
+    def find_all_in_canonical_text( self, string_list_IN ):
+
+        '''
+        Accepts a list of non-empty strings.  Returns a dictionary that maps
+           each to what find_in_canonical_text() returns for it.  Finds direct
+           matches for all strings in one scan of the canonical text, then
+           calls find_in_canonical_text() for strings not found, to check if
+           they span paragraphs.
+        '''
+
+        # return reference
+        dict_OUT = {}
+
+        # declare variables
+        automaton = None
+        match_dict = None
+        current_string = ""
+
+        # one scan for all strings.
+        automaton = AhoCorasickAutomaton()
+        for current_string in string_list_IN:
+
+            automaton.add_pattern( current_string )
+
+        #-- END loop over strings --#
+
+        match_dict = automaton.find_all( self.get_content() )
+
+        # build output, falling back for strings not found.
+        for current_string in string_list_IN:
+
+            if ( current_string in match_dict ):
+
+                dict_OUT[ current_string ] = match_dict[ current_string ]
+
+            else:
+
+                dict_OUT[ current_string ] = self.find_in_canonical_text( current_string )
+
+            #-- END check to see if direct match --#
+
+        #-- END loop over strings --#
+
+        return dict_OUT
+
+    #-- END method find_all_in_canonical_text() --#
+
+
+    def find_all_in_paragraph_list( self, string_list_IN ):
+
+        '''
+        Accepts a list of non-empty strings.  Returns a dictionary that maps
+           each to what find_in_paragraph_list() returns for it.  Scans the
+           paragraphs once, joined by a space the way a string that spans
+           paragraphs reads: each match inside a paragraph adds that
+           paragraph's number, and a string only found across a paragraph
+           break gets the number of the paragraph it starts in.  Strings not
+           found at all fall back to find_in_paragraph_list(), which also
+           tries punctuation and white space differences.
+        '''
+
+        # return reference
+        dict_OUT = {}
+
+        # declare variables
+        automaton = None
+        paragraph_list = None
+        paragraph_start_list = None
+        paragraph_end_list = None
+        current_index = -1
+        current_paragraph = ""
+        joined_text = ""
+        spanning_dict = None
+        match_index = -1
+        current_string = ""
+        paragraph_index = -1
+        paragraph_number = -1
+        match_list = None
+
+        # one automaton for all strings.
+        automaton = AhoCorasickAutomaton()
+        for current_string in string_list_IN:
+
+            automaton.add_pattern( current_string )
+            dict_OUT[ current_string ] = []
+
+        #-- END loop over strings --#
+
+        # join paragraphs, remembering where each starts and ends.
+        paragraph_list = self.get_paragraph_list()
+        paragraph_start_list = []
+        paragraph_end_list = []
+        current_index = 0
+        for current_paragraph in paragraph_list:
+
+            paragraph_start_list.append( current_index )
+            current_index += len( current_paragraph )
+            paragraph_end_list.append( current_index )
+
+            # space between paragraphs.
+            current_index += 1
+
+        #-- END loop over paragraphs --#
+
+        joined_text = " ".join( paragraph_list )
+
+        # one scan of all paragraphs.
+        spanning_dict = {}
+        for match_index, current_string in automaton.iterate_matches( joined_text ):
+
+            # which paragraph does the match start in?
+            paragraph_index = bisect.bisect_right( paragraph_start_list, match_index ) - 1
+            paragraph_number = paragraph_index + 1
+
+            # ends in the same paragraph?
+            if ( ( match_index + len( current_string ) ) <= paragraph_end_list[ paragraph_index ] ):
+
+                match_list = dict_OUT[ current_string ]
+
+            else:
+
+                # spans paragraphs.
+                match_list = spanning_dict.setdefault( current_string, [] )
+
+            #-- END check to see if match spans paragraphs --#
+
+            # add paragraph number once (matches for a string come in order).
+            if ( ( len( match_list ) == 0 ) or ( match_list[ -1 ] != paragraph_number ) ):
+
+                match_list.append( paragraph_number )
+
+            #-- END check to see if paragraph already in list --#
+
+        #-- END loop over matches --#
+
+        # strings not in any one paragraph.
+        for current_string in string_list_IN:
+
+            if ( len( dict_OUT[ current_string ] ) == 0 ):
+
+                if ( current_string in spanning_dict ):
+
+                    # starts in one paragraph, ends in another.
+                    dict_OUT[ current_string ] = spanning_dict[ current_string ]
+
+                else:
+
+                    dict_OUT[ current_string ] = self.find_in_paragraph_list( current_string )
+
+                #-- END check to see if spans paragraphs --#
+
+            #-- END check to see if found --#
+
+        #-- END loop over strings --#
+
+        return dict_OUT
+
+    #-- END method find_all_in_paragraph_list() --#
+
+
+    def find_all_in_plain_text( self, string_list_IN, ignore_case_IN = False ):
+
+        '''
+        Accepts a list of non-empty strings.  Returns a dictionary that maps
+           each to what find_in_plain_text() returns for it.  If case matters,
+           finds all strings in one scan of the plain text.  If not, calls
+           find_in_plain_text() for each.
+        '''
+
+        # return reference
+        dict_OUT = {}
+
+        # declare variables
+        automaton = None
+        match_dict = None
+        current_string = ""
+
+        # case-sensitive?
+        if ( ignore_case_IN == False ):
+
+            # yes - one scan for all strings.
+            automaton = AhoCorasickAutomaton()
+            for current_string in string_list_IN:
+
+                automaton.add_pattern( current_string )
+
+            #-- END loop over strings --#
+
+            match_dict = automaton.find_all( self.get_content_sans_html() )
+
+            for current_string in string_list_IN:
+
+                dict_OUT[ current_string ] = match_dict.get( current_string, [] )
+
+            #-- END loop over strings --#
+
+        else:
+
+            # no - string by string.
+            for current_string in string_list_IN:
+
+                dict_OUT[ current_string ] = self.find_in_plain_text( current_string, ignore_case_IN = ignore_case_IN )
+
+            #-- END loop over strings --#
+
+        #-- END check to see if ignore case --#
+
+        return dict_OUT
+
+    #-- END method find_all_in_plain_text() --#
+
+
+    def find_all_in_word_list( self, string_list_IN ):
+
+        '''
+        Accepts a list of non-empty strings.  Returns a dictionary that maps
+           each to what find_in_word_list() returns for it.  Finds all strings
+           in one scan of the word list, then looks for the ones that weren't
+           found in one scan of the word list with punctuation removed.
+        '''
+
+        # return reference
+        dict_OUT = {}
+
+        # declare variables
+        remaining_string_list = None
+        remove_punctuation = False
+        automaton = None
+        pattern_dict = None
+        current_string = ""
+        string_word_list = None
+        match_dict = None
+        not_found_list = None
+        match_list = None
+        word_count = -1
+
+        remaining_string_list = list( string_list_IN )
+        for remove_punctuation in ( False, True ):
+
+            # build automaton over word tuples for strings left.
+            automaton = AhoCorasickAutomaton()
+            pattern_dict = {}
+            for current_string in remaining_string_list:
+
+                string_word_list = self.convert_string_to_word_list( current_string,
+                                                                     remove_html_IN = True,
+                                                                     remove_punctuation_IN = remove_punctuation,
+                                                                     clean_white_space_IN = True )
+
+                # any words?
+                if ( ( string_word_list is not None ) and ( len( string_word_list ) > 0 ) ):
+
+                    pattern_dict[ current_string ] = string_word_list
+                    automaton.add_pattern( tuple( string_word_list ), current_string )
+
+                else:
+
+                    # nothing to match on - let single-string method deal.
+                    dict_OUT[ current_string ] = self.find_in_word_list( current_string, remove_punctuation_IN = remove_punctuation )
+
+                #-- END check to see if any words --#
+
+            #-- END loop over strings --#
+
+            # scan word list once.
+            match_dict = automaton.find_all( self.get_word_list( remove_punctuation_IN = remove_punctuation ) )
+
+            # convert to first and last word numbers.
+            not_found_list = []
+            for current_string in pattern_dict:
+
+                match_list = match_dict.get( current_string, [] )
+                if ( len( match_list ) > 0 ):
+
+                    word_count = len( pattern_dict[ current_string ] )
+                    dict_OUT[ current_string ] = {}
+                    dict_OUT[ current_string ][ self.FIT_FIRST_WORD_NUMBER_LIST ] = [ match_index + 1 for match_index in match_list ]
+                    dict_OUT[ current_string ][ self.FIT_LAST_WORD_NUMBER_LIST ] = [ match_index + word_count for match_index in match_list ]
+
+                else:
+
+                    not_found_list.append( current_string )
+
+                #-- END check to see if found --#
+
+            #-- END loop over strings --#
+
+            remaining_string_list = not_found_list
+
+        #-- END loop over with and without punctuation --#
+
+        # anything left wasn't found either way.
+        for current_string in remaining_string_list:
+
+            dict_OUT[ current_string ] = {}
+            dict_OUT[ current_string ][ self.FIT_FIRST_WORD_NUMBER_LIST ] = []
+            dict_OUT[ current_string ][ self.FIT_LAST_WORD_NUMBER_LIST ] = []
+
+        #-- END loop over strings not found --#
+
+        return dict_OUT
+
+    #-- END method find_all_in_word_list() --#
+
+
+    def find_in_canonical_text( self, string_IN, do_multi_graph_check_IN = True ):
+
+        '''
+        Accepts a string that we want to locate in the nested article text.
+        If found, returns a list of the indices of positions in the string where
+           the string was found (could be more than one).  If not found, returns
+           empty list.  If error, returns None.
+        '''
+
+        # return reference.
+        list_OUT = []
+
+        # declare variables
         me = "find_in_canonical_text"
         index_OUT = -1
         my_text = ""
@@ -4556,6 +5465,8 @@ class Article_Text( Unique_Article_Content ):
                 number (s) of the paragraph in this article that contains the
                 string (or, if it spans multiple paragraphs, the start of this
                 string).
+        Results are remembered for the current content, so looking for the
+            same string again (or after find_in_text_batch()) doesn't search.
         '''
 
         # return reference
@@ -4566,6 +5477,8 @@ class Article_Text( Unique_Article_Content ):
         items_to_process = []
         temp_dictionary = {}
         current_value = None
+        fit_results_dict = None
+        cached_dictionary = None
 
         # do we have a string?
         if ( ( string_IN is not None ) and ( string_IN != "" ) ):
@@ -4579,87 +5492,262 @@ class Article_Text( Unique_Article_Content ):
             else:
 
                 # no - process all items.
-                items_to_process = []
-                items_to_process.append( self.FIT_CANONICAL_INDEX_LIST )
-                items_to_process.append( self.FIT_TEXT_INDEX_LIST )
-                items_to_process.append( self.FIT_FIRST_WORD_NUMBER_LIST )
-                items_to_process.append( self.FIT_LAST_WORD_NUMBER_LIST )
-                items_to_process.append( self.FIT_PARAGRAPH_NUMBER_LIST )
+                items_to_process = list( self.FIT_ITEM_LIST )
 
             #-- END check to see which items we process. --#
 
-            # go item by item.
+            # already found, by this method or find_in_text_batch()?
+            fit_results_dict = self.get_parse_cache_dict().setdefault( self.PARSE_CACHE_FIT_RESULTS, {} )
+            cached_dictionary = fit_results_dict.get( ( string_IN, ignore_case_IN ), None )
+            if ( cached_dictionary is not None ):
+
+                # yes - return copy of requested items.
+                dict_OUT = self.copy_FIT_values( cached_dictionary, items_to_process )
+
+            else:
+
+                # go item by item.
+
+                # FIT_CANONICAL_INDEX_LIST
+                if ( self.FIT_CANONICAL_INDEX_LIST in items_to_process ):
+
+                    # find the index of the start of the string in the canonical
+                    #    text for this article (paragraphs preserved as <p> tags).
+                    current_value = self.find_in_canonical_text( string_IN )
+                    dict_OUT[ self.FIT_CANONICAL_INDEX_LIST ] = current_value
+
+                #-- END FIT_CANONICAL_INDEX_LIST --#
+
+                # FIT_TEXT_INDEX_LIST
+                if ( self.FIT_TEXT_INDEX_LIST in items_to_process ):
+
+                    # find the index of the start of the string in the plain text
+                    #    for this article.
+                    current_value = self.find_in_plain_text( string_IN, ignore_case_IN = ignore_case_IN )
+                    dict_OUT[ self.FIT_TEXT_INDEX_LIST ] = current_value
+
+                #-- END FIT_TEXT_INDEX_LIST --#
+
+                # FIT_FIRST_WORD_NUMBER_LIST and/or FIT_LAST_WORD_NUMBER_LIST
+                if ( ( self.FIT_FIRST_WORD_NUMBER_LIST in items_to_process ) or ( self.FIT_LAST_WORD_NUMBER_LIST in items_to_process ) ):
+
+                    # find the position in the list of words in this article for the
+                    #    first and last words in the string passed in (also can
+                    #    approximate word count from this, as well).
+                    temp_dictionary = self.find_in_word_list( string_IN )
+
+                    # will return a dictionary with first and last number.
+                    if ( self.FIT_FIRST_WORD_NUMBER_LIST in items_to_process ):
+
+                        # get value and store it in output dictionary.
+                        current_value = temp_dictionary[ self.FIT_FIRST_WORD_NUMBER_LIST ]
+                        dict_OUT[ self.FIT_FIRST_WORD_NUMBER_LIST ] = current_value
+
+                    #-- END check to see if we return number of first word in word list. --#
+
+                    # will return a dictionary with first and last number.
+                    if ( self.FIT_LAST_WORD_NUMBER_LIST in items_to_process ):
+
+                        # get value and store it in output dictionary.
+                        current_value = temp_dictionary[ self.FIT_LAST_WORD_NUMBER_LIST ]
+                        dict_OUT[ self.FIT_LAST_WORD_NUMBER_LIST ] = current_value
+
+                    #-- END check to see if we return number of first word in word list. --#
+
+                #-- FIT_FIRST_WORD_NUMBER_LIST and/or FIT_LAST_WORD_NUMBER_LIST --#
+
+                # FIT_PARAGRAPH_NUMBER_LIST
+                if ( self.FIT_PARAGRAPH_NUMBER_LIST in items_to_process ):
+
+                    # find the number of the paragraph in this article that contains
+                    #    the string passed in.  If through some error or insanity
+                    #    the string starts in one paragraph and ends in another,
+                    #    will find the paragraph in which it starts.
+                    current_value = self.find_in_paragraph_list( string_IN )
+                    dict_OUT[ self.FIT_PARAGRAPH_NUMBER_LIST ] = current_value
+
+                #-- END FIT_PARAGRAPH_NUMBER_LIST --#
+
+                # did we look for everything?  If so, remember.
+                if ( len( dict_OUT ) == len( self.FIT_ITEM_LIST ) ):
+
+                    fit_results_dict[ ( string_IN, ignore_case_IN ) ] = self.copy_FIT_values( dict_OUT )
+
+                #-- END check to see if all items --#
+
+            #-- END check to see if already found --#
+
+        else:
+
+            # no string passed in, return None.
+            dict_OUT = None
+
+        #-- END check to see if string passed in. --#
+
+        return dict_OUT
+
+    #-- END method find_in_text() --#
+
+
+    def find_in_text_batch( self, string_list_IN, requested_items_IN = None, ignore_case_IN = False, *args, **kwargs ):
+
+        '''
+        Accepts a list of strings that we want to locate in the nested article
+            text (all the mentions and quotations in an article, for example).
+            Returns a dictionary that maps each string to what find_in_text()
+            returns for it, with the same requested_items_IN and
+            ignore_case_IN.
+
+        Rather than scanning the text once per string, builds an Aho-Corasick
+            automaton over all of the strings and scans each view of the text
+            (canonical text, plain text, paragraphs, word list) once.  Strings
+            that span paragraphs are placed from the same scan of the
+            paragraphs.  Strings not found directly in a view (punctuation or
+            white space differences) fall back to the single-string
+            find_in_*() methods for that view.  Results are also
+            stored so later find_in_text() calls for these strings on this
+            content don't search again.
+        '''
+
+        # return reference
+        dict_OUT = {}
+
+        # declare variables
+        me = "find_in_text_batch"
+        items_to_process = []
+        string_list = []
+        current_string = ""
+        string_dict = None
+        fit_results_dict = None
+        cached_dictionary = None
+        canonical_dict = None
+        text_index_dict = None
+        word_dict = None
+        paragraph_dict = None
+
+        # got any requested items?
+        if ( ( requested_items_IN is not None ) and ( len( requested_items_IN ) > 0 ) ):
+
+            # yes.  use this as list of items to process.
+            items_to_process = requested_items_IN
+
+        else:
+
+            # no - process all items.
+            items_to_process = list( self.FIT_ITEM_LIST )
+
+        #-- END check to see which items we process. --#
+
+        # get unique strings we haven't already found.
+        fit_results_dict = self.get_parse_cache_dict().setdefault( self.PARSE_CACHE_FIT_RESULTS, {} )
+        string_list = []
+        for current_string in string_list_IN:
+
+            # skip empty strings and ones we've already done.
+            if ( ( current_string is not None ) and ( current_string != "" )
+                and ( current_string not in dict_OUT ) ):
+
+                # already found?
+                cached_dictionary = fit_results_dict.get( ( current_string, ignore_case_IN ), None )
+                if ( cached_dictionary is not None ):
+
+                    dict_OUT[ current_string ] = self.copy_FIT_values( cached_dictionary, items_to_process )
+
+                else:
+
+                    dict_OUT[ current_string ] = {}
+                    string_list.append( current_string )
+
+                #-- END check to see if already found --#
+
+            elif ( ( current_string is None ) or ( current_string == "" ) ):
+
+                # same as find_in_text()
+                dict_OUT[ current_string ] = None
+
+            #-- END check to see if valid string --#
+
+        #-- END loop over strings --#
+
+        # anything left to look for?
+        if ( len( string_list ) > 0 ):
 
             # FIT_CANONICAL_INDEX_LIST
             if ( self.FIT_CANONICAL_INDEX_LIST in items_to_process ):
 
-                # find the index of the start of the string in the canonical
-                #    text for this article (paragraphs preserved as <p> tags).
-                current_value = self.find_in_canonical_text( string_IN )
-                dict_OUT[ self.FIT_CANONICAL_INDEX_LIST ] = current_value
+                canonical_dict = self.find_all_in_canonical_text( string_list )
+                for current_string in string_list:
+
+                    dict_OUT[ current_string ][ self.FIT_CANONICAL_INDEX_LIST ] = canonical_dict[ current_string ]
+
+                #-- END loop over strings --#
 
             #-- END FIT_CANONICAL_INDEX_LIST --#
 
             # FIT_TEXT_INDEX_LIST
             if ( self.FIT_TEXT_INDEX_LIST in items_to_process ):
 
-                # find the index of the start of the string in the plain text
-                #    for this article.
-                current_value = self.find_in_plain_text( string_IN, ignore_case_IN = ignore_case_IN )
-                dict_OUT[ self.FIT_TEXT_INDEX_LIST ] = current_value
+                text_index_dict = self.find_all_in_plain_text( string_list, ignore_case_IN = ignore_case_IN )
+                for current_string in string_list:
+
+                    dict_OUT[ current_string ][ self.FIT_TEXT_INDEX_LIST ] = text_index_dict[ current_string ]
+
+                #-- END loop over strings --#
 
             #-- END FIT_TEXT_INDEX_LIST --#
 
             # FIT_FIRST_WORD_NUMBER_LIST and/or FIT_LAST_WORD_NUMBER_LIST
             if ( ( self.FIT_FIRST_WORD_NUMBER_LIST in items_to_process ) or ( self.FIT_LAST_WORD_NUMBER_LIST in items_to_process ) ):
 
-                # find the position in the list of words in this article for the
-                #    first and last words in the string passed in (also can
-                #    approximate word count from this, as well).
-                temp_dictionary = self.find_in_word_list( string_IN )
+                word_dict = self.find_all_in_word_list( string_list )
+                for current_string in string_list:
 
-                # will return a dictionary with first and last number.
-                if ( self.FIT_FIRST_WORD_NUMBER_LIST in items_to_process ):
+                    string_dict = dict_OUT[ current_string ]
+                    if ( self.FIT_FIRST_WORD_NUMBER_LIST in items_to_process ):
 
-                    # get value and store it in output dictionary.
-                    current_value = temp_dictionary[ self.FIT_FIRST_WORD_NUMBER_LIST ]
-                    dict_OUT[ self.FIT_FIRST_WORD_NUMBER_LIST ] = current_value
+                        string_dict[ self.FIT_FIRST_WORD_NUMBER_LIST ] = word_dict[ current_string ][ self.FIT_FIRST_WORD_NUMBER_LIST ]
 
-                #-- END check to see if we return number of first word in word list. --#
+                    #-- END check to see if first word --#
 
-                # will return a dictionary with first and last number.
-                if ( self.FIT_LAST_WORD_NUMBER_LIST in items_to_process ):
+                    if ( self.FIT_LAST_WORD_NUMBER_LIST in items_to_process ):
 
-                    # get value and store it in output dictionary.
-                    current_value = temp_dictionary[ self.FIT_LAST_WORD_NUMBER_LIST ]
-                    dict_OUT[ self.FIT_LAST_WORD_NUMBER_LIST ] = current_value
+                        string_dict[ self.FIT_LAST_WORD_NUMBER_LIST ] = word_dict[ current_string ][ self.FIT_LAST_WORD_NUMBER_LIST ]
 
-                #-- END check to see if we return number of first word in word list. --#
+                    #-- END check to see if last word --#
 
-            #-- FIT_FIRST_WORD_NUMBER_LIST and/or FIT_LAST_WORD_NUMBER_LIST --#
+                #-- END loop over strings --#
+
+            #-- END FIT_FIRST_WORD_NUMBER_LIST and/or FIT_LAST_WORD_NUMBER_LIST --#
 
             # FIT_PARAGRAPH_NUMBER_LIST
             if ( self.FIT_PARAGRAPH_NUMBER_LIST in items_to_process ):
 
-                # find the number of the paragraph in this article that contains
-                #    the string passed in.  If through some error or insanity
-                #    the string starts in one paragraph and ends in another,
-                #    will find the paragraph in which it starts.
-                current_value = self.find_in_paragraph_list( string_IN )
-                dict_OUT[ self.FIT_PARAGRAPH_NUMBER_LIST ] = current_value
+                paragraph_dict = self.find_all_in_paragraph_list( string_list )
+                for current_string in string_list:
+
+                    dict_OUT[ current_string ][ self.FIT_PARAGRAPH_NUMBER_LIST ] = paragraph_dict[ current_string ]
+
+                #-- END loop over strings --#
 
             #-- END FIT_PARAGRAPH_NUMBER_LIST --#
 
-        else:
+            # remember results that have all items.
+            for current_string in string_list:
 
-            # no string passed in, return None.
-            dict_OUT = None
+                string_dict = dict_OUT[ current_string ]
+                if ( len( string_dict ) == len( self.FIT_ITEM_LIST ) ):
 
-        #-- END check to see if string passed in. --#
+                    fit_results_dict[ ( current_string, ignore_case_IN ) ] = self.copy_FIT_values( string_dict )
+
+                #-- END check to see if all items --#
+
+            #-- END loop over strings --#
+
+        #-- END check to see if anything to look for --#
 
         return dict_OUT
 
-    #-- END method find_in_text() --#
+    #-- END method find_in_text_batch() --#
 
 
     def find_in_word_list( self, string_IN, remove_punctuation_IN = False ):
@@ -4691,6 +5779,7 @@ class Article_Text( Unique_Article_Content ):
         match_index = -1
         string_word_count = -1
         recurse_results_dict = None
+        word_offset_index = None
 
         # got a string?
         if ( ( string_IN is not None ) and ( string_IN != "" ) ):
@@ -4708,13 +5797,35 @@ class Article_Text( Unique_Article_Content ):
 
             #output_debug( "search word list: " + str( string_word_list ) )
 
-            # try the KnuthMorrisPratt algorithm from Python Cookbook 2nd Ed.
-            for match_index in SequenceHelper.KnuthMorrisPratt( my_word_list, string_word_list ):
+            # got any words to look for?
+            if ( ( string_word_list is not None ) and ( len( string_word_list ) > 0 ) ):
+
+                # yes - only check positions where first word occurs.
+                word_offset_index = self.get_word_offset_index( remove_punctuation_IN = remove_punctuation_IN )
+                string_word_count = len( string_word_list )
+                for match_index in word_offset_index.get( string_word_list[ 0 ], [] ):
 
-                # append match to list.
-                match_list.append( match_index )
+                    # rest of words match?
+                    if ( my_word_list[ match_index : match_index + string_word_count ] == string_word_list ):
 
-            #-- END loop over matches. --#
+                        # append match to list.
+                        match_list.append( match_index )
+
+                    #-- END check to see if match --#
+
+                #-- END loop over matches. --#
+
+            else:
+
+                # try the KnuthMorrisPratt algorithm from Python Cookbook 2nd Ed.
+                for match_index in SequenceHelper.KnuthMorrisPratt( my_word_list, string_word_list ):
+
+                    # append match to list.
+                    match_list.append( match_index )
+
+                #-- END loop over matches. --#
+
+            #-- END check to see if words to look for --#
 
             # got anything?
             if ( len( match_list ) > 0 ):
@@ -4804,12 +5915,23 @@ class Article_Text( Unique_Article_Content ):
 
         # declare variables
         me = "get_content_sans_html"
+        parse_dict = None
 
-        # get the content.
-        content_OUT = self.content
+        # already parsed?
+        parse_dict = self.get_parse_cache_dict()
+        content_OUT = parse_dict.get( self.PARSE_CACHE_PLAIN_TEXT, None )
+        if ( content_OUT is None ):
+
+            # no - get the content.
+            content_OUT = self.content
 
-        # strip all HTML
-        content_OUT = HTMLHelper.remove_html( content_OUT, bs_parser_IN = BS_PARSER )
+            # strip all HTML
+            content_OUT = HTMLHelper.remove_html( content_OUT, bs_parser_IN = BS_PARSER )
+
+            # store for next time.
+            parse_dict[ self.PARSE_CACHE_PLAIN_TEXT ] = content_OUT
+
+        #-- END check to see if already parsed --#
 
         return content_OUT
 
@@ -4822,6 +5944,8 @@ class Article_Text( Unique_Article_Content ):
         Looks in nested content for paragraph tags.  Returns a list of the text
            in paragraph tags, in the same order as they appeared in the content,
            with no nested HTML.  If no <p> tags, returns a list with a single item - all of the text.
+           Content is only parsed the first time this is called after it
+           changes - see parse_paragraph_list() for the actual parsing.
         Preconditions: None
         Postconditions: None
 
@@ -4832,9 +5956,211 @@ class Article_Text( Unique_Article_Content ):
         list_OUT = []
 
         # declare variables
-        me = "get_paragraph_list"
-        my_content = ""
-        content_bs = None
+        parse_dict = None
+        paragraph_list = None
+
+        # already parsed?
+        parse_dict = self.get_parse_cache_dict()
+        paragraph_list = parse_dict.get( self.PARSE_CACHE_PARAGRAPH_LIST, None )
+        if ( paragraph_list is None ):
+
+            # no - parse and store.
+            paragraph_list = self.parse_paragraph_list()
+            parse_dict[ self.PARSE_CACHE_PARAGRAPH_LIST ] = paragraph_list
+
+        #-- END check to see if already parsed --#
+
+        # return a copy, so callers can't change what is cached.
+        list_OUT = list( paragraph_list )
+
+        return list_OUT
+
+    #-- END method get_paragraph_list() --#
+
+
+    def get_parse_cache_dict( self ):
+
+        '''
+        Returns the dictionary of parse products (paragraph list, plain text,
+           word lists, word offset indexes) for this instance's current
+           content, throwing away the old one if content has changed since it
+           was built.  If a shared parse cache is enabled, the dictionary comes
+           from there, so instances with the same content share it.  Items are
+           added to the dictionary as they are parsed, by the methods that use
+           them.
+        '''
+
+        # return reference
+        dict_OUT = None
+
+        # declare variables
+        my_content = None
+
+        # get the content.
+        my_content = self.content
+
+        # got a dictionary for the current content?
+        dict_OUT = self.parse_cache_dict
+        if ( ( dict_OUT is None ) or ( self.parse_cache_content != my_content ) ):
+
+            # no - shared cache?
+            if ( Article_Text.shared_parse_cache is not None ):
+
+                # yes - get from there.
+                dict_OUT = Article_Text.shared_parse_cache.get_parse_dict( my_content )
+
+            else:
+
+                # no - start empty.
+                dict_OUT = {}
+
+            #-- END check to see if shared cache --#
+
+            # store with content it goes with.
+            self.parse_cache_dict = dict_OUT
+            self.parse_cache_content = my_content
+
+        #-- END check to see if dictionary is current --#
+
+        return dict_OUT
+
+    #-- END method get_parse_cache_dict() --#
+
+
+    def get_word_list( self, remove_punctuation_IN = False, *args, **kwargs ):
+
+        '''
+        Creates list of words contained in nested content.  Returns a list of
+           the words in the Article_Text, with each word added as an item in the
+           list, in the same order as they appeared in the content, with no
+           nested HTML.  Content is only parsed the first time this is called
+           after it changes - see parse_word_list() for the actual parsing.
+        Preconditions: None
+        Postconditions: None
+
+        Returns a list of the words in the content.
+        '''
+
+        # return reference
+        list_OUT = []
+
+        # declare variables
+        parse_dict = None
+        cache_key = ""
+        word_list = None
+
+        # already parsed?
+        parse_dict = self.get_parse_cache_dict()
+        cache_key = self.PARSE_CACHE_WORD_LIST + "-" + str( remove_punctuation_IN )
+        word_list = parse_dict.get( cache_key, None )
+        if ( word_list is None ):
+
+            # no - parse and store.
+            word_list = self.parse_word_list( remove_punctuation_IN = remove_punctuation_IN )
+            parse_dict[ cache_key ] = word_list
+
+        #-- END check to see if already parsed --#
+
+        # return a copy, so callers can't change what is cached.
+        list_OUT = list( word_list )
+
+        return list_OUT
+
+    #-- END method get_word_list() --#
+
+
+    def get_word_offset_index( self, remove_punctuation_IN = False, *args, **kwargs ):
+
+        '''
+        Returns a dictionary that maps each word in the word list for this
+           Article_Text (see get_word_list()) to a list of the indexes in the
+           word list where it occurs, in ascending order.  Built once per
+           content, like the word list.  Do not change what is returned.
+        '''
+
+        # return reference
+        dict_OUT = None
+
+        # declare variables
+        parse_dict = None
+        cache_key = ""
+        word_list = None
+        word_index = -1
+        current_word = ""
+
+        # already built?
+        parse_dict = self.get_parse_cache_dict()
+        cache_key = self.PARSE_CACHE_WORD_OFFSET_INDEX + "-" + str( remove_punctuation_IN )
+        dict_OUT = parse_dict.get( cache_key, None )
+        if ( dict_OUT is None ):
+
+            # no - build from word list.
+            dict_OUT = {}
+            word_list = self.get_word_list( remove_punctuation_IN = remove_punctuation_IN )
+            for word_index, current_word in enumerate( word_list ):
+
+                dict_OUT.setdefault( current_word, [] ).append( word_index )
+
+            #-- END loop over words --#
+
+            # store for next time.
+            parse_dict[ cache_key ] = dict_OUT
+
+        #-- END check to see if already built --#
+
+        return dict_OUT
+
+    #-- END method get_word_offset_index() --#
+
+
+    def make_paragraph_string( self, paragraph_element_list_IN, *args, **kwargs ):
+
+        '''
+        Accepts a list of the contents of a paragraph.  Loops over them and
+           pulls them all together into one string.  Returns the string.
+
+        Params:
+        - paragraph_element_list_IN - list of BeautifulSoup4 elements that from an article paragraph.
+        '''
+
+        # return reference
+        string_OUT = ""
+
+        # declare variables
+        my_bs_helper = ""
+
+        # initialize BeautifulSoup helper
+        my_bs_helper = self.get_bs_helper()
+
+        # call class method
+        string_OUT = self.process_paragraph_contents( paragraph_element_list_IN, my_bs_helper )
+
+        return string_OUT
+
+    #-- END method make_paragraph_string() --#
+
+
+    def parse_paragraph_list( self, *args, **kwargs ):
+
+        '''
+        Looks in nested content for paragraph tags.  Returns a list of the text
+           in paragraph tags, in the same order as they appeared in the content,
+           with no nested HTML.  If no <p> tags, returns a list with a single item - all of the text.
+        Preconditions: None
+        Postconditions: None
+
+        Always parses - use get_paragraph_list(), which caches the result.
+
+        Returns a list of the paragraphs in the content.
+        '''
+
+        # return reference
+        list_OUT = []
+
+        # declare variables
+        me = "parse_paragraph_list"
+        my_content = ""
+        content_bs = None
         p_tag_list = []
         p_tag_count = -1
         current_p_tag = None
@@ -4881,10 +6207,10 @@ class Article_Text( Unique_Article_Content ):
 
         return list_OUT
 
-    #-- END method get_paragraph_list() --#
+    #-- END method parse_paragraph_list() --#
 
 
-    def get_word_list( self, remove_punctuation_IN = False, *args, **kwargs ):
+    def parse_word_list( self, remove_punctuation_IN = False, *args, **kwargs ):
 
         '''
         Creates list of words contained in nested content.  Returns a list of
@@ -4894,6 +6220,8 @@ class Article_Text( Unique_Article_Content ):
         Preconditions: None
         Postconditions: None
 
+        Always parses - use get_word_list(), which caches the result.
+
         Returns a list of the words in the content.
         '''
 
@@ -4901,7 +6229,7 @@ class Article_Text( Unique_Article_Content ):
         list_OUT = []
 
         # declare variables
-        me = "get_paragraph_list"
+        me = "parse_word_list"
         my_content = ""
         cleaned_content = ""
         word_list = []
@@ -4949,34 +6277,7 @@ class Article_Text( Unique_Article_Content ):
 
         return list_OUT
 
-    #-- END method get_word_list() --#
-
-
-    def make_paragraph_string( self, paragraph_element_list_IN, *args, **kwargs ):
-
-        '''
-        Accepts a list of the contents of a paragraph.  Loops over them and
-           pulls them all together into one string.  Returns the string.
-
-        Params:
-        - paragraph_element_list_IN - list of BeautifulSoup4 elements that from an article paragraph.
-        '''
-
-        # return reference
-        string_OUT = ""
-
-        # declare variables
-        my_bs_helper = ""
-
-        # initialize BeautifulSoup helper
-        my_bs_helper = self.get_bs_helper()
-
-        # call class method
-        string_OUT = self.process_paragraph_contents( paragraph_element_list_IN, my_bs_helper )
-
-        return string_OUT
-
-    #-- END method make_paragraph_string() --#
+    #-- END method parse_word_list() --#
 
 
     def remove_paragraphs( self, paragraph_id_list_IN, *args, **kwargs ):
@@ -5107,6 +6408,7 @@ class Article_Text( Unique_Article_Content ):
 
             # store back in content
             self.content = canonical_text
+            self.clear_parse_cache()
 
         else:
 
@@ -5146,7 +6448,7 @@ class Article_Text( Unique_Article_Content ):
         # get content
         my_content = self.get_content()
 
-        # clean that content
+        # clean that content (also clears parse cache).
         self.set_text( my_content, self.do_clean_on_save )
 
         # call parent save() method
@@ -5189,6 +6491,9 @@ class Article_Text( Unique_Article_Content ):
         # set the text in the instance and return the content.
         text_OUT = self.set_content( text_value )
 
+        # content changed - parse products are stale.
+        self.clear_parse_cache()
+
         return text_OUT
 
     #-- END method set_text() --#
@@ -5277,6 +6582,13 @@ class Article_Data( models.Model ):
     class Meta:
         ordering = [ 'article', 'last_modified', 'create_date' ]
 
+        # indexes to match filter_records() and NetworkOutput filters.
+        indexes = [
+            models.Index( fields = [ "coder_type" ], name = "article_data_coder_type_idx" ),
+            models.Index( fields = [ "status" ], name = "article_data_status_idx" ),
+            models.Index( fields = [ "article", "coder" ], name = "article_data_art_coder_idx" ),
+        ]
+
 
     #----------------------------------------------------------------------
     # ! ==> class methods
@@ -6046,6 +7358,103 @@ class Article_Data( models.Model ):
     #-- END class method make_deep_copy() --#
 
 
+    @classmethod
+    def make_deep_copies( cls, id_list_IN, new_coder_user_id_IN = None, batch_size_IN = DEFAULT_DEEP_COPY_BATCH_SIZE, *args, **kwargs ):
+
+        '''
+        Batched version of make_deep_copy().  Accepts list of IDs of
+            Article_Data we want to make deep copies of and the optional ID of
+            a User we want to set as coder in the copies.  Copies the tree a
+            level at a time - one query to read each table for all the IDs
+            passed in, then bulk_create() to insert the copies, using maps of
+            old ID to new instance to re-point ForeignKeys and ManyToMany
+            through rows.  All in one transaction.  Once copied, rebuilds each
+            copy's Article_Data_Network_Tie rows (bulk_create() does not call
+            Article_Person.save()).
+
+        Returns dictionary of old Article_Data ID to new Article_Data instance.
+        '''
+
+        # return reference
+        id_map_OUT = {}
+
+        # declare variables
+        me = "make_deep_copies"
+        debug_message = ""
+        my_logger_name = "context_text.models.Article_Data"
+        change_dict = None
+        copy_from_list = None
+        copy_from_article_data = None
+        copy_to_article_data = None
+        related_list = None
+        related_id_list = None
+
+        # got IDs?
+        if ( ( id_list_IN is not None ) and ( len( id_list_IN ) > 0 ) ):
+
+            # do we have a User to set as the coder in the copies?
+            change_dict = None
+            if ( ( new_coder_user_id_IN is not None )
+                and ( isinstance( new_coder_user_id_IN, six.integer_types ) == True )
+                and ( new_coder_user_id_IN > 0 ) ):
+
+                if ( User.objects.filter( pk = new_coder_user_id_IN ).exists() == True ):
+
+                    change_dict = { "coder_id" : new_coder_user_id_IN }
+
+                else:
+
+                    debug_message = "attempt to lookup user ID " + str( new_coder_user_id_IN ) + " failed - copies keep original coder."
+                    output_debug( debug_message, me, logger_name_IN = my_logger_name )
+
+                #-- END check to see if user exists --#
+
+            #-- END check to see if ID of user to set as coder --#
+
+            with transaction.atomic():
+
+                # ! ----> Article_Data
+                copy_from_list = list( cls.objects.filter( pk__in = id_list_IN ).order_by( "id" ).prefetch_related( "article_data_notes_set" ) )
+                id_map_OUT = bulk_copy_instances( copy_from_list, change_dict_IN = change_dict, batch_size_IN = batch_size_IN )
+
+                debug_message = "deep copying " + str( len( id_map_OUT ) ) + " Article_Data records."
+                output_debug( debug_message, me, logger_name_IN = my_logger_name )
+
+                # ! ----> ManyToMany - topics, locations, projects
+                bulk_copy_m2m_values( "topics", id_map_OUT, batch_size_IN = batch_size_IN )
+                bulk_copy_m2m_values( "locations", id_map_OUT, batch_size_IN = batch_size_IN )
+                bulk_copy_m2m_values( "projects", id_map_OUT, batch_size_IN = batch_size_IN )
+
+                # ! ----> Article_Data_Notes
+                related_list = []
+                for copy_from_article_data in copy_from_list:
+
+                    related_list.extend( copy_from_article_data.article_data_notes_set.all() )
+
+                #-- END loop over Article_Data --#
+
+                bulk_copy_instances( related_list, "article_data", id_map_OUT, batch_size_IN = batch_size_IN )
+
+                # ! ----> Article_Author
+                related_id_list = list( Article_Author.objects.filter( article_data_id__in = id_map_OUT.keys() ).values_list( "id", flat = True ) )
+                Article_Author.make_deep_copies( related_id_list, article_data_id_map_IN = id_map_OUT, batch_size_IN = batch_size_IN )
+
+                # ! ----> Article_Subject
+                related_id_list = list( Article_Subject.objects.filter( article_data_id__in = id_map_OUT.keys() ).values_list( "id", flat = True ) )
+                Article_Subject.make_deep_copies( related_id_list, article_data_id_map_IN = id_map_OUT, batch_size_IN = batch_size_IN )
+
+                # ! ----> Article_Data_Network_Tie
+                Article_Data_Network_Tie.update_for_article_data_qs( cls.objects.filter( pk__in = [ copy_to_article_data.pk for copy_to_article_data in six.itervalues( id_map_OUT ) ] ) )
+
+            #-- END with transaction --#
+
+        #-- END check to see if IDs passed in --#
+
+        return id_map_OUT
+
+    #-- END class method make_deep_copies() --#
+
+
     #----------------------------------------------------------------------------
     # ! ==> instance methods
     #----------------------------------------------------------------------------
@@ -6345,6 +7754,467 @@ class Article_Data_Notes( Abstract_Related_JSON_Content ):
 #-- END abstract Article_Data_Notes model --#
 
 
+# Article_Data_Network_Tie model
+class Article_Data_Network_Tie( models.Model ):
+
+    '''
+    Precomputed contribution of a single Article_Data to the author-source
+       network.  Rows are rebuilt whenever one of the Article_Data's
+       Article_Author or Article_Subject records is saved or deleted (see
+       request_update() - inside defer_updates(), as when ArticleCoder codes
+       an article, once per Article_Data when the block ends), so a network
+       for any set of Article_Data can be built by aggregating these rows in
+       SQL (see NetworkDataOutput.process_network_ties()) rather than by
+       loading every author and source.  Types of rows:
+       - author - one per author person (to_person is empty).  Makes sure
+          authors are in the network as authors even if they have no ties.
+       - source - one per quoted source person, with source traits (to_person
+          is empty).  Only stored if the Article_Data has at least one
+          Article_Author, to match what NetworkDataOutput does.
+       - author_author - one per pair of author people.
+       - author_source - one per author person and quoted source, with the
+          source's traits so sources can be filtered on them when the network
+          is built.
+       Ties are stored once, and are made reciprocal at aggregation time.
+    '''
+
+    #----------------------------------------------------------------------
+    # ! ==> constants-ish
+    #----------------------------------------------------------------------
+
+
+    TIE_TYPE_AUTHOR = "author"
+    TIE_TYPE_SOURCE = "source"
+    TIE_TYPE_AUTHOR_AUTHOR = "author_author"
+    TIE_TYPE_AUTHOR_SOURCE = "author_source"
+
+    TIE_TYPE_CHOICES = (
+        ( TIE_TYPE_AUTHOR, "Author" ),
+        ( TIE_TYPE_SOURCE, "Source" ),
+        ( TIE_TYPE_AUTHOR_AUTHOR, "Author - Author tie" ),
+        ( TIE_TYPE_AUTHOR_SOURCE, "Author - Source tie" ),
+    )
+
+    # per-thread deferred update state for defer_updates() - depth of nested
+    #    defer_updates() blocks, and IDs of Article_Data to rebuild at the end.
+    deferred_update_local = threading.local()
+
+
+    #----------------------------------------------------------------------
+    # ! ==> model fields
+    #----------------------------------------------------------------------
+
+
+    article_data = models.ForeignKey( Article_Data, on_delete = models.CASCADE )
+    tie_type = models.CharField( max_length = 255, choices = TIE_TYPE_CHOICES, db_index = True )
+    from_person = models.ForeignKey( Person, on_delete = models.CASCADE, related_name = "%(app_label)s_%(class)s_from_person_set" )
+    to_person = models.ForeignKey( Person, on_delete = models.CASCADE, blank = True, null = True, related_name = "%(app_label)s_%(class)s_to_person_set" )
+    tie_count = models.IntegerField( default = 1 )
+    source_type = models.CharField( max_length = 255, blank = True, null = True )
+    source_contact_type = models.CharField( max_length = 255, blank = True, null = True )
+    source_capacity = models.CharField( max_length = 255, blank = True, null = True )
+    create_date = models.DateTimeField( auto_now_add = True )
+
+    # meta class with ordering.
+    class Meta:
+
+        ordering = [ 'article_data', 'id' ]
+
+    #-- END nested Meta class --#
+
+
+    #----------------------------------------------------------------------
+    # ! ==> class methods
+    #----------------------------------------------------------------------
+
+
+    @classmethod
+    @contextlib.contextmanager
+    def defer_updates( cls ):
+
+        '''
+        Context manager.  Inside it, request_update() (called by
+           Article_Person save() and delete()) just remembers the Article_Data
+           ID, and when the outermost block ends, even because of an
+           exception, the ties of each of those Article_Data are rebuilt once,
+           rather than once per author or source saved.  Per thread.
+        '''
+
+        # declare variables
+        my_local = None
+        article_data_id_set = None
+        article_data_id = None
+
+        my_local = cls.deferred_update_local
+        if ( getattr( my_local, "depth", 0 ) == 0 ):
+
+            my_local.depth = 0
+            my_local.article_data_id_set = set()
+
+        #-- END check to see if outermost --#
+
+        my_local.depth += 1
+        try:
+
+            yield
+
+        finally:
+
+            my_local.depth -= 1
+            if ( my_local.depth == 0 ):
+
+                # outermost - rebuild each Article_Data once.
+                article_data_id_set = my_local.article_data_id_set
+                my_local.article_data_id_set = set()
+                for article_data_id in sorted( article_data_id_set ):
+
+                    cls.update_for_article_data( article_data_id )
+
+                #-- END loop over deferred Article_Data IDs --#
+
+            #-- END check to see if outermost --#
+
+        #-- END try...finally around deferred block --#
+
+    #-- END class method defer_updates() --#
+
+
+    @classmethod
+    def make_ties_for_article_data( cls, article_data_id_IN ):
+
+        '''
+        Accepts ID of Article_Data.  Loads the person IDs of its authors and
+           the person IDs and traits of its quoted sources (one query each),
+           then builds the list of (unsaved) Article_Data_Network_Tie
+           instances that capture that Article_Data's contribution to the
+           network, following the same rules as NetworkDataOutput.render():
+           - authors without a person are skipped, and each author person is
+              only counted once.
+           - each pair of author people is tied once.
+           - each author person is tied to each quoted source that has a
+              person.
+        Returns the list.
+        '''
+
+        # return reference
+        list_OUT = []
+
+        # declare variables
+        author_count = -1
+        author_person_id_list = None
+        author_person_id = None
+        source_value_list = None
+        source_values = None
+        source_person_id = None
+        author_index = -1
+        other_person_id = None
+
+        # load authors
+        author_person_id_list = []
+        author_count = 0
+        for author_person_id in Article_Author.objects.filter( article_data_id = article_data_id_IN ).order_by( "id" ).values_list( "person_id", flat = True ):
+
+            author_count += 1
+
+            # person, and not already seen?
+            if ( ( author_person_id is not None ) and ( author_person_id not in author_person_id_list ) ):
+
+                author_person_id_list.append( author_person_id )
+
+            #-- END check to see if person --#
+
+        #-- END loop over author person IDs --#
+
+        # only articles with authors contribute to the network.
+        if ( author_count > 0 ):
+
+            # load quoted sources that have a person.
+            source_value_list = Article_Subject.objects.filter( article_data_id = article_data_id_IN,
+                                                                subject_type = Article_Subject.SUBJECT_TYPE_QUOTED,
+                                                                person__isnull = False )
+            source_value_list = list( source_value_list.order_by( "id" ).values_list( "person_id", "source_type", "source_contact_type", "source_capacity" ) )
+
+            # loop over authors.
+            for author_index, author_person_id in enumerate( author_person_id_list ):
+
+                # author node
+                list_OUT.append( cls( article_data_id = article_data_id_IN,
+                                      tie_type = cls.TIE_TYPE_AUTHOR,
+                                      from_person_id = author_person_id ) )
+
+                # ties with authors after this one.
+                for other_person_id in author_person_id_list[ author_index + 1 : ]:
+
+                    list_OUT.append( cls( article_data_id = article_data_id_IN,
+                                          tie_type = cls.TIE_TYPE_AUTHOR_AUTHOR,
+                                          from_person_id = author_person_id,
+                                          to_person_id = other_person_id ) )
+
+                #-- END loop over other authors --#
+
+                # ties with sources.
+                for source_values in source_value_list:
+
+                    list_OUT.append( cls( article_data_id = article_data_id_IN,
+                                          tie_type = cls.TIE_TYPE_AUTHOR_SOURCE,
+                                          from_person_id = author_person_id,
+                                          to_person_id = source_values[ 0 ],
+                                          source_type = source_values[ 1 ],
+                                          source_contact_type = source_values[ 2 ],
+                                          source_capacity = source_values[ 3 ] ) )
+
+                #-- END loop over sources --#
+
+            #-- END loop over authors --#
+
+            # source nodes
+            for source_values in source_value_list:
+
+                list_OUT.append( cls( article_data_id = article_data_id_IN,
+                                      tie_type = cls.TIE_TYPE_SOURCE,
+                                      from_person_id = source_values[ 0 ],
+                                      source_type = source_values[ 1 ],
+                                      source_contact_type = source_values[ 2 ],
+                                      source_capacity = source_values[ 3 ] ) )
+
+            #-- END loop over sources --#
+
+        #-- END check to see if authors --#
+
+        return list_OUT
+
+    #-- END class method make_ties_for_article_data() --#
+
+
+    @classmethod
+    def get_article_data_missing_ties_qs( cls, article_data_qs_IN ):
+
+        '''
+        Accepts Article_Data QuerySet.  Returns QuerySet of the Article_Data in
+           it that should have tie rows - they have at least one author with a
+           person - but have none, as for data coded before the table existed
+           that hasn't been backfilled (see update_in_batches(), or the
+           backfill_network_ties management command).
+        '''
+
+        # return reference
+        qs_OUT = None
+
+        # declare variables
+        author_article_data_qs = None
+
+        author_article_data_qs = Article_Author.objects.filter( person__isnull = False ).values( "article_data_id" )
+        qs_OUT = Article_Data.objects.filter( id__in = article_data_qs_IN.values( "id" ) )
+        qs_OUT = qs_OUT.filter( id__in = author_article_data_qs ).exclude( id__in = cls.objects.values( "article_data_id" ) )
+
+        return qs_OUT
+
+    #-- END class method get_article_data_missing_ties_qs() --#
+
+
+    @classmethod
+    def request_update( cls, article_data_id_IN ):
+
+        '''
+        Accepts ID of Article_Data whose authors or sources changed.  If inside
+           defer_updates(), remembers it for a rebuild at the end of the block
+           and returns 0.  Otherwise, rebuilds its ties now and returns the
+           number of rows created.
+        '''
+
+        # return reference
+        count_OUT = 0
+
+        # got an ID?
+        if ( article_data_id_IN is not None ):
+
+            # deferred?
+            if ( getattr( cls.deferred_update_local, "depth", 0 ) > 0 ):
+
+                cls.deferred_update_local.article_data_id_set.add( article_data_id_IN )
+
+            else:
+
+                count_OUT = cls.update_for_article_data( article_data_id_IN )
+
+            #-- END check to see if deferred --#
+
+        #-- END check to see if ID --#
+
+        return count_OUT
+
+    #-- END class method request_update() --#
+
+
+    @classmethod
+    def update_for_article_data( cls, article_data_id_IN ):
+
+        '''
+        Accepts ID of Article_Data.  In a transaction, deletes the existing
+           tie rows for that Article_Data, then rebuilds and bulk-inserts
+           them.  Returns the number of rows created.
+        '''
+
+        # return reference
+        count_OUT = 0
+
+        # declare variables
+        tie_list = None
+
+        # got an ID?
+        if ( article_data_id_IN is not None ):
+
+            # build ties
+            tie_list = cls.make_ties_for_article_data( article_data_id_IN )
+
+            # replace existing.
+            with transaction.atomic():
+
+                cls.objects.filter( article_data_id = article_data_id_IN ).delete()
+                cls.objects.bulk_create( tie_list )
+
+            #-- END transaction --#
+
+            count_OUT = len( tie_list )
+
+        #-- END check to see if ID --#
+
+        return count_OUT
+
+    #-- END class method update_for_article_data() --#
+
+
+    @classmethod
+    def update_for_article_data_qs( cls, article_data_qs_IN ):
+
+        '''
+        Accepts Article_Data QuerySet, rebuilds tie rows for each Article_Data
+           in it.  For populating the table for data coded before it existed,
+           or after Article_Author or Article_Subject rows were changed in
+           bulk (QuerySet update() or delete()), which does not call save().
+           One transaction per Article_Data - for the whole table, see
+           update_in_batches().  Returns the number of rows created.
+        '''
+
+        # return reference
+        count_OUT = 0
+
+        # declare variables
+        article_data_id = None
+
+        # loop over IDs.
+        for article_data_id in article_data_qs_IN.values_list( "id", flat = True ).iterator():
+
+            count_OUT += cls.update_for_article_data( article_data_id )
+
+        #-- END loop over Article_Data IDs --#
+
+        return count_OUT
+
+    #-- END class method update_for_article_data_qs() --#
+
+
+    @classmethod
+    def update_in_batches( cls, article_data_qs_IN = None, batch_size_IN = 1000 ):
+
+        '''
+        Accepts optional QuerySet of Article_Data (defaults to all) and batch
+           size.  Rebuilds the tie rows for batch_size_IN Article_Data at a
+           time (in ID order), replacing each batch's rows in one transaction
+           with one bulk_create().  For backfilling the table for data coded
+           before it existed.  Returns dictionary with counts of Article_Data
+           checked ("checked") and tie rows created ("created").
+        '''
+
+        # return reference
+        dict_OUT = {}
+
+        # declare variables
+        article_data_id_qs = None
+        last_id = 0
+        batch_id_list = None
+        tie_list = None
+        article_data_id = None
+        checked_count = 0
+        created_count = 0
+
+        # QuerySet
+        article_data_id_qs = article_data_qs_IN
+        if ( article_data_id_qs is None ):
+
+            article_data_id_qs = Article_Data.objects.all()
+
+        #-- END check to see if QuerySet passed in --#
+
+        article_data_id_qs = article_data_id_qs.order_by( "id" ).values_list( "id", flat = True )
+
+        # keyset pagination, so each batch is an indexed range read.
+        batch_id_list = list( article_data_id_qs.filter( id__gt = last_id )[ : batch_size_IN ] )
+        while ( len( batch_id_list ) > 0 ):
+
+            # build ties
+            tie_list = []
+            for article_data_id in batch_id_list:
+
+                tie_list.extend( cls.make_ties_for_article_data( article_data_id ) )
+
+            #-- END loop over batch --#
+
+            # replace existing.
+            with transaction.atomic():
+
+                cls.objects.filter( article_data_id__in = batch_id_list ).delete()
+                cls.objects.bulk_create( tie_list )
+
+            #-- END transaction --#
+
+            checked_count += len( batch_id_list )
+            created_count += len( tie_list )
+            last_id = batch_id_list[ -1 ]
+            batch_id_list = list( article_data_id_qs.filter( id__gt = last_id )[ : batch_size_IN ] )
+
+        #-- END loop over batches --#
+
+        dict_OUT[ "checked" ] = checked_count
+        dict_OUT[ "created" ] = created_count
+
+        return dict_OUT
+
+    #-- END class method update_in_batches() --#
+
+
+    #----------------------------------------------------------------------
+    # ! ==> instance methods
+    #----------------------------------------------------------------------
+
+
+    def __str__( self ):
+
+        # return reference
+        string_OUT = ""
+
+        if ( self.id ):
+
+            string_OUT += str( self.id ) + " - "
+
+        #-- END check to see if ID --#
+
+        string_OUT += self.tie_type + " - article_data: " + str( self.article_data_id ) + "; from person: " + str( self.from_person_id )
+
+        if ( self.to_person_id is not None ):
+
+            string_OUT += "; to person: " + str( self.to_person_id )
+
+        #-- END check to see if to person --#
+
+        return string_OUT
+
+    #-- END method __str__() --#
+
+
+#-- END model Article_Data_Network_Tie --#
+
+
 # Article_Person model
 class Article_Person( Abstract_Person_Parent ):
 
@@ -6449,6 +8319,34 @@ class Article_Person( Abstract_Person_Parent ):
     #-- END method __str__() --#
 
 
+    def delete( self, *args, **kwargs ):
+
+        '''
+        Overridden delete() method that updates the precomputed network ties
+           of the related Article_Data after django's delete() method (see
+           Article_Data_Network_Tie.request_update()).
+        '''
+
+        # return reference
+        result_OUT = None
+
+        # declare variables.
+        article_data_id = None
+
+        # remember Article_Data.
+        article_data_id = self.article_data_id
+
+        # call parent delete() method.
+        result_OUT = super( Article_Person, self ).delete( *args, **kwargs )
+
+        # update the Article_Data's precomputed network ties.
+        Article_Data_Network_Tie.request_update( article_data_id )
+
+        return result_OUT
+
+    #-- END method delete() --#
+
+
     def get_article_info( self ):
 
         '''
@@ -6652,16 +8550,16 @@ class Article_Person( Abstract_Person_Parent ):
         id_OUT = ''
 
         # declare variables
-        my_person = None
+        my_person_id = None
 
-        # get current person.
-        my_person = self.person
+        # get current person's ID from the foreign key column - no need to
+        #    load the Person just to get its ID.
+        my_person_id = self.person_id
 
         # see if there is a person
-        if ( my_person is not None ):
+        if ( my_person_id is not None ):
 
-            # are we also loading the person?
-            id_OUT = my_person.id
+            id_OUT = my_person_id
 
         #-- END check to make sure there is an associated person.
 
@@ -6754,6 +8652,9 @@ class Article_Person( Abstract_Person_Parent ):
         # call process_alternate_matches
         self.process_alternate_matches()
 
+        # update the Article_Data's precomputed network ties.
+        Article_Data_Network_Tie.request_update( self.article_data_id )
+
     #-- END method save() --#
 
 
@@ -7044,7 +8945,17 @@ class Article_Author( Article_Person ):
         ( "other", "Other" )
     )
 
-    author_type = models.CharField( max_length = 255, choices = AUTHOR_TYPE_CHOICES, default = "staff", blank = True, null = True )
+    author_type = models.CharField( max_length = 255, choices = AUTHOR_TYPE_CHOICES, default = "staff", blank = True, null = True )
+
+    # Meta-data for this class.
+    class Meta:
+
+        # person to Article_Data lookups (network output, person merges).
+        indexes = [
+            models.Index( fields = [ "person", "article_data" ], name = "article_author_person_ad_idx" ),
+        ]
+
+    #-- END class Meta --#
 
 
     #----------------------------------------------------------------------
@@ -7157,6 +9068,66 @@ class Article_Author( Article_Person ):
     #-- END class method make_deep_copy() --#
 
 
+    @classmethod
+    def make_deep_copies( cls, id_list_IN, article_data_id_map_IN = None, batch_size_IN = DEFAULT_DEEP_COPY_BATCH_SIZE, *args, **kwargs ):
+
+        '''
+        Batched version of make_deep_copy().  Accepts list of IDs of
+            Article_Author we want to make deep copies of, and an optional
+            dictionary of old Article_Data ID to new Article_Data instance to
+            point the copies at (if not passed, copies stay with the original
+            Article_Data).  Reads each table once with prefetch_related(),
+            then inserts each level with bulk_create().
+
+        - Article_Author
+            - Alternate_Author_Match
+
+        Returns dictionary of old Article_Author ID to new instance.
+        '''
+
+        # return reference
+        id_map_OUT = {}
+
+        # declare variables
+        parent_field_name = None
+        copy_from_list = None
+        copy_from_article_author = None
+        related_list = None
+
+        # got IDs?
+        if ( ( id_list_IN is not None ) and ( len( id_list_IN ) > 0 ) ):
+
+            # re-point Article_Data?
+            if ( article_data_id_map_IN is not None ):
+
+                parent_field_name = "article_data"
+
+            #-- END check to see if Article_Data map --#
+
+            with transaction.atomic():
+
+                copy_from_list = list( cls.objects.filter( pk__in = id_list_IN ).order_by( "id" ).prefetch_related( "alternate_author_match_set" ) )
+                id_map_OUT = bulk_copy_instances( copy_from_list, parent_field_name, article_data_id_map_IN, batch_size_IN = batch_size_IN )
+
+                # ! ----> Alternate_Author_Match
+                related_list = []
+                for copy_from_article_author in copy_from_list:
+
+                    related_list.extend( copy_from_article_author.alternate_author_match_set.all() )
+
+                #-- END loop over Article_Author --#
+
+                bulk_copy_instances( related_list, "article_author", id_map_OUT, batch_size_IN = batch_size_IN )
+
+            #-- END with transaction --#
+
+        #-- END check to see if IDs passed in --#
+
+        return id_map_OUT
+
+    #-- END class method make_deep_copies() --#
+
+
     #----------------------------------------------------------------------
     # ! ==> instance methods
     #----------------------------------------------------------------------
@@ -7570,6 +9541,17 @@ class Article_Subject( Article_Person ):
     # field to store how source was captured. - parent
     #capture_method = models.CharField( max_length = 255, blank = True, null = True )
 
+    # Meta-data for this class.
+    class Meta:
+
+        # person to Article_Data lookups, and quoted sources per Article_Data.
+        indexes = [
+            models.Index( fields = [ "person", "article_data" ], name = "article_subject_person_ad_idx" ),
+            models.Index( fields = [ "article_data", "subject_type" ], name = "article_subject_ad_type_idx" ),
+        ]
+
+    #-- END class Meta --#
+
 
     #----------------------------------------------------------------------
     # ! ==> class methods
@@ -7813,6 +9795,85 @@ class Article_Subject( Article_Person ):
     #-- END class method make_deep_copy() --#
 
 
+    @classmethod
+    def make_deep_copies( cls, id_list_IN, article_data_id_map_IN = None, batch_size_IN = DEFAULT_DEEP_COPY_BATCH_SIZE, *args, **kwargs ):
+
+        '''
+        Batched version of make_deep_copy().  Accepts list of IDs of
+            Article_Subject we want to make deep copies of, and an optional
+            dictionary of old Article_Data ID to new Article_Data instance to
+            point the copies at (if not passed, copies stay with the original
+            Article_Data).  Reads each table once with prefetch_related(),
+            then inserts each level with bulk_create().
+
+        - Article_Subject
+            - ManyToMany:
+                - topics
+            - Alternate_Subject_Match
+            - Article_Subject_Mention
+            - Article_Subject_Quotation
+            - Subject_Organization
+
+        Returns dictionary of old Article_Subject ID to new instance.
+        '''
+
+        # return reference
+        id_map_OUT = {}
+
+        # declare variables
+        parent_field_name = None
+        copy_from_list = None
+        copy_from_article_subject = None
+        related_set_name = ""
+        related_list = None
+
+        # got IDs?
+        if ( ( id_list_IN is not None ) and ( len( id_list_IN ) > 0 ) ):
+
+            # re-point Article_Data?
+            if ( article_data_id_map_IN is not None ):
+
+                parent_field_name = "article_data"
+
+            #-- END check to see if Article_Data map --#
+
+            with transaction.atomic():
+
+                copy_from_list = cls.objects.filter( pk__in = id_list_IN ).order_by( "id" )
+                copy_from_list = copy_from_list.prefetch_related( "alternate_subject_match_set",
+                                                                  "article_subject_mention_set",
+                                                                  "article_subject_quotation_set",
+                                                                  "subject_organization_set" )
+                copy_from_list = list( copy_from_list )
+                id_map_OUT = bulk_copy_instances( copy_from_list, parent_field_name, article_data_id_map_IN, batch_size_IN = batch_size_IN )
+
+                # ! ----> ManyToMany - topics
+                bulk_copy_m2m_values( "topics", id_map_OUT, batch_size_IN = batch_size_IN )
+
+                # ! ----> Alternate_Subject_Match, Article_Subject_Mention,
+                #     Article_Subject_Quotation, Subject_Organization
+                for related_set_name in [ "alternate_subject_match_set", "article_subject_mention_set", "article_subject_quotation_set", "subject_organization_set" ]:
+
+                    related_list = []
+                    for copy_from_article_subject in copy_from_list:
+
+                        related_list.extend( getattr( copy_from_article_subject, related_set_name ).all() )
+
+                    #-- END loop over Article_Subject --#
+
+                    bulk_copy_instances( related_list, "article_subject", id_map_OUT, batch_size_IN = batch_size_IN )
+
+                #-- END loop over related sets --#
+
+            #-- END with transaction --#
+
+        #-- END check to see if IDs passed in --#
+
+        return id_map_OUT
+
+    #-- END class method make_deep_copies() --#
+
+
     #----------------------------------------------------------------------
     # ! ==> instance methods
     #----------------------------------------------------------------------
@@ -8820,6 +10881,9 @@ class Temp_Section( models.Model ):
     # query for bylines of in-house authors.
     Q_IN_HOUSE_AUTHOR = Q( author_varchar__iregex = r'.* */ *THE GRAND RAPIDS PRESS$' ) | Q( author_varchar__iregex = r'.* */ *PRESS .* EDITOR$' ) | Q( author_varchar__iregex = r'.* */ *GRAND RAPIDS PRESS .* BUREAU$' ) | Q( author_varchar__iregex = r'.* */ *SPECIAL TO THE PRESS$' )
 
+    # query for bylines of Booth news service authors.
+    Q_EXTERNAL_BOOTH_AUTHOR = Q( author_varchar__iregex = r'.* */ *GRAND RAPIDS PRESS NEWS SERVICE$' )
+
     # date range params
     PARAM_START_DATE = "start_date"
     PARAM_END_DATE = "end_date"
@@ -8832,6 +10896,7 @@ class Temp_Section( models.Model ):
     PARAM_SECTION_NAME = "section_name"
     PARAM_CUSTOM_SECTION_Q = "custom_section_q"
     PARAM_JUST_PROCESS_ALL = "just_process_all" # set to True if just want sum of all sections, not records for each individual section.  If False, processes each section individually, then generates the "all" record.
+    PARAM_DAY_BY_DAY = "day_by_day" # set to True to make a record per day in the date range, False to make a single record for the whole range.
 
     # property names for dictionaries of output information.
     OUTPUT_DAY_COUNT = "day_count"
@@ -9446,7 +11511,7 @@ class Temp_Section( models.Model ):
         article_qs = self.append_shared_article_qs_params( article_qs, *args, **kwargs )
 
         # only get articles by news service.
-        author_q = Q( author_varchar__iregex = r'.* */ *GRAND RAPIDS PRESS NEWS SERVICE$' )
+        author_q = Temp_Section.Q_EXTERNAL_BOOTH_AUTHOR
         article_qs = article_qs.filter( author_q )
 
         # limit to current section.
@@ -9772,6 +11837,211 @@ class Temp_Section( models.Model ):
     # class methods
     #----------------------------------------------------------------------
 
+    @classmethod
+    def build_section_stats_grid( cls, start_date_IN, end_date_IN, day_by_day_IN = True, skip_individual_sections_IN = False, custom_article_q_IN = None ):
+
+        '''
+        Accepts start and end date strings (YYYY-MM-DD), a flag for whether we
+           want a period per day or a single period for the whole range, a
+           flag for whether to skip the individual sections and just do "all",
+           and an optional Q() to filter articles further.  Computes the values
+           process_column_values() would for every section and period in the
+           range from two GROUP BY queries rather than a set of count queries
+           per section per day.  Returns a dictionary that maps
+           ( section_name, period_start, period_end ) tuples to dictionaries of
+           Temp_Section field names to values.
+        Preconditions: Dates must be in YYYY-MM-DD format.
+        Postconditions: Every section and period in the range gets an entry,
+           even if it has no articles.
+        '''
+
+        # return reference
+        grid_OUT = {}
+
+        # declare variables
+        me = "build_section_stats_grid"
+        start_date = None
+        end_date = None
+        period_list = None
+        period_start = None
+        period_end = None
+        current_date = None
+        section_name_list = None
+        section_name = ""
+        base_article_qs = None
+        page_qs = None
+        author_qs = None
+        bucket_dict = None
+        bucket = None
+        bucket_key = None
+        row = None
+        row_date = None
+        row_section = ""
+        row_page = None
+        author_varchar = ""
+        in_house_count = -1
+        day_count = -1
+        total_articles = -1
+        in_house_articles = -1
+        total_pages = -1
+        in_house_pages = -1
+        values_dict = None
+
+        # convert dates, then make list of periods.
+        start_date = datetime.datetime.strptime( start_date_IN, cls.DEFAULT_DATE_FORMAT )
+        end_date = datetime.datetime.strptime( end_date_IN, cls.DEFAULT_DATE_FORMAT )
+        period_list = []
+        if ( day_by_day_IN == True ):
+
+            current_date = start_date
+            while ( current_date <= end_date ):
+
+                period_list.append( ( current_date, current_date ) )
+                current_date = current_date + datetime.timedelta( days = 1 )
+
+            #-- END loop over days --#
+
+        else:
+
+            period_list.append( ( start_date, end_date ) )
+
+        #-- END check to see if day by day --#
+
+        # sections - "all" always, individual sections unless skipped.
+        section_name_list = []
+        if ( skip_individual_sections_IN == False ):
+
+            section_name_list.extend( cls.NEWS_SECTION_NAME_LIST )
+
+        #-- END check to see if we want individual sections --#
+        section_name_list.append( cls.SECTION_NAME_ALL )
+
+        # empty bucket for every section and period.
+        bucket_dict = {}
+        for period_start, period_end in period_list:
+
+            for section_name in section_name_list:
+
+                bucket = {}
+                bucket[ "total_articles" ] = 0
+                bucket[ "in_house_articles" ] = 0
+                bucket[ "external_booth" ] = 0
+                bucket[ "page_set" ] = set()
+                bucket[ "in_house_page_set" ] = set()
+                bucket[ "author_key_set" ] = set()
+                bucket_dict[ ( section_name, period_start, period_end ) ] = bucket
+
+            #-- END loop over sections --#
+
+        #-- END loop over periods --#
+
+        # articles in news sections in date range.
+        base_article_qs = Article.objects.filter( pub_date__gte = start_date, pub_date__lte = end_date )
+        base_article_qs = base_article_qs.filter( section__in = cls.NEWS_SECTION_NAME_LIST )
+        if ( custom_article_q_IN ):
+
+            base_article_qs = base_article_qs.filter( custom_article_q_IN )
+
+        #-- END check to see if custom Q() --#
+
+        # query 1 - counts per date, section, and page.
+        page_qs = base_article_qs.order_by().values( "pub_date", "section", "page" )
+        page_qs = page_qs.annotate( article_count = Count( "id" ),
+                                    in_house_count = Count( "id", filter = cls.Q_IN_HOUSE_AUTHOR ),
+                                    booth_count = Count( "id", filter = cls.Q_EXTERNAL_BOOTH_AUTHOR ) )
+
+        for row in page_qs:
+
+            row_date = row[ "pub_date" ]
+            row_section = row[ "section" ]
+            row_page = row[ "page" ]
+            in_house_count = row[ "in_house_count" ]
+
+            # add to the section's bucket and the "all" bucket.  Pages are
+            #    counted per day, and "all" counts a page once even if more
+            #    than one section has articles on it.
+            for bucket_key in cls.get_bucket_key_list( row_section, row_date, day_by_day_IN, skip_individual_sections_IN, start_date, end_date ):
+
+                bucket = bucket_dict[ bucket_key ]
+                bucket[ "total_articles" ] += row[ "article_count" ]
+                bucket[ "in_house_articles" ] += in_house_count
+                bucket[ "external_booth" ] += row[ "booth_count" ]
+                bucket[ "page_set" ].add( ( row_date, row_page ) )
+                if ( in_house_count > 0 ):
+
+                    bucket[ "in_house_page_set" ].add( ( row_date, row_page ) )
+
+                #-- END check to see if in-house page --#
+
+            #-- END loop over buckets --#
+
+        #-- END loop over page rows --#
+
+        # query 2 - distinct in-house bylines per date and section.
+        author_qs = base_article_qs.filter( cls.Q_IN_HOUSE_AUTHOR ).order_by()
+        author_qs = author_qs.values_list( "pub_date", "section", "author_varchar" ).distinct()
+
+        for row_date, row_section, author_varchar in author_qs:
+
+            for bucket_key in cls.get_bucket_key_list( row_section, row_date, day_by_day_IN, skip_individual_sections_IN, start_date, end_date ):
+
+                bucket_dict[ bucket_key ][ "author_key_set" ].add( cls.get_in_house_author_key( author_varchar ) )
+
+            #-- END loop over buckets --#
+
+        #-- END loop over author rows --#
+
+        # initialize Decimal Math
+        getcontext().prec = 20
+
+        # turn buckets into field values.
+        for bucket_key, bucket in six.iteritems( bucket_dict ):
+
+            section_name, period_start, period_end = bucket_key
+            day_count = ( period_end - period_start ).days + 1
+            total_articles = bucket[ "total_articles" ]
+            in_house_articles = bucket[ "in_house_articles" ]
+            total_pages = len( bucket[ "page_set" ] )
+            in_house_pages = len( bucket[ "in_house_page_set" ] )
+
+            values_dict = {}
+            values_dict[ "total_days" ] = day_count
+            values_dict[ "total_articles" ] = total_articles
+            values_dict[ "in_house_articles" ] = in_house_articles
+            values_dict[ "external_articles" ] = total_articles - in_house_articles
+            values_dict[ "external_booth" ] = bucket[ "external_booth" ]
+            values_dict[ "total_pages" ] = total_pages
+            values_dict[ "in_house_pages" ] = in_house_pages
+            values_dict[ "in_house_authors" ] = len( bucket[ "author_key_set" ] )
+            values_dict[ "average_articles_per_day" ] = Decimal( total_articles ) / Decimal( day_count )
+            values_dict[ "average_pages_per_day" ] = Decimal( total_pages ) / Decimal( day_count )
+            values_dict[ "average_in_house_articles_per_day" ] = Decimal( in_house_articles ) / Decimal( day_count )
+            values_dict[ "average_in_house_pages_per_day" ] = Decimal( in_house_pages ) / Decimal( day_count )
+
+            # percents - 0 if no articles.
+            if ( total_articles > 0 ):
+
+                values_dict[ "percent_in_house" ] = Decimal( in_house_articles ) / Decimal( total_articles )
+                values_dict[ "percent_external" ] = Decimal( total_articles - in_house_articles ) / Decimal( total_articles )
+
+            else:
+
+                values_dict[ "percent_in_house" ] = Decimal( "0.0" )
+                values_dict[ "percent_external" ] = Decimal( "0.0" )
+
+            #-- END check to see if any articles --#
+
+            grid_OUT[ bucket_key ] = values_dict
+
+        #-- END loop over buckets --#
+
+        output_debug( "Built " + str( len( grid_OUT ) ) + " section stats entries for " + start_date_IN + " to " + end_date_IN, me )
+
+        return grid_OUT
+
+    #-- END class method build_section_stats_grid() --#
+
+
     @classmethod
     def find_instance( self, *args, **kwargs ):
 
@@ -9899,77 +12169,98 @@ class Temp_Section( models.Model ):
 
 
     @classmethod
-    def process_section_date_range( cls, *args, **kwargs ):
+    def get_bucket_key_list( cls, section_name_IN, pub_date_IN, day_by_day_IN, skip_individual_sections_IN, start_date_IN, end_date_IN ):
+
+        '''
+        Accepts an article's section and pub_date plus the settings passed to
+           build_section_stats_grid().  Returns list of the
+           ( section_name, period_start, period_end ) keys the article counts
+           toward - its section's (unless skipped), and "all".
+        '''
+
+        # return reference
+        list_OUT = []
 
         # declare variables
-        me = "process_section_date_range"
-        start_date_IN = ""
-        end_date_IN = ""
-        skip_individual_sections_IN = False
-        save_stats = True
-        section_params = {}
-        current_section_name = ""
-        current_instance = None
+        period_start = None
+        period_end = None
 
-        # Get start and end dates
-        start_date_IN = get_dict_value( kwargs, cls.PARAM_START_DATE, None )
-        end_date_IN = get_dict_value( kwargs, cls.PARAM_END_DATE, None )
+        # which period?
+        if ( day_by_day_IN == True ):
 
-        # check if we only want to create "all" records, so skip individual
-        #    sections.
-        skip_individual_sections_IN = get_dict_value( kwargs, cls.PARAM_JUST_PROCESS_ALL, False )
+            period_start = datetime.datetime( pub_date_IN.year, pub_date_IN.month, pub_date_IN.day )
+            period_end = period_start
 
-        # got dates?
-        if ( ( start_date_IN ) and ( end_date_IN ) ):
+        else:
+
+            period_start = start_date_IN
+            period_end = end_date_IN
+
+        #-- END check to see if day by day --#
+
+        if ( skip_individual_sections_IN == False ):
+
+            list_OUT.append( ( section_name_IN, period_start, period_end ) )
+
+        #-- END check to see if individual sections --#
+
+        list_OUT.append( ( cls.SECTION_NAME_ALL, period_start, period_end ) )
+
+        return list_OUT
+
+    #-- END class method get_bucket_key_list() --#
 
-            # store in params.
-            section_params[ cls.PARAM_START_DATE ] = start_date_IN
-            section_params[ cls.PARAM_END_DATE ] = end_date_IN
 
-            # process records for individual sections?
-            if( skip_individual_sections_IN == False ):
+    @classmethod
+    def get_in_house_author_key( cls, author_varchar_IN ):
 
-                # loop over list of section names that are local news or sports.
-                for current_section_name in cls.NEWS_SECTION_NAME_LIST:
+        '''
+        Accepts an author_varchar byline.  Returns the part that
+           get_in_house_author_count() counts distinct values of - everything
+           through the space before the first " / " (empty string if no " / ").
+           Upper-cased, so bylines that differ only in case count once, as they
+           do under MySQL's default case-insensitive collation.
+        '''
 
-                    # set section name
-                    section_params[ cls.PARAM_SECTION_NAME ] = current_section_name
+        # return reference
+        value_OUT = ""
 
-                    # get instance
-                    current_instance = cls.find_instance( **section_params )
+        # declare variables
+        slash_index = -1
 
-                    # process values and save
-                    current_instance.process_column_values( save_stats, **section_params )
+        if ( author_varchar_IN ):
 
-                    # output current instance.
-                    output_debug( "Finished processing section " + current_section_name + " - " + str( current_instance ) + "\n\n", me, "\n\n=== " )
+            slash_index = author_varchar_IN.find( " / " )
+            value_OUT = author_varchar_IN[ : slash_index + 1 ].upper()
 
-                    # memory management.
-                    gc.collect()
-                    django.db.reset_queries()
+        #-- END check to see if byline --#
 
-                #-- END loop over sections. --#
+        return value_OUT
 
-            #-- END check to see if just want to update "all" rows. --#
+    #-- END class method get_in_house_author_key() --#
 
-            # Then, do the "all"
-            # set section name
-            section_params[ cls.PARAM_SECTION_NAME ] = Temp_Section.SECTION_NAME_ALL
 
-            # get instance
-            current_instance = cls.find_instance( **section_params )
+    @classmethod
+    def process_section_date_range( cls, *args, **kwargs ):
 
-            # process values and save
-            current_instance.process_column_values( save_stats, **section_params )
+        '''
+        Makes one Temp_Section record for the whole date range for each news
+           section (unless PARAM_JUST_PROCESS_ALL), plus one for "all".  Uses
+           process_section_date_range_grid().
+        '''
 
-            # output current instance.
-            output_debug( "Finished processing section " + current_section_name + " - " + str( current_instance ) + "\n\n", me, "\n\n=== " )
+        # return reference
+        count_OUT = 0
 
-            # memory management.
-            gc.collect()
-            django.db.reset_queries()
+        # declare variables
+        grid_params = None
+
+        # one period for the whole range.
+        grid_params = dict( kwargs )
+        grid_params[ cls.PARAM_DAY_BY_DAY ] = False
+        count_OUT = cls.process_section_date_range_grid( **grid_params )
 
-        #-- END check to make sure we have dates. --#
+        return count_OUT
 
     #-- END method process_section_date_range() --#
 
@@ -9977,102 +12268,217 @@ class Temp_Section( models.Model ):
     @classmethod
     def process_section_date_range_day_by_day( cls, *args, **kwargs ):
 
+        '''
+        Makes a Temp_Section record for each day in the date range for each
+           news section (unless PARAM_JUST_PROCESS_ALL), plus one for "all".
+           Uses process_section_date_range_grid(), so the whole range is done
+           in a few GROUP BY queries rather than a set of queries per section
+           per day.
+        '''
+
+        # return reference
+        count_OUT = 0
+
+        # declare variables
+        grid_params = None
+
+        # one period per day.
+        grid_params = dict( kwargs )
+        grid_params[ cls.PARAM_DAY_BY_DAY ] = True
+        count_OUT = cls.process_section_date_range_grid( **grid_params )
+
+        return count_OUT
+
+    #-- END method process_section_date_range_day_by_day() --#
+
+
+    @classmethod
+    def process_section_date_range_grid( cls, *args, **kwargs ):
+
+        '''
+        Set-based version of process_section_date_range() and
+           process_section_date_range_day_by_day().  Computes the values for
+           every section and period in the date range with
+           build_section_stats_grid(), then saves them with
+           upsert_section_stats().  Accepts the same parameters as those
+           methods, plus PARAM_DAY_BY_DAY (defaults to True) and
+           PARAM_CUSTOM_ARTICLE_Q.  Returns the number of rows saved.
+        '''
+
+        # return reference
+        count_OUT = 0
+
         # declare variables
-        me = "process_section_date_range_day_by_day"
+        me = "process_section_date_range_grid"
         start_date_IN = ""
         end_date_IN = ""
         skip_individual_sections_IN = False
-        start_date = None
-        end_date = None
-        save_stats = True
-        daily_params = {}
-        current_section_name = ""
-        current_date = None
-        current_timedelta = None
-        current_instance = None
-
+        day_by_day_IN = True
+        custom_article_q_IN = None
+        stats_grid = None
 
         # Get start and end dates
         start_date_IN = get_dict_value( kwargs, cls.PARAM_START_DATE, None )
         end_date_IN = get_dict_value( kwargs, cls.PARAM_END_DATE, None )
 
-        # check if we only want to create "all" records, so skip individual
-        #    sections.
+        # other parameters.
         skip_individual_sections_IN = get_dict_value( kwargs, cls.PARAM_JUST_PROCESS_ALL, False )
+        day_by_day_IN = get_dict_value( kwargs, cls.PARAM_DAY_BY_DAY, True )
+        custom_article_q_IN = get_dict_value( kwargs, cls.PARAM_CUSTOM_ARTICLE_Q, None )
 
         # got dates?
         if ( ( start_date_IN ) and ( end_date_IN ) ):
 
-            # Convert start and end dates to datetime.
-            start_date = datetime.datetime.strptime( start_date_IN, cls.DEFAULT_DATE_FORMAT )
-            end_date = datetime.datetime.strptime( end_date_IN, cls.DEFAULT_DATE_FORMAT )
+            # compute, then save.
+            stats_grid = cls.build_section_stats_grid( start_date_IN, end_date_IN, day_by_day_IN, skip_individual_sections_IN, custom_article_q_IN )
+            count_OUT = cls.upsert_section_stats( stats_grid )
 
-            # then, loop one day at a time.
-            current_date = start_date
-            current_timedelta = end_date - current_date
+            output_debug( "Saved " + str( count_OUT ) + " Temp_Section rows for " + start_date_IN + " to " + end_date_IN, me )
 
-            # loop over dates as long as difference between current and end is 0
-            #    or greater.
-            while ( current_timedelta.days > -1 ):
+            # memory management.
+            django.db.reset_queries()
 
-                # current date
-                output_debug( "Processing " + str( current_date ), me )
+        #-- END check to make sure we have start and end date. --#
 
-                # set start and end date in kwargs to current_date
-                daily_params[ cls.PARAM_START_DATE ] = current_date.strftime( cls.DEFAULT_DATE_FORMAT )
-                daily_params[ cls.PARAM_END_DATE ] = current_date.strftime( cls.DEFAULT_DATE_FORMAT )
+        return count_OUT
 
-                # process records for individual sections?
-                if( skip_individual_sections_IN == False ):
+    #-- END method process_section_date_range_grid() --#
 
-                    # yes - loop over list of section names that are local news or sports.
-                    for current_section_name in cls.NEWS_SECTION_NAME_LIST:
 
-                        # set section name
-                        daily_params[ cls.PARAM_SECTION_NAME ] = current_section_name
+    @classmethod
+    def upsert_section_stats( cls, stats_grid_IN ):
 
-                        # get an instance
-                        current_instance = cls.find_instance( **daily_params )
+        '''
+        Accepts a dictionary like the one build_section_stats_grid() returns.
+           Loads the Temp_Section rows that already exist for those section
+           names and periods in one query, updates them with bulk_update(),
+           and creates the rest with bulk_create(), all in one transaction.
+           Returns number of rows saved.
+        '''
 
-                        # process values and save
-                        current_instance.process_column_values( save_stats, **daily_params )
+        # return reference
+        count_OUT = 0
 
-                        # output current instance.
-                        output_debug( "Finished processing section " + current_section_name + "\n\n", me, "\n\n=== " )
+        # declare variables
+        name_set = None
+        min_start_date = None
+        max_start_date = None
+        existing_dict = None
+        existing_qs = None
+        existing_instance = None
+        instance_key = None
+        start_date = None
+        end_date = None
+        stats_key = None
+        values_dict = None
+        current_instance = None
+        update_list = None
+        create_list = None
+        field_name_list = None
+        field_name = ""
+        field_value = None
 
-                    #-- END loop over sections. --#
+        if ( stats_grid_IN ):
 
-                #-- END check to see if just want to update "all" rows. --#
+            # get range of keys.
+            name_set = set( [ stats_key[ 0 ] for stats_key in stats_grid_IN ] )
+            min_start_date = min( [ stats_key[ 1 ] for stats_key in stats_grid_IN ] )
+            max_start_date = max( [ stats_key[ 1 ] for stats_key in stats_grid_IN ] )
 
-                # process "all"
-                # set section name
-                daily_params[ cls.PARAM_SECTION_NAME ] = cls.SECTION_NAME_ALL
+            # load existing rows - first one wins if there are duplicates.
+            existing_dict = {}
+            existing_qs = cls.objects.filter( name__in = name_set, start_date__gte = min_start_date, start_date__lte = max_start_date ).order_by( "id" )
+            for existing_instance in existing_qs:
 
-                # get an instance
-                current_instance = cls.find_instance( **daily_params )
+                start_date = existing_instance.start_date
+                end_date = existing_instance.end_date
+                if ( ( start_date is not None ) and ( end_date is not None ) ):
 
-                # process values and save
-                current_instance.process_column_values( save_stats, **daily_params )
+                    # compare as naive, the way the dates were stored.
+                    if ( timezone.is_aware( start_date ) == True ):
 
-                # output current instance.
-                output_debug( "Finished processing section " + current_section_name + "\n\n", me, "\n\n=== " )
+                        start_date = timezone.make_naive( start_date )
 
-                # Done with this date.  Moving on.
-                output_debug( "Finished processing date " + str( current_date ) + " - " + str( current_instance ) + "\n\n", me, "\n\n=== " )
+                    #-- END check to see if aware --#
 
-                # increment the date and re-calculate timedelta.
-                current_date = current_date + datetime.timedelta( days = 1 )
-                current_timedelta = end_date - current_date
+                    if ( timezone.is_aware( end_date ) == True ):
 
-                # memory management.
-                gc.collect()
-                django.db.reset_queries()
+                        end_date = timezone.make_naive( end_date )
 
-            #-- END loop over dates in date range --#
+                    #-- END check to see if aware --#
 
-        #-- END check to make sure we have start and end date. --#
+                    instance_key = ( existing_instance.name, start_date, end_date )
+                    if ( instance_key not in existing_dict ):
 
-    #-- END method process_section_date_range_day_by_day() --#
+                        existing_dict[ instance_key ] = existing_instance
+
+                    #-- END check to see if already have one --#
+
+                #-- END check to see if dates --#
+
+            #-- END loop over existing rows --#
+
+            # set values.
+            update_list = []
+            create_list = []
+            field_name_list = None
+            for stats_key, values_dict in six.iteritems( stats_grid_IN ):
+
+                current_instance = existing_dict.get( stats_key, None )
+                if ( current_instance is not None ):
+
+                    update_list.append( current_instance )
+
+                else:
+
+                    current_instance = cls()
+                    current_instance.name = stats_key[ 0 ]
+                    current_instance.start_date = stats_key[ 1 ]
+                    current_instance.end_date = stats_key[ 2 ]
+                    create_list.append( current_instance )
+
+                #-- END check to see if existing row --#
+
+                for field_name, field_value in six.iteritems( values_dict ):
+
+                    setattr( current_instance, field_name, field_value )
+
+                #-- END loop over values --#
+
+                current_instance.last_modified = timezone.now()
+
+                if ( field_name_list is None ):
+
+                    field_name_list = list( values_dict.keys() ) + [ "last_modified" ]
+
+                #-- END check to see if we have field names --#
+
+            #-- END loop over stats --#
+
+            # save.
+            with transaction.atomic():
+
+                if ( len( update_list ) > 0 ):
+
+                    cls.objects.bulk_update( update_list, field_name_list, batch_size = 500 )
+
+                #-- END check to see if updates --#
+
+                if ( len( create_list ) > 0 ):
+
+                    cls.objects.bulk_create( create_list, batch_size = 500 )
+
+                #-- END check to see if creates --#
+
+            #-- END with transaction --#
+
+            count_OUT = len( update_list ) + len( create_list )
+
+        #-- END check to see if anything passed in --#
+
+        return count_OUT
+
+    #-- END class method upsert_section_stats() --#
 
 
 #= End Temp_Section Model ======================================================#
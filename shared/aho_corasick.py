@@ -0,0 +1,293 @@
+from __future__ import unicode_literals
+
+'''
+Copyright 2010-2016 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text.
+
+context_text is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text. If not, see http://www.gnu.org/licenses/.
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+
+# python base imports
+from collections import deque
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class AhoCorasickAutomaton( object ):
+
+    '''
+    Aho-Corasick multi-pattern matcher.  Add any number of patterns, call
+       build(), then scan a sequence once to find every occurrence of every
+       pattern, overlapping occurrences included.  Patterns and the sequence
+       being scanned can be any sequences of hashable symbols - a string
+       (symbols are characters) or a list of words (symbols are words).
+
+    Usage:
+
+        automaton = AhoCorasickAutomaton()
+        automaton.add_pattern( "he" )
+        automaton.add_pattern( "she" )
+        automaton.build()
+        for start_index, pattern in automaton.iterate_matches( "ushers" ):
+            ...
+    '''
+
+    #---------------------------------------------------------------------------
+    # ! ==> __init__() method
+    #---------------------------------------------------------------------------
+
+
+    def __init__( self ):
+
+        # state 0 is the root.  Each state has a dictionary of goto
+        #    transitions, a failure link, the list of patterns that end there
+        #    in the trie, and the list of all patterns reported there (its own
+        #    plus those of its failure chain, set by build()).
+        self.goto_list = [ {} ]
+        self.fail_list = [ 0 ]
+        self.trie_output_list = [ [] ]
+        self.output_list = [ [] ]
+
+        # pattern key --> pattern length.
+        self.pattern_length_dict = {}
+
+        # has build() been called since last pattern was added?
+        self.is_built = False
+
+    #-- END method __init__() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def add_pattern( self, pattern_IN, key_IN = None ):
+
+        '''
+        Accepts a pattern (sequence of symbols) and an optional key to report
+           when it is matched (defaults to the pattern itself, which must then
+           be hashable - convert lists to tuples).  Empty patterns are ignored.
+        '''
+
+        # declare variables
+        pattern_key = None
+        current_state = 0
+        symbol = None
+        next_state = None
+
+        # got a pattern?
+        if ( ( pattern_IN is not None ) and ( len( pattern_IN ) > 0 ) ):
+
+            pattern_key = key_IN
+            if ( pattern_key is None ):
+
+                pattern_key = pattern_IN
+
+            #-- END check to see if key passed in --#
+
+            # walk/extend the trie.
+            current_state = 0
+            for symbol in pattern_IN:
+
+                next_state = self.goto_list[ current_state ].get( symbol, None )
+                if ( next_state is None ):
+
+                    next_state = len( self.goto_list )
+                    self.goto_list.append( {} )
+                    self.fail_list.append( 0 )
+                    self.trie_output_list.append( [] )
+                    self.output_list.append( [] )
+                    self.goto_list[ current_state ][ symbol ] = next_state
+
+                #-- END check to see if need new state --#
+
+                current_state = next_state
+
+            #-- END loop over symbols in pattern --#
+
+            # only record each key once.
+            if ( pattern_key not in self.pattern_length_dict ):
+
+                self.trie_output_list[ current_state ].append( pattern_key )
+                self.pattern_length_dict[ pattern_key ] = len( pattern_IN )
+
+            #-- END check to see if key already added --#
+
+            self.is_built = False
+
+        #-- END check to see if pattern --#
+
+    #-- END method add_pattern() --#
+
+
+    def build( self ):
+
+        '''
+        Computes failure links (breadth-first over the trie) and merges the
+           outputs of each state's failure chain into the state's output list,
+           so scanning never has to follow failure links to report matches.
+           Output lists start over from the trie's each time, so it is safe
+           to call again after adding more patterns.
+        '''
+
+        # declare variables
+        state_queue = None
+        current_state = -1
+        symbol = None
+        child_state = -1
+        fail_state = -1
+        current_output_list = None
+
+        state_queue = deque()
+
+        # start each state's outputs over from just its own patterns.
+        self.output_list = [ list( current_output_list ) for current_output_list in self.trie_output_list ]
+
+        # children of root fail to root.
+        for child_state in self.goto_list[ 0 ].values():
+
+            self.fail_list[ child_state ] = 0
+            state_queue.append( child_state )
+
+        #-- END loop over root's children --#
+
+        # breadth-first over the rest.
+        while ( len( state_queue ) > 0 ):
+
+            current_state = state_queue.popleft()
+            for symbol, child_state in self.goto_list[ current_state ].items():
+
+                state_queue.append( child_state )
+
+                # follow failure links from parent until a state has a
+                #    transition on this symbol (or we hit root).
+                fail_state = self.fail_list[ current_state ]
+                while ( ( fail_state != 0 ) and ( symbol not in self.goto_list[ fail_state ] ) ):
+
+                    fail_state = self.fail_list[ fail_state ]
+
+                #-- END loop over failure chain --#
+
+                fail_state = self.goto_list[ fail_state ].get( symbol, 0 )
+                self.fail_list[ child_state ] = fail_state
+                self.output_list[ child_state ] = self.output_list[ child_state ] + self.output_list[ fail_state ]
+
+            #-- END loop over children --#
+
+        #-- END loop over states --#
+
+        self.is_built = True
+
+    #-- END method build() --#
+
+
+    def find_all( self, sequence_IN ):
+
+        '''
+        Scans sequence_IN once.  Returns dictionary of pattern key to list of
+           start indexes of that pattern in the sequence, in ascending order.
+           Patterns that are not found are not in the dictionary.
+        '''
+
+        # return reference
+        dict_OUT = {}
+
+        # declare variables
+        start_index = -1
+        pattern_key = None
+
+        for start_index, pattern_key in self.iterate_matches( sequence_IN ):
+
+            dict_OUT.setdefault( pattern_key, [] ).append( start_index )
+
+        #-- END loop over matches --#
+
+        # matches are reported by end index - sort each list by start.
+        for pattern_key in dict_OUT:
+
+            dict_OUT[ pattern_key ].sort()
+
+        #-- END loop over keys --#
+
+        return dict_OUT
+
+    #-- END method find_all() --#
+
+
+    def iterate_matches( self, sequence_IN ):
+
+        '''
+        Generator - scans sequence_IN once, yielding a tuple of
+           ( start_index, pattern_key ) for each occurrence of each pattern,
+           in order of where the occurrence ends.  Calls build() first if
+           patterns were added since it was last called.
+        '''
+
+        # declare variables
+        goto_list = None
+        fail_list = None
+        output_list = None
+        pattern_length_dict = None
+        current_state = 0
+        index = -1
+        symbol = None
+        next_state = None
+        pattern_key = None
+
+        # make sure we are built.
+        if ( self.is_built == False ):
+
+            self.build()
+
+        #-- END check to see if built --#
+
+        goto_list = self.goto_list
+        fail_list = self.fail_list
+        output_list = self.output_list
+        pattern_length_dict = self.pattern_length_dict
+
+        current_state = 0
+        for index, symbol in enumerate( sequence_IN ):
+
+            # follow failure links until we can move on this symbol.
+            next_state = goto_list[ current_state ].get( symbol, None )
+            while ( ( next_state is None ) and ( current_state != 0 ) ):
+
+                current_state = fail_list[ current_state ]
+                next_state = goto_list[ current_state ].get( symbol, None )
+
+            #-- END loop over failure chain --#
+
+            if ( next_state is None ):
+
+                next_state = 0
+
+            #-- END check to see if back at root --#
+
+            current_state = next_state
+
+            # report everything that ends here.
+            for pattern_key in output_list[ current_state ]:
+
+                yield ( index - pattern_length_dict[ pattern_key ] + 1, pattern_key )
+
+            #-- END loop over outputs --#
+
+        #-- END loop over sequence --#
+
+    #-- END method iterate_matches() --#
+
+
+#-- END class AhoCorasickAutomaton --#
@@ -0,0 +1,270 @@
+from __future__ import unicode_literals
+
+'''
+Copyright 2010-2016 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text.
+
+context_text is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text. If not, see http://www.gnu.org/licenses/.
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+# python base imports
+import re
+import unicodedata
+
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class NameKeyHelper( object ):
+
+    '''
+    Builds the normalized name keys stored on Person (first_name_key,
+        last_name_key, first_initial_key, etc.), so name lookups can compare
+        keys with exact equality against an index rather than comparing name
+        parts with "__iexact":
+        - make_name_key() - accents removed, lower-cased, punctuation removed,
+            white space collapsed ("O'Brien" --> "obrien").
+        - make_initials_key() - first letter of each word, where words are
+            separated by white space, periods, or hyphens ("M.J." and
+            "Mary-Jane" --> "mj").
+        - make_phonetic_key() - American Soundex of the name ("Smith" and
+            "Smyth" --> "s530").
+    All return "" for None or a value with no letters or digits.
+        make_person_key_dict() builds all of Person's keys at once, including
+        full_name_key ("first middle last" name keys), used for searching (see
+        context_text.shared.person_search).
+    '''
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+
+    # punctuation - anything that isn't a word character or white space.
+    REGEX_PUNCTUATION = re.compile( r"[^\w\s]|_", re.UNICODE )
+
+    # white space
+    REGEX_WHITE_SPACE = re.compile( r"\s+", re.UNICODE )
+
+    # word separators for initials
+    REGEX_INITIALS_SEPARATOR = re.compile( r"[\s.\-]+", re.UNICODE )
+    INITIALS_KEY_MAX_LENGTH = 32
+    NAME_KEY_MAX_LENGTH = 255
+
+    # Soundex
+    SOUNDEX_KEY_LENGTH = 4
+    SOUNDEX_CODE_DICT = {}
+    SOUNDEX_CODE_DICT.update( dict.fromkeys( "bfpv", "1" ) )
+    SOUNDEX_CODE_DICT.update( dict.fromkeys( "cgjkqsxz", "2" ) )
+    SOUNDEX_CODE_DICT.update( dict.fromkeys( "dt", "3" ) )
+    SOUNDEX_CODE_DICT.update( dict.fromkeys( "l", "4" ) )
+    SOUNDEX_CODE_DICT.update( dict.fromkeys( "mn", "5" ) )
+    SOUNDEX_CODE_DICT.update( dict.fromkeys( "r", "6" ) )
+
+    # letters that don't separate two letters with the same code.
+    SOUNDEX_IGNORE_LETTERS = "hw"
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> class methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    @classmethod
+    def is_initials( cls, value_IN ):
+
+        '''
+        Returns True if every word in the value passed in is a single letter
+            ("W", "M.J.", "a w"), False if not or if no words.
+        '''
+
+        # return reference
+        is_initials_OUT = False
+
+        # declare variables
+        word_list = None
+
+        word_list = cls.split_words( value_IN )
+        if ( len( word_list ) > 0 ):
+
+            is_initials_OUT = all( [ ( len( current_word ) == 1 ) for current_word in word_list ] )
+
+        #-- END check to see if any words --#
+
+        return is_initials_OUT
+
+    #-- END class method is_initials() --#
+
+
+    @classmethod
+    def make_initials_key( cls, value_IN ):
+
+        '''
+        Accepts a name part.  Returns the first letter of each word, lower-case.
+        '''
+
+        return "".join( [ current_word[ 0 ] for current_word in cls.split_words( value_IN ) ] )
+
+    #-- END class method make_initials_key() --#
+
+
+    @classmethod
+    def make_name_key( cls, value_IN ):
+
+        '''
+        Accepts a name part.  Returns it with accents removed, lower-cased,
+            punctuation removed, and white space collapsed to single spaces.
+        '''
+
+        # return reference
+        value_OUT = ""
+
+        if ( value_IN is not None ):
+
+            value_OUT = cls.strip_accents( "{}".format( value_IN ) ).lower()
+            value_OUT = cls.REGEX_PUNCTUATION.sub( "", value_OUT )
+            value_OUT = cls.REGEX_WHITE_SPACE.sub( " ", value_OUT ).strip()
+
+        #-- END check to see if None --#
+
+        return value_OUT
+
+    #-- END class method make_name_key() --#
+
+
+    @classmethod
+    def make_person_key_dict( cls, first_name_IN, middle_name_IN, last_name_IN ):
+
+        '''
+        Accepts first, middle, and last name.  Returns dictionary that maps the
+            name of each of Person's name key fields to its value.
+        '''
+
+        # return reference
+        dict_OUT = {}
+
+        dict_OUT[ "first_name_key" ] = cls.make_name_key( first_name_IN )[ : cls.NAME_KEY_MAX_LENGTH ]
+        dict_OUT[ "first_initials_key" ] = cls.make_initials_key( first_name_IN )[ : cls.INITIALS_KEY_MAX_LENGTH ]
+        dict_OUT[ "middle_name_key" ] = cls.make_name_key( middle_name_IN )[ : cls.NAME_KEY_MAX_LENGTH ]
+        dict_OUT[ "middle_initials_key" ] = cls.make_initials_key( middle_name_IN )[ : cls.INITIALS_KEY_MAX_LENGTH ]
+        dict_OUT[ "last_name_key" ] = cls.make_name_key( last_name_IN )[ : cls.NAME_KEY_MAX_LENGTH ]
+        dict_OUT[ "last_name_phonetic_key" ] = cls.make_phonetic_key( last_name_IN )
+
+        # whole name, for searching.
+        dict_OUT[ "full_name_key" ] = " ".join( [ current_key for current_key in ( dict_OUT[ "first_name_key" ], dict_OUT[ "middle_name_key" ], dict_OUT[ "last_name_key" ] ) if ( current_key != "" ) ] )[ : cls.NAME_KEY_MAX_LENGTH ]
+
+        return dict_OUT
+
+    #-- END class method make_person_key_dict() --#
+
+
+    @classmethod
+    def make_phonetic_key( cls, value_IN ):
+
+        '''
+        Accepts a name part.  Returns its American Soundex code, lower-case
+            ("s530"), computed from the letters in make_name_key( value_IN ).
+            Returns "" if no letters.
+        '''
+
+        # return reference
+        value_OUT = ""
+
+        # declare variables
+        letter_list = None
+        code_list = None
+        previous_code = None
+        current_letter = None
+        current_code = None
+
+        letter_list = [ current_letter for current_letter in cls.make_name_key( value_IN ) if ( "a" <= current_letter <= "z" ) ]
+        if ( len( letter_list ) > 0 ):
+
+            code_list = [ letter_list[ 0 ] ]
+            previous_code = cls.SOUNDEX_CODE_DICT.get( letter_list[ 0 ], "" )
+            for current_letter in letter_list[ 1 : ]:
+
+                # "h" and "w" don't reset the previous code.
+                if ( current_letter not in cls.SOUNDEX_IGNORE_LETTERS ):
+
+                    current_code = cls.SOUNDEX_CODE_DICT.get( current_letter, "" )
+                    if ( ( current_code != "" ) and ( current_code != previous_code ) ):
+
+                        code_list.append( current_code )
+
+                    #-- END check to see if new code --#
+
+                    previous_code = current_code
+
+                #-- END check to see if ignored letter --#
+
+            #-- END loop over letters --#
+
+            value_OUT = "".join( code_list )[ : cls.SOUNDEX_KEY_LENGTH ].ljust( cls.SOUNDEX_KEY_LENGTH, "0" )
+
+        #-- END check to see if any letters --#
+
+        return value_OUT
+
+    #-- END class method make_phonetic_key() --#
+
+
+    @classmethod
+    def split_words( cls, value_IN ):
+
+        '''
+        Accepts a name part.  Returns list of its words, split on white space,
+            periods, and hyphens, then passed through make_name_key() (empty
+            words are dropped).
+        '''
+
+        # return reference
+        list_OUT = []
+
+        # declare variables
+        current_word = None
+
+        if ( value_IN is not None ):
+
+            for current_word in cls.REGEX_INITIALS_SEPARATOR.split( "{}".format( value_IN ) ):
+
+                current_word = cls.make_name_key( current_word ).replace( " ", "" )
+                if ( current_word != "" ):
+
+                    list_OUT.append( current_word )
+
+                #-- END check to see if empty --#
+
+            #-- END loop over words --#
+
+        #-- END check to see if None --#
+
+        return list_OUT
+
+    #-- END class method split_words() --#
+
+
+    @classmethod
+    def strip_accents( cls, value_IN ):
+
+        '''
+        Returns the string passed in with accents removed ("José" --> "Jose").
+        '''
+
+        return "".join( [ current_char for current_char in unicodedata.normalize( "NFKD", value_IN ) if ( unicodedata.combining( current_char ) == 0 ) ] )
+
+    #-- END class method strip_accents() --#
+
+
+#-- END class NameKeyHelper --#
@@ -0,0 +1,136 @@
+from __future__ import unicode_literals
+
+'''
+Copyright 2010-2016 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text.
+
+context_text is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text. If not, see http://www.gnu.org/licenses/.
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+
+# python base imports
+from collections import OrderedDict
+import threading
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class ParsedTextCache( object ):
+
+    '''
+    Bounded, thread-safe least-recently-used cache of parse products for
+       article text, keyed on the text itself, so Article_Text instances that
+       hold the same content (the same article loaded more than once in a
+       batch run, for example) share one parse.  Each value is the dictionary
+       Article_Text fills in lazily with its paragraph list, plain text, word
+       lists, and word offset indexes.
+    '''
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+    DEFAULT_MAX_SIZE = 1000
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> __init__() method
+    #---------------------------------------------------------------------------
+
+
+    def __init__( self, max_size_IN = DEFAULT_MAX_SIZE ):
+
+        # declare variables
+        self.max_size = max_size_IN
+        self.entry_dict = OrderedDict()
+        self.lock = threading.Lock()
+
+        # stats
+        self.hit_count = 0
+        self.miss_count = 0
+
+    #-- END method __init__() --#
+
+
+    def __len__( self ):
+
+        return len( self.entry_dict )
+
+    #-- END method __len__() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def clear( self ):
+
+        '''
+        Removes all entries and resets hit and miss counts.
+        '''
+
+        with self.lock:
+
+            self.entry_dict.clear()
+            self.hit_count = 0
+            self.miss_count = 0
+
+        #-- END with lock --#
+
+    #-- END method clear() --#
+
+
+    def get_parse_dict( self, text_IN ):
+
+        '''
+        Accepts text.  Returns the parse dictionary for that text, creating and
+           storing an empty one if the text is not already in the cache.  If
+           the cache is full, evicts the least recently used entry.
+        '''
+
+        # return reference
+        dict_OUT = None
+
+        with self.lock:
+
+            dict_OUT = self.entry_dict.get( text_IN, None )
+            if ( dict_OUT is not None ):
+
+                # hit - mark most recently used.
+                self.entry_dict.move_to_end( text_IN )
+                self.hit_count += 1
+
+            else:
+
+                # miss - add new entry, then trim to size.
+                dict_OUT = {}
+                self.entry_dict[ text_IN ] = dict_OUT
+                self.miss_count += 1
+
+                while ( len( self.entry_dict ) > self.max_size ):
+
+                    self.entry_dict.popitem( last = False )
+
+                #-- END loop to evict least recently used --#
+
+            #-- END check to see if hit --#
+
+        #-- END with lock --#
+
+        return dict_OUT
+
+    #-- END method get_parse_dict() --#
+
+
+#-- END class ParsedTextCache --#
@@ -0,0 +1,971 @@
+from __future__ import unicode_literals
+from __future__ import division
+
+'''
+Copyright 2010-2016 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text.
+
+context_text is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text. If not, see http://www.gnu.org/licenses/.
+
+Ranked, typo-tolerant Person name search for PersonAutocomplete and the
+   person_filter view.  A Person matches a search if their full_name_key
+   contains the normalized search string, or if the two are similar enough by
+   trigram similarity (shared trigrams divided by all trigrams, computed the
+   way PostgreSQL's pg_trgm does).  Results are ranked substring matches
+   first, then by similarity, then by ID.
+
+Backends:
+- PostgreSQLPersonSearchBackend - pg_trgm in the database, using the GIN
+   trigram index on full_name_key from migration 0037.
+- NGramPersonSearchBackend - in-process trigram index over full_name_key,
+   for SQLite and MySQL (or PostgreSQL without pg_trgm).
+
+Use PersonSearch.get_backend() to get the best available backend, and
+   PersonSearch.register_backend() to plug in another.
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+# python base imports
+from abc import ABCMeta, abstractmethod
+import collections
+import heapq
+import math
+import threading
+import time
+
+# django imports
+from django.db import connection
+from django.db.models import Case
+from django.db.models import CharField
+from django.db.models import FloatField
+from django.db.models import IntegerField
+from django.db.models import Q
+from django.db.models import Value
+from django.db.models import When
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+# django.contrib.postgres - only needed for the PostgreSQL backend, so if
+#    psycopg2 isn't installed, the n-gram backend still works.
+try:
+
+    from django.contrib.postgres.lookups import TrigramSimilar
+    from django.contrib.postgres.search import TrigramSimilarity
+
+    # "__trigram_similar" is registered when django.contrib.postgres is in
+    #    INSTALLED_APPS - register it here so it doesn't have to be.
+    CharField.register_lookup( TrigramSimilar )
+
+except ImportError:
+
+    TrigramSimilar = None
+    TrigramSimilarity = None
+
+#-- END try...except around django.contrib.postgres imports --#
+
+# context_text imports
+from context_text.models import Person
+from context_text.shared.name_key_helper import NameKeyHelper
+
+
+#===============================================================================
+# functions
+#===============================================================================
+
+
+def make_trigram_set( key_IN ):
+
+    '''
+    Accepts a normalized name key.  Returns the set of its trigrams, made the
+        way pg_trgm makes them: each word padded with two spaces in front and
+        one behind ("smith" --> "  s", " sm", "smi", "mit", "ith", "th ").
+    '''
+
+    # return reference
+    set_OUT = set()
+
+    # declare variables
+    current_word = None
+    padded_word = None
+    char_index = -1
+
+    for current_word in key_IN.split():
+
+        padded_word = "  " + current_word + " "
+        for char_index in range( len( padded_word ) - 2 ):
+
+            set_OUT.add( padded_word[ char_index : char_index + 3 ] )
+
+        #-- END loop over trigrams in word --#
+
+    #-- END loop over words --#
+
+    return set_OUT
+
+#-- END function make_trigram_set() --#
+
+
+#===============================================================================
+# classes (base class first, then in alphabetical order by name)
+#===============================================================================
+
+class PersonSearchBackend( object ):
+
+    '''
+    Parent class for Person search backends.  Child classes implement search()
+        and, if they can tell, is_available().
+    '''
+
+    __metaclass__ = ABCMeta
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+
+    # name used to ask PersonSearch for this backend.
+    BACKEND_NAME = None
+
+    # defaults
+    DEFAULT_RESULT_LIMIT = 20
+
+    # same as pg_trgm's default similarity threshold.
+    DEFAULT_MIN_SIMILARITY = 0.3
+
+    # score bonus for substring matches, so they rank ahead of the rest.
+    SUBSTRING_MATCH_SCORE = 1.0
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> class methods
+    #---------------------------------------------------------------------------
+
+
+    @classmethod
+    def is_available( cls ):
+
+        '''
+        Returns True if this backend can be used with the current database.
+        '''
+
+        return True
+
+    #-- END class method is_available() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> __init__() method
+    #---------------------------------------------------------------------------
+
+
+    def __init__( self ):
+
+        # declare variables
+        self.min_similarity = self.DEFAULT_MIN_SIMILARITY
+
+    #-- END method __init__() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def make_query_key( self, query_string_IN ):
+
+        '''
+        Returns the search string normalized the way full_name_key is.
+        '''
+
+        return NameKeyHelper.make_name_key( query_string_IN )
+
+    #-- END method make_query_key() --#
+
+
+    def remove_person( self, person_id_IN ):
+
+        '''
+        Called when a Person is deleted.  Backends that keep their own index
+            override this.
+        '''
+
+        pass
+
+    #-- END method remove_person() --#
+
+
+    @abstractmethod
+    def search( self, query_string_IN, limit_IN = DEFAULT_RESULT_LIMIT, qs_IN = None ):
+
+        '''
+        Accepts search string, maximum number of results (None for all), and
+            optional QuerySet of Persons to limit the search to.  Returns list
+            of ( person ID, score ) tuples, best match first.  Score is
+            similarity (0 to 1), plus SUBSTRING_MATCH_SCORE for substring
+            matches.  Returns empty list if the search string is empty.
+        '''
+
+        pass
+
+    #-- END abstract method search() --#
+
+
+    def search_queryset( self, query_string_IN, limit_IN = DEFAULT_RESULT_LIMIT, qs_IN = None ):
+
+        '''
+        Same as search(), but returns QuerySet of the matching Persons, in
+            ranked order.
+        '''
+
+        # return reference
+        qs_OUT = None
+
+        # declare variables
+        person_id_list = None
+        rank_index = -1
+        when_list = None
+
+        person_id_list = [ current_result[ 0 ] for current_result in self.search( query_string_IN, limit_IN = limit_IN, qs_IN = qs_IN ) ]
+        if ( len( person_id_list ) > 0 ):
+
+            when_list = [ When( id = person_id, then = Value( rank_index ) ) for rank_index, person_id in enumerate( person_id_list ) ]
+            qs_OUT = Person.objects.filter( id__in = person_id_list ).order_by( Case( *when_list, output_field = IntegerField() ) )
+
+        else:
+
+            qs_OUT = Person.objects.none()
+
+        #-- END check to see if any matches --#
+
+        return qs_OUT
+
+    #-- END method search_queryset() --#
+
+
+    def update_person( self, person_IN ):
+
+        '''
+        Called when a Person is saved.  Backends that keep their own index
+            override this.
+        '''
+
+        pass
+
+    #-- END method update_person() --#
+
+
+#-- END class PersonSearchBackend --#
+
+
+class NGramPersonSearchBackend( PersonSearchBackend ):
+
+    '''
+    Keeps a trigram index of every Person's full_name_key in memory: trigram
+        --> list of IDs of people whose key has it.  Built from one
+        values_list() query the first time it is searched, kept current in
+        this process by the Person post_save and post_delete receivers below,
+        and rebuilt once it is older than max_age_seconds, to pick up changes
+        made by other processes.
+    - substring matches: candidates are the people who have every trigram in
+        the search string that doesn't include padding, checked with "in".
+        Search strings too short to have one are checked against every key.
+    - similar matches: shared trigram counts come from the posting lists of
+        the search string's trigrams.
+    Thread-safe - one index can be shared by all of a process's requests.
+    '''
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+
+    BACKEND_NAME = "ngram"
+
+    # rebuild after this many seconds.
+    DEFAULT_MAX_AGE_SECONDS = 600
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> __init__() method
+    #---------------------------------------------------------------------------
+
+
+    def __init__( self ):
+
+        # call parent's __init__()
+        super( NGramPersonSearchBackend, self ).__init__()
+
+        # declare variables
+        self.max_age_seconds = self.DEFAULT_MAX_AGE_SECONDS
+        self.lock = threading.RLock()
+        self.built_time = None
+        self.trigram_to_id_list_dict = {}
+        self.person_id_to_key_dict = {}
+        self.person_id_to_trigram_count_dict = {}
+
+    #-- END method __init__() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def add_person( self, person_id_IN, full_name_key_IN ):
+
+        '''
+        Accepts person ID and full_name_key.  Adds the person to the index,
+            replacing any prior entry for the same ID.
+        '''
+
+        # declare variables
+        trigram_set = None
+        current_trigram = None
+
+        with self.lock:
+
+            self.remove_person( person_id_IN )
+            trigram_set = make_trigram_set( full_name_key_IN or "" )
+            self.person_id_to_key_dict[ person_id_IN ] = full_name_key_IN or ""
+            self.person_id_to_trigram_count_dict[ person_id_IN ] = len( trigram_set )
+            for current_trigram in trigram_set:
+
+                self.trigram_to_id_list_dict.setdefault( current_trigram, [] ).append( person_id_IN )
+
+            #-- END loop over trigrams --#
+
+        #-- END with lock --#
+
+    #-- END method add_person() --#
+
+
+    def build( self ):
+
+        '''
+        Loads every Person's full_name_key into a new index with one query.
+            Returns count of people indexed.
+        '''
+
+        # return reference
+        count_OUT = 0
+
+        # declare variables
+        current_person_id = None
+        current_key = None
+
+        with self.lock:
+
+            self.clear()
+            for current_person_id, current_key in Person.objects.values_list( "id", "full_name_key" ).iterator():
+
+                self.add_person( current_person_id, current_key )
+                count_OUT += 1
+
+            #-- END loop over people --#
+
+            self.built_time = time.time()
+
+        #-- END with lock --#
+
+        return count_OUT
+
+    #-- END method build() --#
+
+
+    def clear( self ):
+
+        '''
+        Empties the index.  It is rebuilt on the next search.
+        '''
+
+        with self.lock:
+
+            self.built_time = None
+            self.trigram_to_id_list_dict = {}
+            self.person_id_to_key_dict = {}
+            self.person_id_to_trigram_count_dict = {}
+
+        #-- END with lock --#
+
+    #-- END method clear() --#
+
+
+    def find_similar( self, query_key_IN ):
+
+        '''
+        Accepts normalized search string.  Returns dictionary of person ID -->
+            trigram similarity for people at least min_similarity similar.
+        '''
+
+        # return reference
+        dict_OUT = {}
+
+        # declare variables
+        query_trigram_set = None
+        query_trigram_count = -1
+        min_shared_count = -1
+        shared_counter = None
+        current_trigram = None
+        person_id = None
+        shared_count = -1
+        similarity = -1.0
+
+        query_trigram_set = make_trigram_set( query_key_IN )
+        query_trigram_count = len( query_trigram_set )
+        if ( query_trigram_count > 0 ):
+
+            # count shared trigrams.
+            shared_counter = collections.Counter()
+            for current_trigram in query_trigram_set:
+
+                shared_counter.update( self.trigram_to_id_list_dict.get( current_trigram, () ) )
+
+            #-- END loop over trigrams --#
+
+            # union is at least the query's trigrams, so fewer shared than this
+            #     can't be similar enough.
+            min_shared_count = max( 1, int( math.ceil( self.min_similarity * query_trigram_count ) ) )
+            for person_id, shared_count in shared_counter.items():
+
+                if ( shared_count >= min_shared_count ):
+
+                    similarity = shared_count / ( query_trigram_count + self.person_id_to_trigram_count_dict[ person_id ] - shared_count )
+                    if ( similarity >= self.min_similarity ):
+
+                        dict_OUT[ person_id ] = similarity
+
+                    #-- END check to see if similar enough --#
+
+                #-- END check to see if enough shared --#
+
+            #-- END loop over people with shared trigrams --#
+
+        #-- END check to see if trigrams --#
+
+        return dict_OUT
+
+    #-- END method find_similar() --#
+
+
+    def find_substring( self, query_key_IN ):
+
+        '''
+        Accepts normalized search string.  Returns set of IDs of people whose
+            full_name_key contains it.
+        '''
+
+        # return reference
+        set_OUT = set()
+
+        # declare variables
+        inner_trigram_list = None
+        char_index = -1
+        current_trigram = None
+        id_list_list = None
+        candidate_id_set = None
+        current_id_list = None
+        person_id = None
+        full_name_key = None
+
+        # trigrams with no padding, so they are in any key that contains query.
+        inner_trigram_list = []
+        for char_index in range( len( query_key_IN ) - 2 ):
+
+            current_trigram = query_key_IN[ char_index : char_index + 3 ]
+            if ( " " not in current_trigram ):
+
+                inner_trigram_list.append( current_trigram )
+
+            #-- END check to see if no padding --#
+
+        #-- END loop over trigrams --#
+
+        if ( len( inner_trigram_list ) > 0 ):
+
+            # intersect posting lists, shortest first.
+            id_list_list = sorted( [ self.trigram_to_id_list_dict.get( current_trigram, [] ) for current_trigram in set( inner_trigram_list ) ], key = len )
+            candidate_id_set = set( id_list_list[ 0 ] )
+            for current_id_list in id_list_list[ 1 : ]:
+
+                if ( len( candidate_id_set ) > 0 ):
+
+                    candidate_id_set.intersection_update( current_id_list )
+
+                #-- END check to see if any candidates left --#
+
+            #-- END loop over posting lists --#
+
+            set_OUT = set( [ person_id for person_id in candidate_id_set if ( query_key_IN in self.person_id_to_key_dict[ person_id ] ) ] )
+
+        else:
+
+            # too short - check everyone.
+            set_OUT = set( [ person_id for person_id, full_name_key in self.person_id_to_key_dict.items() if ( query_key_IN in full_name_key ) ] )
+
+        #-- END check to see if inner trigrams --#
+
+        return set_OUT
+
+    #-- END method find_substring() --#
+
+
+    def is_stale( self ):
+
+        '''
+        Returns True if index hasn't been built, or is older than
+            max_age_seconds.
+        '''
+
+        return ( ( self.built_time is None ) or ( ( time.time() - self.built_time ) > self.max_age_seconds ) )
+
+    #-- END method is_stale() --#
+
+
+    def remove_person( self, person_id_IN ):
+
+        '''
+        Accepts person ID.  Removes the person from the index, if present.
+        '''
+
+        # declare variables
+        full_name_key = None
+        current_trigram = None
+        id_list = None
+
+        with self.lock:
+
+            full_name_key = self.person_id_to_key_dict.pop( person_id_IN, None )
+            if ( full_name_key is not None ):
+
+                for current_trigram in make_trigram_set( full_name_key ):
+
+                    id_list = self.trigram_to_id_list_dict.get( current_trigram, [] )
+                    if ( person_id_IN in id_list ):
+
+                        id_list.remove( person_id_IN )
+
+                    #-- END check to see if in list --#
+
+                    if ( len( id_list ) == 0 ):
+
+                        self.trigram_to_id_list_dict.pop( current_trigram, None )
+
+                    #-- END check to see if list empty --#
+
+                #-- END loop over trigrams --#
+
+                del self.person_id_to_trigram_count_dict[ person_id_IN ]
+
+            #-- END check to see if indexed --#
+
+        #-- END with lock --#
+
+    #-- END method remove_person() --#
+
+
+    def search( self, query_string_IN, limit_IN = PersonSearchBackend.DEFAULT_RESULT_LIMIT, qs_IN = None ):
+
+        '''
+        See PersonSearchBackend.search().  Builds (or rebuilds) the index first
+            if needed.
+        '''
+
+        # return reference
+        list_OUT = []
+
+        # declare variables
+        query_key = None
+        substring_id_set = None
+        similarity_dict = None
+        allowed_id_set = None
+        person_id = None
+        score_dict = None
+
+        query_key = self.make_query_key( query_string_IN )
+        if ( query_key != "" ):
+
+            with self.lock:
+
+                if ( self.is_stale() == True ):
+
+                    self.build()
+
+                #-- END check to see if need to build --#
+
+                substring_id_set = self.find_substring( query_key )
+                similarity_dict = self.find_similar( query_key )
+
+            #-- END with lock --#
+
+            # score
+            score_dict = dict( similarity_dict )
+            for person_id in substring_id_set:
+
+                score_dict[ person_id ] = score_dict.get( person_id, 0.0 ) + self.SUBSTRING_MATCH_SCORE
+
+            #-- END loop over substring matches --#
+
+            # limit to QuerySet?
+            if ( qs_IN is not None ):
+
+                allowed_id_set = set( qs_IN.values_list( "id", flat = True ) )
+                score_dict = dict( [ ( person_id, score ) for person_id, score in score_dict.items() if ( person_id in allowed_id_set ) ] )
+
+            #-- END check to see if QuerySet --#
+
+            # rank - only the top limit_IN, if there is a limit.
+            if ( limit_IN is not None ):
+
+                list_OUT = heapq.nsmallest( limit_IN, score_dict.items(), key = lambda current_item : ( -current_item[ 1 ], current_item[ 0 ] ) )
+
+            else:
+
+                list_OUT = sorted( score_dict.items(), key = lambda current_item : ( -current_item[ 1 ], current_item[ 0 ] ) )
+
+            #-- END check to see if limit --#
+
+        #-- END check to see if query --#
+
+        return list_OUT
+
+    #-- END method search() --#
+
+
+    def update_person( self, person_IN ):
+
+        '''
+        Accepts saved Person.  If the index has been built, updates the
+            person's entry.
+        '''
+
+        with self.lock:
+
+            if ( self.built_time is not None ):
+
+                self.add_person( person_IN.id, person_IN.full_name_key )
+
+            #-- END check to see if built --#
+
+        #-- END with lock --#
+
+    #-- END method update_person() --#
+
+
+#-- END class NGramPersonSearchBackend --#
+
+
+class PostgreSQLPersonSearchBackend( PersonSearchBackend ):
+
+    '''
+    Searches in PostgreSQL with pg_trgm: "LIKE" for substring matches and the
+        "%" similarity operator, both of which use the GIN trigram index on
+        full_name_key (migration 0037), ranked by similarity().  The
+        similarity threshold is the database's pg_trgm.similarity_threshold
+        (0.3 unless changed), not min_similarity.
+    '''
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+
+    BACKEND_NAME = "postgresql_trigram"
+
+    # cache of whether pg_trgm is installed, by database alias.
+    extension_available_dict = {}
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> class methods
+    #---------------------------------------------------------------------------
+
+
+    @classmethod
+    def is_available( cls ):
+
+        '''
+        Returns True if the database is PostgreSQL with pg_trgm installed, and
+            django.contrib.postgres can be imported.
+        '''
+
+        # return reference
+        is_available_OUT = False
+
+        # declare variables
+        my_cursor = None
+
+        if ( ( connection.vendor == "postgresql" ) and ( TrigramSimilarity is not None ) ):
+
+            if ( connection.alias not in cls.extension_available_dict ):
+
+                with connection.cursor() as my_cursor:
+
+                    my_cursor.execute( "SELECT COUNT( * ) FROM pg_extension WHERE extname = 'pg_trgm'" )
+                    cls.extension_available_dict[ connection.alias ] = ( my_cursor.fetchone()[ 0 ] > 0 )
+
+                #-- END with cursor --#
+
+            #-- END check to see if already checked --#
+
+            is_available_OUT = cls.extension_available_dict[ connection.alias ]
+
+        #-- END check to see if PostgreSQL --#
+
+        return is_available_OUT
+
+    #-- END class method is_available() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def search( self, query_string_IN, limit_IN = PersonSearchBackend.DEFAULT_RESULT_LIMIT, qs_IN = None ):
+
+        '''
+        See PersonSearchBackend.search().  One query.
+        '''
+
+        # return reference
+        list_OUT = []
+
+        # declare variables
+        query_key = None
+        person_qs = None
+        person_id = None
+        substring_score = None
+        similarity = None
+
+        query_key = self.make_query_key( query_string_IN )
+        if ( query_key != "" ):
+
+            person_qs = qs_IN
+            if ( person_qs is None ):
+
+                person_qs = Person.objects.all()
+
+            #-- END check to see if QuerySet passed in --#
+
+            person_qs = person_qs.filter( Q( full_name_key__contains = query_key ) | Q( full_name_key__trigram_similar = query_key ) )
+            person_qs = person_qs.annotate( search_substring_score = Case( When( full_name_key__contains = query_key, then = Value( self.SUBSTRING_MATCH_SCORE ) ), default = Value( 0.0 ), output_field = FloatField() ),
+                                            search_similarity = TrigramSimilarity( "full_name_key", query_key ) )
+            person_qs = person_qs.order_by( "-search_substring_score", "-search_similarity", "id" )
+            person_qs = person_qs.values_list( "id", "search_substring_score", "search_similarity" )
+            if ( limit_IN is not None ):
+
+                person_qs = person_qs[ : limit_IN ]
+
+            #-- END check to see if limit --#
+
+            list_OUT = [ ( person_id, substring_score + similarity ) for person_id, substring_score, similarity in person_qs ]
+
+        #-- END check to see if query --#
+
+        return list_OUT
+
+    #-- END method search() --#
+
+
+#-- END class PostgreSQLPersonSearchBackend --#
+
+
+class PersonSearch( object ):
+
+    '''
+    Registry of Person search backends.  get_backend() returns a shared
+        instance of a backend - the one asked for by name, or the first
+        available one in BACKEND_CLASS_LIST (PostgreSQL trigram, then n-gram).
+    '''
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+
+    # backend classes, most preferred first.
+    BACKEND_CLASS_LIST = []
+    BACKEND_CLASS_LIST.append( PostgreSQLPersonSearchBackend )
+    BACKEND_CLASS_LIST.append( NGramPersonSearchBackend )
+
+    # shared instances, by backend name.
+    backend_instance_dict = {}
+    backend_lock = threading.Lock()
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> class methods
+    #---------------------------------------------------------------------------
+
+
+    @classmethod
+    def get_backend( cls, backend_name_IN = None ):
+
+        '''
+        Accepts optional backend name.  Returns shared instance of that
+            backend, or, if no name, the first available backend.  Raises
+            ValueError if the name is not registered.
+        '''
+
+        # return reference
+        instance_OUT = None
+
+        # declare variables
+        backend_class = None
+        current_class = None
+
+        # which class?
+        if ( backend_name_IN is not None ):
+
+            for current_class in cls.BACKEND_CLASS_LIST:
+
+                if ( current_class.BACKEND_NAME == backend_name_IN ):
+
+                    backend_class = current_class
+
+                #-- END check to see if match --#
+
+            #-- END loop over backend classes --#
+
+            if ( backend_class is None ):
+
+                raise ValueError( "PersonSearch: unknown backend name \"{}\".".format( backend_name_IN ) )
+
+            #-- END check to see if found --#
+
+        else:
+
+            for current_class in cls.BACKEND_CLASS_LIST:
+
+                if ( ( backend_class is None ) and ( current_class.is_available() == True ) ):
+
+                    backend_class = current_class
+
+                #-- END check to see if available --#
+
+            #-- END loop over backend classes --#
+
+        #-- END check to see if name passed in --#
+
+        # shared instance
+        with cls.backend_lock:
+
+            instance_OUT = cls.backend_instance_dict.get( backend_class.BACKEND_NAME, None )
+            if ( instance_OUT is None ):
+
+                instance_OUT = backend_class()
+                cls.backend_instance_dict[ backend_class.BACKEND_NAME ] = instance_OUT
+
+            #-- END check to see if instance exists --#
+
+        #-- END with lock --#
+
+        return instance_OUT
+
+    #-- END class method get_backend() --#
+
+
+    @classmethod
+    def get_backend_instance_list( cls ):
+
+        '''
+        Returns list of the backend instances created so far.
+        '''
+
+        # return reference
+        list_OUT = None
+
+        with cls.backend_lock:
+
+            list_OUT = list( cls.backend_instance_dict.values() )
+
+        #-- END with lock --#
+
+        return list_OUT
+
+    #-- END class method get_backend_instance_list() --#
+
+
+    @classmethod
+    def register_backend( cls, backend_class_IN, is_preferred_IN = False ):
+
+        '''
+        Accepts PersonSearchBackend child class.  Adds it to the registry - at
+            the front of the list if is_preferred_IN, so get_backend() picks it
+            whenever it is available, else at the end.
+        '''
+
+        if ( backend_class_IN not in cls.BACKEND_CLASS_LIST ):
+
+            if ( is_preferred_IN == True ):
+
+                cls.BACKEND_CLASS_LIST.insert( 0, backend_class_IN )
+
+            else:
+
+                cls.BACKEND_CLASS_LIST.append( backend_class_IN )
+
+            #-- END check to see if preferred --#
+
+        #-- END check to see if already registered --#
+
+    #-- END class method register_backend() --#
+
+
+#-- END class PersonSearch --#
+
+
+#===============================================================================
+# signal receivers
+#===============================================================================
+
+
+@receiver( post_save, sender = Person )
+def person_search_post_save( sender, instance, **kwargs ):
+
+    '''
+    Keeps backend indexes current when a Person is saved.
+    '''
+
+    # declare variables
+    current_backend = None
+
+    for current_backend in PersonSearch.get_backend_instance_list():
+
+        current_backend.update_person( instance )
+
+    #-- END loop over backends --#
+
+#-- END function person_search_post_save() --#
+
+
+@receiver( post_delete, sender = Person )
+def person_search_post_delete( sender, instance, **kwargs ):
+
+    '''
+    Keeps backend indexes current when a Person is deleted.
+    '''
+
+    # declare variables
+    current_backend = None
+
+    for current_backend in PersonSearch.get_backend_instance_list():
+
+        current_backend.remove_person( instance.id )
+
+    #-- END loop over backends --#
+
+#-- END function person_search_post_delete() --#
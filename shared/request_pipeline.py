@@ -0,0 +1,709 @@
+from __future__ import unicode_literals
+
+'''
+Copyright 2010-2016 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text.
+
+context_text is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text. If not, see http://www.gnu.org/licenses/.
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+
+# python base imports
+import concurrent.futures
+import heapq
+import json
+import time
+
+# six - Python 2 and 3 support
+import six
+
+# requests HTTP package
+import requests
+from requests.adapters import HTTPAdapter
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class DailyLimitReachedError( Exception ):
+
+    '''
+    Raised in a request thread when the rate limiter says the daily request
+       limit has been reached, so the request was not sent.
+    '''
+
+    # just make it work exactly like an Exception
+    pass
+
+#-- END DailyLimitReachedError class --#
+
+
+class RequestPipeline( object ):
+
+    '''
+    Sends POST requests to a remote service (the OpenCalais API, for example)
+       over one pooled requests.Session, keeping up to concurrency requests in
+       flight at once.  Pass run() an iterable of ( key, request data ) pairs.
+       It yields a RequestPipelineResult for each as it finishes, so the
+       caller can work with one response while the next requests are still
+       outstanding.  Responses are parsed as JSON in the thread that calls
+       run(), not in the request threads.
+
+    Requests that fail because the service says there are too many concurrent
+       requests (HTTP 429, or a body that contains one of the strings in
+       concurrency_limit_text_list), or because of a transient problem
+       (connection error, timeout, HTTP 500, 502, 503, or 504) are put back
+       in the queue and re-sent after an exponential backoff (or the
+       Retry-After header, if the service sends one), up to max_retries times.
+       After that, the result is returned with error_message set.
+
+    If a rate_limiter is passed in (anything with start_request() and
+       may_i_continue() methods, like article_coding.SharedRateLimiter), each
+       request thread calls start_request() before sending, which waits for
+       its turn.  Once the rate limiter's daily limit is reached, run() stops
+       taking new requests from the iterable, and requests the limiter
+       refuses come back unsent, with is_daily_limit_reached set.
+
+    The session is kept across calls to run(), so one pipeline can be reused.
+       If the pipeline made the session, call close() when done with it, or
+       use the pipeline as a context manager ("with RequestPipeline( ... ) as
+       my_pipeline:").
+    '''
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+    DEFAULT_CONCURRENCY = 2
+    DEFAULT_MAX_RETRIES = 5
+    DEFAULT_BACKOFF_SECONDS = 1.0
+    DEFAULT_MAX_BACKOFF_SECONDS = 60.0
+    DEFAULT_TIMEOUT_SECONDS = 120
+    TEXT_ENCODING = "utf-8"
+
+    # HTTP status codes we retry.
+    STATUS_CODE_OK = 200
+    STATUS_CODE_TOO_MANY_REQUESTS = 429
+    TRANSIENT_STATUS_CODE_LIST = [ 500, 502, 503, 504 ]
+
+    # retry reasons
+    RETRY_REASON_CONCURRENCY_LIMIT = "concurrency_limit"
+    RETRY_REASON_TRANSIENT = "transient"
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> class methods
+    #---------------------------------------------------------------------------
+
+
+    @classmethod
+    def make_session( cls, pool_size_IN = DEFAULT_CONCURRENCY ):
+
+        '''
+        Accepts number of connections to keep open.  Returns a requests.Session
+           whose HTTP and HTTPS adapters keep that many connections to a host
+           in their pool, so requests reuse connections rather than opening a
+           new one each time.
+        '''
+
+        # return reference
+        session_OUT = None
+
+        # declare variables
+        my_adapter = None
+
+        session_OUT = requests.Session()
+        my_adapter = HTTPAdapter( pool_connections = 1, pool_maxsize = max( 1, pool_size_IN ) )
+        session_OUT.mount( "https://", my_adapter )
+        session_OUT.mount( "http://", my_adapter )
+
+        return session_OUT
+
+    #-- END class method make_session() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> __init__() method
+    #---------------------------------------------------------------------------
+
+
+    def __init__( self,
+                  url_IN,
+                  header_dict_IN = None,
+                  concurrency_IN = DEFAULT_CONCURRENCY,
+                  max_retries_IN = DEFAULT_MAX_RETRIES,
+                  backoff_seconds_IN = DEFAULT_BACKOFF_SECONDS,
+                  max_backoff_seconds_IN = DEFAULT_MAX_BACKOFF_SECONDS,
+                  timeout_seconds_IN = DEFAULT_TIMEOUT_SECONDS,
+                  rate_limiter_IN = None,
+                  session_IN = None ):
+
+        # declare variables
+        self.url = url_IN
+        self.header_dict = header_dict_IN
+        self.concurrency = max( 1, concurrency_IN )
+        self.max_retries = max_retries_IN
+        self.backoff_seconds = backoff_seconds_IN
+        self.max_backoff_seconds = max_backoff_seconds_IN
+        self.timeout_seconds = timeout_seconds_IN
+        self.rate_limiter = rate_limiter_IN
+
+        # strings that, if in a response body, mean too many concurrent
+        #     requests.
+        self.concurrency_limit_text_list = []
+
+        # session - if not passed in, make one and close it when done.
+        self.session = session_IN
+        self.is_session_owner = False
+        if ( self.session is None ):
+
+            self.session = self.make_session( self.concurrency )
+            self.is_session_owner = True
+
+        #-- END check to see if session passed in --#
+
+        # stats
+        self.request_count = 0
+        self.retry_count = 0
+        self.concurrency_limit_count = 0
+        self.error_count = 0
+
+        # set once the rate limiter refuses a request.
+        self.is_daily_limit_reached = False
+
+    #-- END method __init__() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> overridden built-in methods
+    #---------------------------------------------------------------------------
+
+
+    def __enter__( self ):
+
+        return self
+
+    #-- END method __enter__() --#
+
+
+    def __exit__( self, exception_type_IN, exception_value_IN, traceback_IN ):
+
+        # close session, if we made it.
+        self.close()
+
+        return False
+
+    #-- END method __exit__() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def close( self ):
+
+        '''
+        Closes the session, if this instance made it.
+        '''
+
+        if ( ( self.is_session_owner == True ) and ( self.session is not None ) ):
+
+            self.session.close()
+            self.session = None
+
+        #-- END check to see if we own the session --#
+
+    #-- END method close() --#
+
+
+    def get_backoff_seconds( self, attempt_count_IN, retry_after_IN = None ):
+
+        '''
+        Accepts number of attempts so far and optional Retry-After header value.
+           Returns seconds to wait before the next attempt - Retry-After, if it
+           is a number of seconds, else backoff_seconds doubled for each
+           attempt after the first, no more than max_backoff_seconds.
+        '''
+
+        # return reference
+        seconds_OUT = 0.0
+
+        # Retry-After?
+        seconds_OUT = None
+        if ( retry_after_IN is not None ):
+
+            try:
+
+                seconds_OUT = float( retry_after_IN )
+
+            except ValueError:
+
+                # HTTP date, or junk - use backoff.
+                seconds_OUT = None
+
+            #-- END try to parse Retry-After --#
+
+        #-- END check to see if Retry-After --#
+
+        if ( seconds_OUT is None ):
+
+            seconds_OUT = self.backoff_seconds * ( 2 ** max( 0, attempt_count_IN - 1 ) )
+
+        #-- END check to see if we need to compute backoff --#
+
+        seconds_OUT = min( max( 0.0, seconds_OUT ), self.max_backoff_seconds )
+
+        return seconds_OUT
+
+    #-- END method get_backoff_seconds() --#
+
+
+    def get_retry_reason( self, status_code_IN, raw_text_IN ):
+
+        '''
+        Accepts HTTP status code and response body.  Returns
+           RETRY_REASON_CONCURRENCY_LIMIT if the service says there are too many
+           concurrent requests, RETRY_REASON_TRANSIENT if it is a server error
+           that is worth trying again, or None if the response is final.
+        '''
+
+        # return reference
+        reason_OUT = None
+
+        # declare variables
+        limit_text = None
+
+        # concurrency limit?
+        if ( status_code_IN == self.STATUS_CODE_TOO_MANY_REQUESTS ):
+
+            reason_OUT = self.RETRY_REASON_CONCURRENCY_LIMIT
+
+        elif ( raw_text_IN is not None ):
+
+            for limit_text in self.concurrency_limit_text_list:
+
+                if ( limit_text in raw_text_IN ):
+
+                    reason_OUT = self.RETRY_REASON_CONCURRENCY_LIMIT
+
+                #-- END check to see if limit text in body --#
+
+            #-- END loop over concurrency limit text --#
+
+        #-- END check to see if concurrency limit --#
+
+        # transient?
+        if ( ( reason_OUT is None ) and ( status_code_IN in self.TRANSIENT_STATUS_CODE_LIST ) ):
+
+            reason_OUT = self.RETRY_REASON_TRANSIENT
+
+        #-- END check to see if transient --#
+
+        return reason_OUT
+
+    #-- END method get_retry_reason() --#
+
+
+    def handle_response( self, result_IN, future_IN ):
+
+        '''
+        Accepts RequestPipelineResult and the finished future of its request.
+           Stores status code and body in the result.  If the request should be
+           tried again and there are retries left, returns the number of
+           seconds to wait first.  If not, parses the body as JSON (sets
+           error_message if the request failed or wasn't sent, or the body
+           isn't JSON) and returns None.
+        '''
+
+        # return reference
+        delay_seconds_OUT = None
+
+        # declare variables
+        status_code = None
+        raw_text = None
+        retry_after = None
+        retry_reason = None
+
+        # what happened?
+        try:
+
+            status_code, raw_text, retry_after = future_IN.result()
+            retry_reason = self.get_retry_reason( status_code, raw_text )
+
+        except DailyLimitReachedError as dlre:
+
+            # not sent.
+            raw_text = "{}".format( dlre )
+            result_IN.is_daily_limit_reached = True
+            self.is_daily_limit_reached = True
+
+        except requests.exceptions.RequestException as re:
+
+            # connection error, timeout, etc.
+            raw_text = "{} sending request: {}".format( type( re ).__name__, re )
+            retry_reason = self.RETRY_REASON_TRANSIENT
+
+        #-- END try/except around request result --#
+
+        # count the attempt, if it was sent.
+        if ( result_IN.is_daily_limit_reached == False ):
+
+            result_IN.attempt_count += 1
+            self.request_count += 1
+
+        #-- END check to see if sent --#
+
+        result_IN.status_code = status_code
+        result_IN.raw_text = raw_text
+        result_IN.retry_reason = retry_reason
+
+        if ( retry_reason == self.RETRY_REASON_CONCURRENCY_LIMIT ):
+
+            self.concurrency_limit_count += 1
+
+        #-- END check to see if concurrency limit --#
+
+        # try again?
+        if ( result_IN.is_daily_limit_reached == True ):
+
+            result_IN.error_message = raw_text
+
+        elif ( ( retry_reason is not None ) and ( result_IN.attempt_count <= self.max_retries ) ):
+
+            self.retry_count += 1
+            delay_seconds_OUT = self.get_backoff_seconds( result_IN.attempt_count, retry_after )
+
+        elif ( retry_reason is not None ):
+
+            # out of retries.
+            result_IN.error_message = "Gave up after {} attempts ( {} ): {}".format( result_IN.attempt_count, retry_reason, raw_text )
+
+        elif ( status_code != self.STATUS_CODE_OK ):
+
+            result_IN.error_message = "HTTP status {}: {}".format( status_code, raw_text )
+
+        else:
+
+            # OK - parse.
+            try:
+
+                result_IN.response_json = json.loads( raw_text )
+
+            except ValueError as ve:
+
+                result_IN.error_message = "ValueError parsing JSON ( {} ): {}".format( ve, raw_text )
+
+            #-- END try/except around parsing JSON --#
+
+        #-- END check to see what to do with response --#
+
+        if ( result_IN.error_message is not None ):
+
+            self.error_count += 1
+
+        #-- END check to see if error --#
+
+        return delay_seconds_OUT
+
+    #-- END method handle_response() --#
+
+
+    def may_i_continue( self ):
+
+        '''
+        Returns False once the daily request limit has been reached - the rate
+           limiter refused a request, or its may_i_continue() says no more -
+           so no new requests should be started.  Otherwise True.
+        '''
+
+        # return reference
+        continue_OUT = True
+
+        if ( self.is_daily_limit_reached == True ):
+
+            continue_OUT = False
+
+        elif ( ( self.rate_limiter is not None ) and ( self.rate_limiter.may_i_continue() == False ) ):
+
+            continue_OUT = False
+
+        #-- END check to see if daily limit reached --#
+
+        return continue_OUT
+
+    #-- END method may_i_continue() --#
+
+
+    def run( self, request_iterable_IN ):
+
+        '''
+        Accepts iterable of ( key, request data ) pairs.  Sends requests for
+           them, keeping up to concurrency in flight, re-sending retryable
+           failures after a backoff.  Generator - yields a
+           RequestPipelineResult for each pair as it finishes (not in the
+           order they were passed in).  Requests are pulled from the iterable
+           only as slots open up, so it can be a generator too, and none are
+           pulled once the daily limit is reached (see may_i_continue()).
+           Leaves the session open, so run() can be called again.
+        '''
+
+        # declare variables
+        request_iterator = None
+        is_exhausted = False
+        in_flight_dict = None
+        delayed_heap = None
+        delayed_counter = 0
+        ready_list = None
+        wait_timeout = None
+        done_set = None
+        current_future = None
+        current_result = None
+        delay_seconds = None
+
+        request_iterator = iter( request_iterable_IN )
+        in_flight_dict = {}
+        delayed_heap = []
+
+        with concurrent.futures.ThreadPoolExecutor( max_workers = self.concurrency ) as executor:
+
+            while True:
+
+                # fill open slots.
+                is_exhausted = self.start_requests( executor, request_iterator, is_exhausted, in_flight_dict, delayed_heap )
+
+                # anything left?
+                if ( len( in_flight_dict ) == 0 ):
+
+                    if ( len( delayed_heap ) > 0 ):
+
+                        # just retries that aren't due yet - wait.
+                        time.sleep( max( 0.0, delayed_heap[ 0 ][ 0 ] - time.time() ) )
+                        continue
+
+                    #-- END check to see if waiting on retries --#
+
+                    # all done.
+                    break
+
+                #-- END check to see if anything in flight --#
+
+                # wait for a request to finish (or a retry to come due).
+                wait_timeout = None
+                if ( len( delayed_heap ) > 0 ):
+
+                    wait_timeout = max( 0.0, delayed_heap[ 0 ][ 0 ] - time.time() )
+
+                #-- END check to see if retries waiting --#
+
+                done_set, not_done_set = concurrent.futures.wait( list( in_flight_dict.keys() ), timeout = wait_timeout, return_when = concurrent.futures.FIRST_COMPLETED )
+
+                # handle finished requests.
+                ready_list = []
+                for current_future in done_set:
+
+                    current_result = in_flight_dict.pop( current_future )
+                    delay_seconds = self.handle_response( current_result, current_future )
+                    if ( delay_seconds is None ):
+
+                        ready_list.append( current_result )
+
+                    else:
+
+                        # back in the queue.
+                        delayed_counter += 1
+                        heapq.heappush( delayed_heap, ( time.time() + delay_seconds, delayed_counter, current_result ) )
+
+                    #-- END check to see if retry --#
+
+                #-- END loop over finished requests --#
+
+                # start the next requests before handing back results, so
+                #     they are outstanding while the caller works.
+                if ( len( ready_list ) > 0 ):
+
+                    is_exhausted = self.start_requests( executor, request_iterator, is_exhausted, in_flight_dict, delayed_heap )
+
+                #-- END check to see if results to hand back --#
+
+                for current_result in ready_list:
+
+                    yield current_result
+
+                #-- END loop over results --#
+
+            #-- END loop until everything has been sent and returned --#
+
+        #-- END with executor --#
+
+    #-- END method run() --#
+
+
+    def send_request( self, request_data_IN ):
+
+        '''
+        Runs in a request thread.  Waits for rate limiter, if there is one, then
+           POSTs request data to url using the shared session.  Returns tuple
+           of ( HTTP status code, response body, Retry-After header or None ).
+           Raises DailyLimitReachedError if the rate limiter refuses the
+           request.  Requests exceptions are raised to the caller.
+        '''
+
+        # return references
+        status_code_OUT = None
+        raw_text_OUT = None
+        retry_after_OUT = None
+
+        # declare variables
+        request_data = None
+        my_response = None
+
+        # rate limited?  Wait for turn, unless daily limit reached.
+        if ( ( self.rate_limiter is not None ) and ( self.rate_limiter.start_request() == False ) ):
+
+            raise DailyLimitReachedError( "Daily request limit reached - request not sent." )
+
+        #-- END check to see if rate limiter --#
+
+        # encode text.
+        request_data = request_data_IN
+        if ( isinstance( request_data, six.text_type ) == True ):
+
+            request_data = request_data.encode( self.TEXT_ENCODING )
+
+        #-- END check to see if we need to encode --#
+
+        my_response = self.session.post( self.url, data = request_data, headers = self.header_dict, timeout = self.timeout_seconds )
+        try:
+
+            status_code_OUT = my_response.status_code
+            raw_text_OUT = my_response.text
+            retry_after_OUT = my_response.headers.get( "Retry-After", None )
+
+        finally:
+
+            my_response.close()
+
+        #-- END try...finally around response --#
+
+        return status_code_OUT, raw_text_OUT, retry_after_OUT
+
+    #-- END method send_request() --#
+
+
+    def start_requests( self, executor_IN, request_iterator_IN, is_exhausted_IN, in_flight_dict_IN, delayed_heap_IN ):
+
+        '''
+        Fills open request slots for run() - retries that are due first, then
+           new requests from the iterator, unless it is exhausted or the daily
+           limit has been reached.  Submits each to executor_IN and adds its
+           future to in_flight_dict_IN.  Returns True if no new requests
+           should be taken from the iterator, False if not.
+        '''
+
+        # return reference
+        is_exhausted_OUT = False
+
+        # declare variables
+        current_time = None
+        current_result = None
+        current_future = None
+        request_key = None
+        request_data = None
+
+        is_exhausted_OUT = is_exhausted_IN
+        current_time = time.time()
+        while ( len( in_flight_dict_IN ) < self.concurrency ):
+
+            current_result = None
+            if ( ( len( delayed_heap_IN ) > 0 ) and ( delayed_heap_IN[ 0 ][ 0 ] <= current_time ) ):
+
+                current_result = heapq.heappop( delayed_heap_IN )[ 2 ]
+
+            elif ( ( is_exhausted_OUT == False ) and ( self.may_i_continue() == False ) ):
+
+                # daily limit - no more new requests.
+                is_exhausted_OUT = True
+
+            elif ( is_exhausted_OUT == False ):
+
+                try:
+
+                    request_key, request_data = next( request_iterator_IN )
+                    current_result = RequestPipelineResult( request_key, request_data )
+
+                except StopIteration:
+
+                    is_exhausted_OUT = True
+
+                #-- END try to get next request --#
+
+            #-- END check to see what to send next --#
+
+            if ( current_result is None ):
+
+                break
+
+            #-- END check to see if anything to send --#
+
+            current_future = executor_IN.submit( self.send_request, current_result.request_data )
+            in_flight_dict_IN[ current_future ] = current_result
+
+        #-- END loop to fill slots --#
+
+        return is_exhausted_OUT
+
+    #-- END method start_requests() --#
+
+
+#-- END class RequestPipeline --#
+
+
+class RequestPipelineResult( object ):
+
+    '''
+    Outcome of one request sent by a RequestPipeline - the key and request data
+       passed in, the final HTTP status code and body, the parsed JSON (if
+       successful), the number of attempts it took, the reason for the last
+       retry (if any), whether it went unsent because the daily limit was
+       reached, and an error message (None if successful).
+    '''
+
+
+    def __init__( self, key_IN, request_data_IN ):
+
+        # declare variables
+        self.key = key_IN
+        self.request_data = request_data_IN
+        self.status_code = None
+        self.raw_text = None
+        self.response_json = None
+        self.attempt_count = 0
+        self.retry_reason = None
+        self.is_daily_limit_reached = False
+        self.error_message = None
+
+    #-- END method __init__() --#
+
+
+    def is_success( self ):
+
+        '''
+        Returns True if the request succeeded and the response parsed as JSON.
+        '''
+
+        return ( ( self.error_message is None ) and ( self.response_json is not None ) )
+
+    #-- END method is_success() --#
+
+
+#-- END class RequestPipelineResult --#
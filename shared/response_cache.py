@@ -0,0 +1,399 @@
+from __future__ import unicode_literals
+
+'''
+Copyright 2010-2016 Jonathan Morgan
+
+This file is part of http://github.com/jonathanmorgan/context_text.
+
+context_text is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+context_text is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with http://github.com/jonathanmorgan/context_text. If not, see http://www.gnu.org/licenses/.
+'''
+
+#===============================================================================
+# imports (in alphabetical order by package, then by name)
+#===============================================================================
+
+
+# python base imports
+import hashlib
+import io
+import os
+import tempfile
+import threading
+
+# six - Python 2 and 3 support
+import six
+
+#===============================================================================
+# classes (in alphabetical order by name)
+#===============================================================================
+
+class ResponseCache( object ):
+
+    '''
+    Content-addressed, on-disk cache of responses from a remote service (the
+       OpenCalais API, for example), so coding the same text again reuses the
+       stored response rather than calling the service.  Keys are SHA-256
+       hashes of the request text plus a version string (see make_key()), so
+       a change in the text or in the version of the API makes a new key.
+       Each response is stored in its own file under the cache directory.
+
+    The total size of the files is kept under max_size_bytes.  When a put()
+       would go over, the least recently used files (by modification time,
+       which get() updates on a hit) are removed until the cache is down to
+       EVICT_TO_FRACTION of the limit.  More than one process can share a
+       directory - files are written to a temporary file, then renamed into
+       place, and each process re-scans the directory before evicting, so
+       size tracking stays close even though each process only knows about
+       its own writes in between.
+    '''
+
+    #---------------------------------------------------------------------------
+    # ! ==> CONSTANTS-ish
+    #---------------------------------------------------------------------------
+
+    DEFAULT_MAX_SIZE_BYTES = 1024 * 1024 * 1024
+    EVICT_TO_FRACTION = 0.9
+    FILE_EXTENSION = ".cache"
+    TEXT_ENCODING = "utf-8"
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> class methods
+    #---------------------------------------------------------------------------
+
+
+    @classmethod
+    def make_key( cls, text_IN, version_IN = "" ):
+
+        '''
+        Accepts request text and optional version string.  Returns hex SHA-256
+           of the version and the text, for use as a cache key.
+        '''
+
+        # return reference
+        key_OUT = None
+
+        # declare variables
+        my_hash = None
+
+        my_hash = hashlib.sha256()
+        my_hash.update( six.text_type( version_IN ).encode( cls.TEXT_ENCODING ) )
+        my_hash.update( b"\n" )
+        my_hash.update( six.text_type( text_IN ).encode( cls.TEXT_ENCODING ) )
+        key_OUT = my_hash.hexdigest()
+
+        return key_OUT
+
+    #-- END class method make_key() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> __init__() method
+    #---------------------------------------------------------------------------
+
+
+    def __init__( self, directory_path_IN, max_size_bytes_IN = DEFAULT_MAX_SIZE_BYTES ):
+
+        # declare variables
+        self.directory_path = directory_path_IN
+        self.max_size_bytes = max_size_bytes_IN
+        self.lock = threading.Lock()
+
+        # stats
+        self.hit_count = 0
+        self.miss_count = 0
+        self.eviction_count = 0
+
+        # make sure directory is there, then see how much is in it.
+        if ( os.path.isdir( self.directory_path ) == False ):
+
+            os.makedirs( self.directory_path )
+
+        #-- END check to see if directory exists --#
+
+        self.total_size_bytes = self.get_total_size_bytes()
+
+    #-- END method __init__() --#
+
+
+    #---------------------------------------------------------------------------
+    # ! ==> instance methods, in alphabetical order
+    #---------------------------------------------------------------------------
+
+
+    def contains( self, key_IN ):
+
+        '''
+        Returns True if there is a response stored for key_IN, False if not.
+           Does not count as a hit or miss, or mark the entry as used.
+        '''
+
+        return os.path.isfile( self.get_file_path( key_IN ) )
+
+    #-- END method contains() --#
+
+
+    def evict( self, target_size_bytes_IN ):
+
+        '''
+        Removes least recently used entries until the files in the cache
+           directory take up no more than target_size_bytes_IN.  Returns number
+           of entries removed.
+        '''
+
+        # return reference
+        count_OUT = 0
+
+        # declare variables
+        entry_list = None
+        total_size = 0
+        modified_time = -1
+        file_size = -1
+        file_path = ""
+
+        # what is there now, oldest first?
+        entry_list = sorted( self.get_entry_list() )
+        total_size = sum( [ file_size for modified_time, file_size, file_path in entry_list ] )
+
+        for modified_time, file_size, file_path in entry_list:
+
+            # small enough?
+            if ( total_size <= target_size_bytes_IN ):
+
+                break
+
+            #-- END check to see if done --#
+
+            try:
+
+                os.remove( file_path )
+                count_OUT += 1
+
+            except OSError:
+
+                # another process got it first.
+                pass
+
+            #-- END try/except around removing file --#
+
+            total_size -= file_size
+
+        #-- END loop over entries --#
+
+        self.total_size_bytes = total_size
+        self.eviction_count += count_OUT
+
+        return count_OUT
+
+    #-- END method evict() --#
+
+
+    def get( self, key_IN ):
+
+        '''
+        Accepts key.  Returns the response stored for the key, or None if there
+           isn't one.  Counts a hit or a miss, and on a hit marks the entry as
+           most recently used.
+        '''
+
+        # return reference
+        value_OUT = None
+
+        # declare variables
+        file_path = ""
+        cache_file = None
+
+        file_path = self.get_file_path( key_IN )
+
+        try:
+
+            with io.open( file_path, "r", encoding = self.TEXT_ENCODING, newline = "" ) as cache_file:
+
+                value_OUT = cache_file.read()
+
+            #-- END with open file --#
+
+            # mark as used.
+            os.utime( file_path, None )
+
+        except ( IOError, OSError ):
+
+            # not there (or removed by another process).
+            value_OUT = None
+
+        #-- END try/except around reading file --#
+
+        with self.lock:
+
+            if ( value_OUT is not None ):
+
+                self.hit_count += 1
+
+            else:
+
+                self.miss_count += 1
+
+            #-- END check to see if hit --#
+
+        #-- END with lock --#
+
+        return value_OUT
+
+    #-- END method get() --#
+
+
+    def get_entry_list( self ):
+
+        '''
+        Returns list of ( modified_time, size_in_bytes, file_path ) tuples,
+           one per entry in the cache directory.
+        '''
+
+        # return reference
+        list_OUT = []
+
+        # declare variables
+        current_directory_path = ""
+        child_directory_list = None
+        child_file_list = None
+        file_name = ""
+        file_path = ""
+        file_stat = None
+
+        for current_directory_path, child_directory_list, child_file_list in os.walk( self.directory_path ):
+
+            for file_name in child_file_list:
+
+                # only entries - skip temporary files.
+                if ( file_name.endswith( self.FILE_EXTENSION ) == True ):
+
+                    file_path = os.path.join( current_directory_path, file_name )
+
+                    try:
+
+                        file_stat = os.stat( file_path )
+                        list_OUT.append( ( file_stat.st_mtime, file_stat.st_size, file_path ) )
+
+                    except OSError:
+
+                        # removed since walk listed it.
+                        pass
+
+                    #-- END try/except around stat --#
+
+                #-- END check to see if entry --#
+
+            #-- END loop over files --#
+
+        #-- END walk over cache directory --#
+
+        return list_OUT
+
+    #-- END method get_entry_list() --#
+
+
+    def get_file_path( self, key_IN ):
+
+        '''
+        Returns path of file for key_IN.  Files are spread across
+           subdirectories named for the first two characters of the key.
+        '''
+
+        return os.path.join( self.directory_path, key_IN[ :2 ], key_IN + self.FILE_EXTENSION )
+
+    #-- END method get_file_path() --#
+
+
+    def get_total_size_bytes( self ):
+
+        '''
+        Returns total size in bytes of the entries in the cache directory.
+        '''
+
+        # declare variables
+        modified_time = -1
+        file_size = -1
+        file_path = ""
+
+        return sum( [ file_size for modified_time, file_size, file_path in self.get_entry_list() ] )
+
+    #-- END method get_total_size_bytes() --#
+
+
+    def put( self, key_IN, value_IN ):
+
+        '''
+        Accepts key and response text.  Stores the response for the key,
+           replacing any already stored, then evicts least recently used
+           entries if the cache is over its size limit.
+        '''
+
+        # declare variables
+        file_path = ""
+        encoded_value = None
+        file_descriptor = -1
+        temp_file_path = ""
+        old_size_bytes = 0
+
+        file_path = self.get_file_path( key_IN )
+        encoded_value = six.text_type( value_IN ).encode( self.TEXT_ENCODING )
+
+        # make sure subdirectory is there.
+        if ( os.path.isdir( os.path.dirname( file_path ) ) == False ):
+
+            try:
+
+                os.makedirs( os.path.dirname( file_path ) )
+
+            except OSError:
+
+                # another process made it.
+                pass
+
+            #-- END try/except around making directory --#
+
+        #-- END check to see if subdirectory exists --#
+
+        # write to temporary file, then rename into place.
+        file_descriptor, temp_file_path = tempfile.mkstemp( dir = os.path.dirname( file_path ), suffix = ".tmp" )
+        with os.fdopen( file_descriptor, "wb" ) as temp_file:
+
+            temp_file.write( encoded_value )
+
+        #-- END with temp file --#
+
+        # replacing an entry?  Don't count its old size twice.
+        try:
+
+            old_size_bytes = os.path.getsize( file_path )
+
+        except OSError:
+
+            # not there yet.
+            old_size_bytes = 0
+
+        #-- END try/except around getting size of existing entry --#
+
+        os.replace( temp_file_path, file_path )
+
+        with self.lock:
+
+            self.total_size_bytes += len( encoded_value ) - old_size_bytes
+
+            # over the limit?
+            if ( ( self.max_size_bytes is not None ) and ( self.max_size_bytes > 0 ) and ( self.total_size_bytes > self.max_size_bytes ) ):
+
+                self.evict( int( self.max_size_bytes * self.EVICT_TO_FRACTION ) )
+
+            #-- END check to see if too big --#
+
+        #-- END with lock --#
+
+    #-- END method put() --#
+
+
+#-- END class ResponseCache --#
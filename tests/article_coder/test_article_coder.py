@@ -3,8 +3,11 @@ This file contains tests of shared code implemented in abstract class
 ArticleCoder, using child ManualArticleCoder.
 
 Functions tested:
+- ArticleCoding.get_worker_param_dict
+- lookup_calc_confidence / lookup_calc_confidence_batch
 - lookup_person
 - process_mention
+- process_mention / process_quotation with an ArticleCodingContext
 - process_quotation
 - process_subject_name
 - process_author_name
@@ -21,7 +24,9 @@ More info:
 
 # django imports
 from django.contrib.auth.models import User
+from django.db import connection
 import django.test
+from django.test.utils import CaptureQueriesContext
 
 # python_utilities imports
 from python_utilities.logging.logging_helper import LoggingHelper
@@ -32,7 +37,9 @@ from context.shared.person_details import PersonDetails
 
 # context_text imports
 from context_text.article_coding.article_coding import ArticleCoding
+from context_text.article_coding.article_coding_context import ArticleCodingContext
 from context_text.article_coding.article_coding import ArticleCoder
+from context_text.article_coding.article_coding import SharedRateLimiter
 from context_text.article_coding.manual_coding.manual_article_coder import ManualArticleCoder
 from context_text.article_coding.open_calais_v2.open_calais_v2_api_response import OpenCalaisV2ApiResponse
 from context_text.article_coding.open_calais_v2.open_calais_v2_article_coder import OpenCalaisV2ArticleCoder
@@ -40,6 +47,8 @@ from context_text.models import Article
 from context_text.models import Article_Author
 from context_text.models import Article_Data
 from context_text.models import Article_Subject
+from context_text.models import Newspaper
+from context_text.models import Person
 from context_text.tests.test_helper import TestHelper
 
 
@@ -93,6 +102,103 @@ class ArticleCoderTest( django.test.TestCase ):
     #-- END test method test_django_config_installed() --#
 
 
+    def test_lookup_calc_confidence_batch( self ):
+
+        # declare variables
+        me = "test_lookup_calc_confidence_batch"
+        test_coder = None
+        test_newspaper = None
+        person_list = None
+        uuid_value = ""
+        details_with_uuid = None
+        details_empty = None
+        pair_list = None
+        batch_list = None
+        single_list = None
+        expected_list = None
+        index = -1
+        confidence_index = None
+        other_uuid_value = "http://d.opencalais.com/pershash-1/test-confidence-other"
+        details_other_uuid = None
+
+        print( "\n\n==> Top of " + me + "\n" )
+
+        test_coder = ManualArticleCoder()
+        test_newspaper = Newspaper.objects.all().order_by( "id" ).first()
+        person_list = list( Person.objects.all().order_by( "id" )[ : 3 ] )
+
+        # first person has UUID and newspaper.
+        uuid_value = "http://d.opencalais.com/pershash-1/test-confidence"
+        person_list[ 0 ].associate_external_uuid( uuid_value, "test_source", "test_name" )
+        person_list[ 0 ].associate_newspaper( test_newspaper )
+
+        details_with_uuid = PersonDetails()
+        details_with_uuid[ ArticleCoder.PARAM_EXTERNAL_UUID ] = uuid_value
+        details_with_uuid[ ArticleCoder.PARAM_NEWSPAPER_INSTANCE ] = test_newspaper
+        details_empty = PersonDetails()
+
+        pair_list = []
+        pair_list.append( ( person_list[ 0 ], details_with_uuid ) )  # match on both: 1.0
+        pair_list.append( ( person_list[ 1 ], details_with_uuid ) )  # no UUID, someone else has it, no newspaper: 1.0 - 0.1 - 2.0 - 0.1
+        pair_list.append( ( person_list[ 2 ], details_empty ) )  # nothing to check: 1.0
+        pair_list.append( ( None, details_with_uuid ) )  # no person: 0.0
+        expected_list = [ 1.0, -1.2, 1.0, 0.0 ]
+
+        # batch - two queries, for all of them.
+        with CaptureQueriesContext( connection ) as captured_queries:
+
+            batch_list = test_coder.lookup_calc_confidence_batch( pair_list )
+
+        #-- END with CaptureQueriesContext --#
+
+        self.assertEqual( len( captured_queries ), 2 )
+
+        # one at a time - same scores.
+        single_list = [ test_coder.lookup_calc_confidence( person, details ) for person, details in pair_list ]
+        for index in range( len( pair_list ) ):
+
+            self.assertAlmostEqual( batch_list[ index ], expected_list[ index ] )
+            self.assertAlmostEqual( single_list[ index ], expected_list[ index ] )
+
+        #-- END loop over pairs --#
+
+        # preloaded index - no queries, kept current when a person is updated.
+        test_coder.preload_person_confidence_index( [ uuid_value ], test_newspaper.id, [ person_list[ 1 ].id ] )
+        with CaptureQueriesContext( connection ) as captured_queries:
+
+            batch_list = test_coder.lookup_calc_confidence_batch( pair_list )
+
+        #-- END with CaptureQueriesContext --#
+
+        self.assertEqual( len( captured_queries ), 0 )
+        self.assertAlmostEqual( batch_list[ 1 ], -1.2 )
+
+        test_coder.update_person( person_list[ 1 ], details_with_uuid )
+        self.assertAlmostEqual( test_coder.lookup_calc_confidence( person_list[ 1 ], details_with_uuid ), -1.0 )
+        test_coder.set_person_confidence_index( None )
+        self.assertAlmostEqual( test_coder.lookup_calc_confidence( person_list[ 1 ], details_with_uuid ), -1.0 )
+
+        # preload loads only the newspaper pairs needed - UUID holders, plus
+        #     people passed in.
+        confidence_index = test_coder.preload_person_confidence_index( [ uuid_value ], test_newspaper.id )
+        self.assertTrue( confidence_index.is_person_newspaper_loaded( person_list[ 0 ].id, test_newspaper.id ) )
+        self.assertTrue( confidence_index.is_person_newspaper_loaded( person_list[ 1 ].id, test_newspaper.id ) )
+        self.assertFalse( confidence_index.is_person_newspaper_loaded( person_list[ 2 ].id, test_newspaper.id ) )
+
+        # next article gets a new index, so sees what other coders wrote since.
+        person_list[ 0 ].associate_external_uuid( other_uuid_value, "test_source", "test_name" )
+        details_other_uuid = PersonDetails()
+        details_other_uuid[ ArticleCoder.PARAM_EXTERNAL_UUID ] = other_uuid_value
+        details_other_uuid[ ArticleCoder.PARAM_NEWSPAPER_INSTANCE ] = test_newspaper
+        confidence_index = test_coder.preload_person_confidence_index( [ other_uuid_value ], test_newspaper.id )
+        self.assertAlmostEqual( test_coder.lookup_calc_confidence( person_list[ 0 ], details_other_uuid ), 1.0 )
+        person_list[ 2 ].associate_external_uuid( other_uuid_value, "test_source", "test_name" )
+        self.assertIsNot( test_coder.preload_person_confidence_index( [ other_uuid_value ], test_newspaper.id ), confidence_index )
+        self.assertAlmostEqual( test_coder.lookup_calc_confidence( person_list[ 0 ], details_other_uuid ), -1.0 )
+
+    #-- END test method test_lookup_calc_confidence_batch() --#
+
+
     def test_lookup_person( self ):
         
         # declare variables
@@ -473,6 +579,168 @@ class ArticleCoderTest( django.test.TestCase ):
     #-- END test method test_lookup_person() --#
 
     
+    def test_lookup_person_name_index( self ):
+        
+        # declare variables
+        me = "test_lookup_person_name_index"
+        test_db_coder = None
+        test_index_coder = None
+        lookup_person_name = ""
+        name_list = None
+        db_article_author = None
+        index_article_author = None
+        new_person = None
+        new_person_id_set = None
+        error_message = ""
+
+        print( "\n\n==> Top of " + me + "\n" )
+        
+        # one coder that uses the database, one that uses the name index.
+        test_db_coder = ManualArticleCoder()
+        test_index_coder = ManualArticleCoder()
+        test_index_coder.init_person_name_index()
+        
+        # existing people, single name part, no match - results should match.
+        name_list = [ "Karen Irene Schwarck", "Coy Lynn Robinson", "Karen", "Calliope Tree-Frog" ]
+        for lookup_person_name in name_list:
+        
+            # database
+            db_article_author = test_db_coder.lookup_person( Article_Author(),
+                                                             lookup_person_name,
+                                                             create_if_no_match_IN = False,
+                                                             update_person_IN = False )
+
+            # name index
+            index_article_author = test_index_coder.lookup_person( Article_Author(),
+                                                                   lookup_person_name,
+                                                                   create_if_no_match_IN = False,
+                                                                   update_person_IN = False )
+            
+            error_message = "In " + me + "(): person for \"" + lookup_person_name + "\" - database: " + str( db_article_author.person ) + "; index: " + str( index_article_author.person )
+            self.assertEqual( getattr( db_article_author.person, "id", None ), getattr( index_article_author.person, "id", None ), msg = error_message )
+            self.assertEqual( db_article_author.match_confidence_level, index_article_author.match_confidence_level, msg = error_message )
+            
+        #-- END loop over names --#
+        
+        # creating a person adds them to the index.
+        lookup_person_name = "Calliope Tree-Frog"
+        index_article_author = test_index_coder.lookup_person( Article_Author(),
+                                                               lookup_person_name,
+                                                               create_if_no_match_IN = True,
+                                                               update_person_IN = False )
+        new_person = index_article_author.person
+        self.assertIsNotNone( new_person.id )
+        new_person_id_set = test_index_coder.get_person_name_index().look_up_full_name_string( new_person.full_name_string )
+        self.assertEqual( new_person_id_set, set( [ new_person.id ] ) )
+        
+    #-- END test method test_lookup_person_name_index() --#
+
+
+    def test_lookup_person_name_index_name_keys( self ):
+
+        # declare variables
+        me = "test_lookup_person_name_index_name_keys"
+        test_person = None
+        use_name_keys = None
+        test_db_coder = None
+        test_index_coder = None
+        lookup_person_name = ""
+        name_list = None
+        db_status = None
+        index_status = None
+        db_article_author = None
+        index_article_author = None
+        error_message = ""
+
+        print( "\n\n==> Top of " + me + "\n" )
+
+        test_person = Person( first_name = "José", last_name = "O'Brien" )
+        test_person.save()
+
+        # index and database agree with and without name keys.
+        name_list = [ "José O'Brien", "josé o'brien", "Jose OBrien", "Jose O'Brien", "José Obrien", "Joe Brien" ]
+        for use_name_keys in [ False, True ]:
+
+            test_db_coder = ManualArticleCoder()
+            test_db_coder.set_use_name_keys( use_name_keys )
+            test_index_coder = ManualArticleCoder()
+            test_index_coder.set_use_name_keys( use_name_keys )
+            test_index_coder.init_person_name_index()
+
+            for lookup_person_name in name_list:
+
+                # FOUND/NEW/MULTIPLE
+                db_status = Person.get_person_lookup_status( test_db_coder.lookup_person_for_name( lookup_person_name, create_if_no_match_IN = True ) )
+                index_status = Person.get_person_lookup_status( test_index_coder.lookup_person_for_name( lookup_person_name, create_if_no_match_IN = True ) )
+                error_message = "In " + me + "(): use_name_keys = " + str( use_name_keys ) + "; status for \"" + lookup_person_name + "\" - database: " + str( db_status ) + "; index: " + str( index_status )
+                self.assertEqual( db_status, index_status, msg = error_message )
+
+                # and lookup_person().
+                db_article_author = test_db_coder.lookup_person( Article_Author(), lookup_person_name, create_if_no_match_IN = False, update_person_IN = False )
+                index_article_author = test_index_coder.lookup_person( Article_Author(), lookup_person_name, create_if_no_match_IN = False, update_person_IN = False )
+                error_message = "In " + me + "(): use_name_keys = " + str( use_name_keys ) + "; person for \"" + lookup_person_name + "\" - database: " + str( db_article_author.person ) + "; index: " + str( index_article_author.person )
+                self.assertEqual( getattr( db_article_author.person, "id", None ), getattr( index_article_author.person, "id", None ), msg = error_message )
+                self.assertEqual( db_article_author.match_confidence_level, index_article_author.match_confidence_level, msg = error_message )
+
+            #-- END loop over names --#
+
+            # accented and apostrophe spellings only find José O'Brien with name keys.
+            self.assertEqual( getattr( test_index_coder.lookup_person_for_name( "Jose OBrien" ), "id", None ), ( test_person.id if ( use_name_keys == True ) else None ) )
+
+        #-- END loop over name key settings --#
+
+    #-- END test method test_lookup_person_name_index_name_keys() --#
+
+
+    def test_lookup_person_name_keys( self ):
+
+        # declare variables
+        me = "test_lookup_person_name_keys"
+        test_coder = None
+        test_person = None
+        test_person_2 = None
+        test_article_author = None
+        person_list = None
+
+        print( "\n\n==> Top of " + me + "\n" )
+
+        test_person = Person( first_name = "José", last_name = "O'Brien" )
+        test_person.save()
+        test_coder = ManualArticleCoder()
+
+        # default - "__iexact", so accents and punctuation count.
+        self.assertEqual( test_coder.get_use_name_keys(), False )
+        test_article_author = test_coder.lookup_person( Article_Author(), "Jose OBrien", create_if_no_match_IN = False, update_person_IN = False )
+        self.assertIsNone( test_article_author.person )
+        test_article_author = test_coder.lookup_person( Article_Author(), "josé o'brien", create_if_no_match_IN = False, update_person_IN = False )
+        self.assertEqual( test_article_author.person.id, test_person.id )
+
+        # name keys - accents and punctuation ignored.
+        test_coder.set_use_name_keys( True )
+        test_article_author = test_coder.lookup_person( Article_Author(), "Jose OBrien", create_if_no_match_IN = False, update_person_IN = False )
+        self.assertEqual( test_article_author.person.id, test_person.id )
+        test_article_author = test_coder.lookup_person( Article_Author(), "josé o'brien", create_if_no_match_IN = False, update_person_IN = False )
+        self.assertEqual( test_article_author.person.id, test_person.id )
+
+        # add a person whose name differs only by accents and punctuation -
+        #     single match and multiple lookups agree they are the same name.
+        test_person_2 = Person( first_name = "Jose", last_name = "OBrien" )
+        test_person_2.save()
+        self.assertIsNone( test_coder.lookup_person_for_name( "Jose OBrien", create_if_no_match_IN = True ) )
+        person_list = test_coder.lookup_person_list_for_name( "Jose OBrien" )
+        self.assertEqual( sorted( [ current_person.id for current_person in person_list ] ), sorted( [ test_person.id, test_person_2.id ] ) )
+
+        # and with "__iexact", that they are not.
+        test_coder.set_use_name_keys( False )
+        self.assertEqual( test_coder.lookup_person_for_name( "Jose OBrien", create_if_no_match_IN = True ).id, test_person_2.id )
+        person_list = test_coder.lookup_person_list_for_name( "Jose OBrien" )
+        self.assertEqual( [ current_person.id for current_person in person_list ], [ test_person_2.id ] )
+        test_article_author = test_coder.lookup_person( Article_Author(), "José O'Brien", create_if_no_match_IN = False, update_person_IN = False )
+        self.assertEqual( test_article_author.person.id, test_person.id )
+
+    #-- END test method test_lookup_person_name_keys() --#
+
+
     def test_parse_author_string( self ):
     
         # declare variables
@@ -1036,6 +1304,80 @@ class ArticleCoderTest( django.test.TestCase ):
     #-- END test method test_process_mention() --#
 
 
+    def test_process_mention_coding_context( self ):
+
+        # declare variables
+        me = "test_process_mention_coding_context"
+        subject_name = ""
+        mention_name = ""
+        quotation_string = ""
+        test_manual_article_coder = None
+        test_article = None
+        test_user = None
+        test_article_data = None
+        test_article_subject = None
+        test_mention = None
+        test_quotation = None
+        saved_count = -1
+
+        print( "\n\n==> Top of " + me + "\n" )
+
+        # set subject_name, mention_name, quotation_string
+        subject_name = TestHelper.TEST_SUBJECT_1
+        mention_name = "The Rockford friends"
+        quotation_string = TestHelper.TEST_QUOTATION_1
+
+        # create ManualArticleCoder instance, article, Article_Data, subject.
+        test_manual_article_coder = ManualArticleCoder()
+        test_article = Article.objects.get( pk = 21409 )
+        test_user = TestHelper.get_test_user()
+        test_article_data = Article_Data()
+        test_article_data.coder = test_user
+        test_article_data.article = test_article
+        test_article_data.save()
+        test_article_subject = test_manual_article_coder.process_subject_name( test_article_data, subject_name )
+        self.assertEqual( test_article_subject.article_subject_mention_set.all().count(), 1 )
+
+        # start coding context - loads name mention created above.
+        test_manual_article_coder.coding_context = ArticleCodingContext( test_article )
+        self.assertEqual( len( test_manual_article_coder.get_coding_context( test_article ).get_mention_list( test_article_subject, test_article_subject.verbatim_name ) ), 1 )
+
+        # new mention and quotation - not saved yet, same values as without
+        #     context.
+        test_mention = test_manual_article_coder.process_mention( test_article, test_article_subject, mention_name )
+        self.assertIsNone( test_mention.id )
+        self.assertEqual( test_mention.value_index, 489 )
+        self.assertEqual( test_mention.paragraph_number, 4 )
+        test_quotation = test_manual_article_coder.process_quotation( test_article, test_article_subject, quotation_string )
+        self.assertIsNone( test_quotation.id )
+        self.assertEqual( test_article_subject.article_subject_mention_set.all().count(), 1 )
+        self.assertEqual( test_article_subject.article_subject_quotation_set.all().count(), 0 )
+
+        # again - same instances, no queries.
+        with CaptureQueriesContext( connection ) as captured_queries:
+
+            self.assertIs( test_manual_article_coder.process_mention( test_article, test_article_subject, mention_name ), test_mention )
+            self.assertIs( test_manual_article_coder.process_quotation( test_article, test_article_subject, quotation_string ), test_quotation )
+
+        #-- END with CaptureQueriesContext --#
+
+        self.assertEqual( len( captured_queries ), 0 )
+
+        # flush - both saved, context cleared.
+        saved_count = test_manual_article_coder.flush_coding_context()
+        self.assertEqual( saved_count, 2 )
+        self.assertIsNone( test_manual_article_coder.get_coding_context() )
+        self.assertEqual( test_article_subject.article_subject_mention_set.all().count(), 2 )
+        self.assertEqual( test_article_subject.article_subject_quotation_set.all().count(), 1 )
+
+        # other article - context not used.
+        test_manual_article_coder.coding_context = ArticleCodingContext( test_article )
+        self.assertIsNone( test_manual_article_coder.get_coding_context( Article.objects.exclude( pk = 21409 ).first() ) )
+        self.assertEqual( test_manual_article_coder.flush_coding_context(), 0 )
+
+    #-- END test method test_process_mention_coding_context() --#
+
+
     def test_process_quotation( self ):
         
         # declare variables
@@ -1492,4 +1834,75 @@ class ArticleCoderTest( django.test.TestCase ):
     #-- END test method test_process_subject_name() --#
 
 
+    def test_get_worker_param_dict( self ):
+        
+        # declare variables
+        me = "test_get_worker_param_dict"
+        my_article_coding = None
+        param_dict = None
+        
+        print( "\n\n==> Top of " + me + "\n" )
+        
+        # create ArticleCoding instance that asks for the name index.
+        my_article_coding = ArticleCoding()
+        my_article_coding.store_parameters( { ArticleCoding.PARAM_USE_PERSON_NAME_INDEX : ArticleCoding.CHOICE_YES, ArticleCoding.PARAM_WORKER_COUNT : 3 } )
+        
+        # one worker - index kept.
+        param_dict = my_article_coding.get_worker_param_dict( 1 )
+        self.assertEqual( param_dict[ ArticleCoding.PARAM_USE_PERSON_NAME_INDEX ], ArticleCoding.CHOICE_YES )
+        self.assertEqual( param_dict[ ArticleCoding.PARAM_WORKER_COUNT ], 3 )
+        
+        # more than one worker - index turned off, in the copy only.
+        param_dict = my_article_coding.get_worker_param_dict( 3 )
+        self.assertEqual( param_dict[ ArticleCoding.PARAM_USE_PERSON_NAME_INDEX ], ArticleCoding.CHOICE_NO )
+        self.assertEqual( my_article_coding.get_param_as_str( ArticleCoding.PARAM_USE_PERSON_NAME_INDEX ), ArticleCoding.CHOICE_YES )
+        
+    #-- END test method test_get_worker_param_dict() --#
+
+
+    def test_shard_article_id_list( self ):
+        
+        # declare variables
+        me = "test_shard_article_id_list"
+        my_article_coding = None
+        article_id_list = None
+        shard_list = None
+        merged_list = None
+        my_rate_limiter = None
+        wait_seconds = -1
+        
+        print( "\n\n==> Top of " + me + "\n" )
+        
+        # create ArticleCoding instance.
+        my_article_coding = ArticleCoding()
+        
+        # 10 IDs into 3 shards.
+        article_id_list = list( range( 1, 11 ) )
+        shard_list = my_article_coding.shard_article_id_list( article_id_list, 3 )
+        self.assertEqual( len( shard_list ), 3 )
+        self.assertEqual( shard_list[ 0 ], [ 1, 4, 7, 10 ] )
+        
+        # every ID in exactly one shard.
+        merged_list = sorted( [ article_id for current_shard in shard_list for article_id in current_shard ] )
+        self.assertEqual( merged_list, article_id_list )
+        
+        # more shards than IDs - no empty shards.
+        shard_list = my_article_coding.shard_article_id_list( [ 1, 2 ], 4 )
+        self.assertEqual( shard_list, [ [ 1 ], [ 2 ] ] )
+        
+        # no rate limit - never waits.
+        my_rate_limiter = SharedRateLimiter( -1 )
+        wait_seconds = my_rate_limiter.wait_for_turn()
+        self.assertEqual( wait_seconds, 0.0 )
+        
+        # rate limit - first request is immediate, second waits.
+        my_rate_limiter = SharedRateLimiter( 0.05 )
+        wait_seconds = my_rate_limiter.wait_for_turn()
+        self.assertEqual( wait_seconds, 0.0 )
+        wait_seconds = my_rate_limiter.wait_for_turn()
+        self.assertGreater( wait_seconds, 0.0 )
+        
+    #-- END test method test_shard_article_id_list() --#
+
+
 #-- END test class ArticleCoderTest --#
@@ -0,0 +1,312 @@
+"""
+This file contains tests of ArticleCoding's thread worker pool - articles
+    sharded across worker threads, each with its own coder, and the results
+    merged back.  The coder is OpenCalaisV2ArticleCoder with every response
+    already in its response cache (see SyntheticCoding), so no requests are
+    made.  TransactionTestCase, so worker threads, which each have their own
+    database connection, can see the test data.  Worker processes also need
+    a database they can connect to, so the process pool test is skipped on
+    an in-memory SQLite test database.
+
+Functions tested:
+
+- ArticleCoding.code_article_data() (thread and process worker pool types)
+- ArticleCoding.code_article_data_parallel()
+- ArticleCoding.get_worker_pool_type()
+- code_article_id_list_worker() (daily limit)
+- SharedRateLimiter.start_request()
+- SharedRateLimiter.may_i_continue()
+
+"""
+
+# python base imports
+import re
+import shutil
+import tempfile
+
+# django imports
+from django.db import connection
+import django.test
+
+# context_text imports
+from context_text.article_coding.article_coder import ArticleCoder
+from context_text.article_coding.article_coding import ArticleCoding
+from context_text.article_coding.article_coding import code_article_id_list_worker
+from context_text.article_coding.article_coding import SharedRateLimiter
+from context_text.article_coding.open_calais_v2.open_calais_v2_article_coder import OpenCalaisV2ArticleCoder
+from context_text.benchmark.synthetic_coding import SyntheticCoding
+from context_text.data.synthetic_corpus import SyntheticCorpus
+from context_text.models import Article
+from context_text.models import Article_Data
+from context_text.models import Article_Text
+
+
+class ArticleCodingParallelTest( django.test.TransactionTestCase ):
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> Constants-ish
+    #----------------------------------------------------------------------------
+
+
+    # DEBUG
+    DEBUG = False
+
+    # CLASS NAME
+    CLASS_NAME = "ArticleCodingParallelTest"
+
+    # test values
+    TEST_ARTICLE_COUNT = 5
+    TEST_WORKER_COUNT = 2
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> instance methods - setup
+    #----------------------------------------------------------------------------
+
+
+    def setUp( self ):
+
+        """
+        setup tasks.  Make a small synthetic corpus and cache an OpenCalais
+           response for each article.
+        """
+
+        self.test_corpus = SyntheticCorpus( article_count_IN = self.TEST_ARTICLE_COUNT, newspaper_count_IN = 1, person_count_IN = 10, seed_IN = 11 )
+        self.test_corpus.create()
+        self.article_qs = Article.objects.filter( id__in = [ current_article.id for current_article in self.test_corpus.article_list ] ).order_by( "id" )
+        self.cache_directory = tempfile.mkdtemp()
+        SyntheticCoding.populate_response_cache( self.article_qs, self.cache_directory )
+
+        # create automated coding user up front, not in two workers at once.
+        ArticleCoder.get_automated_coding_user()
+
+    #-- END function setUp() --#
+
+
+    def tearDown( self ):
+
+        shutil.rmtree( self.cache_directory, ignore_errors = True )
+
+    #-- END function tearDown() --#
+
+
+    def make_article_coding( self, pool_type_IN, cache_directory_IN = None ):
+
+        # return reference
+        instance_OUT = None
+
+        # declare variables
+        param_dict = None
+
+        param_dict = {}
+        param_dict[ ArticleCoding.PARAM_CODER_TYPE ] = ArticleCoding.ARTICLE_CODING_IMPL_OPEN_CALAIS_API_V2
+        param_dict[ ArticleCoding.PARAM_WORKER_COUNT ] = self.TEST_WORKER_COUNT
+        param_dict[ OpenCalaisV2ArticleCoder.CONFIG_PROP_RESPONSE_CACHE_DIRECTORY ] = cache_directory_IN or self.cache_directory
+        if ( pool_type_IN is not None ):
+
+            param_dict[ ArticleCoding.PARAM_WORKER_POOL_TYPE ] = pool_type_IN
+
+        #-- END check to see if pool type --#
+
+        instance_OUT = ArticleCoding()
+        instance_OUT.store_parameters( param_dict )
+
+        return instance_OUT
+
+    #-- END method make_article_coding() --#
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> instance methods - tests
+    #----------------------------------------------------------------------------
+
+
+    def test_code_article_data_parallel( self ):
+
+        # declare variables
+        me = "test_code_article_data_parallel"
+        bad_article = None
+        good_id_list = None
+        my_article_coding = None
+        status_string = ""
+        article_data_qs = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        # one article loses its text, so it is an error.
+        bad_article = self.test_corpus.article_list[ 2 ]
+        Article_Text.objects.filter( article = bad_article ).delete()
+        good_id_list = sorted( [ current_article.id for current_article in self.test_corpus.article_list if ( current_article.id != bad_article.id ) ] )
+
+        # code_article_data() hands a "thread" pool to code_article_data_parallel().
+        my_article_coding = self.make_article_coding( ArticleCoding.WORKER_POOL_TYPE_THREAD )
+        status_string = my_article_coding.code_article_data( self.article_qs )
+
+        # statuses merged from every worker.
+        self.assertEqual( sorted( my_article_coding.get_success_list() ), good_id_list )
+        self.assertEqual( my_article_coding.get_success_count(), len( good_id_list ) )
+        self.assertEqual( list( my_article_coding.get_error_dictionary().keys() ), [ bad_article.id ] )
+        self.assertEqual( my_article_coding.get_error_count(), 1 )
+        self.assertTrue( my_article_coding.has_errors() )
+
+        # counters rolled up into the summary.
+        self.assertIsNotNone( re.search( r"Articles processed\D*{}\b".format( self.TEST_ARTICLE_COUNT ), status_string ), msg = status_string )
+        self.assertIsNotNone( re.search( r"Error count\D*1\b", status_string ), msg = status_string )
+        self.assertIsNotNone( re.search( r"Worker count\D*{}\b".format( self.TEST_WORKER_COUNT ), status_string ), msg = status_string )
+        self.assertIn( ArticleCoding.WORKER_POOL_TYPE_THREAD, status_string )
+
+        # coded articles have complete automated Article_Data, the bad one's
+        #     is marked with the error.
+        article_data_qs = Article_Data.objects.filter( article__in = self.article_qs, coder = ArticleCoder.get_automated_coding_user() )
+        self.assertEqual( sorted( article_data_qs.filter( status = Article_Data.STATUS_COMPLETE ).values_list( "article_id", flat = True ) ), good_id_list )
+        self.assertEqual( article_data_qs.get( article = bad_article ).status, Article_Data.STATUS_UNKNOWN_ERROR )
+
+    #-- END test method test_code_article_data_parallel() --#
+
+
+    def test_code_article_data_parallel_process( self ):
+
+        # declare variables
+        me = "test_code_article_data_parallel_process"
+        article_id_list = None
+        my_article_coding = None
+        status_string = ""
+        article_data_qs = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        # checked here, not in a decorator - the test database is only in
+        #     place once the test run has started.
+        if ( ( connection.vendor == "sqlite" ) and ( connection.is_in_memory_db() == True ) ):
+
+            self.skipTest( "worker processes can't see an in-memory SQLite database." )
+
+        #-- END check to see if in-memory database --#
+
+        article_id_list = sorted( [ current_article.id for current_article in self.test_corpus.article_list ] )
+
+        # code_article_data() hands a "process" pool to code_article_data_parallel().
+        my_article_coding = self.make_article_coding( ArticleCoding.WORKER_POOL_TYPE_PROCESS )
+        status_string = my_article_coding.code_article_data( self.article_qs )
+
+        # statuses merged back from the worker processes.
+        self.assertEqual( sorted( my_article_coding.get_success_list() ), article_id_list )
+        self.assertEqual( my_article_coding.get_error_count(), 0 )
+        self.assertIsNotNone( re.search( r"Articles processed\D*{}\b".format( self.TEST_ARTICLE_COUNT ), status_string ), msg = status_string )
+        self.assertIsNotNone( re.search( r"Worker count\D*{}\b".format( self.TEST_WORKER_COUNT ), status_string ), msg = status_string )
+        self.assertIn( ArticleCoding.WORKER_POOL_TYPE_PROCESS, status_string )
+
+        # and the workers' coding is in the database.
+        article_data_qs = Article_Data.objects.filter( article__in = self.article_qs, coder = ArticleCoder.get_automated_coding_user(), status = Article_Data.STATUS_COMPLETE )
+        self.assertEqual( sorted( article_data_qs.values_list( "article_id", flat = True ) ), article_id_list )
+
+    #-- END test method test_code_article_data_parallel_process() --#
+
+
+    def test_code_article_id_list_worker_daily_limit( self ):
+
+        # declare variables
+        me = "test_code_article_id_list_worker_daily_limit"
+        article_id_list = None
+        uncached_article_id = -1
+        limited_cache_directory = ""
+        my_article_coding = None
+        my_rate_limiter = None
+        worker_result = None
+        status_list = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        # responses cached for every article but the third, so coding it
+        #     would need a request.
+        article_id_list = sorted( [ current_article.id for current_article in self.test_corpus.article_list ] )
+        uncached_article_id = article_id_list[ 2 ]
+        limited_cache_directory = tempfile.mkdtemp()
+        self.addCleanup( shutil.rmtree, limited_cache_directory, ignore_errors = True )
+        SyntheticCoding.populate_response_cache( self.article_qs.exclude( id = uncached_article_id ), limited_cache_directory )
+        my_article_coding = self.make_article_coding( None, cache_directory_IN = limited_cache_directory )
+
+        # the day's one request is already used up.
+        my_rate_limiter = SharedRateLimiter( -1, daily_limit_IN = 1 )
+        self.assertTrue( my_rate_limiter.start_request() )
+        self.assertFalse( my_rate_limiter.may_i_continue() )
+
+        # cached articles before it are coded, then the worker stops - no
+        #     request, and every article left gets the daily limit status.
+        worker_result = code_article_id_list_worker( my_article_coding.get_param_container().get_parameters(), article_id_list, my_rate_limiter )
+        status_list = worker_result[ ArticleCoding.WORKER_RESULT_ARTICLE_STATUS_LIST ]
+        self.assertEqual( [ current_status[ 0 ] for current_status in status_list ], article_id_list )
+        self.assertEqual( [ current_status[ 1 ] for current_status in status_list ], ( [ ArticleCoder.STATUS_SUCCESS ] * 2 ) + ( [ ArticleCoding.STATUS_DAILY_LIMIT_REACHED ] * 3 ) )
+        self.assertEqual( worker_result[ ArticleCoding.WORKER_RESULT_ARTICLE_COUNTER ], 2 )
+        self.assertEqual( worker_result[ ArticleCoding.WORKER_RESULT_DAILY_LIMIT_COUNTER ], 3 )
+        self.assertEqual( my_rate_limiter.request_count.value, 1 )
+        self.assertEqual( Article_Data.objects.filter( article_id__in = article_id_list[ 2 : ] ).count(), 0 )
+
+        # merged, they are errors, so they can be re-run.
+        for current_status in status_list:
+
+            my_article_coding.record_article_status( current_status[ 0 ], current_status[ 1 ] )
+
+        #-- END loop over statuses --#
+
+        self.assertEqual( sorted( my_article_coding.get_error_dictionary().keys() ), article_id_list[ 2 : ] )
+
+    #-- END test method test_code_article_id_list_worker_daily_limit() --#
+
+
+    def test_get_worker_pool_type( self ):
+
+        # declare variables
+        me = "test_get_worker_pool_type"
+        pool_type = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        # known types pass through.
+        for pool_type in ArticleCoding.WORKER_POOL_TYPE_CHOICES_LIST:
+
+            self.assertEqual( self.make_article_coding( pool_type ).get_worker_pool_type(), pool_type )
+
+        #-- END loop over pool types --#
+
+        # not set or unknown - default, so serial coding.
+        self.assertEqual( self.make_article_coding( None ).get_worker_pool_type(), ArticleCoding.WORKER_POOL_TYPE_DEFAULT )
+        self.assertEqual( self.make_article_coding( "fork" ).get_worker_pool_type(), ArticleCoding.WORKER_POOL_TYPE_DEFAULT )
+        self.assertEqual( ArticleCoding.WORKER_POOL_TYPE_DEFAULT, ArticleCoding.WORKER_POOL_TYPE_NONE )
+
+    #-- END test method test_get_worker_pool_type() --#
+
+
+    def test_shared_rate_limiter_daily_limit( self ):
+
+        # declare variables
+        me = "test_shared_rate_limiter_daily_limit"
+        my_rate_limiter = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        # no daily limit - always OK.
+        my_rate_limiter = SharedRateLimiter( -1 )
+        self.assertTrue( my_rate_limiter.start_request() )
+        self.assertTrue( my_rate_limiter.start_request() )
+        self.assertTrue( my_rate_limiter.may_i_continue() )
+
+        # limit of 2 - third request refused.
+        my_rate_limiter = SharedRateLimiter( -1, daily_limit_IN = 2 )
+        self.assertTrue( my_rate_limiter.may_i_continue() )
+        self.assertTrue( my_rate_limiter.start_request() )
+        self.assertTrue( my_rate_limiter.start_request() )
+        self.assertFalse( my_rate_limiter.may_i_continue() )
+        self.assertFalse( my_rate_limiter.start_request() )
+        self.assertEqual( my_rate_limiter.request_count.value, 2 )
+
+        # wait_for_turn() only spaces requests, it doesn't count them.
+        my_rate_limiter = SharedRateLimiter( -1, daily_limit_IN = 1 )
+        my_rate_limiter.wait_for_turn()
+        self.assertTrue( my_rate_limiter.may_i_continue() )
+
+    #-- END test method test_shared_rate_limiter_daily_limit() --#
+
+
+#-- END class ArticleCodingParallelTest --#
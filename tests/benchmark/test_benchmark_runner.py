@@ -0,0 +1,245 @@
+"""
+This file contains tests of the context_text hot path benchmark - the
+   SyntheticCoding OpenCalais and manual coding stand-ins and the
+   BenchmarkRunner used by the benchmark_hot_paths management command.
+
+Functions tested:
+
+- BenchmarkRunner.compare_results()
+- BenchmarkRunner.run()
+- BenchmarkRunner.to_json()
+- SyntheticCoding.find_quotation_list()
+- SyntheticCoding.make_open_calais_json()
+- SyntheticCoding.populate_response_cache()
+
+"""
+
+# python base imports
+import json
+
+# django imports
+import django.test
+
+# context_text imports
+from context_text.article_coding.article_coder import ArticleCoder
+from context_text.article_coding.open_calais_v2.open_calais_v2_api_response import OpenCalaisV2ApiResponse
+from context_text.benchmark.benchmark_runner import BenchmarkRunner
+from context_text.benchmark.synthetic_coding import SyntheticCoding
+from context_text.data.synthetic_corpus import SyntheticCorpus
+from context_text.models import Article_Data
+from context_text.tests.test_helper import TestHelper
+
+
+class BenchmarkRunnerTest( django.test.TestCase ):
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> Constants-ish
+    #----------------------------------------------------------------------------
+
+
+    # DEBUG
+    DEBUG = False
+
+    # CLASS NAME
+    CLASS_NAME = "BenchmarkRunnerTest"
+
+    # test text
+    TEST_TEXT = 'The council met. "We will vote," said Mary Smith1. Then "It is late," said John Brown2. "No," said Mary Smith1.'
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> instance methods - setup
+    #----------------------------------------------------------------------------
+
+
+    def setUp( self ):
+
+        """
+        setup tasks.  Call function that we'll re-use, then make a small
+           synthetic corpus.
+        """
+
+        # call TestHelper.standardSetUp()
+        TestHelper.standardSetUp( self )
+
+        self.test_corpus = SyntheticCorpus( article_count_IN = 5, newspaper_count_IN = 2, person_count_IN = 20, seed_IN = 7 )
+        self.test_corpus.create()
+
+    #-- END function setUp() --#
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> instance methods - tests
+    #----------------------------------------------------------------------------
+
+
+    def test_code_article_data_from_cache( self ):
+
+        # declare variables
+        me = "test_code_article_data_from_cache"
+        test_runner = None
+        article_data_qs = None
+        current_article_data = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        test_runner = BenchmarkRunner( self.test_corpus, repeat_count_IN = 1, coding_article_count_IN = 2 )
+        try:
+
+            test_runner.prepare()
+            test_runner.run_code_article_data()
+
+            # one automated Article_Data per article, with quoted sources.
+            article_data_qs = Article_Data.objects.filter( article_id__in = test_runner.coding_article_id_list, coder = ArticleCoder.get_automated_coding_user() )
+            self.assertEqual( article_data_qs.count(), 2 )
+            for current_article_data in article_data_qs:
+
+                self.assertTrue( current_article_data.get_quoted_article_sources_qs().count() > 0 )
+
+            #-- END loop over Article_Data --#
+
+        finally:
+
+            test_runner.cleanup()
+
+        #-- END try...finally around runner --#
+
+    #-- END test method test_code_article_data_from_cache() --#
+
+
+    def test_compare_results( self ):
+
+        # declare variables
+        me = "test_compare_results"
+        old_dict = None
+        new_dict = None
+        compare_list = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        old_dict = { "scenario_list" : [ { "name" : "a", "median_ms" : 10.0, "query_count" : 5 }, { "name" : "b", "median_ms" : 0.0, "query_count" : 1 } ] }
+        new_dict = { "scenario_list" : [ { "name" : "a", "median_ms" : 5.0, "query_count" : 2 }, { "name" : "b", "median_ms" : 1.0, "query_count" : 1 }, { "name" : "c", "median_ms" : 1.0, "query_count" : 1 } ] }
+        compare_list = BenchmarkRunner.compare_results( old_dict, new_dict )
+
+        # only scenarios in both; no ratio from 0.
+        self.assertEqual( [ current_compare[ "name" ] for current_compare in compare_list ], [ "a", "b" ] )
+        self.assertEqual( compare_list[ 0 ][ "median_ratio" ], 0.5 )
+        self.assertEqual( compare_list[ 0 ][ "old_query_count" ], 5 )
+        self.assertEqual( compare_list[ 0 ][ "new_query_count" ], 2 )
+        self.assertIsNone( compare_list[ 1 ][ "median_ratio" ] )
+
+    #-- END test method test_compare_results() --#
+
+
+    def test_find_quotation_list( self ):
+
+        # declare variables
+        me = "test_find_quotation_list"
+        quotation_list = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        quotation_list = SyntheticCoding.find_quotation_list( self.TEST_TEXT )
+        self.assertEqual( len( quotation_list ), 3 )
+        self.assertEqual( quotation_list[ 0 ][ "quote" ], "We will vote" )
+        self.assertEqual( quotation_list[ 1 ][ "name" ], "John Brown2" )
+        self.assertEqual( quotation_list[ 1 ][ "exact" ], '"It is late," said John Brown2.' )
+
+        # offsets point into the text.
+        self.assertEqual( self.TEST_TEXT[ quotation_list[ 2 ][ "offset" ] : quotation_list[ 2 ][ "offset" ] + quotation_list[ 2 ][ "length" ] ], quotation_list[ 2 ][ "exact" ] )
+        self.assertEqual( self.TEST_TEXT[ quotation_list[ 2 ][ "name_offset" ] : quotation_list[ 2 ][ "name_offset" ] + quotation_list[ 2 ][ "name_length" ] ], "Mary Smith1" )
+
+    #-- END test method test_find_quotation_list() --#
+
+
+    def test_make_open_calais_json( self ):
+
+        # declare variables
+        me = "test_make_open_calais_json"
+        response_dict = None
+        item_list = None
+        person_list = None
+        quotation_list = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        response_dict = SyntheticCoding.make_open_calais_json( self.TEST_TEXT )
+        self.assertIn( OpenCalaisV2ApiResponse.JSON_NAME_DOC, response_dict )
+
+        # one Person per name, one instance per mention.
+        item_list = [ current_item for current_key, current_item in response_dict.items() if ( current_key != OpenCalaisV2ApiResponse.JSON_NAME_DOC ) ]
+        person_list = [ current_item for current_item in item_list if ( current_item[ OpenCalaisV2ApiResponse.JSON_NAME_ITEM_TYPE ] == OpenCalaisV2ApiResponse.OC_ITEM_TYPE_PERSON ) ]
+        quotation_list = [ current_item for current_item in item_list if ( current_item[ OpenCalaisV2ApiResponse.JSON_NAME_ITEM_TYPE ] == OpenCalaisV2ApiResponse.OC_ITEM_TYPE_QUOTATION ) ]
+        self.assertEqual( len( person_list ), 2 )
+        self.assertEqual( sorted( [ len( current_item[ OpenCalaisV2ApiResponse.JSON_NAME_INSTANCES ] ) for current_item in person_list ] ), [ 1, 2 ] )
+        self.assertEqual( len( quotation_list ), 3 )
+
+        # quotations point at their speaker.
+        for current_item in quotation_list:
+
+            self.assertIn( current_item[ OpenCalaisV2ApiResponse.JSON_NAME_QUOTE_PERSON_URI ], response_dict )
+
+        #-- END loop over quotations --#
+
+        # deterministic
+        self.assertEqual( json.dumps( response_dict, sort_keys = True ), json.dumps( SyntheticCoding.make_open_calais_json( self.TEST_TEXT ), sort_keys = True ) )
+
+    #-- END test method test_make_open_calais_json() --#
+
+
+    def test_run( self ):
+
+        # declare variables
+        me = "test_run"
+        test_runner = None
+        result_dict = None
+        current_scenario = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        test_runner = BenchmarkRunner( self.test_corpus, repeat_count_IN = 1, coding_article_count_IN = 3 )
+        try:
+
+            result_dict = test_runner.run()
+
+        finally:
+
+            test_runner.cleanup()
+
+        #-- END try...finally around runner --#
+
+        # every scenario ran, without errors, and made queries.
+        self.assertEqual( len( result_dict[ "scenario_list" ] ), len( test_runner.get_scenario_list() ) )
+        for current_scenario in result_dict[ "scenario_list" ]:
+
+            self.assertIsNone( current_scenario[ "error" ], msg = current_scenario[ "name" ] )
+            self.assertTrue( current_scenario[ "query_count" ] > 0, msg = current_scenario[ "name" ] )
+            self.assertEqual( len( current_scenario[ "ms_list" ] ), 1 )
+
+        #-- END loop over scenarios --#
+
+        # runs are rolled back.
+        self.assertEqual( Article_Data.objects.filter( coder = test_runner.manual_coder_user ).count(), 0 )
+
+        # JSON round trip
+        self.assertEqual( json.loads( BenchmarkRunner.to_json( result_dict ) ), result_dict )
+
+        # scenario filter - by prefix.
+        test_runner = BenchmarkRunner( self.test_corpus, repeat_count_IN = 1, coding_article_count_IN = 1 )
+        try:
+
+            result_dict = test_runner.run( scenario_name_list_IN = [ BenchmarkRunner.SCENARIO_CSV_ARTICLE_OUTPUT_PREFIX ] )
+
+        finally:
+
+            test_runner.cleanup()
+
+        #-- END try...finally around runner --#
+
+        self.assertEqual( len( result_dict[ "scenario_list" ] ), 3 )
+
+    #-- END test method test_run() --#
+
+
+#-- END class BenchmarkRunnerTest --#
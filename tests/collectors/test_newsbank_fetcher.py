@@ -0,0 +1,300 @@
+"""
+This file contains tests of the NewsBank collector's ConcurrentFetcher, run
+    against a local HTTP server that stands in for NewsBank, serving saved
+    issue and article HTML.
+
+Functions tested:
+
+- ConcurrentFetcher.fetch()
+- ConcurrentFetcher.fetch_all()
+
+"""
+
+# python imports
+import threading
+import time
+
+# six - Python 2 and 3 support
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+
+# django imports
+import django.test
+
+# context_text imports
+from context_text.collectors.newsbank.newsbank_fetcher import ConcurrentFetcher
+from context_text.collectors.newsbank.newsbank_fetcher import FetchError
+
+
+class NewsBankStandInServer( socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer ):
+
+    '''
+    Local stand-in for NewsBank.  Tracks how many requests are in progress at
+       once, and how many times each path has been requested.
+    '''
+
+    daemon_threads = True
+
+    # saved NewsBank HTML
+    ISSUE_HTML = '<html><body><div id="articles"><h3><span>Section:</span> Section: Business</h3><ul><li><a href="/iw-search/we/InfoWeb?p_action=doc&p_docid=ABC123">Plant to close</a></li></ul></div></body></html>'
+    ARTICLE_HTML_FORMAT = '<html><body><div class="mainArticle"><div class="docCite">Article {}</div><div class="mainText"><p>Body of article {}.</p></div></div></body></html>'
+
+    # how long each request takes, so requests overlap.
+    RESPONSE_DELAY = 0.05
+
+    def __init__( self, *args, **kwargs ):
+
+        BaseHTTPServer.HTTPServer.__init__( self, *args, **kwargs )
+        self.state_lock = threading.Lock()
+        self.in_progress_count = 0
+        self.max_in_progress_count = 0
+        self.path_to_count_map = {}
+
+    #-- END method __init__() --#
+
+#-- END class NewsBankStandInServer --#
+
+
+class NewsBankStandInHandler( BaseHTTPServer.BaseHTTPRequestHandler ):
+
+    # keep connections open, like NewsBank.
+    protocol_version = "HTTP/1.1"
+
+    def do_GET( self ):
+
+        # declare variables
+        my_server = self.server
+        request_count = -1
+        status_code = 200
+        body = ""
+
+        with my_server.state_lock:
+
+            my_server.in_progress_count += 1
+            my_server.max_in_progress_count = max( my_server.max_in_progress_count, my_server.in_progress_count )
+            request_count = my_server.path_to_count_map.get( self.path, 0 ) + 1
+            my_server.path_to_count_map[ self.path ] = request_count
+
+        #-- END with state lock --#
+
+        time.sleep( my_server.RESPONSE_DELAY )
+
+        if ( self.path.startswith( "/issue" ) ):
+
+            body = my_server.ISSUE_HTML
+
+        elif ( self.path.startswith( "/article/" ) ):
+
+            body = my_server.ARTICLE_HTML_FORMAT.format( self.path, self.path )
+
+        elif ( ( self.path == "/flaky" ) and ( request_count <= 2 ) ):
+
+            # unavailable first two times.
+            status_code = 503
+            body = "try again"
+
+        elif ( self.path == "/flaky" ):
+
+            body = "finally"
+
+        else:
+
+            status_code = 404
+            body = "not found"
+
+        #-- END check to see what path --#
+
+        body = body.encode( "utf-8" )
+        self.send_response( status_code )
+        self.send_header( "Content-Type", "text/html" )
+        self.send_header( "Content-Length", str( len( body ) ) )
+        self.end_headers()
+        self.wfile.write( body )
+
+        with my_server.state_lock:
+
+            my_server.in_progress_count -= 1
+
+        #-- END with state lock --#
+
+    #-- END method do_GET() --#
+
+
+    def log_message( self, *args ):
+
+        # quiet.
+        pass
+
+    #-- END method log_message() --#
+
+#-- END class NewsBankStandInHandler --#
+
+
+class NewsBankFetcherTest( django.test.TestCase ):
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> Constants-ish
+    #----------------------------------------------------------------------------
+
+
+    # DEBUG
+    DEBUG = False
+
+    # CLASS NAME
+    CLASS_NAME = "NewsBankFetcherTest"
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> instance methods - setup
+    #----------------------------------------------------------------------------
+
+
+    def setUp( self ):
+
+        """
+        setup tasks.  Start local stand-in for NewsBank.
+        """
+
+        self.server = NewsBankStandInServer( ( "127.0.0.1", 0 ), NewsBankStandInHandler )
+        self.server_thread = threading.Thread( target = self.server.serve_forever )
+        self.server_thread.daemon = True
+        self.server_thread.start()
+        self.base_url = "http://127.0.0.1:" + str( self.server.server_address[ 1 ] )
+
+    #-- END function setUp() --#
+
+
+    def tearDown( self ):
+
+        self.server.shutdown()
+        self.server.server_close()
+
+    #-- END function tearDown() --#
+
+
+    def make_fetcher( self, **kwargs ):
+
+        # fast defaults for tests.
+        kwargs.setdefault( "backoff_seconds_IN", 0.01 )
+        kwargs.setdefault( "politeness_delay_IN", 0 )
+        kwargs.setdefault( "timeout_IN", 5 )
+        return ConcurrentFetcher( **kwargs )
+
+    #-- END method make_fetcher() --#
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> instance methods - tests
+    #----------------------------------------------------------------------------
+
+
+    def test_fetch_all( self ):
+
+        # declare variables
+        me = "test_fetch_all"
+        my_fetcher = None
+        request_list = None
+        result_list = None
+        index = -1
+        fetch_result = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        my_fetcher = self.make_fetcher( max_workers_IN = 8, per_host_limit_IN = 3 )
+
+        # an issue and a batch of articles.
+        request_list = [ ( "issue", self.base_url + "/issue?f_issue=2010-07-08" ) ]
+        for index in range( 12 ):
+
+            request_list.append( ( index, self.base_url + "/article/" + str( index ) ) )
+
+        #-- END loop over articles --#
+
+        result_list = list( my_fetcher.fetch_all( request_list ) )
+        my_fetcher.close()
+
+        # in order, all there, all successful.
+        self.assertEqual( [ fetch_result.key for fetch_result in result_list ], [ key for key, url in request_list ] )
+        for fetch_result in result_list:
+
+            self.assertTrue( fetch_result.is_success(), msg = str( fetch_result.exception ) )
+
+        #-- END loop over results --#
+
+        # stands in for urllib connection.
+        self.assertIn( b'<div id="articles">', result_list[ 0 ].read() )
+        self.assertEqual( result_list[ 0 ].geturl(), self.base_url + "/issue?f_issue=2010-07-08" )
+        self.assertIn( b"Body of article /article/5.", result_list[ 6 ].read() )
+
+        # concurrent, but never more than per-host limit.
+        self.assertTrue( self.server.max_in_progress_count > 1 )
+        self.assertTrue( self.server.max_in_progress_count <= 3 )
+
+    #-- END test method test_fetch_all() --#
+
+
+    def test_fetch_errors( self ):
+
+        # declare variables
+        me = "test_fetch_errors"
+        my_fetcher = None
+        fetch_result = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        my_fetcher = self.make_fetcher( max_retries_IN = 3 )
+
+        # retried until it works.
+        fetch_result = my_fetcher.fetch( self.base_url + "/flaky", "flaky" )
+        self.assertTrue( fetch_result.is_success() )
+        self.assertEqual( fetch_result.read(), b"finally" )
+        self.assertEqual( fetch_result.attempt_count, 3 )
+        self.assertEqual( my_fetcher.retry_count, 2 )
+
+        # not retried.
+        fetch_result = my_fetcher.fetch( self.base_url + "/missing", "missing" )
+        self.assertFalse( fetch_result.is_success() )
+        self.assertIsInstance( fetch_result.exception, FetchError )
+        self.assertEqual( fetch_result.status_code, 404 )
+        self.assertEqual( fetch_result.attempt_count, 1 )
+        self.assertNotEqual( fetch_result.stack_trace, "" )
+
+        # out of retries.
+        self.server.path_to_count_map = {}
+        my_fetcher.max_retries = 1
+        fetch_result = my_fetcher.fetch( self.base_url + "/flaky", "flaky" )
+        self.assertFalse( fetch_result.is_success() )
+        self.assertEqual( fetch_result.attempt_count, 2 )
+
+        my_fetcher.close()
+
+    #-- END test method test_fetch_errors() --#
+
+
+    def test_politeness_delay( self ):
+
+        # declare variables
+        me = "test_politeness_delay"
+        my_fetcher = None
+        request_list = None
+        start_time = None
+        result_list = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        my_fetcher = self.make_fetcher( max_workers_IN = 4, per_host_limit_IN = 4, politeness_delay_IN = 0.2 )
+        request_list = [ ( index, self.base_url + "/article/" + str( index ) ) for index in range( 4 ) ]
+
+        # 4 requests, starts at least 0.2 seconds apart.
+        start_time = time.time()
+        result_list = list( my_fetcher.fetch_all( request_list ) )
+        self.assertTrue( ( time.time() - start_time ) >= 0.6 )
+        self.assertEqual( len( result_list ), 4 )
+
+        my_fetcher.close()
+
+    #-- END test method test_politeness_delay() --#
+
+
+#-- END test class NewsBankFetcherTest --#
@@ -0,0 +1,145 @@
+"""
+This file contains tests of the NewsBankHelper methods that split parsing a
+    NewsBank article from storing it, so articles can be parsed in worker
+    processes and stored in batches.
+
+Functions tested:
+
+- NewsBankHelper.parse_file_contents()
+- NewsBankHelper.save_parsed_article_list()
+
+"""
+
+# django imports
+import django.test
+
+# context_text imports
+from context_text.collectors.newsbank.newsbank_helper import NewsBankHelper
+from context_text.models import Article
+from context_text.models import Article_RawData
+from context_text.models import Article_Text
+from context_text.tests.test_helper import TestHelper
+
+
+class NewsBankHelperTest( django.test.TestCase ):
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> Constants-ish
+    #----------------------------------------------------------------------------
+
+
+    # DEBUG
+    DEBUG = False
+
+    # CLASS NAME
+    CLASS_NAME = "NewsBankHelperTest"
+
+    # saved NewsBank article HTML
+    ARTICLE_HTML_FORMAT = '<html><body><div class="docBody"><h3 class="docCite">Plant {} to close</h3><div class="docSource"><span class="pubName">Grand Rapids Press, The (MI)</span> - Wednesday, July 8, 2009</div><div class="docAuthor"><div class="sourceInfo">By Jane Smith</div></div><div class="mainText">The plant will close.<br /><br />Jobs will be lost.</div></div><div id="openUrl"><a href="http://infoweb.newsbank.com/{}">link</a></div></body></html>'
+    ERROR_HTML = '<html><body><p>Session expired.</p></body></html>'
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> instance methods - setup
+    #----------------------------------------------------------------------------
+
+
+    def setUp( self ):
+
+        """
+        setup tasks.  Call function that we'll re-use.
+        """
+
+        # call TestHelper.standardSetUp()
+        TestHelper.standardSetUp( self )
+
+    #-- END function setUp() --#
+
+
+    def parse_article( self, nb_helper_IN, id_IN ):
+
+        # parse saved HTML for ID.
+        return nb_helper_IN.parse_file_contents( id_IN, self.ARTICLE_HTML_FORMAT.format( id_IN, id_IN ) )
+
+    #-- END method parse_article() --#
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> instance methods - tests
+    #----------------------------------------------------------------------------
+
+
+    def test_parse_file_contents( self ):
+
+        # declare variables
+        me = "test_parse_file_contents"
+        nb_helper = None
+        parsed_article = None
+        field_dict = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        nb_helper = NewsBankHelper()
+
+        # parses without touching database.
+        parsed_article = self.parse_article( nb_helper, "NB001" )
+        self.assertEqual( parsed_article.status, NewsBankHelper.STATUS_SUCCESS )
+        self.assertEqual( Article.objects.filter( unique_identifier = "NB001" ).count(), 0 )
+
+        field_dict = parsed_article.get_article_field_dict()
+        self.assertEqual( field_dict[ "unique_identifier" ], "NB001" )
+        self.assertEqual( field_dict[ "headline" ], "Plant NB001 to close" )
+        self.assertEqual( field_dict[ "permalink" ], "http://infoweb.newsbank.com/NB001" )
+        self.assertEqual( field_dict[ "pub_date" ].year, 2009 )
+        self.assertIn( "Jobs will be lost.", parsed_article.text )
+
+        # no docBody - status is error.
+        parsed_article = nb_helper.parse_file_contents( "NB002", self.ERROR_HTML )
+        self.assertNotEqual( parsed_article.status, NewsBankHelper.STATUS_SUCCESS )
+        self.assertEqual( parsed_article.get_article_field_dict(), {} )
+
+    #-- END test method test_parse_file_contents() --#
+
+
+    def test_save_parsed_article_list( self ):
+
+        # declare variables
+        me = "test_save_parsed_article_list"
+        nb_helper = None
+        parsed_list = None
+        saved_list = None
+        article_qs = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        nb_helper = NewsBankHelper()
+        nb_helper.check_for_duplicates = True
+        nb_helper.do_on_duplicate = NewsBankHelper.DO_ON_DUPLICATE_UPDATE
+
+        # new articles, one in list twice.
+        parsed_list = [ self.parse_article( nb_helper, "NB101" ), self.parse_article( nb_helper, "NB102" ), self.parse_article( nb_helper, "NB101" ) ]
+        saved_list = nb_helper.save_parsed_article_list( parsed_list )
+        self.assertEqual( len( saved_list ), 2 )
+
+        article_qs = Article.objects.filter( unique_identifier__in = [ "NB101", "NB102" ] )
+        self.assertEqual( article_qs.count(), 2 )
+        self.assertEqual( Article_Text.objects.filter( article__in = article_qs ).count(), 2 )
+        self.assertEqual( Article_RawData.objects.filter( article__in = article_qs ).count(), 2 )
+        self.assertEqual( Article_Text.objects.get( article__unique_identifier = "NB102" ).get_content_sans_html().count( "The plant will close." ), 1 )
+
+        # again - updates, doesn't insert.
+        saved_list = nb_helper.save_parsed_article_list( [ self.parse_article( nb_helper, "NB102" ) ] )
+        self.assertEqual( len( saved_list ), 1 )
+        self.assertEqual( Article.objects.filter( unique_identifier = "NB102" ).count(), 1 )
+        self.assertEqual( Article_Text.objects.filter( article__unique_identifier = "NB102" ).count(), 1 )
+
+        # skip.
+        nb_helper.do_on_duplicate = NewsBankHelper.DO_ON_DUPLICATE_SKIP
+        saved_list = nb_helper.save_parsed_article_list( [ self.parse_article( nb_helper, "NB102" ), self.parse_article( nb_helper, "NB103" ) ] )
+        self.assertEqual( [ article.unique_identifier for article in saved_list ], [ "NB103" ] )
+
+    #-- END test method test_save_parsed_article_list() --#
+
+
+#-- END test class NewsBankHelperTest --#
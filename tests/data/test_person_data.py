@@ -0,0 +1,250 @@
+"""
+This file contains tests of the context_text PersonData set-based person merge.
+
+Functions tested:
+
+- PersonData.get_merge_function()
+- PersonData.get_person_reference_field_list()
+- PersonData.merge_persons()
+- PersonData.merge_persons_bulk()
+
+"""
+
+# django imports
+import django.test
+
+# python_utilities
+from python_utilities.status.status_container import StatusContainer
+
+# context_text imports
+from context_text.data.person_data import PersonData
+from context_text.data.synthetic_corpus import SyntheticCorpus
+from context_text.models import Article_Author
+from context_text.models import Article_Data
+from context_text.models import Article_Data_Network_Tie
+from context_text.models import Article_Subject
+from context_text.models import Person
+from context_text.models import Person_Newspaper
+from context_text.tests.test_helper import TestHelper
+
+
+class PersonDataTest( django.test.TestCase ):
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> Constants-ish
+    #----------------------------------------------------------------------------
+
+
+    # DEBUG
+    DEBUG = False
+
+    # CLASS NAME
+    CLASS_NAME = "PersonDataTest"
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> instance methods - setup
+    #----------------------------------------------------------------------------
+
+
+    def setUp( self ):
+
+        """
+        setup tasks.  Call function that we'll re-use, then make a small
+            corpus so there is coding that refers to people.
+        """
+
+        # call TestHelper.standardSetUp()
+        TestHelper.standardSetUp( self )
+
+        self.corpus = SyntheticCorpus( article_count_IN = 20, newspaper_count_IN = 2, person_count_IN = 6, seed_IN = 7 )
+        self.corpus.create()
+
+        # merge the first two people into the third.
+        self.from_id_list = [ self.corpus.person_list[ 0 ].id, self.corpus.person_list[ 1 ].id ]
+        self.into_id = self.corpus.person_list[ 2 ].id
+
+    #-- END function setUp() --#
+
+
+    def get_reference_count( self, person_id_list_IN ):
+
+        '''
+        Returns count of Article_Author and Article_Subject rows whose person is
+            in the list passed in.
+        '''
+
+        # return reference
+        count_OUT = 0
+
+        count_OUT += Article_Author.objects.filter( person_id__in = person_id_list_IN ).count()
+        count_OUT += Article_Subject.objects.filter( person_id__in = person_id_list_IN ).count()
+
+        return count_OUT
+
+    #-- END method get_reference_count() --#
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> instance methods - tests
+    #----------------------------------------------------------------------------
+
+
+    def test_get_merge_function( self ):
+
+        # declare variables
+        me = "test_get_merge_function"
+        model_class = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        # default map - unchanged, coding is left alone.
+        for model_class in [ Article_Author, Article_Subject, Person_Newspaper ]:
+
+            self.assertEqual( PersonData.get_merge_function( model_class ), PersonData.mf_do_nothing )
+
+        #-- END loop over models --#
+
+        # bulk map - references move to the INTO person.
+        for model_class in [ Article_Author, Article_Subject, Person_Newspaper ]:
+
+            self.assertEqual( PersonData.get_merge_function( model_class, is_bulk_IN = True ), PersonData.mf_update_person_reference )
+
+        #-- END loop over models --#
+
+        # anything not in the map gets the default either way.
+        self.assertEqual( PersonData.get_merge_function( Person ), PersonData.mf_do_nothing )
+        self.assertEqual( PersonData.get_merge_function( Person, is_bulk_IN = True ), PersonData.mf_do_nothing )
+
+    #-- END test method test_get_merge_function() --#
+
+
+    def test_get_person_reference_field_list( self ):
+
+        # declare variables
+        me = "test_get_person_reference_field_list"
+        field_list = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        field_list = PersonData.get_person_reference_field_list()
+        self.assertIn( ( Article_Author, "person" ), field_list )
+        self.assertIn( ( Article_Subject, "person" ), field_list )
+
+        # original_person is history - left alone.
+        self.assertNotIn( ( Article_Author, "original_person" ), field_list )
+
+        # network ties are rebuilt, not merged.
+        self.assertNotIn( ( Article_Data_Network_Tie, "from_person" ), field_list )
+        self.assertNotIn( ( Article_Data_Network_Tie, "to_person" ), field_list )
+
+    #-- END test method test_get_person_reference_field_list() --#
+
+
+    def test_merge_persons( self ):
+
+        # declare variables
+        me = "test_merge_persons"
+        from_count = -1
+        into_count = -1
+        merge_status = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        from_count = self.get_reference_count( self.from_id_list )
+        into_count = self.get_reference_count( [ self.into_id ] )
+
+        # default merge map does nothing to coding - references stay put.
+        merge_status = PersonData.merge_persons( self.from_id_list, self.into_id )
+        self.assertEqual( merge_status.get_status_code(), StatusContainer.STATUS_CODE_SUCCESS )
+        self.assertEqual( self.get_reference_count( self.from_id_list ), from_count )
+        self.assertEqual( self.get_reference_count( [ self.into_id ] ), into_count )
+
+    #-- END test method test_merge_persons() --#
+
+
+    def test_merge_persons_bulk( self ):
+
+        # declare variables
+        me = "test_merge_persons_bulk"
+        from_count = -1
+        into_count = -1
+        merge_status = None
+        message_list = None
+        author_qs = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        from_count = self.get_reference_count( self.from_id_list )
+        into_count = self.get_reference_count( [ self.into_id ] )
+        self.assertGreater( from_count, 0 )
+
+        # dry run - nothing changes.
+        merge_status = PersonData.merge_persons_bulk( self.from_id_list, self.into_id, do_updates_IN = False )
+        self.assertEqual( merge_status.get_status_code(), StatusContainer.STATUS_CODE_SUCCESS )
+        self.assertEqual( self.get_reference_count( self.from_id_list ), from_count )
+
+        # merge.
+        merge_status = PersonData.merge_persons_bulk( self.from_id_list, self.into_id, batch_size_IN = 2 )
+        self.assertEqual( merge_status.get_status_code(), StatusContainer.STATUS_CODE_SUCCESS )
+        self.assertEqual( self.get_reference_count( self.from_id_list ), 0 )
+        self.assertEqual( self.get_reference_count( [ self.into_id ] ), into_count + from_count )
+
+        # moved rows remember who they used to refer to.
+        author_qs = Article_Author.objects.filter( original_person_id__in = self.from_id_list )
+        self.assertEqual( author_qs.exclude( person_id = self.into_id ).count(), 0 )
+        self.assertEqual( Article_Author.objects.filter( person_id = self.into_id, original_person__isnull = True ).count(),
+                          Article_Author.objects.filter( person_id = self.into_id ).count() - author_qs.count() )
+
+        # messages - a row count per table, then elapsed time.
+        message_list = merge_status.get_message_list()
+        self.assertIn( "Total rows moved: " + str( from_count ), message_list )
+        self.assertTrue( message_list[ -1 ].startswith( "Elapsed time: " ) )
+
+        # FROM persons still there unless asked.
+        self.assertEqual( Person.objects.filter( pk__in = self.from_id_list ).count(), 2 )
+        PersonData.merge_persons_bulk( self.from_id_list, self.into_id, delete_from_IN = True )
+        self.assertEqual( Person.objects.filter( pk__in = self.from_id_list ).count(), 0 )
+        self.assertEqual( self.get_reference_count( [ self.into_id ] ), into_count + from_count )
+
+        # errors.
+        merge_status = PersonData.merge_persons_bulk( [], self.into_id )
+        self.assertEqual( merge_status.get_status_code(), StatusContainer.STATUS_CODE_ERROR )
+        merge_status = PersonData.merge_persons_bulk( self.from_id_list, None )
+        self.assertEqual( merge_status.get_status_code(), StatusContainer.STATUS_CODE_ERROR )
+
+    #-- END test method test_merge_persons_bulk() --#
+
+
+    def test_merge_persons_bulk_network_ties( self ):
+
+        # declare variables
+        me = "test_merge_persons_bulk_network_ties"
+        tie_count = -1
+        merged_tie_list = None
+        rebuilt_tie_list = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        # corpus is bulk-created, so build its ties first.
+        Article_Data_Network_Tie.update_for_article_data_qs( Article_Data.objects.all() )
+        tie_count = Article_Data_Network_Tie.objects.count()
+        self.assertGreater( Article_Data_Network_Tie.objects.filter( from_person_id__in = self.from_id_list ).count(), 0 )
+
+        # merge and delete - ties move to the INTO person, none are lost.
+        PersonData.merge_persons_bulk( self.from_id_list, self.into_id, delete_from_IN = True )
+        self.assertEqual( Article_Data_Network_Tie.objects.filter( from_person_id__in = self.from_id_list ).count(), 0 )
+        self.assertEqual( Article_Data_Network_Tie.objects.filter( to_person_id__in = self.from_id_list ).count(), 0 )
+        self.assertEqual( Article_Data_Network_Tie.objects.count(), tie_count )
+
+        # same as rebuilding everything from the merged coding.
+        merged_tie_list = sorted( Article_Data_Network_Tie.objects.values_list( "article_data_id", "tie_type", "from_person_id", "to_person_id" ) )
+        Article_Data_Network_Tie.update_for_article_data_qs( Article_Data.objects.all() )
+        rebuilt_tie_list = sorted( Article_Data_Network_Tie.objects.values_list( "article_data_id", "tie_type", "from_person_id", "to_person_id" ) )
+        self.assertEqual( merged_tie_list, rebuilt_tie_list )
+
+    #-- END test method test_merge_persons_bulk_network_ties() --#
+
+
+#-- END test class PersonDataTest --#
@@ -0,0 +1,96 @@
+"""
+This file contains tests of the context_text SyntheticCorpus generator used
+   by the benchmark_query_plans management command.
+
+Functions tested:
+
+- SyntheticCorpus.create()
+- SyntheticCorpus.delete()
+
+"""
+
+# django imports
+import django.test
+
+# context_text imports
+from context_text.data.synthetic_corpus import SyntheticCorpus
+from context_text.models import Article
+from context_text.models import Article_Data
+from context_text.models import Article_Subject
+from context_text.models import Article_Text
+from context_text.tests.test_helper import TestHelper
+
+
+class SyntheticCorpusTest( django.test.TestCase ):
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> Constants-ish
+    #----------------------------------------------------------------------------
+
+
+    # DEBUG
+    DEBUG = False
+
+    # CLASS NAME
+    CLASS_NAME = "SyntheticCorpusTest"
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> instance methods - setup
+    #----------------------------------------------------------------------------
+
+
+    def setUp( self ):
+
+        """
+        setup tasks.  Call function that we'll re-use.
+        """
+
+        # call TestHelper.standardSetUp()
+        TestHelper.standardSetUp( self )
+
+    #-- END function setUp() --#
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> instance methods - tests
+    #----------------------------------------------------------------------------
+
+
+    def test_create_delete( self ):
+
+        # declare variables
+        me = "test_create_delete"
+        my_corpus = None
+        summary_dict = None
+        article_qs = None
+        first_list = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        my_corpus = SyntheticCorpus( article_count_IN = 25, newspaper_count_IN = 2, person_count_IN = 30, seed_IN = 99 )
+        summary_dict = my_corpus.create()
+        self.assertEqual( summary_dict[ "article_count" ], 25 )
+        self.assertEqual( summary_dict[ "person_count" ], 30 )
+
+        # one automated Article_Data per article, plus manual every tenth.
+        self.assertEqual( summary_dict[ "article_data_count" ], 25 + 3 )
+
+        article_qs = Article.objects.filter( unique_identifier__startswith = my_corpus.get_unique_identifier( "" ) )
+        self.assertEqual( article_qs.count(), 25 )
+        self.assertEqual( Article_Text.objects.filter( article__in = article_qs ).count(), 25 )
+        self.assertEqual( Article_Data.objects.filter( article__in = article_qs ).count(), 28 )
+        self.assertEqual( Article_Subject.objects.filter( article_data__article__in = article_qs ).count(), summary_dict[ "subject_count" ] )
+
+        # deterministic.
+        first_list = list( article_qs.order_by( "id" ).values_list( "pub_date", "section" ) )
+        my_corpus.delete()
+        self.assertEqual( article_qs.count(), 0 )
+        my_corpus.create()
+        self.assertEqual( list( article_qs.order_by( "id" ).values_list( "pub_date", "section" ) ), first_list )
+
+    #-- END test method test_create_delete() --#
+
+
+#-- END test class SyntheticCorpusTest --#
@@ -0,0 +1,152 @@
+"""
+This file contains tests of the context_text CsvArticleOutput class's
+   aggregate max counts and streaming output.
+
+Functions tested:
+
+- CsvArticleOutput.compute_max_counts()
+- CsvArticleOutput.iterate_csv_lines()
+- CsvArticleOutput.render()
+- CsvArticleOutput.render_to_file()
+
+"""
+
+# six imports - support Pythons 2 and 3
+from six import StringIO
+
+# django imports
+import django.test
+
+# context_text imports
+from context_text.export.csv_article_output import CsvArticleOutput
+from context_text.models import Article_Data
+from context_text.tests.test_helper import TestHelper
+
+
+class CsvArticleOutputTest( django.test.TestCase ):
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> Constants-ish
+    #----------------------------------------------------------------------------
+
+
+    # DEBUG
+    DEBUG = False
+
+    # CLASS NAME
+    CLASS_NAME = "CsvArticleOutputTest"
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> instance methods - setup
+    #----------------------------------------------------------------------------
+
+
+    def setUp( self ):
+
+        """
+        setup tasks.  Call function that we'll re-use.
+        """
+
+        # call TestHelper.standardSetUp()
+        TestHelper.standardSetUp( self, fixture_list_IN = TestHelper.EXPORT_FIXTURE_LIST )
+
+    #-- END function setUp() --#
+
+
+    def make_csv_output( self, output_type_IN ):
+
+        '''
+        Returns CsvArticleOutput for all Article_Data, with small chunk size
+           so iteration crosses chunk boundaries.
+        '''
+
+        # return reference
+        csv_output_OUT = None
+
+        csv_output_OUT = CsvArticleOutput()
+        csv_output_OUT.set_output_type( output_type_IN )
+        csv_output_OUT.set_query_set( Article_Data.objects.all().order_by( "id" ) )
+        csv_output_OUT.iterator_chunk_size = 2
+
+        return csv_output_OUT
+
+    #-- END method make_csv_output() --#
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> instance methods - tests
+    #----------------------------------------------------------------------------
+
+
+    def test_compute_max_counts( self ):
+
+        # declare variables
+        me = "test_compute_max_counts"
+        csv_output = None
+        max_dict = None
+        article_data = None
+        expected_dict = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        # expected - loop and count, the way render() used to.
+        expected_dict = { "max_topics" : -1, "max_locations" : -1, "max_authors" : -1, "max_sources" : -1 }
+        for article_data in Article_Data.objects.all():
+
+            expected_dict[ "max_topics" ] = max( expected_dict[ "max_topics" ], article_data.topics.count() )
+            expected_dict[ "max_locations" ] = max( expected_dict[ "max_locations" ], article_data.locations.count() )
+            expected_dict[ "max_authors" ] = max( expected_dict[ "max_authors" ], article_data.article_author_set.count() )
+            expected_dict[ "max_sources" ] = max( expected_dict[ "max_sources" ], article_data.get_quoted_article_sources_qs().count() )
+
+        #-- END loop over Article_Data --#
+
+        csv_output = self.make_csv_output( CsvArticleOutput.ARTICLE_OUTPUT_TYPE_ARTICLE_PER_LINE )
+        max_dict = csv_output.compute_max_counts()
+        self.assertEqual( max_dict, expected_dict )
+        self.assertEqual( csv_output.max_sources, expected_dict[ "max_sources" ] )
+
+        # nothing there - -1.
+        csv_output.query_set = Article_Data.objects.filter( pk = -1 )
+        self.assertEqual( csv_output.compute_max_counts()[ "max_authors" ], -1 )
+
+    #-- END test method test_compute_max_counts() --#
+
+
+    def test_iterate_csv_lines( self ):
+
+        # declare variables
+        me = "test_iterate_csv_lines"
+        output_type = ""
+        output_type_label = ""
+        csv_output = None
+        line_list = None
+        output_file = None
+        article_count = -1
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        article_count = Article_Data.objects.all().count()
+
+        for output_type, output_type_label in CsvArticleOutput.OUTPUT_TYPE_CHOICES_LIST:
+
+            # header, then one piece per article.
+            csv_output = self.make_csv_output( output_type )
+            line_list = list( csv_output.iterate_csv_lines() )
+            self.assertEqual( len( line_list ), article_count + 1, msg = output_type )
+
+            # same as render().
+            self.assertEqual( "".join( line_list ), self.make_csv_output( output_type ).render(), msg = output_type )
+
+            # and render_to_file().
+            output_file = StringIO()
+            self.assertEqual( self.make_csv_output( output_type ).render_to_file( output_file ), article_count )
+            self.assertEqual( output_file.getvalue(), "".join( line_list ), msg = output_type )
+
+        #-- END loop over output types --#
+
+    #-- END test method test_iterate_csv_lines() --#
+
+
+#-- END test class CsvArticleOutputTest --#
@@ -0,0 +1,595 @@
+"""
+This file contains tests of the context_text NetworkDataOutput sparse relation
+   matrix and the network data output types that render from it.
+
+Functions tested:
+
+- SparseRelationMatrix.build()
+- NDO_CSVMatrix.render_network_data()
+- NDO_EdgeList.render_network_data()
+- NDO_MatrixMarket.render_network_data()
+- NDO_SimpleMatrix.create_network_string()
+- NDO_SparseBinary.render_network_data()
+- NetworkDataOutput.get_node_table()
+- NetworkDataOutput.render() - bulk-loaded vs. per-Article_Data queries.
+- NetworkDataOutput.process_network_ties() - precomputed ties vs. render().
+- Article_Data_Network_Tie.defer_updates() and request_update().
+- Article_Data_Network_Tie.get_article_data_missing_ties_qs() and
+    update_in_batches(), and the backfill_network_ties command - render()
+    falls back to authors and sources when ties are missing.
+
+"""
+
+# python imports
+import io
+import os
+import shutil
+import tempfile
+import timeit
+import unittest
+
+# numpy, scipy, and pyarrow - optional (requirements-sparse-binary.txt), so
+#    test_sparse_binary_output() is skipped if they aren't installed.
+try:
+
+    import numpy
+    import pyarrow.parquet
+    import scipy.io
+    import scipy.sparse
+
+except ImportError:
+
+    numpy = None
+    pyarrow = None
+    scipy = None
+
+#-- END try...except around numpy, scipy, and pyarrow imports --#
+
+# django imports
+from django.core.management import call_command
+from django.db import connection
+import django.test
+from django.test.utils import CaptureQueriesContext
+
+# context_text imports
+from context_text.export.ndo_csv_matrix import NDO_CSVMatrix
+from context_text.export.ndo_edge_list import NDO_EdgeList
+from context_text.export.ndo_matrix_market import NDO_MatrixMarket
+from context_text.export.ndo_simple_matrix import NDO_SimpleMatrix
+from context_text.export.ndo_sparse_binary import NDO_SparseBinary
+from context_text.export.network_data_output import NetworkDataOutput
+from context_text.export.network_node_table import NetworkNodeTable
+from context_text.export.sparse_relation_matrix import SparseRelationMatrix
+from context_text.models import Article_Data
+from context_text.models import Article_Data_Network_Tie
+from context_text.models import Article_Subject
+from context_text.models import Person
+from context_text.tests.test_helper import TestHelper
+
+
+class NetworkDataOutputTest( django.test.TestCase ):
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> Constants-ish
+    #----------------------------------------------------------------------------
+
+
+    # DEBUG
+    DEBUG = False
+
+    # CLASS NAME
+    CLASS_NAME = "NetworkDataOutputTest"
+
+    # test network - 30 and 10 are authors who quoted source 20, person 40 is
+    #    in the person dictionary but has no ties.
+    TEST_PERSON_ID_LIST = [ 40, 30, 20, 10 ]
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> instance methods - setup
+    #----------------------------------------------------------------------------
+
+
+    def setUp( self ):
+
+        """
+        setup tasks.  Call function that we'll re-use.
+        """
+
+        # call TestHelper.standardSetUp()
+        TestHelper.standardSetUp( self, fixture_list_IN = TestHelper.EXPORT_FIXTURE_LIST )
+
+    #-- END function setUp() --#
+
+
+    def init_ndo( self, ndo_IN, data_output_type_IN = NetworkDataOutput.NETWORK_DATA_OUTPUT_TYPE_NETWORK ):
+
+        '''
+        Loads test network into the NetworkDataOutput instance passed in.
+        '''
+
+        # declare variables
+        person_id = None
+
+        # people
+        ndo_IN.person_dictionary = {}
+        for person_id in self.TEST_PERSON_ID_LIST:
+
+            ndo_IN.person_dictionary[ person_id ] = person_id
+
+        #-- END loop over people --#
+
+        # ties
+        ndo_IN.add_reciprocal_relation( 30, 20 )
+        ndo_IN.add_reciprocal_relation( 10, 20 )
+        ndo_IN.add_reciprocal_relation( 10, 20 )
+
+        # types
+        ndo_IN.update_person_type( 10, NetworkDataOutput.PERSON_TYPE_AUTHOR )
+        ndo_IN.update_person_type( 30, NetworkDataOutput.PERSON_TYPE_AUTHOR )
+        ndo_IN.update_person_type( 20, NetworkDataOutput.PERSON_TYPE_SOURCE )
+
+        ndo_IN.data_output_type = data_output_type_IN
+        ndo_IN.generate_master_person_list()
+
+        return ndo_IN
+
+    #-- END method init_ndo() --#
+
+
+    def render_fixture_network( self, use_bulk_load_IN, use_precomputed_ties_IN = False ):
+
+        '''
+        Renders a CSV matrix of the network in the export fixture data, with
+           bulk loading of authors and sources either on or off, or from
+           precomputed ties.  Returns tuple of ( rendered network, number of
+           queries, seconds elapsed ).
+        '''
+
+        # declare variables
+        ndo = None
+        network_string = None
+        query_count = None
+        start_time = None
+        elapsed_seconds = None
+        person_instance = None
+
+        # set up NDO
+        ndo = NDO_CSVMatrix()
+        ndo.use_bulk_load = use_bulk_load_IN
+        ndo.use_precomputed_ties = use_precomputed_ties_IN
+        ndo.data_output_type = NetworkDataOutput.NETWORK_DATA_OUTPUT_TYPE_NET_AND_ATTR_COLS
+        ndo.set_query_set( Article_Data.objects.all().order_by( "id" ) )
+        ndo.set_person_dictionary( { person_instance.id : person_instance for person_instance in Person.objects.all() } )
+
+        # render, counting queries and timing.
+        with CaptureQueriesContext( connection ) as captured_queries:
+
+            start_time = timeit.default_timer()
+            network_string = ndo.render()
+            elapsed_seconds = timeit.default_timer() - start_time
+
+        #-- END with CaptureQueriesContext --#
+
+        query_count = len( captured_queries )
+
+        return network_string, query_count, elapsed_seconds
+
+    #-- END method render_fixture_network() --#
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> instance methods - tests
+    #----------------------------------------------------------------------------
+
+
+    def test_dense_matrix_output( self ):
+
+        # declare variables
+        me = "test_dense_matrix_output"
+        ndo = None
+        network_string = None
+        csv_string = None
+
+        print( '\n====> In {}.{}'.format( self.CLASS_NAME, me ) )
+
+        # simple matrix
+        ndo = self.init_ndo( NDO_SimpleMatrix() )
+        network_string = ndo.create_network_string()
+        self.assertEqual( network_string, "  0  2  0  0\n  2  0  1  0\n  0  1  0  0\n  0  0  0  0\n" )
+
+        # CSV matrix
+        ndo = self.init_ndo( NDO_CSVMatrix() )
+        csv_string = ndo.render_network_data()
+        self.assertIn( "1__10__author-2,0,2,0,0", csv_string )
+        self.assertIn( "4__40__unknown-1,0,0,0,0", csv_string )
+
+    #-- END test method test_dense_matrix_output() --#
+
+
+    def test_edge_list_output( self ):
+
+        # declare variables
+        me = "test_edge_list_output"
+        ndo = None
+        line_list = None
+
+        print( '\n====> In {}.{}'.format( self.CLASS_NAME, me ) )
+
+        # just network
+        ndo = self.init_ndo( NDO_EdgeList() )
+        line_list = ndo.render_network_data().splitlines()
+        self.assertEqual( line_list[ 0 ], "from_person_id,to_person_id,tie_count" )
+        self.assertEqual( line_list[ 1: ], [ "10,20,2", "20,10,2", "20,30,1", "30,20,1" ] )
+
+        # network with attribute columns
+        ndo = self.init_ndo( NDO_EdgeList(), NetworkDataOutput.NETWORK_DATA_OUTPUT_TYPE_NET_AND_ATTR_COLS )
+        line_list = ndo.render_network_data().splitlines()
+        self.assertEqual( line_list[ 1 ], "10,20,2,2,3" )
+
+        # network with node table - includes isolate.
+        ndo = self.init_ndo( NDO_EdgeList(), NetworkDataOutput.NETWORK_DATA_OUTPUT_TYPE_NET_AND_ATTR_ROWS )
+        line_list = ndo.render_network_data().splitlines()
+        self.assertIn( "person_id,person_type", line_list )
+        self.assertEqual( line_list[ -1 ], "40,1" )
+
+    #-- END test method test_edge_list_output() --#
+
+
+    def test_matrix_market_output( self ):
+
+        # declare variables
+        me = "test_matrix_market_output"
+        ndo = None
+        line_list = None
+
+        print( '\n====> In {}.{}'.format( self.CLASS_NAME, me ) )
+
+        ndo = self.init_ndo( NDO_MatrixMarket() )
+        line_list = ndo.render_network_data().splitlines()
+        self.assertEqual( line_list[ 0 ], NDO_MatrixMarket.MATRIX_MARKET_BANNER )
+        self.assertIn( "% 4 4__40__unknown-1", line_list )
+        self.assertEqual( line_list[ -5: ], [ "4 4 4", "1 2 2", "2 1 2", "2 3 1", "3 2 1" ] )
+
+    #-- END test method test_matrix_market_output() --#
+
+
+    def test_node_table( self ):
+
+        # declare variables
+        me = "test_node_table"
+        ndo = None
+        node_table = None
+        current_node = None
+
+        print( '\n====> In {}.{}'.format( self.CLASS_NAME, me ) )
+
+        ndo = self.init_ndo( NDO_CSVMatrix() )
+        node_table = ndo.get_node_table()
+
+        # built once, then reused.
+        self.assertIs( ndo.get_node_table(), node_table )
+        self.assertEqual( node_table.person_id_list, ( 10, 20, 30, 40 ) )
+        self.assertEqual( node_table.person_type_list, ( "author", "source", "author", "unknown" ) )
+        self.assertEqual( list( node_table.person_type_id_array ), [ 2, 3, 2, 1 ] )
+        self.assertEqual( node_table.label_list[ 0 ], "10__author-2" )
+        self.assertEqual( node_table.get_index( 30 ), 2 )
+        self.assertEqual( node_table.get_index( 99 ), None )
+
+        # rows use __slots__, table is read-only.
+        current_node = node_table.get_node( 40 )
+        self.assertEqual( current_node.index, 3 )
+        self.assertEqual( current_node.label, "40__unknown-1" )
+        self.assertFalse( hasattr( current_node, "__dict__" ) )
+        with self.assertRaises( AttributeError ):
+            node_table.label_list = ()
+
+        # ...and so is what it holds.
+        with self.assertRaises( TypeError ):
+            node_table.person_id_to_index_dict[ 99 ] = 4
+        with self.assertRaises( TypeError ):
+            node_table.person_type_id_array[ 0 ] = 3
+        with self.assertRaises( AttributeError ):
+            current_node.label = "40__source-3"
+        self.assertEqual( node_table.get_index( 99 ), None )
+        self.assertEqual( node_table.get_node( 40 ).label, "40__unknown-1" )
+
+        # emitters and getters read from it.
+        self.assertEqual( ndo.create_label_list(), [ "1__10__author-2", "2__20__source-3", "3__30__author-2", "4__40__unknown-1" ] )
+        self.assertEqual( ndo.create_person_id_list( False ), [ 10, 20, 30, 40 ] )
+        self.assertEqual( ndo.create_person_type_id_list( True ), [ "2", "3", "2", "1" ] )
+        self.assertEqual( ndo.get_person_label( 20 ), "20__source-3" )
+        self.assertEqual( ndo.get_person_type_id( 99 ), 1 )
+
+        # type change - table rebuilt.
+        ndo.update_person_type( 40, NetworkDataOutput.PERSON_TYPE_SOURCE )
+        self.assertIsNone( ndo.node_table )
+        self.assertEqual( ndo.get_person_type_id( 40 ), 3 )
+        self.assertEqual( ndo.get_node_table().label_list[ 3 ], "40__source-3" )
+        self.assertIsInstance( ndo.node_table, NetworkNodeTable )
+
+    #-- END test method test_node_table() --#
+
+
+    def test_render_bulk_load( self ):
+
+        # declare variables
+        me = "test_render_bulk_load"
+        article_data_count = None
+        legacy_network = None
+        legacy_query_count = None
+        legacy_seconds = None
+        bulk_network = None
+        bulk_query_count = None
+        bulk_seconds = None
+        error_string = None
+
+        print( '\n====> In {}.{}'.format( self.CLASS_NAME, me ) )
+
+        article_data_count = Article_Data.objects.all().count()
+
+        # render both ways.
+        legacy_network, legacy_query_count, legacy_seconds = self.render_fixture_network( False )
+        bulk_network, bulk_query_count, bulk_seconds = self.render_fixture_network( True )
+
+        # benchmark output
+        print( "- Article_Data count: {}".format( article_data_count ) )
+        print( "- per-Article_Data queries: {} queries, {:.4f} seconds".format( legacy_query_count, legacy_seconds ) )
+        print( "- bulk load: {} queries, {:.4f} seconds".format( bulk_query_count, bulk_seconds ) )
+
+        # same network either way.
+        error_string = "Bulk-loaded network differs from network built with per-Article_Data queries."
+        self.assertEqual( bulk_network, legacy_network, msg = error_string )
+
+        # bulk load: Article_Data, authors, and sources - 3 queries,
+        #    regardless of how many Article_Data.
+        error_string = "Bulk load should take 3 queries, took {}.".format( bulk_query_count )
+        self.assertEqual( bulk_query_count, 3, msg = error_string )
+        self.assertLessEqual( bulk_query_count, legacy_query_count )
+
+    #-- END test method test_render_bulk_load() --#
+
+
+    def test_render_precomputed_ties( self ):
+
+        # declare variables
+        me = "test_render_precomputed_ties"
+        tie_count = None
+        article_subject = None
+        article_data_id = None
+        legacy_network = None
+        legacy_query_count = None
+        legacy_seconds = None
+        precomputed_network = None
+        precomputed_query_count = None
+        precomputed_seconds = None
+        error_string = None
+
+        print( '\n====> In {}.{}'.format( self.CLASS_NAME, me ) )
+
+        # fixtures are loaded without calling save(), so build ties.
+        tie_count = Article_Data_Network_Tie.update_for_article_data_qs( Article_Data.objects.all() )
+        self.assertEqual( Article_Data_Network_Tie.objects.all().count(), tie_count )
+
+        # render both ways.
+        legacy_network, legacy_query_count, legacy_seconds = self.render_fixture_network( True, False )
+        precomputed_network, precomputed_query_count, precomputed_seconds = self.render_fixture_network( True, True )
+
+        # benchmark output
+        print( "- tie rows: {}".format( tie_count ) )
+        print( "- bulk load: {} queries, {:.4f} seconds".format( legacy_query_count, legacy_seconds ) )
+        print( "- precomputed ties: {} queries, {:.4f} seconds".format( precomputed_query_count, precomputed_seconds ) )
+
+        # same network either way.
+        error_string = "Network built from precomputed ties differs from network built from authors and sources."
+        self.assertEqual( precomputed_network, legacy_network, msg = error_string )
+
+        # deleting a quoted source should update its Article_Data's ties.
+        article_subject = Article_Subject.objects.filter( subject_type = Article_Subject.SUBJECT_TYPE_QUOTED, person__isnull = False ).first()
+        if ( article_subject is not None ):
+
+            article_data_id = article_subject.article_data_id
+            article_subject.delete()
+            self.assertEqual( Article_Data_Network_Tie.objects.filter( article_data_id = article_data_id ).count(),
+                              len( Article_Data_Network_Tie.make_ties_for_article_data( article_data_id ) ) )
+
+            # and the networks should still match.
+            legacy_network, legacy_query_count, legacy_seconds = self.render_fixture_network( True, False )
+            precomputed_network, precomputed_query_count, precomputed_seconds = self.render_fixture_network( True, True )
+            self.assertEqual( precomputed_network, legacy_network, msg = error_string )
+
+        #-- END check to see if quoted source --#
+
+    #-- END test method test_render_precomputed_ties() --#
+
+
+    def test_render_precomputed_ties_deferred( self ):
+
+        # declare variables
+        me = "test_render_precomputed_ties_deferred"
+        article_subject_list = None
+        article_data_id = None
+        tie_count = None
+        current_subject = None
+
+        print( '\n====> In {}.{}'.format( self.CLASS_NAME, me ) )
+
+        # fixtures are loaded without calling save(), so build ties.
+        Article_Data_Network_Tie.update_for_article_data_qs( Article_Data.objects.all() )
+
+        # quoted sources of an Article_Data with more than one.
+        article_subject_list = list( Article_Subject.objects.filter( subject_type = Article_Subject.SUBJECT_TYPE_QUOTED, person__isnull = False ).order_by( "article_data_id", "id" ) )
+        article_subject_list = [ current_subject for current_subject in article_subject_list if ( len( [ other_subject for other_subject in article_subject_list if ( other_subject.article_data_id == current_subject.article_data_id ) ] ) > 1 ) ]
+        if ( len( article_subject_list ) > 0 ):
+
+            article_data_id = article_subject_list[ 0 ].article_data_id
+            tie_count = Article_Data_Network_Tie.objects.filter( article_data_id = article_data_id ).count()
+
+            # inside defer_updates(), saves and deletes don't rebuild...
+            with Article_Data_Network_Tie.defer_updates():
+
+                for current_subject in [ current_subject for current_subject in article_subject_list if ( current_subject.article_data_id == article_data_id ) ]:
+
+                    current_subject.save()
+                    current_subject.delete()
+
+                #-- END loop over quoted sources --#
+
+                self.assertEqual( Article_Data_Network_Tie.objects.filter( article_data_id = article_data_id ).count(), tie_count )
+
+            #-- END with deferred tie updates --#
+
+            # ...the Article_Data is rebuilt once at the end.
+            self.assertEqual( Article_Data_Network_Tie.objects.filter( article_data_id = article_data_id ).count(),
+                              len( Article_Data_Network_Tie.make_ties_for_article_data( article_data_id ) ) )
+            self.assertEqual( Article_Data_Network_Tie.objects.filter( article_data_id = article_data_id, tie_type = Article_Data_Network_Tie.TIE_TYPE_SOURCE ).count(), 0 )
+
+        #-- END check to see if quoted sources --#
+
+        # outside defer_updates(), request_update() rebuilds right away.
+        article_data_id = Article_Data.objects.order_by( "id" ).values_list( "id", flat = True ).first()
+        Article_Data_Network_Tie.objects.filter( article_data_id = article_data_id ).delete()
+        tie_count = Article_Data_Network_Tie.request_update( article_data_id )
+        self.assertEqual( Article_Data_Network_Tie.objects.filter( article_data_id = article_data_id ).count(), tie_count )
+
+    #-- END test method test_render_precomputed_ties_deferred() --#
+
+
+    def test_render_precomputed_ties_missing( self ):
+
+        # declare variables
+        me = "test_render_precomputed_ties_missing"
+        author_article_data_count = None
+        legacy_network = None
+        precomputed_network = None
+        query_count = None
+        elapsed_seconds = None
+        result_dict = None
+        article_data_id = None
+        command_output = None
+        error_string = None
+
+        print( '\n====> In {}.{}'.format( self.CLASS_NAME, me ) )
+
+        # fixtures are loaded without calling save(), so no ties yet.
+        author_article_data_count = Article_Data.objects.filter( article_author__person__isnull = False ).distinct().count()
+        self.assertGreater( author_article_data_count, 0 )
+        self.assertEqual( Article_Data_Network_Tie.get_article_data_missing_ties_qs( Article_Data.objects.all() ).count(), author_article_data_count )
+
+        # precomputed falls back to authors and sources rather than render an
+        #    empty network.
+        error_string = "Network built with missing precomputed ties differs from network built from authors and sources."
+        legacy_network, query_count, elapsed_seconds = self.render_fixture_network( True, False )
+        precomputed_network, query_count, elapsed_seconds = self.render_fixture_network( True, True )
+        self.assertEqual( precomputed_network, legacy_network, msg = error_string )
+
+        # backfill in batches.
+        result_dict = Article_Data_Network_Tie.update_in_batches( batch_size_IN = 2 )
+        self.assertEqual( result_dict[ "checked" ], Article_Data.objects.all().count() )
+        self.assertEqual( result_dict[ "created" ], Article_Data_Network_Tie.objects.all().count() )
+        self.assertEqual( Article_Data_Network_Tie.get_article_data_missing_ties_qs( Article_Data.objects.all() ).count(), 0 )
+        precomputed_network, query_count, elapsed_seconds = self.render_fixture_network( True, True )
+        self.assertEqual( precomputed_network, legacy_network, msg = error_string )
+
+        # lose one Article_Data's ties, command only rebuilds that one.
+        article_data_id = Article_Data.objects.filter( article_author__person__isnull = False ).order_by( "id" ).values_list( "id", flat = True ).first()
+        Article_Data_Network_Tie.objects.filter( article_data_id = article_data_id ).delete()
+        self.assertEqual( list( Article_Data_Network_Tie.get_article_data_missing_ties_qs( Article_Data.objects.all() ).values_list( "id", flat = True ) ), [ article_data_id ] )
+        command_output = io.StringIO()
+        call_command( "backfill_network_ties", "--missing-only", "--batch-size", "2", stdout = command_output )
+        self.assertIn( "Checked 1 Article_Data", command_output.getvalue() )
+        self.assertEqual( Article_Data_Network_Tie.get_article_data_missing_ties_qs( Article_Data.objects.all() ).count(), 0 )
+        self.assertEqual( Article_Data_Network_Tie.objects.filter( article_data_id = article_data_id ).count(),
+                          len( Article_Data_Network_Tie.make_ties_for_article_data( article_data_id ) ) )
+
+    #-- END test method test_render_precomputed_ties_missing() --#
+
+
+    @unittest.skipIf( ( ( numpy is None ) or ( scipy is None ) or ( pyarrow is None ) ), "numpy, scipy, or pyarrow not installed (requirements-sparse-binary.txt)" )
+    def test_sparse_binary_output( self ):
+
+        # declare variables
+        me = "test_sparse_binary_output"
+        expected_matrix = None
+        ndo = None
+        output_directory = None
+        result_string = None
+        npz_file = None
+        edge_table = None
+
+        print( '\n====> In {}.{}'.format( self.CLASS_NAME, me ) )
+
+        expected_matrix = [ [ 0, 2, 0, 0 ], [ 2, 0, 1, 0 ], [ 0, 1, 0, 0 ], [ 0, 0, 0, 0 ] ]
+
+        # a quarter of the cells have ties - dense at default threshold.
+        ndo = self.init_ndo( NDO_SparseBinary() )
+        self.assertIsInstance( ndo.build_adjacency_matrix(), numpy.ndarray )
+        self.assertEqual( ndo.build_adjacency_matrix().tolist(), expected_matrix )
+
+        # sparse, written to files.
+        output_directory = tempfile.mkdtemp()
+        try:
+
+            ndo.dense_threshold = 0.5
+            ndo.output_directory = output_directory
+            ndo.network_label = "Test Network"
+            self.assertTrue( scipy.sparse.issparse( ndo.build_adjacency_matrix() ) )
+            result_string = ndo.render_network_data()
+            self.assertEqual( len( result_string.splitlines() ), 3 )
+            self.assertEqual( ndo.output_path_dict[ NDO_SparseBinary.FILE_FORMAT_NPZ ], os.path.join( output_directory, "test-network.npz" ) )
+
+            # npz - readable by scipy, plus node attributes.
+            self.assertEqual( scipy.sparse.load_npz( ndo.output_path_dict[ NDO_SparseBinary.FILE_FORMAT_NPZ ] ).toarray().tolist(), expected_matrix )
+            npz_file = numpy.load( ndo.output_path_dict[ NDO_SparseBinary.FILE_FORMAT_NPZ ] )
+            self.assertEqual( npz_file[ NDO_SparseBinary.NPZ_ARRAY_PERSON_ID ].tolist(), [ 10, 20, 30, 40 ] )
+            self.assertEqual( npz_file[ NDO_SparseBinary.NPZ_ARRAY_PERSON_TYPE_ID ].tolist(), [ 2, 3, 2, 1 ] )
+            npz_file.close()
+
+            # Matrix Market
+            self.assertEqual( scipy.io.mmread( ndo.output_path_dict[ NDO_SparseBinary.FILE_FORMAT_MATRIX_MARKET ] ).toarray().tolist(), expected_matrix )
+
+            # Parquet edge list, with person types.
+            edge_table = pyarrow.parquet.read_table( ndo.output_path_dict[ NDO_SparseBinary.FILE_FORMAT_PARQUET ] ).to_pydict()
+            self.assertEqual( edge_table[ NDO_SparseBinary.COLUMN_FROM_PERSON_ID ], [ 10, 20, 20, 30 ] )
+            self.assertEqual( edge_table[ NDO_SparseBinary.COLUMN_TO_PERSON_ID ], [ 20, 10, 30, 20 ] )
+            self.assertEqual( edge_table[ NDO_SparseBinary.COLUMN_TIE_COUNT ], [ 2, 2, 1, 1 ] )
+            self.assertEqual( edge_table[ NDO_SparseBinary.COLUMN_FROM_PERSON_TYPE ], [ "author", "source", "source", "author" ] )
+
+        finally:
+
+            shutil.rmtree( output_directory )
+
+        #-- END try...finally around output directory --#
+
+    #-- END test method test_sparse_binary_output() --#
+
+
+    def test_sparse_relation_matrix( self ):
+
+        # declare variables
+        me = "test_sparse_relation_matrix"
+        relation_map = None
+        sparse_matrix = None
+
+        print( '\n====> In {}.{}'.format( self.CLASS_NAME, me ) )
+
+        # person 99 is not in network, so tie to them should be ignored.
+        relation_map = { 3 : { 1 : 2, 99 : 5 }, 1 : { 3 : 2 } }
+        sparse_matrix = SparseRelationMatrix( relation_map, [ 3, 2, 1 ] )
+
+        self.assertEqual( sparse_matrix.node_id_list, [ 1, 2, 3 ] )
+        self.assertEqual( sparse_matrix.get_index_for_person_id( 3 ), 2 )
+        self.assertEqual( sparse_matrix.get_index_for_person_id( 99 ), None )
+        self.assertEqual( sparse_matrix.row_pointer_list, [ 0, 1, 1, 2 ] )
+        self.assertEqual( sparse_matrix.column_index_list, [ 2, 0 ] )
+        self.assertEqual( sparse_matrix.value_list, [ 2, 2 ] )
+        self.assertEqual( sparse_matrix.get_edge_count(), 2 )
+        self.assertEqual( list( sparse_matrix.iterate_edges() ), [ ( 0, 2, 2 ), ( 2, 0, 2 ) ] )
+        self.assertEqual( sparse_matrix.get_dense_row( 1 ), [ 0, 0, 0 ] )
+        self.assertEqual( sparse_matrix.get_dense_row( 2 ), [ 2, 0, 0 ] )
+
+    #-- END test method test_sparse_relation_matrix() --#
+
+
+#-- END test class NetworkDataOutputTest --#
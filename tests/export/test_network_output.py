@@ -0,0 +1,167 @@
+"""
+This file contains tests of the context_text NetworkOutput duplicate
+   Article_Data removal.
+
+Functions tested:
+
+- NetworkOutput.make_coder_rank_expression()
+- NetworkOutput.remove_duplicate_article_data()
+- NetworkOutput.remove_duplicate_article_data_in_database()
+- NetworkOutput.remove_duplicate_article_data_in_python()
+
+"""
+
+# django imports
+from django.db import connection
+import django.test
+from django.test.utils import CaptureQueriesContext
+
+# context_text imports
+from context_text.data.synthetic_corpus import SyntheticCorpus
+from context_text.export.network_output import NetworkOutput
+from context_text.models import Article_Data
+from context_text.shared.context_text_base import ContextTextBase
+from context_text.tests.test_helper import TestHelper
+
+
+class NetworkOutputTest( django.test.TestCase ):
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> Constants-ish
+    #----------------------------------------------------------------------------
+
+
+    # DEBUG
+    DEBUG = False
+
+    # CLASS NAME
+    CLASS_NAME = "NetworkOutputTest"
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> instance methods - setup
+    #----------------------------------------------------------------------------
+
+
+    def setUp( self ):
+
+        """
+        setup tasks.  Call function that we'll re-use, then make a small
+            corpus where every tenth article is coded twice.
+        """
+
+        # call TestHelper.standardSetUp()
+        TestHelper.standardSetUp( self )
+
+        self.corpus = SyntheticCorpus( article_count_IN = 25, newspaper_count_IN = 1, person_count_IN = 10, seed_IN = 3 )
+        self.corpus.create()
+
+        self.automated_coder = self.corpus.coder_list[ 0 ]
+        self.manual_coder = self.corpus.coder_list[ 1 ]
+        self.article_data_qs = Article_Data.objects.filter( article__in = self.corpus.article_list ).order_by( "id" )
+
+    #-- END function setUp() --#
+
+
+    def get_coder_id_by_article( self, query_set_IN ):
+
+        '''
+        Returns dictionary that maps article ID to list of coder IDs of the
+            Article_Data for it in the query set passed in.
+        '''
+
+        # return reference
+        dict_OUT = {}
+
+        # declare variables
+        article_id = None
+        coder_id = None
+
+        for article_id, coder_id in query_set_IN.values_list( "article_id", "coder_id" ):
+
+            dict_OUT.setdefault( article_id, [] ).append( coder_id )
+
+        #-- END loop over article data --#
+
+        return dict_OUT
+
+    #-- END method get_coder_id_by_article() --#
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> instance methods - tests
+    #----------------------------------------------------------------------------
+
+
+    def test_remove_duplicate_article_data( self ):
+
+        # declare variables
+        me = "test_remove_duplicate_article_data"
+        network_outputter = None
+        rank_dict = None
+        database_qs = None
+        python_qs = None
+        coder_dict = None
+        article_id = None
+        coder_id_list = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        # three articles coded twice.
+        self.assertEqual( self.article_data_qs.count(), 25 + 3 )
+
+        network_outputter = NetworkOutput()
+
+        # no priorities - one per article, lowest ID (automated) kept.
+        database_qs = network_outputter.remove_duplicate_article_data_in_database( self.article_data_qs )
+        python_qs = network_outputter.remove_duplicate_article_data_in_python( self.article_data_qs )
+        self.assertEqual( database_qs.count(), 25 )
+        self.assertEqual( list( database_qs.values_list( "id", flat = True ) ), list( python_qs.values_list( "id", flat = True ) ) )
+        self.assertEqual( database_qs.filter( coder = self.manual_coder ).count(), 0 )
+
+        # manual coder first - their coding wins where there is some.
+        rank_dict = { self.manual_coder.id : 0, self.automated_coder.id : 1 }
+        with CaptureQueriesContext( connection ) as captured_queries:
+
+            database_qs = network_outputter.remove_duplicate_article_data_in_database( self.article_data_qs, rank_dict )
+
+        #-- END with CaptureQueriesContext --#
+
+        # nothing run until evaluated - filtered with a subquery, not a list
+        #     of IDs.
+        self.assertEqual( len( captured_queries ), 0 )
+
+        python_qs = network_outputter.remove_duplicate_article_data_in_python( self.article_data_qs, rank_dict )
+        self.assertEqual( list( database_qs.values_list( "id", flat = True ) ), list( python_qs.values_list( "id", flat = True ) ) )
+        self.assertEqual( database_qs.filter( coder = self.manual_coder ).count(), 3 )
+
+        coder_dict = self.get_coder_id_by_article( database_qs )
+        self.assertEqual( len( coder_dict ), 25 )
+        for article_id, coder_id_list in coder_dict.items():
+
+            self.assertEqual( len( coder_id_list ), 1 )
+
+        #-- END loop over articles --#
+
+        # coder not in priorities - ranked after those that are.
+        rank_dict = { self.manual_coder.id : 0 }
+        database_qs = network_outputter.remove_duplicate_article_data_in_database( self.article_data_qs, rank_dict )
+        self.assertEqual( database_qs.filter( coder = self.manual_coder ).count(), 3 )
+        self.assertEqual( database_qs.count(), 25 )
+
+        # through parameters.
+        network_outputter.store_parameters( { NetworkOutput.PARAM_DEDUPLICATE_IN_PYTHON : ContextTextBase.CHOICE_YES } )
+        with CaptureQueriesContext( connection ) as captured_queries:
+
+            python_qs = network_outputter.remove_duplicate_article_data( self.article_data_qs, "" )
+
+        #-- END with CaptureQueriesContext --#
+
+        self.assertEqual( len( captured_queries ), 1 )
+        self.assertEqual( python_qs.count(), 25 )
+
+    #-- END test method test_remove_duplicate_article_data() --#
+
+
+#-- END test class NetworkOutputTest --#
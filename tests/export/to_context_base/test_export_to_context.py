@@ -1663,4 +1663,72 @@ class ExportToContextTest( django.test.TestCase ):
     #-- END method test_process_articles()
 
 
+    def test_process_articles_in_batches( self ):
+        
+        '''
+        - call process_articles_in_batches() with batch size 1, so more than
+            one batch.
+        - check relations, same as test_process_articles().
+        - call it again, make sure no relations are duplicated.
+        '''
+        
+        # declare variables
+        me = "test_process_articles_in_batches"
+        export_instance = None
+        error_string = None
+        article_qs = None
+        article_id = None
+        create_status = None
+        relation_count = None
+        test_value = None
+        should_be = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+        
+        # init
+        export_instance = ExportToContext()
+        export_instance.progress_interval = 1
+        article_qs = Article.objects.filter( id__in = self.TEST_ID_LIST )
+        
+        # ! ----> call the process_articles_in_batches() method.
+        create_status = export_instance.process_articles_in_batches( article_qs, tag_articles_IN = True, batch_size_IN = 1 )
+        
+        # success?
+        test_value = create_status.is_success()
+        should_be = True
+        error_string = "Calling process_articles_in_batches() for article ID list {}.  Success?: {}, should be {}.".format( self.TEST_ID_LIST, test_value, should_be )
+        self.assertEqual( test_value, should_be, msg = error_string )
+        
+        # writer is cleared when done.
+        self.assertIsNone( export_instance.relation_writer )
+
+        # validate relations.
+        for article_id in self.TEST_ID_LIST:
+        
+            self.validate_article_newspaper_relations( article_id )
+            self.validate_article_article_relations( article_id )
+    
+        #-- END loop over articles. --#
+        
+        relation_count = Entity_Relation.objects.count()
+                        
+        # ! ----> call it again - duplicates?
+        create_status = export_instance.process_articles_in_batches( article_qs, tag_articles_IN = True )
+        self.assertEqual( create_status.is_success(), True )
+        
+        test_value = Entity_Relation.objects.count()
+        should_be = relation_count
+        error_string = "After calling process_articles_in_batches() again, {} relations, should be {}.".format( test_value, should_be )
+        self.assertEqual( test_value, should_be, msg = error_string )
+
+        for article_id in self.TEST_ID_LIST:
+        
+            self.validate_article_newspaper_relations( article_id )
+            self.validate_article_article_relations( article_id )
+    
+        #-- END loop over articles. --#
+
+    #-- END method test_process_articles_in_batches()
+
+
 #-- END test class ExportToContextTest --#
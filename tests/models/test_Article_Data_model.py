@@ -2,6 +2,7 @@
 This file contains tests of the context_text Article_Data model.
 
 Functions tested:
+- @classmethod Article_Data.make_deep_copies()
 - @classmethod Article_Data.make_deep_copy()
 """
 
@@ -857,6 +858,49 @@ class Article_DataModelTest( django.test.TestCase ):
     #-- END test method test_article_data_deep_copy() --# 
 
 
+    def test_article_data_deep_copies( self ):
+        
+        # declare variables
+        me = "test_article_data_deep_copies"
+        original_article_data_id_list = None
+        copy_to_coder_user = None
+        copy_to_coder_user_id = -1
+        copy_id_map = None
+        original_article_data_id = -1
+        article_data_copy = None
+        error_message_list = None
+                
+        print( '\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+        
+        # copy a few Article_Data at once.
+        original_article_data_id_list = list( Article_Data.objects.all().order_by( "id" ).values_list( "id", flat = True )[ :5 ] )
+        original_article_data_id_list.append( 74 )
+        
+        # get user to copy to:
+        copy_to_coder_user = ContextTextBase.get_ground_truth_coding_user()
+        copy_to_coder_user_id = copy_to_coder_user.id
+
+        # make copies, small batches.
+        copy_id_map = Article_Data.make_deep_copies( original_article_data_id_list,
+                                                     new_coder_user_id_IN = copy_to_coder_user_id,
+                                                     batch_size_IN = 2 )
+        self.assertEqual( set( copy_id_map.keys() ), set( original_article_data_id_list ) )
+        
+        # and validate each, same as make_deep_copy().
+        for original_article_data_id, article_data_copy in six.iteritems( copy_id_map ):
+        
+            self.assertNotEqual( article_data_copy.id, original_article_data_id )
+            error_message_list = Article_Data_Copy_Tester.validate_article_data_deep_copy( original_article_data_id, article_data_copy.id, copy_to_coder_user_id )
+            self.assertEqual( len( error_message_list ), 0, msg = "Copy of Article_Data ID " + str( original_article_data_id ) + " errors: " + str( error_message_list ) )
+            
+        #-- END loop over copies --#
+        
+        # nothing passed in - nothing copied.
+        self.assertEqual( Article_Data.make_deep_copies( [] ), {} )
+        
+    #-- END test method test_article_data_deep_copies() --# 
+
+
     def test_class_create_q_filter_automated_by_coder_type( self ):
         
         # declare variables
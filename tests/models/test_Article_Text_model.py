@@ -0,0 +1,226 @@
+"""
+This file contains tests of the context_text Article_Text model class.
+
+Functions tested:
+
+- get_paragraph_list(), get_content_sans_html(), get_word_list(),
+    get_word_offset_index() - cached parse products.
+- find_in_word_list()
+- find_in_text_batch()
+- enable_shared_parse_cache()
+
+"""
+
+# django imports
+import django.test
+
+# context_text imports
+from context_text.models import Article_Text
+from context_text.tests.test_helper import TestHelper
+
+
+class Article_TextModelTest( django.test.TestCase ):
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> Constants-ish
+    #----------------------------------------------------------------------------
+
+
+    # DEBUG
+    DEBUG = False
+
+    # CLASS NAME
+    CLASS_NAME = "Article_TextModelTest"
+
+    # test text
+    TEST_TEXT_1 = '<p id="1">The mayor said "no comment." The mayor said it twice.</p>'
+    TEST_TEXT_2 = '<p id="1">A different article.</p><p id="2">Second paragraph.</p>'
+    TEST_TEXT_3 = '<p id="1">The council met Tuesday. "We will vote," said Smith.</p><p id="2">Jones agreed. The council will vote next week.</p>'
+
+    # strings to find in TEST_TEXT_3 - direct matches, multiple matches, a
+    #    quotation that needs punctuation removed, one that spans paragraphs,
+    #    one that isn't there, and a duplicate.
+    TEST_FIND_LIST = [ "The council", "vote", "We will vote", "said Smith. Jones agreed.", "Brown", "The council" ]
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> instance methods - setup
+    #----------------------------------------------------------------------------
+
+
+    def setUp( self ):
+
+        """
+        setup tasks.  Call function that we'll re-use.
+        """
+
+        # call TestHelper.standardSetUp()
+        TestHelper.standardSetUp( self )
+
+    #-- END function setUp() --#
+
+
+    def tearDown( self ):
+
+        # make sure shared cache doesn't leak into other tests.
+        Article_Text.disable_shared_parse_cache()
+
+    #-- END function tearDown() --#
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> instance methods - tests
+    #----------------------------------------------------------------------------
+
+
+    def test_find_in_word_list( self ):
+
+        # declare variables
+        me = "test_find_in_word_list"
+        article_text = None
+        result_dict = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        article_text = Article_Text( content = self.TEST_TEXT_1 )
+
+        # two matches.
+        result_dict = article_text.find_in_word_list( "The mayor said" )
+        self.assertEqual( result_dict[ Article_Text.FIT_FIRST_WORD_NUMBER_LIST ], [ 1, 6 ] )
+        self.assertEqual( result_dict[ Article_Text.FIT_LAST_WORD_NUMBER_LIST ], [ 3, 8 ] )
+
+        # only matches once punctuation is removed.
+        result_dict = article_text.find_in_word_list( "no comment" )
+        self.assertEqual( result_dict[ Article_Text.FIT_FIRST_WORD_NUMBER_LIST ], [ 4 ] )
+        self.assertEqual( result_dict[ Article_Text.FIT_LAST_WORD_NUMBER_LIST ], [ 5 ] )
+
+        # no match.
+        result_dict = article_text.find_in_word_list( "The governor said" )
+        self.assertEqual( result_dict[ Article_Text.FIT_FIRST_WORD_NUMBER_LIST ], [] )
+
+        # no string.
+        self.assertIsNone( article_text.find_in_word_list( "" ) )
+
+    #-- END test method test_find_in_word_list() --#
+
+
+    def test_find_in_text_batch( self ):
+
+        # declare variables
+        me = "test_find_in_text_batch"
+        batch_dict = None
+        find_string = ""
+        expected_dict = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        # batch.
+        batch_dict = Article_Text( content = self.TEST_TEXT_3 ).find_in_text_batch( self.TEST_FIND_LIST + [ "" ] )
+        self.assertEqual( len( batch_dict ), 6 )
+        self.assertIsNone( batch_dict[ "" ] )
+
+        # each should match single-string search on a fresh instance.
+        for find_string in self.TEST_FIND_LIST:
+
+            expected_dict = Article_Text( content = self.TEST_TEXT_3 ).find_in_text( find_string )
+            self.assertEqual( batch_dict[ find_string ], expected_dict, msg = find_string )
+
+        #-- END loop over strings --#
+
+        self.assertEqual( batch_dict[ "The council" ][ Article_Text.FIT_PARAGRAPH_NUMBER_LIST ], [ 1, 2 ] )
+        self.assertEqual( batch_dict[ "Brown" ][ Article_Text.FIT_TEXT_INDEX_LIST ], [] )
+
+        # requested items only.
+        batch_dict = Article_Text( content = self.TEST_TEXT_3 ).find_in_text_batch( [ "vote" ], requested_items_IN = [ Article_Text.FIT_FIRST_WORD_NUMBER_LIST ] )
+        self.assertEqual( list( batch_dict[ "vote" ].keys() ), [ Article_Text.FIT_FIRST_WORD_NUMBER_LIST ] )
+
+    #-- END test method test_find_in_text_batch() --#
+
+
+    def test_parse_cache( self ):
+
+        # declare variables
+        me = "test_parse_cache"
+        article_text = None
+        parse_dict = None
+        paragraph_list = None
+        word_list = None
+        offset_index = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        article_text = Article_Text( content = self.TEST_TEXT_1 )
+
+        # cached results match a fresh parse.
+        paragraph_list = article_text.get_paragraph_list()
+        self.assertEqual( paragraph_list, article_text.parse_paragraph_list() )
+        self.assertEqual( len( paragraph_list ), 1 )
+        word_list = article_text.get_word_list()
+        self.assertEqual( word_list, article_text.parse_word_list() )
+        self.assertEqual( article_text.get_word_list( remove_punctuation_IN = True ), article_text.parse_word_list( remove_punctuation_IN = True ) )
+
+        # second call reuses parse dictionary.
+        parse_dict = article_text.get_parse_cache_dict()
+        self.assertIn( Article_Text.PARSE_CACHE_PARAGRAPH_LIST, parse_dict )
+        self.assertIs( article_text.get_parse_cache_dict(), parse_dict )
+
+        # changing returned list doesn't change cache.
+        paragraph_list.append( "extra" )
+        word_list.pop()
+        self.assertEqual( len( article_text.get_paragraph_list() ), 1 )
+        self.assertEqual( article_text.get_word_list(), article_text.parse_word_list() )
+
+        # offset index.
+        offset_index = article_text.get_word_offset_index()
+        self.assertEqual( offset_index[ "mayor" ], [ 1, 6 ] )
+
+        # set_text() invalidates.
+        article_text.set_text( self.TEST_TEXT_2 )
+        self.assertIsNot( article_text.get_parse_cache_dict(), parse_dict )
+        self.assertEqual( article_text.get_paragraph_list(), [ "A different article.", "Second paragraph." ] )
+        self.assertNotIn( "mayor", article_text.get_word_offset_index() )
+
+        # so does assigning content directly.
+        article_text.content = self.TEST_TEXT_1
+        self.assertEqual( len( article_text.get_paragraph_list() ), 1 )
+        self.assertEqual( article_text.get_word_offset_index()[ "mayor" ], [ 1, 6 ] )
+
+    #-- END test method test_parse_cache() --#
+
+
+    def test_shared_parse_cache( self ):
+
+        # declare variables
+        me = "test_shared_parse_cache"
+        shared_cache = None
+        article_text_1 = None
+        article_text_2 = None
+        article_text_3 = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        shared_cache = Article_Text.enable_shared_parse_cache( max_size_IN = 1 )
+
+        # instances with same content share parse dictionary.
+        article_text_1 = Article_Text( content = self.TEST_TEXT_1 )
+        article_text_2 = Article_Text( content = self.TEST_TEXT_1 )
+        article_text_1.get_paragraph_list()
+        self.assertIs( article_text_1.get_parse_cache_dict(), article_text_2.get_parse_cache_dict() )
+        self.assertEqual( shared_cache.hit_count, 1 )
+
+        # bounded - different content evicts.
+        article_text_3 = Article_Text( content = self.TEST_TEXT_2 )
+        article_text_3.get_paragraph_list()
+        self.assertEqual( len( shared_cache ), 1 )
+
+        # disabled - back to per-instance.
+        Article_Text.disable_shared_parse_cache()
+        article_text_1 = Article_Text( content = self.TEST_TEXT_1 )
+        article_text_2 = Article_Text( content = self.TEST_TEXT_1 )
+        self.assertIsNot( article_text_1.get_parse_cache_dict(), article_text_2.get_parse_cache_dict() )
+
+    #-- END test method test_shared_parse_cache() --#
+
+
+#-- END test class Article_TextModelTest --#
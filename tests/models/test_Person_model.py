@@ -4,6 +4,7 @@ This file contains tests of the context_text Person model (and by extension
 
 Functions tested:
 - Person.look_up_person_from_name()
+- Person.look_up_person_from_name( ..., use_name_keys_IN = True )
 """
 
 # django imports
@@ -1562,6 +1563,87 @@ class PersonModelTest( django.test.TestCase ):
     #-- END test method test_look_up_person_from_name() --#
 
 
+    def test_look_up_person_from_name_name_keys( self ):
+
+        # declare variables
+        me = "test_look_up_person_from_name_name_keys"
+        test_person = None
+        test_qs = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        test_person = Person( first_name = "José", middle_name = "M.J.", last_name = "O'Brien" )
+        test_person.save()
+
+        # default - parent lookup, "__iexact" on the name parts, as before.
+        test_qs = Person.look_up_person_from_name( "josé m.j. o'brien", do_strict_match_IN = True )
+        self.assertEqual( list( test_qs.values_list( "id", flat = True ) ), [ test_person.id ] )
+        test_qs = Person.look_up_person_from_name( "JOSE M.J. OBRIEN", do_strict_match_IN = True )
+        self.assertEqual( test_qs.count(), 0 )
+
+        # name keys - same exact match, and accents and punctuation ignored.
+        test_qs = Person.look_up_person_from_name( "josé m.j. o'brien", do_strict_match_IN = True, use_name_keys_IN = True )
+        self.assertEqual( list( test_qs.values_list( "id", flat = True ) ), [ test_person.id ] )
+        test_qs = Person.look_up_person_from_name( "JOSE M.J. OBRIEN", do_strict_match_IN = True, use_name_keys_IN = True )
+        self.assertEqual( list( test_qs.values_list( "id", flat = True ) ), [ test_person.id ] )
+
+        # initials and phonetic flags do nothing without name keys.
+        test_qs = Person.look_up_person_from_name( "J. M. J. O'Brien", do_initials_match_IN = True, do_phonetic_match_IN = True )
+        self.assertEqual( test_qs.count(), 0 )
+
+    #-- END test method test_look_up_person_from_name_name_keys() --#
+
+
+    def test_name_keys( self ):
+
+        # declare variables
+        me = "test_name_keys"
+        test_person = None
+        test_person_2 = None
+        test_qs = None
+        result_dict = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        # keys set on save.
+        test_person = Person( first_name = "José", middle_name = "M.J.", last_name = "O'Brien" )
+        test_person.save()
+        self.assertEqual( test_person.first_name_key, "jose" )
+        self.assertEqual( test_person.first_initials_key, "j" )
+        self.assertEqual( test_person.middle_name_key, "mj" )
+        self.assertEqual( test_person.middle_initials_key, "mj" )
+        self.assertEqual( test_person.last_name_key, "obrien" )
+        self.assertEqual( test_person.last_name_phonetic_key, "o165" )
+
+        # and kept current on rename.
+        test_person.last_name = "OBryan"
+        test_person.save()
+        self.assertEqual( Person.objects.get( pk = test_person.id ).last_name_key, "obryan" )
+
+        # exact lookup on name keys ignores case, accents, and punctuation.
+        test_qs = Person.look_up_person_from_name( "JOSE M.J. O'BRYAN", do_strict_match_IN = True, use_name_keys_IN = True )
+        self.assertEqual( list( test_qs.values_list( "id", flat = True ) ), [ test_person.id ] )
+
+        # initials and phonetic matches are opt-in.
+        test_qs = Person.look_up_person_from_name( "J. M. J. O'Brien", use_name_keys_IN = True )
+        self.assertEqual( test_qs.count(), 0 )
+        test_qs = Person.look_up_person_from_name( "J. M. J. O'Brien", use_name_keys_IN = True, do_initials_match_IN = True, do_phonetic_match_IN = True )
+        self.assertEqual( list( test_qs.values_list( "id", flat = True ) ), [ test_person.id ] )
+
+        # backfill fixes keys written around save().
+        test_person_2 = Person( first_name = "Ann", last_name = "Smyth" )
+        test_person_2.save()
+        Person.objects.filter( id__in = [ test_person.id, test_person_2.id ] ).update( first_name_key = "", last_name_phonetic_key = "" )
+        result_dict = Person.update_name_keys_in_batches( batch_size_IN = 2 )
+        self.assertEqual( result_dict[ "updated" ], 2 )
+        self.assertEqual( result_dict[ "checked" ], Person.objects.count() )
+        test_person_2 = Person.objects.get( pk = test_person_2.id )
+        self.assertEqual( test_person_2.first_name_key, "ann" )
+        self.assertEqual( test_person_2.last_name_phonetic_key, "s530" )
+
+    #-- END test method test_name_keys() --#
+
+
     def test_update_entity( self ):
         
         # declare variables
@@ -0,0 +1,265 @@
+"""
+This file contains tests of the context_text Temp_Section model class's
+   set-based statistics engine.
+
+Functions tested:
+
+- Temp_Section.build_section_stats_grid()
+- Temp_Section.get_in_house_author_key()
+- Temp_Section.process_section_date_range()
+- Temp_Section.process_section_date_range_day_by_day()
+- Temp_Section.upsert_section_stats()
+
+"""
+
+# python base imports
+import datetime
+from decimal import Decimal
+
+# django imports
+import django.test
+
+# context_text imports
+from context_text.models import Article
+from context_text.models import Temp_Section
+
+
+class Temp_SectionModelTest( django.test.TestCase ):
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> Constants-ish
+    #----------------------------------------------------------------------------
+
+
+    # DEBUG
+    DEBUG = False
+
+    # CLASS NAME
+    CLASS_NAME = "Temp_SectionModelTest"
+
+    # dates
+    START_DATE = "2030-01-01"
+    END_DATE = "2030-01-03"
+
+    # bylines
+    BYLINE_IN_HOUSE_A = "Ann Smith / THE GRAND RAPIDS PRESS"
+    BYLINE_IN_HOUSE_A_LOWER = "Ann Smith / The Grand Rapids Press"
+    BYLINE_IN_HOUSE_B = "Bob Jones / THE GRAND RAPIDS PRESS"
+    BYLINE_BOOTH = "Cal Brown / GRAND RAPIDS PRESS NEWS SERVICE"
+    BYLINE_EXTERNAL = "ASSOCIATED PRESS"
+
+    # ( day offset, section, page, byline )
+    ARTICLE_SPEC_LIST = []
+    ARTICLE_SPEC_LIST.append( ( 0, "City and Region", "1", BYLINE_IN_HOUSE_A ) )
+    ARTICLE_SPEC_LIST.append( ( 0, "City and Region", "1", BYLINE_IN_HOUSE_B ) )
+    ARTICLE_SPEC_LIST.append( ( 0, "City and Region", "2", BYLINE_BOOTH ) )
+    ARTICLE_SPEC_LIST.append( ( 0, "Sports", "1", BYLINE_IN_HOUSE_A_LOWER ) )
+    ARTICLE_SPEC_LIST.append( ( 0, "Opinion", "1", BYLINE_IN_HOUSE_B ) )
+    ARTICLE_SPEC_LIST.append( ( 2, "Sports", "3", BYLINE_EXTERNAL ) )
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> instance methods - setup
+    #----------------------------------------------------------------------------
+
+
+    def setUp( self ):
+
+        """
+        setup tasks.  Create a few articles across sections, pages, and days.
+        """
+
+        # declare variables
+        start_date = None
+        day_offset = -1
+        section_name = ""
+        page = ""
+        byline = ""
+        current_article = None
+
+        start_date = datetime.datetime.strptime( self.START_DATE, Temp_Section.DEFAULT_DATE_FORMAT ).date()
+        for day_offset, section_name, page, byline in self.ARTICLE_SPEC_LIST:
+
+            current_article = Article()
+            current_article.pub_date = start_date + datetime.timedelta( days = day_offset )
+            current_article.section = section_name
+            current_article.page = page
+            current_article.author_varchar = byline
+            current_article.headline = "Temp_Section test article"
+            current_article.save()
+
+        #-- END loop over article specs --#
+
+    #-- END function setUp() --#
+
+
+    def get_key( self, section_name_IN, start_date_IN, end_date_IN = None ):
+
+        '''
+        Returns stats grid key for section name and date strings.
+        '''
+
+        # return reference
+        key_OUT = None
+
+        # declare variables
+        start_date = None
+        end_date = None
+
+        if ( end_date_IN is None ):
+
+            end_date_IN = start_date_IN
+
+        #-- END check to see if end date --#
+
+        start_date = datetime.datetime.strptime( start_date_IN, Temp_Section.DEFAULT_DATE_FORMAT )
+        end_date = datetime.datetime.strptime( end_date_IN, Temp_Section.DEFAULT_DATE_FORMAT )
+        key_OUT = ( section_name_IN, start_date, end_date )
+
+        return key_OUT
+
+    #-- END method get_key() --#
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> instance methods - tests
+    #----------------------------------------------------------------------------
+
+
+    def test_build_section_stats_grid( self ):
+
+        # declare variables
+        me = "test_build_section_stats_grid"
+        stats_grid = None
+        values_dict = None
+        section_name = ""
+        period_start = None
+        period_end = None
+        section_instance = None
+        section_params = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        stats_grid = Temp_Section.build_section_stats_grid( self.START_DATE, self.END_DATE )
+
+        # 3 days, each section plus "all".
+        self.assertEqual( len( stats_grid ), 3 * ( len( Temp_Section.NEWS_SECTION_NAME_LIST ) + 1 ) )
+
+        # one section, one day.
+        values_dict = stats_grid[ self.get_key( "City and Region", "2030-01-01" ) ]
+        self.assertEqual( values_dict[ "total_articles" ], 3 )
+        self.assertEqual( values_dict[ "in_house_articles" ], 2 )
+        self.assertEqual( values_dict[ "external_articles" ], 1 )
+        self.assertEqual( values_dict[ "external_booth" ], 1 )
+        self.assertEqual( values_dict[ "total_pages" ], 2 )
+        self.assertEqual( values_dict[ "in_house_pages" ], 1 )
+        self.assertEqual( values_dict[ "in_house_authors" ], 2 )
+
+        # "all" - page 1 counted once across sections, "Opinion" left out.
+        values_dict = stats_grid[ self.get_key( Temp_Section.SECTION_NAME_ALL, "2030-01-01" ) ]
+        self.assertEqual( values_dict[ "total_articles" ], 4 )
+        self.assertEqual( values_dict[ "in_house_articles" ], 3 )
+        self.assertEqual( values_dict[ "total_pages" ], 2 )
+        self.assertEqual( values_dict[ "in_house_pages" ], 1 )
+        self.assertEqual( values_dict[ "in_house_authors" ], 2 )
+        self.assertEqual( values_dict[ "percent_in_house" ], Decimal( 3 ) / Decimal( 4 ) )
+
+        # empty day.
+        values_dict = stats_grid[ self.get_key( Temp_Section.SECTION_NAME_ALL, "2030-01-02" ) ]
+        self.assertEqual( values_dict[ "total_articles" ], 0 )
+        self.assertEqual( values_dict[ "total_days" ], 1 )
+        self.assertEqual( values_dict[ "percent_external" ], Decimal( "0.0" ) )
+
+        # counts match the per-instance ORM methods.  Just the first day - those
+        #    methods drop their filters when a QuerySet along the way is empty.
+        for ( section_name, period_start, period_end ), values_dict in stats_grid.items():
+
+            if ( period_start != self.get_key( section_name, self.START_DATE )[ 1 ] ):
+
+                continue
+
+            #-- END check to see if first day --#
+
+            section_instance = Temp_Section()
+            section_instance.name = section_name
+            section_params = {}
+            section_params[ Temp_Section.PARAM_START_DATE ] = period_start.strftime( Temp_Section.DEFAULT_DATE_FORMAT )
+            section_params[ Temp_Section.PARAM_END_DATE ] = period_end.strftime( Temp_Section.DEFAULT_DATE_FORMAT )
+            self.assertEqual( values_dict[ "total_articles" ], section_instance.get_total_article_count( **section_params ), msg = section_name )
+            self.assertEqual( values_dict[ "external_articles" ], section_instance.get_external_article_count( **section_params ), msg = section_name )
+            self.assertEqual( values_dict[ "external_booth" ], section_instance.get_external_booth_count( **section_params ), msg = section_name )
+            section_instance.get_daily_averages( **section_params )
+            self.assertEqual( values_dict[ "total_pages" ], section_instance.total_pages, msg = section_name )
+            self.assertEqual( values_dict[ "average_articles_per_day" ], section_instance.average_articles_per_day, msg = section_name )
+            section_instance.get_daily_in_house_averages( **section_params )
+            self.assertEqual( values_dict[ "in_house_pages" ], section_instance.in_house_pages, msg = section_name )
+
+        #-- END loop over grid --#
+
+        # just "all", whole range.
+        stats_grid = Temp_Section.build_section_stats_grid( self.START_DATE, self.END_DATE, day_by_day_IN = False, skip_individual_sections_IN = True )
+        self.assertEqual( len( stats_grid ), 1 )
+        values_dict = stats_grid[ self.get_key( Temp_Section.SECTION_NAME_ALL, self.START_DATE, self.END_DATE ) ]
+        self.assertEqual( values_dict[ "total_days" ], 3 )
+        self.assertEqual( values_dict[ "total_articles" ], 5 )
+        self.assertEqual( values_dict[ "external_articles" ], 2 )
+        self.assertEqual( values_dict[ "total_pages" ], 3 )
+        self.assertEqual( values_dict[ "average_articles_per_day" ], Decimal( 5 ) / Decimal( 3 ) )
+
+    #-- END test method test_build_section_stats_grid() --#
+
+
+    def test_get_in_house_author_key( self ):
+
+        # declare variables
+        me = "test_get_in_house_author_key"
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        self.assertEqual( Temp_Section.get_in_house_author_key( self.BYLINE_IN_HOUSE_A ), "ANN SMITH " )
+        self.assertEqual( Temp_Section.get_in_house_author_key( self.BYLINE_IN_HOUSE_A_LOWER ), "ANN SMITH " )
+        self.assertEqual( Temp_Section.get_in_house_author_key( self.BYLINE_EXTERNAL ), "" )
+        self.assertEqual( Temp_Section.get_in_house_author_key( None ), "" )
+
+    #-- END test method test_get_in_house_author_key() --#
+
+
+    def test_process_section_date_range( self ):
+
+        # declare variables
+        me = "test_process_section_date_range"
+        section_params = None
+        row_count = -1
+        all_instance = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        section_params = {}
+        section_params[ Temp_Section.PARAM_START_DATE ] = self.START_DATE
+        section_params[ Temp_Section.PARAM_END_DATE ] = self.END_DATE
+
+        # day by day - a row per section per day.
+        row_count = Temp_Section.process_section_date_range_day_by_day( **section_params )
+        self.assertEqual( row_count, 3 * ( len( Temp_Section.NEWS_SECTION_NAME_LIST ) + 1 ) )
+        self.assertEqual( Temp_Section.objects.count(), row_count )
+
+        # again - rows updated, not duplicated.
+        Temp_Section.objects.filter( name = "Sports" ).update( total_articles = -1 )
+        Temp_Section.process_section_date_range_day_by_day( **section_params )
+        self.assertEqual( Temp_Section.objects.count(), row_count )
+        self.assertEqual( Temp_Section.objects.filter( total_articles = -1 ).count(), 0 )
+
+        # whole range - one more row per section, found by find_instance().
+        Temp_Section.process_section_date_range( **section_params )
+        self.assertEqual( Temp_Section.objects.count(), row_count + len( Temp_Section.NEWS_SECTION_NAME_LIST ) + 1 )
+        section_params[ Temp_Section.PARAM_SECTION_NAME ] = Temp_Section.SECTION_NAME_ALL
+        all_instance = Temp_Section.find_instance( **section_params )
+        self.assertIsNotNone( all_instance.id )
+        self.assertEqual( all_instance.total_articles, 5 )
+        self.assertEqual( all_instance.in_house_authors, 2 )
+
+    #-- END test method test_process_section_date_range() --#
+
+
+#-- END test class Temp_SectionModelTest --#
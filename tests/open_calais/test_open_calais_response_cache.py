@@ -0,0 +1,194 @@
+"""
+This file contains tests of the on-disk ResponseCache used to store OpenCalais
+    responses so the same article text is not sent to the API twice.
+
+Functions tested:
+
+- ResponseCache.make_key()
+- ResponseCache.get() / put() / contains()
+- ResponseCache.evict()
+- OpenCalaisV2ArticleCoder.is_article_response_cached()
+
+"""
+
+# python base imports
+import shutil
+import tempfile
+
+# django imports
+import django.test
+
+# context_text imports
+from context_text.article_coding.open_calais_v2.open_calais_v2_article_coder import OpenCalaisV2ArticleCoder
+from context_text.data.synthetic_corpus import SyntheticCorpus
+from context_text.models import Article_Text
+from context_text.shared.response_cache import ResponseCache
+
+
+class ResponseCacheTest( django.test.TestCase ):
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> Constants-ish
+    #----------------------------------------------------------------------------
+
+
+    # DEBUG
+    DEBUG = False
+
+    # CLASS NAME
+    CLASS_NAME = "ResponseCacheTest"
+
+    # test values
+    TEST_TEXT = "The mayor said \"no comment.\"\r\nThe mayor said it twice."
+    TEST_RESPONSE = '{ "doc": { "info": { "docId": "1" } } }'
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> instance methods - setup
+    #----------------------------------------------------------------------------
+
+
+    def setUp( self ):
+
+        """
+        setup tasks.  Make a temporary cache directory.
+        """
+
+        self.cache_directory = tempfile.mkdtemp()
+
+    #-- END function setUp() --#
+
+
+    def tearDown( self ):
+
+        # remove temporary cache directory.
+        shutil.rmtree( self.cache_directory, ignore_errors = True )
+
+    #-- END function tearDown() --#
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> instance methods - tests
+    #----------------------------------------------------------------------------
+
+
+    def test_eviction( self ):
+
+        # declare variables
+        me = "test_eviction"
+        response_cache = None
+        key_list = None
+        key = ""
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        # room for 3 100-byte entries.
+        response_cache = ResponseCache( self.cache_directory, max_size_bytes_IN = 350 )
+        key_list = [ ResponseCache.make_key( "text {}".format( index ) ) for index in range( 4 ) ]
+        for key in key_list[ :3 ]:
+
+            response_cache.put( key, "x" * 100 )
+
+        #-- END loop over first three keys --#
+
+        self.assertEqual( response_cache.eviction_count, 0 )
+        self.assertEqual( response_cache.get_total_size_bytes(), 300 )
+
+        # under target - nothing evicted.  Then go over limit.
+        response_cache.evict( 1000 )
+        self.assertEqual( response_cache.eviction_count, 0 )
+        response_cache.put( key_list[ 3 ], "x" * 100 )
+        self.assertGreater( response_cache.eviction_count, 0 )
+        self.assertLessEqual( response_cache.get_total_size_bytes(), 350 )
+
+    #-- END test method test_eviction() --#
+
+
+    def test_get_put( self ):
+
+        # declare variables
+        me = "test_get_put"
+        response_cache = None
+        key = ""
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        response_cache = ResponseCache( self.cache_directory )
+        key = ResponseCache.make_key( self.TEST_TEXT, "v2" )
+
+        # miss.
+        self.assertFalse( response_cache.contains( key ) )
+        self.assertIsNone( response_cache.get( key ) )
+        self.assertEqual( response_cache.miss_count, 1 )
+
+        # hit - text comes back exactly.
+        response_cache.put( key, self.TEST_RESPONSE )
+        self.assertTrue( response_cache.contains( key ) )
+        self.assertEqual( response_cache.get( key ), self.TEST_RESPONSE )
+        self.assertEqual( response_cache.hit_count, 1 )
+
+        # new instance on same directory sees entry.
+        response_cache = ResponseCache( self.cache_directory )
+        self.assertEqual( response_cache.total_size_bytes, len( self.TEST_RESPONSE ) )
+        self.assertEqual( response_cache.get( key ), self.TEST_RESPONSE )
+
+        # replacing an entry counts only the new size.
+        response_cache.put( key, self.TEST_RESPONSE + " " )
+        self.assertEqual( response_cache.total_size_bytes, len( self.TEST_RESPONSE ) + 1 )
+        response_cache.put( key, self.TEST_RESPONSE )
+        self.assertEqual( response_cache.total_size_bytes, len( self.TEST_RESPONSE ) )
+
+    #-- END test method test_get_put() --#
+
+
+    def test_is_article_response_cached( self ):
+
+        # declare variables
+        me = "test_is_article_response_cached"
+        test_corpus = None
+        test_article = None
+        test_coder = None
+        article_text = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        test_corpus = SyntheticCorpus( article_count_IN = 1, newspaper_count_IN = 1, person_count_IN = 3, seed_IN = 3 )
+        test_corpus.create()
+        test_article = test_corpus.article_list[ 0 ]
+
+        test_coder = OpenCalaisV2ArticleCoder()
+        test_coder.response_cache = ResponseCache( self.cache_directory )
+        self.assertFalse( test_coder.is_article_response_cached( test_article ) )
+
+        # two texts, or none - not cached rather than an exception.
+        article_text = test_article.article_text_set.get()
+        article_text.pk = None
+        article_text.save()
+        self.assertFalse( test_coder.is_article_response_cached( test_article ) )
+        Article_Text.objects.filter( article = test_article ).delete()
+        self.assertFalse( test_coder.is_article_response_cached( test_article ) )
+
+    #-- END test method test_is_article_response_cached() --#
+
+
+    def test_make_key( self ):
+
+        # declare variables
+        me = "test_make_key"
+        key = ""
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        key = ResponseCache.make_key( self.TEST_TEXT, "v2" )
+        self.assertEqual( len( key ), 64 )
+        self.assertEqual( key, ResponseCache.make_key( self.TEST_TEXT, "v2" ) )
+
+        # text or version change makes new key.
+        self.assertNotEqual( key, ResponseCache.make_key( self.TEST_TEXT + " ", "v2" ) )
+        self.assertNotEqual( key, ResponseCache.make_key( self.TEST_TEXT, "v3" ) )
+
+    #-- END test method test_make_key() --#
+
+
+#-- END test class ResponseCacheTest --#
@@ -0,0 +1,540 @@
+"""
+This file contains tests of the RequestPipeline used to keep several
+    OpenCalais requests in flight over one pooled session.  Requests go to a
+    stub HTTP server on localhost that sometimes says the concurrent request
+    limit was exceeded, or fails once with a 503.
+
+Functions tested:
+
+- RequestPipeline.run()
+- RequestPipeline.close(), as context manager
+- RequestPipeline.get_backoff_seconds()
+- RequestPipeline.get_retry_reason()
+- RequestPipeline.may_i_continue()
+- OpenCalaisV2ArticleCoder.iterate_articles_pipelined(), directly and through
+    ArticleCoding.code_article_data() (pipeline worker pool type)
+
+"""
+
+# python base imports
+import http.server
+import json
+import shutil
+import tempfile
+import threading
+
+# django imports
+import django.test
+
+# context_text imports
+from context_text.article_coding.article_coder import ArticleCoder
+from context_text.article_coding.article_coding import ArticleCoding
+from context_text.article_coding.article_coding import SharedRateLimiter
+from context_text.article_coding.open_calais_v2.open_calais_v2_article_coder import OpenCalaisV2ArticleCoder
+from context_text.benchmark.synthetic_coding import SyntheticCoding
+from context_text.data.synthetic_corpus import SyntheticCorpus
+from context_text.models import Article
+from context_text.models import Article_Data
+from context_text.models import Article_Text
+from context_text.shared.request_pipeline import RequestPipeline
+
+
+class StubOpenCalaisHandler( http.server.BaseHTTPRequestHandler ):
+
+    '''
+    Responds to POSTs with JSON that echoes the request body.  Bodies that
+       start with "limit" get the OpenCalais concurrent request limit message
+       (HTTP 429 if they start with "limit429") the first time they are sent,
+       bodies that start with "flaky" get a 503 the first time, and bodies that
+       start with "bad" always get a 400.  Server keeps track of how many
+       requests were in flight at once.
+    '''
+
+    def do_POST( self ):
+
+        # declare variables
+        server = self.server
+        body = None
+        status_code = 200
+        response_text = None
+        response_bytes = None
+
+        body = self.rfile.read( int( self.headers.get( "Content-Length", 0 ) ) ).decode( "utf-8" )
+
+        with server.lock:
+
+            server.in_flight_count += 1
+            server.max_in_flight_count = max( server.max_in_flight_count, server.in_flight_count )
+            server.attempt_dict[ body ] = server.attempt_dict.get( body, 0 ) + 1
+            attempt_count = server.attempt_dict[ body ]
+            server.header_list.append( self.headers.get( "x-ag-access-token" ) )
+
+        #-- END with lock --#
+
+        # give other requests a chance to overlap.
+        server.release_event.wait( 0.05 )
+
+        if ( body.startswith( "limit429" ) and ( attempt_count == 1 ) ):
+
+            status_code = 429
+            response_text = "You have exceeded the concurrent request limit."
+
+        elif ( body.startswith( "limit" ) and ( attempt_count == 1 ) ):
+
+            status_code = 200
+            response_text = "You have exceeded the concurrent request limit for your license."
+
+        elif ( body.startswith( "flaky" ) and ( attempt_count == 1 ) ):
+
+            status_code = 503
+            response_text = "Service Unavailable"
+
+        elif ( body.startswith( "bad" ) ):
+
+            status_code = 400
+            response_text = "Bad request"
+
+        else:
+
+            response_text = json.dumps( { "doc" : { "info" : { "document" : body } } } )
+
+        #-- END check to see how to respond --#
+
+        with server.lock:
+
+            server.in_flight_count -= 1
+
+        #-- END with lock --#
+
+        response_bytes = response_text.encode( "utf-8" )
+        self.send_response( status_code )
+        self.send_header( "Content-Type", "application/json" )
+        self.send_header( "Content-Length", str( len( response_bytes ) ) )
+        if ( status_code == 429 ):
+
+            self.send_header( "Retry-After", "0" )
+
+        #-- END check to see if Retry-After --#
+        self.end_headers()
+        self.wfile.write( response_bytes )
+
+    #-- END method do_POST() --#
+
+
+    def log_message( self, format, *args ):
+
+        # quiet.
+        pass
+
+    #-- END method log_message() --#
+
+#-- END class StubOpenCalaisHandler --#
+
+
+class RequestPipelineTest( django.test.TestCase ):
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> Constants-ish
+    #----------------------------------------------------------------------------
+
+
+    # DEBUG
+    DEBUG = False
+
+    # CLASS NAME
+    CLASS_NAME = "RequestPipelineTest"
+
+    # test values
+    TEST_ACCESS_TOKEN = "test-token"
+    TEST_CONCURRENCY = 3
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> instance methods - setup
+    #----------------------------------------------------------------------------
+
+
+    def setUp( self ):
+
+        """
+        setup tasks.  Start stub server on a free port on localhost.
+        """
+
+        self.server = http.server.ThreadingHTTPServer( ( "127.0.0.1", 0 ), StubOpenCalaisHandler )
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.release_event = threading.Event()
+        self.server.in_flight_count = 0
+        self.server.max_in_flight_count = 0
+        self.server.attempt_dict = {}
+        self.server.header_list = []
+        self.server_thread = threading.Thread( target = self.server.serve_forever )
+        self.server_thread.daemon = True
+        self.server_thread.start()
+        self.url = "http://127.0.0.1:{}/permid/calais".format( self.server.server_address[ 1 ] )
+
+    #-- END function setUp() --#
+
+
+    def tearDown( self ):
+
+        # stop stub server.
+        self.server.shutdown()
+        self.server.server_close()
+        self.server_thread.join()
+
+    #-- END function tearDown() --#
+
+
+    def make_pipeline( self ):
+
+        # return reference
+        pipeline_OUT = None
+
+        pipeline_OUT = RequestPipeline( self.url,
+                                        header_dict_IN = { "x-ag-access-token" : self.TEST_ACCESS_TOKEN },
+                                        concurrency_IN = self.TEST_CONCURRENCY,
+                                        max_retries_IN = 3,
+                                        backoff_seconds_IN = 0.01,
+                                        timeout_seconds_IN = 10 )
+        pipeline_OUT.concurrency_limit_text_list.append( "exceeded the concurrent request limit" )
+
+        return pipeline_OUT
+
+    #-- END method make_pipeline() --#
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> instance methods - tests
+    #----------------------------------------------------------------------------
+
+
+    def test_get_backoff_seconds( self ):
+
+        # declare variables
+        me = "test_get_backoff_seconds"
+        my_pipeline = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        my_pipeline = RequestPipeline( self.url, backoff_seconds_IN = 1.0, max_backoff_seconds_IN = 5.0 )
+        self.assertEqual( my_pipeline.get_backoff_seconds( 1 ), 1.0 )
+        self.assertEqual( my_pipeline.get_backoff_seconds( 2 ), 2.0 )
+        self.assertEqual( my_pipeline.get_backoff_seconds( 3 ), 4.0 )
+        self.assertEqual( my_pipeline.get_backoff_seconds( 10 ), 5.0 )
+
+        # Retry-After wins if a number of seconds.
+        self.assertEqual( my_pipeline.get_backoff_seconds( 3, "2" ), 2.0 )
+        self.assertEqual( my_pipeline.get_backoff_seconds( 3, "Wed, 21 Oct 2015 07:28:00 GMT" ), 4.0 )
+        my_pipeline.close()
+
+    #-- END test method test_get_backoff_seconds() --#
+
+
+    def test_get_retry_reason( self ):
+
+        # declare variables
+        me = "test_get_retry_reason"
+        my_pipeline = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        my_pipeline = self.make_pipeline()
+        self.assertEqual( my_pipeline.get_retry_reason( 429, "" ), RequestPipeline.RETRY_REASON_CONCURRENCY_LIMIT )
+        self.assertEqual( my_pipeline.get_retry_reason( 200, "You have exceeded the concurrent request limit." ), RequestPipeline.RETRY_REASON_CONCURRENCY_LIMIT )
+        self.assertEqual( my_pipeline.get_retry_reason( 503, "" ), RequestPipeline.RETRY_REASON_TRANSIENT )
+        self.assertIsNone( my_pipeline.get_retry_reason( 200, "{}" ) )
+        self.assertIsNone( my_pipeline.get_retry_reason( 400, "Bad request" ) )
+        my_pipeline.close()
+
+    #-- END test method test_get_retry_reason() --#
+
+
+    def test_run( self ):
+
+        # declare variables
+        me = "test_run"
+        my_pipeline = None
+        request_list = None
+        result_dict = None
+        current_result = None
+        request_key = None
+        request_data = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        # plain requests, plus some that hit the limit or fail once.
+        request_list = []
+        for request_key in range( 12 ):
+
+            request_list.append( ( request_key, "article {} text".format( request_key ) ) )
+
+        #-- END loop over plain requests --#
+        request_list.append( ( 100, "limit - article 100 text" ) )
+        request_list.append( ( 101, "limit429 - article 101 text" ) )
+        request_list.append( ( 102, "flaky - article 102 text" ) )
+
+        my_pipeline = self.make_pipeline()
+        result_dict = {}
+        for current_result in my_pipeline.run( iter( request_list ) ):
+
+            result_dict[ current_result.key ] = current_result
+
+        #-- END loop over results --#
+
+        # every request came back, parsed, with the right body.
+        self.assertEqual( len( result_dict ), len( request_list ) )
+        for request_key, request_data in request_list:
+
+            current_result = result_dict[ request_key ]
+            self.assertTrue( current_result.is_success(), current_result.error_message )
+            self.assertEqual( current_result.response_json[ "doc" ][ "info" ][ "document" ], request_data )
+
+        #-- END loop over requests --#
+
+        # retries
+        self.assertEqual( result_dict[ 100 ].attempt_count, 2 )
+        self.assertEqual( result_dict[ 101 ].attempt_count, 2 )
+        self.assertEqual( result_dict[ 102 ].attempt_count, 2 )
+        self.assertEqual( result_dict[ 0 ].attempt_count, 1 )
+        self.assertEqual( my_pipeline.retry_count, 3 )
+        self.assertEqual( my_pipeline.concurrency_limit_count, 2 )
+        self.assertEqual( my_pipeline.request_count, len( request_list ) + 3 )
+
+        # requests overlapped, but never more than the limit.
+        self.assertGreater( self.server.max_in_flight_count, 1 )
+        self.assertLessEqual( self.server.max_in_flight_count, self.TEST_CONCURRENCY )
+
+        # headers sent.
+        self.assertEqual( set( self.server.header_list ), set( [ self.TEST_ACCESS_TOKEN ] ) )
+        my_pipeline.close()
+
+    #-- END test method test_run() --#
+
+
+    def test_run_errors( self ):
+
+        # declare variables
+        me = "test_run_errors"
+        my_pipeline = None
+        result_list = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        # not retried.
+        with self.make_pipeline() as my_pipeline:
+
+            result_list = list( my_pipeline.run( [ ( 1, "bad - article 1 text" ), ( 2, "article 2 text" ) ] ) )
+            self.assertEqual( len( result_list ), 2 )
+            result_list.sort( key = lambda result : result.key )
+            self.assertFalse( result_list[ 0 ].is_success() )
+            self.assertEqual( result_list[ 0 ].status_code, 400 )
+            self.assertEqual( result_list[ 0 ].attempt_count, 1 )
+            self.assertTrue( result_list[ 1 ].is_success() )
+            self.assertEqual( my_pipeline.error_count, 1 )
+
+        #-- END with pipeline --#
+
+        # always over the limit - gives up after max retries.
+        self.server.attempt_dict.clear()
+        with self.make_pipeline() as my_pipeline:
+
+            my_pipeline.max_retries = 0
+            result_list = list( my_pipeline.run( [ ( 3, "limit - article 3 text" ) ] ) )
+            self.assertFalse( result_list[ 0 ].is_success() )
+            self.assertEqual( result_list[ 0 ].retry_reason, RequestPipeline.RETRY_REASON_CONCURRENCY_LIMIT )
+            self.assertEqual( result_list[ 0 ].attempt_count, 1 )
+
+        #-- END with pipeline --#
+
+        # can't connect - transient, then gives up.
+        with RequestPipeline( "http://127.0.0.1:1/", max_retries_IN = 1, backoff_seconds_IN = 0.01, timeout_seconds_IN = 2 ) as my_pipeline:
+
+            result_list = list( my_pipeline.run( [ ( 4, "article 4 text" ) ] ) )
+            self.assertFalse( result_list[ 0 ].is_success() )
+            self.assertEqual( result_list[ 0 ].retry_reason, RequestPipeline.RETRY_REASON_TRANSIENT )
+            self.assertEqual( result_list[ 0 ].attempt_count, 2 )
+            self.assertIsNotNone( result_list[ 0 ].raw_text )
+
+        #-- END with pipeline --#
+
+    #-- END test method test_run_errors() --#
+
+
+    def test_run_daily_limit( self ):
+
+        # declare variables
+        me = "test_run_daily_limit"
+        my_rate_limiter = None
+        my_pipeline = None
+        request_iterator = None
+        result_list = None
+        success_list = None
+        refused_list = None
+        current_result = None
+        remaining_count = -1
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        # room for two requests, more requests than slots.
+        my_rate_limiter = SharedRateLimiter( -1, daily_limit_IN = 2 )
+        request_iterator = iter( [ ( request_key, "article {} text".format( request_key ) ) for request_key in range( 6 ) ] )
+        with self.make_pipeline() as my_pipeline:
+
+            my_pipeline.rate_limiter = my_rate_limiter
+            result_list = list( my_pipeline.run( request_iterator ) )
+            self.assertFalse( my_pipeline.may_i_continue() )
+            self.assertEqual( my_pipeline.request_count, 2 )
+
+        #-- END with pipeline --#
+
+        # two sent, anything else pulled before the limit came back unsent.
+        success_list = [ current_result for current_result in result_list if ( current_result.is_success() == True ) ]
+        refused_list = [ current_result for current_result in result_list if ( current_result.is_daily_limit_reached == True ) ]
+        self.assertEqual( len( success_list ), 2 )
+        self.assertEqual( len( success_list ) + len( refused_list ), len( result_list ) )
+        self.assertLessEqual( len( refused_list ), 1 )
+        for current_result in refused_list:
+
+            self.assertIsNotNone( current_result.error_message )
+            self.assertEqual( current_result.attempt_count, 0 )
+
+        #-- END loop over refused results --#
+
+        # server only saw two, and the rest were never pulled.
+        self.assertEqual( sum( self.server.attempt_dict.values() ), 2 )
+        remaining_count = len( list( request_iterator ) )
+        self.assertEqual( len( result_list ) + remaining_count, 6 )
+        self.assertGreaterEqual( remaining_count, 3 )
+
+    #-- END test method test_run_daily_limit() --#
+
+
+    def test_run_reuse( self ):
+
+        # declare variables
+        me = "test_run_reuse"
+        my_pipeline = None
+        result_list = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        # session stays open between runs.
+        with self.make_pipeline() as my_pipeline:
+
+            result_list = list( my_pipeline.run( [ ( 1, "article 1 text" ), ( 2, "article 2 text" ) ] ) )
+            self.assertEqual( len( result_list ), 2 )
+            result_list = list( my_pipeline.run( [ ( 3, "article 3 text" ) ] ) )
+            self.assertEqual( len( result_list ), 1 )
+            self.assertTrue( result_list[ 0 ].is_success(), result_list[ 0 ].error_message )
+            self.assertEqual( my_pipeline.request_count, 3 )
+
+        #-- END with pipeline --#
+
+    #-- END test method test_run_reuse() --#
+
+
+    def test_iterate_articles_pipelined_daily_limit( self ):
+
+        # declare variables
+        me = "test_iterate_articles_pipelined_daily_limit"
+        test_corpus = None
+        cache_directory = None
+        article_qs = None
+        uncached_article = None
+        my_article_coding = None
+        param_dict = None
+        article_coder = None
+        my_rate_limiter = None
+        article_id_list = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        # one article isn't cached, and the daily limit is already used up.
+        test_corpus = SyntheticCorpus( article_count_IN = 3, newspaper_count_IN = 1, person_count_IN = 6, seed_IN = 5 )
+        test_corpus.create()
+        article_qs = Article.objects.filter( id__in = [ current_article.id for current_article in test_corpus.article_list ] ).order_by( "id" )
+        uncached_article = test_corpus.article_list[ 1 ]
+        cache_directory = tempfile.mkdtemp()
+        try:
+
+            SyntheticCoding.populate_response_cache( article_qs.exclude( id = uncached_article.id ), cache_directory )
+
+            param_dict = {}
+            param_dict[ ArticleCoding.PARAM_CODER_TYPE ] = ArticleCoding.ARTICLE_CODING_IMPL_OPEN_CALAIS_API_V2
+            param_dict[ OpenCalaisV2ArticleCoder.CONFIG_PROP_RESPONSE_CACHE_DIRECTORY ] = cache_directory
+            my_article_coding = ArticleCoding()
+            my_article_coding.store_parameters( param_dict )
+            article_coder = my_article_coding.get_coder_instance()
+            article_coder.initialize_from_params( param_dict )
+
+            my_rate_limiter = SharedRateLimiter( -1, daily_limit_IN = 1 )
+            self.assertTrue( my_rate_limiter.start_request() )
+
+            # cached articles still come back, the uncached one does not.
+            article_id_list = [ current_article.id for current_article in article_coder.iterate_articles_pipelined( article_qs, rate_limiter_IN = my_rate_limiter ) ]
+
+        finally:
+
+            shutil.rmtree( cache_directory, ignore_errors = True )
+
+        #-- END try...finally around cache directory --#
+
+        self.assertEqual( sorted( article_id_list ), [ test_corpus.article_list[ 0 ].id, test_corpus.article_list[ 2 ].id ] )
+        self.assertEqual( len( article_coder.prefetched_result_dict ), 0 )
+
+    #-- END test method test_iterate_articles_pipelined_daily_limit() --#
+
+
+    def test_code_article_data_pipelined_bad_article( self ):
+
+        # declare variables
+        me = "test_code_article_data_pipelined_bad_article"
+        test_corpus = None
+        cache_directory = None
+        article_qs = None
+        bad_article = None
+        my_article_coding = None
+        param_dict = None
+        error_dict = None
+        article_data_qs = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        # every article's response cached, so no requests - then one article
+        #     loses its text.
+        test_corpus = SyntheticCorpus( article_count_IN = 3, newspaper_count_IN = 1, person_count_IN = 6, seed_IN = 5 )
+        test_corpus.create()
+        article_qs = Article.objects.filter( id__in = [ current_article.id for current_article in test_corpus.article_list ] ).order_by( "id" )
+        cache_directory = tempfile.mkdtemp()
+        try:
+
+            SyntheticCoding.populate_response_cache( article_qs, cache_directory )
+            bad_article = test_corpus.article_list[ 1 ]
+            Article_Text.objects.filter( article = bad_article ).delete()
+
+            param_dict = {}
+            param_dict[ ArticleCoding.PARAM_CODER_TYPE ] = ArticleCoding.ARTICLE_CODING_IMPL_OPEN_CALAIS_API_V2
+            param_dict[ ArticleCoding.PARAM_WORKER_POOL_TYPE ] = ArticleCoding.WORKER_POOL_TYPE_PIPELINE
+            param_dict[ OpenCalaisV2ArticleCoder.CONFIG_PROP_RESPONSE_CACHE_DIRECTORY ] = cache_directory
+            my_article_coding = ArticleCoding()
+            my_article_coding.store_parameters( param_dict )
+            my_article_coding.code_article_data( article_qs )
+
+        finally:
+
+            shutil.rmtree( cache_directory, ignore_errors = True )
+
+        #-- END try...finally around cache directory --#
+
+        # bad article is its own error, the others are still coded.
+        error_dict = my_article_coding.get_error_dictionary()
+        self.assertEqual( list( error_dict.keys() ), [ bad_article.id ] )
+        article_data_qs = Article_Data.objects.filter( article__in = article_qs, coder = ArticleCoder.get_automated_coding_user() )
+        self.assertEqual( sorted( article_data_qs.values_list( "article_id", flat = True ) ), [ test_corpus.article_list[ 0 ].id, test_corpus.article_list[ 2 ].id ] )
+
+    #-- END test method test_code_article_data_pipelined_bad_article() --#
+
+
+#-- END test class RequestPipelineTest --#
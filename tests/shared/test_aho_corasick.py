@@ -0,0 +1,75 @@
+"""
+This file contains tests of the context_text AhoCorasickAutomaton multi-pattern
+   matcher used by Article_Text.find_in_text_batch().
+
+Functions tested:
+
+- AhoCorasickAutomaton.build()
+- AhoCorasickAutomaton.find_all()
+
+"""
+
+# django imports
+import django.test
+
+# context_text imports
+from context_text.shared.aho_corasick import AhoCorasickAutomaton
+
+
+class AhoCorasickAutomatonTest( django.test.SimpleTestCase ):
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> Constants-ish
+    #----------------------------------------------------------------------------
+
+
+    # DEBUG
+    DEBUG = False
+
+    # CLASS NAME
+    CLASS_NAME = "AhoCorasickAutomatonTest"
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> instance methods - tests
+    #----------------------------------------------------------------------------
+
+
+    def test_build( self ):
+
+        # declare variables
+        me = "test_build"
+        test_automaton = None
+        match_dict = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        test_automaton = AhoCorasickAutomaton()
+        test_automaton.add_pattern( "he" )
+        test_automaton.add_pattern( "she" )
+        test_automaton.build()
+        match_dict = test_automaton.find_all( "ushers" )
+        self.assertEqual( match_dict, { "she" : [ 1 ], "he" : [ 2 ] } )
+
+        # building again doesn't repeat outputs.
+        test_automaton.build()
+        test_automaton.build()
+        self.assertEqual( test_automaton.find_all( "ushers" ), match_dict )
+
+        # add after build, then rebuild - new pattern found, old ones once.
+        test_automaton.add_pattern( "hers" )
+        test_automaton.add_pattern( "s" )
+        test_automaton.build()
+        match_dict = test_automaton.find_all( "ushers" )
+        self.assertEqual( match_dict, { "she" : [ 1 ], "he" : [ 2 ], "hers" : [ 2 ], "s" : [ 1, 5 ] } )
+
+        # and iterate_matches() rebuilds on its own after an add.
+        test_automaton.add_pattern( "us" )
+        match_dict = test_automaton.find_all( "ushers" )
+        self.assertEqual( match_dict, { "us" : [ 0 ], "she" : [ 1 ], "he" : [ 2 ], "hers" : [ 2 ], "s" : [ 1, 5 ] } )
+
+    #-- END test method test_build() --#
+
+
+#-- END class AhoCorasickAutomatonTest --#
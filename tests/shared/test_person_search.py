@@ -0,0 +1,216 @@
+"""
+This file contains tests of the context_text PersonSearch Person search
+   backends used by PersonAutocomplete and the person_filter lookup form.
+
+Functions tested:
+
+- NGramPersonSearchBackend.search()
+- NGramPersonSearchBackend.update_person()
+- NGramPersonSearchBackend.remove_person()
+- PersonSearchBackend.search_queryset()
+- PersonSearch.get_backend()
+- make_trigram_set()
+
+"""
+
+# django imports
+import django.test
+
+# context_text imports
+from context_text.models import Person
+from context_text.shared.person_search import make_trigram_set
+from context_text.shared.person_search import NGramPersonSearchBackend
+from context_text.shared.person_search import PersonSearch
+from context_text.tests.test_helper import TestHelper
+
+
+class PersonSearchTest( django.test.TestCase ):
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> Constants-ish
+    #----------------------------------------------------------------------------
+
+
+    # DEBUG
+    DEBUG = False
+
+    # CLASS NAME
+    CLASS_NAME = "PersonSearchTest"
+
+    # test people - first, middle, last.
+    TEST_NAME_LIST = []
+    TEST_NAME_LIST.append( ( "Zebulon", "", "Quixotewicz" ) )
+    TEST_NAME_LIST.append( ( "Zelda", "", "Quixotewicz" ) )
+    TEST_NAME_LIST.append( ( "Zebulon", "P.", "Quarrington" ) )
+    TEST_NAME_LIST.append( ( "Zoë", "", "Quixote" ) )
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> instance methods - setup
+    #----------------------------------------------------------------------------
+
+
+    def setUp( self ):
+
+        """
+        setup tasks.  Call function that we'll re-use, then make test people.
+        """
+
+        # declare variables
+        first_name = None
+        middle_name = None
+        last_name = None
+        test_person = None
+
+        # call TestHelper.standardSetUp()
+        TestHelper.standardSetUp( self )
+
+        self.test_person_list = []
+        for first_name, middle_name, last_name in self.TEST_NAME_LIST:
+
+            test_person = Person( first_name = first_name, middle_name = middle_name, last_name = last_name )
+            test_person.save()
+            self.test_person_list.append( test_person )
+
+        #-- END loop over test names --#
+
+        self.test_person_qs = Person.objects.filter( id__in = [ test_person.id for test_person in self.test_person_list ] )
+
+    #-- END function setUp() --#
+
+
+    def tearDown( self ):
+
+        # rolled-back people shouldn't stay in the shared index.
+        PersonSearch.get_backend( NGramPersonSearchBackend.BACKEND_NAME ).clear()
+
+    #-- END function tearDown() --#
+
+
+    #----------------------------------------------------------------------------
+    # ! ==> instance methods - tests
+    #----------------------------------------------------------------------------
+
+
+    def test_get_backend( self ):
+
+        # declare variables
+        me = "test_get_backend"
+        test_backend = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        # by name - shared instance.
+        test_backend = PersonSearch.get_backend( NGramPersonSearchBackend.BACKEND_NAME )
+        self.assertTrue( isinstance( test_backend, NGramPersonSearchBackend ) )
+        self.assertIs( test_backend, PersonSearch.get_backend( NGramPersonSearchBackend.BACKEND_NAME ) )
+
+        # default - something available.
+        test_backend = PersonSearch.get_backend()
+        self.assertTrue( test_backend.is_available() )
+
+        # unknown name
+        with self.assertRaises( ValueError ):
+
+            PersonSearch.get_backend( "no_such_backend" )
+
+        #-- END with assertRaises --#
+
+    #-- END test method test_get_backend() --#
+
+
+    def test_make_trigram_set( self ):
+
+        # declare variables
+        me = "test_make_trigram_set"
+        trigram_set = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        # same padding as pg_trgm - two spaces before, one after each word.
+        trigram_set = make_trigram_set( "ann lee" )
+        self.assertEqual( trigram_set, set( [ "  a", " an", "ann", "nn ", "  l", " le", "lee", "ee " ] ) )
+        self.assertEqual( make_trigram_set( "" ), set() )
+
+    #-- END test method test_make_trigram_set() --#
+
+
+    def test_ngram_search( self ):
+
+        # declare variables
+        me = "test_ngram_search"
+        test_backend = None
+        result_list = None
+        result_id_list = None
+        person_qs = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        test_backend = NGramPersonSearchBackend()
+
+        # substring - both Quixotewiczes, ahead of Quixote.
+        result_list = test_backend.search( "quixotewicz", limit_IN = None, qs_IN = self.test_person_qs )
+        result_id_list = [ current_result[ 0 ] for current_result in result_list ]
+        self.assertEqual( set( result_id_list[ : 2 ] ), set( [ self.test_person_list[ 0 ].id, self.test_person_list[ 1 ].id ] ) )
+        self.assertTrue( result_list[ 0 ][ 1 ] >= test_backend.SUBSTRING_MATCH_SCORE )
+
+        # full name ranks the exact person first.
+        result_list = test_backend.search( "Zelda Quixotewicz", qs_IN = self.test_person_qs )
+        self.assertEqual( result_list[ 0 ][ 0 ], self.test_person_list[ 1 ].id )
+
+        # accents and case don't matter.
+        result_list = test_backend.search( "ZOE QUIXOTE", qs_IN = self.test_person_qs )
+        self.assertEqual( result_list[ 0 ][ 0 ], self.test_person_list[ 3 ].id )
+
+        # typo - not a substring, found by similarity.
+        result_list = test_backend.search( "Zebulon Quixotewizc", qs_IN = self.test_person_qs )
+        self.assertEqual( result_list[ 0 ][ 0 ], self.test_person_list[ 0 ].id )
+        self.assertTrue( result_list[ 0 ][ 1 ] < test_backend.SUBSTRING_MATCH_SCORE )
+
+        # limit
+        result_list = test_backend.search( "z", limit_IN = 2, qs_IN = self.test_person_qs )
+        self.assertEqual( len( result_list ), 2 )
+
+        # empty query
+        self.assertEqual( test_backend.search( "  ", qs_IN = self.test_person_qs ), [] )
+
+        # search_queryset() - Persons, in ranked order.
+        person_qs = test_backend.search_queryset( "Zelda Quixotewicz", qs_IN = self.test_person_qs )
+        self.assertEqual( person_qs[ 0 ], self.test_person_list[ 1 ] )
+        self.assertEqual( test_backend.search_queryset( "", qs_IN = self.test_person_qs ).count(), 0 )
+
+    #-- END test method test_ngram_search() --#
+
+
+    def test_ngram_update_remove( self ):
+
+        # declare variables
+        me = "test_ngram_update_remove"
+        test_backend = None
+        test_person = None
+        result_list = None
+
+        print( '\n\n====> In {}.{}\n'.format( self.CLASS_NAME, me ) )
+
+        # shared instance - kept current by signals once built.
+        test_backend = PersonSearch.get_backend( NGramPersonSearchBackend.BACKEND_NAME )
+        test_backend.build()
+
+        # rename
+        test_person = self.test_person_list[ 2 ]
+        test_person.last_name = "Vanderwaalsby"
+        test_person.save()
+        result_list = test_backend.search( "vanderwaalsby" )
+        self.assertEqual( [ current_result[ 0 ] for current_result in result_list ], [ test_person.id ] )
+        result_list = test_backend.search( "quarrington" )
+        self.assertFalse( test_person.id in [ current_result[ 0 ] for current_result in result_list ] )
+
+        # delete
+        test_person.delete()
+        self.assertEqual( test_backend.search( "vanderwaalsby" ), [] )
+
+    #-- END test method test_ngram_update_remove() --#
+
+
+#-- END test class PersonSearchTest --#
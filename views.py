@@ -52,6 +52,7 @@ from django.urls import reverse
 #from django.http import Http404
 from django.http import HttpResponse
 from django.http import HttpResponseRedirect
+from django.http import StreamingHttpResponse
 
 # django.shortcuts imports - render() method
 #from django.shortcuts import get_object_or_404
@@ -147,6 +148,7 @@ from context_text.models import Person
 
 # shared classes
 from context_text.shared.context_text_base import ContextTextBase
+from context_text.shared.person_search import PersonSearch
 
 
 #================================================================================
@@ -3406,6 +3408,9 @@ def output_articles( request_IN ):
     network_query_set = None
     article_data_count = ''
     query_counter = ''
+    download_as_file_IN = ""
+    csv_outputter = None
+    current_date_time = ""
     
     # initialize response dictionary
     response_dictionary = {}
@@ -3414,6 +3419,9 @@ def output_articles( request_IN ):
     # set my default rendering template
     default_template = 'context_text/context_text_output_articles.html'
 
+    # stream CSV as a file download?
+    download_as_file_IN = request_IN.POST.get( NetworkOutput.PARAM_CSV_DOWNLOAD_AS_FILE, NetworkOutput.CHOICE_NO )
+
     # variables for building, populating person array that is used to control
     #    building of network data matrices.
 
@@ -3432,63 +3440,81 @@ def output_articles( request_IN ):
             network_outputter = NetworkOutput()
             network_outputter.set_request( request_IN )
 
-            # For now, output plain string
-            output_string = network_outputter.debug_parameters()
+            # download as file?
+            if ( download_as_file_IN == NetworkOutput.CHOICE_YES ):
+            
+                # yes - stream the CSV straight back, a few rows at a time,
+                #    rather than building it all up in memory.
+                network_query_set = network_outputter.create_network_query_set()
+                csv_outputter = network_outputter.create_csv_article_output( network_query_set )
+                
+                # time stamp to append to file name
+                current_date_time = datetime.datetime.now().strftime( '%Y%m%d-%H%M%S' )
+                
+                response_OUT = StreamingHttpResponse( csv_outputter.iterate_csv_lines(), content_type = "text/csv" )
+                response_OUT[ 'Content-Disposition' ] = 'attachment; filename="context_text_articles-' + current_date_time + '.csv"'
+                
+            else:
+            
+                # For now, output plain string
+                output_string = network_outputter.debug_parameters()
 
-            #-------------------------------------------------------------------
-            # summary info.
-            #-------------------------------------------------------------------
+                #-------------------------------------------------------------------
+                # summary info.
+                #-------------------------------------------------------------------
 
-            # retrieve QuerySet based on parameters passed in.
-            network_query_set = network_outputter.create_network_query_set()
+                # retrieve QuerySet based on parameters passed in.
+                network_query_set = network_outputter.create_network_query_set()
 
-            # get count of queryset return items
-            if ( ( network_query_set != None ) and ( network_query_set != "" ) ):
+                # get count of queryset return items
+                if ( ( network_query_set != None ) and ( network_query_set != "" ) ):
 
-                # get count of articles
-                article_data_count = network_query_set.count()
-    
-                output_string += "\n\nTotal articles returned: " + str( article_data_count ) + "\n\n\n"
-    
-                # loop over the query set.
-                query_counter = 0
-                for current_item in network_query_set:
-                    query_counter += 1
-                    output_string += "- ( " + str( query_counter ) + " ) " + current_item.article.headline + "\n"
+                    # get count of articles
+                    article_data_count = network_query_set.count()
     
-                # first, build the CSV list of articles, so we can use it for
-                #    reliability, basic statistics.
-                output_string += "\n\n"
-                output_string += "====================\n"
-                output_string += "CSV output:\n"
-                output_string += "====================\n"
-                output_string += network_outputter.render_csv_article_data( network_query_set )
-                output_string += "====================\n"
-                output_string += "END CSV output\n"
-                output_string += "====================\n"
+                    output_string += "\n\nTotal articles returned: " + str( article_data_count ) + "\n\n\n"
     
-                # Prepare parameters for view.
-                response_dictionary[ 'output_string' ] = output_string
-                response_dictionary[ 'article_select_form' ] = article_select_form
-                response_dictionary[ 'output_type_form' ] = output_type_form
-                response_OUT = render( request_IN, default_template, response_dictionary )
+                    # loop over the query set.
+                    query_counter = 0
+                    for current_item in network_query_set:
+                        query_counter += 1
+                        output_string += "- ( " + str( query_counter ) + " ) " + current_item.article.headline + "\n"
+    
+                    # first, build the CSV list of articles, so we can use it for
+                    #    reliability, basic statistics.
+                    output_string += "\n\n"
+                    output_string += "====================\n"
+                    output_string += "CSV output:\n"
+                    output_string += "====================\n"
+                    output_string += network_outputter.render_csv_article_data( network_query_set )
+                    output_string += "====================\n"
+                    output_string += "END CSV output\n"
+                    output_string += "====================\n"
+    
+                    # Prepare parameters for view.
+                    response_dictionary[ 'output_string' ] = output_string
+                    response_dictionary[ 'article_select_form' ] = article_select_form
+                    response_dictionary[ 'output_type_form' ] = output_type_form
+                    response_OUT = render( request_IN, default_template, response_dictionary )
                 
-            else:
+                else:
             
+                    # is None.  error.
+                    response_dictionary[ 'output_string' ] = "ERROR - network query set is None."
+                    response_dictionary[ 'article_select_form' ] = article_select_form
+                    response_dictionary[ 'output_type_form' ] = output_type_form
+                    response_OUT = render( request_IN, default_template, response_dictionary )
+            
+                #-- END check to see if query set is None --#
+                '''
                 # is None.  error.
-                response_dictionary[ 'output_string' ] = "ERROR - network query set is None."
+                response_dictionary[ 'output_string' ] = "debug - " + str( type( network_query_set ) ) + " - " + str( network_query_set )
                 response_dictionary[ 'article_select_form' ] = article_select_form
                 response_dictionary[ 'output_type_form' ] = output_type_form
                 response_OUT = render( request_IN, default_template, response_dictionary )
+                '''
             
-            #-- END check to see if query set is None --#
-            '''
-            # is None.  error.
-            response_dictionary[ 'output_string' ] = "debug - " + str( type( network_query_set ) ) + " - " + str( network_query_set )
-            response_dictionary[ 'article_select_form' ] = article_select_form
-            response_dictionary[ 'output_type_form' ] = output_type_form
-            response_OUT = render( request_IN, default_template, response_dictionary )
-            '''
+            #-- END check to see if download as file --#
             
         else:
 
@@ -4198,6 +4224,40 @@ def person_merge( request_IN ):
 
                     #-- END check to make sure one FROM and one INTO. --#
 
+                elif ( merge_action_IN == Person_MergeActionForm.PERSON_MERGE_ACTION_MERGE_ALL ):
+                
+                    # ! ---- merge_all from...to.
+                    
+                    # first, check to make sure at least one FROM and one INTO.
+                    from_count = len( merge_from_id_list )
+                    into_count = len( merge_into_id_list )
+                    
+                    if ( ( from_count >= 1 ) and ( into_count == 1 ) ):
+                    
+                        # move everything that refers to the FROM persons
+                        #     over to the INTO person, one UPDATE per table.
+                        #     FROM persons are left in place.
+                        into_person_id = merge_into_id_list[ 0 ]
+                        
+                        # call the merge method.
+                        merge_status = PersonData.merge_persons_bulk( merge_from_id_list, into_person_id, do_updates_IN = True, delete_from_IN = False )
+                        
+                        # update the action details list - rows moved per
+                        #     table, then elapsed time.
+                        action_summary = "Status = \"" + str( merge_status.get_status_code() ) + "\": merging all data that refers to person(s) " + str( merge_from_id_list ) + " into person " + str( into_person_id )
+                        action_detail_list.append( action_summary )
+                        
+                        # get message list from status container and append it to action summary.
+                        merge_status_message_list = merge_status.get_message_list()
+                        action_detail_list.extend( merge_status_message_list )
+                        
+                    else:
+                    
+                        # when merging all, need one or more FROM and one INTO
+                        response_dictionary[ 'output_string' ] = "When merging all person data, you can merge one or more persons (FROM) into a single other person (INTO) (FROM n INTO 1)."        
+
+                    #-- END check to make sure FROM and one INTO. --#
+
                 #-- END check to see what merge action --#
                 
 
@@ -4256,6 +4316,10 @@ class PersonAutocomplete( autocomplete.Select2QuerySetView ):
     # this autocomplete's related class.
     MY_LOOKUP_CLASS = Person
 
+    # search - ranked matches from PersonSearch, best first.
+    SEARCH_BACKEND_NAME = None  # None = best available.
+    SEARCH_RESULT_LIMIT = 20
+
 
     #============================================================================
     # ! ==> Built-in Instance methods
@@ -4313,9 +4377,14 @@ class PersonAutocomplete( autocomplete.Select2QuerySetView ):
             qs_OUT = DalHelper.get_instance_query( person_search_string, my_request, my_lookup_class )
 
             # got anything back?
-            if ( qs_OUT is None ):
+            if ( ( qs_OUT is None ) and ( person_search_string ) ):
+
+                # No exact match for q as ID.  Ranked search on names.
+                qs_OUT = PersonSearch.get_backend( self.SEARCH_BACKEND_NAME ).search_queryset( person_search_string, limit_IN = self.SEARCH_RESULT_LIMIT )
+
+            elif ( qs_OUT is None ):
 
-                # No exact match for q as ID.  Try Person.find_person_from_name()
+                # no search string.  Try Person.find_person_from_name()
                 qs_OUT = my_lookup_class.find_person_from_name( person_search_string, do_strict_match_IN = False, do_partial_match_IN = True )
                 
             #-- END retrieval of QuerySet when no ID match. --#